@@ -1 +1,2 @@
-"""NBA API tools package."""
\ No newline at end of file
+"""NBA API tools package."""
+from api_tools import http_client  # noqa: F401  Configures the shared nba_api client and request coalescing
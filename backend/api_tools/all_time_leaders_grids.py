@@ -14,34 +14,20 @@ endpoint, which includes information such as:
 - Games played leaders
 - And many other statistical categories
 
-The data is returned as pandas DataFrames and can be cached as CSV files for faster access.
+The data is returned as pandas DataFrames and can be cached as Parquet files for faster access.
 """
 
 import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import alltimeleadersgrids
 from utils.path_utils import get_cache_dir, get_cache_file_path
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -68,27 +54,6 @@ VALID_SEASON_TYPES = {
 }
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV with UTF-8 encoding
-        df.to_csv(file_path, index=False, encoding='utf-8')
-
-        # Log the file size and path
-        file_size = os.path.getsize(file_path)
-        logger.info(f"Saved DataFrame to CSV: {file_path} (Size: {file_size} bytes)")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
-
 
 def _get_csv_path_for_all_time_leaders(
     league_id: str = "00",
@@ -106,14 +71,14 @@ def _get_csv_path_for_all_time_leaders(
         topx: Number of top players to return (default: 10)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Create a filename based on the parameters
     # Replace spaces with underscores for season_type
     safe_season_type = season_type.replace(" ", "_")
 
     # Create a unique filename that includes all parameters
-    filename = f"all_time_leaders_league{league_id}_mode{per_mode}_season{safe_season_type}_top{topx}.csv"
+    filename = f"all_time_leaders_league{league_id}_mode{per_mode}_season{safe_season_type}_top{topx}.parquet"
 
     return get_cache_file_path(filename, "all_time_leaders")
 
@@ -151,7 +116,7 @@ def _validate_all_time_leaders_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=ALL_TIME_LEADERS_CACHE_SIZE)
+@cached_logic(maxsize=ALL_TIME_LEADERS_CACHE_SIZE)
 def fetch_all_time_leaders_logic(
     league_id: str = "00",
     per_mode: str = "Totals",
@@ -204,7 +169,7 @@ def fetch_all_time_leaders_logic(
             return format_response(error=validation_error), dataframes
         return format_response(error=validation_error)
 
-    # Check if cached CSV file exists
+    # Check if cached Parquet file exists
     csv_path = _get_csv_path_for_all_time_leaders(
         league_id=league_id,
         per_mode=per_mode,
@@ -214,21 +179,11 @@ def fetch_all_time_leaders_logic(
 
     if os.path.exists(csv_path) and return_dataframe:
         try:
-            # Check if the file is empty or too small
-            file_size = os.path.getsize(csv_path)
-            if file_size < 10:  # If file is too small, it's probably empty or corrupted
-                logger.warning(f"CSV file is too small ({file_size} bytes), fetching from API instead")
-                # Delete the corrupted file
-                try:
-                    os.remove(csv_path)
-                    logger.info(f"Deleted corrupted CSV file: {csv_path}")
-                except Exception as e:
-                    logger.error(f"Error deleting corrupted CSV file: {e}", exc_info=True)
-                # Continue to API fetch
+            df = load_dataset(csv_path)
+            if df is None:
+                logger.warning(f"Cached dataset missing or unreadable, fetching from API instead: {csv_path}")
             else:
-                logger.info(f"Loading all-time leaders from CSV: {csv_path}")
-                # Read CSV with appropriate data types
-                df = pd.read_csv(csv_path, encoding='utf-8')
+                logger.info(f"Loading all-time leaders from dataset cache: {csv_path}")
 
                 # Process for JSON response
                 result_dict = {
@@ -241,7 +196,7 @@ def fetch_all_time_leaders_logic(
                     "data_sets": {}
                 }
 
-                # Split the CSV into multiple DataFrames based on the category
+                # Split the Parquet into multiple DataFrames based on the category
                 categories = [
                     "ASTLeaders", "BLKLeaders", "DREBLeaders", "FG3ALeaders", "FG3MLeaders",
                     "FG3_PCTLeaders", "FGALeaders", "FGMLeaders", "FG_PCTLeaders", "FTALeaders",
@@ -249,7 +204,7 @@ def fetch_all_time_leaders_logic(
                     "PTSLeaders", "REBLeaders", "STLLeaders", "TOVLeaders"
                 ]
 
-                # Check if the CSV contains a 'Category' column
+                # Check if the Parquet contains a 'Category' column
                 if 'Category' in df.columns:
                     # Split the DataFrame by category
                     for category in categories:
@@ -260,7 +215,7 @@ def fetch_all_time_leaders_logic(
                             dataframes[category] = category_df
                             result_dict["data_sets"][category] = _process_dataframe(category_df, single_row=False)
                 else:
-                    # If no Category column, assume it's a combined CSV with all categories
+                    # If no Category column, assume it's a combined Parquet with all categories
                     dataframes["AllTimeLeaders"] = df
                     result_dict["data_sets"]["AllTimeLeaders"] = _process_dataframe(df, single_row=False)
 
@@ -269,8 +224,8 @@ def fetch_all_time_leaders_logic(
                 return format_response(result_dict)
 
         except Exception as e:
-            logger.error(f"Error loading CSV: {e}", exc_info=True)
-            # If there's an error loading the CSV, fetch from the API
+            logger.error(f"Error loading Parquet: {e}", exc_info=True)
+            # If there's an error loading the Parquet, fetch from the API
 
     # Prepare API parameters
     api_params = {
@@ -302,7 +257,7 @@ def fetch_all_time_leaders_logic(
         # "FTMLeaders", "FT_PCTLeaders", "GPLeaders", "OREBLeaders", "PFLeaders",
         # "PTSLeaders", "REBLeaders", "STLLeaders", "TOVLeaders"
 
-        # Create a combined DataFrame for CSV storage
+        # Create a combined DataFrame for Parquet storage
         combined_df = pd.DataFrame()
 
         # Process each data frame
@@ -382,11 +337,11 @@ def fetch_all_time_leaders_logic(
                 processed_data = _process_dataframe(df, single_row=False)
                 result_dict["data_sets"][data_set_name] = processed_data
 
-        # Save combined DataFrame to CSV
+        # Save combined DataFrame to the dataset cache
         if return_dataframe:
             # Even if the DataFrame is empty, save it to indicate we tried to fetch the data
             # This will help with caching and prevent repeated API calls
-            _save_dataframe_to_csv(combined_df, csv_path)
+            save_dataset(combined_df, csv_path)
 
         # Return response
         logger.info(f"Successfully fetched all-time leaders data")
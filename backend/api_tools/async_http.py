@@ -0,0 +1,330 @@
+"""
+Async fetch layer for nba_api traffic.
+
+The api_tools logic functions stay synchronous and remain the single definition
+of each endpoint's parameters and response processing. `call_logic_async` runs
+one of them in a worker thread with its upstream I/O deferred: when the function
+reaches nba_api's `send_api_request` for a response that has not been fetched
+yet, a `DeferredFetch` unwinds it and frees the thread, the request is awaited
+on the event loop with a pooled `httpx.AsyncClient` (HTTP keep-alive, per-host
+rate limiting, retries matching http_client.py), and the function runs again
+with that response available. Cache I/O, dataset writes and pandas processing
+therefore never run on the loop. Cache hits return before any request is made,
+so most calls finish in one pass; a pass that unwinds stops before the
+function's own cache write, and nested cached logic functions that completed in
+an earlier pass are cache hits in the next one.
+
+The function makes its requests blocking in a worker thread instead when httpx
+is not installed, settings.NBA_API_ASYNC_ENABLED is off, or it needs more than
+settings.NBA_API_ASYNC_MAX_FETCH_PASSES upstream requests.
+"""
+import asyncio
+import inspect
+import logging
+import weakref
+import functools
+import contextvars
+from urllib.parse import urlparse
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import requests
+from nba_api.library.http import NBAHTTP
+
+from config import settings
+from api_tools.http_client import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_USER_AGENT,
+    RETRY_STATUS_CODES,
+    _request_key,
+)
+from api_tools.utils import DEFAULT_RETRY_ATTEMPTS, DEFAULT_RETRY_INITIAL_DELAY, DEFAULT_RETRY_MAX_DELAY
+from utils.rate_limiter import get_rate_limiter
+from utils.single_flight import AsyncSingleFlight, no_blocking_waits
+
+try:
+    import httpx
+except ImportError:  # Optional: without it, async callers run logic functions in worker threads
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamRequest(NamedTuple):
+    """An nba_api request captured at `send_api_request`, ready to be sent by the async client."""
+    key: str                      # Same identity used by http_client's request coalescing
+    url: str
+    params: List[Tuple[str, str]]
+    headers: Dict[str, str]
+    timeout: float
+
+
+class FetchedResponse(NamedTuple):
+    """The parts of an HTTP response nba_api keeps."""
+    text: str
+    status_code: int
+    url: str
+
+
+class DeferredFetch(BaseException):
+    """
+    Unwinds a logic function running under `call_logic_async` at upstream requests not fetched yet.
+
+    Usually carries the single request that stopped the function; composite fetches
+    (api_tools/composite.py) gather the first request of every branch into one, with
+    their shared deadline as `timeout`. Derives from BaseException so the
+    `except Exception` handlers in the logic functions and `retry_on_timeout` let it through untouched.
+    """
+
+    def __init__(self, upstream_requests: List[UpstreamRequest], timeout: Optional[float] = None):
+        super().__init__(", ".join(request.url for request in upstream_requests))
+        self.requests = upstream_requests
+        self.timeout = timeout
+
+
+class _FetchPlan:
+    """Upstream outcomes (responses or exceptions) gathered for one async logic call."""
+
+    def __init__(self) -> None:
+        self.outcomes: Dict[str, Union[FetchedResponse, BaseException]] = {}
+        self.defer = True  # False once the call is finished in a worker thread
+
+
+_active_plan: contextvars.ContextVar[Optional[_FetchPlan]] = contextvars.ContextVar("nba_api_fetch_plan", default=None)
+_stats = {"calls": 0, "fetch_passes": 0, "thread_fallbacks": 0}
+
+
+def deferring_fetches() -> bool:
+    """True while running under `call_logic_async` with upstream requests being deferred."""
+    plan = _active_plan.get()
+    return plan is not None and plan.defer
+
+
+# --- nba_api Interception ---
+def _build_request(client: NBAHTTP, arguments: Dict[str, Any]) -> UpstreamRequest:
+    """Mirrors how nba_api's `send_api_request` assembles the URL, query string and headers."""
+    endpoint = arguments["endpoint"]
+    parameters = arguments.get("parameters") or {}
+    headers = dict(arguments.get("headers") or client.headers or {})
+    if arguments.get("referer"):
+        headers["Referer"] = arguments["referer"]
+    params = [(str(k), str(v)) for k, v in sorted(parameters.items(), key=lambda kv: kv[0]) if v is not None]
+    return UpstreamRequest(
+        key=_request_key(client, endpoint, parameters),
+        url=client.base_url.format(endpoint=endpoint),
+        params=params,
+        headers=headers,
+        timeout=float(arguments.get("timeout") or settings.DEFAULT_TIMEOUT_SECONDS),
+    )
+
+
+def _to_nba_response(client: NBAHTTP, arguments: Dict[str, Any], fetched: FetchedResponse) -> Any:
+    """Builds the same response object nba_api would have returned for this client."""
+    client.parameters = arguments.get("parameters")
+    data = client.nba_response(response=client.clean_contents(fetched.text), status_code=fetched.status_code, url=fetched.url)
+    if arguments.get("raise_exception_on_error") and not data.valid_json():
+        raise Exception("InvalidResponse: Response is not in a valid JSON format.")
+    return data
+
+
+def install_deferred_fetching() -> None:
+    """
+    Wraps nba_api's shared `NBAHTTP.send_api_request` so calls made under `call_logic_async`
+    are served from the call's fetch plan or deferred to the async client. Calls made outside
+    it go straight to the existing (coalesced, rate-limited) sync path. Safe to call more than once.
+    """
+    original = NBAHTTP.send_api_request
+    if getattr(original, "_deferrable", False):
+        return
+    signature = inspect.signature(original)
+
+    @functools.wraps(original)
+    def send_api_request(self, *args, **kwargs):
+        plan = _active_plan.get()
+        if plan is None:
+            return original(self, *args, **kwargs)
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        key = _request_key(self, arguments["endpoint"], arguments.get("parameters"))
+        outcome = plan.outcomes.get(key)
+        if outcome is None:
+            if not plan.defer:
+                return original(self, *args, **kwargs)
+            raise DeferredFetch([_build_request(self, arguments)])
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return _to_nba_response(self, arguments, outcome)
+
+    send_api_request._deferrable = True
+    NBAHTTP.send_api_request = send_api_request
+    logger.info("nba_api deferred async fetching installed")
+
+
+# --- Async Client ---
+class _LoopState:
+    """The pooled client and fetch coalescing for one event loop."""
+
+    def __init__(self) -> None:
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.NBA_API_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.NBA_API_ASYNC_MAX_KEEPALIVE,
+                keepalive_expiry=settings.NBA_API_ASYNC_KEEPALIVE_SECONDS,
+            ),
+            headers={"User-Agent": DEFAULT_USER_AGENT},
+            follow_redirects=True,
+        )
+        self.flight = AsyncSingleFlight("nba_api_async")
+
+
+_loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+
+def _loop_state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _LoopState()
+        _loop_states[loop] = state
+    return state
+
+
+async def aclose_async_client() -> None:
+    """Closes the running loop's pooled client (e.g., on application shutdown)."""
+    state = _loop_states.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+        await state.client.aclose()
+
+
+async def _send(client: "httpx.AsyncClient", request: UpstreamRequest) -> "httpx.Response":
+    if not settings.NBA_API_RATE_LIMIT_ENABLED:
+        return await client.get(request.url, params=request.params, headers=request.headers, timeout=request.timeout)
+    async with get_rate_limiter().async_slot(urlparse(request.url).hostname or ""):
+        return await client.get(request.url, params=request.params, headers=request.headers, timeout=request.timeout)
+
+
+async def _fetch_with_retries(client: "httpx.AsyncClient", request: UpstreamRequest) -> FetchedResponse:
+    """
+    Sends a request with the same retry budget as the sync path: connection errors and read
+    timeouts as in `retry_on_timeout`, 5xx statuses as in http_client's urllib3 `Retry`.
+
+    Raises:
+        requests.exceptions.RetryError: When either retry budget is exhausted.
+    """
+    transport_failures = 0
+    status_retries = 0
+    while True:
+        try:
+            response = await _send(client, request)
+        except httpx.TransportError as e:
+            transport_failures += 1
+            if transport_failures >= DEFAULT_RETRY_ATTEMPTS:
+                logger.error(f"All {transport_failures} attempts for {request.url} failed. Last error: {type(e).__name__}: {e}")
+                raise requests.exceptions.RetryError(f"{request.url} failed after {transport_failures} attempts: {type(e).__name__}: {e}") from e
+            delay = min(DEFAULT_RETRY_INITIAL_DELAY * 2 ** (transport_failures - 1), DEFAULT_RETRY_MAX_DELAY)
+            logger.warning(f"Attempt {transport_failures} of {DEFAULT_RETRY_ATTEMPTS} for {request.url} failed with {type(e).__name__}. Retrying in {delay:.2f} seconds...")
+            await asyncio.sleep(delay)
+            continue
+
+        if response.status_code in RETRY_STATUS_CODES:
+            if status_retries >= DEFAULT_MAX_RETRIES:
+                raise requests.exceptions.RetryError(f"{request.url} returned {response.status_code} after {status_retries} retries")
+            status_retries += 1
+            await asyncio.sleep(DEFAULT_BACKOFF_FACTOR * 2 ** (status_retries - 1))
+            continue
+        return FetchedResponse(response.text, response.status_code, str(response.url))
+
+
+async def fetch(request: UpstreamRequest) -> FetchedResponse:
+    """Fetches one upstream request, sharing the response with identical concurrent fetches on this loop."""
+    state = _loop_state()
+    return await state.flight.do(request.key, lambda: _fetch_with_retries(state.client, request))
+
+
+async def _fetch_into(plan: _FetchPlan, deferred: DeferredFetch) -> None:
+    """Fetches every deferred request concurrently and records each outcome in the plan."""
+    tasks = {request.key: asyncio.ensure_future(fetch(request)) for request in deferred.requests}
+    _, pending = await asyncio.wait(tasks.values(), timeout=deferred.timeout)
+    for key, task in tasks.items():
+        if task in pending:
+            task.cancel()
+            plan.outcomes[key] = requests.exceptions.Timeout(f"Upstream request not completed within the {deferred.timeout:.1f}s deadline")
+            continue
+        error = task.exception()
+        if error is None:
+            plan.outcomes[key] = task.result()
+        elif isinstance(error, Exception):  # Replayed inside the logic function, which handles it like a sync failure
+            plan.outcomes[key] = error
+        else:
+            raise error
+
+
+# --- Async Logic Calls ---
+def _run_deferred_pass(plan: _FetchPlan, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[bool, Any]:
+    """Runs one pass of `func` (in a worker thread); returns (True, result), or (False, DeferredFetch) if it unwound."""
+    token = _active_plan.set(plan)
+    try:
+        with no_blocking_waits():
+            return True, func(*args, **kwargs)
+    except DeferredFetch as deferred:
+        return False, deferred
+    finally:
+        _active_plan.reset(token)
+
+
+def _run_with_plan(plan: _FetchPlan, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    token = _active_plan.set(plan)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _active_plan.reset(token)
+
+
+async def call_logic_async(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Awaits a synchronous logic function (or a tool body calling several) without holding a
+    thread while its upstream requests are in flight.
+
+    Args:
+        func (Callable[..., Any]): The synchronous function, e.g. a `fetch_*_logic` function.
+        *args, **kwargs: Passed to `func` unchanged.
+
+    Returns:
+        Any: Exactly what `func(*args, **kwargs)` returns. Upstream failures surface inside
+        `func` as they would on the sync path, so it formats its usual error response.
+    """
+    if httpx is None or not settings.NBA_API_ASYNC_ENABLED:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    _stats["calls"] += 1
+    plan = _FetchPlan()
+    for _ in range(settings.NBA_API_ASYNC_MAX_FETCH_PASSES):
+        finished, outcome = await asyncio.to_thread(_run_deferred_pass, plan, func, args, kwargs)
+        if finished:
+            return outcome
+        _stats["fetch_passes"] += 1
+        await _fetch_into(plan, outcome)
+
+    _stats["thread_fallbacks"] += 1
+    logger.info(f"{getattr(func, '__name__', func)} needed more than {settings.NBA_API_ASYNC_MAX_FETCH_PASSES} upstream requests; finishing in a worker thread")
+    plan.defer = False
+    return await asyncio.to_thread(_run_with_plan, plan, func, args, kwargs)
+
+
+def async_variant(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Returns a coroutine function with `func`'s signature that runs it through `call_logic_async`."""
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await call_logic_async(func, *args, **kwargs)
+    return wrapper
+
+
+def async_fetch_info() -> Dict[str, Any]:
+    """Returns async-call counters and the fetch-coalescing counters of every live event loop."""
+    return {
+        **_stats,
+        "enabled": httpx is not None and settings.NBA_API_ASYNC_ENABLED,
+        "coalescing": [state.flight.info() for state in list(_loop_states.values())],
+    }
+
+
+install_deferred_fetching()
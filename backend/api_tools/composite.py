@@ -0,0 +1,104 @@
+"""
+Concurrent sub-fetches for composite logic functions.
+
+Tools such as the player aggregate profile or team info + roster are built
+from several independent upstream calls. `fetch_concurrently` runs them at the
+same time under one shared deadline, so the composite takes roughly as long as
+its slowest part instead of the sum. Each sub-fetch reports its own outcome;
+the caller decides which failures are fatal and which become partial errors.
+
+Under `call_logic_async` (api_tools/async_http.py) no threads are used: every
+branch runs inline until its first unfetched request, and those requests are
+deferred together so the event loop fetches them concurrently.
+"""
+import time
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from config import settings
+from api_tools.async_http import DeferredFetch, deferring_fetches
+
+logger = logging.getLogger(__name__)
+
+
+class SubFetch(NamedTuple):
+    """One independent part of a composite fetch."""
+    func: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    kwargs: Optional[Dict[str, Any]] = None
+
+
+class SubResult(NamedTuple):
+    """Outcome of a sub-fetch: its return value, or why it has none."""
+    value: Any = None
+    error: Optional[str] = None  # Set when the sub-fetch raised or missed the deadline
+    elapsed: float = 0.0
+
+
+_executor = ThreadPoolExecutor(max_workers=settings.COMPOSITE_FETCH_MAX_WORKERS, thread_name_prefix="composite-fetch")
+_in_sub_fetch: contextvars.ContextVar[bool] = contextvars.ContextVar("composite_in_sub_fetch", default=False)
+
+
+def _run_sub_fetch(name: str, sub_fetch: SubFetch) -> SubResult:
+    _in_sub_fetch.set(True)  # Runs in a copied context; nested composites execute inline
+    started = time.monotonic()
+    try:
+        value = sub_fetch.func(*sub_fetch.args, **(sub_fetch.kwargs or {}))
+        return SubResult(value=value, elapsed=time.monotonic() - started)
+    except Exception as e:
+        logger.error(f"Composite sub-fetch '{name}' failed: {type(e).__name__}: {e}", exc_info=True)
+        return SubResult(error=f"{type(e).__name__}: {e}", elapsed=time.monotonic() - started)
+
+
+def _run_deferred(fetches: Dict[str, SubFetch], deadline: float) -> Dict[str, SubResult]:
+    """Runs every branch inline, collecting their unfetched requests into a single deferral."""
+    results: Dict[str, SubResult] = {}
+    pending: List[Any] = []
+    timeout = deadline
+    for name, sub_fetch in fetches.items():
+        try:
+            results[name] = contextvars.copy_context().run(_run_sub_fetch, name, sub_fetch)
+        except DeferredFetch as deferred:
+            pending.extend(deferred.requests)
+            if deferred.timeout is not None:
+                timeout = min(timeout, deferred.timeout)
+    if pending:
+        raise DeferredFetch(pending, timeout=timeout)
+    return results
+
+
+def fetch_concurrently(fetches: Dict[str, SubFetch], deadline: Optional[float] = None) -> Dict[str, SubResult]:
+    """
+    Runs independent sub-fetches concurrently and waits for all of them up to a shared deadline.
+
+    Args:
+        fetches (Dict[str, SubFetch]): Sub-fetches by name.
+        deadline (Optional[float]): Seconds to wait for all sub-fetches.
+            Defaults to settings.COMPOSITE_FETCH_DEADLINE_SECONDS.
+
+    Returns:
+        Dict[str, SubResult]: One result per name. Sub-fetches that raised or were still running at
+        the deadline have `error` set; late ones keep running in the background and still warm the caches.
+    """
+    deadline = settings.COMPOSITE_FETCH_DEADLINE_SECONDS if deadline is None else deadline
+    if deferring_fetches():
+        return _run_deferred(fetches, deadline)
+    if len(fetches) <= 1 or _in_sub_fetch.get():
+        return {name: contextvars.copy_context().run(_run_sub_fetch, name, sub_fetch) for name, sub_fetch in fetches.items()}
+
+    futures = {
+        name: _executor.submit(contextvars.copy_context().run, _run_sub_fetch, name, sub_fetch)
+        for name, sub_fetch in fetches.items()
+    }
+    _, not_done = wait(futures.values(), timeout=deadline)
+
+    results: Dict[str, SubResult] = {}
+    for name, future in futures.items():
+        if future in not_done:
+            logger.warning(f"Composite sub-fetch '{name}' did not finish within {deadline:.1f}s")
+            results[name] = SubResult(error=f"timed out after {deadline:.1f}s", elapsed=deadline)
+        else:
+            results[name] = future.result()
+    return results
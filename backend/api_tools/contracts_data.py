@@ -1,49 +1,26 @@
 """
 NBA player contract data API tools.
 Fetches data from clean CSV files with NBA API ID mappings.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
 from typing import Any, Dict, Optional, Union, List, Tuple
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 logger = logging.getLogger(__name__)
 
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
-
 # Cache directory setup
 CONTRACTS_CSV_DIR = get_cache_dir("contracts")
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
 CONTRACTS_CSV = os.path.join(DATA_DIR, "contracts_clean.csv")
 
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """Saves a DataFrame to a CSV file."""
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
-
 def _load_contracts_data() -> pd.DataFrame:
     """Load the clean contracts CSV data."""
     if not os.path.exists(CONTRACTS_CSV):
@@ -53,7 +30,7 @@ def _load_contracts_data() -> pd.DataFrame:
     logger.info(f"Loaded {len(df)} contract records")
     return df
 
-@lru_cache(maxsize=32)
+@cached_logic(maxsize=32)
 def fetch_contracts_data_logic(
     player_id: Optional[int] = None,
     team_id: Optional[int] = None,
@@ -78,13 +55,13 @@ def fetch_contracts_data_logic(
         if team_id:
             cache_parts.append(f"team_{team_id}")
 
-        cache_filename = "_".join(cache_parts) + ".csv"
+        cache_filename = "_".join(cache_parts) + ".parquet"
         cache_path = get_cache_file_path(cache_filename, "contracts")
 
         # Try to load from cache first
         if os.path.exists(cache_path):
             try:
-                df = pd.read_csv(cache_path)
+                df = load_dataset(cache_path)
                 logger.info(f"Loaded cached contracts data: {len(df)} records")
             except Exception as e:
                 logger.warning(f"Error reading cache, loading fresh data: {e}")
@@ -99,11 +76,11 @@ def fetch_contracts_data_logic(
                 df = df[df['nba_team_id'] == team_id]
 
             # Cache the filtered results
-            _save_dataframe_to_csv(df, cache_path)
+            save_dataset(df, cache_path)
 
         # Process data for JSON response
         data_sets = {
-            "contracts": _process_dataframe(df)
+            "contracts": _process_dataframe(df, single_row=False)
         }
 
         response_data = {
@@ -165,29 +142,29 @@ def get_highest_paid_players(limit: int = 50, return_dataframe: bool = False) ->
         JSON string or tuple of (JSON string, DataFrames dict)
     """
     try:
-        cache_filename = f"highest_paid_players_limit_{limit}.csv"
+        cache_filename = f"highest_paid_players_limit_{limit}.parquet"
         cache_path = get_cache_file_path(cache_filename, "contracts")
 
         # Try to load from cache first
         if os.path.exists(cache_path):
             try:
-                df = pd.read_csv(cache_path)
+                df = load_dataset(cache_path)
                 logger.info(f"Loaded cached highest paid players: {len(df)} records")
             except Exception as e:
                 logger.warning(f"Error reading cache, loading fresh data: {e}")
                 df = _load_contracts_data()
                 # Filter and sort
                 df = df[df['Guaranteed'].notna()].sort_values('Guaranteed', ascending=False).head(limit)
-                _save_dataframe_to_csv(df, cache_path)
+                save_dataset(df, cache_path)
         else:
             df = _load_contracts_data()
             # Filter and sort
             df = df[df['Guaranteed'].notna()].sort_values('Guaranteed', ascending=False).head(limit)
-            _save_dataframe_to_csv(df, cache_path)
+            save_dataset(df, cache_path)
 
         # Process data for JSON response
         data_sets = {
-            "highest_paid_players": _process_dataframe(df)
+            "highest_paid_players": _process_dataframe(df, single_row=False)
         }
 
         response_data = {
@@ -233,7 +210,7 @@ def search_player_contracts(player_name: str, return_dataframe: bool = False) ->
 
         # Process data for JSON response
         data_sets = {
-            "player_contracts": _process_dataframe(df_filtered)
+            "player_contracts": _process_dataframe(df_filtered, single_row=False)
         }
 
         response_data = {
@@ -7,36 +7,21 @@ non-stationary shooting endpoint, which includes shooting metrics such as:
 - On-the-move shooting (15-foot and college range)
 - Shooting percentages and attempts
 
-The data is returned as pandas DataFrames and can be cached as CSV files for faster access.
+The data is returned as pandas DataFrames and can be cached as Parquet files for faster access.
 """
 
 import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import draftcombinenonstationaryshooting
 from utils.validation import _validate_season_format
 from utils.path_utils import get_cache_dir, get_cache_file_path
-
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -53,25 +38,6 @@ VALID_LEAGUE_IDS = {
 }
 
 
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
-
-
 def _get_csv_path_for_draft_combine_nonshooting(season_year: str, league_id: str = "00") -> str:
     """
     Generates a file path for saving draft combine non-stationary shooting DataFrame.
@@ -81,9 +47,9 @@ def _get_csv_path_for_draft_combine_nonshooting(season_year: str, league_id: str
         league_id: League ID (default: "00" for NBA)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
-    filename = f"draft_combine_nonshooting_{season_year}_{league_id}.csv"
+    filename = f"draft_combine_nonshooting_{season_year}_{league_id}.parquet"
     return get_cache_file_path(filename, "draft_combine")
 
 
@@ -116,7 +82,7 @@ def _validate_draft_combine_nonshooting_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=DRAFT_COMBINE_NONSHOOTING_CACHE_SIZE)
+@cached_logic(maxsize=DRAFT_COMBINE_NONSHOOTING_CACHE_SIZE)
 def fetch_draft_combine_nonshooting_logic(
     season_year: str,
     league_id: str = "00",
@@ -152,14 +118,14 @@ def fetch_draft_combine_nonshooting_logic(
             return format_response(error=validation_error), dataframes
         return format_response(error=validation_error)
 
-    # Check if cached CSV file exists
+    # Check if cached Parquet file exists
     csv_path = _get_csv_path_for_draft_combine_nonshooting(season_year, league_id)
 
     if os.path.exists(csv_path) and return_dataframe:
         try:
-            logger.info(f"Loading draft combine non-stationary shooting from CSV: {csv_path}")
-            # Read CSV with appropriate data types
-            df = pd.read_csv(csv_path)
+            logger.info(f"Loading draft combine non-stationary shooting from dataset cache: {csv_path}")
+            # Read Parquet with appropriate data types
+            df = load_dataset(csv_path)
 
             # Convert numeric columns to appropriate types
             numeric_columns = [
@@ -190,8 +156,8 @@ def fetch_draft_combine_nonshooting_logic(
             return format_response(result_dict)
 
         except Exception as e:
-            logger.error(f"Error loading CSV: {e}", exc_info=True)
-            # If there's an error loading the CSV, fetch from the API
+            logger.error(f"Error loading Parquet: {e}", exc_info=True)
+            # If there's an error loading the Parquet, fetch from the API
 
     # Prepare API parameters
     api_params = {
@@ -236,9 +202,9 @@ def fetch_draft_combine_nonshooting_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
 
-                    # Save to CSV if not empty
+                    # Save to Parquet if not empty
                     if not df.empty:
-                        _save_dataframe_to_csv(df, csv_path)
+                        save_dataset(df, csv_path)
 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
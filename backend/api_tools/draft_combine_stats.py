@@ -7,7 +7,7 @@ stats endpoint, which includes comprehensive data such as:
 - Physical testing results (vertical leap, agility, sprint, bench press)
 - Shooting statistics (spot shooting, off-dribble shooting, on-move shooting)
 
-The data is returned as pandas DataFrames and can be cached as CSV files for faster access.
+The data is returned as pandas DataFrames and can be cached as Parquet files for faster access.
 """
 
 import os
@@ -15,29 +15,14 @@ import logging
 import json
 import re
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import draftcombinestats
 from utils.validation import _validate_season_format
 from utils.path_utils import get_cache_dir, get_cache_file_path
-
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-    
-    if single_row:
-        return df.iloc[0].to_dict()
-    
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -54,24 +39,6 @@ VALID_LEAGUE_IDS = {
 }
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-    
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
-
 
 def _get_csv_path_for_draft_combine_stats(season_year: str, league_id: str = "00") -> str:
     """
@@ -82,11 +49,11 @@ def _get_csv_path_for_draft_combine_stats(season_year: str, league_id: str = "00
         league_id: League ID (default: "00" for NBA)
         
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Sanitize season_year for filename (replace special characters)
     safe_season = season_year.replace("-", "_").replace(" ", "_")
-    filename = f"draft_combine_stats_{safe_season}_{league_id}.csv"
+    filename = f"draft_combine_stats_{safe_season}_{league_id}.parquet"
     return get_cache_file_path(filename, "draft_combine")
 
 # --- Parameter Validation Functions ---
@@ -117,7 +84,7 @@ def _validate_draft_combine_stats_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=DRAFT_COMBINE_STATS_CACHE_SIZE)
+@cached_logic(maxsize=DRAFT_COMBINE_STATS_CACHE_SIZE)
 def fetch_draft_combine_stats_logic(
     season_year: str,
     league_id: str = "00",
@@ -153,14 +120,14 @@ def fetch_draft_combine_stats_logic(
             return format_response(error=validation_error), dataframes
         return format_response(error=validation_error)
     
-    # Check if cached CSV file exists
+    # Check if cached Parquet file exists
     csv_path = _get_csv_path_for_draft_combine_stats(season_year, league_id)
     
     if os.path.exists(csv_path) and return_dataframe:
         try:
-            logger.info(f"Loading draft combine stats from CSV: {csv_path}")
-            # Read CSV with appropriate data types
-            df = pd.read_csv(csv_path)
+            logger.info(f"Loading draft combine stats from dataset cache: {csv_path}")
+            # Read Parquet with appropriate data types
+            df = load_dataset(csv_path)
             
             # Convert numeric columns to appropriate types
             numeric_columns = [
@@ -195,8 +162,8 @@ def fetch_draft_combine_stats_logic(
             return format_response(result_dict)
             
         except Exception as e:
-            logger.error(f"Error loading CSV: {e}", exc_info=True)
-            # If there's an error loading the CSV, fetch from the API
+            logger.error(f"Error loading Parquet: {e}", exc_info=True)
+            # If there's an error loading the Parquet, fetch from the API
     
     # Prepare API parameters
     api_params = {
@@ -241,9 +208,9 @@ def fetch_draft_combine_stats_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
                     
-                    # Save to CSV if not empty
+                    # Save to Parquet if not empty
                     if not df.empty:
-                        _save_dataframe_to_csv(df, csv_path)
+                        save_dataset(df, csv_path)
                 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
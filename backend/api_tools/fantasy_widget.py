@@ -1,7 +1,7 @@
 """
 Handles fetching and processing fantasy basketball widget data
 from the FantasyWidget endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 The FantasyWidget endpoint provides comprehensive fantasy basketball data (20 columns):
 - Player info: ID, name, position, team (5 columns)
@@ -15,30 +15,14 @@ import logging
 import os
 import json
 from typing import Optional, Dict, Any, Set, Union, Tuple
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import fantasywidget
 from nba_api.stats.library.parameters import SeasonTypeAllStar
 import pandas as pd
 
 from utils.path_utils import get_cache_dir, get_cache_file_path
-
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 def _validate_season_format(season):
     """Validate season format (YYYY-YY)."""
@@ -78,27 +62,7 @@ FANTASY_WIDGET_CSV_DIR = get_cache_dir("fantasy_widget")
 # Ensure cache directories exist
 os.makedirs(FANTASY_WIDGET_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV with UTF-8 encoding
-        df.to_csv(file_path, index=False, encoding='utf-8')
-
-        # Log the file size and path
-        file_size = os.path.getsize(file_path)
-        logger.info(f"Saved DataFrame to CSV: {file_path} (Size: {file_size} bytes)")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_fantasy_widget(
     league_id: str = "00",
@@ -122,7 +86,7 @@ def _get_csv_path_for_fantasy_widget(
         position: Position filter (optional)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Create a filename based on the parameters
     filename_parts = [
@@ -141,7 +105,7 @@ def _get_csv_path_for_fantasy_widget(
     if position:
         filename_parts.append(f"pos{position}")
 
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
 
     return get_cache_file_path(filename, "fantasy_widget")
 
@@ -165,7 +129,7 @@ def _validate_fantasy_widget_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=FANTASY_WIDGET_CACHE_SIZE)
+@cached_logic(maxsize=FANTASY_WIDGET_CACHE_SIZE)
 def fetch_fantasy_widget_logic(
     league_id: str = "00",
     season: str = CURRENT_NBA_SEASON,
@@ -181,7 +145,7 @@ def fetch_fantasy_widget_logic(
     """
     Fetches fantasy widget data using the FantasyWidget endpoint.
 
-    Provides DataFrame output capabilities and CSV caching.
+    Provides DataFrame output capabilities and Parquet caching.
 
     Args:
         league_id: League ID (default: "00" for NBA)
@@ -217,7 +181,7 @@ def fetch_fantasy_widget_logic(
             return error_response, {}
         return error_response
 
-    # Check for cached CSV file
+    # Check for cached Parquet file
     csv_path = _get_csv_path_for_fantasy_widget(
         league_id=league_id,
         season=season,
@@ -231,21 +195,11 @@ def fetch_fantasy_widget_logic(
 
     if os.path.exists(csv_path) and return_dataframe:
         try:
-            # Check if the file is empty or too small
-            file_size = os.path.getsize(csv_path)
-            if file_size < 100:  # If file is too small, it's probably empty or corrupted
-                logger.warning(f"CSV file is too small ({file_size} bytes), fetching from API instead")
-                # Delete the corrupted file
-                try:
-                    os.remove(csv_path)
-                    logger.info(f"Deleted corrupted CSV file: {csv_path}")
-                except Exception as e:
-                    logger.error(f"Error deleting corrupted CSV file: {e}", exc_info=True)
-                # Continue to API fetch
+            df = load_dataset(csv_path)
+            if df is None:
+                logger.warning(f"Cached dataset missing or unreadable, fetching from API instead: {csv_path}")
             else:
-                logger.info(f"Loading fantasy widget from CSV: {csv_path}")
-                # Read CSV with appropriate data types
-                df = pd.read_csv(csv_path, encoding='utf-8')
+                logger.info(f"Loading fantasy widget from dataset cache: {csv_path}")
 
                 # Process for JSON response
                 result_dict = {
@@ -272,8 +226,8 @@ def fetch_fantasy_widget_logic(
                 return format_response(result_dict)
 
         except Exception as e:
-            logger.error(f"Error loading CSV: {e}", exc_info=True)
-            # If there's an error loading the CSV, fetch from the API
+            logger.error(f"Error loading Parquet: {e}", exc_info=True)
+            # If there's an error loading the Parquet, fetch from the API
 
     try:
         # Prepare API parameters (only include non-None values)
@@ -305,7 +259,7 @@ def fetch_fantasy_widget_logic(
             "data_sets": {}
         }
 
-        # Create a combined DataFrame for CSV storage
+        # Create a combined DataFrame for Parquet storage
         combined_df = pd.DataFrame()
 
         # Process each data frame
@@ -318,7 +272,7 @@ def fetch_fantasy_widget_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
 
-                    # Use the first (main) DataFrame for CSV storage
+                    # Use the first (main) DataFrame for Parquet storage
                     if idx == 0:
                         combined_df = df.copy()
 
@@ -326,9 +280,9 @@ def fetch_fantasy_widget_logic(
                 processed_data = _process_dataframe(df, single_row=False)
                 result_dict["data_sets"][data_set_name] = processed_data
 
-        # Save combined DataFrame to CSV
+        # Save combined DataFrame to the dataset cache
         if return_dataframe and not combined_df.empty:
-            # Recalculate CSV path to ensure consistency
+            # Recalculate Parquet path to ensure consistency
             save_csv_path = _get_csv_path_for_fantasy_widget(
                 league_id=league_id,
                 season=season,
@@ -338,7 +292,7 @@ def fetch_fantasy_widget_logic(
                 team_id=team_id,
                 position=position
             )
-            _save_dataframe_to_csv(combined_df, save_csv_path)
+            save_dataset(combined_df, save_csv_path)
 
         final_json_response = format_response(result_dict)
         if return_dataframe:
@@ -1,7 +1,7 @@
 """
 Handles fetching and processing franchise history data
 from the FranchiseHistory endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 The FranchiseHistory endpoint provides comprehensive franchise history data (15 columns):
 - Team info: LEAGUE_ID, TEAM_ID, TEAM_CITY, TEAM_NAME (4 columns)
@@ -16,29 +16,13 @@ import logging
 import os
 import json
 from typing import Optional, Dict, Any, Set, Union, Tuple
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import franchisehistory
 import pandas as pd
 
 from utils.path_utils import get_cache_dir, get_cache_file_path
-
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -54,27 +38,7 @@ FRANCHISE_HISTORY_CSV_DIR = get_cache_dir("franchise_history")
 # Ensure cache directories exist
 os.makedirs(FRANCHISE_HISTORY_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-    
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        # Save DataFrame to CSV with UTF-8 encoding
-        df.to_csv(file_path, index=False, encoding='utf-8')
-        
-        # Log the file size and path
-        file_size = os.path.getsize(file_path)
-        logger.info(f"Saved DataFrame to CSV: {file_path} (Size: {file_size} bytes)")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_franchise_history(
     league_id: str = "00",
@@ -88,9 +52,9 @@ def _get_csv_path_for_franchise_history(
         data_set_name: Name of the data set
         
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
-    filename = f"franchise_history_league{league_id}_{data_set_name}.csv"
+    filename = f"franchise_history_league{league_id}_{data_set_name}.parquet"
     return get_cache_file_path(filename, "franchise_history")
 
 # --- Parameter Validation ---
@@ -103,7 +67,7 @@ def _validate_franchise_history_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=FRANCHISE_HISTORY_CACHE_SIZE)
+@cached_logic(maxsize=FRANCHISE_HISTORY_CACHE_SIZE)
 def fetch_franchise_history_logic(
     league_id: str = "00",
     return_dataframe: bool = False
@@ -111,7 +75,7 @@ def fetch_franchise_history_logic(
     """
     Fetches franchise history data using the FranchiseHistory endpoint.
     
-    Provides DataFrame output capabilities and CSV caching.
+    Provides DataFrame output capabilities and Parquet caching.
     
     Args:
         league_id: League ID (default: "00" for NBA)
@@ -138,7 +102,7 @@ def fetch_franchise_history_logic(
             return error_response, {}
         return error_response
     
-    # Check for cached CSV files
+    # Check for cached Parquet files
     dataframes = {}
     
     # Try to load from cache first
@@ -151,19 +115,14 @@ def fetch_franchise_history_logic(
             csv_path = _get_csv_path_for_franchise_history(league_id, data_set_name)
             if os.path.exists(csv_path):
                 try:
-                    # Check if the file is empty or too small
-                    file_size = os.path.getsize(csv_path)
-                    if file_size < 100:  # If file is too small, it's probably empty or corrupted
-                        logger.warning(f"CSV file is too small ({file_size} bytes), fetching from API instead")
-                        all_cached = False
-                        break
+                    df = load_dataset(csv_path)
+                    if df is None:
+                        logger.warning(f"Cached dataset missing or unreadable, fetching from API instead: {csv_path}")
                     else:
-                        logger.info(f"Loading franchise history from CSV: {csv_path}")
-                        # Read CSV with appropriate data types
-                        df = pd.read_csv(csv_path, encoding='utf-8')
+                        logger.info(f"Loading franchise history from dataset cache: {csv_path}")
                         dataframes[data_set_name] = df
                 except Exception as e:
-                    logger.error(f"Error loading CSV: {e}", exc_info=True)
+                    logger.error(f"Error loading Parquet: {e}", exc_info=True)
                     all_cached = False
                     break
             else:
@@ -215,9 +174,9 @@ def fetch_franchise_history_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
                     
-                    # Save DataFrame to CSV
+                    # Save DataFrame to the dataset cache
                     csv_path = _get_csv_path_for_franchise_history(league_id, data_set_name)
-                    _save_dataframe_to_csv(df, csv_path)
+                    save_dataset(df, csv_path)
                 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
@@ -1,49 +1,26 @@
 """
 NBA free agent data API tools.
 Fetches data from clean CSV files with NBA API ID mappings.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
 from typing import Any, Dict, Optional, Union, List, Tuple
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 logger = logging.getLogger(__name__)
 
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
-
 # Cache directory setup
 FREE_AGENTS_CSV_DIR = get_cache_dir("free_agents")
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
 FREE_AGENTS_CSV = os.path.join(DATA_DIR, "free_agents_clean.csv")
 
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """Saves a DataFrame to a CSV file."""
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
-
 def _load_free_agents_data() -> pd.DataFrame:
     """Load the clean free agents CSV data."""
     if not os.path.exists(FREE_AGENTS_CSV):
@@ -53,7 +30,7 @@ def _load_free_agents_data() -> pd.DataFrame:
     logger.info(f"Loaded {len(df)} free agent records")
     return df
 
-@lru_cache(maxsize=32)
+@cached_logic(maxsize=32)
 def fetch_free_agents_data_logic(
     player_id: Optional[int] = None,
     team_id: Optional[int] = None,
@@ -90,13 +67,13 @@ def fetch_free_agents_data_logic(
         if min_ppg:
             cache_parts.append(f"minppg_{min_ppg}")
 
-        cache_filename = "_".join(cache_parts) + ".csv"
+        cache_filename = "_".join(cache_parts) + ".parquet"
         cache_path = get_cache_file_path(cache_filename, "free_agents")
 
         # Try to load from cache first
         if os.path.exists(cache_path):
             try:
-                df = pd.read_csv(cache_path)
+                df = load_dataset(cache_path)
                 logger.info(f"Loaded cached free agents data: {len(df)} records")
             except Exception as e:
                 logger.warning(f"Error reading cache, loading fresh data: {e}")
@@ -117,11 +94,11 @@ def fetch_free_agents_data_logic(
                 df = df[df['PPG'] >= min_ppg]
 
             # Cache the filtered results
-            _save_dataframe_to_csv(df, cache_path)
+            save_dataset(df, cache_path)
 
         # Process data for JSON response
         data_sets = {
-            "free_agents": _process_dataframe(df)
+            "free_agents": _process_dataframe(df, single_row=False)
         }
 
         response_data = {
@@ -200,13 +177,13 @@ def get_top_free_agents(
             cache_parts.append(f"type_{free_agent_type}")
         cache_parts.append(f"limit_{limit}")
 
-        cache_filename = "_".join(cache_parts) + ".csv"
+        cache_filename = "_".join(cache_parts) + ".parquet"
         cache_path = get_cache_file_path(cache_filename, "free_agents")
 
         # Try to load from cache first
         if os.path.exists(cache_path):
             try:
-                df = pd.read_csv(cache_path)
+                df = load_dataset(cache_path)
                 logger.info(f"Loaded cached top free agents: {len(df)} records")
             except Exception as e:
                 logger.warning(f"Error reading cache, loading fresh data: {e}")
@@ -217,7 +194,7 @@ def get_top_free_agents(
                 if free_agent_type:
                     df = df[df['type'] == free_agent_type]
                 df = df.sort_values('PPG', ascending=False).head(limit)
-                _save_dataframe_to_csv(df, cache_path)
+                save_dataset(df, cache_path)
         else:
             df = _load_free_agents_data()
             # Apply filters and sort
@@ -226,11 +203,11 @@ def get_top_free_agents(
             if free_agent_type:
                 df = df[df['type'] == free_agent_type]
             df = df.sort_values('PPG', ascending=False).head(limit)
-            _save_dataframe_to_csv(df, cache_path)
+            save_dataset(df, cache_path)
 
         # Process data for JSON response
         data_sets = {
-            "top_free_agents": _process_dataframe(df)
+            "top_free_agents": _process_dataframe(df, single_row=False)
         }
 
         response_data = {
@@ -278,7 +255,7 @@ def search_free_agents(player_name: str, return_dataframe: bool = False) -> Unio
 
         # Process data for JSON response
         data_sets = {
-            "free_agent_search": _process_dataframe(df_filtered)
+            "free_agent_search": _process_dataframe(df_filtered, single_row=False)
         }
 
         response_data = {
@@ -1,12 +1,12 @@
 """
 Handles fetching and processing player matchup data from NBA games
 using the BoxScoreMatchupsV3 endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 from typing import Dict, Optional, Union, Tuple
 
@@ -18,6 +18,7 @@ from api_tools.utils import (
     format_response
 )
 from utils.validation import validate_game_id_format
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -31,34 +32,21 @@ os.makedirs(CSV_CACHE_DIR, exist_ok=True)
 os.makedirs(BOXSCORE_MATCHUPS_CSV_DIR, exist_ok=True)
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_matchups(game_id: str) -> str:
     """
-    Generates a file path for saving a matchups DataFrame as CSV.
+    Generates a file path for saving a matchups DataFrame as Parquet.
 
     Args:
         game_id: The game ID
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
-    filename = f"{game_id}_matchups.csv"
+    filename = f"{game_id}_matchups.parquet"
     return os.path.join(BOXSCORE_MATCHUPS_CSV_DIR, filename)
 
-@lru_cache(maxsize=GAME_BOXSCORE_MATCHUPS_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_MATCHUPS_CACHE_SIZE)
 def fetch_game_boxscore_matchups_logic(
     game_id: str,
     return_dataframe: bool = False
@@ -114,10 +102,10 @@ def fetch_game_boxscore_matchups_logic(
         if return_dataframe:
             dataframes["matchups"] = matchups_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not matchups_df.empty:
                 csv_path = _get_csv_path_for_matchups(game_id)
-                _save_dataframe_to_csv(matchups_df, csv_path)
+                save_dataset(matchups_df, csv_path)
 
         # Process data for JSON response
         if matchups_df.empty:
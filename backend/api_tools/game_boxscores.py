@@ -2,12 +2,15 @@
 Handles fetching and processing various types of game box score data
 (Traditional, Advanced, Four Factors, Usage, Defensive, Summary)
 using a generic helper function.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
+
+`fetch_game_boxscore_bundle_logic` fetches any subset of these families for one
+game concurrently and merges them into single player and team tables.
 """
 import logging
 import os
 import json
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 from typing import Any, Dict, Optional, Type, Union, Tuple, List
 
@@ -30,7 +33,11 @@ from api_tools.utils import (
     _process_dataframe,
     format_response
 )
+from api_tools.composite import SubFetch, fetch_concurrently
 from utils.validation import validate_game_id_format
+from utils.dataset_store import save_dataset
+from utils.cache_policy import record_game_status
+from utils.season_warehouse import is_full_game_request, stored_endpoint
 
 logger = logging.getLogger(__name__)
 
@@ -44,23 +51,10 @@ os.makedirs(CSV_CACHE_DIR, exist_ok=True)
 os.makedirs(BOXSCORE_CSV_DIR, exist_ok=True)
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_boxscore(game_id: str, boxscore_type: str, **kwargs) -> str:
     """
-    Generates a file path for saving a boxscore DataFrame as CSV.
+    Generates a file path for saving a boxscore DataFrame as Parquet.
 
     Args:
         game_id: The game ID
@@ -68,14 +62,14 @@ def _get_csv_path_for_boxscore(game_id: str, boxscore_type: str, **kwargs) -> st
         **kwargs: Additional parameters to include in the filename
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Create a string with the parameters
     params_str = ""
     if kwargs:
         params_str = "_" + "_".join(f"{k}_{v}" for k, v in kwargs.items() if v != 0)
 
-    filename = f"{game_id}_{boxscore_type}{params_str}.csv"
+    filename = f"{game_id}_{boxscore_type}{params_str}.parquet"
     return os.path.join(BOXSCORE_CSV_DIR, filename)
 
 def _get_dataframes_from_endpoint(
@@ -153,8 +147,12 @@ def _fetch_boxscore_data_generic(
         return error_response
 
     try:
-        endpoint_instance = endpoint_class(game_id=game_id, **kwargs, timeout=settings.DEFAULT_TIMEOUT_SECONDS)
-        logger.debug(f"{endpoint_name_for_logging} API call successful for {game_id}")
+        endpoint_instance = None
+        if is_full_game_request(*kwargs.values()):  # Served from the season warehouse when ingested
+            endpoint_instance = stored_endpoint(endpoint_class, game_id)
+        if endpoint_instance is None:
+            endpoint_instance = endpoint_class(game_id=game_id, **kwargs, timeout=settings.DEFAULT_TIMEOUT_SECONDS)
+            logger.debug(f"{endpoint_name_for_logging} API call successful for {game_id}")
 
         # Extract DataFrames from the endpoint
         dataframes = _get_dataframes_from_endpoint(endpoint_instance, dataset_mapping)
@@ -193,13 +191,13 @@ def _fetch_boxscore_data_generic(
         if additional_params_for_response:
             result["parameters"] = additional_params_for_response
 
-        # Save DataFrames to CSV if requested
+        # Save DataFrames to the dataset cache if requested
         if return_dataframe:
             boxscore_type = endpoint_name_for_logging.replace("BoxScore", "").replace("V2", "").replace("V3", "").lower()
             for output_key, df in dataframes.items():
                 if not df.empty:
                     csv_path = _get_csv_path_for_boxscore(game_id, f"{boxscore_type}_{output_key}", **kwargs)
-                    _save_dataframe_to_csv(df, csv_path)
+                    save_dataset(df, csv_path)
 
         logger.info(f"Generic boxscore fetch for {endpoint_name_for_logging} completed for game {game_id}")
         json_response = format_response(result)
@@ -227,7 +225,7 @@ def _fetch_boxscore_data_generic(
 
 # --- Public Fetch Logic Functions ---
 
-@lru_cache(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
 def fetch_boxscore_traditional_logic(
     game_id: str,
     start_period: int = StartPeriod.default,
@@ -274,7 +272,7 @@ def fetch_boxscore_traditional_logic(
         start_range=start_range, end_range=end_range, range_type=range_type
     )
 
-@lru_cache(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
 def fetch_boxscore_advanced_logic(
     game_id: str,
     start_period: int = StartPeriod.default,
@@ -313,7 +311,7 @@ def fetch_boxscore_advanced_logic(
         start_range=start_range, end_range=end_range
     )
 
-@lru_cache(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
 def fetch_boxscore_four_factors_logic(
     game_id: str,
     start_period: int = StartPeriod.default,
@@ -344,7 +342,7 @@ def fetch_boxscore_four_factors_logic(
         start_period=start_period, end_period=end_period
     )
 
-@lru_cache(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
 def fetch_boxscore_usage_logic(
     game_id: str,
     return_dataframe: bool = False
@@ -370,7 +368,7 @@ def fetch_boxscore_usage_logic(
         # No additional constructor kwargs beyond game_id for BoxScoreUsageV3 apart from defaults
     )
 
-@lru_cache(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
 def fetch_boxscore_defensive_logic(
     game_id: str,
     return_dataframe: bool = False
@@ -396,7 +394,7 @@ def fetch_boxscore_defensive_logic(
         # No additional constructor kwargs beyond game_id for BoxScoreDefensiveV2
     )
 
-@lru_cache(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
 def fetch_boxscore_summary_logic(
     game_id: str,
     return_dataframe: bool = False
@@ -432,7 +430,7 @@ def fetch_boxscore_summary_logic(
         # No additional constructor kwargs beyond game_id for BoxScoreSummaryV2
     )
 
-@lru_cache(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
 def fetch_boxscore_misc_logic(
     game_id: str,
     start_period: int = StartPeriod.default,
@@ -474,7 +472,7 @@ def fetch_boxscore_misc_logic(
         start_range=start_range, end_range=end_range, range_type=range_type
     )
 
-@lru_cache(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
 def fetch_boxscore_playertrack_logic(
     game_id: str,
     return_dataframe: bool = False
@@ -499,7 +497,7 @@ def fetch_boxscore_playertrack_logic(
         return_dataframe=return_dataframe
     )
 
-@lru_cache(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
 def fetch_boxscore_scoring_logic(
     game_id: str,
     start_period: int = StartPeriod.default,
@@ -541,7 +539,7 @@ def fetch_boxscore_scoring_logic(
         start_range=start_range, end_range=end_range, range_type=range_type
     )
 
-@lru_cache(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
 def fetch_boxscore_hustle_logic(
     game_id: str,
     return_dataframe: bool = False
@@ -564,4 +562,186 @@ def fetch_boxscore_hustle_logic(
         error_constants={"api": Errors.BOXSCORE_API, "processing": Errors.PROCESSING_ERROR},
         endpoint_name_for_logging="BoxScoreHustleV2",
         return_dataframe=return_dataframe
-    )
\ No newline at end of file
+    )
+
+
+# --- Game Boxscore Bundle ---
+
+# Family -> (endpoint class, output key -> dataset attribute). "players" and "teams" are merged across
+# families on PLAYER_KEY / TEAM_KEY; any other dataset is returned as-is under its output key.
+BOXSCORE_FAMILIES: Dict[str, Tuple[Type[Any], Dict[str, str]]] = {
+    "traditional": (BoxScoreTraditionalV3, {"players": "player_stats", "teams": "team_stats", "starters_bench": "team_starter_bench_stats"}),
+    "advanced": (BoxScoreAdvancedV3, {"players": "player_stats", "teams": "team_stats"}),
+    "four_factors": (BoxScoreFourFactorsV3, {"players": "player_stats", "teams": "team_stats"}),
+    "usage": (BoxScoreUsageV3, {"players": "player_stats", "teams": "team_stats"}),
+    "defensive": (BoxScoreDefensiveV2, {"players": "player_stats", "teams": "team_stats"}),
+    "misc": (BoxScoreMiscV3, {"players": "player_stats", "teams": "team_stats"}),
+    "playertrack": (BoxScorePlayerTrackV3, {"players": "player_stats", "teams": "team_stats"}),
+    "scoring": (BoxScoreScoringV3, {"players": "player_stats", "teams": "team_stats"}),
+    "hustle": (BoxScoreHustleV2, {"players": "player_stats", "teams": "team_stats"}),
+    "summary": (BoxScoreSummaryV2, {
+        "game_summary": "game_summary", "line_score": "line_score", "other_stats": "other_stats",
+        "officials": "officials", "inactive_players": "inactive_players", "game_info": "game_info",
+        "last_meeting": "last_meeting", "season_series": "season_series",
+    }),
+}
+DEFAULT_BUNDLE_FAMILIES = ("traditional", "advanced", "four_factors", "misc", "summary")
+PLAYER_KEY = "personId"
+TEAM_KEY = "teamId"
+BUNDLE_DROPPED_COLUMNS = ("gameId",)  # Repeated on every row; the bundle carries game_id once
+
+
+def _normalize_bundle_families(families: Optional[Union[str, List[str]]]) -> Tuple[str, ...]:
+    """Returns the requested families in BOXSCORE_FAMILIES order; raises ValueError for unknown names."""
+    if not families:
+        return DEFAULT_BUNDLE_FAMILIES
+    if isinstance(families, str):
+        families = families.split(",")
+    requested = {str(family).strip().lower().replace("-", "_") for family in families if str(family).strip()}
+    if "all" in requested:
+        return tuple(BOXSCORE_FAMILIES)
+    unknown = sorted(requested - set(BOXSCORE_FAMILIES))
+    if unknown:
+        raise ValueError(Errors.INVALID_BOXSCORE_FAMILY.format(value=unknown[0], options=", ".join(BOXSCORE_FAMILIES)))
+    return tuple(family for family in BOXSCORE_FAMILIES if family in requested)
+
+def _fetch_boxscore_family(game_id: str, family: str) -> Dict[str, pd.DataFrame]:
+    endpoint_class, dataset_mapping = BOXSCORE_FAMILIES[family]
+    endpoint_instance = stored_endpoint(endpoint_class, game_id) or endpoint_class(game_id=game_id, timeout=settings.DEFAULT_TIMEOUT_SECONDS)
+    return _get_dataframes_from_endpoint(endpoint_instance, dataset_mapping)
+
+def _merge_family_frames(frames: Dict[str, pd.DataFrame], key: str) -> Tuple[pd.DataFrame, Dict[str, List[str]]]:
+    """
+    Outer-joins one table per family on `key`. A column present in several families keeps the first
+    family's values (in BOXSCORE_FAMILIES order), filled from later families where it is missing.
+    Returns the merged table and the columns each family contributed.
+    """
+    merged: Optional[pd.DataFrame] = None
+    columns_by_family: Dict[str, List[str]] = {}
+    for family, df in frames.items():
+        if df is None or df.empty or key not in df.columns:
+            continue
+        df = df.drop(columns=[c for c in BUNDLE_DROPPED_COLUMNS if c in df.columns]).drop_duplicates(subset=[key])
+        if merged is None:
+            merged = df.reset_index(drop=True)
+            columns_by_family[family] = [c for c in df.columns if c != key]
+            continue
+        added = [c for c in df.columns if c not in merged.columns]
+        column_order = list(merged.columns) + added
+        merged = merged.set_index(key).combine_first(df.set_index(key)).reset_index()[column_order]
+        if added:
+            columns_by_family[family] = added
+    return (merged if merged is not None else pd.DataFrame()), columns_by_family
+
+@cached_logic(maxsize=GAME_BOXSCORE_CACHE_SIZE)
+def _fetch_boxscore_bundle(
+    game_id: str,
+    families: Tuple[str, ...],
+    return_dataframe: bool = False
+) -> Union[str, Tuple[str, Dict[str, pd.DataFrame]]]:
+    sub_results = fetch_concurrently({
+        family: SubFetch(_fetch_boxscore_family, (game_id, family)) for family in families
+    })
+
+    partial_errors: List[str] = []
+    player_frames: Dict[str, pd.DataFrame] = {}
+    team_frames: Dict[str, pd.DataFrame] = {}
+    other_frames: Dict[str, pd.DataFrame] = {}
+    for family in families:
+        sub_result = sub_results[family]
+        if sub_result.error:
+            partial_errors.append(f"{family}: {sub_result.error}")
+            continue
+        for output_key, df in sub_result.value.items():
+            if output_key == "players":
+                player_frames[family] = df
+            elif output_key == "teams":
+                team_frames[family] = df
+            else:
+                other_frames[output_key] = df
+
+    if len(partial_errors) == len(families):
+        error_msg = Errors.BOXSCORE_BUNDLE_ALL_FAILED.format(game_id=game_id, errors_list="; ".join(partial_errors))
+        logger.error(error_msg)
+        if return_dataframe:
+            return format_response(error=error_msg), {}
+        return format_response(error=error_msg)
+
+    players_df, player_columns = _merge_family_frames(player_frames, PLAYER_KEY)
+    teams_df, team_columns = _merge_family_frames(team_frames, TEAM_KEY)
+
+    # A final game's bundle never changes; record it so the cache policy keeps this entry indefinitely
+    game_summary = other_frames.get("game_summary")
+    if game_summary is not None and not game_summary.empty and "GAME_STATUS_ID" in game_summary.columns:
+        record_game_status(game_id, game_summary["GAME_STATUS_ID"].iloc[0])
+
+    result: Dict[str, Any] = {
+        "game_id": game_id,
+        "families": [family for family in families if not sub_results[family].error],
+        "players": _process_dataframe(players_df, single_row=False) or [],
+        "teams": _process_dataframe(teams_df, single_row=False) or [],
+        "columns_by_family": {
+            family: {"players": player_columns.get(family, []), "teams": team_columns.get(family, [])}
+            for family in families if family in player_columns or family in team_columns
+        },
+    }
+    if other_frames:
+        result["game"] = {output_key: _process_dataframe(df, single_row=False) or [] for output_key, df in other_frames.items()}
+    if partial_errors:
+        result["partial_errors"] = partial_errors
+
+    if return_dataframe:
+        dataframes = {"players": players_df, "teams": teams_df, **other_frames}
+        for output_key, df in dataframes.items():
+            if not df.empty:
+                save_dataset(df, _get_csv_path_for_boxscore(game_id, f"bundle_{output_key}"))
+        return format_response(result), dataframes
+    return format_response(result)
+
+def fetch_game_boxscore_bundle_logic(
+    game_id: str,
+    families: Optional[Union[str, List[str]]] = None,
+    return_dataframe: bool = False
+) -> Union[str, Tuple[str, Dict[str, pd.DataFrame]]]:
+    """
+    Fetches several box score families for one game in a single concurrent round of upstream calls
+    and merges them into one player table (keyed by personId) and one team table (keyed by teamId).
+
+    The bundle is cached as a unit per game and family set; once the game is final (known from the
+    summary family or a scoreboard) it is kept as immutable historical data.
+
+    Args:
+        game_id: The ID of the game to fetch data for
+        families: Families to fetch, as a list or comma-separated string: any of
+            traditional, advanced, four_factors, usage, defensive, misc, playertrack, scoring,
+            hustle, summary, or "all". Defaults to DEFAULT_BUNDLE_FAMILIES.
+        return_dataframe: Whether to return DataFrames along with the JSON response
+
+    Returns:
+        If return_dataframe=False: JSON string with "players", "teams", "columns_by_family", "game"
+            (summary and other per-game datasets) and "partial_errors" for families that failed
+        If return_dataframe=True: Tuple of (JSON string, Dictionary of DataFrames)
+    """
+    logger.info(f"Executing fetch_game_boxscore_bundle_logic for game ID: {game_id}, families: {families}")
+
+    if not game_id:
+        error_response = format_response(error=Errors.GAME_ID_EMPTY)
+        if return_dataframe:
+            return error_response, {}
+        return error_response
+
+    if not validate_game_id_format(game_id):
+        error_response = format_response(error=Errors.INVALID_GAME_ID_FORMAT.format(game_id=game_id))
+        if return_dataframe:
+            return error_response, {}
+        return error_response
+
+    try:
+        normalized_families = _normalize_bundle_families(families)
+    except ValueError as e:
+        error_response = format_response(error=str(e))
+        if return_dataframe:
+            return error_response, {}
+        return error_response
+
+    return _fetch_boxscore_bundle(game_id, normalized_families, return_dataframe=return_dataframe)
@@ -2,14 +2,14 @@
 Handles fetching league game data using the LeagueGameFinder endpoint.
 Includes logic for parameter validation, post-fetch date filtering (due to API instability
 with date range parameters), and result limiting for broad queries.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import pandas as pd
 from typing import Optional, List, Dict, Any, Set, Union, Tuple
 from datetime import datetime
-from functools import lru_cache
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import leaguegamefinder
 from nba_api.stats.library.parameters import LeagueID, SeasonTypeAllStar
 from config import settings
@@ -20,6 +20,7 @@ from api_tools.utils import (
 )
 from utils.validation import _validate_season_format, validate_date_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -35,20 +36,7 @@ _VALID_GAME_FINDER_LEAGUE_IDS: Set[str] = {getattr(LeagueID, attr) for attr in d
 # --- Cache Directory Setup ---
 GAME_FINDER_CSV_DIR = get_cache_dir("game_finder")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_game_finder(
     player_or_team_abbreviation: str,
@@ -61,7 +49,7 @@ def _get_csv_path_for_game_finder(
     date_to_nullable: Optional[str] = None
 ) -> str:
     """
-    Generates a file path for saving game finder DataFrame as CSV.
+    Generates a file path for saving game finder DataFrame as Parquet.
 
     Args:
         player_or_team_abbreviation: 'P' for player or 'T' for team
@@ -74,7 +62,7 @@ def _get_csv_path_for_game_finder(
         date_to_nullable: End date 'YYYY-MM-DD'
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Create a string with the parameters
     params = []
@@ -105,7 +93,7 @@ def _get_csv_path_for_game_finder(
         params.append(f"to_{date_to_nullable}")
 
     # Join parameters with underscores
-    filename = "_".join(params) + ".csv"
+    filename = "_".join(params) + ".parquet"
 
     return get_cache_file_path(filename, "game_finder")
 
@@ -210,6 +198,7 @@ def _format_game_dates(games_list: List[Dict[str, Any]]) -> None:
                 game_item['GAME_DATE_FORMATTED'] = game_item['GAME_DATE'].split('T')[0] # Fallback
 
 # --- Main Logic Function ---
+@cached_logic()
 def fetch_league_games_logic(
     player_or_team_abbreviation: str = 'T',
     player_id_nullable: Optional[int] = None,
@@ -311,7 +300,7 @@ def fetch_league_games_logic(
         if return_dataframe:
             dataframes["games"] = games_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not games_df.empty:
                 csv_path = _get_csv_path_for_game_finder(
                     player_or_team_abbreviation=player_or_team_abbreviation,
@@ -323,7 +312,7 @@ def fetch_league_games_logic(
                     date_from_nullable=date_from_nullable,
                     date_to_nullable=date_to_nullable
                 )
-                _save_dataframe_to_csv(games_df, csv_path)
+                save_dataset(games_df, csv_path)
 
         games_list = _process_dataframe(games_df, single_row=False)
         if games_list is None:
@@ -355,7 +344,7 @@ def fetch_league_games_logic(
             )
 
             result["dataframe_info"] = {
-                "message": "League games data has been converted to DataFrame and saved as CSV file",
+                "message": "League games data has been converted to DataFrame and saved as Parquet file",
                 "dataframes": {
                     "games": {
                         "shape": list(games_df.shape) if not games_df.empty else [],
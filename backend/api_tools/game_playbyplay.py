@@ -2,14 +2,13 @@
 Handles fetching and processing game play-by-play (PBP) data.
 It attempts to fetch live PBP data first and falls back to historical PBP data (PlayByPlayV3)
 if live data is unavailable or if specific period filters are applied.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import json
 import logging
 import os
 from typing import Dict, Any, Optional, List, Union, Tuple
 from datetime import datetime
-import re
 import pandas as pd
 from functools import lru_cache
 
@@ -22,6 +21,10 @@ from api_tools.utils import (
     format_response
 )
 from utils.validation import validate_game_id_format
+from utils.dataset_store import save_dataset
+from utils.live_snapshots import PLAYBYPLAY, get_live_snapshot
+from api_tools.live_playbyplay_store import get_live_pbp_store
+from utils.season_warehouse import is_full_game_request, stored_endpoint
 
 logger = logging.getLogger(__name__)
 
@@ -38,23 +41,9 @@ os.makedirs(PBP_CSV_DIR, exist_ok=True)
 # Note: Previous helper functions like _get_event_type and _determine_team_from_tricode
 # were removed as PlayByPlayV3 provides richer data directly (actionType, subType, teamTricode).
 
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
-
 def _get_csv_path_for_playbyplay(game_id: str, source: str, start_period: int = 0, end_period: int = 0) -> str:
     """
-    Generates a file path for saving a play-by-play DataFrame as CSV.
+    Generates a file path for saving a play-by-play DataFrame as Parquet.
 
     Args:
         game_id: The game ID
@@ -63,14 +52,14 @@ def _get_csv_path_for_playbyplay(game_id: str, source: str, start_period: int =
         end_period: Ending period filter
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Create a string with the period filters
     period_str = ""
     if start_period > 0 or end_period > 0:
         period_str = f"_periods_{start_period}_{end_period}"
 
-    filename = f"{game_id}_{source}{period_str}.csv"
+    filename = f"{game_id}_{source}{period_str}.parquet"
     return os.path.join(PBP_CSV_DIR, filename)
 
 def _filter_plays_by_event_type(plays_df: pd.DataFrame, event_types: List[str] = None) -> pd.DataFrame:
@@ -220,65 +209,6 @@ def _format_historical_pbp_dataframe(pbp_df: pd.DataFrame) -> pd.DataFrame:
 
     return formatted_df
 
-def _format_live_pbp_dataframe(live_data_dict: Dict[str, Any]) -> pd.DataFrame:
-    """
-    Converts live play-by-play data dictionary to a DataFrame and formats it.
-
-    Args:
-        live_data_dict: Dictionary from LivePlayByPlay endpoint
-
-    Returns:
-        Formatted DataFrame with standardized columns
-    """
-    raw_actions_list = live_data_dict.get('game', {}).get('actions', [])
-
-    if not raw_actions_list:
-        return pd.DataFrame()
-
-    # Convert list of dictionaries to DataFrame
-    df = pd.DataFrame(raw_actions_list)
-
-    if df.empty:
-        return df
-
-    # Get team information for mapping team IDs to home/away
-    game_details_dict = live_data_dict.get('game', {})
-    home_team_id_live = game_details_dict.get('homeTeam', {}).get('teamId')
-    away_team_id_live = game_details_dict.get('awayTeam', {}).get('teamId')
-
-    # Add team information
-    if 'teamId' in df.columns:
-        df['team'] = df['teamId'].apply(
-            lambda x: "home" if x == home_team_id_live else
-                     "away" if x == away_team_id_live else "neutral"
-        )
-
-    # Format the clock column
-    if 'clock' in df.columns:
-        df['clock'] = df['clock'].apply(
-            lambda x: re.match(r"PT(\d+)M(\d+\.?\d*)S", str(x)).group(1) + ":" +
-                     re.match(r"PT(\d+)M(\d+\.?\d*)S", str(x)).group(2).split('.')[0].zfill(2)
-                     if re.match(r"PT(\d+)M(\d+\.?\d*)S", str(x)) else x
-        )
-
-    # Create a score column
-    if 'scoreHome' in df.columns and 'scoreAway' in df.columns:
-        df['score'] = df.apply(
-            lambda row: f"{row['scoreHome']}-{row['scoreAway']}"
-            if pd.notna(row['scoreHome']) and pd.notna(row['scoreAway']) else None,
-            axis=1
-        )
-
-    # Create a standardized event_type column
-    if 'actionType' in df.columns and 'subType' in df.columns:
-        df['event_type'] = df.apply(
-            lambda row: f"{str(row['actionType']).upper()}_{str(row['subType']).upper()}"
-            if pd.notna(row['actionType']) else "",
-            axis=1
-        )
-
-    return df
-
 # --- Play-by-Play Logic Functions ---
 
 def _fetch_historical_playbyplay_logic(
@@ -320,10 +250,14 @@ def _fetch_historical_playbyplay_logic(
     """
     logger.info(f"Executing _fetch_historical_playbyplay_logic (V3) for game ID: {game_id}, periods {start_period}-{end_period}, return_dataframe={return_dataframe}")
 
-    # Fetch data from the API
-    pbp_endpoint = playbyplayv3.PlayByPlayV3(
-        game_id=game_id, start_period=start_period, end_period=end_period, timeout=settings.DEFAULT_TIMEOUT_SECONDS
-    )
+    # Fetch data from the season warehouse (full games only) or the API
+    pbp_endpoint = None
+    if is_full_game_request(start_period, end_period):
+        pbp_endpoint = stored_endpoint(playbyplayv3.PlayByPlayV3, game_id)
+    if pbp_endpoint is None:
+        pbp_endpoint = playbyplayv3.PlayByPlayV3(
+            game_id=game_id, start_period=start_period, end_period=end_period, timeout=settings.DEFAULT_TIMEOUT_SECONDS
+        )
 
     # Get DataFrames
     pbp_df = pbp_endpoint.play_by_play.get_data_frame()  # V3 uses camelCase
@@ -342,10 +276,10 @@ def _fetch_historical_playbyplay_logic(
     if team_id or team_tricode:
         formatted_pbp_df = _filter_plays_by_team(formatted_pbp_df, team_id, team_tricode)
 
-    # Save to CSV if returning DataFrame
+    # Save to Parquet if returning DataFrame
     if return_dataframe:
         csv_path = _get_csv_path_for_playbyplay(game_id, "historical_v3", start_period, end_period)
-        _save_dataframe_to_csv(formatted_pbp_df, csv_path)
+        save_dataset(formatted_pbp_df, csv_path)
 
     # Process the DataFrame for JSON response
     processed_plays = _process_dataframe(pbp_df, single_row=False)
@@ -434,11 +368,15 @@ def _fetch_live_playbyplay_logic(
     person_id: int = None,
     team_id: int = None,
     team_tricode: str = None,
-    return_dataframe: bool = False
+    return_dataframe: bool = False,
+    since_action_number: int = 0
 ) -> Union[Dict[str, Any], Tuple[Dict[str, Any], Dict[str, pd.DataFrame]]]:
     """
     Fetches live play-by-play data.
 
+    Actions are merged into the incremental live store (api_tools/live_playbyplay_store.py),
+    which formats only actions it has not seen before.
+
     Args:
         game_id: The ID of the game.
         event_types: List of event types to filter by (e.g., ['SHOT', 'REBOUND', 'TURNOVER']).
@@ -447,11 +385,16 @@ def _fetch_live_playbyplay_logic(
         team_id: Filter plays by team ID.
         team_tricode: Filter plays by team tricode (e.g., 'LAL', 'BOS').
         return_dataframe: Whether to return DataFrames along with the JSON response.
+        since_action_number: Only return plays after this action number (a previous response's
+                             'cursor.next'). Defaults to 0 (all plays).
 
     Returns:
         If return_dataframe=False:
             Dict[str, Any]: A dictionary containing formatted live PBP data.
                             Includes 'periods' list and 'source'. 'has_video' is False for live.
+                            'cursor' ({'since', 'next'}) and 'state' (score, clock, players on court)
+                            are always included; with a cursor, 'corrections' and 'removed' list
+                            earlier plays the feed edited or dropped since.
         If return_dataframe=True:
             Tuple[Dict[str, Any], Dict[str, pd.DataFrame]]: A tuple containing the formatted live PBP data
                                                            and a dictionary of DataFrames.
@@ -460,83 +403,49 @@ def _fetch_live_playbyplay_logic(
         ValueError: If no live actions are found (game not live or recently concluded).
         Exception: For NBA API call failures or unexpected data structure.
     """
-    logger.info(f"Executing _fetch_live_playbyplay_logic for game ID: {game_id}, return_dataframe={return_dataframe}")
+    logger.info(f"Executing _fetch_live_playbyplay_logic for game ID: {game_id}, since={since_action_number}, return_dataframe={return_dataframe}")
 
-    # Fetch data from the API
-    live_pbp_endpoint = LivePlayByPlay(game_id=game_id)
-    live_data_dict = live_pbp_endpoint.get_dict()
+    # Use the background poller's play-by-play when fresh; otherwise fetch from the API
+    live_data_dict = get_live_snapshot(PLAYBYPLAY, game_id)
+    if live_data_dict is None:
+        live_pbp_endpoint = LivePlayByPlay(game_id=game_id)
+        live_data_dict = live_pbp_endpoint.get_dict()
     raw_actions_list = live_data_dict.get('game', {}).get('actions', [])
 
     if not raw_actions_list:
         logger.warning(f"No live actions found for game {game_id}. Game might not be live or recently concluded.")
         raise ValueError("No live actions found, game may not be live.")
 
-    # Convert to DataFrame and format
-    formatted_pbp_df = _format_live_pbp_dataframe(live_data_dict)
+    # Format only the actions the store has not seen
+    pbp_store = get_live_pbp_store()
+    pbp_store.update(game_id, live_data_dict)
+    changes = pbp_store.changes(game_id, since_action_number)
+    filters_requested = bool(event_types or player_name or person_id or team_id or team_tricode)
 
-    # Apply filters if provided
-    if event_types:
-        formatted_pbp_df = _filter_plays_by_event_type(formatted_pbp_df, event_types)
+    formatted_pbp_df = None
+    if filters_requested or return_dataframe:
+        # Filters work on the formatted DataFrame, built from the store's already formatted rows
+        formatted_pbp_df = pbp_store.frame(game_id, since_action_number)
 
-    if player_name or person_id:
-        formatted_pbp_df = _filter_plays_by_player(formatted_pbp_df, player_name, person_id)
+        if event_types:
+            formatted_pbp_df = _filter_plays_by_event_type(formatted_pbp_df, event_types)
 
-    if team_id or team_tricode:
-        formatted_pbp_df = _filter_plays_by_team(formatted_pbp_df, team_id, team_tricode)
+        if player_name or person_id:
+            formatted_pbp_df = _filter_plays_by_player(formatted_pbp_df, player_name, person_id)
+
+        if team_id or team_tricode:
+            formatted_pbp_df = _filter_plays_by_team(formatted_pbp_df, team_id, team_tricode)
 
-    # Save to CSV if returning DataFrame
+    # Save to Parquet if returning DataFrame
     if return_dataframe:
         csv_path = _get_csv_path_for_playbyplay(game_id, "live")
-        _save_dataframe_to_csv(formatted_pbp_df, csv_path)
-
-    # Process for JSON response
-    periods_data = {}
-    game_details_dict = live_data_dict.get('game', {})
-    home_team_id_live = game_details_dict.get('homeTeam', {}).get('teamId')
-    away_team_id_live = game_details_dict.get('awayTeam', {}).get('teamId')
-
-    # Use the filtered DataFrame if filters were applied
-    actions_to_process = formatted_pbp_df.to_dict('records') if not formatted_pbp_df.empty else raw_actions_list
-
-    for action_item in actions_to_process:
-        period_num = action_item.get("period", 0)
-        if period_num not in periods_data:
-            periods_data[period_num] = []
+        save_dataset(formatted_pbp_df, csv_path)
 
-        # Format clock string
-        clock_raw_str = action_item.get("clock", "")
-        match_obj = re.match(r"PT(\d+)M(\d+\.?\d*)S", str(clock_raw_str))
-        clock_formatted_str = f"{match_obj.group(1)}:{match_obj.group(2).split('.')[0].zfill(2)}" if match_obj else clock_raw_str
-
-        # Format score string
-        score_home = action_item.get('scoreHome')
-        score_away = action_item.get('scoreAway')
-        score_str_live = f"{score_home}-{score_away}" if score_home is not None and score_away is not None else None
-
-        # Determine team (home/away/neutral)
-        action_team_id_live = action_item.get('teamId')
-        team_str_live = "home" if action_team_id_live == home_team_id_live else "away" if action_team_id_live == away_team_id_live else "neutral"
-
-        # Create formatted play dictionary
-        formatted_play = {
-            "event_num": action_item.get("actionNumber"),
-            "clock": clock_formatted_str,
-            "score": score_str_live,
-            "team": team_str_live,  # home, away, or neutral
-            "team_tricode": action_item.get("teamTricode"),
-            "description": action_item.get("description"),
-            "person_id": action_item.get("personId"),
-            "player_name": action_item.get("playerNameI") or action_item.get("playerName"),  # Prefer playerNameI if available
-            "action_type": action_item.get("actionType"),
-            "sub_type": action_item.get("subType"),
-            "event_type": f"{str(action_item.get('actionType', '')).upper()}_{str(action_item.get('subType', '')).upper()}"
-        }
-
-        # Add to the appropriate period
-        periods_data[period_num].append(formatted_play)
-
-    # Create the final periods list
-    periods_list_final = [{"period": p_num, "plays": plays_list} for p_num, plays_list in sorted(periods_data.items())]
+    if filters_requested:
+        numbers = formatted_pbp_df['actionNumber'].tolist() if not formatted_pbp_df.empty else []
+        periods_list_final = pbp_store.periods(game_id, numbers)
+    else:
+        periods_list_final = changes["periods"]
 
     # Create the result dictionary
     result_dict = {
@@ -544,8 +453,13 @@ def _fetch_live_playbyplay_logic(
         "has_video": False,
         "source": "live",
         "filtered_periods": None,
-        "periods": periods_list_final
+        "periods": periods_list_final,
+        "cursor": changes["cursor"],
+        "state": changes["state"]
     }
+    for key in ("corrections", "removed"):
+        if key in changes:
+            result_dict[key] = changes[key]
 
     # Add filter information if any filters were applied
     filters_applied = {}
@@ -572,6 +486,17 @@ def _fetch_live_playbyplay_logic(
 
     return result_dict
 
+def _drop_plays_through(result_dict: Dict[str, Any], since_action_number: int) -> None:
+    """Removes plays with event numbers up to `since_action_number` (and emptied periods) from a result."""
+    if not since_action_number:
+        return
+    periods = []
+    for period in result_dict.get("periods", []):
+        plays = [play for play in period["plays"] if (play.get("event_num") or 0) > since_action_number]
+        if plays:
+            periods.append({**period, "plays": plays})
+    result_dict["periods"] = periods
+
 # --- Main Public Function ---
 def fetch_playbyplay_logic(
     game_id: str,
@@ -582,7 +507,8 @@ def fetch_playbyplay_logic(
     person_id: int = None,
     team_id: int = None,
     team_tricode: str = None,
-    return_dataframe: bool = False
+    return_dataframe: bool = False,
+    since_action_number: int = 0
 ) -> Union[str, Tuple[str, Dict[str, pd.DataFrame]]]:
     """
     Fetches play-by-play data for a game. Attempts live data first if no period filters
@@ -602,6 +528,9 @@ def fetch_playbyplay_logic(
         team_id: Filter plays by team ID.
         team_tricode: Filter plays by team tricode (e.g., 'LAL', 'BOS').
         return_dataframe: Whether to return DataFrames along with the JSON response.
+        since_action_number: Only return plays after this action number. For live games, pass the
+                             previous response's 'cursor.next' to get just the new plays (and any
+                             'corrections'). Defaults to 0 (all plays).
 
     Returns:
         If return_dataframe=False:
@@ -647,6 +576,7 @@ def fetch_playbyplay_logic(
             # Handle the result based on return_dataframe
             if return_dataframe:
                 result_dict, dataframes = result
+                _drop_plays_through(result_dict, since_action_number)
                 result_dict["parameters"] = {
                     "start_period": start_period,
                     "end_period": end_period,
@@ -656,6 +586,7 @@ def fetch_playbyplay_logic(
                 return json_response, dataframes
             else:
                 result_dict = result
+                _drop_plays_through(result_dict, since_action_number)
                 result_dict["parameters"] = {
                     "start_period": start_period,
                     "end_period": end_period,
@@ -684,7 +615,8 @@ def fetch_playbyplay_logic(
                 person_id,
                 team_id,
                 team_tricode,
-                return_dataframe
+                return_dataframe,
+                since_action_number
             )
 
             # Handle the result based on return_dataframe
@@ -725,6 +657,7 @@ def fetch_playbyplay_logic(
                 # Handle the result based on return_dataframe
                 if return_dataframe:
                     result_dict, dataframes = result
+                    _drop_plays_through(result_dict, since_action_number)
                     result_dict["parameters"] = {
                         "start_period": 0,
                         "end_period": 0,
@@ -734,6 +667,7 @@ def fetch_playbyplay_logic(
                     return json_response, dataframes
                 else:
                     result_dict = result
+                    _drop_plays_through(result_dict, since_action_number)
                     result_dict["parameters"] = {
                         "start_period": 0,
                         "end_period": 0,
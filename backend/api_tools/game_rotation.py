@@ -1,7 +1,7 @@
 """
 Handles fetching and processing game rotation data
 from the GameRotation endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 The GameRotation endpoint provides comprehensive game rotation data (12 columns):
 - Game info: GAME_ID (1 column)
@@ -16,29 +16,14 @@ import logging
 import os
 import json
 from typing import Optional, Dict, Any, Set, Union, Tuple
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import gamerotation
 import pandas as pd
 
 from utils.path_utils import get_cache_dir, get_cache_file_path
-
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from utils.season_warehouse import stored_endpoint
+from api_tools.utils import format_response, _process_dataframe
 
 def _validate_game_id(game_id):
     """Validate game ID format."""
@@ -67,27 +52,7 @@ GAME_ROTATION_CSV_DIR = get_cache_dir("game_rotation")
 # Ensure cache directories exist
 os.makedirs(GAME_ROTATION_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-    
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        # Save DataFrame to CSV with UTF-8 encoding
-        df.to_csv(file_path, index=False, encoding='utf-8')
-        
-        # Log the file size and path
-        file_size = os.path.getsize(file_path)
-        logger.info(f"Saved DataFrame to CSV: {file_path} (Size: {file_size} bytes)")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_game_rotation(
     game_id: str,
@@ -103,9 +68,9 @@ def _get_csv_path_for_game_rotation(
         data_set_name: Name of the data set
         
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
-    filename = f"game_rotation_game{game_id}_league{league_id}_{data_set_name}.csv"
+    filename = f"game_rotation_game{game_id}_league{league_id}_{data_set_name}.parquet"
     return get_cache_file_path(filename, "game_rotation")
 
 # --- Parameter Validation ---
@@ -123,7 +88,7 @@ def _validate_game_rotation_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=GAME_ROTATION_CACHE_SIZE)
+@cached_logic(maxsize=GAME_ROTATION_CACHE_SIZE)
 def fetch_game_rotation_logic(
     game_id: str,
     league_id: str = "00",
@@ -132,7 +97,7 @@ def fetch_game_rotation_logic(
     """
     Fetches game rotation data using the GameRotation endpoint.
     
-    Provides DataFrame output capabilities and CSV caching.
+    Provides DataFrame output capabilities and Parquet caching.
     
     Args:
         game_id: Game ID (required)
@@ -160,7 +125,7 @@ def fetch_game_rotation_logic(
             return error_response, {}
         return error_response
     
-    # Check for cached CSV files
+    # Check for cached Parquet files
     dataframes = {}
     
     # Try to load from cache first
@@ -173,19 +138,14 @@ def fetch_game_rotation_logic(
             csv_path = _get_csv_path_for_game_rotation(game_id, league_id, data_set_name)
             if os.path.exists(csv_path):
                 try:
-                    # Check if the file is empty or too small
-                    file_size = os.path.getsize(csv_path)
-                    if file_size < 100:  # If file is too small, it's probably empty or corrupted
-                        logger.warning(f"CSV file is too small ({file_size} bytes), fetching from API instead")
-                        all_cached = False
-                        break
+                    df = load_dataset(csv_path)
+                    if df is None:
+                        logger.warning(f"Cached dataset missing or unreadable, fetching from API instead: {csv_path}")
                     else:
-                        logger.info(f"Loading game rotation from CSV: {csv_path}")
-                        # Read CSV with appropriate data types
-                        df = pd.read_csv(csv_path, encoding='utf-8')
+                        logger.info(f"Loading game rotation from dataset cache: {csv_path}")
                         dataframes[data_set_name] = df
                 except Exception as e:
-                    logger.error(f"Error loading CSV: {e}", exc_info=True)
+                    logger.error(f"Error loading Parquet: {e}", exc_info=True)
                     all_cached = False
                     break
             else:
@@ -216,7 +176,11 @@ def fetch_game_rotation_logic(
         }
         
         logger.debug(f"Calling GameRotation with parameters: {api_params}")
-        game_rotation_endpoint = gamerotation.GameRotation(**api_params)
+        game_rotation_endpoint = None
+        if league_id == "00":  # The season warehouse holds NBA games
+            game_rotation_endpoint = stored_endpoint(gamerotation.GameRotation, game_id)
+        if game_rotation_endpoint is None:
+            game_rotation_endpoint = gamerotation.GameRotation(**api_params)
         
         # Get data frames
         list_of_dataframes = game_rotation_endpoint.get_data_frames()
@@ -239,9 +203,9 @@ def fetch_game_rotation_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
                     
-                    # Save DataFrame to CSV
+                    # Save DataFrame to the dataset cache
                     csv_path = _get_csv_path_for_game_rotation(game_id, league_id, data_set_name)
-                    _save_dataframe_to_csv(df, csv_path)
+                    save_dataset(df, csv_path)
                 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
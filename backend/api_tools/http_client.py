@@ -1,12 +1,20 @@
 from nba_api.stats.static import players
 from nba_api.stats import endpoints
 import requests
+from urllib.parse import urlparse
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+import json
 import logging
+import functools
+from nba_api.library.http import NBAHTTP
 from nba_api.stats.library.http import NBAStatsHTTP
+from nba_api.live.nba.library.http import NBALiveHTTP
 from config import settings
-from typing import Optional
+from utils.single_flight import SingleFlight
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+from utils import deadline
+from typing import Optional, Dict, Any
 
 logger = logging.getLogger(__name__)
 
@@ -16,24 +24,67 @@ DEFAULT_BACKOFF_FACTOR = 1
 RETRY_STATUS_CODES = [500, 502, 503, 504]
 DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 
-def configure_nba_api_client(timeout: Optional[int] = None):
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that admits each outbound request through the global rate limiter for its host.
+
+    Within a call deadline (utils/deadline.py, set per agent tool call) requests are not started
+    once the deadline has passed and their socket timeouts are capped at the time left.
+    """
+
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, *args, **kwargs):
+        if self.rate_limiter is None:
+            return self._send_within_deadline(request, *args, **kwargs)
+        host = urlparse(request.url).hostname or ""
+        with self.rate_limiter.slot(host):
+            return self._send_within_deadline(request, *args, **kwargs)
+
+    def _send_within_deadline(self, request, *args, **kwargs):
+        if deadline.remaining() is None:
+            return super().send(request, *args, **kwargs)
+        try:
+            deadline.check(f"request to {urlparse(request.url).hostname}")
+        except deadline.DeadlineExceeded as e:
+            raise requests.exceptions.Timeout(str(e), request=request) from e
+        kwargs["timeout"] = deadline.cap_timeout(kwargs.get("timeout"))
+        return super().send(request, *args, **kwargs)
+
+def configure_nba_api_client(timeout: Optional[int] = None, rate_limiter: Optional[RateLimiter] = None):
     """Configure the NBA API client with custom settings for better reliability.
 
+    The configured session is installed as nba_api's shared session, so every stats and live
+    endpoint goes through the retry policy and the per-host rate limiter.
+
     Args:
         timeout (Optional[int]): Timeout in seconds for API requests. Defaults to settings.DEFAULT_TIMEOUT_SECONDS.
+        rate_limiter (Optional[RateLimiter]): Limiter governing outbound requests. Defaults to the
+            process-wide limiter when settings.NBA_API_RATE_LIMIT_ENABLED is set.
     """
     try:
         session = requests.Session()
+        # Connection errors and read timeouts are left to api_tools.utils.retry_on_timeout so the
+        # two retry layers do not stack while holding a rate-limiter slot.
         retries = Retry(
             total=DEFAULT_MAX_RETRIES,
+            connect=0,
+            read=0,
             backoff_factor=DEFAULT_BACKOFF_FACTOR,
             status_forcelist=RETRY_STATUS_CODES,
         )
 
-        # Mount the retry adapter to both HTTP and HTTPS requests
-        adapter = HTTPAdapter(max_retries=retries)
+        if rate_limiter is None and settings.NBA_API_RATE_LIMIT_ENABLED:
+            rate_limiter = get_rate_limiter()
+
+        # Mount the rate-limited retry adapter to both HTTP and HTTPS requests
+        adapter = RateLimitedAdapter(rate_limiter=rate_limiter, max_retries=retries)
         session.mount('http://', adapter)
         session.mount('https://', adapter)
+        for client_class in (NBAHTTP, NBAStatsHTTP, NBALiveHTTP):
+            client_class.set_session(session)
 
         # Create NBA stats client
         nba_session = NBAStatsHTTP()
@@ -52,9 +103,43 @@ def configure_nba_api_client(timeout: Optional[int] = None):
         logger.error(f"Failed to configure NBA API client: {str(e)}")
         raise
 
+# --- Request Coalescing ---
+upstream_flight = SingleFlight("nba_api")
+
+def _request_key(client: NBAHTTP, endpoint: str, parameters: Dict[str, Any]) -> str:
+    """Identifies an upstream request by client class, endpoint and sorted parameters."""
+    normalized = json.dumps(
+        {str(k): ("" if v is None else str(v)) for k, v in (parameters or {}).items()},
+        sort_keys=True,
+    )
+    return f"{type(client).__name__}:{str(endpoint).lower()}:{normalized}"
+
+def install_request_coalescing() -> None:
+    """
+    Wraps nba_api's shared `NBAHTTP.send_api_request` (used by every stats and live endpoint
+    constructor) so concurrent identical requests wait on a single upstream fetch and share its response.
+    Safe to call more than once.
+    """
+    if not settings.NBA_API_REQUEST_COALESCING_ENABLED:
+        return
+    original = NBAHTTP.send_api_request
+    if getattr(original, "_coalesced", False):
+        return
+
+    @functools.wraps(original)
+    def send_api_request(self, endpoint, parameters, *args, **kwargs):
+        key = _request_key(self, endpoint, parameters)
+        return upstream_flight.do(key, lambda: original(self, endpoint, parameters, *args, **kwargs))
+
+    send_api_request._coalesced = True
+    NBAHTTP.send_api_request = send_api_request
+    logger.info("nba_api request coalescing installed")
+
 # Configure the NBA API client
 nba_session = configure_nba_api_client()
 
 # Patch the NBA API's internal requests session
 players.requests = nba_session
-endpoints.requests = nba_session
\ No newline at end of file
+endpoints.requests = nba_session
+
+install_request_coalescing()
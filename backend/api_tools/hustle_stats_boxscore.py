@@ -1,7 +1,7 @@
 """
 Handles fetching and processing hustle stats box score data
 from the HustleStatsBoxScore endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 The HustleStatsBoxScore endpoint provides comprehensive hustle stats data (3 DataFrames):
 - Game Status: Game ID and hustle status (2 columns)
@@ -14,29 +14,14 @@ import logging
 import os
 import json
 from typing import Optional, Dict, Any, Union, Tuple
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import hustlestatsboxscore
 import pandas as pd
 
 from utils.path_utils import get_cache_dir, get_cache_file_path
-
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from utils.season_warehouse import stored_endpoint
+from api_tools.utils import format_response, _process_dataframe
 
 def _validate_game_id(game_id):
     """Validate game ID format."""
@@ -62,27 +47,7 @@ HUSTLE_STATS_CSV_DIR = get_cache_dir("hustle_stats")
 # Ensure cache directories exist
 os.makedirs(HUSTLE_STATS_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-    
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        # Save DataFrame to CSV with UTF-8 encoding
-        df.to_csv(file_path, index=False, encoding='utf-8')
-        
-        # Log the file size and path
-        file_size = os.path.getsize(file_path)
-        logger.info(f"Saved DataFrame to CSV: {file_path} (Size: {file_size} bytes)")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_hustle_stats(
     game_id: str,
@@ -96,9 +61,9 @@ def _get_csv_path_for_hustle_stats(
         data_set_name: Name of the data set
         
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
-    filename = f"hustle_stats_game{game_id}_{data_set_name}.csv"
+    filename = f"hustle_stats_game{game_id}_{data_set_name}.parquet"
     return get_cache_file_path(filename, "hustle_stats")
 
 # --- Parameter Validation ---
@@ -111,7 +76,7 @@ def _validate_hustle_stats_params(game_id: str) -> Optional[str]:
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=HUSTLE_STATS_CACHE_SIZE)
+@cached_logic(maxsize=HUSTLE_STATS_CACHE_SIZE)
 def fetch_hustle_stats_logic(
     game_id: str,
     return_dataframe: bool = False
@@ -119,7 +84,7 @@ def fetch_hustle_stats_logic(
     """
     Fetches hustle stats box score data using the HustleStatsBoxScore endpoint.
     
-    Provides DataFrame output capabilities and CSV caching.
+    Provides DataFrame output capabilities and Parquet caching.
     
     Args:
         game_id: Game ID (required)
@@ -146,7 +111,7 @@ def fetch_hustle_stats_logic(
             return error_response, {}
         return error_response
     
-    # Check for cached CSV files
+    # Check for cached Parquet files
     dataframes = {}
     
     # Try to load from cache first
@@ -159,19 +124,14 @@ def fetch_hustle_stats_logic(
             csv_path = _get_csv_path_for_hustle_stats(game_id, data_set_name)
             if os.path.exists(csv_path):
                 try:
-                    # Check if the file is empty or too small
-                    file_size = os.path.getsize(csv_path)
-                    if file_size < 50:  # If file is too small, it's probably empty or corrupted
-                        logger.warning(f"CSV file is too small ({file_size} bytes), fetching from API instead")
-                        all_cached = False
-                        break
+                    df = load_dataset(csv_path)
+                    if df is None:
+                        logger.warning(f"Cached dataset missing or unreadable, fetching from API instead: {csv_path}")
                     else:
-                        logger.info(f"Loading hustle stats from CSV: {csv_path}")
-                        # Read CSV with appropriate data types
-                        df = pd.read_csv(csv_path, encoding='utf-8')
+                        logger.info(f"Loading hustle stats from dataset cache: {csv_path}")
                         dataframes[data_set_name] = df
                 except Exception as e:
-                    logger.error(f"Error loading CSV: {e}", exc_info=True)
+                    logger.error(f"Error loading Parquet: {e}", exc_info=True)
                     all_cached = False
                     break
             else:
@@ -200,7 +160,10 @@ def fetch_hustle_stats_logic(
         }
         
         logger.debug(f"Calling HustleStatsBoxScore with parameters: {api_params}")
-        hustle_stats_endpoint = hustlestatsboxscore.HustleStatsBoxScore(**api_params)
+        hustle_stats_endpoint = (
+            stored_endpoint(hustlestatsboxscore.HustleStatsBoxScore, game_id)
+            or hustlestatsboxscore.HustleStatsBoxScore(**api_params)
+        )
         
         # Get data frames
         list_of_dataframes = hustle_stats_endpoint.get_data_frames()
@@ -223,9 +186,9 @@ def fetch_hustle_stats_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
                     
-                    # Save DataFrame to CSV
+                    # Save DataFrame to the dataset cache
                     csv_path = _get_csv_path_for_hustle_stats(game_id, data_set_name)
-                    _save_dataframe_to_csv(df, csv_path)
+                    save_dataset(df, csv_path)
                 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
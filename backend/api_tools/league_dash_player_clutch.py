@@ -1,6 +1,6 @@
 """
 Handles fetching player clutch statistics.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the LeagueDashPlayerClutch endpoint, which provides
 detailed player statistics in clutch situations:
@@ -12,7 +12,7 @@ import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import leaguedashplayerclutch
@@ -27,6 +27,7 @@ from api_tools.utils import (
     format_response
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -111,23 +112,6 @@ VALID_LEAGUE_IDS = {
 }
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_player_clutch(
     season: str,
@@ -142,7 +126,7 @@ def _get_csv_path_for_player_clutch(
     player_experience: Optional[str] = None
 ) -> str:
     """
-    Generates a file path for saving a player clutch DataFrame as CSV.
+    Generates a file path for saving a player clutch DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -157,7 +141,7 @@ def _get_csv_path_for_player_clutch(
         player_experience: Optional player experience filter
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_")
@@ -184,7 +168,7 @@ def _get_csv_path_for_player_clutch(
         exp_clean = player_experience.lower()
         filename_parts.append(f"exp_{exp_clean}")
 
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
 
     return get_cache_file_path(filename, "league_dash_player_clutch")
 
@@ -284,7 +268,7 @@ def _validate_player_clutch_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=LEAGUE_DASH_PLAYER_CLUTCH_CACHE_SIZE)
+@cached_logic(maxsize=LEAGUE_DASH_PLAYER_CLUTCH_CACHE_SIZE)
 def fetch_league_player_clutch_stats_logic(
     season: str = settings.CURRENT_NBA_SEASON,
     season_type: str = "Regular Season",
@@ -426,13 +410,13 @@ def fetch_league_player_clutch_stats_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
 
-                    # Save to CSV if not empty
+                    # Save to Parquet if not empty
                     if not df.empty:
                         csv_path = _get_csv_path_for_player_clutch(
                             season, season_type, per_mode, measure_type, clutch_time, ahead_behind, point_diff,
                             team_id, player_position, player_experience
                         )
-                        _save_dataframe_to_csv(df, csv_path)
+                        save_dataset(df, csv_path)
 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
@@ -1,6 +1,6 @@
 """
 Handles fetching player shooting statistics across the league.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the LeagueDashPlayerPtShot endpoint, which provides
 comprehensive shooting statistics for players across the league.
@@ -22,6 +22,8 @@ from api_tools.utils import (
     format_response
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
+from utils.cache import cached_logic
 from utils.validation import _validate_season_format, validate_date_format
 
 logger = logging.getLogger(__name__)
@@ -41,23 +43,6 @@ _VALID_LEAGUE_IDS: Set[str] = {getattr(LeagueID, attr) for attr in dir(LeagueID)
                              if not attr.startswith('_') and isinstance(getattr(LeagueID, attr), str)}
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_player_pt_shot(
     season: str,
@@ -70,7 +55,7 @@ def _get_csv_path_for_player_pt_shot(
     division_nullable: Optional[str] = None
 ) -> str:
     """
-    Generates a file path for saving a league player shot DataFrame as CSV.
+    Generates a file path for saving a league player shot DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -83,7 +68,7 @@ def _get_csv_path_for_player_pt_shot(
         division_nullable: Optional division filter
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_")
@@ -110,11 +95,12 @@ def _get_csv_path_for_player_pt_shot(
         division_clean = division_nullable.replace(" ", "_").lower()
         filename_parts.append(f"div_{division_clean}")
 
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
 
     return get_cache_file_path(filename, "league_dash_player_pt_shot")
 
 # --- Main Logic Function ---
+@cached_logic()
 def fetch_league_dash_player_pt_shot_logic(
     season: str = settings.CURRENT_NBA_SEASON,
     season_type: str = SeasonTypeAllStar.regular,
@@ -336,13 +322,13 @@ def fetch_league_dash_player_pt_shot_logic(
         if return_dataframe:
             dataframes["LeagueDashPTShots"] = player_pt_shot_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not player_pt_shot_df.empty:
                 csv_path = _get_csv_path_for_player_pt_shot(
                     season, season_type, per_mode, league_id,
                     team_id_nullable, player_position_nullable, conference_nullable, division_nullable
                 )
-                _save_dataframe_to_csv(player_pt_shot_df, csv_path)
+                save_dataset(player_pt_shot_df, csv_path)
 
         # Process for JSON response
         processed_data = _process_dataframe(player_pt_shot_df, single_row=False)
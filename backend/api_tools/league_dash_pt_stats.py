@@ -1,6 +1,6 @@
 """
 Handles fetching player tracking statistics across the league.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the LeagueDashPtStats endpoint, which provides
 comprehensive player tracking statistics for players or teams across the league.
@@ -39,6 +39,8 @@ from api_tools.utils import (
     format_response
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
+from utils.cache import cached_logic
 from utils.validation import _validate_season_format, validate_date_format
 
 logger = logging.getLogger(__name__)
@@ -61,23 +63,6 @@ _VALID_PT_MEASURE_TYPES: Set[str] = {getattr(PtMeasureType, attr) for attr in di
                                    if not attr.startswith('_') and isinstance(getattr(PtMeasureType, attr), str)}
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_pt_stats(
     season: str,
@@ -91,7 +76,7 @@ def _get_csv_path_for_pt_stats(
     division_simple_nullable: Optional[str] = None
 ) -> str:
     """
-    Generates a file path for saving a league player tracking stats DataFrame as CSV.
+    Generates a file path for saving a league player tracking stats DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -105,7 +90,7 @@ def _get_csv_path_for_pt_stats(
         division_simple_nullable: Optional division filter
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_")
@@ -134,11 +119,12 @@ def _get_csv_path_for_pt_stats(
         division_clean = division_simple_nullable.replace(" ", "_").lower()
         filename_parts.append(f"div_{division_clean}")
 
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
 
     return get_cache_file_path(filename, "league_dash_pt_stats")
 
 # --- Main Logic Function ---
+@cached_logic()
 def fetch_league_dash_pt_stats_logic(
     season: str = settings.CURRENT_NBA_SEASON,
     season_type: str = SeasonTypeAllStar.regular,
@@ -368,14 +354,14 @@ def fetch_league_dash_pt_stats_logic(
         if return_dataframe:
             dataframes["LeagueDashPtStats"] = pt_stats_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not pt_stats_df.empty:
                 csv_path = _get_csv_path_for_pt_stats(
                     season, season_type, per_mode, player_or_team, pt_measure_type,
                     team_id_nullable, player_position_abbreviation_nullable,
                     conference_nullable, division_simple_nullable
                 )
-                _save_dataframe_to_csv(pt_stats_df, csv_path)
+                save_dataset(pt_stats_df, csv_path)
 
         # Process for JSON response
         processed_data = _process_dataframe(pt_stats_df, single_row=False)
@@ -1,6 +1,6 @@
 """
 Handles fetching team shot location statistics across the league.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the LeagueDashTeamShotLocations endpoint, which provides
 comprehensive shot location statistics for teams across the league:
@@ -16,7 +16,7 @@ import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List, Set
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import leaguedashteamshotlocations
@@ -30,6 +30,7 @@ from api_tools.utils import (
     format_response
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
 from utils.validation import _validate_season_format, validate_date_format
 
 logger = logging.getLogger(__name__)
@@ -52,23 +53,6 @@ _VALID_DISTANCE_RANGES: Set[str] = {getattr(DistanceRange, attr) for attr in dir
                                   if not attr.startswith('_') and isinstance(getattr(DistanceRange, attr), str)}
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_team_shot_locations(
     season: str,
@@ -80,7 +64,7 @@ def _get_csv_path_for_team_shot_locations(
     division: Optional[str] = None
 ) -> str:
     """
-    Generates a file path for saving a league team shot locations DataFrame as CSV.
+    Generates a file path for saving a league team shot locations DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -92,7 +76,7 @@ def _get_csv_path_for_team_shot_locations(
         division: Optional division filter
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_")
@@ -114,11 +98,12 @@ def _get_csv_path_for_team_shot_locations(
         division_clean = division.replace(" ", "_").lower()
         filename_parts.append(f"div_{division_clean}")
 
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
 
     return get_cache_file_path(filename, "league_dash_team_shot_locations")
 
 # --- Main Logic Function ---
+@cached_logic()
 def fetch_league_team_shot_locations_logic(
     season: str = settings.CURRENT_NBA_SEASON,
     season_type: str = SeasonTypeAllStar.regular,
@@ -325,13 +310,13 @@ def fetch_league_team_shot_locations_logic(
         if return_dataframe:
             dataframes["ShotLocations"] = shot_locations_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not shot_locations_df.empty:
                 csv_path = _get_csv_path_for_team_shot_locations(
                     season, season_type, per_mode, measure_type, distance_range,
                     conference_nullable, division_nullable
                 )
-                _save_dataframe_to_csv(shot_locations_df, csv_path)
+                save_dataset(shot_locations_df, csv_path)
 
         # The shot locations DataFrame has multi-level columns which need special handling
         # First, flatten the column names to make them JSON serializable
@@ -1,6 +1,6 @@
 """
 Handles fetching league team statistics.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the LeagueDashTeamStats endpoint, which provides
 comprehensive team statistics across the league:
@@ -13,7 +13,7 @@ import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import leaguedashteamstats
@@ -27,6 +27,7 @@ from api_tools.utils import (
     format_response
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -105,23 +106,6 @@ VALID_DIVISIONS = {
 }
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_league_team_stats(
     season: str,
@@ -132,7 +116,7 @@ def _get_csv_path_for_league_team_stats(
     division: Optional[str] = None
 ) -> str:
     """
-    Generates a file path for saving a league team stats DataFrame as CSV.
+    Generates a file path for saving a league team stats DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -143,7 +127,7 @@ def _get_csv_path_for_league_team_stats(
         division: Optional division filter
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_")
@@ -164,7 +148,7 @@ def _get_csv_path_for_league_team_stats(
         division_clean = division.replace(" ", "_").lower()
         filename_parts.append(f"div_{division_clean}")
 
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
 
     return get_cache_file_path(filename, "league_dash_team_stats")
 
@@ -251,7 +235,7 @@ def _validate_league_team_stats_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=LEAGUE_DASH_TEAM_STATS_CACHE_SIZE)
+@cached_logic(maxsize=LEAGUE_DASH_TEAM_STATS_CACHE_SIZE)
 def fetch_league_team_stats_logic(
     season: str = settings.CURRENT_NBA_SEASON,
     season_type: str = "Regular Season",
@@ -463,12 +447,12 @@ def fetch_league_team_stats_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
 
-                    # Save to CSV if not empty
+                    # Save to Parquet if not empty
                     if not df.empty:
                         csv_path = _get_csv_path_for_league_team_stats(
                             season, season_type, per_mode, measure_type, conference, division
                         )
-                        _save_dataframe_to_csv(df, csv_path)
+                        save_dataset(df, csv_path)
 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
@@ -1,21 +1,21 @@
 """
 Handles fetching NBA draft history data using the drafthistory endpoint.
 Allows filtering by various parameters like season year, league, team, round, and pick.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json # Not explicitly used, but format_response returns JSON string. Good to keep for context.
 from typing import Optional, Dict, Any, List, Set, Union, Tuple
 import pandas as pd
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import drafthistory
 from nba_api.stats.library.parameters import LeagueID
 from api_tools.utils import _process_dataframe, format_response
 from config import settings
 from core.errors import Errors
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -27,20 +27,7 @@ _VALID_DRAFT_LEAGUE_IDS: Set[str] = {getattr(LeagueID, attr) for attr in dir(Lea
 # --- Cache Directory Setup ---
 DRAFT_HISTORY_CSV_DIR = get_cache_dir("draft_history")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_draft_history(
     season_year_nullable: Optional[str] = None,
@@ -50,7 +37,7 @@ def _get_csv_path_for_draft_history(
     overall_pick_nullable: Optional[int] = None
 ) -> str:
     """
-    Generates a file path for saving draft history DataFrame as CSV.
+    Generates a file path for saving draft history DataFrame as Parquet.
 
     Args:
         season_year_nullable: Four-digit draft year (e.g., '2023')
@@ -60,7 +47,7 @@ def _get_csv_path_for_draft_history(
         overall_pick_nullable: Overall pick number to filter by pick
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Create a string with the parameters
     params = []
@@ -83,11 +70,12 @@ def _get_csv_path_for_draft_history(
         params.append(f"pick_{overall_pick_nullable}")
 
     # Join parameters with underscores
-    filename = "_".join(params) + ".csv"
+    filename = "_".join(params) + ".parquet"
 
     return get_cache_file_path(filename, "draft_history")
 
 # --- Logic Function ---
+@cached_logic()
 def fetch_draft_history_logic(
     season_year_nullable: Optional[str] = None,
     league_id_nullable: str = LeagueID.nba,
@@ -157,7 +145,7 @@ def fetch_draft_history_logic(
         if return_dataframe:
             dataframes["draft_history"] = draft_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not draft_df.empty:
                 csv_path = _get_csv_path_for_draft_history(
                     season_year_nullable=season_year_nullable,
@@ -166,7 +154,7 @@ def fetch_draft_history_logic(
                     round_num_nullable=round_num_nullable,
                     overall_pick_nullable=overall_pick_nullable
                 )
-                _save_dataframe_to_csv(draft_df, csv_path)
+                save_dataset(draft_df, csv_path)
 
         draft_list = _process_dataframe(draft_df, single_row=False)
 
@@ -212,7 +200,7 @@ def fetch_draft_history_logic(
             )
 
             result["dataframe_info"] = {
-                "message": "Draft history data has been converted to DataFrame and saved as CSV file",
+                "message": "Draft history data has been converted to DataFrame and saved as Parquet file",
                 "dataframes": {
                     "draft_history": {
                         "shape": list(draft_df.shape) if not draft_df.empty else [],
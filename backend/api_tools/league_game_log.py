@@ -1,6 +1,6 @@
 """
 Handles fetching game logs for the entire league.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the LeagueGameLog endpoint, which provides
 comprehensive game-by-game statistics for all teams or players across the league.
@@ -22,6 +22,8 @@ from api_tools.utils import (
     format_response
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
+from utils.cache import cached_logic
 from utils.validation import _validate_season_format, validate_date_format
 
 logger = logging.getLogger(__name__)
@@ -47,23 +49,6 @@ _VALID_SORTERS: Set[str] = {getattr(Sorter, attr) for attr in dir(Sorter)
                           if not attr.startswith('_') and isinstance(getattr(Sorter, attr), str)}
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_game_log(
     season: str,
@@ -74,7 +59,7 @@ def _get_csv_path_for_game_log(
     date_to_nullable: Optional[str] = None
 ) -> str:
     """
-    Generates a file path for saving a league game log DataFrame as CSV.
+    Generates a file path for saving a league game log DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -85,7 +70,7 @@ def _get_csv_path_for_game_log(
         date_to_nullable: Optional end date filter
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_")
@@ -105,11 +90,12 @@ def _get_csv_path_for_game_log(
         date_to_clean = date_to_nullable.replace("-", "")
         filename_parts.append(f"to_{date_to_clean}")
 
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
 
     return get_cache_file_path(filename, "league_game_log")
 
 # --- Main Logic Function ---
+@cached_logic()
 def fetch_league_game_log_logic(
     season: str = settings.CURRENT_NBA_SEASON,
     season_type: str = SeasonTypeAllStar.regular,
@@ -247,13 +233,13 @@ def fetch_league_game_log_logic(
         if return_dataframe:
             dataframes["LeagueGameLog"] = game_log_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not game_log_df.empty:
                 csv_path = _get_csv_path_for_game_log(
                     season, season_type, player_or_team, league_id,
                     date_from_nullable, date_to_nullable
                 )
-                _save_dataframe_to_csv(game_log_df, csv_path)
+                save_dataset(game_log_df, csv_path)
 
         # Process for JSON response
         processed_data = _process_dataframe(game_log_df, single_row=False)
@@ -1,7 +1,7 @@
 """
 Handles fetching and processing league hustle stats team data
 from the LeagueHustleStatsTeam endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 The LeagueHustleStatsTeam endpoint provides comprehensive team hustle stats data (1 DataFrame):
 - Team Info: TEAM_ID, TEAM_NAME, MIN (3 columns)
@@ -17,41 +17,14 @@ import logging
 import os
 import json
 from typing import Optional, Dict, Any, Set, Union, Tuple
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import leaguehustlestatsteam
 from nba_api.stats.library.parameters import SeasonTypeAllStar, PerModeTime
 import pandas as pd
 
 from utils.path_utils import get_cache_dir, get_cache_file_path
-
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    # Handle multi-level columns by flattening them
-    if hasattr(df.columns, 'nlevels') and df.columns.nlevels > 1:
-        # Flatten multi-level columns
-        df = df.copy()
-        df.columns = ['_'.join(str(col).strip() for col in cols if str(col).strip()) for cols in df.columns.values]
-    
-    # Convert any remaining tuple columns to strings
-    if any(isinstance(col, tuple) for col in df.columns):
-        df = df.copy()
-        df.columns = [str(col) if isinstance(col, tuple) else col for col in df.columns]
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 def _validate_season_format(season):
     """Validate season format (YYYY-YY)."""
@@ -89,27 +62,7 @@ LEAGUE_HUSTLE_STATS_TEAM_CSV_DIR = get_cache_dir("league_hustle_stats_team")
 # Ensure cache directories exist
 os.makedirs(LEAGUE_HUSTLE_STATS_TEAM_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-    
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        # Save DataFrame to CSV with UTF-8 encoding
-        df.to_csv(file_path, index=False, encoding='utf-8')
-        
-        # Log the file size and path
-        file_size = os.path.getsize(file_path)
-        logger.info(f"Saved DataFrame to CSV: {file_path} (Size: {file_size} bytes)")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_league_hustle_stats_team(
     per_mode_time: str = PerModeTime.totals,
@@ -129,7 +82,7 @@ def _get_csv_path_for_league_hustle_stats_team(
         data_set_name: Name of the data set
         
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Create a filename based on the parameters
     filename_parts = [
@@ -141,7 +94,7 @@ def _get_csv_path_for_league_hustle_stats_team(
         data_set_name
     ]
     
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
     
     return get_cache_file_path(filename, "league_hustle_stats_team")
 
@@ -164,7 +117,7 @@ def _validate_league_hustle_stats_team_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=LEAGUE_HUSTLE_STATS_TEAM_CACHE_SIZE)
+@cached_logic(maxsize=LEAGUE_HUSTLE_STATS_TEAM_CACHE_SIZE)
 def fetch_league_hustle_stats_team_logic(
     per_mode_time: str = PerModeTime.totals,
     season: str = CURRENT_NBA_SEASON,
@@ -175,7 +128,7 @@ def fetch_league_hustle_stats_team_logic(
     """
     Fetches league hustle stats team data using the LeagueHustleStatsTeam endpoint.
     
-    Provides DataFrame output capabilities and CSV caching.
+    Provides DataFrame output capabilities and Parquet caching.
     
     Args:
         per_mode_time: Per mode (default: Totals)
@@ -208,7 +161,7 @@ def fetch_league_hustle_stats_team_logic(
             return error_response, {}
         return error_response
     
-    # Check for cached CSV file
+    # Check for cached Parquet file
     csv_path = _get_csv_path_for_league_hustle_stats_team(
         per_mode_time, season, season_type_all_star, league_id_nullable, "TeamHustleStats"
     )
@@ -216,21 +169,11 @@ def fetch_league_hustle_stats_team_logic(
     
     if os.path.exists(csv_path) and return_dataframe:
         try:
-            # Check if the file is empty or too small
-            file_size = os.path.getsize(csv_path)
-            if file_size < 500:  # If file is too small, it's probably empty or corrupted
-                logger.warning(f"CSV file is too small ({file_size} bytes), fetching from API instead")
-                # Delete the corrupted file
-                try:
-                    os.remove(csv_path)
-                    logger.info(f"Deleted corrupted CSV file: {csv_path}")
-                except Exception as e:
-                    logger.error(f"Error deleting corrupted CSV file: {e}", exc_info=True)
-                # Continue to API fetch
+            df = load_dataset(csv_path)
+            if df is None:
+                logger.warning(f"Cached dataset missing or unreadable, fetching from API instead: {csv_path}")
             else:
-                logger.info(f"Loading league hustle stats team from CSV: {csv_path}")
-                # Read CSV with appropriate data types
-                df = pd.read_csv(csv_path, encoding='utf-8')
+                logger.info(f"Loading league hustle stats team from dataset cache: {csv_path}")
                 
                 # Process for JSON response
                 result_dict = {
@@ -252,8 +195,8 @@ def fetch_league_hustle_stats_team_logic(
                 return format_response(result_dict)
             
         except Exception as e:
-            logger.error(f"Error loading CSV: {e}", exc_info=True)
-            # If there's an error loading the CSV, fetch from the API
+            logger.error(f"Error loading Parquet: {e}", exc_info=True)
+            # If there's an error loading the Parquet, fetch from the API
     
     try:
         # Prepare API parameters
@@ -284,7 +227,7 @@ def fetch_league_hustle_stats_team_logic(
             "data_sets": {}
         }
         
-        # Create a combined DataFrame for CSV storage
+        # Create a combined DataFrame for Parquet storage
         combined_df = pd.DataFrame()
         
         # Process each data frame
@@ -296,7 +239,7 @@ def fetch_league_hustle_stats_team_logic(
             if return_dataframe:
                 dataframes[data_set_name] = df
                 
-                # Use the first (main) DataFrame for CSV storage
+                # Use the first (main) DataFrame for Parquet storage
                 if idx == 0:
                     combined_df = df.copy()
             
@@ -304,9 +247,9 @@ def fetch_league_hustle_stats_team_logic(
             processed_data = _process_dataframe(df, single_row=False)
             result_dict["data_sets"][data_set_name] = processed_data
         
-        # Save combined DataFrame to CSV (even if empty for caching purposes)
+        # Save combined DataFrame to the dataset cache (even if empty for caching purposes)
         if return_dataframe:
-            _save_dataframe_to_csv(combined_df, csv_path)
+            save_dataset(combined_df, csv_path)
         
         final_json_response = format_response(result_dict)
         if return_dataframe:
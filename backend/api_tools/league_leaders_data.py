@@ -1,10 +1,10 @@
 """
 Handles fetching league leaders data for various statistical categories.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import os
 import logging
-from functools import lru_cache
+from utils.cache import cached_logic
 import requests # For direct HTTP debug request
 import json
 import pandas as pd
@@ -16,6 +16,7 @@ from api_tools.utils import _process_dataframe, format_response
 from utils.validation import _validate_season_format
 from config import settings
 from core.errors import Errors
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -42,20 +43,7 @@ LEAGUE_LEADERS_CSV_DIR = os.path.join(CSV_CACHE_DIR, "league_leaders")
 os.makedirs(CSV_CACHE_DIR, exist_ok=True)
 os.makedirs(LEAGUE_LEADERS_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_league_leaders(
     season: str,
@@ -66,7 +54,7 @@ def _get_csv_path_for_league_leaders(
     scope: str
 ) -> str:
     """
-    Generates a file path for saving league leaders DataFrame as CSV.
+    Generates a file path for saving league leaders DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -77,7 +65,7 @@ def _get_csv_path_for_league_leaders(
         scope: The scope (e.g., 'S' for season, 'RS' for rookies)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean season type for filename
     clean_season_type = season_type.replace(" ", "_").lower()
@@ -85,7 +73,7 @@ def _get_csv_path_for_league_leaders(
     # Clean per mode for filename
     clean_per_mode = per_mode.replace(" ", "_").lower()
 
-    filename = f"leaders_{season}_{stat_category}_{clean_season_type}_{clean_per_mode}_{league_id}_{scope}.csv"
+    filename = f"leaders_{season}_{stat_category}_{clean_season_type}_{clean_per_mode}_{league_id}_{scope}.parquet"
     return os.path.join(LEAGUE_LEADERS_CSV_DIR, filename)
 
 # --- Helper for Parameter Validation ---
@@ -112,6 +100,7 @@ def _validate_league_leaders_params(
     return None
 
 # --- Main Logic Function ---
+@cached_logic()
 def fetch_league_leaders_logic(
     season: str,
     stat_category: str = StatCategoryAbbreviation.pts,
@@ -215,16 +204,16 @@ def fetch_league_leaders_logic(
             return format_response(error=error_msg), dataframes
         return format_response(error=error_msg)
 
-    # Save DataFrame to CSV if requested
+    # Save DataFrame to the dataset cache if requested
     if return_dataframe:
         dataframes["leaders"] = leaders_df
 
-        # Save to CSV if not empty
+        # Save to Parquet if not empty
         if not leaders_df.empty:
             csv_path = _get_csv_path_for_league_leaders(
                 season, stat_category, season_type, per_mode, league_id, scope
             )
-            _save_dataframe_to_csv(leaders_df, csv_path)
+            save_dataset(leaders_df, csv_path)
 
     # Ensure all expected columns and the stat_category column are present for processing
     cols_for_processing = list(dict.fromkeys([col for col in _EXPECTED_LEADER_COLS if col in leaders_df.columns] + [stat_category]))
@@ -1,10 +1,10 @@
 """
 Handles fetching league lineup statistics with extensive filtering options.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Optional, Dict, Union, Tuple
 
 import pandas as pd
@@ -38,26 +38,14 @@ from api_tools.utils import (
 )
 from utils.validation import validate_season_format, validate_date_format, validate_team_id
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
 # --- Cache Directory Setup ---
 LEAGUE_LINEUPS_CSV_DIR = get_cache_dir("league_lineups")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_league_lineups(
     season: str,
@@ -68,7 +56,7 @@ def _get_csv_path_for_league_lineups(
     team_id_nullable: Optional[int] = None
 ) -> str:
     """
-    Generates a file path for saving league lineups DataFrame as CSV.
+    Generates a file path for saving league lineups DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -79,7 +67,7 @@ def _get_csv_path_for_league_lineups(
         team_id_nullable: Filter by a specific team ID
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean measure type and per mode for filename
     clean_measure_type = measure_type.replace(" ", "_").lower()
@@ -89,9 +77,10 @@ def _get_csv_path_for_league_lineups(
     # Add team ID to filename if provided
     team_part = f"_team_{team_id_nullable}" if team_id_nullable else ""
 
-    filename = f"lineups_{season}_{group_quantity}_{clean_measure_type}_{clean_per_mode}_{clean_season_type}{team_part}.csv"
+    filename = f"lineups_{season}_{group_quantity}_{clean_measure_type}_{clean_per_mode}_{clean_season_type}{team_part}.parquet"
     return get_cache_file_path(filename, "league_lineups")
 
+@cached_logic()
 def fetch_league_dash_lineups_logic(
     season: str,
     group_quantity: int = 5,
@@ -236,7 +225,7 @@ def fetch_league_dash_lineups_logic(
         if return_dataframe:
             dataframes["lineups"] = lineups_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not lineups_df.empty:
                 csv_path = _get_csv_path_for_league_lineups(
                     season=season,
@@ -246,7 +235,7 @@ def fetch_league_dash_lineups_logic(
                     season_type=season_type,
                     team_id_nullable=team_id_nullable
                 )
-                _save_dataframe_to_csv(lineups_df, csv_path)
+                save_dataset(lineups_df, csv_path)
 
         lineups_list = _process_dataframe(lineups_df, single_row=False)
 
@@ -288,7 +277,7 @@ def fetch_league_dash_lineups_logic(
             )
 
             response_data["dataframe_info"] = {
-                "message": "League lineups data has been converted to DataFrame and saved as CSV file",
+                "message": "League lineups data has been converted to DataFrame and saved as Parquet file",
                 "dataframes": {
                     "lineups": {
                         "shape": list(lineups_df.shape) if not lineups_df.empty else [],
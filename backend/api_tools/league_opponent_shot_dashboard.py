@@ -1,10 +1,10 @@
 """
 Handles fetching league dashboard data for opponent player/team shots.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Optional, Dict, Union, Tuple
 import pandas as pd
 
@@ -33,26 +33,14 @@ from api_tools.utils import (
 )
 from utils.validation import validate_season_format, validate_date_format, validate_team_id
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
 # --- Cache Directory Setup ---
 OPPONENT_SHOT_CSV_DIR = get_cache_dir("opponent_shot_dashboard")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_opponent_shot_dashboard(
     season: str,
@@ -62,7 +50,7 @@ def _get_csv_path_for_opponent_shot_dashboard(
     opponent_team_id_nullable: Optional[int] = None
 ) -> str:
     """
-    Generates a file path for saving opponent shot dashboard DataFrame as CSV.
+    Generates a file path for saving opponent shot dashboard DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -72,7 +60,7 @@ def _get_csv_path_for_opponent_shot_dashboard(
         opponent_team_id_nullable: Filter by opponent team ID
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean season type and per mode for filename
     clean_season_type = season_type.replace(" ", "_").lower()
@@ -82,9 +70,10 @@ def _get_csv_path_for_opponent_shot_dashboard(
     team_part = f"_team_{team_id_nullable}" if team_id_nullable else ""
     opponent_part = f"_opp_{opponent_team_id_nullable}" if opponent_team_id_nullable and opponent_team_id_nullable != 0 else ""
 
-    filename = f"opp_shot_{season}_{clean_season_type}_{clean_per_mode}{team_part}{opponent_part}.csv"
+    filename = f"opp_shot_{season}_{clean_season_type}_{clean_per_mode}{team_part}{opponent_part}.parquet"
     return get_cache_file_path(filename, "opponent_shot_dashboard")
 
+@cached_logic()
 def fetch_league_dash_opponent_pt_shot_logic(
     season: str,
     season_type: str = SeasonTypeAllStar.regular,
@@ -253,7 +242,7 @@ def fetch_league_dash_opponent_pt_shot_logic(
         if return_dataframe:
             dataframes["opponent_shots"] = data_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not data_df.empty:
                 csv_path = _get_csv_path_for_opponent_shot_dashboard(
                     season=season,
@@ -262,7 +251,7 @@ def fetch_league_dash_opponent_pt_shot_logic(
                     team_id_nullable=team_id_nullable,
                     opponent_team_id_nullable=opponent_team_id_nullable
                 )
-                _save_dataframe_to_csv(data_df, csv_path)
+                save_dataset(data_df, csv_path)
 
         data_list = _process_dataframe(data_df, single_row=False)
 
@@ -304,7 +293,7 @@ def fetch_league_dash_opponent_pt_shot_logic(
             )
 
             response_data["dataframe_info"] = {
-                "message": "Opponent shot dashboard data has been converted to DataFrame and saved as CSV file",
+                "message": "Opponent shot dashboard data has been converted to DataFrame and saved as Parquet file",
                 "dataframes": {
                     "opponent_shots": {
                         "shape": list(data_df.shape) if not data_df.empty else [],
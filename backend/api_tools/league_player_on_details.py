@@ -1,13 +1,12 @@
 """
 Handles fetching NBA league player on details data using the leagueplayerondetails endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 from typing import Optional, Dict, Union, Tuple
 import pandas as pd
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import leagueplayerondetails
 from nba_api.stats.library.parameters import (
     SeasonTypeAllStar,
@@ -32,26 +31,14 @@ from api_tools.utils import (
 )
 from utils.validation import _validate_season_format, validate_date_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
 # --- Cache Directory Setup ---
 PLAYER_ON_DETAILS_CSV_DIR = get_cache_dir("player_on_details")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_on_details(
     season: str,
@@ -61,7 +48,7 @@ def _get_csv_path_for_player_on_details(
     team_id: int
 ) -> str:
     """
-    Generates a file path for saving player on details DataFrame as CSV.
+    Generates a file path for saving player on details DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -71,14 +58,14 @@ def _get_csv_path_for_player_on_details(
         team_id: The team ID
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean season type, measure type, and per mode for filename
     clean_season_type = season_type.replace(" ", "_").lower()
     clean_measure_type = measure_type.replace(" ", "_").lower()
     clean_per_mode = per_mode.replace(" ", "_").lower()
 
-    filename = f"player_on_details_{season}_{clean_season_type}_{clean_measure_type}_{clean_per_mode}_team_{team_id}.csv"
+    filename = f"player_on_details_{season}_{clean_season_type}_{clean_measure_type}_{clean_per_mode}_team_{team_id}.parquet"
     return get_cache_file_path(filename, "player_on_details")
 
 # Module-level constants for validation sets
@@ -101,6 +88,7 @@ _VALID_LPOD_VS_CONFERENCES = {val for val in ConferenceNullable.__dict__.values(
 _VALID_LPOD_VS_DIVISIONS = {val for val in DivisionNullable.__dict__.values() if isinstance(val, str) and val} | {None}
 
 
+@cached_logic()
 def fetch_league_player_on_details_logic(
     season: str = settings.CURRENT_NBA_SEASON,
     season_type: str = SeasonTypeAllStar.regular,
@@ -305,7 +293,7 @@ def fetch_league_player_on_details_logic(
         if return_dataframe:
             dataframes["league_player_on_details"] = details_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not details_df.empty:
                 csv_path = _get_csv_path_for_player_on_details(
                     season=season,
@@ -314,7 +302,7 @@ def fetch_league_player_on_details_logic(
                     per_mode=per_mode,
                     team_id=team_id
                 )
-                _save_dataframe_to_csv(details_df, csv_path)
+                save_dataset(details_df, csv_path)
 
         details_list = _process_dataframe(details_df, single_row=False)
 
@@ -362,7 +350,7 @@ def fetch_league_player_on_details_logic(
             )
 
             result["dataframe_info"] = {
-                "message": "League player on details data has been converted to DataFrame and saved as CSV file",
+                "message": "League player on details data has been converted to DataFrame and saved as Parquet file",
                 "dataframes": {
                     "league_player_on_details": {
                         "shape": list(details_df.shape) if not details_df.empty else [],
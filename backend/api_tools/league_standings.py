@@ -1,6 +1,6 @@
 """
 Handles fetching and processing NBA league standings data.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
@@ -8,8 +8,6 @@ import json
 from typing import Optional, Dict, Any, List, Set, Union, Tuple
 import pandas as pd
 # import numpy as np # Not strictly needed if _process_dataframe handles numpy types
-from functools import lru_cache
-from datetime import datetime, date
 
 from nba_api.stats.endpoints import leaguestandingsv3
 from nba_api.stats.library.parameters import SeasonTypeAllStar, LeagueID
@@ -17,6 +15,8 @@ from api_tools.utils import format_response, _process_dataframe # Import _proces
 from utils.validation import _validate_season_format
 from config import settings
 from core.errors import Errors
+from utils.cache import cached_logic
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -36,20 +36,7 @@ LEAGUE_STANDINGS_CSV_DIR = os.path.join(CSV_CACHE_DIR, "league_standings")
 os.makedirs(CSV_CACHE_DIR, exist_ok=True)
 os.makedirs(LEAGUE_STANDINGS_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_league_standings(
     season: str,
@@ -57,7 +44,7 @@ def _get_csv_path_for_league_standings(
     league_id: str
 ) -> str:
     """
-    Generates a file path for saving league standings DataFrame as CSV.
+    Generates a file path for saving league standings DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -65,12 +52,12 @@ def _get_csv_path_for_league_standings(
         league_id: The league ID (e.g., '00' for NBA)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean season type for filename
     clean_season_type = season_type.replace(" ", "_").lower()
 
-    filename = f"standings_{season}_{clean_season_type}_{league_id}.csv"
+    filename = f"standings_{season}_{clean_season_type}_{league_id}.parquet"
     return os.path.join(LEAGUE_STANDINGS_CSV_DIR, filename)
 
 # Columns to extract and their order for the final response
@@ -88,8 +75,8 @@ _STANDINGS_COLUMNS_TO_KEEP = [
 ]
 
 # --- Helper Functions ---
-@lru_cache(maxsize=LEAGUE_STANDINGS_RAW_CACHE_SIZE)
-def get_cached_standings(season: str, season_type: str, league_id: str, timestamp: str) -> pd.DataFrame:
+@cached_logic(maxsize=LEAGUE_STANDINGS_RAW_CACHE_SIZE)
+def get_cached_standings(season: str, season_type: str, league_id: str) -> pd.DataFrame:
     """
     Cached wrapper for nba_api's LeagueStandingsV3 endpoint.
 
@@ -97,7 +84,6 @@ def get_cached_standings(season: str, season_type: str, league_id: str, timestam
         season: NBA season in 'YYYY-YY' format.
         season_type: Season type (e.g., 'Regular Season').
         league_id: League ID (e.g., '00' for NBA).
-        timestamp: ISO-formatted timestamp for cache invalidation.
 
     Returns:
         pd.DataFrame: DataFrame with league standings.
@@ -105,7 +91,7 @@ def get_cached_standings(season: str, season_type: str, league_id: str, timestam
     Raises:
         Exception: If the API call fails.
     """
-    logger.info(f"Cache miss/expiry for standings - fetching for {season}, {season_type}, {league_id} (ts: {timestamp})")
+    logger.info(f"Cache miss/expiry for standings - fetching for {season}, {season_type}, {league_id}")
     try:
         standings_endpoint = leaguestandingsv3.LeagueStandingsV3(
             season=season, season_type=season_type, league_id=league_id,
@@ -192,8 +178,7 @@ def fetch_league_standings_logic(
         return format_response(error=Errors.INVALID_LEAGUE_ID.format(value=league_id, options=", ".join(list(_VALID_LEAGUE_IDS_FOR_STANDINGS)[:3])))
 
     try:
-        current_hour_timestamp = datetime.now().replace(minute=0, second=0, microsecond=0).isoformat()
-        standings_df = get_cached_standings(effective_season, season_type, league_id, current_hour_timestamp)
+        standings_df = get_cached_standings(effective_season, season_type, league_id)
 
         if standings_df.empty:
             logger.warning(f"No standings data found for {effective_season}, {season_type}, {league_id} from API.")
@@ -213,16 +198,16 @@ def fetch_league_standings_logic(
         # Use the utility _process_dataframe on the sliced DataFrame
         sliced_df = standings_df[cols_to_extract]
 
-        # Save DataFrame to CSV if requested
+        # Save DataFrame to the dataset cache if requested
         if return_dataframe:
             dataframes["standings"] = sliced_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not sliced_df.empty:
                 csv_path = _get_csv_path_for_league_standings(
                     effective_season, season_type, league_id
                 )
-                _save_dataframe_to_csv(sliced_df, csv_path)
+                save_dataset(sliced_df, csv_path)
 
         processed_standings = _process_dataframe(sliced_df, single_row=False)
 
@@ -0,0 +1,565 @@
+"""
+Possession and stint engine: lineup and on/off ratings computed locally from play-by-play.
+
+Each game's PlayByPlayV3 actions and GameRotation stints are reduced once to an action
+table: period, clock, points, the team whose possession the action ended, the score margin
+and both teams' five players on court. Rotation intervals give the on-court sets; a change
+takes effect at the team's substitution action at that clock (or the first action after it),
+so free throws logged before a substitution stay with the lineup that was on the floor.
+
+Action tables of final games are kept in memory and stored as datasets. Any combination of
+filters (periods, clutch time, opponent, home/road) is then a NumPy group-by over the cached
+tables, so lineup and on/off questions the stats endpoints have no parameters for are answered
+without further upstream calls.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from nba_api.stats.library.parameters import SeasonTypeAllStar
+
+from config import settings
+from core.errors import Errors
+from api_tools.composite import SubFetch, fetch_concurrently
+from api_tools.game_playbyplay import _fetch_historical_playbyplay_logic
+from api_tools.game_rotation import fetch_game_rotation_logic
+from api_tools.league_game_log import fetch_league_game_log_logic
+from api_tools.utils import (
+    _process_dataframe,
+    find_team_id_or_error,
+    format_response,
+    parse_response,
+    TeamNotFoundError
+)
+from utils.cache import cached_logic
+from utils.cache_policy import GAME_STATUS_FINAL, DataClass, classify_request, record_game_status
+from utils.dataset_store import load_dataset, save_dataset
+from utils.path_utils import get_cache_file_path
+from utils.validation import _validate_season_format, validate_game_id_format
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+LINEUP_STINTS_CACHE_SIZE = 128
+PERIOD_SECONDS = 720
+OVERTIME_SECONDS = 300
+REGULATION_PERIODS = 4
+LINEUP_SIZE = 5
+CLUTCH_SECONDS = 300  # Last five minutes of the fourth quarter or overtime...
+CLUTCH_MARGIN = 5     # ...with neither team ahead by more than five (the NBA's clutch definition)
+_PERIOD_KEY = 10_000  # Sort key = period * _PERIOD_KEY + elapsed seconds; a game never reaches 10,000 seconds
+_VALID_LOCATIONS = {None, "", "Home", "Road"}
+_NON_POSSESSION_FREE_THROWS = "technical|flagrant|clear path"  # The fouled team keeps the ball afterwards
+
+HOME_COLUMNS = [f"home_{slot}" for slot in range(1, LINEUP_SIZE + 1)]
+AWAY_COLUMNS = [f"away_{slot}" for slot in range(1, LINEUP_SIZE + 1)]
+RATING_COLUMNS = ("seconds", "points_for", "points_against", "off_possessions", "def_possessions")
+
+# Action tables of final games, most recently used last
+_game_tables: "OrderedDict[str, Tuple[pd.DataFrame, pd.DataFrame]]" = OrderedDict()
+_game_tables_lock = threading.Lock()
+
+
+# --- Clock Helpers ---
+def _period_start(period: np.ndarray) -> np.ndarray:
+    """Elapsed game seconds at the start of each period (periods 5+ are five-minute overtimes)."""
+    period = np.asarray(period)
+    return (np.minimum(period, REGULATION_PERIODS + 1) - 1) * PERIOD_SECONDS + np.maximum(period - REGULATION_PERIODS - 1, 0) * OVERTIME_SECONDS
+
+def _period_length(period: np.ndarray) -> np.ndarray:
+    return np.where(np.asarray(period) <= REGULATION_PERIODS, PERIOD_SECONDS, OVERTIME_SECONDS)
+
+def _period_at(elapsed: np.ndarray) -> np.ndarray:
+    """Period in play at each elapsed time; a time on a boundary belongs to the period that starts there."""
+    elapsed = np.asarray(elapsed, dtype=float)
+    regulation_end = REGULATION_PERIODS * PERIOD_SECONDS
+    return np.where(
+        elapsed < regulation_end,
+        elapsed // PERIOD_SECONDS + 1,
+        REGULATION_PERIODS + 1 + (elapsed - regulation_end) // OVERTIME_SECONDS,
+    ).astype(np.int64)
+
+def _clock_remaining(clock: pd.Series) -> np.ndarray:
+    """Seconds left in the period from "MM:SS" or ISO-8601 ("PT11M58.00S") clocks, truncated like the play-by-play."""
+    parts = clock.astype(str).str.extract(r"(\d+)\D+(\d+)").astype(float)
+    return (parts[0] * 60 + parts[1]).fillna(0).to_numpy()
+
+
+# --- Action Table ---
+def _home_team_id(pbp_df: pd.DataFrame, team: np.ndarray, home_points: np.ndarray) -> int:
+    """The home team: from V3's `location` ("h") when present, else the team whose scoring moves scoreHome."""
+    if "location" in pbp_df.columns:
+        candidates = team[(pbp_df["location"].astype(str).str.lower() == "h").to_numpy() & (team > 0)]
+    else:
+        candidates = team[(home_points > 0) & (team > 0)]
+    if candidates.size == 0:
+        raise ValueError("Cannot tell the home team from the play-by-play.")
+    values, counts = np.unique(candidates, return_counts=True)
+    return int(values[np.argmax(counts)])
+
+def _lineups_at_actions(
+    rotation_df: pd.DataFrame,
+    action_key: np.ndarray,
+    substitution_positions: np.ndarray,
+) -> np.ndarray:
+    """
+    Five sorted person IDs on court for one team at each action (zeros where the rotation does not
+    show exactly five players).
+
+    The rotation's in/out times split the game into stints. Each stint starts at the team's first
+    substitution action at the stint's clock, or at the first action at or after that clock when
+    no substitution was logged (period starts).
+    """
+    lineups = np.zeros((len(action_key), LINEUP_SIZE), dtype=np.int64)
+    players = rotation_df["PERSON_ID"].to_numpy(dtype=np.int64)
+    if len(players) < LINEUP_SIZE or len(action_key) == 0:
+        return lineups
+    in_time = rotation_df["IN_TIME_REAL"].to_numpy(dtype=float) / 10  # Tenths of a second from tip-off
+    out_time = rotation_df["OUT_TIME_REAL"].to_numpy(dtype=float) / 10
+
+    changes = np.unique(np.concatenate([in_time, out_time]))
+    on_court = (in_time[None, :] <= changes[:, None]) & (changes[:, None] < out_time[None, :])
+    stint_players = np.sort(np.where(on_court, players[None, :], np.iinfo(np.int64).max), axis=1)[:, :LINEUP_SIZE]
+    stint_players[on_court.sum(axis=1) != LINEUP_SIZE] = 0
+
+    # Place each change on the play-by-play's clock, which shows whole seconds remaining
+    change_period = _period_at(changes)
+    period_end = _period_start(change_period) + _period_length(change_period)
+    change_key = change_period * _PERIOD_KEY + period_end - np.floor(period_end - changes + 1e-6)
+    first_action = np.searchsorted(np.maximum.accumulate(action_key), change_key, side="left")
+    substitutions = pd.Series(substitution_positions, index=action_key[substitution_positions])
+    substitutions = substitutions[~substitutions.index.duplicated()]
+    logged = substitutions.reindex(change_key).to_numpy(dtype=float)
+    stint_start = np.where(np.isnan(logged), first_action, logged).astype(np.int64)
+
+    stint = np.searchsorted(stint_start, np.arange(len(action_key)), side="right") - 1
+    placed = stint >= 0
+    lineups[placed] = stint_players[stint[placed]]
+    return lineups
+
+def build_action_table(pbp_df: pd.DataFrame, rotation_df: pd.DataFrame, game_id: str) -> pd.DataFrame:
+    """
+    Reduces one game's PlayByPlayV3 actions and GameRotation rows (both teams) to an action table.
+
+    Columns: period, remaining and elapsed seconds, `seconds` until the next action, the home and away
+    team IDs, points scored by each side, `possession_end_team` (team whose possession the action
+    ended: made field goal, last made free throw of a trip, turnover, or the shooting team on a
+    defensive rebound; 0 otherwise), the home margin before the action, and home_1..home_5 /
+    away_1..away_5 with the players on court.
+    """
+    pbp = pbp_df.reset_index(drop=True)
+    period = pd.to_numeric(pbp["period"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    remaining = _clock_remaining(pbp["clock"])
+    period_end = _period_start(period) + _period_length(period)
+    elapsed = period_end - remaining
+    team = pd.to_numeric(pbp["teamId"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+
+    # Running scores are only set on scoring actions
+    score_home = pd.to_numeric(pbp["scoreHome"], errors="coerce").ffill().fillna(0).to_numpy()
+    score_away = pd.to_numeric(pbp["scoreAway"], errors="coerce").ffill().fillna(0).to_numpy()
+    home_points = np.clip(np.diff(score_home, prepend=0), 0, None)
+    away_points = np.clip(np.diff(score_away, prepend=0), 0, None)
+    home_margin = np.concatenate([[0], (score_home - score_away)[:-1]])
+
+    home_team_id = _home_team_id(pbp, team, home_points)
+    team_ids = set(rotation_df["TEAM_ID"].astype(np.int64)) | set(np.unique(team[team > 0]).tolist())
+    away_candidates = sorted(team_ids - {home_team_id})
+    if len(away_candidates) != 1:
+        raise ValueError(f"Expected two teams in game {game_id}, found {sorted(team_ids)}.")
+    away_team_id = away_candidates[0]
+
+    # Possession ends
+    action_type = pbp["actionType"].fillna("").astype(str).str.strip().str.lower().to_numpy()
+    sub_type = pbp["subType"].fillna("").astype(str).str.lower()
+    made_field_goal = action_type == "made shot"
+    free_throw = action_type == "free throw"
+    free_throw_made = free_throw & (home_points + away_points > 0)
+    trip = sub_type.str.extract(r"(\d+) of (\d+)").astype(float)
+    last_of_trip = free_throw & (trip[0] == trip[1]).to_numpy() & ~sub_type.str.contains(_NON_POSSESSION_FREE_THROWS).to_numpy()
+    # An and-one (a 1-of-1 at the clock of the team's made basket) belongs to the possession the basket ended
+    clock_team_key = (period * _PERIOD_KEY + remaining.astype(np.int64)) * 10**11 + team
+    and_one = free_throw & ((trip[0] == 1) & (trip[1] == 1)).to_numpy() & np.isin(clock_team_key, clock_team_key[made_field_goal])
+    missed = (action_type == "missed shot") | (free_throw & ~free_throw_made)
+    shooting_team = pd.Series(np.where(missed, np.where(and_one, -1, team), np.nan)).ffill().fillna(-1).to_numpy(dtype=np.int64)
+    defensive_rebound = (action_type == "rebound") & (team > 0) & (shooting_team > 0) & (team != shooting_team)
+    turnover = (action_type == "turnover") & (team > 0)
+    possession_end_team = np.select(
+        [made_field_goal, last_of_trip & free_throw_made & ~and_one, turnover, defensive_rebound],
+        [team, team, team, shooting_team],
+        default=0,
+    )
+
+    # Time until the next action, within the period
+    same_period_next = np.append(period[1:] == period[:-1], False)
+    next_elapsed = np.append(elapsed[1:], 0)
+    seconds = np.clip(np.where(same_period_next, next_elapsed, period_end) - elapsed, 0, None)
+
+    action_key = period * _PERIOD_KEY + elapsed
+    substitution = action_type == "substitution"
+    table = pd.DataFrame({
+        "game_id": game_id,
+        "period": period,
+        "remaining": remaining,
+        "elapsed": elapsed,
+        "seconds": seconds,
+        "home_team_id": home_team_id,
+        "away_team_id": away_team_id,
+        "home_points": home_points,
+        "away_points": away_points,
+        "possession_end_team": possession_end_team,
+        "home_margin": home_margin,
+    })
+    rotation_team = rotation_df["TEAM_ID"].astype(np.int64)
+    for columns, side_team_id in ((HOME_COLUMNS, home_team_id), (AWAY_COLUMNS, away_team_id)):
+        lineups = _lineups_at_actions(
+            rotation_df[rotation_team == side_team_id], action_key, np.flatnonzero(substitution & (team == side_team_id))
+        )
+        table[columns] = lineups
+    return table
+
+def _player_table(rotation_df: pd.DataFrame) -> pd.DataFrame:
+    names = (rotation_df["PLAYER_FIRST"].fillna("").astype(str) + " " + rotation_df["PLAYER_LAST"].fillna("").astype(str)).str.strip()
+    players = pd.DataFrame({
+        "person_id": rotation_df["PERSON_ID"].astype(np.int64),
+        "team_id": rotation_df["TEAM_ID"].astype(np.int64),
+        "player_name": names,
+    })
+    return players.drop_duplicates(subset=["person_id"]).reset_index(drop=True)
+
+def _is_final(pbp_df: pd.DataFrame) -> bool:
+    """A game is over when its last action ends the fourth period or later with the score untied."""
+    if pbp_df.empty:
+        return False
+    last = pbp_df.iloc[-1]
+    scores = pbp_df[["scoreHome", "scoreAway"]].apply(pd.to_numeric, errors="coerce").ffill().iloc[-1]
+    return bool(
+        str(last["actionType"]).lower() == "period"
+        and str(last["subType"]).lower() == "end"
+        and pd.to_numeric(pbp_df["period"], errors="coerce").max() >= REGULATION_PERIODS
+        and scores.notna().all() and scores["scoreHome"] != scores["scoreAway"]
+    )
+
+
+# --- Per-Game Cache ---
+def _table_paths(game_id: str) -> Tuple[str, str]:
+    return (
+        get_cache_file_path(f"lineup_stints_game{game_id}_actions.parquet", "lineup_stints"),
+        get_cache_file_path(f"lineup_stints_game{game_id}_players.parquet", "lineup_stints"),
+    )
+
+def _remember(game_id: str, tables: Tuple[pd.DataFrame, pd.DataFrame]) -> None:
+    with _game_tables_lock:
+        _game_tables[game_id] = tables
+        _game_tables.move_to_end(game_id)
+        while len(_game_tables) > settings.LINEUP_STINTS_MEMORY_GAMES:
+            _game_tables.popitem(last=False)
+
+def load_game_tables(game_id: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Returns a game's (action table, player table), built from play-by-play and rotation on first use.
+    Final games are served from memory or the dataset store afterwards; games in progress are rebuilt.
+    """
+    with _game_tables_lock:
+        if game_id in _game_tables:
+            _game_tables.move_to_end(game_id)
+            return _game_tables[game_id]
+
+    actions_path, players_path = _table_paths(game_id)
+    if classify_request("lineup_stints", {"game_id": game_id}) is DataClass.HISTORICAL:
+        actions, players = load_dataset(actions_path), load_dataset(players_path)
+        if actions is not None and players is not None:
+            _remember(game_id, (actions, players))
+            return actions, players
+
+    _, pbp_frames = _fetch_historical_playbyplay_logic(game_id, return_dataframe=True)
+    pbp_df = pbp_frames.get("play_by_play", pd.DataFrame())
+    if pbp_df.empty:
+        raise ValueError(f"No play-by-play for game {game_id}.")
+    rotation_response, rotation_frames = fetch_game_rotation_logic(game_id, return_dataframe=True)
+    rotation_data = parse_response(rotation_response)
+    if "error" in rotation_data:
+        raise ValueError(rotation_data["error"])
+    rotation_df = pd.concat([df for df in rotation_frames.values() if not df.empty], ignore_index=True) if rotation_frames else pd.DataFrame()
+    if rotation_df.empty:
+        raise ValueError(f"No rotation data for game {game_id}.")
+
+    tables = (build_action_table(pbp_df, rotation_df, game_id), _player_table(rotation_df))
+    if _is_final(pbp_df):
+        record_game_status(game_id, GAME_STATUS_FINAL)
+        save_dataset(tables[0], actions_path, params={"game_id": game_id})
+        save_dataset(tables[1], players_path, params={"game_id": game_id})
+        _remember(game_id, tables)
+    return tables
+
+
+# --- Aggregation ---
+def _ratings(totals: pd.DataFrame) -> pd.DataFrame:
+    """Adds minutes, per-100-possession ratings and plus/minus to summed RATING_COLUMNS."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        off_rating = np.where(totals["off_possessions"] > 0, 100 * totals["points_for"] / totals["off_possessions"], np.nan)
+        def_rating = np.where(totals["def_possessions"] > 0, 100 * totals["points_against"] / totals["def_possessions"], np.nan)
+    return totals.assign(
+        minutes=(totals["seconds"] / 60).round(1),
+        plus_minus=totals["points_for"] - totals["points_against"],
+        off_rating=np.round(off_rating, 1),
+        def_rating=np.round(def_rating, 1),
+        net_rating=np.round(off_rating - def_rating, 1),
+    ).drop(columns=["seconds"])
+
+def team_view(actions: pd.DataFrame, team_id: int) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Orients action tables to one team: its five players per action, and per-action seconds, points
+    for/against, possessions ended on offense/defense, margin, opponent, home flag, period and clock.
+    """
+    is_home = (actions["home_team_id"] == team_id).to_numpy()
+    lineups = np.where(is_home[:, None], actions[HOME_COLUMNS].to_numpy(), actions[AWAY_COLUMNS].to_numpy())
+    opponent = np.where(is_home, actions["away_team_id"], actions["home_team_id"])
+    possession_end = actions["possession_end_team"].to_numpy()
+    view = pd.DataFrame({
+        "seconds": actions["seconds"].to_numpy(dtype=float),
+        "points_for": np.where(is_home, actions["home_points"], actions["away_points"]).astype(float),
+        "points_against": np.where(is_home, actions["away_points"], actions["home_points"]).astype(float),
+        "off_possessions": (possession_end == team_id).astype(float),
+        "def_possessions": (possession_end == opponent).astype(float),
+        "margin": np.where(is_home, actions["home_margin"], -actions["home_margin"]),
+        "opponent_team_id": opponent,
+        "is_home": is_home,
+        "period": actions["period"].to_numpy(),
+        "remaining": actions["remaining"].to_numpy(),
+    })
+    return lineups, view
+
+def filter_mask(
+    view: pd.DataFrame,
+    periods: Sequence[int] = (),
+    clutch: bool = False,
+    opponent_team_id: int = 0,
+    location: Optional[str] = None,
+) -> np.ndarray:
+    """Actions kept by the filters; every filter is optional and they combine freely."""
+    mask = np.ones(len(view), dtype=bool)
+    if periods:
+        mask &= view["period"].isin(periods).to_numpy()
+    if clutch:
+        mask &= ((view["period"] >= REGULATION_PERIODS) & (view["remaining"] <= CLUTCH_SECONDS)
+                 & (view["margin"].abs() <= CLUTCH_MARGIN)).to_numpy()
+    if opponent_team_id:
+        mask &= (view["opponent_team_id"] == opponent_team_id).to_numpy()
+    if location:
+        mask &= view["is_home"].to_numpy() == (location == "Home")
+    return mask
+
+def aggregate_lineups(lineups: np.ndarray, view: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Groups actions by five-man unit and by player with np.unique/np.bincount.
+
+    Returns (lineup totals, player on/off totals, team totals); only actions with a known lineup count.
+    A player's "off" totals are the team's totals minus the player's "on" totals.
+    """
+    known = (lineups > 0).all(axis=1)
+    lineups, view = lineups[known], view[known]
+    team_totals = pd.DataFrame({column: [view[column].sum()] for column in RATING_COLUMNS})
+    if not len(lineups):
+        empty = pd.DataFrame(columns=RATING_COLUMNS)
+        return empty, empty, team_totals
+
+    units, inverse = np.unique(lineups, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    unit_totals = pd.DataFrame({
+        column: np.bincount(inverse, weights=view[column].to_numpy(), minlength=len(units)) for column in RATING_COLUMNS
+    })
+    for slot in range(LINEUP_SIZE):
+        unit_totals[f"player_{slot + 1}"] = units[:, slot]
+
+    players = np.unique(units)
+    slots = np.searchsorted(players, units).ravel()
+    on_totals = pd.DataFrame({
+        column: np.bincount(slots, weights=np.repeat(unit_totals[column].to_numpy(), LINEUP_SIZE), minlength=len(players))
+        for column in RATING_COLUMNS
+    })
+    off_totals = pd.DataFrame({column: team_totals[column].iloc[0] - on_totals[column] for column in RATING_COLUMNS})
+    on_off = pd.concat([_ratings(on_totals).add_prefix("on_"), _ratings(off_totals).add_prefix("off_")], axis=1)
+    on_off.insert(0, "person_id", players)
+    on_off["on_off_net_rating"] = (on_off["on_net_rating"] - on_off["off_net_rating"]).round(1)
+    return _ratings(unit_totals), on_off, team_totals
+
+
+# --- Game Selection ---
+def _normalize_game_ids(game_ids: Optional[Union[str, List[str]]]) -> Tuple[str, ...]:
+    if not game_ids:
+        return ()
+    if isinstance(game_ids, str):
+        game_ids = game_ids.split(",")
+    normalized = tuple(dict.fromkeys(str(game_id).strip() for game_id in game_ids if str(game_id).strip()))
+    for game_id in normalized:
+        if not validate_game_id_format(game_id):
+            raise ValueError(Errors.INVALID_GAME_ID_FORMAT.format(game_id=game_id))
+    return normalized
+
+def _normalize_periods(periods: Optional[Union[str, int, List[int]]]) -> Tuple[int, ...]:
+    if periods in (None, "", 0, []):
+        return ()
+    values = str(periods).split(",") if isinstance(periods, (str, int)) else periods
+    try:
+        normalized = tuple(sorted({int(str(value).strip()) for value in values if str(value).strip()}))
+    except ValueError:
+        raise ValueError(Errors.INVALID_STINT_PERIODS.format(value=periods))
+    if any(value < 1 for value in normalized):
+        raise ValueError(Errors.INVALID_STINT_PERIODS.format(value=periods))
+    return normalized
+
+def _team_game_ids(team_id: int, season: str, season_type: str, last_n_games: int) -> Tuple[str, ...]:
+    """A team's completed games in a season from the league game log, oldest first."""
+    response, dataframes = fetch_league_game_log_logic(season=season, season_type=season_type, return_dataframe=True)
+    data = parse_response(response)
+    if "error" in data:
+        raise RuntimeError(data["error"])
+    log_df = dataframes.get("LeagueGameLog", pd.DataFrame())
+    if log_df.empty:
+        return ()
+    log_df = log_df[log_df["TEAM_ID"].astype(np.int64) == team_id]
+    if "WL" in log_df.columns:
+        log_df = log_df[log_df["WL"].notna()]
+    game_ids = tuple(log_df.sort_values(["GAME_DATE", "GAME_ID"])["GAME_ID"].astype(str))
+    return game_ids[-last_n_games:] if last_n_games else game_ids
+
+
+# --- Main Logic Function ---
+@cached_logic(maxsize=LINEUP_STINTS_CACHE_SIZE)
+def _compute_lineup_stints(
+    team_id: int,
+    team_name: str,
+    season: str,
+    season_type: str,
+    game_ids: Tuple[str, ...],
+    periods: Tuple[int, ...],
+    clutch: bool,
+    opponent_team_id: int,
+    location: Optional[str],
+    min_minutes: float,
+    top_n: int,
+    return_dataframe: bool = False
+) -> Union[str, Tuple[str, Dict[str, pd.DataFrame]]]:
+    sub_results = fetch_concurrently(
+        {game_id: SubFetch(load_game_tables, (game_id,)) for game_id in game_ids},
+        deadline=settings.LINEUP_STINTS_DEADLINE_SECONDS,
+    )
+    partial_errors = [f"{game_id}: {sub_results[game_id].error}" for game_id in game_ids if sub_results[game_id].error]
+    built = [sub_results[game_id].value for game_id in game_ids if not sub_results[game_id].error]
+    if not built:
+        error_msg = Errors.LINEUP_STINTS_ALL_FAILED.format(team_name=team_name, errors_list="; ".join(partial_errors[:10]))
+        logger.error(error_msg)
+        if return_dataframe:
+            return format_response(error=error_msg), {}
+        return format_response(error=error_msg)
+
+    actions = pd.concat([table for table, _ in built], ignore_index=True)
+    actions = actions[(actions["home_team_id"] == team_id) | (actions["away_team_id"] == team_id)]
+    players = pd.concat([table for _, table in built], ignore_index=True).drop_duplicates(subset=["person_id"])
+    names = players.set_index("person_id")["player_name"]
+
+    lineups, view = team_view(actions, team_id)
+    mask = filter_mask(view, periods, clutch, opponent_team_id, location)
+    units, on_off, team_totals = aggregate_lineups(lineups[mask], view[mask])
+
+    player_columns = [f"player_{slot + 1}" for slot in range(LINEUP_SIZE)]
+    if not units.empty:
+        units = units[units["minutes"] >= min_minutes].sort_values("minutes", ascending=False).head(top_n).reset_index(drop=True)
+        units.insert(0, "lineup", units[player_columns].apply(lambda row: " - ".join(names.reindex(row).fillna("").astype(str)), axis=1))
+        on_off.insert(1, "player_name", names.reindex(on_off["person_id"]).to_numpy())
+        on_off = on_off.sort_values("on_minutes", ascending=False).reset_index(drop=True)
+
+    result: Dict[str, Any] = {
+        "team_id": team_id,
+        "team_name": team_name,
+        "season": season,
+        "season_type": season_type,
+        "games": len(built),
+        "filters": {
+            "periods": list(periods),
+            "clutch": clutch,
+            "opponent_team_id": opponent_team_id or None,
+            "location": location or None,
+            "min_minutes": min_minutes,
+        },
+        "team_totals": (_process_dataframe(_ratings(team_totals), single_row=True) or {}),
+        "lineups": _process_dataframe(units, single_row=False) or [],
+        "on_off": _process_dataframe(on_off, single_row=False) or [],
+    }
+    if partial_errors:
+        result["partial_errors"] = partial_errors
+
+    if return_dataframe:
+        return format_response(result), {"lineups": units, "on_off": on_off, "actions": actions[mask]}
+    return format_response(result)
+
+def fetch_lineup_stints_logic(
+    team_identifier: str,
+    season: str = settings.CURRENT_NBA_SEASON,
+    season_type: str = SeasonTypeAllStar.regular,
+    game_ids: Optional[Union[str, List[str]]] = None,
+    last_n_games: int = 0,
+    periods: Optional[Union[str, int, List[int]]] = None,
+    clutch: bool = False,
+    opponent_team_identifier: Optional[str] = None,
+    location: Optional[str] = None,
+    min_minutes: float = 0,
+    top_n: Optional[int] = None,
+    return_dataframe: bool = False
+) -> Union[str, Tuple[str, Dict[str, pd.DataFrame]]]:
+    """
+    Computes five-man lineup and player on/off ratings for a team from play-by-play and rotations.
+
+    Each game is fetched once (PlayByPlayV3 and GameRotation, read from the season warehouse when
+    ingested); later queries with any filters over the same games are computed locally.
+
+    Args:
+        team_identifier: Name, abbreviation, or ID of the team.
+        season: NBA season in YYYY-YY format; its completed games are used unless game_ids is given.
+        season_type: Type of season (e.g., 'Regular Season', 'Playoffs').
+        game_ids: Specific games (list or comma-separated) instead of the season's games.
+        last_n_games: Only the team's last N games of the season (0 for all).
+        periods: Periods to include (e.g., [4] or "4,5"; 5+ is overtime). Empty for all.
+        clutch: Only clutch time: last five minutes of the fourth quarter or overtime, margin within five.
+        opponent_team_identifier: Only games against this team.
+        location: 'Home' or 'Road' games only.
+        min_minutes: Minimum minutes for a lineup to be listed.
+        top_n: Lineups returned, by minutes (default settings.LINEUP_STINTS_TOP_LINEUPS).
+        return_dataframe: Whether to return DataFrames along with the JSON response.
+
+    Returns:
+        If return_dataframe=False: JSON string with "team_totals", "lineups" (players, minutes, points
+            for/against, offensive/defensive possessions, off/def/net rating per 100 possessions) and
+            "on_off" (each player's ratings on and off the court), plus "partial_errors" for games that
+            could not be built.
+        If return_dataframe=True: Tuple of (JSON string, {"lineups", "on_off", "actions"} DataFrames).
+    """
+    logger.info(f"Executing fetch_lineup_stints_logic for {team_identifier}, season {season}, periods={periods}, clutch={clutch}")
+
+    def error(message: str):
+        if return_dataframe:
+            return format_response(error=message), {}
+        return format_response(error=message)
+
+    if not season or not _validate_season_format(season):
+        return error(Errors.INVALID_SEASON_FORMAT.format(season=season))
+    if location not in _VALID_LOCATIONS:
+        return error(Errors.INVALID_LOCATION.format(value=location, options="Home, Road"))
+    try:
+        team_id, team_name = find_team_id_or_error(team_identifier)
+        opponent_team_id = find_team_id_or_error(opponent_team_identifier)[0] if opponent_team_identifier else 0
+        normalized_periods = _normalize_periods(periods)
+        selected_games = _normalize_game_ids(game_ids) or _team_game_ids(team_id, season, season_type, last_n_games)
+    except (TeamNotFoundError, ValueError, RuntimeError) as e:
+        return error(str(e))
+    if not selected_games:
+        return error(Errors.LINEUP_STINTS_NO_GAMES.format(team_name=team_name, season=season, season_type=season_type))
+
+    return _compute_lineup_stints(
+        team_id, team_name, season, season_type, selected_games, normalized_periods, bool(clutch),
+        opponent_team_id, location or None, float(min_minutes), int(top_n or settings.LINEUP_STINTS_TOP_LINEUPS),
+        return_dataframe=return_dataframe,
+    )
@@ -1,7 +1,7 @@
 """
 Handles fetching and formatting live NBA scoreboard data.
 Uses nba_api.live.nba.endpoints.scoreboard.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 from typing import Dict, List, Optional, TypedDict, Any, Union, Tuple
 from nba_api.live.nba.endpoints import scoreboard
@@ -9,48 +9,37 @@ from datetime import datetime
 import logging
 import os
 import pandas as pd
-from functools import lru_cache
 
 from config import settings
 from core.errors import Errors
 from api_tools.utils import format_response
+from utils.cache import cached_logic
+from utils.cache_policy import DataClass, record_game_status
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
+from utils.live_snapshots import SCOREBOARD, get_live_snapshot
 
 logger = logging.getLogger(__name__)
 
 # --- Cache Directory Setup ---
 LIVE_SCOREBOARD_CSV_DIR = get_cache_dir("live_scoreboard")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_live_scoreboard(date_str: str) -> str:
     """
-    Generates a file path for saving live scoreboard DataFrame as CSV.
+    Generates a file path for saving live scoreboard DataFrame as Parquet.
 
     Args:
         date_str: The date string in YYYY-MM-DD format
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
-    filename = f"live_scoreboard_{date_str}.csv"
+    filename = f"live_scoreboard_{date_str}.parquet"
     return get_cache_file_path(filename, "live_scoreboard")
 
 # --- Module-Level Constants ---
-CACHE_TTL_SECONDS = 10  # Time-to-live for cached raw scoreboard data
 SCOREBOARD_RAW_CACHE_SIZE = 2 # Max number of raw scoreboard responses to cache
 
 GAME_STATUS_SCHEDULED = 1
@@ -91,18 +80,14 @@ class FormattedScoreboardResponse(TypedDict): # Renamed from ScoreboardResponse
     games: List[FormattedGameInfo]
 
 # --- Caching Function for Raw Data ---
-@lru_cache(maxsize=SCOREBOARD_RAW_CACHE_SIZE)
-def get_cached_scoreboard_data(
-    cache_key: str,
-    timestamp_bucket: str # Timestamp bucket for more frequent invalidation
-) -> Dict[str, Any]:
+@cached_logic(maxsize=SCOREBOARD_RAW_CACHE_SIZE, data_class=DataClass.LIVE)
+def get_cached_scoreboard_data(cache_key: str) -> Dict[str, Any]:
     """
     Cached wrapper for fetching raw live scoreboard data.
-    Uses a timestamp bucket for time-based cache invalidation.
+    Expiry follows the LIVE freshness class (settings.CACHE_TTL_LIVE_SECONDS).
 
     Args:
         cache_key: A simple string key for the cache (e.g., "live_scoreboard").
-        timestamp_bucket: A string derived from the current time, bucketed by CACHE_TTL_SECONDS.
 
     Returns:
         Dict[str, Any]: The raw dictionary result from the API call.
@@ -110,7 +95,7 @@ def get_cached_scoreboard_data(
     Raises:
         Exception: If the ScoreBoard API call fails.
     """
-    logger.info(f"Cache miss or expiry for live scoreboard (key: {cache_key}, ts_bucket: {timestamp_bucket}) - fetching new data.")
+    logger.info(f"Cache miss or expiry for live scoreboard (key: {cache_key}) - fetching new data.")
     try:
         board = scoreboard.ScoreBoard(timeout=settings.DEFAULT_TIMEOUT_SECONDS)
         return board.get_dict()
@@ -203,8 +188,6 @@ def fetch_league_scoreboard_logic(
     dataframes = {}
 
     cache_key = "live_scoreboard_data" # More descriptive key
-    # Timestamp bucket for cache invalidation, based on CACHE_TTL_SECONDS
-    timestamp_bucket = str(int(datetime.now().timestamp() // CACHE_TTL_SECONDS))
 
     try:
         if bypass_cache:
@@ -212,10 +195,13 @@ def fetch_league_scoreboard_logic(
             board = scoreboard.ScoreBoard(timeout=settings.DEFAULT_TIMEOUT_SECONDS)
             raw_data = board.get_dict()
         else:
-            raw_data = get_cached_scoreboard_data(cache_key=cache_key, timestamp_bucket=timestamp_bucket)
+            # The background poller's scoreboard, when fresh, saves an upstream call per viewer
+            raw_data = get_live_snapshot(SCOREBOARD) or get_cached_scoreboard_data(cache_key=cache_key)
 
         scoreboard_outer = raw_data.get('scoreboard', {})
         raw_games_list = scoreboard_outer.get('games', [])
+        for game in raw_games_list:
+            record_game_status(game.get("gameId"), game.get("gameStatus"))
         game_date_str = scoreboard_outer.get('gameDate', datetime.now().strftime("%Y-%m-%d"))
 
         formatted_games_list: List[FormattedGameInfo] = [_format_live_game_details(game) for game in raw_games_list]
@@ -259,10 +245,10 @@ def fetch_league_scoreboard_logic(
             games_df = pd.DataFrame(games_data)
             dataframes["games"] = games_df
 
-            # Save to CSV
+            # Save to Parquet
             if not games_df.empty:
                 csv_path = _get_csv_path_for_live_scoreboard(game_date_str)
-                _save_dataframe_to_csv(games_df, csv_path)
+                save_dataset(games_df, csv_path)
 
                 # Add relative path to response
                 relative_path = get_relative_cache_path(
@@ -271,7 +257,7 @@ def fetch_league_scoreboard_logic(
                 )
 
                 response_data["dataframe_info"] = {
-                    "message": "Live scoreboard data has been converted to DataFrame and saved as CSV file",
+                    "message": "Live scoreboard data has been converted to DataFrame and saved as Parquet file",
                     "dataframes": {
                         "games": {
                             "shape": list(games_df.shape),
@@ -0,0 +1,353 @@
+"""
+Background ingestion of live games with push fan-out.
+
+One asyncio task per API process polls the live scoreboard and, for games in
+progress, their boxscore and play-by-play, at intervals that follow each game's
+state (scheduled, live, halftime, final). The latest payloads are kept in
+utils/live_snapshots.py for the live tools, and each change is rendered once and
+pushed to every subscriber of routes/live.py's stream, so upstream traffic grows
+with the number of games rather than the number of viewers.
+"""
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from nba_api.live.nba.endpoints import boxscore, playbyplay, scoreboard
+
+from config import settings
+from api_tools.async_http import call_logic_async
+from api_tools.live_playbyplay_store import get_live_pbp_store
+from api_tools.live_game_tools import (
+    GAME_STATUS_FINAL,
+    GAME_STATUS_IN_PROGRESS,
+    _format_live_game_details,
+)
+from utils.cache_policy import record_game_status
+from utils.live_snapshots import (
+    BOXSCORE,
+    PLAYBYPLAY,
+    SCOREBOARD,
+    drop_live_snapshots,
+    live_snapshot_info,
+    put_live_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+GAME_STATES = ("scheduled", "live", "halftime", "final")
+MAX_BACKOFF_FACTOR = 16  # Failed polls wait up to this many intervals
+MIN_SLEEP_SECONDS = 0.05
+
+
+def game_state(raw_game: Dict[str, Any]) -> str:
+    """Classifies a raw live scoreboard game as one of GAME_STATES."""
+    status = raw_game.get("gameStatus")
+    if status == GAME_STATUS_FINAL:
+        return "final"
+    if status == GAME_STATUS_IN_PROGRESS:
+        return "halftime" if str(raw_game.get("gameStatusText", "")).strip().lower() == "halftime" else "live"
+    return "scheduled"
+
+
+# --- Upstream Fetches ---
+def _fetch_scoreboard(game_id: Optional[str] = None) -> Dict[str, Any]:
+    return scoreboard.ScoreBoard(timeout=settings.DEFAULT_TIMEOUT_SECONDS).get_dict()
+
+
+def _fetch_boxscore(game_id: str) -> Dict[str, Any]:
+    return boxscore.BoxScore(game_id=game_id, timeout=settings.DEFAULT_TIMEOUT_SECONDS).get_dict()
+
+
+def _fetch_playbyplay(game_id: str) -> Dict[str, Any]:
+    return playbyplay.PlayByPlay(game_id=game_id, timeout=settings.DEFAULT_TIMEOUT_SECONDS).get_dict()
+
+
+_LIVE_FETCHERS = {SCOREBOARD: _fetch_scoreboard, BOXSCORE: _fetch_boxscore, PLAYBYPLAY: _fetch_playbyplay}
+
+
+async def fetch_live(kind: str, game_id: Optional[str] = None) -> Dict[str, Any]:
+    """Fetches a live payload on the event loop (api_tools/async_http.py), without holding a thread."""
+    return await call_logic_async(_LIVE_FETCHERS[kind], game_id)
+
+
+def _sse(event_type: str, data: Dict[str, Any]) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+# --- Subscribers ---
+class LiveSubscriber:
+    """
+    One stream's queue of rendered SSE events. Only the newest
+    settings.LIVE_SUBSCRIBER_MAX_PENDING events are kept for a slow reader, so one
+    stalled client never holds memory or delays the others.
+    """
+
+    def __init__(self, game_ids: Optional[Iterable[str]] = None, all_games: bool = False):
+        self.game_ids: Set[str] = set(game_ids or ())
+        self.all_games = all_games
+        self.dropped = 0
+        self._events: Deque[str] = deque(maxlen=settings.LIVE_SUBSCRIBER_MAX_PENDING)
+        self._ready = asyncio.Event()
+
+    def wants(self, game_id: Optional[str]) -> bool:
+        return game_id is None or self.all_games or game_id in self.game_ids
+
+    def push(self, event: str) -> None:
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+        self._ready.set()
+
+    async def next(self, timeout: float) -> str:
+        """Waits up to `timeout` seconds and returns every pending event as one chunk ("" if none)."""
+        if not self._events:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return ""
+        chunk = "".join(self._events)
+        self._events.clear()
+        self._ready.clear()
+        return chunk
+
+
+class _GameFeed:
+    """Polling state of one tracked game."""
+
+    __slots__ = ("game_id", "state", "next_poll", "failures", "last_action_number", "done")
+
+    def __init__(self, game_id: str, state: str):
+        self.game_id = game_id
+        self.state = state
+        self.next_poll = 0.0
+        self.failures = 0
+        self.last_action_number = 0
+        self.done = False  # Final payloads fetched; no more polling
+
+
+# --- Ingestion Service ---
+class LiveIngestionService:
+    """
+    Polls live games in the background and fans their updates out to subscribers.
+
+    Args:
+        fetch (Callable): `await fetch(kind, game_id)` returning the raw payload; defaults to
+            `fetch_live`. Injectable for tests.
+    """
+
+    def __init__(self, fetch: Optional[Callable[[str, Optional[str]], Awaitable[Dict[str, Any]]]] = None):
+        self._fetch = fetch or fetch_live
+        self._feeds: Dict[str, _GameFeed] = {}
+        self._subscribers: Set[LiveSubscriber] = set()
+        self._latest_events: Dict[Tuple[str, Optional[str]], str] = {}
+        self._next_scoreboard_poll = 0.0
+        self._scoreboard_failures = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"polls": {SCOREBOARD: 0, BOXSCORE: 0, PLAYBYPLAY: 0}, "poll_errors": 0,
+                       "published": 0, "deliveries": 0, "unchanged": 0}
+
+    # --- Lifecycle ---
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Starts polling on the running event loop (no-op if already running)."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="live-ingestion")
+            logger.info("Live game ingestion started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            logger.info("Live game ingestion stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                now = time.monotonic()
+                polls = [self._poll_game(feed) for feed in self._feeds.values() if not feed.done and feed.next_poll <= now]
+                if self._next_scoreboard_poll <= now:
+                    polls.append(self._poll_scoreboard())
+                if polls:
+                    await asyncio.gather(*polls)
+                wake = min([self._next_scoreboard_poll] + [f.next_poll for f in self._feeds.values() if not f.done])
+            except Exception as e:  # Never let one bad payload stop ingestion
+                logger.error(f"Live ingestion cycle failed: {e}", exc_info=True)
+                wake = time.monotonic() + settings.LIVE_POLL_LIVE_SECONDS
+            await asyncio.sleep(max(MIN_SLEEP_SECONDS, wake - time.monotonic()))
+
+    # --- Polling ---
+    def _scoreboard_interval(self, raw_games: List[Dict[str, Any]]) -> float:
+        states = [game_state(game) for game in raw_games]
+        if "live" in states or "halftime" in states:
+            return settings.LIVE_POLL_SCOREBOARD_LIVE_SECONDS
+        pregame_cutoff = time.time() + settings.LIVE_PREGAME_WINDOW_SECONDS
+        for game, state in zip(raw_games, states):
+            start = _parse_utc(game.get("gameTimeUTC"))
+            if state == "scheduled" and start is not None and start <= pregame_cutoff:
+                return settings.LIVE_POLL_SCOREBOARD_PREGAME_SECONDS  # Includes games past their tip-off time
+        return settings.LIVE_POLL_SCOREBOARD_IDLE_SECONDS
+
+    @staticmethod
+    def _game_interval(state: str) -> float:
+        return settings.LIVE_POLL_HALFTIME_SECONDS if state == "halftime" else settings.LIVE_POLL_LIVE_SECONDS
+
+    async def _poll_scoreboard(self) -> None:
+        self._stats["polls"][SCOREBOARD] += 1
+        try:
+            raw = await self._fetch(SCOREBOARD, None)
+        except Exception as e:
+            self._stats["poll_errors"] += 1
+            self._scoreboard_failures += 1
+            backoff = min(2 ** self._scoreboard_failures, MAX_BACKOFF_FACTOR)
+            self._next_scoreboard_poll = time.monotonic() + settings.LIVE_POLL_SCOREBOARD_LIVE_SECONDS * backoff
+            logger.warning(f"Live scoreboard poll failed ({self._scoreboard_failures} in a row): {e}")
+            return
+        self._scoreboard_failures = 0
+        put_live_snapshot(SCOREBOARD, raw)
+        board = raw.get("scoreboard", {})
+        raw_games = board.get("games", [])
+
+        now = time.monotonic()
+        listed = set()
+        for game in raw_games:
+            game_id = game.get("gameId")
+            if not game_id:
+                continue
+            listed.add(game_id)
+            record_game_status(game_id, game.get("gameStatus"))
+            state = game_state(game)
+            feed = self._feeds.get(game_id)
+            if feed is None and state in ("live", "halftime"):
+                self._feeds[game_id] = _GameFeed(game_id, state)
+            elif feed is not None and feed.state != state:
+                logger.info(f"Live game {game_id}: {feed.state} -> {state}")
+                feed.state = state
+                feed.next_poll = min(feed.next_poll, now)  # Fetch right away, including the final payloads
+        for game_id in [game_id for game_id in self._feeds if game_id not in listed]:
+            del self._feeds[game_id]  # Yesterday's games, once the scoreboard rolls over
+            drop_live_snapshots(game_id)
+            get_live_pbp_store().drop(game_id)
+            self._latest_events.pop((BOXSCORE, game_id), None)
+
+        self._next_scoreboard_poll = now + self._scoreboard_interval(raw_games)
+        self._publish(SCOREBOARD, None, {
+            "date": board.get("gameDate"),
+            "games": [_format_live_game_details(game) for game in raw_games],
+        })
+
+    async def _poll_game(self, feed: _GameFeed) -> None:
+        final = feed.state == "final"
+        self._stats["polls"][BOXSCORE] += 1
+        self._stats["polls"][PLAYBYPLAY] += 1
+        box, pbp = await asyncio.gather(
+            self._fetch(BOXSCORE, feed.game_id), self._fetch(PLAYBYPLAY, feed.game_id), return_exceptions=True
+        )
+        if isinstance(box, dict):
+            put_live_snapshot(BOXSCORE, box, feed.game_id, final=final)
+            self._publish(BOXSCORE, feed.game_id, {"game_id": feed.game_id, "state": feed.state, "game": box.get("game", {})})
+        if isinstance(pbp, dict):
+            put_live_snapshot(PLAYBYPLAY, pbp, feed.game_id, final=final)
+            store = get_live_pbp_store()
+            counts = store.update(feed.game_id, pbp)
+            changes = store.changes(feed.game_id, feed.last_action_number)
+            # Tool calls update the store too, so new plays are judged against the last published cursor
+            if any(counts.values()) or changes["cursor"]["next"] > feed.last_action_number:
+                feed.last_action_number = changes["cursor"]["next"]
+                self._publish(PLAYBYPLAY, feed.game_id, {"game_id": feed.game_id, **changes}, remember=False)
+
+        errors = [result for result in (box, pbp) if isinstance(result, BaseException)]
+        if errors:
+            self._stats["poll_errors"] += len(errors)
+            feed.failures += 1
+            logger.warning(f"Live poll of game {feed.game_id} failed ({feed.failures} in a row): {errors[0]}")
+        else:
+            feed.failures = 0
+            feed.done = final
+        feed.next_poll = time.monotonic() + self._game_interval(feed.state) * min(2 ** feed.failures, MAX_BACKOFF_FACTOR)
+
+    # --- Fan-out ---
+    def _publish(self, kind: str, game_id: Optional[str], payload: Dict[str, Any], remember: bool = True) -> None:
+        """Renders an update once and pushes it to every interested subscriber, unless it repeats the last one."""
+        event = _sse(kind, payload)
+        if remember:
+            if self._latest_events.get((kind, game_id)) == event:
+                self._stats["unchanged"] += 1
+                return
+            self._latest_events[(kind, game_id)] = event
+        self._stats["published"] += 1
+        for subscriber in self._subscribers:
+            if subscriber.wants(game_id):
+                subscriber.push(event)
+                self._stats["deliveries"] += 1
+
+    def subscribe(self, game_ids: Optional[Iterable[str]] = None, all_games: bool = False) -> Optional[LiveSubscriber]:
+        """
+        Registers a subscriber to the scoreboard and the given games (or every tracked game),
+        primed with their latest state: scoreboard, boxscore and the full play-by-play so far.
+        Returns None when settings.LIVE_MAX_SUBSCRIBERS are already connected.
+        """
+        if len(self._subscribers) >= settings.LIVE_MAX_SUBSCRIBERS:
+            return None
+        subscriber = LiveSubscriber(game_ids, all_games)
+        for (kind, game_id), event in list(self._latest_events.items()):
+            if subscriber.wants(game_id):
+                subscriber.push(event)
+        for game_id in [game_id for game_id in self._feeds if subscriber.wants(game_id)]:
+            changes = get_live_pbp_store().changes(game_id)
+            if changes is not None:
+                subscriber.push(_sse(PLAYBYPLAY, {"game_id": game_id, **changes, "snapshot": True}))
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: LiveSubscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def info(self) -> Dict[str, Any]:
+        """Tracked games by state, upstream polls, and published events vs deliveries to subscribers."""
+        games: Dict[str, int] = {}
+        for feed in self._feeds.values():
+            games[feed.state] = games.get(feed.state, 0) + 1
+        return {
+            "running": self.running,
+            "tracked_games": games,
+            "subscribers": len(self._subscribers),
+            "dropped_events": sum(s.dropped for s in self._subscribers),
+            **self._stats,
+            "polls": dict(self._stats["polls"]),
+        }
+
+
+def _parse_utc(value: Optional[str]) -> Optional[float]:
+    """Parses the scoreboard's `gameTimeUTC` (e.g. "2024-01-15T00:30:00Z") into a timestamp."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+_live_ingestion: Optional[LiveIngestionService] = None
+
+
+def get_live_ingestion() -> LiveIngestionService:
+    """Returns the process-wide ingestion service (started by main.py when LIVE_INGESTION_ENABLED)."""
+    global _live_ingestion
+    if _live_ingestion is None:
+        _live_ingestion = LiveIngestionService()
+    return _live_ingestion
+
+
+def live_ingestion_info() -> Dict[str, Any]:
+    if _live_ingestion is None:
+        return {"running": False, "snapshots": live_snapshot_info(), "playbyplay_store": get_live_pbp_store().info()}
+    return {**_live_ingestion.info(), "snapshots": live_snapshot_info(), "playbyplay_store": get_live_pbp_store().info()}
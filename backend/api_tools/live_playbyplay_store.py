@@ -0,0 +1,277 @@
+"""
+Incremental store of live play-by-play, keyed by `actionNumber`.
+
+The live feed returns every action of the game on each request. `LivePlayByPlayStore.update`
+formats only the actions it has not seen (or that the feed edited since), and keeps a
+running score/clock/on-court state, so a fourth-quarter update costs the same as a
+first-quarter one. Readers ask for the plays after an action-number cursor and get
+only those, plus corrections to earlier plays made after the cursor was issued.
+"""
+import re
+import bisect
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+import pandas as pd
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_CLOCK_RE = re.compile(r"PT(\d+)M(\d+\.?\d*)S")
+MAX_ON_COURT = 5
+
+
+def format_live_clock(raw_clock: Any) -> Any:
+    """Formats an ISO-8601 game clock ("PT11M58.00S") as "11:58"; other values are returned unchanged."""
+    match = _CLOCK_RE.match(str(raw_clock))
+    return f"{match.group(1)}:{match.group(2).split('.')[0].zfill(2)}" if match else raw_clock
+
+
+def _event_type(action: Dict[str, Any]) -> str:
+    return f"{str(action.get('actionType', '')).upper()}_{str(action.get('subType', '')).upper()}"
+
+
+def _team_side(team_id: Any, home_team_id: Any, away_team_id: Any) -> str:
+    if team_id is None:
+        return "neutral"
+    return "home" if team_id == home_team_id else "away" if team_id == away_team_id else "neutral"
+
+
+class _GamePlays:
+    """Formatted plays and running state of one game."""
+
+    def __init__(self, home_team_id: Any, away_team_id: Any):
+        self.home_team_id = home_team_id
+        self.away_team_id = away_team_id
+        self.numbers: List[int] = []          # Sorted action numbers
+        self.rows: Dict[int, Dict[str, Any]] = {}   # DataFrame rows (raw action + formatted columns)
+        self.plays: Dict[int, Dict[str, Any]] = {}  # JSON plays, as returned by the play-by-play tool
+        self.edited: Dict[int, Any] = {}
+        self.revised_at: Dict[int, int] = {}  # Edited action -> latest action number when the edit was seen
+        self.removed_at: Dict[int, int] = {}  # Removed action -> latest action number when it disappeared
+        self.on_court: Dict[str, Set[Any]] = {}  # Team tricode -> person IDs
+        self.player_names: Dict[Any, str] = {}
+        self.state: Dict[str, Any] = {}
+
+    @property
+    def latest(self) -> int:
+        return self.numbers[-1] if self.numbers else 0
+
+    def format(self, number: int, action: Dict[str, Any]) -> None:
+        side = _team_side(action.get("teamId"), self.home_team_id, self.away_team_id)
+        clock = format_live_clock(action.get("clock", ""))
+        score_home, score_away = action.get("scoreHome"), action.get("scoreAway")
+        score = f"{score_home}-{score_away}" if score_home is not None and score_away is not None else None
+        self.rows[number] = {
+            **action,
+            "team": side,
+            "clock": clock,
+            "score": score,
+            "event_type": _event_type(action) if action.get("actionType") is not None else "",
+        }
+        self.plays[number] = {
+            "event_num": number,
+            "clock": clock,
+            "score": score,
+            "team": side,
+            "team_tricode": action.get("teamTricode"),
+            "description": action.get("description"),
+            "person_id": action.get("personId"),
+            "player_name": action.get("playerNameI") or action.get("playerName"),
+            "action_type": action.get("actionType"),
+            "sub_type": action.get("subType"),
+            "event_type": _event_type(action),
+        }
+        self.edited[number] = action.get("edited")
+
+    def track_lineup(self, action: Dict[str, Any]) -> None:
+        """Applies one action to the on-court sets: period starts reset them, substitutions move players, and
+        a player seen acting is on court (which is how each period's starters are discovered)."""
+        action_type = str(action.get("actionType", "")).lower()
+        if action_type == "period" and str(action.get("subType", "")).lower() == "start":
+            for players in self.on_court.values():
+                players.clear()
+            return
+        team = action.get("teamTricode")
+        person_id = action.get("personId")
+        if not team or not person_id:
+            return
+        if action.get("playerNameI") or action.get("playerName"):
+            self.player_names[person_id] = action.get("playerNameI") or action.get("playerName")
+        players = self.on_court.setdefault(team, set())
+        if action_type == "substitution":
+            if str(action.get("subType", "")).lower() == "out":
+                players.discard(person_id)
+            elif len(players) < MAX_ON_COURT:
+                players.add(person_id)
+        elif person_id not in players and len(players) < MAX_ON_COURT:
+            players.add(person_id)
+
+    def rebuild_lineups(self) -> None:
+        for players in self.on_court.values():
+            players.clear()
+        for number in self.numbers:
+            self.track_lineup(self.rows[number])
+
+    def update_state(self, last_action: Dict[str, Any]) -> None:
+        self.state = {
+            "period": last_action.get("period"),
+            "clock": format_live_clock(last_action.get("clock", "")),
+            "score": {"home": last_action.get("scoreHome"), "away": last_action.get("scoreAway")},
+            "on_court": {
+                team: [{"person_id": pid, "player_name": self.player_names.get(pid)} for pid in sorted(players)]
+                for team, players in self.on_court.items()
+            },
+            "last_action_number": self.latest,
+        }
+
+    def periods(self, numbers: List[int]) -> List[Dict[str, Any]]:
+        grouped: Dict[Any, List[Dict[str, Any]]] = {}
+        for number in numbers:
+            grouped.setdefault(self.rows[number].get("period", 0), []).append(self.plays[number])
+        return [{"period": period, "plays": plays} for period, plays in sorted(grouped.items())]
+
+
+class LivePlayByPlayStore:
+    """
+    Formatted live play-by-play of the most recently updated games (settings.LIVE_PBP_MAX_GAMES).
+    Shared by the play-by-play tool (worker threads) and the live ingestion poller (event loop).
+    """
+
+    def __init__(self, max_games: Optional[int] = None):
+        self.max_games = max_games or settings.LIVE_PBP_MAX_GAMES
+        self._games: "OrderedDict[str, _GamePlays]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"updates": 0, "actions_formatted": 0, "actions_skipped": 0, "edits": 0, "removals": 0}
+
+    def update(self, game_id: str, live_data: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Merges a live play-by-play payload (`PlayByPlay.get_dict()`) into the game's plays.
+        Returns how many actions were new, edited and removed.
+        """
+        game = live_data.get("game", {})
+        actions = game.get("actions", [])
+        with self._lock:
+            plays = self._games.get(game_id)
+            if plays is None:
+                plays = _GamePlays(game.get("homeTeam", {}).get("teamId"), game.get("awayTeam", {}).get("teamId"))
+                self._games[game_id] = plays
+                while len(self._games) > self.max_games:
+                    self._games.popitem(last=False)
+            self._games.move_to_end(game_id)
+
+            new = edited = removed = 0
+            lineup_changed_in_past = False
+            for action in actions:
+                number = action.get("actionNumber")
+                if number is None:
+                    continue
+                if number not in plays.rows:
+                    in_order = number > plays.latest
+                    plays.format(number, action)
+                    bisect.insort(plays.numbers, number)
+                    if in_order:
+                        plays.track_lineup(plays.rows[number])
+                    else:
+                        lineup_changed_in_past = True
+                    new += 1
+                elif action.get("edited") != plays.edited.get(number):
+                    lineup_changed_in_past |= "substitution" in (str(action.get("actionType", "")).lower(),
+                                                                 str(plays.rows[number].get("actionType", "")).lower())
+                    plays.format(number, action)
+                    plays.revised_at[number] = plays.latest
+                    edited += 1
+            if len(plays.numbers) != len(actions):
+                present = {action.get("actionNumber") for action in actions}
+                for number in [n for n in plays.numbers if n not in present]:
+                    lineup_changed_in_past = True
+                    del plays.rows[number], plays.plays[number], plays.edited[number]
+                    plays.revised_at.pop(number, None)
+                    plays.removed_at[number] = plays.latest
+                    removed += 1
+                plays.numbers = [n for n in plays.numbers if n in plays.rows]
+            if lineup_changed_in_past:
+                plays.rebuild_lineups()
+            if plays.numbers:
+                plays.update_state(plays.rows[plays.latest])
+
+            self._stats["updates"] += 1
+            self._stats["actions_formatted"] += new + edited
+            self._stats["actions_skipped"] += len(actions) - new - edited
+            self._stats["edits"] += edited
+            self._stats["removals"] += removed
+        return {"new": new, "edited": edited, "removed": removed}
+
+    def has_game(self, game_id: str) -> bool:
+        with self._lock:
+            return game_id in self._games
+
+    def changes(self, game_id: str, since: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Plays after action number `since`, grouped by period, with the game's running state.
+        `corrections` are earlier plays edited while `since` or a later action was the latest, and
+        `removed` the action numbers dropped by the feed in that time; both may repeat until a newer
+        action arrives, so clients apply plays by `event_num`. Pass `cursor.next` as the next `since`.
+        Returns None for a game that is not in the store.
+        """
+        with self._lock:
+            plays = self._games.get(game_id)
+            if plays is None:
+                return None
+            start = bisect.bisect_right(plays.numbers, since)
+            result: Dict[str, Any] = {
+                "periods": plays.periods(plays.numbers[start:]),
+                "cursor": {"since": since, "next": max(plays.latest, since)},
+                "state": dict(plays.state),
+            }
+            if since > 0:
+                corrections = [n for n, at in plays.revised_at.items() if n <= since <= at]
+                removed = sorted(n for n, at in plays.removed_at.items() if n <= since <= at)
+                if corrections:
+                    result["corrections"] = [
+                        {**plays.plays[n], "period": plays.rows[n].get("period")} for n in sorted(corrections)
+                    ]
+                if removed:
+                    result["removed"] = removed
+            return result
+
+    def frame(self, game_id: str, since: int = 0) -> pd.DataFrame:
+        """The game's plays after `since` as the formatted DataFrame used for filtering and dataset output."""
+        with self._lock:
+            plays = self._games.get(game_id)
+            if plays is None:
+                return pd.DataFrame()
+            start = bisect.bisect_right(plays.numbers, since)
+            return pd.DataFrame([plays.rows[n] for n in plays.numbers[start:]])
+
+    def periods(self, game_id: str, numbers: List[int]) -> List[Dict[str, Any]]:
+        """Groups the given action numbers' plays by period (numbers not in the store are skipped)."""
+        with self._lock:
+            plays = self._games.get(game_id)
+            if plays is None:
+                return []
+            return plays.periods([n for n in numbers if n in plays.rows])
+
+    def drop(self, game_id: str) -> None:
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"games": len(self._games), **self._stats}
+
+
+_store: Optional[LivePlayByPlayStore] = None
+_store_lock = threading.Lock()
+
+
+def get_live_pbp_store() -> LivePlayByPlayStore:
+    """Returns the process-wide live play-by-play store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LivePlayByPlayStore()
+        return _store
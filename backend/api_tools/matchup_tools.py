@@ -1,42 +1,29 @@
 """
 Handles fetching and processing player matchup statistics, including
 player-vs-player season matchups and defensive player rollup stats.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
-from datetime import datetime
 import pandas as pd
 from typing import Dict, Tuple, Any, Type, Optional, Set, List, Union
-from functools import lru_cache
 
 from nba_api.stats.endpoints import LeagueSeasonMatchups, MatchupsRollup
 from nba_api.stats.library.parameters import SeasonTypeAllStar
 from config import settings
 from core.errors import Errors
 from api_tools.utils import format_response, _process_dataframe, find_player_id_or_error, PlayerNotFoundError
+from utils.cache import cached_logic
 from utils.validation import _validate_season_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
 # --- Cache Directory Setup ---
 MATCHUPS_CSV_DIR = get_cache_dir("matchups")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_season_matchups(
     def_player_id: int,
@@ -45,7 +32,7 @@ def _get_csv_path_for_season_matchups(
     season_type: str
 ) -> str:
     """
-    Generates a file path for saving season matchups DataFrame as CSV.
+    Generates a file path for saving season matchups DataFrame as Parquet.
 
     Args:
         def_player_id: Defensive player ID
@@ -54,12 +41,12 @@ def _get_csv_path_for_season_matchups(
         season_type: The season type (e.g., 'Regular Season', 'Playoffs')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean season type for filename
     clean_season_type = season_type.replace(" ", "_").lower()
 
-    filename = f"season_matchups_{def_player_id}_{off_player_id}_{season}_{clean_season_type}.csv"
+    filename = f"season_matchups_{def_player_id}_{off_player_id}_{season}_{clean_season_type}.parquet"
     return get_cache_file_path(filename, "matchups")
 
 def _get_csv_path_for_matchups_rollup(
@@ -68,7 +55,7 @@ def _get_csv_path_for_matchups_rollup(
     season_type: str
 ) -> str:
     """
-    Generates a file path for saving matchups rollup DataFrame as CSV.
+    Generates a file path for saving matchups rollup DataFrame as Parquet.
 
     Args:
         def_player_id: Defensive player ID
@@ -76,35 +63,33 @@ def _get_csv_path_for_matchups_rollup(
         season_type: The season type (e.g., 'Regular Season', 'Playoffs')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean season type for filename
     clean_season_type = season_type.replace(" ", "_").lower()
 
-    filename = f"matchups_rollup_{def_player_id}_{season}_{clean_season_type}.csv"
+    filename = f"matchups_rollup_{def_player_id}_{season}_{clean_season_type}.parquet"
     return get_cache_file_path(filename, "matchups")
 
 # --- Module-Level Constants ---
-CACHE_TTL_SECONDS_MATCHUPS = 3600 * 6  # Cache matchup data for 6 hours
 MATCHUP_DATA_CACHE_SIZE = 128
 
 _MATCHUP_VALID_SEASON_TYPES: Set[str] = {SeasonTypeAllStar.regular, SeasonTypeAllStar.preseason, SeasonTypeAllStar.playoffs}
 
 # --- Helper for Fetching and Caching Raw Endpoint Data ---
-@lru_cache(maxsize=MATCHUP_DATA_CACHE_SIZE)
+@cached_logic(maxsize=MATCHUP_DATA_CACHE_SIZE)
 def _get_cached_endpoint_dict(
     cache_key_tuple: Tuple,
-    timestamp_bucket: str,
     endpoint_class: Type[Any],
     api_params: Dict[str, Any]
 ) -> Dict[str, Any]:
     """
     Cached wrapper for NBA API endpoints returning a dictionary.
-    Used by matchup tools to cache raw API responses.
+    Used by matchup tools to cache raw API responses. Expiry follows the freshness
+    policy for `api_params["season"]` (current season short-lived, past seasons immutable).
 
     Args:
         cache_key_tuple: A unique tuple for caching, including endpoint name and key API parameters.
-        timestamp_bucket: A string derived from the current time, bucketed for cache invalidation.
         endpoint_class: The specific NBA API endpoint class to instantiate.
         api_params: Keyword arguments to be passed directly to the endpoint_class constructor.
 
@@ -114,8 +99,7 @@ def _get_cached_endpoint_dict(
     Raises:
         Exception: If the API call fails, to be handled by the caller.
     """
-    # Log parameters without the timestamp_bucket for brevity if it's too verbose
-    logger.info(f"Cache miss/expiry for {endpoint_class.__name__} (ts: {timestamp_bucket}) - fetching. Params: {api_params}")
+    logger.info(f"Cache miss/expiry for {endpoint_class.__name__} - fetching. Params: {api_params}")
     try:
         endpoint_instance = endpoint_class(**api_params, timeout=settings.DEFAULT_TIMEOUT_SECONDS)
         return endpoint_instance.get_dict()
@@ -185,7 +169,7 @@ def _extract_dataframe_from_response(
     return df
 
 # --- Main Logic Functions ---
-@lru_cache(maxsize=MATCHUP_DATA_CACHE_SIZE) # Caches the final processed string response
+@cached_logic(maxsize=MATCHUP_DATA_CACHE_SIZE) # Caches the final processed string response
 def fetch_league_season_matchups_logic(
     def_player_identifier: str,
     off_player_identifier: str,
@@ -251,23 +235,17 @@ def fetch_league_season_matchups_logic(
         "season_type_playoffs": season_type
     }
     raw_data_cache_key = ("LeagueSeasonMatchups", str(def_player_id_resolved), str(off_player_id_resolved), season, season_type)
-    timestamp_bucket = str(int(datetime.now().timestamp() // CACHE_TTL_SECONDS_MATCHUPS))
 
     try:
         response_dict: Dict[str, Any]
         live_endpoint_instance = None
 
-        if bypass_cache or season == settings.CURRENT_NBA_SEASON:
+        if bypass_cache:
             logger.info(f"Fetching fresh LeagueSeasonMatchups data (Bypass: {bypass_cache}, Season: {season})")
             live_endpoint_instance = LeagueSeasonMatchups(**api_params, timeout=settings.DEFAULT_TIMEOUT_SECONDS)
             response_dict = live_endpoint_instance.get_dict()
-            if not bypass_cache and response_dict: # Update cache if fresh call for current season was successful
-                 # Consider clearing specific entry or letting LRU handle it.
-                 # For simplicity, we can rely on the timestamp_bucket for invalidation.
-                 # If we want to force update the cache with this new data:
-                 _get_cached_endpoint_dict(raw_data_cache_key, timestamp_bucket, LeagueSeasonMatchups, api_params)
         else:
-            response_dict = _get_cached_endpoint_dict(raw_data_cache_key, timestamp_bucket, LeagueSeasonMatchups, api_params)
+            response_dict = _get_cached_endpoint_dict(raw_data_cache_key, LeagueSeasonMatchups, api_params)
 
         matchups_df = _extract_dataframe_from_response(response_dict, "SeasonMatchups", live_endpoint_instance)
 
@@ -304,7 +282,7 @@ def fetch_league_season_matchups_logic(
         if return_dataframe:
             dataframes["matchups"] = matchups_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not matchups_df.empty:
                 csv_path = _get_csv_path_for_season_matchups(
                     def_player_id=def_player_id_resolved,
@@ -312,7 +290,7 @@ def fetch_league_season_matchups_logic(
                     season=season,
                     season_type=season_type
                 )
-                _save_dataframe_to_csv(matchups_df, csv_path)
+                save_dataset(matchups_df, csv_path)
 
                 # Add relative path to response
                 relative_path = get_relative_cache_path(
@@ -321,7 +299,7 @@ def fetch_league_season_matchups_logic(
                 )
 
                 result_payload["dataframe_info"] = {
-                    "message": "Season matchups data has been converted to DataFrame and saved as CSV file",
+                    "message": "Season matchups data has been converted to DataFrame and saved as Parquet file",
                     "dataframes": {
                         "matchups": {
                             "shape": list(matchups_df.shape),
@@ -344,7 +322,7 @@ def fetch_league_season_matchups_logic(
             return error_response, dataframes
         return error_response
 
-@lru_cache(maxsize=MATCHUP_DATA_CACHE_SIZE)
+@cached_logic(maxsize=MATCHUP_DATA_CACHE_SIZE)
 def fetch_matchups_rollup_logic(
     def_player_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -406,21 +384,17 @@ def fetch_matchups_rollup_logic(
         "season_type_playoffs": season_type
     }
     raw_data_cache_key = ("MatchupsRollup", str(def_player_id_resolved), season, season_type)
-    timestamp_bucket = str(int(datetime.now().timestamp() // CACHE_TTL_SECONDS_MATCHUPS))
 
     try:
         response_dict: Dict[str, Any]
         live_endpoint_instance = None
 
-        if bypass_cache or season == settings.CURRENT_NBA_SEASON:
+        if bypass_cache:
             logger.info(f"Fetching fresh MatchupsRollup data (Bypass: {bypass_cache}, Season: {season})")
             live_endpoint_instance = MatchupsRollup(**api_params, timeout=settings.DEFAULT_TIMEOUT_SECONDS)
             response_dict = live_endpoint_instance.get_dict()
-            if not bypass_cache and response_dict:
-                 _get_cached_endpoint_dict.cache_clear()
-                 _get_cached_endpoint_dict(raw_data_cache_key, timestamp_bucket, MatchupsRollup, api_params)
         else:
-            response_dict = _get_cached_endpoint_dict(raw_data_cache_key, timestamp_bucket, MatchupsRollup, api_params)
+            response_dict = _get_cached_endpoint_dict(raw_data_cache_key, MatchupsRollup, api_params)
 
         rollup_df = _extract_dataframe_from_response(response_dict, "MatchupsRollup", live_endpoint_instance)
 
@@ -455,14 +429,14 @@ def fetch_matchups_rollup_logic(
         if return_dataframe:
             dataframes["rollup"] = rollup_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not rollup_df.empty:
                 csv_path = _get_csv_path_for_matchups_rollup(
                     def_player_id=def_player_id_resolved,
                     season=season,
                     season_type=season_type
                 )
-                _save_dataframe_to_csv(rollup_df, csv_path)
+                save_dataset(rollup_df, csv_path)
 
                 # Add relative path to response
                 relative_path = get_relative_cache_path(
@@ -471,7 +445,7 @@ def fetch_matchups_rollup_logic(
                 )
 
                 result_payload["dataframe_info"] = {
-                    "message": "Matchups rollup data has been converted to DataFrame and saved as CSV file",
+                    "message": "Matchups rollup data has been converted to DataFrame and saved as Parquet file",
                     "dataframes": {
                         "rollup": {
                             "shape": list(rollup_df.shape),
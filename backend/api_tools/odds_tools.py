@@ -1,13 +1,12 @@
 """
 Handles fetching live betting odds for today's NBA games using NBALiveHTTP.
 Includes caching logic for the raw API response.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
 from typing import Any, Dict, Optional, Union, List, Tuple
-from functools import lru_cache
 from datetime import datetime
 import pandas as pd
 
@@ -15,29 +14,29 @@ from nba_api.live.nba.library.http import NBALiveHTTP
 from config import settings
 from core.errors import Errors
 from api_tools.utils import format_response
+from utils.cache import cached_logic
+from utils.cache_policy import DataClass
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
 # --- Module-Level Constants ---
-CACHE_TTL_SECONDS_ODDS = 3600  # 1 hour
 ODDS_RAW_CACHE_SIZE = 2
 ODDS_ENDPOINT_PATH = "odds/odds_todaysGames.json"
 ODDS_CSV_DIR = get_cache_dir("odds")
 
 # --- Caching Function for Raw Data ---
-@lru_cache(maxsize=ODDS_RAW_CACHE_SIZE)
+@cached_logic(maxsize=ODDS_RAW_CACHE_SIZE, data_class=DataClass.INTRADAY)
 def get_cached_odds_data(
-    cache_key: str, # Static part of the key, e.g., "todays_live_odds"
-    timestamp_bucket: str # Timestamp bucket for time-based invalidation
+    cache_key: str # Static part of the key, e.g., "todays_live_odds"
 ) -> Dict[str, Any]:
     """
     Cached wrapper for fetching live odds data using `NBALiveHTTP`.
-    The `timestamp_bucket` ensures periodic cache invalidation.
+    Expiry follows the INTRADAY freshness class (settings.CACHE_TTL_INTRADAY_SECONDS).
 
     Args:
         cache_key: A static string for the cache key.
-        timestamp_bucket: A string derived from the current time, bucketed by CACHE_TTL_SECONDS_ODDS.
 
     Returns:
         The raw dictionary response from the odds endpoint.
@@ -45,7 +44,7 @@ def get_cached_odds_data(
     Raises:
         Exception: If the API call fails, to be handled by the caller.
     """
-    logger.info(f"Cache miss or expiry for odds data - fetching new data (Key: {cache_key}, Timestamp Bucket: {timestamp_bucket})")
+    logger.info(f"Cache miss or expiry for odds data - fetching new data (Key: {cache_key})")
     try:
         http_client = NBALiveHTTP()
         response = http_client.send_api_request(
@@ -192,29 +191,29 @@ def _convert_to_dataframe(games_data: List[Dict[str, Any]]) -> pd.DataFrame:
 
 def _save_to_csv(df: pd.DataFrame, date_str: str = None) -> str:
     """
-    Saves the DataFrame to a CSV file using the standardized path_utils approach.
+    Saves the DataFrame to a Parquet file using the standardized path_utils approach.
 
     Args:
         df: DataFrame to save
         date_str: Optional date string to include in the filename (defaults to today's date)
 
     Returns:
-        Relative path to the saved CSV file
+        Relative path to the saved Parquet file
     """
     if date_str is None:
         date_str = datetime.now().strftime('%Y-%m-%d')
 
-    filename = f"odds_data_{date_str}.csv"
+    filename = f"odds_data_{date_str}.parquet"
     file_path = get_cache_file_path(filename, "odds")
 
     try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved odds data to CSV: {file_path}")
+        if save_dataset(df, file_path, endpoint="odds", params={"date": date_str}) is None:
+            return ""
 
         # Return the relative path for inclusion in the response
         return get_relative_cache_path(filename, "odds")
     except Exception as e:
-        logger.error(f"Error saving odds data to CSV: {e}", exc_info=True)
+        logger.error(f"Error saving odds data: {e}", exc_info=True)
         return ""
 
 # --- Main Logic Function ---
@@ -276,7 +275,6 @@ def fetch_odds_data_logic(
     logger.info(f"Executing fetch_odds_data_logic with bypass_cache={bypass_cache}, return_dataframe={return_dataframe}")
 
     cache_key_odds = "todays_live_odds_data"
-    cache_invalidation_timestamp_bucket = str(int(datetime.now().timestamp() // CACHE_TTL_SECONDS_ODDS))
 
     try:
         raw_response_dict: Dict[str, Any]
@@ -288,7 +286,7 @@ def fetch_odds_data_logic(
             )
             raw_response_dict = api_response.get_dict()
         else:
-            raw_response_dict = get_cached_odds_data(cache_key=cache_key_odds, timestamp_bucket=cache_invalidation_timestamp_bucket)
+            raw_response_dict = get_cached_odds_data(cache_key=cache_key_odds)
 
         games_data_list = raw_response_dict.get("games", [])
 
@@ -302,16 +300,16 @@ def fetch_odds_data_logic(
         if return_dataframe:
             df = _convert_to_dataframe(games_data_list)
 
-            # Get today's date for the CSV filename
+            # Get today's date for the Parquet filename
             today_date_str = datetime.now().strftime('%Y-%m-%d')
 
-            # Save to CSV and get the relative path
+            # Save to Parquet and get the relative path
             csv_relative_path = _save_to_csv(df, today_date_str)
 
             # Add DataFrame metadata to the response
             if csv_relative_path:
                 result_payload["dataframe_info"] = {
-                    "message": "Odds data has been converted to DataFrame and saved as CSV file",
+                    "message": "Odds data has been converted to DataFrame and saved as Parquet file",
                     "dataframes": {
                         "odds": {
                             "shape": list(df.shape),
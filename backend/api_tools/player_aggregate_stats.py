@@ -1,11 +1,12 @@
 """
 Handles aggregating various player statistics from different sources,
 including common info, career stats, game logs for a specific season, and awards.
-Provides both JSON and DataFrame outputs with CSV caching.
+The four parts are fetched concurrently (api_tools/composite.py).
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import json
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Optional, Dict, Any, Union, Tuple
 import pandas as pd
 from nba_api.stats.library.parameters import SeasonTypeAllStar
@@ -13,11 +14,14 @@ from config import settings
 from core.errors import Errors
 from api_tools.utils import (
     format_response,
+    parse_response,
     find_player_id_or_error,
     PlayerNotFoundError
 )
+from api_tools.composite import SubFetch, fetch_concurrently
 from utils.validation import _validate_season_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 from .player_common_info import fetch_player_info_logic
 from .player_career_data import fetch_player_career_stats_logic, fetch_player_awards_logic
 from .player_gamelogs import fetch_player_gamelog_logic
@@ -25,28 +29,16 @@ from .player_gamelogs import fetch_player_gamelog_logic
 logger = logging.getLogger(__name__)
 
 PLAYER_AGGREGATE_STATS_CACHE_SIZE = 128
+AGGREGATE_REQUIRED_PARTS = frozenset({"info_and_headlines", "career"})  # Other parts are reported as partial errors
 
 # --- Cache Directory Setup ---
 PLAYER_STATS_CSV_DIR = get_cache_dir("player_stats")
 
 # --- Helper Functions ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_player_stats(player_name: str, season: str, season_type: str, data_type: str) -> str:
     """
-    Generates a file path for saving a player stats DataFrame as CSV.
+    Generates a file path for saving a player stats DataFrame as Parquet.
 
     Args:
         player_name: The player's name
@@ -55,7 +47,7 @@ def _get_csv_path_for_player_stats(player_name: str, season: str, season_type: s
         data_type: The type of data (e.g., 'info', 'career', 'gamelog', 'awards')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean player name for filename
     clean_player_name = player_name.replace(" ", "_").replace(".", "").lower()
@@ -63,9 +55,10 @@ def _get_csv_path_for_player_stats(player_name: str, season: str, season_type: s
     # Clean season type for filename
     clean_season_type = season_type.replace(" ", "_").lower()
 
-    filename = f"{clean_player_name}_{season}_{clean_season_type}_{data_type}.csv"
+    filename = f"{clean_player_name}_{season}_{clean_season_type}_{data_type}.parquet"
     return get_cache_file_path(filename, "player_stats")
 
+@cached_logic()
 def fetch_player_stats_logic(
     player_name: str,
     season: Optional[str] = None,
@@ -122,21 +115,25 @@ def fetch_player_stats_logic(
         results_json = {}
         dataframes = {}
 
-        # Define the logic functions to call
-        logic_functions_config = {
-            "info_and_headlines": (fetch_player_info_logic, [player_actual_name]),
-            "career": (fetch_player_career_stats_logic, [player_actual_name]),
-            "gamelog_for_season": (fetch_player_gamelog_logic, [player_actual_name, effective_season, season_type]),
-            "awards_history": (fetch_player_awards_logic, [player_actual_name])
-        }
-
-        # Call each logic function and process the results
-        for key, (func, args) in logic_functions_config.items():
-            result_str = func(*args)
+        # Fetch the independent parts concurrently; info and career are required, the rest degrade to partial errors
+        sub_results = fetch_concurrently({
+            "info_and_headlines": SubFetch(fetch_player_info_logic, (player_actual_name,)),
+            "career": SubFetch(fetch_player_career_stats_logic, (player_actual_name,)),
+            "gamelog_for_season": SubFetch(fetch_player_gamelog_logic, (player_actual_name, effective_season, season_type)),
+            "awards_history": SubFetch(fetch_player_awards_logic, (player_actual_name,)),
+        })
+        partial_errors = []
+
+        # Process the result of each part
+        for key, outcome in sub_results.items():
+            result_str = outcome.value if outcome.error is None else format_response(error=outcome.error)
             try:
-                data = json.loads(result_str)
+                data = parse_response(result_str)
                 if "error" in data:
                     logger.error(f"Error from {key} logic for {player_actual_name}: {data['error']}")
+                    if key not in AGGREGATE_REQUIRED_PARTS:
+                        partial_errors.append(f"{key}: {data['error']}")
+                        continue
                     error_response = result_str
                     if return_dataframe:
                         return error_response, {}
@@ -152,27 +149,27 @@ def fetch_player_stats_logic(
                             info_df = pd.DataFrame([data["player_info"]])
                             dataframes["player_info"] = info_df
 
-                            # Save to CSV
+                            # Save to Parquet
                             csv_path = _get_csv_path_for_player_stats(player_actual_name, effective_season, season_type, "info")
-                            _save_dataframe_to_csv(info_df, csv_path)
+                            save_dataset(info_df, csv_path)
 
                         # Convert headline stats to DataFrame
                         if "headline_stats" in data:
                             headline_df = pd.DataFrame([data["headline_stats"]])
                             dataframes["headline_stats"] = headline_df
 
-                            # Save to CSV
+                            # Save to Parquet
                             csv_path = _get_csv_path_for_player_stats(player_actual_name, effective_season, season_type, "headline_stats")
-                            _save_dataframe_to_csv(headline_df, csv_path)
+                            save_dataset(headline_df, csv_path)
 
                         # Convert available seasons to DataFrame
                         if "available_seasons" in data:
                             seasons_df = pd.DataFrame(data["available_seasons"])
                             dataframes["available_seasons"] = seasons_df
 
-                            # Save to CSV
+                            # Save to Parquet
                             csv_path = _get_csv_path_for_player_stats(player_actual_name, effective_season, season_type, "available_seasons")
-                            _save_dataframe_to_csv(seasons_df, csv_path)
+                            save_dataset(seasons_df, csv_path)
 
                     elif key == "career":
                         # Convert season totals regular season to DataFrame
@@ -180,36 +177,36 @@ def fetch_player_stats_logic(
                             reg_season_df = pd.DataFrame(data["season_totals_regular_season"])
                             dataframes["season_totals_regular_season"] = reg_season_df
 
-                            # Save to CSV
+                            # Save to Parquet
                             csv_path = _get_csv_path_for_player_stats(player_actual_name, effective_season, season_type, "season_totals_regular")
-                            _save_dataframe_to_csv(reg_season_df, csv_path)
+                            save_dataset(reg_season_df, csv_path)
 
                         # Convert career totals regular season to DataFrame
                         if "career_totals_regular_season" in data:
                             career_reg_df = pd.DataFrame([data["career_totals_regular_season"]])
                             dataframes["career_totals_regular_season"] = career_reg_df
 
-                            # Save to CSV
+                            # Save to Parquet
                             csv_path = _get_csv_path_for_player_stats(player_actual_name, effective_season, season_type, "career_totals_regular")
-                            _save_dataframe_to_csv(career_reg_df, csv_path)
+                            save_dataset(career_reg_df, csv_path)
 
                         # Convert season totals post season to DataFrame
                         if "season_totals_post_season" in data:
                             post_season_df = pd.DataFrame(data["season_totals_post_season"])
                             dataframes["season_totals_post_season"] = post_season_df
 
-                            # Save to CSV
+                            # Save to Parquet
                             csv_path = _get_csv_path_for_player_stats(player_actual_name, effective_season, season_type, "season_totals_post")
-                            _save_dataframe_to_csv(post_season_df, csv_path)
+                            save_dataset(post_season_df, csv_path)
 
                         # Convert career totals post season to DataFrame
                         if "career_totals_post_season" in data:
                             career_post_df = pd.DataFrame([data["career_totals_post_season"]])
                             dataframes["career_totals_post_season"] = career_post_df
 
-                            # Save to CSV
+                            # Save to Parquet
                             csv_path = _get_csv_path_for_player_stats(player_actual_name, effective_season, season_type, "career_totals_post")
-                            _save_dataframe_to_csv(career_post_df, csv_path)
+                            save_dataset(career_post_df, csv_path)
 
                     elif key == "gamelog_for_season":
                         # Convert gamelog to DataFrame
@@ -217,9 +214,9 @@ def fetch_player_stats_logic(
                             gamelog_df = pd.DataFrame(data["gamelog"])
                             dataframes["gamelog"] = gamelog_df
 
-                            # Save to CSV
+                            # Save to Parquet
                             csv_path = _get_csv_path_for_player_stats(player_actual_name, effective_season, season_type, "gamelog")
-                            _save_dataframe_to_csv(gamelog_df, csv_path)
+                            save_dataset(gamelog_df, csv_path)
 
                     elif key == "awards_history":
                         # Convert awards to DataFrame
@@ -227,9 +224,9 @@ def fetch_player_stats_logic(
                             awards_df = pd.DataFrame(data["awards"])
                             dataframes["awards"] = awards_df
 
-                            # Save to CSV
+                            # Save to Parquet
                             csv_path = _get_csv_path_for_player_stats(player_actual_name, effective_season, season_type, "awards")
-                            _save_dataframe_to_csv(awards_df, csv_path)
+                            save_dataset(awards_df, csv_path)
 
             except json.JSONDecodeError as parse_error:
                 logger.error(f"Failed to parse JSON from {key} logic for {player_actual_name}: {parse_error}. Response: {result_str}")
@@ -262,18 +259,20 @@ def fetch_player_stats_logic(
             "season_gamelog": gamelog_data.get("gamelog", []),
             "awards": awards_data.get("awards", [])
         }
+        if partial_errors:
+            result_dict["partial_errors"] = partial_errors
 
         # Add DataFrame metadata to the response if DataFrames are being returned
         if return_dataframe and dataframes:
             dataframe_info = {
-                "message": "Player aggregate stats data has been converted to DataFrames and saved as CSV files",
+                "message": "Player aggregate stats data has been converted to DataFrames and saved as Parquet files",
                 "dataframes": {}
             }
 
             for df_key, df in dataframes.items():
                 if not df.empty:
-                    # Get the relative path for the CSV file
-                    csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_{effective_season}_{season_type.replace(' ', '_').lower()}_{df_key}.csv"
+                    # Get the relative path for the Parquet file
+                    csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_{effective_season}_{season_type.replace(' ', '_').lower()}_{df_key}.parquet"
                     relative_path = get_relative_cache_path(csv_filename, "player_stats")
 
                     dataframe_info["dataframes"][df_key] = {
@@ -1,7 +1,7 @@
 """
 Handles fetching and processing player career by college rollup data
 from the PlayerCareerByCollegeRollup endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 The PlayerCareerByCollegeRollup endpoint provides comprehensive college rollup data (4 DataFrames):
 - Tournament Info: REGION, SEED, COLLEGE, PLAYERS (4 columns)
@@ -16,41 +16,14 @@ import logging
 import os
 import json
 from typing import Optional, Dict, Any, Set, Union, Tuple
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import playercareerbycollegerollup
 from nba_api.stats.library.parameters import SeasonTypeAllStar, PerModeSimple
 import pandas as pd
 
 from utils.path_utils import get_cache_dir, get_cache_file_path
-
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    # Handle multi-level columns by flattening them
-    if hasattr(df.columns, 'nlevels') and df.columns.nlevels > 1:
-        # Flatten multi-level columns
-        df = df.copy()
-        df.columns = ['_'.join(str(col).strip() for col in cols if str(col).strip()) for cols in df.columns.values]
-    
-    # Convert any remaining tuple columns to strings
-    if any(isinstance(col, tuple) for col in df.columns):
-        df = df.copy()
-        df.columns = [str(col) if isinstance(col, tuple) else col for col in df.columns]
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 def _validate_season_format(season):
     """Validate season format (YYYY-YY)."""
@@ -88,27 +61,7 @@ PLAYER_CAREER_BY_COLLEGE_ROLLUP_CSV_DIR = get_cache_dir("player_career_by_colleg
 # Ensure cache directories exist
 os.makedirs(PLAYER_CAREER_BY_COLLEGE_ROLLUP_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-    
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        # Save DataFrame to CSV with UTF-8 encoding
-        df.to_csv(file_path, index=False, encoding='utf-8')
-        
-        # Log the file size and path
-        file_size = os.path.getsize(file_path)
-        logger.info(f"Saved DataFrame to CSV: {file_path} (Size: {file_size} bytes)")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_career_by_college_rollup(
     league_id: str = "00",
@@ -128,7 +81,7 @@ def _get_csv_path_for_player_career_by_college_rollup(
         data_set_name: Name of the data set
         
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Create a filename based on the parameters
     filename_parts = [
@@ -140,7 +93,7 @@ def _get_csv_path_for_player_career_by_college_rollup(
         data_set_name
     ]
     
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
     
     return get_cache_file_path(filename, "player_career_by_college_rollup")
 
@@ -163,7 +116,7 @@ def _validate_player_career_by_college_rollup_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=PLAYER_CAREER_BY_COLLEGE_ROLLUP_CACHE_SIZE)
+@cached_logic(maxsize=PLAYER_CAREER_BY_COLLEGE_ROLLUP_CACHE_SIZE)
 def fetch_player_career_by_college_rollup_logic(
     league_id: str = "00",
     per_mode_simple: str = PerModeSimple.totals,
@@ -174,7 +127,7 @@ def fetch_player_career_by_college_rollup_logic(
     """
     Fetches player career by college rollup data using the PlayerCareerByCollegeRollup endpoint.
     
-    Provides DataFrame output capabilities and CSV caching.
+    Provides DataFrame output capabilities and Parquet caching.
     
     Args:
         league_id: League ID (default: "00" for NBA)
@@ -207,7 +160,7 @@ def fetch_player_career_by_college_rollup_logic(
             return error_response, {}
         return error_response
     
-    # Check for cached CSV files
+    # Check for cached Parquet files
     dataframes = {}
     
     # Try to load from cache first
@@ -222,19 +175,14 @@ def fetch_player_career_by_college_rollup_logic(
             )
             if os.path.exists(csv_path):
                 try:
-                    # Check if the file is empty or too small
-                    file_size = os.path.getsize(csv_path)
-                    if file_size < 100:  # If file is too small, it's probably empty or corrupted
-                        logger.warning(f"CSV file is too small ({file_size} bytes), fetching from API instead")
-                        all_cached = False
-                        break
+                    df = load_dataset(csv_path)
+                    if df is None:
+                        logger.warning(f"Cached dataset missing or unreadable, fetching from API instead: {csv_path}")
                     else:
-                        logger.info(f"Loading player career by college rollup from CSV: {csv_path}")
-                        # Read CSV with appropriate data types
-                        df = pd.read_csv(csv_path, encoding='utf-8')
+                        logger.info(f"Loading player career by college rollup from dataset cache: {csv_path}")
                         dataframes[data_set_name] = df
                 except Exception as e:
-                    logger.error(f"Error loading CSV: {e}", exc_info=True)
+                    logger.error(f"Error loading Parquet: {e}", exc_info=True)
                     all_cached = False
                     break
             else:
@@ -300,11 +248,11 @@ def fetch_player_career_by_college_rollup_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
                     
-                    # Save DataFrame to CSV
+                    # Save DataFrame to the dataset cache
                     csv_path = _get_csv_path_for_player_career_by_college_rollup(
                         league_id, per_mode_simple, season_type_all_star, season_nullable, data_set_name
                     )
-                    _save_dataframe_to_csv(df, csv_path)
+                    save_dataset(df, csv_path)
                 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
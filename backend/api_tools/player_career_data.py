@@ -1,9 +1,9 @@
 """
 Handles fetching and processing player career statistics and awards information.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Dict, Any, Union, Tuple, Optional, List
 import pandas as pd
 import json
@@ -19,6 +19,7 @@ from api_tools.utils import (
     PlayerNotFoundError
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -35,23 +36,10 @@ PLAYER_CAREER_CSV_DIR = get_cache_dir("player_career")
 PLAYER_AWARDS_CSV_DIR = get_cache_dir("player_awards")
 
 # --- Helper Functions ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_career_stats(player_name: str, per_mode: str, data_type: str) -> str:
     """
-    Generates a file path for saving a player career stats DataFrame as CSV.
+    Generates a file path for saving a player career stats DataFrame as Parquet.
 
     Args:
         player_name: The player's name
@@ -59,7 +47,7 @@ def _get_csv_path_for_career_stats(player_name: str, per_mode: str, data_type: s
         data_type: The type of data (e.g., 'season_regular', 'career_regular', 'season_post', 'career_post')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean player name for filename
     clean_player_name = player_name.replace(" ", "_").replace(".", "").lower()
@@ -67,25 +55,26 @@ def _get_csv_path_for_career_stats(player_name: str, per_mode: str, data_type: s
     # Clean per mode for filename
     clean_per_mode = per_mode.lower()
 
-    filename = f"{clean_player_name}_{clean_per_mode}_{data_type}.csv"
+    filename = f"{clean_player_name}_{clean_per_mode}_{data_type}.parquet"
     return get_cache_file_path(filename, "player_career")
 
 def _get_csv_path_for_awards(player_name: str) -> str:
     """
-    Generates a file path for saving a player awards DataFrame as CSV.
+    Generates a file path for saving a player awards DataFrame as Parquet.
 
     Args:
         player_name: The player's name
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean player name for filename
     clean_player_name = player_name.replace(" ", "_").replace(".", "").lower()
 
-    filename = f"{clean_player_name}_awards.csv"
+    filename = f"{clean_player_name}_awards.parquet"
     return get_cache_file_path(filename, "player_awards")
 
+@cached_logic()
 def fetch_player_career_stats_logic(
     player_name: str,
     per_mode: str = PerModeDetailed.per_game,
@@ -174,25 +163,25 @@ def fetch_player_career_stats_logic(
         available_season_cols_ps = [col for col in season_totals_cols if col in season_totals_ps_df.columns]
         filtered_season_ps_df = season_totals_ps_df.loc[:, available_season_cols_ps] if not season_totals_ps_df.empty and available_season_cols_ps else pd.DataFrame()
 
-        # Save DataFrames to CSV if returning DataFrames
+        # Save DataFrames to the dataset cache if returning DataFrames
         if return_dataframe:
             # Save regular season data
             if not filtered_season_rs_df.empty:
                 csv_path = _get_csv_path_for_career_stats(player_actual_name, per_mode, "season_regular")
-                _save_dataframe_to_csv(filtered_season_rs_df, csv_path)
+                save_dataset(filtered_season_rs_df, csv_path)
 
             if not career_totals_rs_df.empty:
                 csv_path = _get_csv_path_for_career_stats(player_actual_name, per_mode, "career_regular")
-                _save_dataframe_to_csv(career_totals_rs_df, csv_path)
+                save_dataset(career_totals_rs_df, csv_path)
 
             # Save post season data
             if not filtered_season_ps_df.empty:
                 csv_path = _get_csv_path_for_career_stats(player_actual_name, per_mode, "season_post")
-                _save_dataframe_to_csv(filtered_season_ps_df, csv_path)
+                save_dataset(filtered_season_ps_df, csv_path)
 
             if not career_totals_ps_df.empty:
                 csv_path = _get_csv_path_for_career_stats(player_actual_name, per_mode, "career_post")
-                _save_dataframe_to_csv(career_totals_ps_df, csv_path)
+                save_dataset(career_totals_ps_df, csv_path)
 
         # Process DataFrames for JSON response
         season_totals_regular_season = _process_dataframe(filtered_season_rs_df, single_row=False)
@@ -224,13 +213,13 @@ def fetch_player_career_stats_logic(
         # Add DataFrame metadata to the response if DataFrames are being returned
         if return_dataframe:
             dataframe_info = {
-                "message": "Player career stats data has been converted to DataFrames and saved as CSV files",
+                "message": "Player career stats data has been converted to DataFrames and saved as Parquet files",
                 "dataframes": {}
             }
 
             # Add metadata for regular season data
             if not filtered_season_rs_df.empty:
-                csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_{per_mode.lower()}_season_regular.csv"
+                csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_{per_mode.lower()}_season_regular.parquet"
                 relative_path = get_relative_cache_path(csv_filename, "player_career")
 
                 dataframe_info["dataframes"]["season_totals_regular_season"] = {
@@ -240,7 +229,7 @@ def fetch_player_career_stats_logic(
                 }
 
             if not career_totals_rs_df.empty:
-                csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_{per_mode.lower()}_career_regular.csv"
+                csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_{per_mode.lower()}_career_regular.parquet"
                 relative_path = get_relative_cache_path(csv_filename, "player_career")
 
                 dataframe_info["dataframes"]["career_totals_regular_season"] = {
@@ -251,7 +240,7 @@ def fetch_player_career_stats_logic(
 
             # Add metadata for post season data
             if not filtered_season_ps_df.empty:
-                csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_{per_mode.lower()}_season_post.csv"
+                csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_{per_mode.lower()}_season_post.parquet"
                 relative_path = get_relative_cache_path(csv_filename, "player_career")
 
                 dataframe_info["dataframes"]["season_totals_post_season"] = {
@@ -261,7 +250,7 @@ def fetch_player_career_stats_logic(
                 }
 
             if not career_totals_ps_df.empty:
-                csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_{per_mode.lower()}_career_post.csv"
+                csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_{per_mode.lower()}_career_post.parquet"
                 relative_path = get_relative_cache_path(csv_filename, "player_career")
 
                 dataframe_info["dataframes"]["career_totals_post_season"] = {
@@ -307,6 +296,7 @@ def fetch_player_career_stats_logic(
             return error_response, {}
         return error_response
 
+@cached_logic()
 def fetch_player_awards_logic(
     player_name: str,
     return_dataframe: bool = False
@@ -353,10 +343,10 @@ def fetch_player_awards_logic(
         # Get DataFrame from the API response
         awards_df = awards_endpoint.player_awards.get_data_frame()
 
-        # Save DataFrame to CSV if returning DataFrame
+        # Save DataFrame to the dataset cache if returning DataFrame
         if return_dataframe and not awards_df.empty:
             csv_path = _get_csv_path_for_awards(player_actual_name)
-            _save_dataframe_to_csv(awards_df, csv_path)
+            save_dataset(awards_df, csv_path)
 
         # Process DataFrame for JSON response
         awards_list = _process_dataframe(awards_df, single_row=False)
@@ -378,11 +368,11 @@ def fetch_player_awards_logic(
 
         # Add DataFrame metadata to the response if DataFrames are being returned
         if return_dataframe and not awards_df.empty:
-            csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_awards.csv"
+            csv_filename = f"{player_actual_name.replace(' ', '_').replace('.', '').lower()}_awards.parquet"
             relative_path = get_relative_cache_path(csv_filename, "player_awards")
 
             response_data["dataframe_info"] = {
-                "message": "Player awards data has been converted to DataFrame and saved as CSV file",
+                "message": "Player awards data has been converted to DataFrame and saved as Parquet file",
                 "dataframes": {
                     "awards": {
                         "shape": list(awards_df.shape),
@@ -1,14 +1,13 @@
 """
 Handles fetching and processing player clutch performance statistics
 from the PlayerDashboardByClutch endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
 from typing import Optional, Dict, Any, Set, Union, Tuple, List
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import playerdashboardbyclutch
 from nba_api.stats.library.parameters import (
     SeasonTypeAllStar, PerModeDetailed, MeasureTypeDetailed
@@ -24,6 +23,7 @@ from api_tools.utils import (
     PlayerNotFoundError
 )
 from utils.validation import _validate_season_format, validate_date_format
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -43,20 +43,7 @@ PLAYER_CLUTCH_CSV_DIR = os.path.join(CSV_CACHE_DIR, "player_clutch")
 os.makedirs(CSV_CACHE_DIR, exist_ok=True)
 os.makedirs(PLAYER_CLUTCH_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_clutch(
     player_name: str,
@@ -65,7 +52,7 @@ def _get_csv_path_for_player_clutch(
     dashboard_name: str
 ) -> str:
     """
-    Generates a file path for saving player clutch DataFrame as CSV.
+    Generates a file path for saving player clutch DataFrame as Parquet.
 
     Args:
         player_name: The player's name
@@ -74,14 +61,14 @@ def _get_csv_path_for_player_clutch(
         dashboard_name: The name of the clutch dashboard
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean player name and dashboard name for filename
     clean_player_name = player_name.replace(" ", "_").replace(".", "").lower()
     clean_season_type = season_type.replace(" ", "_").lower()
     clean_dashboard = dashboard_name.replace(" ", "_").lower()
 
-    filename = f"{clean_player_name}_{season}_{clean_season_type}_{clean_dashboard}.csv"
+    filename = f"{clean_player_name}_{season}_{clean_season_type}_{clean_dashboard}.parquet"
     return os.path.join(PLAYER_CLUTCH_CSV_DIR, filename)
 
 # --- Helper for Parameter Validation ---
@@ -126,7 +113,7 @@ def _validate_clutch_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=PLAYER_CLUTCH_CACHE_SIZE)
+@cached_logic(maxsize=PLAYER_CLUTCH_CACHE_SIZE)
 def fetch_player_clutch_stats_logic(
     player_name: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -157,7 +144,7 @@ def fetch_player_clutch_stats_logic(
     The "clutch" aspect is inherent to the endpoint; parameters serve to filter these stats.
     Various clutch scenarios are returned as different data sets within the response.
 
-    Provides DataFrame output capabilities and CSV caching for each data set.
+    Provides DataFrame output capabilities and Parquet caching for each data set.
 
     Args:
         player_name: Name or ID of the player.
@@ -291,14 +278,14 @@ def fetch_player_clutch_stats_logic(
 
                     if return_dataframe: # This stores the original, unprocessed DataFrame
                         dataframes_for_return[set_name] = current_df.copy() # Store a copy of the original df
-                        # Save the processed_df_output (list of dicts) to CSV if needed, or save current_df
+                        # Save the processed_df_output (list of dicts) to the dataset cache if needed, or save current_df
                         # For consistency with to_dict(orient='records'), we should save the processed data if that was the intent
-                        # However, the CSV saving logic was using processed_df which was a DataFrame before.
-                        # Let's save the current_df to CSV as it's the raw data for that table.
+                        # However, the Parquet saving logic was using processed_df which was a DataFrame before.
+                        # Let's save the current_df to Parquet as it's the raw data for that table.
                         csv_path = _get_csv_path_for_player_clutch(
                             player_actual_name, season, season_type, set_name
                         )
-                        _save_dataframe_to_csv(current_df.copy(), csv_path) # Save the unprocessed df to CSV
+                        save_dataset(current_df.copy(), csv_path) # Save the unprocessed df to the dataset cache
                 except Exception as e:
                     logger.error(f"Error processing data set '{set_name}' for player clutch stats: {e}", exc_info=True)
                     result_dict["data_sets"][set_name] = {"error": f"Failed to process data set: {e}"}
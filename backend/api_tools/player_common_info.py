@@ -1,11 +1,11 @@
 """
 Handles fetching common player information, including biographical data,
 headline statistics, available seasons, and headshot URLs.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Dict, Any, Union, Tuple, Optional
 import pandas as pd
 import json
@@ -14,6 +14,7 @@ from nba_api.stats.endpoints import commonplayerinfo
 from config import settings
 from core.errors import Errors
 from api_tools.utils import _process_dataframe, format_response, find_player_id_or_error, PlayerNotFoundError
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -28,37 +29,25 @@ os.makedirs(CSV_CACHE_DIR, exist_ok=True)
 os.makedirs(PLAYER_INFO_CSV_DIR, exist_ok=True)
 
 # --- Helper Functions ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_player_info(player_name: str, data_type: str) -> str:
     """
-    Generates a file path for saving player info DataFrame as CSV.
+    Generates a file path for saving player info DataFrame as Parquet.
 
     Args:
         player_name: The player's name
         data_type: The type of data (e.g., 'info', 'headline_stats', 'available_seasons')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean player name for filename
     clean_player_name = player_name.replace(" ", "_").replace(".", "").lower()
 
-    filename = f"{clean_player_name}_{data_type}.csv"
+    filename = f"{clean_player_name}_{data_type}.parquet"
     return os.path.join(PLAYER_INFO_CSV_DIR, filename)
 
+@cached_logic()
 def fetch_player_info_logic(
     player_name: str,
     league_id_nullable: Optional[str] = None,
@@ -114,19 +103,19 @@ def fetch_player_info_logic(
         headline_stats_df = info_endpoint.player_headline_stats.get_data_frame()
         available_seasons_df = info_endpoint.available_seasons.get_data_frame()
 
-        # Save DataFrames to CSV if returning DataFrames
+        # Save DataFrames to the dataset cache if returning DataFrames
         if return_dataframe:
             if not player_info_df.empty:
                 csv_path = _get_csv_path_for_player_info(player_actual_name, "info")
-                _save_dataframe_to_csv(player_info_df, csv_path)
+                save_dataset(player_info_df, csv_path)
 
             if not headline_stats_df.empty:
                 csv_path = _get_csv_path_for_player_info(player_actual_name, "headline_stats")
-                _save_dataframe_to_csv(headline_stats_df, csv_path)
+                save_dataset(headline_stats_df, csv_path)
 
             if not available_seasons_df.empty:
                 csv_path = _get_csv_path_for_player_info(player_actual_name, "available_seasons")
-                _save_dataframe_to_csv(available_seasons_df, csv_path)
+                save_dataset(available_seasons_df, csv_path)
 
         # Process DataFrames for JSON response
         player_info_dict = _process_dataframe(player_info_df, single_row=True)
@@ -1,12 +1,12 @@
 """
 Handles fetching player dashboard statistics by year over year.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import os
 import logging
 import json
 from typing import Optional, List, Dict, Any, Set, Union, Tuple
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import playerdashboardbyyearoveryear
@@ -20,6 +20,7 @@ from api_tools.utils import (
 )
 from utils.validation import _validate_season_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -29,37 +30,24 @@ PLAYER_DASHBOARD_BY_YEAR_CACHE_SIZE = 128
 # --- Cache Directory Setup ---
 PLAYER_DASHBOARD_BY_YEAR_CSV_DIR = get_cache_dir("player_dashboard_by_year_over_year")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_dashboard_by_year(
     player_id: str,
     season: str
 ) -> str:
     """
-    Generates a file path for saving player dashboard by year DataFrame as CSV.
+    Generates a file path for saving player dashboard by year DataFrame as Parquet.
 
     Args:
         player_id: The player's ID
         season: The season in YYYY-YY format
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     return get_cache_file_path(
-        f"player_{player_id}_dashboard_by_year_{season}.csv",
+        f"player_{player_id}_dashboard_by_year_{season}.parquet",
         "player_dashboard_by_year_over_year"
     )
 
@@ -71,7 +59,7 @@ def _validate_dashboard_by_year_params(season: str) -> Optional[str]:
     return None
 
 # --- Logic Functions ---
-@lru_cache(maxsize=PLAYER_DASHBOARD_BY_YEAR_CACHE_SIZE)
+@cached_logic(maxsize=PLAYER_DASHBOARD_BY_YEAR_CACHE_SIZE)
 def fetch_player_dashboard_by_year_over_year_logic(
     player_name: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -139,13 +127,13 @@ def fetch_player_dashboard_by_year_over_year_logic(
         if not overall_df.empty:
             dataframes['overall_player_dashboard'] = overall_df
 
-        # Save to CSV if DataFrames are not empty
+        # Save to Parquet if DataFrames are not empty
         if return_dataframe and dataframes:
             csv_path = _get_csv_path_for_player_dashboard_by_year(str(player_id), season)
             
             # Save the main by_year DataFrame
             if 'by_year_player_dashboard' in dataframes:
-                _save_dataframe_to_csv(dataframes['by_year_player_dashboard'], csv_path)
+                save_dataset(dataframes['by_year_player_dashboard'], csv_path)
 
         # Prepare response data
         response_data = {
@@ -1,6 +1,6 @@
 """
 Handles fetching player dashboard statistics by general splits.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the PlayerDashboardByGeneralSplits endpoint, which provides
 detailed player statistics broken down by various splits:
@@ -16,7 +16,7 @@ import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import playerdashboardbygeneralsplits
@@ -32,6 +32,7 @@ from api_tools.utils import (
     PlayerNotFoundError
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -72,23 +73,6 @@ VALID_SEASON_TYPES = {
 }
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_dashboard(
     player_id: str,
@@ -99,7 +83,7 @@ def _get_csv_path_for_dashboard(
     dashboard_type: str
 ) -> str:
     """
-    Generates a file path for saving a dashboard DataFrame as CSV.
+    Generates a file path for saving a dashboard DataFrame as Parquet.
 
     Args:
         player_id: The player ID
@@ -110,7 +94,7 @@ def _get_csv_path_for_dashboard(
         dashboard_type: The dashboard type (e.g., overall_player_dashboard)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_")
@@ -119,7 +103,7 @@ def _get_csv_path_for_dashboard(
     measure_type_clean = measure_type.replace(" ", "_").lower()
     
     # Create filename
-    filename = f"{player_id}_{season_clean}_{season_type_clean}_{per_mode_clean}_{measure_type_clean}_{dashboard_type}.csv"
+    filename = f"{player_id}_{season_clean}_{season_type_clean}_{per_mode_clean}_{measure_type_clean}_{dashboard_type}.parquet"
     
     return get_cache_file_path(filename, "player_dashboard_general")
 
@@ -171,7 +155,7 @@ def _validate_dashboard_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=PLAYER_DASHBOARD_GENERAL_CACHE_SIZE)
+@cached_logic(maxsize=PLAYER_DASHBOARD_GENERAL_CACHE_SIZE)
 def fetch_player_dashboard_general_splits_logic(
     player_name: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -298,12 +282,12 @@ def fetch_player_dashboard_general_splits_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
                     
-                    # Save to CSV if not empty
+                    # Save to Parquet if not empty
                     if not df.empty:
                         csv_path = _get_csv_path_for_dashboard(
                             player_id_val, season, season_type, per_mode, measure_type, data_set_name
                         )
-                        _save_dataframe_to_csv(df, csv_path)
+                        save_dataset(df, csv_path)
                 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
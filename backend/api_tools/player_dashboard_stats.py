@@ -1,13 +1,13 @@
 """
 Handles fetching various player dashboard statistics including profile,
 defensive stats, and hustle stats.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import os
 import logging
 import json
 from typing import Optional, List, Dict, Any, Set, Union, Tuple
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import (
@@ -27,6 +27,7 @@ from api_tools.utils import (
 )
 from utils.validation import _validate_season_format, validate_date_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -53,36 +54,23 @@ _VALID_DEFENSE_PER_MODES: Set[str] = {getattr(PerModeSimple, attr) for attr in d
 
 _VALID_HUSTLE_PER_MODES: Set[str] = {getattr(PerModeTime, attr) for attr in dir(PerModeTime) if not attr.startswith('_') and isinstance(getattr(PerModeTime, attr), str)}
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_profile(player_id: str, per_mode: str) -> str:
     """
-    Generates a file path for saving player profile DataFrame as CSV.
+    Generates a file path for saving player profile DataFrame as Parquet.
 
     Args:
         player_id: The player's ID
         per_mode: The per mode (e.g., 'PerGame', 'Totals')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean per mode for filename
     clean_per_mode = per_mode.replace(" ", "_").lower()
 
-    return get_cache_file_path(f"player_{player_id}_profile_{clean_per_mode}.csv", "player_dashboard/profile")
+    return get_cache_file_path(f"player_{player_id}_profile_{clean_per_mode}.parquet", "player_dashboard/profile")
 
 def _get_csv_path_for_player_defense(
     player_id: str,
@@ -92,7 +80,7 @@ def _get_csv_path_for_player_defense(
     opponent_team_id: int
 ) -> str:
     """
-    Generates a file path for saving player defense DataFrame as CSV.
+    Generates a file path for saving player defense DataFrame as Parquet.
 
     Args:
         player_id: The player's ID
@@ -102,7 +90,7 @@ def _get_csv_path_for_player_defense(
         opponent_team_id: The opponent team ID
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean season type for filename
     clean_season_type = season_type.replace(" ", "_").lower()
@@ -111,7 +99,7 @@ def _get_csv_path_for_player_defense(
     clean_per_mode = per_mode.replace(" ", "_").lower()
 
     return get_cache_file_path(
-        f"player_{player_id}_defense_{season}_{clean_season_type}_{clean_per_mode}_{opponent_team_id}.csv",
+        f"player_{player_id}_defense_{season}_{clean_season_type}_{clean_per_mode}_{opponent_team_id}.parquet",
         "player_dashboard/defense"
     )
 
@@ -124,7 +112,7 @@ def _get_csv_path_for_player_hustle(
     league_id: str = LeagueID.nba
 ) -> str:
     """
-    Generates a file path for saving player hustle DataFrame as CSV.
+    Generates a file path for saving player hustle DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -135,7 +123,7 @@ def _get_csv_path_for_player_hustle(
         league_id: The league ID (e.g., '00' for NBA)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean season type for filename
     clean_season_type = season_type.replace(" ", "_").lower()
@@ -145,11 +133,11 @@ def _get_csv_path_for_player_hustle(
 
     # Create filename based on filters
     if player_id:
-        filename = f"player_{player_id}_hustle_{season}_{clean_season_type}_{clean_per_mode}.csv"
+        filename = f"player_{player_id}_hustle_{season}_{clean_season_type}_{clean_per_mode}.parquet"
     elif team_id:
-        filename = f"team_{team_id}_hustle_{season}_{clean_season_type}_{clean_per_mode}.csv"
+        filename = f"team_{team_id}_hustle_{season}_{clean_season_type}_{clean_per_mode}.parquet"
     else:
-        filename = f"league_{league_id}_hustle_{season}_{clean_season_type}_{clean_per_mode}.csv"
+        filename = f"league_{league_id}_hustle_{season}_{clean_season_type}_{clean_per_mode}.parquet"
 
     return get_cache_file_path(filename, "player_dashboard/hustle")
 
@@ -267,22 +255,22 @@ def fetch_player_profile_logic(
             dataframes["career_highs"] = career_highs_df
             dataframes["next_game"] = next_game_df
 
-            # Save to CSV if not empty
+            # Save to Parquet if not empty
             if not career_totals_rs_df.empty:
                 csv_path = _get_csv_path_for_player_profile(player_id, effective_per_mode)
-                _save_dataframe_to_csv(career_totals_rs_df, csv_path)
+                save_dataset(career_totals_rs_df, csv_path)
 
             if not season_totals_rs_df.empty:
-                csv_path = get_cache_file_path(f"player_{player_id}_season_totals_rs_{effective_per_mode.replace(' ', '_').lower()}.csv", "player_dashboard/profile")
-                _save_dataframe_to_csv(season_totals_rs_df, csv_path)
+                csv_path = get_cache_file_path(f"player_{player_id}_season_totals_rs_{effective_per_mode.replace(' ', '_').lower()}.parquet", "player_dashboard/profile")
+                save_dataset(season_totals_rs_df, csv_path)
 
             if not career_totals_ps_df.empty:
-                csv_path = get_cache_file_path(f"player_{player_id}_career_totals_ps_{effective_per_mode.replace(' ', '_').lower()}.csv", "player_dashboard/profile")
-                _save_dataframe_to_csv(career_totals_ps_df, csv_path)
+                csv_path = get_cache_file_path(f"player_{player_id}_career_totals_ps_{effective_per_mode.replace(' ', '_').lower()}.parquet", "player_dashboard/profile")
+                save_dataset(career_totals_ps_df, csv_path)
 
             if not season_totals_ps_df.empty:
-                csv_path = get_cache_file_path(f"player_{player_id}_season_totals_ps_{effective_per_mode.replace(' ', '_').lower()}.csv", "player_dashboard/profile")
-                _save_dataframe_to_csv(season_totals_ps_df, csv_path)
+                csv_path = get_cache_file_path(f"player_{player_id}_season_totals_ps_{effective_per_mode.replace(' ', '_').lower()}.parquet", "player_dashboard/profile")
+                save_dataset(season_totals_ps_df, csv_path)
 
         season_highs_dict = _process_dataframe(season_highs_df, single_row=True)
         career_highs_dict = _process_dataframe(career_highs_df, single_row=True)
@@ -338,22 +326,22 @@ def fetch_player_profile_logic(
         if return_dataframe:
             # Add DataFrame info to the response
             response_data["dataframe_info"] = {
-                "message": "Player profile data has been converted to DataFrames and saved as CSV files",
+                "message": "Player profile data has been converted to DataFrames and saved as Parquet files",
                 "dataframes": {
                     "player_info": {
                         "shape": list(player_info_df.shape) if 'player_info_df' in locals() and not player_info_df.empty else [],
                         "columns": player_info_df.columns.tolist() if 'player_info_df' in locals() and not player_info_df.empty else [],
-                        "csv_path": get_relative_cache_path(f"player_{player_id}_info.csv", "player_dashboard/profile")
+                        "csv_path": get_relative_cache_path(f"player_{player_id}_info.parquet", "player_dashboard/profile")
                     },
                     "career_totals_regular_season": {
                         "shape": list(career_totals_rs_df.shape) if not career_totals_rs_df.empty else [],
                         "columns": career_totals_rs_df.columns.tolist() if not career_totals_rs_df.empty else [],
-                        "csv_path": get_relative_cache_path(f"player_{player_id}_profile_{effective_per_mode.replace(' ', '_').lower()}.csv", "player_dashboard/profile")
+                        "csv_path": get_relative_cache_path(f"player_{player_id}_profile_{effective_per_mode.replace(' ', '_').lower()}.parquet", "player_dashboard/profile")
                     },
                     "season_totals_regular_season": {
                         "shape": list(season_totals_rs_df.shape) if not season_totals_rs_df.empty else [],
                         "columns": season_totals_rs_df.columns.tolist() if not season_totals_rs_df.empty else [],
-                        "csv_path": get_relative_cache_path(f"player_{player_id}_season_totals_rs_{effective_per_mode.replace(' ', '_').lower()}.csv", "player_dashboard/profile")
+                        "csv_path": get_relative_cache_path(f"player_{player_id}_season_totals_rs_{effective_per_mode.replace(' ', '_').lower()}.parquet", "player_dashboard/profile")
                     }
                 }
             }
@@ -362,10 +350,10 @@ def fetch_player_profile_logic(
             if 'player_info_df' in locals() and not player_info_df.empty:
                 dataframes["player_info"] = player_info_df
 
-            # Save player_info DataFrame to CSV if available
+            # Save player_info DataFrame to the dataset cache if available
             if 'player_info_df' in locals() and not player_info_df.empty:
-                csv_path = get_cache_file_path(f"player_{player_id}_info.csv", "player_dashboard/profile")
-                _save_dataframe_to_csv(player_info_df, csv_path)
+                csv_path = get_cache_file_path(f"player_{player_id}_info.parquet", "player_dashboard/profile")
+                save_dataset(player_info_df, csv_path)
 
             return format_response(response_data), dataframes
 
@@ -387,7 +375,7 @@ def fetch_player_profile_logic(
             return format_response(error=error_msg), dataframes
         return format_response(error=error_msg)
 
-@lru_cache(maxsize=PLAYER_DEFENSE_CACHE_SIZE)
+@cached_logic(maxsize=PLAYER_DEFENSE_CACHE_SIZE)
 def fetch_player_defense_logic(
     player_name: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -504,7 +492,7 @@ def fetch_player_defense_logic(
                 csv_path = _get_csv_path_for_player_defense(
                     player_id, season, season_type, per_mode, opponent_team_id
                 )
-                _save_dataframe_to_csv(def_roll_up_df, csv_path)
+                save_dataset(def_roll_up_df, csv_path)
 
         processed_def_roll_up = _process_dataframe(def_roll_up_df, single_row=False) if not def_roll_up_df.empty else []
 
@@ -550,7 +538,7 @@ def fetch_player_defense_logic(
         if return_dataframe: return format_response(error=error_msg), dataframes
         return format_response(error=error_msg)
 
-@lru_cache(maxsize=PLAYER_HUSTLE_CACHE_SIZE)
+@cached_logic(maxsize=PLAYER_HUSTLE_CACHE_SIZE)
 def fetch_player_hustle_stats_logic(
     season: str = settings.CURRENT_NBA_SEASON,
     season_type: str = SeasonTypeAllStar.regular,
@@ -736,7 +724,7 @@ def fetch_player_hustle_stats_logic(
                 csv_path = _get_csv_path_for_player_hustle(
                     season, season_type, per_mode, player_id_resolved, team_id if not player_id_resolved else None, league_id
                 )
-                _save_dataframe_to_csv(hustle_stats_df, csv_path)
+                save_dataset(hustle_stats_df, csv_path)
 
         # Limit results if league-wide and too many rows
         if not player_id_resolved and (team_id is None or team_id == NBA_API_DEFAULT_TEAM_ID_ALL) and len(hustle_stats_df) > MAX_LEAGUE_WIDE_HUSTLE_RESULTS:
@@ -1,12 +1,12 @@
 """
 Handles fetching player dashboard statistics by team performance.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import playerdashboardbyteamperformance
@@ -23,6 +23,7 @@ from api_tools.utils import (
 )
 from utils.validation import _validate_season_format, validate_date_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -35,20 +36,7 @@ _VALID_PER_MODES = {getattr(PerModeDetailed, attr) for attr in dir(PerModeDetail
 _VALID_MEASURE_TYPES = {getattr(MeasureTypeDetailed, attr) for attr in dir(MeasureTypeDetailed) if not attr.startswith('_') and isinstance(getattr(MeasureTypeDetailed, attr), str)}
 _VALID_LEAGUE_IDS = {getattr(LeagueID, attr) for attr in dir(LeagueID) if not attr.startswith('_') and isinstance(getattr(LeagueID, attr), str)}
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_team_performance(
     player_id: str,
@@ -59,7 +47,7 @@ def _get_csv_path_for_team_performance(
     dashboard_type: str
 ) -> str:
     """
-    Generates a file path for saving player team performance DataFrame as CSV.
+    Generates a file path for saving player team performance DataFrame as Parquet.
 
     Args:
         player_id: The player's ID
@@ -70,7 +58,7 @@ def _get_csv_path_for_team_performance(
         dashboard_type: The dashboard type (e.g., 'overall', 'points_scored')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean parameters for filename
     clean_season_type = season_type.replace(" ", "_").lower()
@@ -78,10 +66,11 @@ def _get_csv_path_for_team_performance(
     clean_measure_type = measure_type.replace(" ", "_").lower()
 
     return get_cache_file_path(
-        f"player_{player_id}_team_performance_{dashboard_type}_{season}_{clean_season_type}_{clean_per_mode}_{clean_measure_type}.csv",
+        f"player_{player_id}_team_performance_{dashboard_type}_{season}_{clean_season_type}_{clean_per_mode}_{clean_measure_type}.parquet",
         "player_team_performance"
     )
 
+@cached_logic()
 def fetch_player_dashboard_by_team_performance_logic(
     player_name: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -246,14 +235,14 @@ def fetch_player_dashboard_by_team_performance_logic(
             "score_differential_player_dashboard"
         ]
 
-        # Store DataFrames and save to CSV if requested
+        # Store DataFrames and save to Parquet if requested
         if return_dataframe:
             for idx, name in enumerate(dataset_names):
                 if idx < len(datasets):
                     df = datasets[idx]
                     dataframes[name] = df
 
-                    # Save to CSV if not empty
+                    # Save to Parquet if not empty
                     if not df.empty:
                         csv_path = _get_csv_path_for_team_performance(
                             player_id=player_id,
@@ -263,7 +252,7 @@ def fetch_player_dashboard_by_team_performance_logic(
                             measure_type=measure_type,
                             dashboard_type=name
                         )
-                        _save_dataframe_to_csv(df, csv_path)
+                        save_dataset(df, csv_path)
 
         # Process DataFrames for JSON response
         result = {}
@@ -318,7 +307,7 @@ def fetch_player_dashboard_by_team_performance_logic(
                     csv_paths[name] = get_relative_cache_path(os.path.basename(csv_path), "player_team_performance")
 
             response_data["dataframe_info"] = {
-                "message": "Player team performance data has been converted to DataFrames and saved as CSV files",
+                "message": "Player team performance data has been converted to DataFrames and saved as Parquet files",
                 "dataframes": {
                     name: {
                         "shape": list(dataframes[name].shape) if name in dataframes and not dataframes[name].empty else [],
@@ -1,11 +1,11 @@
 """
 Handles fetching player estimated metrics (E_OFF_RATING, E_DEF_RATING, E_NET_RATING, etc.)
 for a given season and season type.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import os
 import logging
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Union, Tuple, Dict, Optional
 
 import pandas as pd
@@ -21,6 +21,7 @@ from core.errors import Errors
 from api_tools.utils import _process_dataframe, format_response
 from utils.validation import _validate_season_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -31,20 +32,7 @@ PLAYER_ESTIMATED_METRICS_CSV_DIR = get_cache_dir("player_estimated_metrics")
 _VALID_PEM_LEAGUE_IDS = {getattr(LeagueID, attr) for attr in dir(LeagueID) if not attr.startswith('_') and isinstance(getattr(LeagueID, attr), str)}
 _VALID_PEM_SEASON_TYPES = {getattr(SeasonTypeAllStar, attr) for attr in dir(SeasonTypeAllStar) if not attr.startswith('_') and isinstance(getattr(SeasonTypeAllStar, attr), str)}
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_estimated_metrics(
     season: str,
@@ -52,7 +40,7 @@ def _get_csv_path_for_estimated_metrics(
     league_id: str
 ) -> str:
     """
-    Generates a file path for saving player estimated metrics DataFrame as CSV.
+    Generates a file path for saving player estimated metrics DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -60,16 +48,17 @@ def _get_csv_path_for_estimated_metrics(
         league_id: The league ID (e.g., '00' for NBA)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean season type for filename
     clean_season_type = season_type.replace(" ", "_").lower()
 
     return get_cache_file_path(
-        f"player_estimated_metrics_{season}_{clean_season_type}_{league_id}.csv",
+        f"player_estimated_metrics_{season}_{clean_season_type}_{league_id}.parquet",
         "player_estimated_metrics"
     )
 
+@cached_logic()
 def fetch_player_estimated_metrics_logic(
     season: str = settings.CURRENT_NBA_SEASON,
     season_type: str = SeasonTypeAllStar.regular,
@@ -123,14 +112,14 @@ def fetch_player_estimated_metrics_logic(
 
         metrics_df = pem_endpoint.player_estimated_metrics.get_data_frame()
 
-        # Save DataFrame to CSV if requested and not empty
+        # Save DataFrame to the dataset cache if requested and not empty
         if return_dataframe and not metrics_df.empty:
             csv_path = _get_csv_path_for_estimated_metrics(
                 season=season,
                 season_type=season_type,
                 league_id=league_id
             )
-            _save_dataframe_to_csv(metrics_df, csv_path)
+            save_dataset(metrics_df, csv_path)
 
         metrics_list = _process_dataframe(metrics_df, single_row=False)
 
@@ -170,7 +159,7 @@ def fetch_player_estimated_metrics_logic(
                 )
 
                 result["dataframe_info"] = {
-                    "message": "Player estimated metrics data has been converted to DataFrame and saved as CSV file",
+                    "message": "Player estimated metrics data has been converted to DataFrame and saved as Parquet file",
                     "shape": list(metrics_df.shape),
                     "columns": metrics_df.columns.tolist(),
                     "csv_path": relative_path
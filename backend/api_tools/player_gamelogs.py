@@ -1,10 +1,10 @@
 """
 Handles fetching and processing player game logs for a specific season and season type.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Dict, Any, Union, Tuple, Optional, List
 import pandas as pd
 import json
@@ -20,6 +20,7 @@ from api_tools.utils import (
     PlayerNotFoundError
 )
 from utils.validation import _validate_season_format
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -34,23 +35,10 @@ os.makedirs(CSV_CACHE_DIR, exist_ok=True)
 os.makedirs(PLAYER_GAMELOG_CSV_DIR, exist_ok=True)
 
 # --- Helper Functions ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_player_gamelog(player_name: str, season: str, season_type: str) -> str:
     """
-    Generates a file path for saving player gamelog DataFrame as CSV.
+    Generates a file path for saving player gamelog DataFrame as Parquet.
 
     Args:
         player_name: The player's name
@@ -58,7 +46,7 @@ def _get_csv_path_for_player_gamelog(player_name: str, season: str, season_type:
         season_type: The season type (e.g., 'Regular Season', 'Playoffs')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean player name for filename
     clean_player_name = player_name.replace(" ", "_").replace(".", "").lower()
@@ -66,9 +54,10 @@ def _get_csv_path_for_player_gamelog(player_name: str, season: str, season_type:
     # Clean season type for filename
     clean_season_type = season_type.replace(" ", "_").lower()
 
-    filename = f"{clean_player_name}_{season}_{clean_season_type}_gamelog.csv"
+    filename = f"{clean_player_name}_{season}_{clean_season_type}_gamelog.parquet"
     return os.path.join(PLAYER_GAMELOG_CSV_DIR, filename)
 
+@cached_logic()
 def fetch_player_gamelog_logic(
     player_name: str,
     season: str,
@@ -172,10 +161,10 @@ def fetch_player_gamelog_logic(
         available_gamelog_cols = [col for col in gamelog_cols if col in gamelog_df.columns]
         filtered_gamelog_df = gamelog_df.loc[:, available_gamelog_cols] if available_gamelog_cols else pd.DataFrame()
 
-        # Save DataFrame to CSV if returning DataFrame
+        # Save DataFrame to the dataset cache if returning DataFrame
         if return_dataframe and not filtered_gamelog_df.empty:
             csv_path = _get_csv_path_for_player_gamelog(player_actual_name, season, season_type)
-            _save_dataframe_to_csv(filtered_gamelog_df, csv_path)
+            save_dataset(filtered_gamelog_df, csv_path)
 
         # Process DataFrame for JSON response
         gamelog_list = _process_dataframe(filtered_gamelog_df, single_row=False)
@@ -1,7 +1,7 @@
 """
 Handles fetching and processing player index data
 from the PlayerIndex endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 The PlayerIndex endpoint provides a comprehensive directory of all players (575+ players)
 with detailed information including:
@@ -16,29 +16,13 @@ import logging
 import os
 import json
 from typing import Optional, Dict, Any, Set, Union, Tuple
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import playerindex
 import pandas as pd
 
 from utils.path_utils import get_cache_dir, get_cache_file_path
-
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 def _validate_season_format(season):
     """Validate season format (YYYY-YY)."""
@@ -78,27 +62,7 @@ PLAYER_INDEX_CSV_DIR = get_cache_dir("player_index")
 # Ensure cache directories exist
 os.makedirs(PLAYER_INDEX_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV with UTF-8 encoding
-        df.to_csv(file_path, index=False, encoding='utf-8')
-
-        # Log the file size and path
-        file_size = os.path.getsize(file_path)
-        logger.info(f"Saved DataFrame to CSV: {file_path} (Size: {file_size} bytes)")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_index(
     league_id: str = "00",
@@ -122,7 +86,7 @@ def _get_csv_path_for_player_index(
         position: Position filter (optional)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Create a filename based on the parameters
     filename_parts = [
@@ -142,7 +106,7 @@ def _get_csv_path_for_player_index(
     if position:
         filename_parts.append(f"pos{position}")
 
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
 
     return get_cache_file_path(filename, "player_index")
 
@@ -171,7 +135,7 @@ def _validate_player_index_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=PLAYER_INDEX_CACHE_SIZE)
+@cached_logic(maxsize=PLAYER_INDEX_CACHE_SIZE)
 def fetch_player_index_logic(
     league_id: str = "00",
     season: str = CURRENT_NBA_SEASON,
@@ -187,7 +151,7 @@ def fetch_player_index_logic(
     """
     Fetches player index data using the PlayerIndex endpoint.
 
-    Provides DataFrame output capabilities and CSV caching.
+    Provides DataFrame output capabilities and Parquet caching.
 
     Args:
         league_id: League ID (default: "00" for NBA)
@@ -223,27 +187,17 @@ def fetch_player_index_logic(
             return error_response, {}
         return error_response
 
-    # Check for cached CSV file
+    # Check for cached Parquet file
     csv_path = _get_csv_path_for_player_index(league_id, season, active, allstar, historical, team_id, position)
     dataframes = {}
 
     if os.path.exists(csv_path) and return_dataframe:
         try:
-            # Check if the file is empty or too small
-            file_size = os.path.getsize(csv_path)
-            if file_size < 100:  # If file is too small, it's probably empty or corrupted
-                logger.warning(f"CSV file is too small ({file_size} bytes), fetching from API instead")
-                # Delete the corrupted file
-                try:
-                    os.remove(csv_path)
-                    logger.info(f"Deleted corrupted CSV file: {csv_path}")
-                except Exception as e:
-                    logger.error(f"Error deleting corrupted CSV file: {e}", exc_info=True)
-                # Continue to API fetch
+            df = load_dataset(csv_path)
+            if df is None:
+                logger.warning(f"Cached dataset missing or unreadable, fetching from API instead: {csv_path}")
             else:
-                logger.info(f"Loading player index from CSV: {csv_path}")
-                # Read CSV with appropriate data types
-                df = pd.read_csv(csv_path, encoding='utf-8')
+                logger.info(f"Loading player index from dataset cache: {csv_path}")
 
                 # Process for JSON response
                 result_dict = {
@@ -270,8 +224,8 @@ def fetch_player_index_logic(
                 return format_response(result_dict)
 
         except Exception as e:
-            logger.error(f"Error loading CSV: {e}", exc_info=True)
-            # If there's an error loading the CSV, fetch from the API
+            logger.error(f"Error loading Parquet: {e}", exc_info=True)
+            # If there's an error loading the Parquet, fetch from the API
 
     try:
         # Prepare API parameters (only include non-None values)
@@ -308,7 +262,7 @@ def fetch_player_index_logic(
             "data_sets": {}
         }
 
-        # Create a combined DataFrame for CSV storage
+        # Create a combined DataFrame for Parquet storage
         combined_df = pd.DataFrame()
 
         # Process each data frame
@@ -321,7 +275,7 @@ def fetch_player_index_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
 
-                    # Use the first (main) DataFrame for CSV storage
+                    # Use the first (main) DataFrame for Parquet storage
                     if idx == 0:
                         combined_df = df.copy()
 
@@ -329,9 +283,9 @@ def fetch_player_index_logic(
                 processed_data = _process_dataframe(df, single_row=False)
                 result_dict["data_sets"][data_set_name] = processed_data
 
-        # Save combined DataFrame to CSV
+        # Save combined DataFrame to the dataset cache
         if return_dataframe and not combined_df.empty:
-            _save_dataframe_to_csv(combined_df, csv_path)
+            save_dataset(combined_df, csv_path)
 
         final_json_response = format_response(result_dict)
         if return_dataframe:
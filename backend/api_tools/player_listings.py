@@ -1,10 +1,10 @@
 """
 Handles fetching NBA player listings data using the CommonAllPlayers endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Optional, Dict, Any, Union, Tuple
 import pandas as pd
 
@@ -19,30 +19,18 @@ from api_tools.utils import (
 )
 from utils.validation import _validate_season_format, _validate_league_id
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
 # --- Cache Directory Setup ---
 PLAYER_LISTINGS_CSV_DIR = get_cache_dir("player_listings")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_listings(season: str, league_id: str, is_only_current_season: int) -> str:
     """
-    Generates a file path for saving a player listings DataFrame as CSV.
+    Generates a file path for saving a player listings DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -50,11 +38,12 @@ def _get_csv_path_for_player_listings(season: str, league_id: str, is_only_curre
         is_only_current_season: Flag for current season only (1) or all players (0)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
-    filename = f"players_{season}_{league_id}_{is_only_current_season}.csv"
+    filename = f"players_{season}_{league_id}_{is_only_current_season}.parquet"
     return get_cache_file_path(filename, "player_listings")
 
+@cached_logic()
 def fetch_common_all_players_logic(
     season: str,
     league_id: str = LeagueID.nba,
@@ -135,10 +124,10 @@ def fetch_common_all_players_logic(
         # Get DataFrame
         players_df = common_all_players_endpoint.common_all_players.get_data_frame()
 
-        # Save to CSV if returning DataFrame
+        # Save to Parquet if returning DataFrame
         if return_dataframe:
             csv_path = _get_csv_path_for_player_listings(season, league_id, is_only_current_season)
-            _save_dataframe_to_csv(players_df, csv_path)
+            save_dataset(players_df, csv_path)
 
         # Process the DataFrame for JSON response
         players_list = _process_dataframe(players_df, single_row=False)
@@ -169,7 +158,7 @@ def fetch_common_all_players_logic(
             )
 
             response_data["dataframe_info"] = {
-                "message": "Player listings data has been converted to DataFrame and saved as CSV file",
+                "message": "Player listings data has been converted to DataFrame and saved as Parquet file",
                 "dataframes": {
                     "players": {
                         "shape": list(players_df.shape) if not players_df.empty else [],
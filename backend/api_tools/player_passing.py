@@ -1,12 +1,12 @@
 """
 Handles fetching and processing player passing statistics, including passes made and received.
 Requires an initial lookup for the player's current team_id via commonplayerinfo.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Set, Dict, Union, Tuple, Optional
 
 import pandas as pd
@@ -22,6 +22,7 @@ from api_tools.utils import (
     PlayerNotFoundError
 )
 from utils.validation import _validate_season_format
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -39,20 +40,7 @@ PLAYER_PASSING_CSV_DIR = os.path.join(CSV_CACHE_DIR, "player_passing")
 os.makedirs(CSV_CACHE_DIR, exist_ok=True)
 os.makedirs(PLAYER_PASSING_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_passing(
     player_name: str,
@@ -62,7 +50,7 @@ def _get_csv_path_for_player_passing(
     data_type: str
 ) -> str:
     """
-    Generates a file path for saving player passing DataFrame as CSV.
+    Generates a file path for saving player passing DataFrame as Parquet.
 
     Args:
         player_name: The player's name
@@ -72,16 +60,17 @@ def _get_csv_path_for_player_passing(
         data_type: The type of data ('passes_made' or 'passes_received')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean player name and data type for filename
     clean_player_name = player_name.replace(" ", "_").replace(".", "").lower()
     clean_season_type = season_type.replace(" ", "_").lower()
     clean_per_mode = per_mode.replace(" ", "_").lower()
 
-    filename = f"{clean_player_name}_{season}_{clean_season_type}_{clean_per_mode}_{data_type}.csv"
+    filename = f"{clean_player_name}_{season}_{clean_season_type}_{clean_per_mode}_{data_type}.parquet"
     return os.path.join(PLAYER_PASSING_CSV_DIR, filename)
 
+@cached_logic()
 def fetch_player_passing_stats_logic(
     player_name: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -227,18 +216,18 @@ def fetch_player_passing_stats_logic(
             dataframes["passes_made"] = passes_made_df
             dataframes["passes_received"] = passes_received_df
 
-            # Save DataFrames to CSV if not empty
+            # Save DataFrames to the dataset cache if not empty
             if not passes_made_df.empty:
                 csv_path = _get_csv_path_for_player_passing(
                     player_actual_name, season, season_type, per_mode, "passes_made"
                 )
-                _save_dataframe_to_csv(passes_made_df, csv_path)
+                save_dataset(passes_made_df, csv_path)
 
             if not passes_received_df.empty:
                 csv_path = _get_csv_path_for_player_passing(
                     player_actual_name, season, season_type, per_mode, "passes_received"
                 )
-                _save_dataframe_to_csv(passes_received_df, csv_path)
+                save_dataset(passes_received_df, csv_path)
 
         if passes_made_list is None or passes_received_list is None:
             if passes_made_df.empty and passes_received_df.empty:
@@ -2,12 +2,12 @@
 Handles fetching and processing player rebounding statistics,
 categorized by overall, shot type, contest level, shot distance, and rebound distance.
 Requires an initial lookup for the player's current team_id via commonplayerinfo.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Set, Dict, Union, Tuple, Optional
 
 import pandas as pd
@@ -23,6 +23,7 @@ from api_tools.utils import (
     PlayerNotFoundError
 )
 from utils.validation import _validate_season_format
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -40,20 +41,7 @@ PLAYER_REBOUNDING_CSV_DIR = os.path.join(CSV_CACHE_DIR, "player_rebounding")
 os.makedirs(CSV_CACHE_DIR, exist_ok=True)
 os.makedirs(PLAYER_REBOUNDING_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_rebounding(
     player_name: str,
@@ -63,7 +51,7 @@ def _get_csv_path_for_player_rebounding(
     data_type: str
 ) -> str:
     """
-    Generates a file path for saving player rebounding DataFrame as CSV.
+    Generates a file path for saving player rebounding DataFrame as Parquet.
 
     Args:
         player_name: The player's name
@@ -73,16 +61,17 @@ def _get_csv_path_for_player_rebounding(
         data_type: The type of data ('overall', 'shot_type', 'contest', 'shot_distance', 'rebound_distance')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean player name and data type for filename
     clean_player_name = player_name.replace(" ", "_").replace(".", "").lower()
     clean_season_type = season_type.replace(" ", "_").lower()
     clean_per_mode = per_mode.replace(" ", "_").lower()
 
-    filename = f"{clean_player_name}_{season}_{clean_season_type}_{clean_per_mode}_{data_type}.csv"
+    filename = f"{clean_player_name}_{season}_{clean_season_type}_{clean_per_mode}_{data_type}.parquet"
     return os.path.join(PLAYER_REBOUNDING_CSV_DIR, filename)
 
+@cached_logic()
 def fetch_player_rebounding_stats_logic(
     player_name: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -239,36 +228,36 @@ def fetch_player_rebounding_stats_logic(
             dataframes["by_shot_distance"] = distances_df
             dataframes["by_rebound_distance"] = reb_dist_df
 
-            # Save DataFrames to CSV if not empty
+            # Save DataFrames to the dataset cache if not empty
             if not overall_df.empty:
                 csv_path = _get_csv_path_for_player_rebounding(
                     player_actual_name, season, season_type, per_mode, "overall"
                 )
-                _save_dataframe_to_csv(overall_df, csv_path)
+                save_dataset(overall_df, csv_path)
 
             if not shot_type_df.empty:
                 csv_path = _get_csv_path_for_player_rebounding(
                     player_actual_name, season, season_type, per_mode, "shot_type"
                 )
-                _save_dataframe_to_csv(shot_type_df, csv_path)
+                save_dataset(shot_type_df, csv_path)
 
             if not contested_df.empty:
                 csv_path = _get_csv_path_for_player_rebounding(
                     player_actual_name, season, season_type, per_mode, "contest"
                 )
-                _save_dataframe_to_csv(contested_df, csv_path)
+                save_dataset(contested_df, csv_path)
 
             if not distances_df.empty:
                 csv_path = _get_csv_path_for_player_rebounding(
                     player_actual_name, season, season_type, per_mode, "shot_distance"
                 )
-                _save_dataframe_to_csv(distances_df, csv_path)
+                save_dataset(distances_df, csv_path)
 
             if not reb_dist_df.empty:
                 csv_path = _get_csv_path_for_player_rebounding(
                     player_actual_name, season, season_type, per_mode, "rebound_distance"
                 )
-                _save_dataframe_to_csv(reb_dist_df, csv_path)
+                save_dataset(reb_dist_df, csv_path)
 
         # Process DataFrames for JSON response
         overall_data = _process_dataframe(overall_df, single_row=True)
@@ -2,14 +2,13 @@
 Handles fetching and processing player shooting tracking statistics,
 categorized by general, shot clock, dribbles, touch time, and defender distance.
 Requires an initial lookup for the player's current team_id via commonplayerinfo.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
 from typing import Optional, Set, Dict, Union, Tuple
-from functools import lru_cache
-
+from utils.cache import cached_logic
 import pandas as pd
 from nba_api.stats.endpoints import commonplayerinfo, playerdashptshots
 from nba_api.stats.library.parameters import SeasonTypeAllStar, PerModeSimple
@@ -23,6 +22,7 @@ from api_tools.utils import (
     PlayerNotFoundError
 )
 from utils.validation import _validate_season_format, validate_date_format
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -41,20 +41,7 @@ PLAYER_SHOOTING_TRACKING_CSV_DIR = os.path.join(CSV_CACHE_DIR, "player_shooting_
 os.makedirs(CSV_CACHE_DIR, exist_ok=True)
 os.makedirs(PLAYER_SHOOTING_TRACKING_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_shooting_tracking(
     player_name: str,
@@ -64,7 +51,7 @@ def _get_csv_path_for_player_shooting_tracking(
     data_type: str
 ) -> str:
     """
-    Generates a file path for saving player shooting tracking DataFrame as CSV.
+    Generates a file path for saving player shooting tracking DataFrame as Parquet.
 
     Args:
         player_name: The player's name
@@ -75,16 +62,17 @@ def _get_csv_path_for_player_shooting_tracking(
                                      'defender_distance', 'defender_distance_10ft_plus')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean player name and data type for filename
     clean_player_name = player_name.replace(" ", "_").replace(".", "").lower()
     clean_season_type = season_type.replace(" ", "_").lower()
     clean_per_mode = per_mode.replace(" ", "_").lower()
 
-    filename = f"{clean_player_name}_{season}_{clean_season_type}_{clean_per_mode}_{data_type}.csv"
+    filename = f"{clean_player_name}_{season}_{clean_season_type}_{clean_per_mode}_{data_type}.parquet"
     return os.path.join(PLAYER_SHOOTING_TRACKING_CSV_DIR, filename)
 
+@cached_logic()
 def fetch_player_shots_tracking_logic(
     player_name: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -246,42 +234,42 @@ def fetch_player_shots_tracking_logic(
             dataframes["by_defender_distance"] = defender_dist_df
             dataframes["by_defender_distance_10ft_plus"] = defender_dist_10ft_df
 
-            # Save DataFrames to CSV if not empty
+            # Save DataFrames to the dataset cache if not empty
             if not general_df.empty:
                 csv_path = _get_csv_path_for_player_shooting_tracking(
                     player_actual_name, season, season_type, per_mode, "general"
                 )
-                _save_dataframe_to_csv(general_df, csv_path)
+                save_dataset(general_df, csv_path)
 
             if not shot_clock_df.empty:
                 csv_path = _get_csv_path_for_player_shooting_tracking(
                     player_actual_name, season, season_type, per_mode, "shot_clock"
                 )
-                _save_dataframe_to_csv(shot_clock_df, csv_path)
+                save_dataset(shot_clock_df, csv_path)
 
             if not dribbles_df.empty:
                 csv_path = _get_csv_path_for_player_shooting_tracking(
                     player_actual_name, season, season_type, per_mode, "dribble"
                 )
-                _save_dataframe_to_csv(dribbles_df, csv_path)
+                save_dataset(dribbles_df, csv_path)
 
             if not touch_time_df.empty:
                 csv_path = _get_csv_path_for_player_shooting_tracking(
                     player_actual_name, season, season_type, per_mode, "touch_time"
                 )
-                _save_dataframe_to_csv(touch_time_df, csv_path)
+                save_dataset(touch_time_df, csv_path)
 
             if not defender_dist_df.empty:
                 csv_path = _get_csv_path_for_player_shooting_tracking(
                     player_actual_name, season, season_type, per_mode, "defender_distance"
                 )
-                _save_dataframe_to_csv(defender_dist_df, csv_path)
+                save_dataset(defender_dist_df, csv_path)
 
             if not defender_dist_10ft_df.empty:
                 csv_path = _get_csv_path_for_player_shooting_tracking(
                     player_actual_name, season, season_type, per_mode, "defender_distance_10ft_plus"
                 )
-                _save_dataframe_to_csv(defender_dist_10ft_df, csv_path)
+                save_dataset(defender_dist_10ft_df, csv_path)
 
         # Process DataFrames for JSON response
         general_list = _process_dataframe(general_df, single_row=False)
@@ -1,6 +1,6 @@
 """
 Handles fetching player vs player comparison statistics.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the PlayerVsPlayer endpoint, which provides
 detailed statistics comparing two players:
@@ -13,7 +13,7 @@ import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import playervsplayer
@@ -27,6 +27,7 @@ from api_tools.utils import (
     format_response
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -67,23 +68,6 @@ VALID_MEASURE_TYPES = {
 }
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_player_vs_player(
     player_id: str,
@@ -95,7 +79,7 @@ def _get_csv_path_for_player_vs_player(
     data_set_name: str
 ) -> str:
     """
-    Generates a file path for saving a player vs player DataFrame as CSV.
+    Generates a file path for saving a player vs player DataFrame as Parquet.
 
     Args:
         player_id: The ID of the first player
@@ -107,7 +91,7 @@ def _get_csv_path_for_player_vs_player(
         data_set_name: The name of the data set (e.g., OnOffCourt, Overall)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_")
@@ -117,7 +101,7 @@ def _get_csv_path_for_player_vs_player(
     data_set_clean = data_set_name.replace(" ", "_").lower()
 
     # Create filename
-    filename = f"player_{player_id}_vs_{vs_player_id}_{season_clean}_{season_type_clean}_{per_mode_clean}_{measure_type_clean}_{data_set_clean}.csv"
+    filename = f"player_{player_id}_vs_{vs_player_id}_{season_clean}_{season_type_clean}_{per_mode_clean}_{measure_type_clean}_{data_set_clean}.parquet"
 
     return get_cache_file_path(filename, "player_vs_player")
 
@@ -174,7 +158,7 @@ def _validate_player_vs_player_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=PLAYER_VS_PLAYER_CACHE_SIZE)
+@cached_logic(maxsize=PLAYER_VS_PLAYER_CACHE_SIZE)
 def fetch_player_vs_player_stats_logic(
     player_id: str,
     vs_player_id: str,
@@ -339,12 +323,12 @@ def fetch_player_vs_player_stats_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
 
-                    # Save to CSV if not empty
+                    # Save to Parquet if not empty
                     if not df.empty:
                         csv_path = _get_csv_path_for_player_vs_player(
                             player_id, vs_player_id, season, season_type, per_mode, measure_type, data_set_name
                         )
-                        _save_dataframe_to_csv(df, csv_path)
+                        save_dataset(df, csv_path)
 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
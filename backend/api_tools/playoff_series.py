@@ -1,6 +1,6 @@
 """
 Handles fetching information about playoff series for a given league and season.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
@@ -18,6 +18,8 @@ from api_tools.utils import (
 )
 from utils.validation import _validate_season_format, _validate_league_id
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
+from utils.cache import cached_logic
 
 logger = logging.getLogger(__name__)
 
@@ -25,23 +27,10 @@ logger = logging.getLogger(__name__)
 PLAYOFF_SERIES_CSV_DIR = get_cache_dir("playoff_series")
 
 # --- Helper Functions ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_playoff_series(season: str, league_id: str, series_id: Optional[str] = None) -> str:
     """
-    Generates a file path for saving a playoff series DataFrame as CSV.
+    Generates a file path for saving a playoff series DataFrame as Parquet.
 
     Args:
         season: The season (YYYY-YY format)
@@ -49,19 +38,20 @@ def _get_csv_path_for_playoff_series(season: str, league_id: str, series_id: Opt
         series_id: Optional series ID to filter for
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean parameters for filename
     clean_season = season.replace("-", "_")
     clean_league_id = league_id
 
     if series_id:
-        filename = f"playoff_series_{clean_season}_{clean_league_id}_{series_id}.csv"
+        filename = f"playoff_series_{clean_season}_{clean_league_id}_{series_id}.parquet"
     else:
-        filename = f"playoff_series_{clean_season}_{clean_league_id}.csv"
+        filename = f"playoff_series_{clean_season}_{clean_league_id}.parquet"
 
     return get_cache_file_path(filename, "playoff_series")
 
+@cached_logic()
 def fetch_common_playoff_series_logic(
     season: str,
     league_id: str = LeagueID.nba,
@@ -132,10 +122,10 @@ def fetch_common_playoff_series_logic(
 
         series_df = playoff_series_endpoint.playoff_series.get_data_frame()
 
-        # Save DataFrame to CSV if returning DataFrames
+        # Save DataFrame to the dataset cache if returning DataFrames
         if return_dataframe and not series_df.empty:
             csv_path = _get_csv_path_for_playoff_series(season, league_id, series_id)
-            _save_dataframe_to_csv(series_df, csv_path)
+            save_dataset(series_df, csv_path)
 
         series_list = _process_dataframe(series_df, single_row=False)
 
@@ -162,7 +152,7 @@ def fetch_common_playoff_series_logic(
             relative_path = get_relative_cache_path(csv_filename, "playoff_series")
 
             response_data["dataframe_info"] = {
-                "message": "Playoff series data has been converted to DataFrame and saved as CSV file",
+                "message": "Playoff series data has been converted to DataFrame and saved as Parquet file",
                 "dataframes": {
                     "playoff_series": {
                         "shape": list(series_df.shape),
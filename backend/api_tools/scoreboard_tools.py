@@ -1,13 +1,12 @@
 """
 Handles fetching NBA scoreboard data for a specific date.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import json
 import os
 from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import date, datetime
-from functools import lru_cache
 from requests.exceptions import ReadTimeout, ConnectionError
 import pandas as pd
 
@@ -18,28 +17,26 @@ from nba_api.stats.library.parameters import LeagueID
 from config import settings
 from core.errors import Errors
 from api_tools.utils import format_response, _process_dataframe, retry_on_timeout
+from utils.cache import cached_logic
+from utils.cache_policy import DataClass, record_game_status
 from utils.validation import validate_date_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
+from utils.live_snapshots import SCOREBOARD, get_live_snapshot
 
 logger = logging.getLogger(__name__)
 
 # --- Cache Directory Setup ---
 SCOREBOARD_CSV_DIR = get_cache_dir("scoreboard")
 
-# Cache TTL constants
-CACHE_TTL_SECONDS_LIVE = 60
-CACHE_TTL_SECONDS_STATIC = 3600 * 6
-
-@lru_cache(maxsize=2)
-def get_cached_live_scoreboard_data(cache_key: str, timestamp: str) -> Dict[str, Any]:
+@cached_logic(maxsize=2, data_class=DataClass.LIVE)
+def get_cached_live_scoreboard_data(cache_key: str) -> Dict[str, Any]:
     """
     Cached wrapper for fetching raw live scoreboard data using `nba_api.live.nba.endpoints.ScoreBoard`.
-    The `timestamp` (typically current minute) is part of the cache key to ensure frequent updates.
+    Expiry follows the LIVE freshness class (settings.CACHE_TTL_LIVE_SECONDS).
 
     Args:
         cache_key (str): A static string part of the cache key (e.g., "live_scoreboard").
-        timestamp (str): An ISO format timestamp string, typically for the current minute,
-                         used to manage cache invalidation for live data.
 
     Returns:
         Dict[str, Any]: The raw dictionary response from the LiveScoreBoard endpoint.
@@ -47,7 +44,7 @@ def get_cached_live_scoreboard_data(cache_key: str, timestamp: str) -> Dict[str,
     Raises:
         Exception: If the API call fails, to be caught by the caller.
     """
-    logger.info(f"Cache miss/expiry for live scoreboard - fetching new data (Timestamp: {timestamp}, CacheKey: {cache_key})")
+    logger.info(f"Cache miss/expiry for live scoreboard - fetching new data (CacheKey: {cache_key})")
     try:
         board = LiveScoreBoard(timeout=settings.DEFAULT_TIMEOUT_SECONDS) # Changed
         return board.get_dict()
@@ -55,18 +52,17 @@ def get_cached_live_scoreboard_data(cache_key: str, timestamp: str) -> Dict[str,
         logger.error(f"Live ScoreBoard API call failed: {e}", exc_info=True)
         raise e
 
-@lru_cache(maxsize=32) # Cache more historical/future dates
-def get_cached_static_scoreboard_data(cache_key: Tuple, timestamp: str, **kwargs: Any) -> Dict[str, Any]:
+@cached_logic(maxsize=32) # Cache more historical/future dates
+def get_cached_static_scoreboard_data(game_date: str, league_id: str, day_offset: int) -> Dict[str, Any]:
     """
     Cached wrapper for fetching and initially processing static scoreboard data using `nba_api.stats.endpoints.scoreboardv2`.
-    The `timestamp` (typically current hour) is part of the cache key for hourly invalidation.
-    `kwargs` are passed directly to the `scoreboardv2.ScoreboardV2` endpoint.
+    Expiry follows the freshness policy for `game_date`: past dates are treated as final,
+    today and future dates are short-lived.
 
     Args:
-        cache_key (Tuple): A tuple representing the static parts of the cache key (e.g., ("static_scoreboard", game_date, league_id)).
-        timestamp (str): An ISO format timestamp string, typically for the current hour,
-                         used to manage cache invalidation for static data.
-        **kwargs: Arguments to pass to `scoreboardv2.ScoreboardV2` (e.g., `game_date`, `league_id`, `day_offset`).
+        game_date (str): Target date in YYYY-MM-DD format.
+        league_id (str): League ID (e.g., "00" for NBA).
+        day_offset (int): Day offset from `game_date`.
 
     Returns:
         Dict[str, Any]: A dictionary containing processed DataFrames (as lists of dicts) for "game_header" and "line_score".
@@ -75,9 +71,11 @@ def get_cached_static_scoreboard_data(cache_key: Tuple, timestamp: str, **kwargs
     Raises:
         Exception: If the API call or initial DataFrame processing fails, to be caught by the caller.
     """
-    logger.info(f"Cache miss/expiry for static scoreboard - fetching new data for {kwargs.get('game_date')} (Timestamp: {timestamp}, CacheKey: {cache_key})")
+    logger.info(f"Cache miss/expiry for static scoreboard - fetching new data for {game_date}")
     try:
-        scoreboard_endpoint = scoreboardv2.ScoreboardV2(**kwargs, timeout=settings.DEFAULT_TIMEOUT_SECONDS) # Changed
+        scoreboard_endpoint = scoreboardv2.ScoreboardV2(
+            game_date=game_date, league_id=league_id, day_offset=day_offset, timeout=settings.DEFAULT_TIMEOUT_SECONDS
+        )
         game_header_list = _process_dataframe(scoreboard_endpoint.game_header.get_data_frame(), single_row=False)
         line_score_list = _process_dataframe(scoreboard_endpoint.line_score.get_data_frame(), single_row=False)
 
@@ -87,7 +85,7 @@ def get_cached_static_scoreboard_data(cache_key: Tuple, timestamp: str, **kwargs
             "line_score": line_score_list if line_score_list is not None else []
         }
     except Exception as e:
-        logger.error(f"ScoreboardV2 API call or processing failed for {kwargs.get('game_date')}: {e}", exc_info=True)
+        logger.error(f"ScoreboardV2 API call or processing failed for {game_date}: {e}", exc_info=True)
         raise e
 
 def fetch_scoreboard_data_logic(
@@ -173,7 +171,6 @@ def fetch_scoreboard_data_logic(
     try:
         if is_today_target:
             # Live data for today
-            cache_ts_live = datetime.now().replace(second=0, microsecond=0).isoformat() # Minute-level timestamp
             live_cache_key = "live_scoreboard_data"
 
             raw_live_data: Dict[str, Any]
@@ -182,7 +179,7 @@ def fetch_scoreboard_data_logic(
                 live_board = LiveScoreBoard(timeout=settings.DEFAULT_TIMEOUT_SECONDS) # Changed
                 raw_live_data = live_board.get_dict()
             else:
-                raw_live_data = get_cached_live_scoreboard_data(cache_key=live_cache_key, timestamp=cache_ts_live)
+                raw_live_data = get_live_snapshot(SCOREBOARD) or get_cached_live_scoreboard_data(cache_key=live_cache_key)
 
             # Check if live data is stale
             live_api_game_date = raw_live_data.get('scoreboard', {}).get('gameDate')
@@ -222,8 +219,6 @@ def fetch_scoreboard_data_logic(
             if force_static_fetch_for_today:
                  logger.info(f"Using static fetch for actual current date: {date_for_static_fetch} due to stale live feed.")
 
-            cache_ts_static = datetime.now().replace(minute=0, second=0, microsecond=0).isoformat()
-            static_cache_key = ("static_scoreboard_data", date_for_static_fetch, league_id, day_offset) # Use date_for_static_fetch
             api_params_static = {"game_date": date_for_static_fetch, "league_id": league_id, "day_offset": day_offset} # Use date_for_static_fetch
 
             processed_static_data: Dict[str, List[Dict[str, Any]]]
@@ -255,7 +250,7 @@ def fetch_scoreboard_data_logic(
 
             else:
                 # This is the cached path
-                processed_static_data = get_cached_static_scoreboard_data(cache_key=static_cache_key, timestamp=cache_ts_static, **api_params_static)
+                processed_static_data = get_cached_static_scoreboard_data(**api_params_static)
 
             game_headers_map = {
                 gh['GAME_ID']: gh
@@ -299,6 +294,9 @@ def fetch_scoreboard_data_logic(
                     logger.warning(f"Missing home/away team line score data for game {game_id_hdr} in ScoreboardV2 response for {effective_date_str}.")
             logger.info(f"Processed {len(formatted_games_list)} games from static scoreboard data for {effective_date_str}.")
 
+        for game_entry in formatted_games_list:
+            record_game_status(game_entry.get("gameId"), game_entry.get("gameStatus"))
+
         final_result = {"gameDate": effective_date_str, "games": formatted_games_list}
 
         # If DataFrame output is requested, create and save DataFrames
@@ -344,23 +342,23 @@ def fetch_scoreboard_data_logic(
             # Combine home and away teams into a single DataFrame
             teams_df = pd.DataFrame(home_teams_data + away_teams_data)
 
-            # Save DataFrames to CSV
+            # Save DataFrames to the dataset cache
             clean_date = effective_date_str.replace("-", "_")
-            games_csv_path = get_cache_file_path(f"scoreboard_games_{clean_date}.csv", "scoreboard")
-            teams_csv_path = get_cache_file_path(f"scoreboard_teams_{clean_date}.csv", "scoreboard")
+            games_csv_path = get_cache_file_path(f"scoreboard_games_{clean_date}.parquet", "scoreboard")
+            teams_csv_path = get_cache_file_path(f"scoreboard_teams_{clean_date}.parquet", "scoreboard")
 
             if not games_df.empty:
-                games_df.to_csv(games_csv_path, index=False)
+                save_dataset(games_df, games_csv_path, endpoint="scoreboard", params={"game_date": effective_date_str})
 
             if not teams_df.empty:
-                teams_df.to_csv(teams_csv_path, index=False)
+                save_dataset(teams_df, teams_csv_path, endpoint="scoreboard", params={"game_date": effective_date_str})
 
             # Add DataFrame metadata to the response
             games_relative_path = get_relative_cache_path(os.path.basename(games_csv_path), "scoreboard")
             teams_relative_path = get_relative_cache_path(os.path.basename(teams_csv_path), "scoreboard")
 
             final_result["dataframe_info"] = {
-                "message": "Scoreboard data has been converted to DataFrames and saved as CSV files",
+                "message": "Scoreboard data has been converted to DataFrames and saved as Parquet files",
                 "dataframes": {}
             }
 
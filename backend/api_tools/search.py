@@ -1,14 +1,13 @@
 """
 Provides search functionalities for players, teams, and games within the NBA data.
-Utilizes cached static lists for players and teams, and LeagueGameFinder for games.
-Provides both JSON and DataFrame outputs with CSV caching.
+Utilizes the in-memory identity index for players and teams, and LeagueGameFinder for games.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
 from typing import List, Dict, Optional, Tuple, Union
 from functools import lru_cache
-from nba_api.stats.static import players, teams
 from nba_api.stats.endpoints import leaguegamefinder
 from nba_api.stats.library.parameters import SeasonTypeAllStar, LeagueID
 import pandas as pd
@@ -28,6 +27,8 @@ from api_tools.utils import (
 )
 from utils.validation import _validate_season_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
+from utils.identity_index import get_identity_index
 
 logger = logging.getLogger(__name__)
 
@@ -44,56 +45,43 @@ PLAYER_SEARCH_CSV_DIR = get_cache_dir("search/players")
 TEAM_SEARCH_CSV_DIR = get_cache_dir("search/teams")
 GAME_SEARCH_CSV_DIR = get_cache_dir("search/games")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_player_search(query: str) -> str:
     """
-    Generates a file path for saving player search results as CSV.
+    Generates a file path for saving player search results as Parquet.
 
     Args:
         query: The search query
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean query for filename
     clean_query = query.replace(" ", "_").replace(".", "").lower()
 
-    filename = f"player_search_{clean_query}.csv"
+    filename = f"player_search_{clean_query}.parquet"
     return get_cache_file_path(filename, "search/players")
 
 def _get_csv_path_for_team_search(query: str) -> str:
     """
-    Generates a file path for saving team search results as CSV.
+    Generates a file path for saving team search results as Parquet.
 
     Args:
         query: The search query
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean query for filename
     clean_query = query.replace(" ", "_").replace(".", "").lower()
 
-    filename = f"team_search_{clean_query}.csv"
+    filename = f"team_search_{clean_query}.parquet"
     return get_cache_file_path(filename, "search/teams")
 
 def _get_csv_path_for_game_search(query: str, season: str, season_type: str) -> str:
     """
-    Generates a file path for saving game search results as CSV.
+    Generates a file path for saving game search results as Parquet.
 
     Args:
         query: The search query
@@ -101,80 +89,37 @@ def _get_csv_path_for_game_search(query: str, season: str, season_type: str) ->
         season_type: The season type (e.g., 'Regular Season', 'Playoffs')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean query and season type for filename
     clean_query = query.replace(" ", "_").replace(".", "").lower()
     clean_season_type = season_type.replace(" ", "_").lower()
 
-    filename = f"game_search_{clean_query}_{season}_{clean_season_type}.csv"
+    filename = f"game_search_{clean_query}_{season}_{clean_season_type}.parquet"
     return get_cache_file_path(filename, "search/games")
 
-# --- Global Caches for Static Data ---
-_player_list_cache: Optional[List[Dict]] = None
-_team_list_cache: Optional[List[Dict]] = None
-
-# --- Helper Functions for Static Data Caching ---
-def _get_cached_player_list() -> List[Dict]:
-    """Gets the full player list, caching it in memory after the first call."""
-    global _player_list_cache
-    if _player_list_cache is None:
-        logger.info("Fetching and caching full player list from nba_api.stats.static...")
-        try:
-            _player_list_cache = players.get_players()
-            if not _player_list_cache: # Should not happen with nba_api, but good check
-                 logger.warning("players.get_players() returned an empty or invalid list.")
-                 _player_list_cache = [] # Ensure it's an empty list on failure
-            else:
-                 logger.info(f"Successfully cached {len(_player_list_cache)} players.")
-        except Exception as e:
-            logger.error(f"Failed to fetch and cache player list: {e}", exc_info=True)
-            _player_list_cache = [] # Ensure it's an empty list on failure
-    return _player_list_cache
-
-def _get_cached_team_list() -> List[Dict]:
-    """Gets the full team list, caching it in memory after the first call."""
-    global _team_list_cache
-    if _team_list_cache is None:
-        logger.info("Fetching and caching full team list from nba_api.stats.static...")
-        try:
-            _team_list_cache = teams.get_teams()
-            if not _team_list_cache: # Should not happen
-                 logger.warning("teams.get_teams() returned an empty or invalid list.")
-                 _team_list_cache = []
-            else:
-                 logger.info(f"Successfully cached {len(_team_list_cache)} teams.")
-        except Exception as e:
-            logger.error(f"Failed to fetch and cache team list: {e}", exc_info=True)
-            _team_list_cache = []
-    return _team_list_cache
-
 # --- Player Search Logic ---
 @lru_cache(maxsize=PLAYER_NAME_FRAGMENT_CACHE_SIZE)
 def find_players_by_name_fragment(name_fragment: str, limit: int = DEFAULT_PLAYER_SEARCH_LIMIT) -> List[Dict]:
     """
-    Finds players whose full name contains the given fragment (case-insensitive).
-    Uses the in-memory cached full player list.
+    Finds the players best matching a name or name fragment, best first.
+    Tolerates typos, missing accents and punctuation; active players rank above retired ones on near-ties.
     """
     if not name_fragment or len(name_fragment) < MIN_PLAYER_SEARCH_LENGTH:
         return []
-    all_players = _get_cached_player_list()
-    if not all_players: return []
-
-    name_fragment_lower = name_fragment.lower()
-    matching_players = []
     try:
-        for player in all_players:
-            if name_fragment_lower in player['full_name'].lower():
-                matching_players.append({
-                    'id': player['id'],
-                    'full_name': player['full_name'],
-                    'is_active': player.get('is_active', False) # is_active might not always be present
-                })
-                if len(matching_players) >= limit: break
+        matching_players = [
+            {
+                'id': hit.record['id'],
+                'full_name': hit.record['full_name'],
+                'is_active': hit.record.get('is_active', False), # is_active might not always be present
+                'match_score': hit.score
+            }
+            for hit in get_identity_index().search_players(name_fragment, limit=limit)
+        ]
     except Exception as e:
-        logger.error(f"Error filtering player list for fragment '{name_fragment}': {e}", exc_info=True)
-        return [] # Return empty on error during filtering
+        logger.error(f"Error searching player list for '{name_fragment}': {e}", exc_info=True)
+        return [] # Return empty on error during search
     logger.debug(f"Found {len(matching_players)} players for fragment '{name_fragment}' (limit {limit}).")
     return matching_players
 
@@ -184,7 +129,7 @@ def search_players_logic(
     return_dataframe: bool = False
 ) -> Union[str, Tuple[str, Dict[str, pd.DataFrame]]]:
     """
-    Public API to search for players by name fragment.
+    Public API to search for players by name or name fragment, ranked by match quality (typo-tolerant).
 
     Provides DataFrame output capabilities.
 
@@ -227,16 +172,16 @@ def search_players_logic(
             if matching_players:
                 players_df = pd.DataFrame(matching_players)
 
-                # Save DataFrame to CSV
+                # Save DataFrame to the dataset cache
                 csv_path = _get_csv_path_for_player_search(query)
-                _save_dataframe_to_csv(players_df, csv_path)
+                save_dataset(players_df, csv_path)
 
                 # Add DataFrame metadata to the response
                 csv_filename = os.path.basename(csv_path)
                 relative_path = get_relative_cache_path(csv_filename, "search/players")
 
                 response_data["dataframe_info"] = {
-                    "message": "Player search results have been converted to DataFrame and saved as CSV file",
+                    "message": "Player search results have been converted to DataFrame and saved as Parquet file",
                     "dataframes": {
                         "players": {
                             "shape": list(players_df.shape),
@@ -269,7 +214,7 @@ def search_teams_logic(
     return_dataframe: bool = False
 ) -> Union[str, Tuple[str, Dict[str, pd.DataFrame]]]:
     """
-    Public API to search for teams by name, city, nickname, or abbreviation.
+    Public API to search for teams by name, city, nickname, or abbreviation, ranked by match quality (typo-tolerant).
 
     Provides DataFrame output capabilities.
 
@@ -295,24 +240,17 @@ def search_teams_logic(
 
     try:
         # Get all teams
-        all_teams = _get_cached_team_list()
-        if not all_teams:
-            logger.warning("Team list cache is empty, cannot search teams.")
+        index = get_identity_index()
+        if not index.teams:
+            logger.warning("Team list is empty, cannot search teams.")
             response_data = {"teams": []}
             if return_dataframe:
                 empty_df = pd.DataFrame()
                 return format_response(response_data), {"teams": empty_df}
             return format_response(response_data)
 
-        # Filter teams
-        query_lower = query.lower()
-        filtered_teams = [
-            team for team in all_teams
-            if query_lower in team.get('full_name', '').lower() or
-               query_lower in team.get('city', '').lower() or
-               query_lower in team.get('nickname', '').lower() or
-               query_lower in team.get('abbreviation', '').lower()
-        ][:limit] # Apply limit after filtering
+        # Rank teams on full name, city, nickname and abbreviation
+        filtered_teams = [{**hit.record, 'match_score': hit.score} for hit in index.search_teams(query, limit=limit)]
 
         # Create response data
         response_data = {"teams": filtered_teams}
@@ -323,16 +261,16 @@ def search_teams_logic(
             if filtered_teams:
                 teams_df = pd.DataFrame(filtered_teams)
 
-                # Save DataFrame to CSV
+                # Save DataFrame to the dataset cache
                 csv_path = _get_csv_path_for_team_search(query)
-                _save_dataframe_to_csv(teams_df, csv_path)
+                save_dataset(teams_df, csv_path)
 
                 # Add DataFrame metadata to the response
                 csv_filename = os.path.basename(csv_path)
                 relative_path = get_relative_cache_path(csv_filename, "search/teams")
 
                 response_data["dataframe_info"] = {
-                    "message": "Team search results have been converted to DataFrame and saved as CSV file",
+                    "message": "Team search results have been converted to DataFrame and saved as Parquet file",
                     "dataframes": {
                         "teams": {
                             "shape": list(teams_df.shape),
@@ -392,8 +330,8 @@ def _filter_for_head_to_head(games_df: pd.DataFrame, team1_id: Optional[int], te
     if games_df.empty or not (team1_id and team2_id):
         return games_df
 
-    team1_info = teams.find_team_name_by_id(team1_id) # nba_api.stats.static.teams
-    team2_info = teams.find_team_name_by_id(team2_id)
+    team1_info = get_identity_index().team_by_id(team1_id)
+    team2_info = get_identity_index().team_by_id(team2_id)
 
     if team1_info and team2_info:
         team1_abbr = team1_info['abbreviation']
@@ -523,17 +461,17 @@ def search_games_logic(
 
         # Return the appropriate result based on return_dataframe
         if return_dataframe:
-            # Save DataFrame to CSV if not empty
+            # Save DataFrame to the dataset cache if not empty
             if not filtered_games_df.empty:
                 csv_path = _get_csv_path_for_game_search(query, season, season_type)
-                _save_dataframe_to_csv(filtered_games_df, csv_path)
+                save_dataset(filtered_games_df, csv_path)
 
                 # Add DataFrame metadata to the response
                 csv_filename = os.path.basename(csv_path)
                 relative_path = get_relative_cache_path(csv_filename, "search/games")
 
                 response_data["dataframe_info"] = {
-                    "message": "Game search results have been converted to DataFrame and saved as CSV file",
+                    "message": "Game search results have been converted to DataFrame and saved as Parquet file",
                     "dataframes": {
                         "games": {
                             "shape": list(filtered_games_df.shape),
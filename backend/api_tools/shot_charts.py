@@ -1,6 +1,6 @@
 """
 Shot chart module for NBA player shot analysis.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 
 import logging
@@ -10,38 +10,22 @@ from typing import Dict, List, Optional, Any, Union, Tuple
 import pandas as pd
 import numpy as np
 from nba_api.stats.endpoints import shotchartdetail
-from nba_api.stats.static import players, teams
 from api_tools.utils import retry_on_timeout, format_response, get_player_id_from_name
 from config import settings
 from core.errors import Errors
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
+from utils.identity_index import get_identity_index
+from utils.cache import cached_logic
 
 logger = logging.getLogger(__name__)
 
 # --- Cache Directory Setup ---
 SHOT_CHARTS_CSV_DIR = get_cache_dir("shot_charts")
 
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file, creating the directory if it doesn't exist.
-
-    Args:
-        df: The DataFrame to save
-        file_path: The path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.debug(f"Saved DataFrame to {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to {file_path}: {e}", exc_info=True)
-
 def _get_csv_path_for_shot_chart(player_id: int, season: str, season_type: str) -> str:
     """
-    Generates a file path for saving shot chart data as CSV.
+    Generates a file path for saving shot chart data as Parquet.
 
     Args:
         player_id: The player ID
@@ -49,7 +33,7 @@ def _get_csv_path_for_shot_chart(player_id: int, season: str, season_type: str)
         season_type: The season type (e.g., 'Regular Season', 'Playoffs')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean season type for filename
     clean_season_type = season_type.replace(" ", "_").lower()
@@ -57,9 +41,10 @@ def _get_csv_path_for_shot_chart(player_id: int, season: str, season_type: str)
     # Handle None season
     season_str = season if season else "current"
 
-    filename = f"player_{player_id}_shots_{season_str}_{clean_season_type}.csv"
+    filename = f"player_{player_id}_shots_{season_str}_{clean_season_type}.parquet"
     return get_cache_file_path(filename, "shot_charts")
 
+@cached_logic()
 def fetch_player_shot_chart(
     player_name: str,
     season: Optional[str] = None,
@@ -142,12 +127,9 @@ def fetch_player_shot_chart(
         team_id = 0
         team_name = ""
 
-        # Find the player's current team
-        all_players = players.get_players()
-        for p in all_players:
-            if p['id'] == player_id:
-                player_name = p['full_name']  # Use the official name from the API
-                break
+        player_record = get_identity_index().player_by_id(player_id)
+        if player_record is not None:
+            player_name = player_record['full_name']  # Use the official name from the API
 
         # Use the NBA API to get shot chart data
         def fetch_shot_chart():
@@ -179,20 +161,19 @@ def fetch_player_shot_chart(
             team_name = shots_df.iloc[0]['TEAM_NAME']
 
         # Transform shot data to our format
-        shots = []
-        for _, row in shots_df.iterrows():
-            shot = {
-                'x': float(row['LOC_X']),
-                'y': float(row['LOC_Y']),
-                'made': bool(row['SHOT_MADE_FLAG']),
-                'value': 3 if row['SHOT_TYPE'] == '3PT Field Goal' else 2,
-                'shot_type': row['ACTION_TYPE'],
-                'shot_zone': f"{row['SHOT_ZONE_BASIC']} - {row['SHOT_ZONE_AREA']}",
-                'distance': float(row['SHOT_DISTANCE']),
-                'game_date': row['GAME_DATE'],
-                'period': int(row['PERIOD']),
-            }
-            shots.append(shot)
+        # Built column-wise rather than with iterrows(); a season can hold well over a thousand shots
+        shot_columns = {
+            'x': shots_df['LOC_X'].astype(float).tolist(),
+            'y': shots_df['LOC_Y'].astype(float).tolist(),
+            'made': shots_df['SHOT_MADE_FLAG'].astype(bool).tolist(),
+            'value': np.where(shots_df['SHOT_TYPE'] == '3PT Field Goal', 3, 2).tolist(),
+            'shot_type': shots_df['ACTION_TYPE'].tolist(),
+            'shot_zone': (shots_df['SHOT_ZONE_BASIC'].astype(str) + ' - ' + shots_df['SHOT_ZONE_AREA'].astype(str)).tolist(),
+            'distance': shots_df['SHOT_DISTANCE'].astype(float).tolist(),
+            'game_date': shots_df['GAME_DATE'].tolist(),
+            'period': shots_df['PERIOD'].astype(int).tolist(),
+        }
+        shots = [dict(zip(shot_columns, values)) for values in zip(*shot_columns.values())]
 
         # Process zone data
         zones = []
@@ -250,14 +231,14 @@ def fetch_player_shot_chart(
             # Add league averages
             dataframes["league_averages"] = league_avg_df
 
-            # Save DataFrames to CSV
+            # Save DataFrames to the dataset cache
             if not shots_df_processed.empty:
                 shots_csv_path = _get_csv_path_for_shot_chart(player_id, season, season_type)
-                _save_dataframe_to_csv(shots_df_processed, shots_csv_path)
+                save_dataset(shots_df_processed, shots_csv_path)
 
                 # Add DataFrame metadata to the response
                 result["dataframe_info"] = {
-                    "message": "Shot chart data has been converted to DataFrames and saved as CSV files",
+                    "message": "Shot chart data has been converted to DataFrames and saved as Parquet files",
                     "dataframes": {
                         "shots": {
                             "shape": list(shots_df_processed.shape),
@@ -1,11 +1,10 @@
 """
 Handles fetching and processing Synergy Sports play type statistics.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 from typing import Optional, Dict, Any, Tuple, Type, List, Set, Union
-from datetime import datetime
 import pandas as pd
 
 from nba_api.stats.endpoints.synergyplaytypes import SynergyPlayTypes
@@ -18,36 +17,19 @@ from nba_api.stats.library.parameters import (
 from config import settings
 from core.errors import Errors
 from api_tools.utils import format_response, _process_dataframe
+from utils.cache import cached_logic
 from utils.validation import _validate_season_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
 # --- Module-Level Constants ---
 SYNERGY_DATA_CACHE_SIZE = 128
-CACHE_TTL_SECONDS_SYNERGY = 3600 * 4  # 4 hours
 
 # --- Cache Directory Setup ---
 SYNERGY_CSV_DIR = get_cache_dir("synergy")
 
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file, creating the directory if it doesn't exist.
-
-    Args:
-        df: The DataFrame to save
-        file_path: The path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.debug(f"Saved DataFrame to {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to {file_path}: {e}", exc_info=True)
-
 def _get_csv_path_for_synergy(
     play_type: str,
     type_grouping: Optional[str],
@@ -56,7 +38,7 @@ def _get_csv_path_for_synergy(
     season_type: str
 ) -> str:
     """
-    Generates a file path for saving synergy data as CSV.
+    Generates a file path for saving synergy data as Parquet.
 
     Args:
         play_type: The play type (e.g., 'Isolation', 'PostUp')
@@ -66,14 +48,14 @@ def _get_csv_path_for_synergy(
         season_type: The season type (e.g., 'Regular Season', 'Playoffs')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean values for filename
     clean_play_type = play_type.replace(" ", "_").lower()
     clean_type_grouping = type_grouping.replace(" ", "_").lower() if type_grouping else "all"
     clean_season_type = season_type.replace(" ", "_").lower()
 
-    filename = f"synergy_{clean_play_type}_{clean_type_grouping}_{player_or_team}_{season}_{clean_season_type}.csv"
+    filename = f"synergy_{clean_play_type}_{clean_type_grouping}_{player_or_team}_{season}_{clean_season_type}.parquet"
     return get_cache_file_path(filename, "synergy")
 
 VALID_PLAY_TYPES: Set[str] = {
@@ -89,13 +71,13 @@ _SYNERGY_VALID_PER_MODES: Set[str] = {getattr(PerModeSimple, attr) for attr in d
 _SYNERGY_VALID_SEASON_TYPES: Set[str] = {getattr(SeasonTypeAllStar, attr) for attr in dir(SeasonTypeAllStar) if not attr.startswith('_') and isinstance(getattr(SeasonTypeAllStar, attr), str)}
 
 # --- Helper Functions ---
+@cached_logic(maxsize=SYNERGY_DATA_CACHE_SIZE)
 def get_cached_synergy_data(
-    timestamp_bucket: str,
     endpoint_class: Type[SynergyPlayTypes],
     api_kwargs: Dict[str, Any]
 ) -> Dict[str, Any]:
-    """Wrapper for the SynergyPlayTypes NBA API endpoint."""
-    logger.info(f"Fetching Synergy data (ts: {timestamp_bucket}). Params: {api_kwargs}")
+    """Cached wrapper for the SynergyPlayTypes NBA API endpoint; expiry follows the freshness policy for the season."""
+    logger.info(f"Fetching Synergy data. Params: {api_kwargs}")
     try:
         synergy_stats_endpoint = endpoint_class(**api_kwargs, timeout=settings.DEFAULT_TIMEOUT_SECONDS)
         return synergy_stats_endpoint.get_dict()
@@ -232,8 +214,6 @@ def fetch_synergy_play_types_logic(
         "play_type_nullable": play_type_nullable,
         "type_grouping_nullable": type_grouping_nullable
     }
-    # Create a timestamp bucket for logging
-    timestamp_bucket = str(int(datetime.now().timestamp() // CACHE_TTL_SECONDS_SYNERGY))
 
     try:
         response_dict: Dict[str, Any]
@@ -244,7 +224,6 @@ def fetch_synergy_play_types_logic(
         else:
             # For cached data, we don't need to pass headers again as the request was already made
             response_dict = get_cached_synergy_data(
-                timestamp_bucket=timestamp_bucket,
                 endpoint_class=SynergyPlayTypes, api_kwargs=api_params_for_call
             )
     except KeyError as ke: # Handles cases where API response might be malformed
@@ -320,7 +299,7 @@ def fetch_synergy_play_types_logic(
             # Add raw synergy data
             dataframes["raw_synergy_data"] = synergy_df
 
-            # Save DataFrame to CSV if not empty
+            # Save DataFrame to the dataset cache if not empty
             if not synergy_stats_df.empty and play_type_nullable:
                 csv_path = _get_csv_path_for_synergy(
                     play_type_nullable,
@@ -329,14 +308,14 @@ def fetch_synergy_play_types_logic(
                     season,
                     season_type
                 )
-                _save_dataframe_to_csv(synergy_stats_df, csv_path)
+                save_dataset(synergy_stats_df, csv_path)
 
                 # Add DataFrame metadata to the response
                 csv_filename = os.path.basename(csv_path)
                 relative_path = get_relative_cache_path(csv_filename, "synergy")
 
                 response_data["dataframe_info"] = {
-                    "message": "Synergy play type data has been converted to DataFrame and saved as CSV file",
+                    "message": "Synergy play type data has been converted to DataFrame and saved as Parquet file",
                     "dataframes": {
                         "synergy_stats": {
                             "shape": list(synergy_stats_df.shape),
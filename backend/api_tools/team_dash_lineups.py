@@ -1,6 +1,6 @@
 """
 Handles fetching team lineup statistics.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the TeamDashLineups endpoint, which provides
 detailed team statistics broken down by different lineup combinations:
@@ -11,7 +11,7 @@ import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import teamdashlineups
@@ -27,6 +27,7 @@ from api_tools.utils import (
     TeamNotFoundError
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -70,23 +71,6 @@ VALID_SEASON_TYPES = {
 VALID_GROUP_QUANTITIES = [2, 3, 4, 5]
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_lineups(
     team_id: str,
@@ -98,7 +82,7 @@ def _get_csv_path_for_lineups(
     data_set_name: str
 ) -> str:
     """
-    Generates a file path for saving a lineups DataFrame as CSV.
+    Generates a file path for saving a lineups DataFrame as Parquet.
 
     Args:
         team_id: The team ID
@@ -110,7 +94,7 @@ def _get_csv_path_for_lineups(
         data_set_name: The data set name (e.g., Lineups, Overall)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_")
@@ -119,7 +103,7 @@ def _get_csv_path_for_lineups(
     measure_type_clean = measure_type.replace(" ", "_").lower()
 
     # Create filename
-    filename = f"{team_id}_{season_clean}_{season_type_clean}_{per_mode_clean}_{measure_type_clean}_group{group_quantity}_{data_set_name}.csv"
+    filename = f"{team_id}_{season_clean}_{season_type_clean}_{per_mode_clean}_{measure_type_clean}_group{group_quantity}_{data_set_name}.parquet"
 
     return get_cache_file_path(filename, "team_dash_lineups")
 
@@ -179,7 +163,7 @@ def _validate_lineups_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=TEAM_DASH_LINEUPS_CACHE_SIZE)
+@cached_logic(maxsize=TEAM_DASH_LINEUPS_CACHE_SIZE)
 def fetch_team_lineups_logic(
     team_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -306,12 +290,12 @@ def fetch_team_lineups_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
 
-                    # Save to CSV if not empty
+                    # Save to Parquet if not empty
                     if not df.empty:
                         csv_path = _get_csv_path_for_lineups(
                             team_id_val, season, season_type, per_mode, measure_type, group_quantity, data_set_name
                         )
-                        _save_dataframe_to_csv(df, csv_path)
+                        save_dataset(df, csv_path)
 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
@@ -1,6 +1,6 @@
 """
 Handles fetching team dashboard statistics by shooting splits.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the TeamDashboardByShootingSplits endpoint, which provides
 detailed team shooting statistics broken down by various splits:
@@ -14,7 +14,7 @@ import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import teamdashboardbyshootingsplits
@@ -30,6 +30,7 @@ from api_tools.utils import (
     TeamNotFoundError
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -71,23 +72,6 @@ VALID_SEASON_TYPES = {
 }
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_dashboard(
     team_id: str,
@@ -98,7 +82,7 @@ def _get_csv_path_for_dashboard(
     dashboard_type: str
 ) -> str:
     """
-    Generates a file path for saving a dashboard DataFrame as CSV.
+    Generates a file path for saving a dashboard DataFrame as Parquet.
 
     Args:
         team_id: The team ID
@@ -109,7 +93,7 @@ def _get_csv_path_for_dashboard(
         dashboard_type: The dashboard type (e.g., overall_team_dashboard)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_")
@@ -118,7 +102,7 @@ def _get_csv_path_for_dashboard(
     measure_type_clean = measure_type.replace(" ", "_").lower()
 
     # Create filename
-    filename = f"{team_id}_{season_clean}_{season_type_clean}_{per_mode_clean}_{measure_type_clean}_{dashboard_type}.csv"
+    filename = f"{team_id}_{season_clean}_{season_type_clean}_{per_mode_clean}_{measure_type_clean}_{dashboard_type}.parquet"
 
     return get_cache_file_path(filename, "team_dashboard_shooting")
 
@@ -170,7 +154,7 @@ def _validate_dashboard_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=TEAM_DASHBOARD_SHOOTING_CACHE_SIZE)
+@cached_logic(maxsize=TEAM_DASHBOARD_SHOOTING_CACHE_SIZE)
 def fetch_team_dashboard_shooting_splits_logic(
     team_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -295,12 +279,12 @@ def fetch_team_dashboard_shooting_splits_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
 
-                    # Save to CSV if not empty
+                    # Save to Parquet if not empty
                     if not df.empty:
                         csv_path = _get_csv_path_for_dashboard(
                             team_id_val, season, season_type, per_mode, measure_type, data_set_name
                         )
-                        _save_dataframe_to_csv(df, csv_path)
+                        save_dataset(df, csv_path)
 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
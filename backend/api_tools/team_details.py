@@ -1,7 +1,7 @@
 """
 Handles fetching and processing team details data
 from the TeamDetails endpoint.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 The TeamDetails endpoint provides comprehensive team information with 8 DataFrames:
 - TeamInfo: basic team details, arena, ownership, management (11 columns)
@@ -17,29 +17,13 @@ import logging
 import os
 import json
 from typing import Optional, Dict, Any, Set, Union, Tuple
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import teamdetails
 import pandas as pd
 
 from utils.path_utils import get_cache_dir, get_cache_file_path
-
-# Define utility functions here since we can't import from .utils
-def _process_dataframe(df, single_row=False):
-    """Process a DataFrame into a list of dictionaries."""
-    if df is None or df.empty:
-        return []
-
-    if single_row:
-        return df.iloc[0].to_dict()
-
-    return df.to_dict(orient="records")
-
-def format_response(data=None, error=None):
-    """Format a response as JSON."""
-    if error:
-        return json.dumps({"error": error})
-    return json.dumps(data)
+from utils.dataset_store import save_dataset, load_dataset
+from api_tools.utils import format_response, _process_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -63,27 +47,7 @@ TEAM_DETAILS_CSV_DIR = get_cache_dir("team_details")
 # Ensure cache directories exist
 os.makedirs(TEAM_DETAILS_CSV_DIR, exist_ok=True)
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV with UTF-8 encoding
-        df.to_csv(file_path, index=False, encoding='utf-8')
-
-        # Log the file size and path
-        file_size = os.path.getsize(file_path)
-        logger.info(f"Saved DataFrame to CSV: {file_path} (Size: {file_size} bytes)")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_team_details(team_id: str, dataset_name: str = "TeamInfo") -> str:
     """
@@ -94,9 +58,9 @@ def _get_csv_path_for_team_details(team_id: str, dataset_name: str = "TeamInfo")
         dataset_name: Name of the dataset (e.g., "TeamInfo", "Championships", etc.)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
-    filename = f"team_details_{team_id}_{dataset_name}.csv"
+    filename = f"team_details_{team_id}_{dataset_name}.parquet"
     return get_cache_file_path(filename, "team_details")
 
 # --- Parameter Validation ---
@@ -109,7 +73,7 @@ def _validate_team_details_params(team_id: str) -> Optional[str]:
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=TEAM_DETAILS_CACHE_SIZE)
+@cached_logic(maxsize=TEAM_DETAILS_CACHE_SIZE)
 def fetch_team_details_logic(
     team_id: str,
     return_dataframe: bool = False
@@ -117,7 +81,7 @@ def fetch_team_details_logic(
     """
     Fetches team details data using the TeamDetails endpoint.
 
-    Provides DataFrame output capabilities and CSV caching.
+    Provides DataFrame output capabilities and Parquet caching.
 
     Args:
         team_id: Team ID (required)
@@ -141,14 +105,14 @@ def fetch_team_details_logic(
             return error_response, {}
         return error_response
 
-    # Check for cached CSV files for all datasets
+    # Check for cached Parquet files for all datasets
     dataframes = {}
     dataframe_names = [
         "TeamInfo", "TeamHistory", "SocialMediaAccounts", "Championships",
         "ConferenceChampionships", "DivisionChampionships", "RetiredPlayers", "HallOfFamePlayers"
     ]
 
-    # Check if all CSV files exist
+    # Check if all Parquet files exist
     all_csvs_exist = True
     csv_paths = {}
 
@@ -162,16 +126,14 @@ def fetch_team_details_logic(
 
         if all_csvs_exist:
             try:
-                logger.info(f"Loading team details from cached CSV files for team {team_id}")
+                logger.info(f"Loading team details from cached Parquet files for team {team_id}")
 
-                # Load all DataFrames from CSV
+                # Load all DataFrames from the dataset cache
                 for dataset_name in dataframe_names:
                     csv_path = csv_paths[dataset_name]
-                    if os.path.exists(csv_path):
-                        file_size = os.path.getsize(csv_path)
-                        if file_size > 50:  # Only load if file has content
-                            df = pd.read_csv(csv_path, encoding='utf-8')
-                            dataframes[dataset_name] = df
+                    df = load_dataset(csv_path)
+                    if df is not None:
+                        dataframes[dataset_name] = df
 
                 # Process for JSON response
                 result_dict = {
@@ -195,7 +157,7 @@ def fetch_team_details_logic(
                 return format_response(result_dict)
 
             except Exception as e:
-                logger.error(f"Error loading CSV files: {e}", exc_info=True)
+                logger.error(f"Error loading Parquet files: {e}", exc_info=True)
                 # If there's an error loading the CSVs, fetch from the API
 
     try:
@@ -237,9 +199,9 @@ def fetch_team_details_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
 
-                    # Save each DataFrame to its own CSV file
+                    # Save each DataFrame to its own Parquet file
                     csv_path = _get_csv_path_for_team_details(team_id, data_set_name)
-                    _save_dataframe_to_csv(df, csv_path)
+                    save_dataset(df, csv_path)
 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
@@ -248,11 +210,11 @@ def fetch_team_details_logic(
                 # Include empty datasets in the response
                 result_dict["data_sets"][data_set_name] = []
 
-                # Save empty CSV file for consistency
+                # Save empty Parquet file for consistency
                 if return_dataframe:
                     csv_path = _get_csv_path_for_team_details(team_id, data_set_name)
                     empty_df = pd.DataFrame()
-                    _save_dataframe_to_csv(empty_df, csv_path)
+                    save_dataset(empty_df, csv_path)
 
         final_json_response = format_response(result_dict)
         if return_dataframe:
@@ -1,6 +1,6 @@
 """
 Handles fetching team game logs.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 
 This module implements the TeamGameLogs endpoint, which provides
 detailed game-by-game statistics for teams:
@@ -12,7 +12,7 @@ import os
 import logging
 import json
 from typing import Optional, Dict, Any, Union, Tuple, List
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import teamgamelogs
@@ -26,6 +26,7 @@ from api_tools.utils import (
     format_response
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -87,23 +88,6 @@ VALID_DIVISIONS = {
 }
 
 # --- Helper Functions for DataFrame Processing ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
 
 def _get_csv_path_for_team_game_logs(
     season: str,
@@ -115,7 +99,7 @@ def _get_csv_path_for_team_game_logs(
     date_to: Optional[str] = None
 ) -> str:
     """
-    Generates a file path for saving a team game logs DataFrame as CSV.
+    Generates a file path for saving a team game logs DataFrame as Parquet.
 
     Args:
         season: The season in YYYY-YY format
@@ -127,7 +111,7 @@ def _get_csv_path_for_team_game_logs(
         date_to: Optional end date filter (MM/DD/YYYY)
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean up parameters for filename
     season_clean = season.replace("-", "_") if season else "all_seasons"
@@ -151,7 +135,7 @@ def _get_csv_path_for_team_game_logs(
         date_to_clean = date_to.replace("/", "_")
         filename_parts.append(f"to_{date_to_clean}")
 
-    filename = "_".join(filename_parts) + ".csv"
+    filename = "_".join(filename_parts) + ".parquet"
 
     return get_cache_file_path(filename, "team_game_logs")
 
@@ -223,7 +207,7 @@ def _validate_team_game_logs_params(
     return None
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=TEAM_GAME_LOGS_CACHE_SIZE)
+@cached_logic(maxsize=TEAM_GAME_LOGS_CACHE_SIZE)
 def fetch_team_game_logs_logic(
     season: str = settings.CURRENT_NBA_SEASON,
     season_type: str = "Regular Season",
@@ -368,12 +352,12 @@ def fetch_team_game_logs_logic(
                 if return_dataframe:
                     dataframes[data_set_name] = df
 
-                    # Save to CSV if not empty
+                    # Save to Parquet if not empty
                     if not df.empty:
                         csv_path = _get_csv_path_for_team_game_logs(
                             season, season_type, per_mode, measure_type, team_id, date_from, date_to
                         )
-                        _save_dataframe_to_csv(df, csv_path)
+                        save_dataset(df, csv_path)
 
                 # Process for JSON response
                 processed_data = _process_dataframe(df, single_row=False)
@@ -1,7 +1,7 @@
 """
 Handles fetching general team statistics, including current season dashboard stats
-and historical year-by-year performance.
-Provides both JSON and DataFrame outputs with CSV caching.
+and historical year-by-year performance. The two endpoints are fetched concurrently.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
@@ -27,6 +27,7 @@ from api_tools.utils import (
     TeamNotFoundError
 )
 from utils.validation import _validate_season_format, validate_date_format
+from api_tools.composite import SubFetch, fetch_concurrently
 
 logger = logging.getLogger(__name__)
 
@@ -41,26 +42,11 @@ _TEAM_GENERAL_VALID_LEAGUE_IDS: Set[str] = {getattr(LeagueID, attr) for attr in
 
 # --- Cache Directory Setup ---
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
+from utils.cache import cached_logic
 TEAM_GENERAL_CSV_DIR = get_cache_dir("team_general")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file, creating the directory if it doesn't exist.
-
-    Args:
-        df: The DataFrame to save
-        file_path: The path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.debug(f"Saved DataFrame to {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to {file_path}: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_team_general(
     team_name: str,
@@ -71,7 +57,7 @@ def _get_csv_path_for_team_general(
     data_type: str
 ) -> str:
     """
-    Generates a file path for saving team general stats DataFrame as CSV.
+    Generates a file path for saving team general stats DataFrame as Parquet.
 
     Args:
         team_name: The team's name
@@ -82,7 +68,7 @@ def _get_csv_path_for_team_general(
         data_type: The type of data ('dashboard' or 'historical')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean team name and data type for filename
     clean_team_name = team_name.replace(" ", "_").replace(".", "").lower()
@@ -90,7 +76,7 @@ def _get_csv_path_for_team_general(
     clean_per_mode = per_mode.replace(" ", "_").lower()
     clean_measure_type = measure_type.replace(" ", "_").lower()
 
-    filename = f"{clean_team_name}_{season}_{clean_season_type}_{clean_per_mode}_{clean_measure_type}_{data_type}.csv"
+    filename = f"{clean_team_name}_{season}_{clean_season_type}_{clean_per_mode}_{clean_measure_type}_{data_type}.parquet"
     return get_cache_file_path(filename, "team_general")
 
 # --- Helper Functions ---
@@ -127,7 +113,7 @@ def _fetch_dashboard_general_splits_data(
         opponent_team_id: Filter by opponent team ID
         date_from: Start date filter (YYYY-MM-DD)
         date_to: End date filter (YYYY-MM-DD)
-        team_name: The team's name (for CSV file naming)
+        team_name: The team's name (for Parquet file naming)
         last_n_games: Number of games to include (0 for all games)
         league_id_nullable: League ID (e.g., "00" for NBA)
         month: Month number (0 for all months)
@@ -185,12 +171,12 @@ def _fetch_dashboard_general_splits_data(
         )
         overall_stats_df = dashboard_endpoint.overall_team_dashboard.get_data_frame()
 
-        # Save DataFrame to CSV if requested and not empty
+        # Save DataFrame to the dataset cache if requested and not empty
         if return_dataframe and not overall_stats_df.empty and team_name:
             csv_path = _get_csv_path_for_team_general(
                 team_name, season, season_type, per_mode, measure_type, "dashboard"
             )
-            _save_dataframe_to_csv(overall_stats_df, csv_path)
+            save_dataset(overall_stats_df, csv_path)
 
         dashboard_stats_dict = _process_dataframe(overall_stats_df, single_row=True) or {}
 
@@ -222,7 +208,7 @@ def _fetch_historical_year_by_year_stats(
         team_id: The team's ID
         league_id: League ID (e.g., "00" for NBA)
         season_type_for_hist: Type of season for historical stats
-        team_name: The team's name (for CSV file naming)
+        team_name: The team's name (for Parquet file naming)
         return_dataframe: Whether to return the original DataFrame
 
     Returns:
@@ -245,12 +231,12 @@ def _fetch_historical_year_by_year_stats(
         )
         hist_df = historical_endpoint.team_stats.get_data_frame()
 
-        # Save DataFrame to CSV if requested and not empty
+        # Save DataFrame to the dataset cache if requested and not empty
         if return_dataframe and not hist_df.empty and team_name:
             csv_path = _get_csv_path_for_team_general(
                 team_name, "all_seasons", season_type_for_hist, DEFAULT_HISTORICAL_PER_MODE, "base", "historical"
             )
-            _save_dataframe_to_csv(hist_df, csv_path)
+            save_dataset(hist_df, csv_path)
 
         historical_stats_list = _process_dataframe(hist_df, single_row=False) or []
 
@@ -268,6 +254,7 @@ def _fetch_historical_year_by_year_stats(
     return historical_stats_list, error_message
 
 # --- Main Logic Function ---
+@cached_logic()
 def fetch_team_stats_logic(
     team_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON, # Season for dashboard stats
@@ -386,63 +373,47 @@ def fetch_team_stats_logic(
         team_id, team_actual_name = find_team_id_or_error(team_identifier)
         all_errors: List[str] = []
 
-        # Fetch dashboard stats with DataFrame if requested
+        # Fetch the dashboard and the year-by-year history concurrently
+        dashboard_kwargs: Dict[str, Any] = {
+            "last_n_games": last_n_games,
+            "league_id_nullable": league_id,
+            "month": month,
+            "period": period,
+            "vs_division_nullable": vs_division_nullable,
+            "vs_conference_nullable": vs_conference_nullable,
+            "season_segment_nullable": season_segment_nullable,
+            "outcome_nullable": outcome_nullable,
+            "location_nullable": location_nullable,
+            "game_segment_nullable": game_segment_nullable,
+            "pace_adjust": pace_adjust,
+            "plus_minus": plus_minus,
+            "rank": rank,
+            "shot_clock_range_nullable": shot_clock_range_nullable,
+            "po_round_nullable": po_round_nullable,
+        }
+        historical_kwargs: Dict[str, Any] = {}
         if return_dataframe:
-            dashboard_stats, dash_err, dashboard_df = _fetch_dashboard_general_splits_data(
-                team_id, season, season_type, per_mode, measure_type, opponent_team_id, date_from, date_to,
-                team_name=team_actual_name,
-                last_n_games=last_n_games,
-                league_id_nullable=league_id,
-                month=month,
-                period=period,
-                vs_division_nullable=vs_division_nullable,
-                vs_conference_nullable=vs_conference_nullable,
-                season_segment_nullable=season_segment_nullable,
-                outcome_nullable=outcome_nullable,
-                location_nullable=location_nullable,
-                game_segment_nullable=game_segment_nullable,
-                pace_adjust=pace_adjust,
-                plus_minus=plus_minus,
-                rank=rank,
-                shot_clock_range_nullable=shot_clock_range_nullable,
-                po_round_nullable=po_round_nullable,
-                return_dataframe=True
-            )
-            dataframes["dashboard"] = dashboard_df
-        else:
-            dashboard_stats, dash_err = _fetch_dashboard_general_splits_data(
-                team_id, season, season_type, per_mode, measure_type, opponent_team_id, date_from, date_to,
-                last_n_games=last_n_games,
-                league_id_nullable=league_id,
-                month=month,
-                period=period,
-                vs_division_nullable=vs_division_nullable,
-                vs_conference_nullable=vs_conference_nullable,
-                season_segment_nullable=season_segment_nullable,
-                outcome_nullable=outcome_nullable,
-                location_nullable=location_nullable,
-                game_segment_nullable=game_segment_nullable,
-                pace_adjust=pace_adjust,
-                plus_minus=plus_minus,
-                rank=rank,
-                shot_clock_range_nullable=shot_clock_range_nullable,
-                po_round_nullable=po_round_nullable
-            )
-
-        if dash_err: all_errors.append(dash_err)
-
-        # Fetch historical stats with DataFrame if requested
+            dashboard_kwargs.update(team_name=team_actual_name, return_dataframe=True)
+            historical_kwargs.update(team_name=team_actual_name, return_dataframe=True)
+        sub_results = fetch_concurrently({
+            "dashboard": SubFetch(
+                _fetch_dashboard_general_splits_data,
+                (team_id, season, season_type, per_mode, measure_type, opponent_team_id, date_from, date_to),
+                dashboard_kwargs,
+            ),
+            "historical": SubFetch(_fetch_historical_year_by_year_stats, (team_id, league_id, season_type), historical_kwargs),
+        })
+        # The helpers report their own API errors; a sub-fetch error means the part timed out or crashed
+        dashboard_result = sub_results["dashboard"].value or ({}, f"team dashboard ({sub_results['dashboard'].error})", pd.DataFrame())
+        historical_result = sub_results["historical"].value or ([], f"historical stats ({sub_results['historical'].error})", pd.DataFrame())
+
+        dashboard_stats, dash_err = dashboard_result[:2]
+        historical_stats, hist_err = historical_result[:2]
         if return_dataframe:
-            historical_stats, hist_err, historical_df = _fetch_historical_year_by_year_stats(
-                team_id, league_id, season_type,
-                team_name=team_actual_name, return_dataframe=True
-            )
-            dataframes["historical"] = historical_df
-        else:
-            historical_stats, hist_err = _fetch_historical_year_by_year_stats(
-                team_id, league_id, season_type
-            )
+            dataframes["dashboard"] = dashboard_result[2]
+            dataframes["historical"] = historical_result[2]
 
+        if dash_err: all_errors.append(dash_err)
         if hist_err: all_errors.append(hist_err)
 
         if not dashboard_stats and not historical_stats and all_errors:
@@ -492,7 +463,7 @@ def fetch_team_stats_logic(
         if return_dataframe:
             # Add DataFrame metadata to the response
             result["dataframe_info"] = {
-                "message": "Team stats data has been converted to DataFrames and saved as CSV files",
+                "message": "Team stats data has been converted to DataFrames and saved as Parquet files",
                 "dataframes": {}
             }
 
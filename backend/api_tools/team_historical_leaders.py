@@ -7,6 +7,7 @@ from nba_api.stats.library.parameters import LeagueID # For default value
 from config import settings
 from core.errors import Errors
 from api_tools.utils import format_response, _process_dataframe, find_team_id_or_error, TeamNotFoundError
+from utils.cache import cached_logic
 from utils.validation import _validate_league_id # Assuming this exists and is appropriate
 
 logger = logging.getLogger(__name__)
@@ -19,6 +20,7 @@ def _validate_season_id_format(season_id: str) -> bool:
     """Validates that the season_id is a 5-digit string."""
     return isinstance(season_id, str) and len(season_id) == 5 and season_id.isdigit()
 
+@cached_logic()
 def fetch_team_historical_leaders_logic(
     team_identifier: str,
     season_id: str, # e.g., "22022" for 2022-23 season
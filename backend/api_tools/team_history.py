@@ -1,7 +1,7 @@
 import logging
 import json # Added for potential use if format_response changes
 import os # Added for path operations
-from functools import lru_cache
+from utils.cache import cached_logic
 from typing import Union, Tuple, Dict # Added for typing
 import pandas as pd # Added for DataFrame typing
 
@@ -16,39 +16,23 @@ from api_tools.utils import (
 )
 from utils.validation import _validate_league_id
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
 # Define cache directory
 TEAM_HISTORY_CSV_DIR = get_cache_dir("team_history")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file, creating the directory if it doesn't exist.
-
-    Args:
-        df: The DataFrame to save
-        file_path: The path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.debug(f"Saved DataFrame to {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to {file_path}: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_team_history(league_id: str) -> str:
     """
-    Generates a file path for saving team history DataFrame as CSV.
+    Generates a file path for saving team history DataFrame as Parquet.
     """
-    filename = f"team_history_league_{league_id}.csv"
+    filename = f"team_history_league_{league_id}.parquet"
     return get_cache_file_path(filename, "team_history")
 
-@lru_cache(maxsize=settings.DEFAULT_LRU_CACHE_SIZE)
+@cached_logic(maxsize=settings.DEFAULT_LRU_CACHE_SIZE)
 def fetch_common_team_years_logic(
     league_id: str = LeagueID.nba,
     return_dataframe: bool = False
@@ -85,7 +69,7 @@ def fetch_common_team_years_logic(
             dataframes["team_years"] = team_years_df
             if not team_years_df.empty:
                 csv_path = _get_csv_path_for_team_history(league_id)
-                _save_dataframe_to_csv(team_years_df, csv_path)
+                save_dataset(team_years_df, csv_path)
 
         team_years_list = _process_dataframe(team_years_df, single_row=False)
 
@@ -108,7 +92,7 @@ def fetch_common_team_years_logic(
             relative_path = get_relative_cache_path(csv_filename, "team_history")
 
             response_data["dataframe_info"] = {
-                "message": "Team history data has been converted to DataFrame and saved as CSV file",
+                "message": "Team history data has been converted to DataFrame and saved as Parquet file",
                 "dataframes": {
                     "team_years": {
                         "shape": list(team_years_df.shape),
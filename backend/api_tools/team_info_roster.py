@@ -1,12 +1,12 @@
 """
 Handles fetching comprehensive team information, including common details,
-season ranks, roster, and coaching staff.
-Provides both JSON and DataFrame outputs with CSV caching.
+season ranks, roster, and coaching staff. The two endpoints are fetched concurrently.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 from typing import Optional, Dict, List, Tuple, Any, Set, Union
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import teaminfocommon, commonteamroster
@@ -20,8 +20,10 @@ from api_tools.utils import (
     find_team_id_or_error,
     TeamNotFoundError
 )
+from api_tools.composite import SubFetch, fetch_concurrently
 from utils.validation import _validate_season_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -33,24 +35,7 @@ _TEAM_INFO_VALID_LEAGUE_IDS: Set[str] = {getattr(LeagueID, attr) for attr in dir
 # --- Cache Directory Setup ---
 TEAM_INFO_CSV_DIR = get_cache_dir("team_info")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file, creating the directory if it doesn't exist.
-
-    Args:
-        df: The DataFrame to save
-        file_path: The path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.debug(f"Saved DataFrame to {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to {file_path}: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_team_info(
     team_name: str,
@@ -59,7 +44,7 @@ def _get_csv_path_for_team_info(
     league_id: str
 ) -> str:
     """
-    Generates a file path for saving team info/roster DataFrame as CSV.
+    Generates a file path for saving team info/roster DataFrame as Parquet.
 
     Args:
         team_name: The team's name
@@ -68,12 +53,12 @@ def _get_csv_path_for_team_info(
         league_id: The league ID
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean team name and data type for filename
     clean_team_name = team_name.replace(" ", "_").replace(".", "").lower()
 
-    filename = f"{clean_team_name}_{data_type}_{season}_{league_id}.csv"
+    filename = f"{clean_team_name}_{data_type}_{season}_{league_id}.parquet"
     return get_cache_file_path(filename, "team_info")
 
 # --- Helper Functions ---
@@ -90,7 +75,7 @@ def _fetch_team_details_and_ranks(
         season: NBA season in YYYY-YY format
         season_type: Type of season (e.g., "Regular Season")
         league_id: League ID (e.g., "00" for NBA)
-        team_name: The team's name (for CSV file naming)
+        team_name: The team's name (for Parquet file naming)
         return_dataframe: Whether to return the original DataFrames
 
     Returns:
@@ -114,15 +99,15 @@ def _fetch_team_details_and_ranks(
         team_info_df = team_info_endpoint.team_info_common.get_data_frame()
         team_ranks_df = team_info_endpoint.team_season_ranks.get_data_frame()
 
-        # Save DataFrames to CSV if requested and not empty
+        # Save DataFrames to the dataset cache if requested and not empty
         if return_dataframe and team_name:
             if not team_info_df.empty:
                 info_csv_path = _get_csv_path_for_team_info(team_name, "info", season, league_id)
-                _save_dataframe_to_csv(team_info_df, info_csv_path)
+                save_dataset(team_info_df, info_csv_path)
 
             if not team_ranks_df.empty:
                 ranks_csv_path = _get_csv_path_for_team_info(team_name, "ranks", season, league_id)
-                _save_dataframe_to_csv(team_ranks_df, ranks_csv_path)
+                save_dataset(team_ranks_df, ranks_csv_path)
 
         info_dict = _process_dataframe(team_info_df, single_row=True) if not team_info_df.empty else {}
         ranks_dict = _process_dataframe(team_ranks_df, single_row=True) if not team_ranks_df.empty else {}
@@ -156,7 +141,7 @@ def _fetch_team_roster_and_coaches(
         team_id: The team's ID
         season: NBA season in YYYY-YY format
         league_id: League ID (e.g., "00" for NBA)
-        team_name: The team's name (for CSV file naming)
+        team_name: The team's name (for Parquet file naming)
         return_dataframe: Whether to return the original DataFrames
 
     Returns:
@@ -179,15 +164,15 @@ def _fetch_team_roster_and_coaches(
         roster_df = roster_endpoint.common_team_roster.get_data_frame()
         coaches_df = roster_endpoint.coaches.get_data_frame()
 
-        # Save DataFrames to CSV if requested and not empty
+        # Save DataFrames to the dataset cache if requested and not empty
         if return_dataframe and team_name:
             if not roster_df.empty:
                 roster_csv_path = _get_csv_path_for_team_info(team_name, "roster", season, league_id)
-                _save_dataframe_to_csv(roster_df, roster_csv_path)
+                save_dataset(roster_df, roster_csv_path)
 
             if not coaches_df.empty:
                 coaches_csv_path = _get_csv_path_for_team_info(team_name, "coaches", season, league_id)
-                _save_dataframe_to_csv(coaches_df, coaches_csv_path)
+                save_dataset(coaches_df, coaches_csv_path)
 
         roster_list = _process_dataframe(roster_df, single_row=False) if not roster_df.empty else []
         coaches_list = _process_dataframe(coaches_df, single_row=False) if not coaches_df.empty else []
@@ -209,7 +194,7 @@ def _fetch_team_roster_and_coaches(
     return roster_list or [], coaches_list or [], current_errors
 
 # --- Main Logic Function ---
-@lru_cache(maxsize=TEAM_INFO_ROSTER_CACHE_SIZE)
+@cached_logic(maxsize=TEAM_INFO_ROSTER_CACHE_SIZE)
 def fetch_team_info_and_roster_logic(
     team_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -265,30 +250,22 @@ def fetch_team_info_and_roster_logic(
         team_id, team_actual_name = find_team_id_or_error(team_identifier)
         all_errors: List[str] = []
 
-        # Fetch team details and ranks with DataFrame if requested
+        # Fetch team details/ranks and roster/coaches concurrently
+        dataframe_kwargs = {"team_name": team_actual_name, "return_dataframe": True} if return_dataframe else None
+        sub_results = fetch_concurrently({
+            "info": SubFetch(_fetch_team_details_and_ranks, (team_id, season, season_type, league_id), dataframe_kwargs),
+            "roster": SubFetch(_fetch_team_roster_and_coaches, (team_id, season, league_id), dataframe_kwargs),
+        })
+        # The helpers report their own API errors; a sub-fetch error means the part timed out or crashed
+        info_result = sub_results["info"].value or ({}, {}, [f"team info/ranks ({sub_results['info'].error})"], pd.DataFrame(), pd.DataFrame())
+        roster_result = sub_results["roster"].value or ([], [], [f"roster/coaches ({sub_results['roster'].error})"], pd.DataFrame(), pd.DataFrame())
+
+        team_info_dict, team_ranks_dict, info_errors = info_result[:3]
+        roster_list, coaches_list, roster_errors = roster_result[:3]
         if return_dataframe:
-            team_info_dict, team_ranks_dict, info_errors, team_info_df, team_ranks_df = _fetch_team_details_and_ranks(
-                team_id, season, season_type, league_id, team_name=team_actual_name, return_dataframe=True
-            )
-            dataframes["team_info"] = team_info_df
-            dataframes["team_ranks"] = team_ranks_df
-        else:
-            team_info_dict, team_ranks_dict, info_errors = _fetch_team_details_and_ranks(
-                team_id, season, season_type, league_id
-            )
+            dataframes["team_info"], dataframes["team_ranks"] = info_result[3:5]
+            dataframes["roster"], dataframes["coaches"] = roster_result[3:5]
         all_errors.extend(info_errors)
-
-        # Fetch roster and coaches with DataFrame if requested
-        if return_dataframe:
-            roster_list, coaches_list, roster_errors, roster_df, coaches_df = _fetch_team_roster_and_coaches(
-                team_id, season, league_id, team_name=team_actual_name, return_dataframe=True
-            )
-            dataframes["roster"] = roster_df
-            dataframes["coaches"] = coaches_df
-        else:
-            roster_list, coaches_list, roster_errors = _fetch_team_roster_and_coaches(
-                team_id, season, league_id
-            )
         all_errors.extend(roster_errors)
 
         if not team_info_dict and not team_ranks_dict and not roster_list and not coaches_list and all_errors:
@@ -310,7 +287,7 @@ def fetch_team_info_and_roster_logic(
         # Add DataFrame metadata to the response if returning DataFrames
         if return_dataframe:
             result["dataframe_info"] = {
-                "message": "Team information data has been converted to DataFrames and saved as CSV files",
+                "message": "Team information data has been converted to DataFrames and saved as Parquet files",
                 "dataframes": {}
             }
 
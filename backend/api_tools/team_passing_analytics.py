@@ -1,12 +1,12 @@
 """
 Handles fetching team passing statistics, including passes made and received.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
 from typing import Optional, Dict, List, Any, Union, Tuple
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import teamdashptpass
@@ -22,30 +22,14 @@ from api_tools.utils import (
 )
 from utils.validation import _validate_season_format
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 
 logger = logging.getLogger(__name__)
 
 # --- Cache Directory Setup ---
 TEAM_PASSING_CSV_DIR = get_cache_dir("team_passing")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file, creating the directory if it doesn't exist.
-
-    Args:
-        df: The DataFrame to save
-        file_path: The path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.debug(f"Saved DataFrame to {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to {file_path}: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_team_passing(
     team_name: str,
@@ -55,7 +39,7 @@ def _get_csv_path_for_team_passing(
     per_mode: str
 ) -> str:
     """
-    Generates a file path for saving team passing DataFrame as CSV.
+    Generates a file path for saving team passing DataFrame as Parquet.
 
     Args:
         team_name: The team's name
@@ -65,17 +49,17 @@ def _get_csv_path_for_team_passing(
         per_mode: The per mode (e.g., 'PerGame', 'Totals')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean team name and data type for filename
     clean_team_name = team_name.replace(" ", "_").replace(".", "").lower()
     clean_season_type = season_type.replace(" ", "_").lower()
     clean_per_mode = per_mode.replace(" ", "_").lower()
 
-    filename = f"{clean_team_name}_{data_type}_{season}_{clean_season_type}_{clean_per_mode}.csv"
+    filename = f"{clean_team_name}_{data_type}_{season}_{clean_season_type}_{clean_per_mode}.parquet"
     return get_cache_file_path(filename, "team_passing")
 
-@lru_cache(maxsize=128)
+@cached_logic(maxsize=128)
 def fetch_team_passing_stats_logic(
     team_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -186,25 +170,25 @@ def fetch_team_passing_stats_logic(
                 return format_response(error=error_msg), dataframes
             return format_response(error=error_msg)
 
-        # Save DataFrames to CSV if requested and not empty
+        # Save DataFrames to the dataset cache if requested and not empty
         if return_dataframe:
             # Add DataFrames to the dictionary
             dataframes["passes_made"] = passes_made_df
             dataframes["passes_received"] = passes_received_df
 
-            # Save passes_made DataFrame to CSV if not empty
+            # Save passes_made DataFrame to the dataset cache if not empty
             if not passes_made_df.empty:
                 passes_made_csv_path = _get_csv_path_for_team_passing(
                     team_actual_name, "passes_made", season, season_type, per_mode
                 )
-                _save_dataframe_to_csv(passes_made_df, passes_made_csv_path)
+                save_dataset(passes_made_df, passes_made_csv_path)
 
-            # Save passes_received DataFrame to CSV if not empty
+            # Save passes_received DataFrame to the dataset cache if not empty
             if not passes_received_df.empty:
                 passes_received_csv_path = _get_csv_path_for_team_passing(
                     team_actual_name, "passes_received", season, season_type, per_mode
                 )
-                _save_dataframe_to_csv(passes_received_df, passes_received_csv_path)
+                save_dataset(passes_received_df, passes_received_csv_path)
 
         passes_made_list = _process_dataframe(passes_made_df, single_row=False)
         passes_received_list = _process_dataframe(passes_received_df, single_row=False)
@@ -246,7 +230,7 @@ def fetch_team_passing_stats_logic(
         # Add DataFrame metadata to the response if returning DataFrames
         if return_dataframe:
             result["dataframe_info"] = {
-                "message": "Team passing data has been converted to DataFrames and saved as CSV files",
+                "message": "Team passing data has been converted to DataFrames and saved as Parquet files",
                 "dataframes": {}
             }
 
@@ -9,6 +9,7 @@ from nba_api.stats.library.parameters import (
 from config import settings
 from core.errors import Errors
 from api_tools.utils import format_response, _process_dataframe, find_team_id_or_error
+from utils.cache import cached_logic
 from utils.validation import _validate_season_format, validate_date_format
 
 logger = logging.getLogger(__name__)
@@ -19,6 +20,7 @@ _VALID_PER_MODES = {getattr(PerModeDetailed, attr) for attr in dir(PerModeDetail
 _VALID_MEASURE_TYPES = {getattr(MeasureTypeDetailedDefense, attr) for attr in dir(MeasureTypeDetailedDefense) if not attr.startswith('_') and isinstance(getattr(MeasureTypeDetailedDefense, attr), str)}
 _VALID_LEAGUE_IDS = {getattr(LeagueID, attr) for attr in dir(LeagueID) if not attr.startswith('_') and isinstance(getattr(LeagueID, attr), str)}
 
+@cached_logic()
 def fetch_team_player_dashboard_logic(
     team_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON,
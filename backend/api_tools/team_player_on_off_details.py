@@ -9,6 +9,7 @@ from nba_api.stats.library.parameters import (
 from config import settings
 from core.errors import Errors
 from api_tools.utils import format_response, _process_dataframe, find_team_id_or_error
+from utils.cache import cached_logic
 from utils.validation import _validate_season_format, validate_date_format
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ _VALID_LOCATIONS = {None, "", "Home", "Road"}
 _VALID_GAME_SEGMENTS = {None, "", "First Half", "Overtime", "Second Half"}
 
 
+@cached_logic()
 def fetch_team_player_on_off_details_logic(
     team_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -1,14 +1,13 @@
 """
 Handles fetching team-level rebounding tracking statistics using the TeamDashPtReb endpoint.
 Utilizes shared utilities for team identification and parameter validation.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
 from typing import Optional, Set, Dict, Union, Tuple # For type hinting validation sets
-from functools import lru_cache
-
+from utils.cache import cached_logic
 import pandas as pd
 from nba_api.stats.endpoints import teamdashptreb
 from nba_api.stats.library.parameters import SeasonTypeAllStar, PerModeSimple
@@ -34,26 +33,10 @@ teamdashptreb.requests = nba_session
 
 # --- Cache Directory Setup ---
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 TEAM_REBOUNDING_CSV_DIR = get_cache_dir("team_rebounding")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file, creating the directory if it doesn't exist.
-
-    Args:
-        df: The DataFrame to save
-        file_path: The path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.debug(f"Saved DataFrame to {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to {file_path}: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_team_rebounding(
     team_name: str,
@@ -63,7 +46,7 @@ def _get_csv_path_for_team_rebounding(
     data_type: str
 ) -> str:
     """
-    Generates a file path for saving team rebounding DataFrame as CSV.
+    Generates a file path for saving team rebounding DataFrame as Parquet.
 
     Args:
         team_name: The team's name
@@ -73,17 +56,18 @@ def _get_csv_path_for_team_rebounding(
         data_type: The type of data ('overall', 'shot_type', 'contest', 'shot_distance', 'reb_distance')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean team name and data type for filename
     clean_team_name = team_name.replace(" ", "_").replace(".", "").lower()
     clean_season_type = season_type.replace(" ", "_").lower()
     clean_per_mode = per_mode.replace(" ", "_").lower()
 
-    filename = f"{clean_team_name}_{season}_{clean_season_type}_{clean_per_mode}_{data_type}.csv"
+    filename = f"{clean_team_name}_{season}_{clean_season_type}_{clean_per_mode}_{data_type}.parquet"
     return get_cache_file_path(filename, "team_rebounding")
 
 # --- Main Logic Function ---
+@cached_logic()
 def fetch_team_rebounding_stats_logic(
     team_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -227,36 +211,36 @@ def fetch_team_rebounding_stats_logic(
             dataframes["shot_distance"] = distances_df
             dataframes["reb_distance"] = reb_dist_df
 
-            # Save DataFrames to CSV if not empty
+            # Save DataFrames to the dataset cache if not empty
             if not overall_df.empty:
                 csv_path = _get_csv_path_for_team_rebounding(
                     team_name_resolved, season, season_type, per_mode, "overall"
                 )
-                _save_dataframe_to_csv(overall_df, csv_path)
+                save_dataset(overall_df, csv_path)
 
             if not shot_type_df.empty:
                 csv_path = _get_csv_path_for_team_rebounding(
                     team_name_resolved, season, season_type, per_mode, "shot_type"
                 )
-                _save_dataframe_to_csv(shot_type_df, csv_path)
+                save_dataset(shot_type_df, csv_path)
 
             if not contested_df.empty:
                 csv_path = _get_csv_path_for_team_rebounding(
                     team_name_resolved, season, season_type, per_mode, "contest"
                 )
-                _save_dataframe_to_csv(contested_df, csv_path)
+                save_dataset(contested_df, csv_path)
 
             if not distances_df.empty:
                 csv_path = _get_csv_path_for_team_rebounding(
                     team_name_resolved, season, season_type, per_mode, "shot_distance"
                 )
-                _save_dataframe_to_csv(distances_df, csv_path)
+                save_dataset(distances_df, csv_path)
 
             if not reb_dist_df.empty:
                 csv_path = _get_csv_path_for_team_rebounding(
                     team_name_resolved, season, season_type, per_mode, "reb_distance"
                 )
-                _save_dataframe_to_csv(reb_dist_df, csv_path)
+                save_dataset(reb_dist_df, csv_path)
 
         overall_data = _process_dataframe(overall_df, single_row=True)
         shot_type_list = _process_dataframe(shot_type_df, single_row=False)
@@ -339,7 +323,7 @@ def fetch_team_rebounding_stats_logic(
         # Add DataFrame metadata to the response if returning DataFrames
         if return_dataframe:
             result["dataframe_info"] = {
-                "message": "Team rebounding tracking data has been converted to DataFrames and saved as CSV files",
+                "message": "Team rebounding tracking data has been converted to DataFrames and saved as Parquet files",
                 "dataframes": {}
             }
 
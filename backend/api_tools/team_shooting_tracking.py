@@ -1,15 +1,14 @@
 """
 Handles fetching team-level shooting tracking statistics using the TeamDashPtShots endpoint.
 Utilizes shared utilities for team identification and parameter validation.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import logging
 import os
 import json
 import pandas as pd
 from typing import Optional, Set, Dict, Union, Tuple # For type hinting validation sets
-from functools import lru_cache
-
+from utils.cache import cached_logic
 from nba_api.stats.endpoints import teamdashptshots
 from nba_api.stats.library.parameters import SeasonTypeAllStar, PerModeSimple
 
@@ -34,26 +33,10 @@ teamdashptshots.requests = nba_session
 
 # --- Cache Directory Setup ---
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
 TEAM_SHOOTING_CSV_DIR = get_cache_dir("team_shooting")
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file, creating the directory if it doesn't exist.
-
-    Args:
-        df: The DataFrame to save
-        file_path: The path to save the CSV file
-    """
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        # Save DataFrame to CSV
-        df.to_csv(file_path, index=False)
-        logger.debug(f"Saved DataFrame to {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to {file_path}: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_team_shooting(
     team_name: str,
@@ -63,7 +46,7 @@ def _get_csv_path_for_team_shooting(
     data_type: str
 ) -> str:
     """
-    Generates a file path for saving team shooting DataFrame as CSV.
+    Generates a file path for saving team shooting DataFrame as Parquet.
 
     Args:
         team_name: The team's name
@@ -73,17 +56,18 @@ def _get_csv_path_for_team_shooting(
         data_type: The type of data ('general', 'shot_clock', 'dribble', 'defender', 'touch_time')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean team name and data type for filename
     clean_team_name = team_name.replace(" ", "_").replace(".", "").lower()
     clean_season_type = season_type.replace(" ", "_").lower()
     clean_per_mode = per_mode.replace(" ", "_").lower()
 
-    filename = f"{clean_team_name}_{season}_{clean_season_type}_{clean_per_mode}_{data_type}.csv"
+    filename = f"{clean_team_name}_{season}_{clean_season_type}_{clean_per_mode}_{data_type}.parquet"
     return get_cache_file_path(filename, "team_shooting")
 
 # --- Main Logic Function ---
+@cached_logic()
 def fetch_team_shooting_stats_logic(
     team_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -231,36 +215,36 @@ def fetch_team_shooting_stats_logic(
             dataframes["defender"] = defender_df
             dataframes["touch_time"] = touch_time_df
 
-            # Save DataFrames to CSV if not empty
+            # Save DataFrames to the dataset cache if not empty
             if not general_df.empty:
                 csv_path = _get_csv_path_for_team_shooting(
                     team_name_resolved, season, season_type, per_mode, "general"
                 )
-                _save_dataframe_to_csv(general_df, csv_path)
+                save_dataset(general_df, csv_path)
 
             if not shot_clock_df.empty:
                 csv_path = _get_csv_path_for_team_shooting(
                     team_name_resolved, season, season_type, per_mode, "shot_clock"
                 )
-                _save_dataframe_to_csv(shot_clock_df, csv_path)
+                save_dataset(shot_clock_df, csv_path)
 
             if not dribbles_df.empty:
                 csv_path = _get_csv_path_for_team_shooting(
                     team_name_resolved, season, season_type, per_mode, "dribble"
                 )
-                _save_dataframe_to_csv(dribbles_df, csv_path)
+                save_dataset(dribbles_df, csv_path)
 
             if not defender_df.empty:
                 csv_path = _get_csv_path_for_team_shooting(
                     team_name_resolved, season, season_type, per_mode, "defender"
                 )
-                _save_dataframe_to_csv(defender_df, csv_path)
+                save_dataset(defender_df, csv_path)
 
             if not touch_time_df.empty:
                 csv_path = _get_csv_path_for_team_shooting(
                     team_name_resolved, season, season_type, per_mode, "touch_time"
                 )
-                _save_dataframe_to_csv(touch_time_df, csv_path)
+                save_dataset(touch_time_df, csv_path)
 
         # Process DataFrames for JSON response
         overall_shooting_data = _process_dataframe(general_df.head(1) if not general_df.empty else pd.DataFrame(), single_row=True)
@@ -354,7 +338,7 @@ def fetch_team_shooting_stats_logic(
         # Add DataFrame metadata to the response if returning DataFrames
         if return_dataframe:
             result["dataframe_info"] = {
-                "message": "Team shooting tracking data has been converted to DataFrames and saved as CSV files",
+                "message": "Team shooting tracking data has been converted to DataFrames and saved as Parquet files",
                 "dataframes": {}
             }
 
@@ -12,6 +12,8 @@ from core.errors import Errors
 from api_tools.utils import format_response, _process_dataframe, find_team_id_or_error
 from utils.validation import _validate_season_format, validate_date_format
 from utils.path_utils import get_cache_dir, get_cache_file_path # Added imports
+from utils.dataset_store import save_dataset
+from utils.cache import cached_logic
 
 logger = logging.getLogger(__name__)
 
@@ -23,22 +25,7 @@ _VALID_PER_MODES = {getattr(PerModeDetailed, attr) for attr in dir(PerModeDetail
 _VALID_MEASURE_TYPES = {getattr(MeasureTypeDetailedDefense, attr) for attr in dir(MeasureTypeDetailedDefense) if not attr.startswith('_') and isinstance(getattr(MeasureTypeDetailedDefense, attr), str)}
 _VALID_LEAGUE_IDS = {getattr(LeagueID, attr) for attr in dir(LeagueID) if not attr.startswith('_') and isinstance(getattr(LeagueID, attr), str)}
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_team_player_on_off_summary(
     team_id: str,
@@ -49,7 +36,7 @@ def _get_csv_path_for_team_player_on_off_summary(
     dashboard_type: str # To distinguish between overall, on_court, off_court
 ) -> str:
     """
-    Generates a file path for saving team player on/off summary DataFrame as CSV.
+    Generates a file path for saving team player on/off summary DataFrame as Parquet.
 
     Args:
         team_id: The team's ID
@@ -60,16 +47,17 @@ def _get_csv_path_for_team_player_on_off_summary(
         dashboard_type: The type of dashboard (e.g., 'overall', 'on_court')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     clean_season_type = season_type.replace(" ", "_").lower()
     clean_per_mode = per_mode.replace(" ", "_").lower()
     clean_measure_type = measure_type.replace(" ", "_").lower()
     clean_dashboard_type = dashboard_type.replace(" ", "_").lower()
 
-    filename = f"team_{team_id}_onoffsummary_{clean_dashboard_type}_{season}_{clean_season_type}_{clean_per_mode}_{clean_measure_type}.csv"
+    filename = f"team_{team_id}_onoffsummary_{clean_dashboard_type}_{season}_{clean_season_type}_{clean_per_mode}_{clean_measure_type}.parquet"
     return get_cache_file_path(filename, "team_player_on_off_summary")
 
+@cached_logic()
 def fetch_teamplayeronoffsummary_logic(
     team_identifier: str,
     season: str = settings.CURRENT_NBA_SEASON,
@@ -220,24 +208,24 @@ def fetch_teamplayeronoffsummary_logic(
             dataframes["off_court"] = off_court_df
             dataframes["on_court"] = on_court_df
 
-            # Save DataFrames to CSV
+            # Save DataFrames to the dataset cache
             if not overall_df.empty:
                 csv_path_overall = _get_csv_path_for_team_player_on_off_summary(
                     str(team_id), season, season_type_all_star, per_mode_detailed, measure_type_detailed_defense, "overall"
                 )
-                _save_dataframe_to_csv(overall_df, csv_path_overall)
+                save_dataset(overall_df, csv_path_overall)
 
             if not off_court_df.empty:
                 csv_path_off_court = _get_csv_path_for_team_player_on_off_summary(
                     str(team_id), season, season_type_all_star, per_mode_detailed, measure_type_detailed_defense, "off_court"
                 )
-                _save_dataframe_to_csv(off_court_df, csv_path_off_court)
+                save_dataset(off_court_df, csv_path_off_court)
 
             if not on_court_df.empty:
                 csv_path_on_court = _get_csv_path_for_team_player_on_off_summary(
                     str(team_id), season, season_type_all_star, per_mode_detailed, measure_type_detailed_defense, "on_court"
                 )
-                _save_dataframe_to_csv(on_court_df, csv_path_on_court)
+                save_dataset(on_court_df, csv_path_on_court)
 
         # Process DataFrames for JSON response
         overall_list = _process_dataframe(overall_df, single_row=False)
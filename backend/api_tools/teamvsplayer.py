@@ -12,6 +12,8 @@ from core.errors import Errors
 from api_tools.utils import format_response, _process_dataframe, find_team_id_or_error, find_player_id_or_error
 from utils.validation import _validate_season_format, validate_date_format
 from utils.path_utils import get_cache_dir, get_cache_file_path # Added imports
+from utils.dataset_store import save_dataset
+from utils.cache import cached_logic
 
 logger = logging.getLogger(__name__)
 
@@ -23,21 +25,7 @@ _VALID_PER_MODES = {getattr(PerModeDetailed, attr) for attr in dir(PerModeDetail
 _VALID_MEASURE_TYPES = {getattr(MeasureTypeDetailedDefense, attr) for attr in dir(MeasureTypeDetailedDefense) if not attr.startswith('_') and isinstance(getattr(MeasureTypeDetailedDefense, attr), str)}
 _VALID_LEAGUE_IDS = {getattr(LeagueID, attr) for attr in dir(LeagueID) if not attr.startswith('_') and isinstance(getattr(LeagueID, attr), str)}
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_team_vs_player(
     team_id: str,
@@ -49,7 +37,7 @@ def _get_csv_path_for_team_vs_player(
     dashboard_type: str
 ) -> str:
     """
-    Generates a file path for saving team vs player DataFrame as CSV.
+    Generates a file path for saving team vs player DataFrame as Parquet.
 
     Args:
         team_id: The team's ID
@@ -61,16 +49,17 @@ def _get_csv_path_for_team_vs_player(
         dashboard_type: The type of dashboard (e.g., 'overall', 'on_off_court')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     clean_season_type = season_type.replace(" ", "_").lower()
     clean_per_mode = per_mode.replace(" ", "_").lower()
     clean_measure_type = measure_type.replace(" ", "_").lower()
     clean_dashboard_type = dashboard_type.replace(" ", "_").lower()
 
-    filename = f"team_{team_id}_vs_player_{vs_player_id}_{clean_dashboard_type}_{season}_{clean_season_type}_{clean_per_mode}_{clean_measure_type}.csv"
+    filename = f"team_{team_id}_vs_player_{vs_player_id}_{clean_dashboard_type}_{season}_{clean_season_type}_{clean_per_mode}_{clean_measure_type}.parquet"
     return get_cache_file_path(filename, "team_vs_player")
 
+@cached_logic()
 def fetch_teamvsplayer_logic(
     team_identifier: str,
     vs_player_identifier: str,
@@ -244,7 +233,7 @@ def fetch_teamvsplayer_logic(
                 "shot_distance_off_court": shot_distance_off_court_df,
                 "vs_player_overall": vs_player_overall_df
             }
-            # Save DataFrames to CSV
+            # Save DataFrames to the dataset cache
             for df_key, df_value in dataframes.items():
                 if not df_value.empty:
                     csv_path = _get_csv_path_for_team_vs_player(
@@ -256,7 +245,7 @@ def fetch_teamvsplayer_logic(
                         measure_type,
                         dashboard_type=df_key
                     )
-                    _save_dataframe_to_csv(df_value, csv_path)
+                    save_dataset(df_value, csv_path)
 
         # Process DataFrames for JSON response
         response_data = {
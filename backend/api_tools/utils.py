@@ -8,7 +8,13 @@ from datetime import datetime, date
 from requests.exceptions import ReadTimeout, ConnectionError
 
 from core.errors import Errors
-from nba_api.stats.static import players, teams
+from utils.identity_index import get_identity_index
+
+try:
+    import orjson
+except ImportError:  # Optional: faster encoding when installed
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -16,6 +22,8 @@ DEFAULT_RETRY_ATTEMPTS = 3
 DEFAULT_RETRY_INITIAL_DELAY = 1.0
 DEFAULT_RETRY_MAX_DELAY = 8.0
 MAX_LOG_VALUE_LENGTH = 100
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+_NATIVE_JSON_TYPES = frozenset({str, int, float, bool, type(None)})
 
 def retry_on_timeout(func: Callable[[], Any], max_retries: int = DEFAULT_RETRY_ATTEMPTS, initial_delay: float = DEFAULT_RETRY_INITIAL_DELAY, max_delay: float = DEFAULT_RETRY_MAX_DELAY) -> Any:
     """
@@ -50,18 +58,57 @@ def retry_on_timeout(func: Callable[[], Any], max_retries: int = DEFAULT_RETRY_A
     return None
 
 
+def _json_default(value: Any) -> Any:
+    """Fallback for values the JSON encoder cannot handle natively (numpy scalars, timestamps, NaT, ...)."""
+    return _convert_value_for_json(value, "<nested>", "json_default")
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Encodes data as compact UTF-8 JSON bytes.
+    Uses orjson when installed (NaN/Infinity become null, numpy arrays are supported natively),
+    otherwise falls back to the standard library encoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_json_default, option=ORJSON_OPTIONS)
+        except TypeError as e:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles these.
+            logger.debug(f"Utils: dumps_json - orjson could not encode payload ({e}); using json module.")
+    return json.dumps(data, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+class ResponseJSON(str):
+    """
+    JSON response string that also carries the object it was encoded from, so in-process
+    callers (composite fetches) can skip parsing it back. Treat `data` as read-only.
+    Pickled copies, such as persistent cache entries, are plain strings.
+    """
+
+    def __new__(cls, text: str, data: Any):
+        response = super().__new__(cls, text)
+        response.data = data
+        return response
+
+    def __reduce__(self):
+        return (str, (str(self),))
+
+def parse_response(response: str) -> Any:
+    """Returns the object behind a logic-function JSON response, parsing only when it is a plain string."""
+    if isinstance(response, ResponseJSON):
+        return response.data
+    return json.loads(response)
+
 def format_response(data: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> str:
     """
     Formats the API response as a JSON string.
     """
     if error:
-        return json.dumps({"error": error})
+        payload = {"error": error}
+        return ResponseJSON(dumps_json(payload).decode("utf-8"), payload)
     elif data is not None:
-        # Using default=str for any non-serializable types (like datetime objects not handled by _convert_value_for_json)
-        return json.dumps(data, default=str)
+        return ResponseJSON(dumps_json(data).decode("utf-8"), data)
     else:
         # Return an empty JSON object if no data and no error
-        return json.dumps({})
+        return "{}"
 
 def _convert_value_for_json(value: Any, col_name: str, context_for_log: str) -> Any:
     """
@@ -69,7 +116,7 @@ def _convert_value_for_json(value: Any, col_name: str, context_for_log: str) ->
     Handles NaN/NaT, numpy types, and datetime objects.
     """
     try:
-        if pd.isna(value):
+        if value is None or (np.ndim(value) == 0 and pd.isna(value)):
             return None
         elif isinstance(value, np.integer):
             return int(value)
@@ -82,6 +129,8 @@ def _convert_value_for_json(value: Any, col_name: str, context_for_log: str) ->
             return value.isoformat()
         elif isinstance(value, (int, float, bool, str)):
             return value
+        elif isinstance(value, np.ndarray):
+            return [_convert_value_for_json(v, col_name, context_for_log) for v in value.tolist()]
         else:
             # Fallback for other types, log and convert to string
             logger.debug(f"Utils: _convert_value_for_json ({context_for_log}) - Fallback to str for col '{col_name}', type '{type(value)}', value: '{str(value)[:MAX_LOG_VALUE_LENGTH]}'")
@@ -90,43 +139,68 @@ def _convert_value_for_json(value: Any, col_name: str, context_for_log: str) ->
         logger.error(f"Utils: _convert_value_for_json ({context_for_log}) - Error converting value for col '{col_name}', type '{type(value)}', value: '{str(value)[:MAX_LOG_VALUE_LENGTH]}'. Error: {val_e}", exc_info=True)
         return None # Return None on conversion error to prevent breaking JSON serialization
 
+def _flatten_column_names(columns: pd.Index) -> List[Any]:
+    """Joins MultiIndex levels with '_' and stringifies tuple column labels."""
+    if getattr(columns, "nlevels", 1) > 1:
+        return ['_'.join(str(level).strip() for level in col if str(level).strip()) for col in columns]
+    return [str(col) if isinstance(col, tuple) else col for col in columns]
+
+def _column_to_json_values(series: pd.Series, col_name: Any) -> List[Any]:
+    """
+    Converts one DataFrame column to a list of JSON-native values in a single pass,
+    choosing the conversion from the column dtype instead of inspecting every cell.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in "biu":
+            return series.to_numpy().tolist()
+        if dtype.kind == "f":
+            array = series.to_numpy()
+            values = array.tolist()
+            non_finite = ~np.isfinite(array)
+            if non_finite.any():
+                for index in np.flatnonzero(non_finite):
+                    values[index] = None
+            return values
+        if dtype.kind == "M":
+            if ((series.dt.microsecond == 0) & (series.dt.nanosecond == 0) | series.isna()).all():
+                # Same text as Timestamp.isoformat() when there are no fractional seconds
+                values = np.datetime_as_string(series.to_numpy().astype("datetime64[s]"), unit="s").tolist()
+                missing = series.isna().to_numpy(dtype=bool)
+                for index in np.flatnonzero(missing):
+                    values[index] = None
+                return values
+            return [None if pd.isna(ts) else ts.isoformat() for ts in series]
+
+    # Object, string, categorical, nullable and timezone-aware columns
+    values = series.astype(object).tolist()
+    missing = series.isna().to_numpy(dtype=bool)
+    if missing.any():
+        for index in np.flatnonzero(missing):
+            values[index] = None
+    if any(type(v) not in _NATIVE_JSON_TYPES for v in values):
+        values = [v if type(v) in _NATIVE_JSON_TYPES else _convert_value_for_json(v, col_name, "column") for v in values]
+    return values
+
 def _process_dataframe(df: Optional[pd.DataFrame], single_row: bool = True) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
     """
     Processes a pandas DataFrame into a dictionary or list of dictionaries,
     with robust handling of data types for JSON serialization.
+
+    Conversion is column-wise and dtype-driven: NaN/NaT/pd.NA become None, numpy scalars
+    become Python numbers and timestamps become ISO-8601 strings. MultiIndex columns are
+    flattened to "level1_level2".
     """
     if df is None or df.empty:
         return {} if single_row else []
 
-    # No need to use df.copy() if we iterate and build new dicts/lists
-    # df_copy = df.copy() # Work on a copy to avoid modifying the original DataFrame
-
-    # Step 1: Convert all pandas/numpy NaNs/NaTs to Python None
-    # This is now handled more granularly by _convert_value_for_json using pd.isna and np.isnan
-    # try:
-    #     df_copy = df_copy.where(pd.notnull(df_copy), None)
-    # except Exception as e:
-    #     logger.warning(f"Utils: _process_dataframe - Error during df.where(pd.notnull(df), None): {e}. Proceeding with original df_copy.")
-
     try:
         if single_row:
-            if len(df) > 0: # Use original df length
-                row_dict = {}
-                # Use df.iloc[0] directly from the original DataFrame
-                for col_name, value in df.iloc[0].items():
-                    row_dict[col_name] = _convert_value_for_json(value, col_name, "single_row")
-                return row_dict
-            else:
-                return {}
-        else: # For single_row == False
-            records = []
-            # Iterate directly over the original DataFrame
-            for _, row_series in df.iterrows():
-                record = {}
-                for col_name, value in row_series.items():
-                    record[col_name] = _convert_value_for_json(value, col_name, "multi_row")
-                records.append(record)
-            return records
+            df = df.iloc[:1]
+        names = _flatten_column_names(df.columns)
+        columns = [_column_to_json_values(df.iloc[:, position], name) for position, name in enumerate(names)]
+        records = [dict(zip(names, row)) for row in zip(*columns)]
+        return records[0] if single_row else records
     except Exception as e:
         logger.error(f"Error processing DataFrame (outer logic in _process_dataframe): {str(e)}", exc_info=True)
         return None
@@ -141,10 +215,14 @@ class PlayerNotFoundError(Exception):
         super().__init__(message)
 
 class TeamNotFoundError(Exception):
-    """Custom exception raised when a team cannot be found by the lookup utilities."""
-    def __init__(self, team_identifier: str):
+    """Custom exception raised when a team cannot be found (or not told apart) by the lookup utilities."""
+    def __init__(self, team_identifier: str, candidates: Optional[List[str]] = None):
         self.team_identifier = team_identifier
-        message = Errors.TEAM_NOT_FOUND.format(identifier=team_identifier) if hasattr(Errors, 'TEAM_NOT_FOUND') else f"Team '{team_identifier}' not found."
+        self.candidates = list(candidates or [])
+        if self.candidates:
+            message = Errors.TEAM_AMBIGUOUS.format(identifier=team_identifier, candidates=", ".join(self.candidates))
+        else:
+            message = Errors.TEAM_NOT_FOUND.format(identifier=team_identifier) if hasattr(Errors, 'TEAM_NOT_FOUND') else f"Team '{team_identifier}' not found."
         super().__init__(message)
 
 # --- Lookup Helpers ---
@@ -180,26 +258,15 @@ def find_player_id_or_error(player_name: str) -> Tuple[int, str]:
     try:
         logger.debug(f"Searching for player ID for: '{player_name}'")
 
-        # Attempt to treat as ID first if it's all digits
-        if player_name.isdigit():
-            player_id_int = int(player_name)
-            all_players_list = players.get_players() # Get all players
-            for p in all_players_list:
-                if p['id'] == player_id_int:
-                    logger.info(f"Found player by ID: {p['full_name']} (ID: {p['id']}) for input '{player_name}' (interpreted as ID)")
-                    return p['id'], p['full_name']
-            # If not found by ID, it might be a name that happens to be all digits, or an invalid ID.
-            # Proceed to name lookup, or let PlayerNotFoundError be raised if it's truly not found by name either.
-
-        player_list_results = players.find_players_by_full_name(player_name)
-        if player_list_results:
-            player_info_dict = player_list_results[0]
+        # Digits are tried as an ID first, then as a name; exact (normalized) names win over ranked, typo-tolerant matches
+        player_info_dict = get_identity_index().resolve_player(player_name)
+        if player_info_dict is not None:
             player_id_found = int(player_info_dict['id'])
             player_actual_name_found = player_info_dict['full_name']
-            logger.info(f"Found player by name: {player_actual_name_found} (ID: {player_id_found}) for input '{player_name}'")
+            logger.info(f"Found player: {player_actual_name_found} (ID: {player_id_found}) for input '{player_name}'")
             return player_id_found, player_actual_name_found
         else:
-            logger.warning(f"Player not found for identifier: '{player_name}' using nba_api.stats.static.players (tried as ID if applicable, then as name)")
+            logger.warning(f"Player not found for identifier: '{player_name}' (tried as ID if applicable, then as name)")
             raise PlayerNotFoundError(player_name)
 
     except PlayerNotFoundError:
@@ -221,34 +288,18 @@ def find_team_id_or_error(team_identifier: str) -> Tuple[int, str]:
     logger.debug(f"Searching for team ID using identifier: '{identifier_str_cleaned}'")
 
     try:
-        if identifier_str_cleaned.isdigit():
-            team_id_int_input = int(identifier_str_cleaned)
-            all_teams_list_static = teams.get_teams()
-            for team_dict_static in all_teams_list_static:
-                if team_dict_static['id'] == team_id_int_input:
-                    logger.info(f"Found team by ID: {team_dict_static['full_name']} (ID: {team_dict_static['id']})")
-                    return team_dict_static['id'], team_dict_static['full_name']
-
-        team_info_by_abbr_static = teams.find_team_by_abbreviation(identifier_str_cleaned.upper())
-        if team_info_by_abbr_static:
-            logger.info(f"Found team by abbreviation: {team_info_by_abbr_static['full_name']} (ID: {team_info_by_abbr_static['id']})")
-            return team_info_by_abbr_static['id'], team_info_by_abbr_static['full_name']
-
-        team_list_by_name_static = teams.find_teams_by_full_name(identifier_str_cleaned)
-        if team_list_by_name_static:
-            team_info_first_match = team_list_by_name_static[0]
-            logger.info(f"Found team by full name: {team_info_first_match['full_name']} (ID: {team_info_first_match['id']})")
-            return team_info_first_match['id'], team_info_first_match['full_name']
-
-        all_teams_for_nickname_search = teams.get_teams()
-        identifier_lower_case = identifier_str_cleaned.lower()
-        for team_item in all_teams_for_nickname_search:
-            if team_item['nickname'].lower() == identifier_lower_case:
-                logger.info(f"Found team by nickname: {team_item['full_name']} (ID: {team_item['id']})")
-                return team_item['id'], team_item['full_name']
-
-        logger.warning(f"Team not found for identifier: '{identifier_str_cleaned}'")
-        raise TeamNotFoundError(identifier_str_cleaned)
+        index = get_identity_index()
+        team_info = index.resolve_team(identifier_str_cleaned)
+        if team_info is not None:
+            logger.info(f"Found team: {team_info['full_name']} (ID: {team_info['id']}) for input '{identifier_str_cleaned}'")
+            return team_info['id'], team_info['full_name']
+
+        candidates = [team['full_name'] for team in index.ambiguous_teams(identifier_str_cleaned)]
+        if candidates:
+            logger.warning(f"Ambiguous team identifier '{identifier_str_cleaned}': {candidates}")
+        else:
+            logger.warning(f"Team not found for identifier: '{identifier_str_cleaned}'")
+        raise TeamNotFoundError(identifier_str_cleaned, candidates)
 
     except TeamNotFoundError:
         raise
@@ -0,0 +1,184 @@
+"""
+Bulk ingestion of completed games into the season warehouse (utils/season_warehouse.py).
+
+A season's game IDs come from the league game log. Each game's full-game
+responses (box score families, play-by-play, win probability, rotations, hustle)
+are fetched at background priority through the shared rate limiter and stored
+as soon as they arrive. Progress lives in the warehouse catalog, so a run that
+is interrupted or hits upstream errors picks up where it stopped when re-run:
+
+    python -m api_tools.warehouse_ingestion 2023-24 --season-type Playoffs
+"""
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+import pandas as pd
+from nba_api.stats.endpoints import gamerotation, hustlestatsboxscore, playbyplayv3, winprobabilitypbp
+from nba_api.stats.library.parameters import SeasonTypeAllStar
+
+from config import settings
+from api_tools.game_boxscores import BOXSCORE_FAMILIES
+from api_tools.league_game_log import fetch_league_game_log_logic
+from api_tools.utils import parse_response, retry_on_timeout
+from utils.rate_limiter import Priority, request_priority
+from utils.season_warehouse import SeasonWarehouse, endpoint_tables, get_season_warehouse
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+# Endpoint class name -> class, each called with only game_id (full-game defaults)
+WAREHOUSE_SOURCES: Dict[str, Type[Any]] = {
+    **{endpoint_class.__name__: endpoint_class for endpoint_class, _ in BOXSCORE_FAMILIES.values()},
+    "PlayByPlayV3": playbyplayv3.PlayByPlayV3,
+    "WinProbabilityPBP": winprobabilitypbp.WinProbabilityPBP,
+    "GameRotation": gamerotation.GameRotation,
+    "HustleStatsBoxScore": hustlestatsboxscore.HustleStatsBoxScore,
+}
+DEFAULT_SEASON_TYPES = (SeasonTypeAllStar.regular, SeasonTypeAllStar.playoffs)
+PROGRESS_LOG_INTERVAL = 100  # Fetches between progress log lines
+
+
+def resolve_sources(sources: Optional[Iterable[str]] = None) -> List[str]:
+    """Validates source names (default: settings.WAREHOUSE_SOURCES, else every supported source)."""
+    names = list(sources or settings.WAREHOUSE_SOURCES or WAREHOUSE_SOURCES)
+    unknown = [name for name in names if name not in WAREHOUSE_SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown warehouse source(s): {', '.join(unknown)}. Valid options: {', '.join(WAREHOUSE_SOURCES)}")
+    return names
+
+
+def enumerate_season_games(season: str, season_type: str = SeasonTypeAllStar.regular) -> List[Dict[str, Any]]:
+    """
+    Completed games of a season from the team league game log, oldest first.
+    Returns [{"game_id", "game_date", "matchup"}], with the home team's matchup ("LAL vs. BOS").
+    """
+    response, dataframes = fetch_league_game_log_logic(season=season, season_type=season_type, return_dataframe=True)
+    data = parse_response(response)
+    if "error" in data:
+        raise RuntimeError(data["error"])
+    log_df = dataframes.get("LeagueGameLog", pd.DataFrame())
+    if log_df.empty:
+        return []
+    if "WL" in log_df.columns:
+        log_df = log_df[log_df["WL"].notna()]  # Only games with a result
+    log_df = log_df.assign(_away=log_df["MATCHUP"].str.contains("@", regex=False))
+    log_df = log_df.sort_values(["GAME_DATE", "GAME_ID", "_away"]).drop_duplicates(subset=["GAME_ID"])
+    return [
+        {"game_id": str(row.GAME_ID), "game_date": str(row.GAME_DATE), "matchup": row.MATCHUP}
+        for row in log_df.itertuples(index=False)
+    ]
+
+
+def fetch_source(game_id: str, source: str) -> Dict[str, pd.DataFrame]:
+    """Fetches one game's full-game response from an endpoint at background priority."""
+    endpoint_class = WAREHOUSE_SOURCES[source]
+    with request_priority(Priority.BACKGROUND):
+        endpoint = retry_on_timeout(lambda: endpoint_class(game_id=game_id, timeout=settings.DEFAULT_TIMEOUT_SECONDS))
+    return endpoint_tables(endpoint)
+
+
+def _ingest_one(warehouse: SeasonWarehouse, game_id: str, source: str, season: str) -> Optional[str]:
+    """Fetches and stores one (game, source); returns the error, if any, after recording it."""
+    try:
+        tables = fetch_source(game_id, source)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        warehouse.record_failure(game_id, source, error, season)
+        return error
+    if not warehouse.write(game_id, source, tables, season):
+        return "write failed"
+    return None
+
+
+def ingest_season(
+    season: str,
+    season_types: Sequence[str] = DEFAULT_SEASON_TYPES,
+    sources: Optional[Iterable[str]] = None,
+    max_games: Optional[int] = None,
+    workers: Optional[int] = None,
+    warehouse: Optional[SeasonWarehouse] = None,
+) -> Dict[str, Any]:
+    """
+    Ingests every completed game of a season that is not in the warehouse yet.
+
+    Args:
+        season: Season in YYYY-YY format
+        season_types: Season types to enumerate (regular season and playoffs by default)
+        sources: Endpoint class names to fetch per game (see WAREHOUSE_SOURCES)
+        max_games: Stop after this many games with pending fetches (for incremental backfills)
+        workers: Concurrent fetches (settings.WAREHOUSE_INGEST_WORKERS); the rate limiter still
+            bounds the request rate to stats.nba.com
+        warehouse: Target warehouse; defaults to the process-wide one
+
+    Returns:
+        Summary with the games catalogued, the fetches stored and failed by this run, and the fetches
+        already done (stored, or failed settings.WAREHOUSE_MAX_ATTEMPTS times) by earlier runs.
+    """
+    warehouse = warehouse or get_season_warehouse()
+    source_names = resolve_sources(sources)
+    started = time.monotonic()
+
+    games = 0
+    for season_type in season_types:
+        games += warehouse.record_games(season, season_type, enumerate_season_games(season, season_type))
+    pending = warehouse.pending(season, source_names)
+    already_done = games * len(source_names) - len(pending)
+    if max_games is not None:
+        allowed = set(list(dict.fromkeys(game_id for game_id, _ in pending))[:max_games])
+        pending = [(game_id, source) for game_id, source in pending if game_id in allowed]
+    logger.info(f"Warehouse ingestion for {season}: {games} games, {len(pending)} fetches pending")
+
+    stored = failed = 0
+    errors: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=workers or settings.WAREHOUSE_INGEST_WORKERS,
+                            thread_name_prefix="warehouse-ingest") as executor:
+        futures = {
+            executor.submit(_ingest_one, warehouse, game_id, source, season): (game_id, source)
+            for game_id, source in pending
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            error = future.result()
+            if error is None:
+                stored += 1
+            else:
+                failed += 1
+                game_id, source = futures[future]
+                errors[f"{game_id}/{source}"] = error
+                logger.warning(f"Warehouse fetch failed for {source} {game_id}: {error}")
+            if done % PROGRESS_LOG_INTERVAL == 0:
+                logger.info(f"Warehouse ingestion for {season}: {done}/{len(pending)} fetches done ({failed} failed)")
+
+    return {
+        "season": season,
+        "games": games,
+        "sources": source_names,
+        "stored": stored,
+        "failed": failed,
+        "already_done": already_done,
+        "errors": dict(list(errors.items())[:20]),
+        "elapsed_seconds": round(time.monotonic() - started, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest a season's completed games into the local season warehouse.")
+    parser.add_argument("season", help="Season in YYYY-YY format, e.g. 2023-24")
+    parser.add_argument("--season-type", action="append", dest="season_types",
+                        help="Season type to include (repeatable). Default: Regular Season and Playoffs")
+    parser.add_argument("--sources", help=f"Comma-separated endpoints. Default: all of {', '.join(WAREHOUSE_SOURCES)}")
+    parser.add_argument("--max-games", type=int, help="Ingest at most this many games in this run")
+    parser.add_argument("--workers", type=int, help="Concurrent fetches")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    summary = ingest_season(
+        args.season,
+        season_types=args.season_types or DEFAULT_SEASON_TYPES,
+        sources=args.sources.split(",") if args.sources else None,
+        max_games=args.max_games,
+        workers=args.workers,
+    )
+    print(summary)
@@ -1,12 +1,12 @@
 """
 Handles fetching win probability play-by-play data for NBA games.
-Provides both JSON and DataFrame outputs with CSV caching.
+Provides both JSON and DataFrame outputs with Parquet caching.
 """
 import os
 import logging
 import json
 from typing import Optional, List, Dict, Any, Set, Union, Tuple
-from functools import lru_cache
+from utils.cache import cached_logic
 import pandas as pd
 
 from nba_api.stats.endpoints import winprobabilitypbp
@@ -18,6 +18,8 @@ from api_tools.utils import (
     format_response
 )
 from utils.path_utils import get_cache_dir, get_cache_file_path, get_relative_cache_path
+from utils.dataset_store import save_dataset
+from utils.season_warehouse import stored_endpoint
 
 logger = logging.getLogger(__name__)
 
@@ -34,40 +36,27 @@ _VALID_RUN_TYPES: Set[str] = {
     if not attr.startswith('_') and isinstance(getattr(RunType, attr), str)
 }
 
-# --- Helper Functions for CSV Caching ---
-def _save_dataframe_to_csv(df: pd.DataFrame, file_path: str) -> None:
-    """
-    Saves a DataFrame to a CSV file.
-
-    Args:
-        df: DataFrame to save
-        file_path: Path to save the CSV file
-    """
-    try:
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved DataFrame to CSV: {file_path}")
-    except Exception as e:
-        logger.error(f"Error saving DataFrame to CSV: {e}", exc_info=True)
+# --- Helper Functions for Parquet Caching ---
 
 def _get_csv_path_for_win_probability_pbp(
     game_id: str,
     run_type: str
 ) -> str:
     """
-    Generates a file path for saving win probability PBP DataFrame as CSV.
+    Generates a file path for saving win probability PBP DataFrame as Parquet.
 
     Args:
         game_id: The game ID
         run_type: The run type (e.g., 'default', 'each second', 'each poss')
 
     Returns:
-        Path to the CSV file
+        Path to the Parquet file
     """
     # Clean run type for filename
     clean_run_type = run_type.replace(" ", "_").lower()
 
     return get_cache_file_path(
-        f"game_{game_id}_win_prob_pbp_{clean_run_type}.csv",
+        f"game_{game_id}_win_prob_pbp_{clean_run_type}.parquet",
         "win_probability_pbp"
     )
 
@@ -84,7 +73,7 @@ def _validate_win_probability_pbp_params(
     return None
 
 # --- Logic Functions ---
-@lru_cache(maxsize=WIN_PROBABILITY_PBP_CACHE_SIZE)
+@cached_logic(maxsize=WIN_PROBABILITY_PBP_CACHE_SIZE)
 def fetch_win_probability_pbp_logic(
     game_id: str,
     run_type: str = RunType.default,
@@ -117,11 +106,15 @@ def fetch_win_probability_pbp_logic(
                 return error_response, {}
             return error_response
 
-        # Make API call
-        win_prob = winprobabilitypbp.WinProbabilityPBP(
-            game_id=game_id,
-            run_type=run_type
-        )
+        # Make API call (the season warehouse holds the default run type)
+        win_prob = None
+        if run_type == RunType.default:
+            win_prob = stored_endpoint(winprobabilitypbp.WinProbabilityPBP, game_id)
+        if win_prob is None:
+            win_prob = winprobabilitypbp.WinProbabilityPBP(
+                game_id=game_id,
+                run_type=run_type
+            )
 
         # Process data sets
         dataframes = {}
@@ -144,13 +137,13 @@ def fetch_win_probability_pbp_logic(
         if not game_info_df.empty:
             dataframes['game_info'] = game_info_df
 
-        # Save to CSV if DataFrames are not empty
+        # Save to Parquet if DataFrames are not empty
         if return_dataframe and dataframes:
             csv_path = _get_csv_path_for_win_probability_pbp(game_id, run_type)
             
             # Save the main win probability DataFrame
             if 'win_prob_pbp' in dataframes:
-                _save_dataframe_to_csv(dataframes['win_prob_pbp'], csv_path)
+                save_dataset(dataframes['win_prob_pbp'], csv_path)
 
         # Prepare response data
         response_data = {
@@ -0,0 +1,166 @@
+"""
+Cold-start benchmark for backend workers.
+
+Imports a module (by default `main`, what each uvicorn worker loads) in fresh
+interpreters under `python -X importtime` and reports median import time, RSS
+after import and peak RSS, plus the slowest imports. Run from backend/:
+
+    python benchmarks/startup_benchmark.py                      # main, graph, tool_manager
+    python benchmarks/startup_benchmark.py main --eager          # compare with lazy tools disabled
+    python benchmarks/startup_benchmark.py --history cache/startup_history.jsonl --max-seconds 3 --max-rss-mb 400
+
+With --history, each run appends one JSON line (time, git revision, results) so
+regressions show up over time; --max-seconds/--max-rss-mb turn the medians into
+a budget and exit with status 1 when it is exceeded.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGETS = ("main", "langgraph_agent.graph", "langgraph_agent.tool_manager")
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+_EXCEPTION_RE = re.compile(r"^[\w.]+(Error|Exception)\b")
+
+# Runs in the child: imports the target, then reports wall time and memory as the last stdout line.
+_CHILD_CODE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {target}
+seconds = time.perf_counter() - started
+with open("/proc/self/statm") as f:
+    rss_pages = int(f.read().split()[1])
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_mb": rss_pages * resource.getpagesize() / 2**20,
+    "peak_rss_mb": peak_kb / 2**20 if sys.platform == "darwin" else peak_kb / 1024,  # bytes on macOS, KiB elsewhere
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self µs, cumulative µs, nesting depth) for each line of `-X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2))
+    return rows
+
+
+def run_once(target: str, env: Dict[str, str]) -> Dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD_CODE.format(target=target)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if _EXCEPTION_RE.match(line)]
+        return {"error": errors[-1] if errors else f"exit status {proc.returncode}"}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["imports"] = parse_importtime(proc.stderr)
+    return result
+
+
+def benchmark(target: str, runs: int, top: int, eager: bool) -> Dict[str, Any]:
+    env = dict(os.environ)
+    if eager:
+        env["AGENT_LAZY_TOOLS_ENABLED"] = "false"
+    samples = [run_once(target, env) for _ in range(runs)]
+    failed = [sample["error"] for sample in samples if "error" in sample]
+    if failed:
+        return {"target": target, "error": failed[0]}
+    slowest: Dict[str, int] = {}
+    packages: Dict[str, int] = {}
+    for sample in samples:
+        for module, self_us, _cumulative_us, _depth in sample["imports"]:
+            slowest[module] = slowest.get(module, 0) + self_us
+            package = module.split(".")[0]
+            packages[package] = packages.get(package, 0) + self_us
+    return {
+        "target": target,
+        "lazy_tools": not eager,
+        "runs": runs,
+        "seconds": round(statistics.median(s["seconds"] for s in samples), 3),
+        "rss_mb": round(statistics.median(s["rss_mb"] for s in samples), 1),
+        "peak_rss_mb": round(statistics.median(s["peak_rss_mb"] for s in samples), 1),
+        "modules": int(statistics.median(s["modules"] for s in samples)),
+        "slowest_imports_ms": {
+            module: round(total / runs / 1000, 1)
+            for module, total in sorted(slowest.items(), key=lambda item: -item[1])[:top]
+        },
+        "packages_ms": {
+            package: round(total / runs / 1000, 1)
+            for package, total in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        },
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_result(result: Dict[str, Any]) -> None:
+    if "error" in result:
+        print(f"{result['target']}: import failed: {result['error']}")
+        return
+    print(
+        f"{result['target']} ({'lazy' if result['lazy_tools'] else 'eager'} tools, median of {result['runs']}): "
+        f"{result['seconds']:.3f}s, RSS {result['rss_mb']:.1f} MB (peak {result['peak_rss_mb']:.1f} MB), "
+        f"{result['modules']} modules"
+    )
+    print("  slowest imports (self ms): " + ", ".join(f"{m} {ms}" for m, ms in result["slowest_imports_ms"].items()))
+    print("  by package (self ms): " + ", ".join(f"{p} {ms}" for p, ms in result["packages_ms"].items()))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", default=list(DEFAULT_TARGETS), help="Modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (median is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports/packages to list")
+    parser.add_argument("--eager", action="store_true", help="Disable lazy tool loading in the children")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--history", help="Append results to this JSON-lines file")
+    parser.add_argument("--max-seconds", type=float, help="Fail if a target's median import time exceeds this")
+    parser.add_argument("--max-rss-mb", type=float, help="Fail if a target's median RSS after import exceeds this")
+    args = parser.parse_args(argv)
+
+    results = [benchmark(target, args.runs, args.top, args.eager) for target in args.targets]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            _print_result(result)
+
+    if args.history:
+        record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": _git_revision(), "results": results}
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    status = 2 if any("error" in result for result in results) else 0
+    for result in results:
+        if "error" in result:
+            continue
+        if args.max_seconds is not None and result["seconds"] > args.max_seconds:
+            print(f"BUDGET EXCEEDED: {result['target']} imports in {result['seconds']}s > {args.max_seconds}s")
+            status = status or 1
+        if args.max_rss_mb is not None and result["rss_mb"] > args.max_rss_mb:
+            print(f"BUDGET EXCEEDED: {result['target']} uses {result['rss_mb']} MB > {args.max_rss_mb} MB")
+            status = status or 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -56,6 +56,170 @@ class Settings(BaseSettings):
     CHROMA_DB_NBA_AGENT: str = "./chroma_db_nba_agent_kb"  # Default path for the KB ChromaDB
     KB_COLLECTION_NAME: str = "nba_analyzer_global_kb" # Default collection name for the main KB
 
+    # --- Response Cache (utils/cache.py) ---
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MIN_PERSIST_TTL_SECONDS: int = 60 # Shorter-lived entries stay in memory only
+    RESPONSE_CACHE_MEMORY_MAX_BYTES: int = 64 * 1024 * 1024 # Per decorated function
+    RESPONSE_CACHE_PERSISTENT_ENABLED: bool = True
+    RESPONSE_CACHE_DB_FILE: str = "response_cache.sqlite3" # Relative to backend/cache
+    RESPONSE_CACHE_DISK_MAX_BYTES: int = 1024 * 1024 * 1024 # 1 GiB
+
+    # --- Freshness Policy TTLs (utils/cache_policy.py) ---
+    CACHE_TTL_LIVE_SECONDS: int = 10 # In-progress games, live scoreboards
+    CACHE_TTL_INTRADAY_SECONDS: int = 300 # Odds, today's and upcoming schedules
+    CACHE_TTL_CURRENT_SEASON_SECONDS: int = 900 # Current-season dashboards
+    CACHE_TTL_REFERENCE_SECONDS: int = 86400 # Season-independent lookups
+    CACHE_TTL_HISTORICAL_SECONDS: int = 365 * 86400 # Completed seasons and final games
+
+    # --- Upstream Request Coalescing (utils/single_flight.py) ---
+    NBA_API_REQUEST_COALESCING_ENABLED: bool = True
+    SINGLE_FLIGHT_WAIT_TIMEOUT_SECONDS: int = 60 # Waiters fetch independently if the leader stalls
+
+    # --- Upstream Rate Limiting (utils/rate_limiter.py) ---
+    NBA_API_RATE_LIMIT_ENABLED: bool = True
+    NBA_API_RATE_LIMIT_DEFAULT_RPS: float = 4.0 # Sustained requests/second for hosts without an explicit budget
+    NBA_API_RATE_LIMIT_DEFAULT_BURST: int = 8
+    NBA_API_MAX_IN_FLIGHT: int = 4
+    # Comma-separated "host:rate:burst:max_in_flight" entries
+    NBA_API_HOST_BUDGETS_STR: str = "stats.nba.com:4:8:4,cdn.nba.com:10:20:8"
+    NBA_API_RATE_LIMIT_MAX_WAIT_SECONDS: int = 30
+    NBA_API_RATE_LIMIT_SHARED: bool = False # Share token buckets across worker processes via SQLite
+    NBA_API_RATE_LIMIT_DB_FILE: str = "rate_limit.sqlite3" # Relative to backend/cache
+
+    # --- Async Upstream Fetching (api_tools/async_http.py) ---
+    NBA_API_ASYNC_ENABLED: bool = True # Agent tools await upstream calls instead of blocking a thread
+    NBA_API_ASYNC_MAX_CONNECTIONS: int = 32
+    NBA_API_ASYNC_MAX_KEEPALIVE: int = 16
+    NBA_API_ASYNC_KEEPALIVE_SECONDS: float = 30.0
+    NBA_API_ASYNC_MAX_FETCH_PASSES: int = 16 # Upstream requests one async logic call may make
+
+    # --- Composite Fetches (api_tools/composite.py) ---
+    COMPOSITE_FETCH_MAX_WORKERS: int = 16 # Shared pool running the sub-fetches of composite tools
+    COMPOSITE_FETCH_DEADLINE_SECONDS: float = 45.0 # Sub-fetches still running after this are reported as failed
+
+    # --- Live Game Ingestion (api_tools/live_ingestion.py) ---
+    LIVE_INGESTION_ENABLED: bool = True # Poll live games in the background from API startup and serve routes/live.py
+    LIVE_POLL_LIVE_SECONDS: float = 5.0 # Boxscore + play-by-play of each game in progress
+    LIVE_POLL_HALFTIME_SECONDS: float = 30.0
+    LIVE_POLL_SCOREBOARD_LIVE_SECONDS: float = 10.0 # While any game is in progress
+    LIVE_POLL_SCOREBOARD_PREGAME_SECONDS: float = 60.0 # While a game is due to start within the pregame window
+    LIVE_POLL_SCOREBOARD_IDLE_SECONDS: float = 300.0
+    LIVE_PREGAME_WINDOW_SECONDS: int = 1800
+    LIVE_SNAPSHOT_MAX_AGE_SECONDS: float = 15.0 # Live tools use the poller's payloads up to this old before going upstream
+    LIVE_PBP_MAX_GAMES: int = 64 # Games kept in the incremental play-by-play store (api_tools/live_playbyplay_store.py)
+    LIVE_MAX_SUBSCRIBERS: int = 2000 # Open /live/stream connections per API process
+    LIVE_SUBSCRIBER_MAX_PENDING: int = 256 # Events held for a slow stream reader; older ones are dropped
+    LIVE_STREAM_KEEPALIVE_SECONDS: float = 15.0
+
+    # --- Season Warehouse (utils/season_warehouse.py, api_tools/warehouse_ingestion.py) ---
+    WAREHOUSE_ENABLED: bool = True # Logic functions read ingested full-game data before calling stats.nba.com
+    WAREHOUSE_DIR: str = "warehouse" # Relative to backend/cache
+    # Comma-separated endpoint classes ingested per game; empty ingests every supported source
+    WAREHOUSE_SOURCES_STR: str = ""
+    WAREHOUSE_INGEST_WORKERS: int = 2 # Concurrent game fetches; every request still goes through the rate limiter
+    WAREHOUSE_MAX_ATTEMPTS: int = 3 # Failed (game, source) fetches are retried by later runs up to this many times
+
+    @property
+    def WAREHOUSE_SOURCES(self) -> List[str]:
+        """Parses WAREHOUSE_SOURCES_STR into a list of endpoint class names."""
+        return [source.strip() for source in self.WAREHOUSE_SOURCES_STR.split(",") if source.strip()]
+
+    # --- Lineup Stints (api_tools/lineup_stints.py) ---
+    LINEUP_STINTS_MEMORY_GAMES: int = 512 # Final games' action tables kept in memory; they are also stored as datasets
+    LINEUP_STINTS_DEADLINE_SECONDS: float = 120 # Wait for a query's per-game builds (two upstream calls per game when cold)
+    LINEUP_STINTS_TOP_LINEUPS: int = 25 # Lineups returned per query, by minutes on court
+
+    # --- Agent Tool Registry (langgraph_agent/tool_registry.py) ---
+    AGENT_LAZY_TOOLS_ENABLED: bool = True # Bind tools from the manifest; import each toolkit on its first tool call
+    AGENT_TOOL_MANIFEST_FILE: str = "tool_manifest.json" # Relative to backend/cache; rebuilt for changed toolkits
+
+    # --- Agent Tool Routing (langgraph_agent/tool_router.py) ---
+    TOOL_ROUTING_ENABLED: bool = True # Bind a per-turn subset of tools instead of every tool on each LLM call
+    TOOL_ROUTING_MAX_TOOLS: int = 16 # Routed tools bound for the data retrieval agent (plus its always-bound tools)
+    TOOL_ROUTING_RETRIEVAL_TOP_K: int = 4 # Best keyword matches added from any category, in case the classifier missed
+    TOOL_ROUTING_BOUND_CACHE_SIZE: int = 64 # Tool subsets whose bound LLM (converted schemas) is kept
+
+    # --- Agent Tool Execution (langgraph_agent/tool_executor.py) ---
+    TOOL_EXECUTION_MAX_CONCURRENCY: int = 8 # Tool calls from one LLM turn that run at once
+    TOOL_EXECUTION_MAX_WORKERS: int = 16 # Shared thread pool for tools without an async runner
+    TOOL_EXECUTION_TIMEOUT_SECONDS: float = 45.0 # Per tool call, unless overridden below
+    # Comma-separated "tool_name:seconds" overrides
+    TOOL_EXECUTION_TIMEOUTS_STR: str = "python_code_execution:120,create_data_visualization:90,exa_web_search:20,exa_nba_search:20,exa_extract_content:30"
+    TOOL_EXECUTION_STREAM_PREVIEW_CHARS: int = 600 # Characters of each result streamed as it completes
+    SSE_DISCONNECT_POLL_SECONDS: float = 1.0 # routes/sse.py: how often a waiting stream checks for a disconnected client
+
+    # --- Code Sandbox (langgraph_agent/code_sandbox.py) ---
+    CODE_SANDBOX_ENABLED: bool = True # Run the data science tools in worker processes (POSIX only); False runs them in the API process
+    CODE_SANDBOX_WORKERS: int = 2 # Pre-warmed worker processes per API process; each conversation is pinned to one
+    CODE_SANDBOX_PREWARM: bool = True # Start the workers at API startup instead of on first use
+    CODE_SANDBOX_TIMEOUT_SECONDS: float = 60.0 # Wall time per call; past it the worker is killed and its sessions are lost
+    CODE_SANDBOX_CPU_SECONDS: int = 30 # CPU time per call (RLIMIT_CPU); past it the code is aborted with an error
+    CODE_SANDBOX_MEMORY_MB: int = 2048 # Address space per worker (RLIMIT_AS); 0 disables the limit
+    CODE_SANDBOX_MAX_SESSIONS: int = 64 # Sessions kept per worker; the least recently used are dropped
+    CODE_SANDBOX_SESSION_TTL_SECONDS: int = 3600 # Sessions idle this long are dropped
+
+    # --- Chart Rendering (langgraph_agent/services/chart_service.py) ---
+    CHART_CACHE_DIR: str = "visualizations" # Subdirectory of backend/cache holding content-addressed chart artifacts
+    CHART_CACHE_MAX_BYTES: int = 256 * 1024 * 1024 # Least recently used artifacts are evicted past this
+    CHART_RENDER_WORKERS: int = 2 # Background threads rendering charts not in the cache
+    CHART_RENDER_TIMEOUT_SECONDS: float = 30.0
+    CHART_DPI: int = 150 # Raster resolution of PNG charts
+    CHART_SPEC_MAX_ROWS: int = 5000 # Rows inlined into Vega-Lite chart specs
+    CHART_URL_PREFIX: str = "/api/v1/charts" # Where routes/charts.py serves artifacts
+
+    # --- SSE Streaming (langgraph_agent/services/stream_service.py) ---
+    SSE_DEFAULT_PROTOCOL: str = "v1" # v1: full message contents; v2: token deltas and truncated tool results
+    SSE_TOKEN_STREAMING_ENABLED: bool = True # v2: stream agent LLM text as it is generated
+    SSE_TOKEN_NODES_STR: str = "data_retrieval_agent,analytics_agent,presentation_agent" # Nodes whose LLM tokens are streamed
+    SSE_TOOL_RESULT_PREVIEW_CHARS: int = 1000 # v2: tool result characters sent (the rest is referenced by length/handle)
+    SSE_FLUSH_WINDOW_MS: float = 25.0 # Events arriving this soon after the first of a batch are written with it
+    SSE_FLUSH_MAX_BYTES: int = 16384 # A batch is written early once it reaches this size
+    SSE_COMPRESSION_ENCODINGS_STR: str = "br,gzip" # Preference order, negotiated per connection; empty disables
+    SSE_GZIP_LEVEL: int = 6
+    SSE_BROTLI_QUALITY: int = 5 # Needs the optional `brotli` package
+
+    @property
+    def SSE_TOKEN_NODES(self) -> List[str]:
+        """Parses SSE_TOKEN_NODES_STR into a list of graph node names."""
+        return [node.strip() for node in self.SSE_TOKEN_NODES_STR.split(",") if node.strip()]
+
+    @property
+    def SSE_COMPRESSION_ENCODINGS(self) -> List[str]:
+        """Parses SSE_COMPRESSION_ENCODINGS_STR into a list of content codings."""
+        return [enc.strip().lower() for enc in self.SSE_COMPRESSION_ENCODINGS_STR.split(",") if enc.strip()]
+
+    # --- Tool Output Condensation (langgraph_agent/services/tool_output_service.py) ---
+    TOOL_OUTPUT_CONDENSE_ENABLED: bool = True # Replace large tool tables with a stored handle + summary for the LLM
+    TOOL_OUTPUT_CONDENSE_MIN_CHARS: int = 6000 # Smaller tool results reach the LLM unchanged
+    TOOL_OUTPUT_CONDENSE_MIN_ROWS: int = 15 # Tables with more rows than this are condensed
+    TOOL_OUTPUT_PREVIEW_ROWS: int = 10 # Leading rows shown to the LLM per condensed table
+    TOOL_OUTPUT_MAX_STAT_COLUMNS: int = 40 # Columns summarized (mean/min/median/max or distinct count)
+    TOOL_RESULT_HANDLE_TTL_SECONDS: int = 86400 # How long full tables stay loadable by handle
+    TOOL_RESULT_MEMORY_MAX_BYTES: int = 128 * 1024 * 1024 # In-memory tier for stored tables (disk copy in the response cache)
+
+    # --- Agent Context Window (langgraph_agent/services/context_service.py) ---
+    AGENT_CONTEXT_MANAGEMENT_ENABLED: bool = True # Fit each hop's prompt into a token budget (stored history is untouched)
+    AGENT_CONTEXT_MAX_TOKENS: int = 32000 # Estimated prompt tokens per agent hop
+    AGENT_CONTEXT_SUMMARY_MAX_TOKENS: int = 1500 # Budget for the summary of evicted turns and pinned facts
+    AGENT_CONTEXT_STALE_TOOL_RESULT_TOKENS: int = 1500 # Tool results from earlier turns are clipped to this
+    AGENT_CONTEXT_SUMMARY_CACHE_SIZE: int = 1024 # Evicted-prefix summaries kept for reuse by later hops/turns
+
+    # --- Agent Conversation Checkpoints (langgraph_agent/checkpointer.py) ---
+    AGENT_CHECKPOINT_PERSISTENT_ENABLED: bool = True # Persist threads to SQLite (shared by workers, survives restarts)
+    AGENT_CHECKPOINT_DB_FILE: str = "agent_checkpoints.sqlite3" # Relative to backend/cache
+    AGENT_CHECKPOINT_THREAD_TTL_SECONDS: int = 7 * 86400 # Threads idle longer than this are deleted
+    AGENT_CHECKPOINT_MAX_THREADS: int = 10000 # Least recently used threads beyond this are deleted
+    AGENT_CHECKPOINT_HOT_CACHE_BYTES: int = 32 * 1024 * 1024 # In-memory LRU of recently read messages/blobs
+    AGENT_CHECKPOINT_DEDUP_MIN_BYTES: int = 4096 # Larger non-message values are stored once as shared blobs
+    AGENT_ACTIVE_THREADS_MAX: int = 1024 # Thread contexts tracked by the memory manager (LRU)
+
+    # --- Semantic Answer Cache (langgraph_agent/services/answer_cache_service.py) ---
+    ANSWER_CACHE_ENABLED: bool = True # Replay stored answers to repeated first-turn questions
+    ANSWER_CACHE_DB_FILE: str = "answer_cache.sqlite3" # Relative to backend/cache
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.6 # Cosine similarity between questions with the same names/seasons/stats
+    ANSWER_CACHE_MIN_TTL_SECONDS: int = 60 # Answers whose data expires sooner (live/odds) are not stored
+    ANSWER_CACHE_MAX_ENTRIES: int = 5000 # Least recently hit answers beyond this are deleted
+
     # --- Application Behavior ---
     LOG_LEVEL: str = "INFO"  # Valid levels: DEBUG, INFO, WARNING, ERROR, CRITICAL
     ENVIRONMENT: str = "development"  # e.g., development, staging, production
@@ -77,6 +77,7 @@ class Errors:
     # Team Errors
     TEAM_IDENTIFIER_EMPTY: str = "Team identifier (name, abbreviation, or ID) cannot be empty."
     TEAM_NOT_FOUND: str = "Team '{identifier}' not found."
+    TEAM_AMBIGUOUS: str = "Team '{identifier}' is ambiguous; it could be any of: {candidates}."
     TEAM_API: str = "API error fetching {data_type} for team {identifier} (Season: {season}): {error}"
     TEAM_PROCESSING: str = "Failed to process {data_type} for team {identifier} (Season: {season})."
     TEAM_UNEXPECTED: str = "Unexpected error fetching team data for {identifier} (Season: {season}): {error}"
@@ -108,6 +109,8 @@ class Errors:
     BOXSCORE_DEFENSIVE_API: str = "Error fetching BoxScoreDefensiveV2 for game {game_id}: {error}"
     BOXSCORE_SUMMARY_API: str = "Error fetching BoxScoreSummaryV2 for game {game_id}: {error}"
     BOXSCORE_MATCHUPS_API: str = "Error fetching BoxScoreMatchupsV3 for game {game_id}: {error}"
+    BOXSCORE_BUNDLE_ALL_FAILED: str = "Failed to fetch any boxscore family for game {game_id}. Errors: {errors_list}"
+    INVALID_BOXSCORE_FAMILY: str = "Invalid boxscore family: '{value}'. Valid options: {options}"
     WINPROBABILITY_API: str = "API error fetching win probability for game {game_id}: {error}"
     PLAYBYPLAY_API: str = "API error fetching play-by-play for game {game_id}: {error}"
     SHOTCHART_API: str = "API error fetching shot chart for game {game_id}: {error}"
@@ -208,6 +211,9 @@ class Errors:
     PLAYER_DASHBOARD_LASTN_API: str = "API error fetching player dashboard last N games for {player_name}: {error}"
     TEAM_DASHBOARD_SHOOTING_API: str = "API error fetching team dashboard shooting splits for {team_identifier}: {error}"
     TEAM_DASH_LINEUPS_API: str = "API error fetching team lineups for {team_identifier}: {error}"
+    LINEUP_STINTS_NO_GAMES: str = "No completed games found for {team_name} ({season}, {season_type}) to build lineup stints from."
+    LINEUP_STINTS_ALL_FAILED: str = "Failed to build lineup stints for any game of {team_name}. Errors: {errors_list}"
+    INVALID_STINT_PERIODS: str = "Invalid periods: '{value}'. Expected period numbers (1-4, 5+ for overtime)."
     LEAGUE_DASH_PLAYER_BIO_API: str = "API error fetching player bio stats (Season: {season}, Type: {season_type}): {error}"
     LEAGUE_DASH_PLAYER_CLUTCH_API: str = "API error fetching player clutch stats (Season: {season}, Type: {season_type}, Clutch Time: {clutch_time}): {error}"
     LEAGUE_DASH_TEAM_CLUTCH_API: str = "API error fetching team clutch stats (Season: {season}, Type: {season_type}, Clutch Time: {clutch_time}): {error}"
@@ -3,11 +3,13 @@ Analytics Agent for the LangGraph NBA data scientist.
 Responsible for performing data analysis, transformations, and identifying patterns.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langgraph_agent.state import AgentState
 from langgraph_agent.interfaces import ILLMProvider
 from langgraph_agent.agents.base_agent import BaseAgent
+from langgraph_agent.tool_router import ToolRouter
+from langgraph_agent.services.context_service import ContextWindowManager
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,8 +20,17 @@ class AnalyticsAgent(BaseAgent):
     transformations, and identify patterns using data science tools (e.g., Pandas, Python REPL).
     It aims to derive insights from the gathered data.
     """
-    def __init__(self, llm_provider: ILLMProvider):
+    agent_name = "analytics_agent"
+
+    def __init__(
+        self,
+        llm_provider: ILLMProvider,
+        tool_router: Optional[ToolRouter] = None,
+        context_manager: Optional[ContextWindowManager] = None,
+    ):
         self.llm_provider = llm_provider
+        self.tool_router = tool_router
+        self.context_manager = context_manager
 
     def _get_analytics_system_prompt(self) -> str:
         """Get specialized system prompt for analytics phase."""
@@ -77,7 +88,7 @@ class AnalyticsAgent(BaseAgent):
                 messages.append(AIMessage(content=f"Tool Output: {output}"))
 
         # The LLM needs to decide what analysis to perform
-        llm_response = self.llm_provider.invoke(messages)
+        llm_response = self._invoke_llm(state, messages)
         messages.append(llm_response)
 
         tool_calls = llm_response.tool_calls
@@ -2,15 +2,19 @@
 Base class for LangGraph agents, providing a common interface for execution.
 """
 
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List
+from langchain_core.messages import BaseMessage
 from langgraph_agent.state import AgentState
+from langgraph_agent.services.context_service import record_llm_usage
 
 class BaseAgent(ABC):
     """
     Abstract base class for all specialized agents in the LangGraph workflow.
     Defines the common interface for agent execution.
     """
+    agent_name: str = ""  # Graph node name; also selects the agent's tool routing profile
 
     @abstractmethod
     def execute(self, state: AgentState) -> Dict[str, Any]:
@@ -24,4 +28,26 @@ class BaseAgent(ABC):
         Returns:
             A dictionary of state updates.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def _invoke_llm(self, state: AgentState, messages: List[BaseMessage]) -> BaseMessage:
+        """
+        Invokes the agent's LLM. With a context manager, the prompt is fitted into the
+        per-hop token budget (the caller's `messages` are left as is). With a tool router,
+        only the tools routed for this turn's query are bound, and the hop is recorded
+        in the routing metrics.
+        """
+        context_manager = getattr(self, "context_manager", None)
+        if context_manager is not None:
+            messages = context_manager.fit(state, messages, self.agent_name)
+        tool_router = getattr(self, "tool_router", None)
+        if tool_router is None:
+            llm_response = self.llm_provider.invoke(messages)
+        else:
+            llm_provider, selection = tool_router.route(state.get("input_query") or "", self.agent_name)
+            started = time.perf_counter()
+            llm_response = llm_provider.invoke(messages)
+            tool_router.record_hop(selection, time.perf_counter() - started)
+        if context_manager is not None:
+            record_llm_usage(self.agent_name, llm_response)
+        return llm_response
@@ -3,11 +3,13 @@ Data Retrieval Agent for the LangGraph NBA data scientist.
 Responsible for identifying and calling appropriate tools to gather raw data.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langgraph_agent.state import AgentState
 from langgraph_agent.interfaces import ILLMProvider
 from langgraph_agent.agents.base_agent import BaseAgent
+from langgraph_agent.tool_router import ToolRouter
+from langgraph_agent.services.context_service import ContextWindowManager
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,8 +20,17 @@ class DataRetrievalAgent(BaseAgent):
     (NBA API, web search) based on the user's query and the current state.
     It aims to gather all necessary raw data before passing control to the analysis phase.
     """
-    def __init__(self, llm_provider: ILLMProvider):
+    agent_name = "data_retrieval_agent"
+
+    def __init__(
+        self,
+        llm_provider: ILLMProvider,
+        tool_router: Optional[ToolRouter] = None,
+        context_manager: Optional[ContextWindowManager] = None,
+    ):
         self.llm_provider = llm_provider
+        self.tool_router = tool_router
+        self.context_manager = context_manager
 
     def execute(self, state: AgentState) -> Dict[str, Any]:
         """
@@ -37,7 +48,7 @@ class DataRetrievalAgent(BaseAgent):
             messages.append(HumanMessage(content=input_query))
 
         # Invoke LLM to decide on tool calls
-        llm_response = self.llm_provider.invoke(messages)
+        llm_response = self._invoke_llm(state, messages)
         messages.append(llm_response)
 
         tool_calls = llm_response.tool_calls
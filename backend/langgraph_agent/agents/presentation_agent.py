@@ -4,11 +4,13 @@ Responsible for formulating the final, insightful, and well-presented answer,
 including narrative and context, and potentially triggering visualizations.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langgraph_agent.state import AgentState
 from langgraph_agent.interfaces import ILLMProvider
 from langgraph_agent.agents.base_agent import BaseAgent
+from langgraph_agent.tool_router import ToolRouter
+from langgraph_agent.services.context_service import ContextWindowManager
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,8 +21,17 @@ class PresentationAgent(BaseAgent):
     into a clear, concise, and insightful final answer for the user.
     It also decides if a visualization is needed and triggers the `data_visualization_tool`.
     """
-    def __init__(self, llm_provider: ILLMProvider):
+    agent_name = "presentation_agent"
+
+    def __init__(
+        self,
+        llm_provider: ILLMProvider,
+        tool_router: Optional[ToolRouter] = None,
+        context_manager: Optional[ContextWindowManager] = None,
+    ):
         self.llm_provider = llm_provider
+        self.tool_router = tool_router
+        self.context_manager = context_manager
 
     def _get_presentation_system_prompt(self) -> str:
         """Get specialized system prompt for presentation phase."""
@@ -73,7 +84,7 @@ class PresentationAgent(BaseAgent):
         # to formulate the final response.
         
         # Invoke LLM to formulate the final answer or decide on visualization
-        llm_response = self.llm_provider.invoke(messages)
+        llm_response = self._invoke_llm(state, messages)
         messages.append(llm_response)
 
         tool_calls = llm_response.tool_calls
@@ -0,0 +1,609 @@
+"""
+Durable, compact LangGraph checkpointer backed by a local SQLite file.
+
+`InMemorySaver` keeps every version of every channel of every thread in process
+RAM, and each new version of the `messages` channel re-serializes the whole
+conversation, multi-hundred-KB tool payloads included. `SqliteCheckpointSaver`
+stores checkpoints in a WAL-mode SQLite file instead, so any uvicorn worker can
+resume a `thread_id` and nothing is lost on restart:
+
+- Message lists are stored as lists of content digests; each message is
+  serialized once into a content-addressed, zlib-compressed `blobs` row and
+  shared by every later checkpoint (and thread) that contains it. Other
+  channel values and pending writes larger than a threshold are deduplicated
+  the same way.
+- Threads idle longer than a TTL, and the least recently used threads beyond
+  a maximum count, are deleted periodically; blobs no thread references any
+  more are garbage-collected with them.
+- Recently written and read blobs are kept in a byte-bounded in-memory LRU
+  (the hot tier), so resuming an active thread rarely decompresses or queries
+  anything twice.
+  Blobs are immutable, so the hot tier is safe to share across workers' writes.
+"""
+import json
+import time
+import zlib
+import random
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+try:
+    from langgraph.checkpoint.base import get_checkpoint_metadata
+except ImportError:  # Older langgraph-checkpoint releases store metadata as given
+    def get_checkpoint_metadata(config: RunnableConfig, metadata: CheckpointMetadata) -> CheckpointMetadata:
+        return metadata
+
+try:
+    from langgraph.checkpoint.base import writes_sort_key
+except ImportError:  # Older langgraph-checkpoint releases: task path, then task, then write index
+    def writes_sort_key(task_path: str, task_id: str = "", idx: int = 0) -> Tuple[str, str, int]:
+        return (task_path, task_id, idx)
+
+from config import settings
+from utils.path_utils import get_cache_file_path
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+EVICTION_CHECK_INTERVAL = 50      # Run thread eviction every N checkpoint writes
+COMPRESS_MIN_BYTES = 256          # Blobs smaller than this are stored uncompressed
+TOUCH_INTERVAL_SECONDS = 60.0     # Reads refresh a thread's last-access time at most this often
+TOUCHED_THREADS_MAX = 10000       # Per-process touch timestamps kept before the throttle map is reset
+SQLITE_MAX_PARAMS = 500           # Digests looked up per query
+MESSAGE_REFS_TYPE = "msgrefs"     # Value is a JSON list of blob digests, one per list item
+BLOB_REF_TYPE = "blobref"         # Value is the digest of one blob
+EMPTY_TYPE = "empty"              # Channel had no value at this version
+
+
+def _digest(value_type: str, data: bytes) -> str:
+    return hashlib.blake2b(value_type.encode("utf-8") + b"\0" + data, digest_size=16).hexdigest()
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    Checkpoint saver persisting LangGraph threads to a SQLite file, with content-addressed
+    message/blob deduplication, idle-thread eviction and a bounded in-memory hot tier.
+
+    Args:
+        db_path (str): SQLite file path; created if missing.
+        thread_ttl_seconds (Optional[float]): Threads idle longer than this are deleted (0 disables).
+        max_threads (Optional[int]): Least recently used threads beyond this count are deleted (0 disables).
+        hot_cache_bytes (Optional[int]): Byte budget of the in-memory blob LRU.
+        dedup_min_bytes (Optional[int]): Non-message values at least this large are stored as shared blobs.
+        serde: LangGraph serializer; defaults to the saver's JsonPlus serializer.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        thread_ttl_seconds: Optional[float] = None,
+        max_threads: Optional[int] = None,
+        hot_cache_bytes: Optional[int] = None,
+        dedup_min_bytes: Optional[int] = None,
+        serde: Any = None,
+    ):
+        super().__init__(serde=serde)
+        self.db_path = db_path
+        self.thread_ttl_seconds = (
+            thread_ttl_seconds if thread_ttl_seconds is not None else settings.AGENT_CHECKPOINT_THREAD_TTL_SECONDS
+        )
+        self.max_threads = max_threads if max_threads is not None else settings.AGENT_CHECKPOINT_MAX_THREADS
+        self.hot_cache_bytes = hot_cache_bytes if hot_cache_bytes is not None else settings.AGENT_CHECKPOINT_HOT_CACHE_BYTES
+        self.dedup_min_bytes = dedup_min_bytes if dedup_min_bytes is not None else settings.AGENT_CHECKPOINT_DEDUP_MIN_BYTES
+        self._local = threading.local()
+        self._hot: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()  # digest -> (type, serialized bytes)
+        self._hot_bytes = 0
+        self._hot_lock = threading.Lock()
+        self._touched: Dict[str, float] = {}  # thread_id -> last time this process refreshed last_access
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self.hot_hits = 0
+        self.hot_misses = 0
+        self._init_schema()
+
+    # --- Connection & Schema ---
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _init_schema(self) -> None:
+        conn = self._connect()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS threads (
+                thread_id TEXT PRIMARY KEY,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_threads_last_access ON threads(last_access);
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL,
+                checkpoint_id TEXT NOT NULL,
+                parent_checkpoint_id TEXT,
+                checkpoint_type TEXT NOT NULL,
+                checkpoint BLOB NOT NULL,
+                metadata_type TEXT NOT NULL,
+                metadata BLOB NOT NULL,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            );
+            CREATE TABLE IF NOT EXISTS channel_values (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                version TEXT NOT NULL,
+                value_type TEXT NOT NULL,
+                value BLOB NOT NULL,
+                PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+            );
+            CREATE TABLE IF NOT EXISTS writes (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL,
+                checkpoint_id TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                channel TEXT NOT NULL,
+                value_type TEXT NOT NULL,
+                value BLOB NOT NULL,
+                task_path TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                value_type TEXT NOT NULL,
+                data BLOB NOT NULL,
+                compressed INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS blob_refs (
+                thread_id TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (thread_id, digest)
+            );
+            CREATE INDEX IF NOT EXISTS idx_blob_refs_digest ON blob_refs(digest);
+            """
+        )
+
+    # --- Value Encoding ---
+    def _store_blob(self, conn: sqlite3.Connection, thread_id: str, value_type: str, data: bytes) -> str:
+        digest = _digest(value_type, data)
+        compressed = len(data) >= COMPRESS_MIN_BYTES
+        conn.execute(
+            "INSERT OR IGNORE INTO blobs (digest, value_type, data, compressed, size) VALUES (?, ?, ?, ?, ?)",
+            (digest, value_type, zlib.compress(data, 1) if compressed else data, int(compressed), len(data)),
+        )
+        conn.execute("INSERT OR IGNORE INTO blob_refs (thread_id, digest) VALUES (?, ?)", (thread_id, digest))
+        self._remember(digest, (value_type, data))  # Write-through: the next turn reads the thread straight back
+        return digest
+
+    def _encode(self, conn: sqlite3.Connection, thread_id: str, value: Any) -> Tuple[str, bytes]:
+        """Serializes a channel value or write; message lists and large values become blob references."""
+        if isinstance(value, list) and value and any(isinstance(item, BaseMessage) for item in value):
+            digests = [self._store_blob(conn, thread_id, *self.serde.dumps_typed(item)) for item in value]
+            return MESSAGE_REFS_TYPE, json.dumps(digests, separators=(",", ":")).encode("utf-8")
+        value_type, data = self.serde.dumps_typed(value)
+        if self.dedup_min_bytes and len(data) >= self.dedup_min_bytes:
+            return BLOB_REF_TYPE, self._store_blob(conn, thread_id, value_type, data).encode("utf-8")
+        return value_type, data
+
+    def _referenced_digests(self, rows: Iterable[Tuple[str, bytes]]) -> List[str]:
+        digests: List[str] = []
+        for value_type, data in rows:
+            if value_type == MESSAGE_REFS_TYPE:
+                digests.extend(json.loads(data))
+            elif value_type == BLOB_REF_TYPE:
+                digests.append(data.decode("utf-8"))
+        return digests
+
+    def _load_blobs(self, conn: sqlite3.Connection, digests: Sequence[str]) -> Dict[str, Tuple[str, bytes]]:
+        """Returns (type, serialized bytes) per digest, from the hot tier where possible."""
+        found: Dict[str, Tuple[str, bytes]] = {}
+        missing: List[str] = []
+        with self._hot_lock:
+            for digest in dict.fromkeys(digests):
+                entry = self._hot.get(digest)
+                if entry is None:
+                    missing.append(digest)
+                else:
+                    self._hot.move_to_end(digest)
+                    found[digest] = entry
+            self.hot_hits += len(found)
+            self.hot_misses += len(missing)
+        for start in range(0, len(missing), SQLITE_MAX_PARAMS):
+            chunk = missing[start:start + SQLITE_MAX_PARAMS]
+            rows = conn.execute(
+                f"SELECT digest, value_type, data, compressed FROM blobs WHERE digest IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for digest, value_type, data, compressed in rows:
+                entry = (value_type, zlib.decompress(data) if compressed else bytes(data))
+                found[digest] = entry
+                self._remember(digest, entry)
+        return found
+
+    def _remember(self, digest: str, entry: Tuple[str, bytes]) -> None:
+        size = len(entry[1])
+        if size > self.hot_cache_bytes:
+            return
+        with self._hot_lock:
+            if digest in self._hot:
+                return
+            self._hot[digest] = entry
+            self._hot_bytes += size
+            while self._hot_bytes > self.hot_cache_bytes:
+                _, (_, evicted) = self._hot.popitem(last=False)
+                self._hot_bytes -= len(evicted)
+
+    def _decode_rows(self, conn: sqlite3.Connection, rows: Sequence[Tuple[str, bytes]]) -> List[Any]:
+        """Deserializes stored (type, bytes) values, resolving blob references in one batched lookup."""
+        blobs = self._load_blobs(conn, self._referenced_digests(rows))
+        values: List[Any] = []
+        for value_type, data in rows:
+            if value_type == MESSAGE_REFS_TYPE:
+                values.append([self.serde.loads_typed(blobs[digest]) for digest in json.loads(data)])
+            elif value_type == BLOB_REF_TYPE:
+                values.append(self.serde.loads_typed(blobs[data.decode("utf-8")]))
+            else:
+                values.append(self.serde.loads_typed((value_type, bytes(data))))
+        return values
+
+    # --- Thread Bookkeeping ---
+    def _touch(self, conn: sqlite3.Connection, thread_id: str, force: bool = False) -> None:
+        now = time.time()
+        if not force and now - self._touched.get(thread_id, 0.0) < TOUCH_INTERVAL_SECONDS:
+            return
+        conn.execute(
+            "INSERT INTO threads (thread_id, last_access) VALUES (?, ?) "
+            "ON CONFLICT(thread_id) DO UPDATE SET last_access = excluded.last_access",
+            (thread_id, now),
+        )
+        if len(self._touched) >= TOUCHED_THREADS_MAX:
+            self._touched.clear()  # Only a throttle; forgetting it costs one extra UPDATE per thread
+        self._touched[thread_id] = now
+
+    def _delete_threads(self, conn: sqlite3.Connection, thread_ids: Sequence[str]) -> None:
+        for table in ("checkpoints", "channel_values", "writes", "blob_refs", "threads"):
+            conn.executemany(f"DELETE FROM {table} WHERE thread_id = ?", [(t,) for t in thread_ids])
+        conn.execute(
+            "DELETE FROM blobs WHERE NOT EXISTS (SELECT 1 FROM blob_refs r WHERE r.digest = blobs.digest)"
+        )
+        for thread_id in thread_ids:
+            self._touched.pop(thread_id, None)
+
+    def evict(self) -> int:
+        """Deletes threads idle past the TTL, then the least recently used beyond `max_threads`. Returns the count."""
+        try:
+            with self._transaction() as conn:
+                stale: List[str] = []
+                if self.thread_ttl_seconds:
+                    cutoff = time.time() - self.thread_ttl_seconds
+                    stale.extend(row[0] for row in conn.execute(
+                        "SELECT thread_id FROM threads WHERE last_access < ?", (cutoff,)
+                    ))
+                if self.max_threads:
+                    excess = conn.execute("SELECT COUNT(*) FROM threads").fetchone()[0] - len(stale) - self.max_threads
+                    expired = set(stale)
+                    for (thread_id,) in conn.execute("SELECT thread_id FROM threads ORDER BY last_access ASC"):
+                        if excess <= 0:
+                            break
+                        if thread_id not in expired:
+                            stale.append(thread_id)
+                            excess -= 1
+                if stale:
+                    self._delete_threads(conn, stale)
+        except sqlite3.Error as e:
+            logger.warning(f"Checkpoint thread eviction failed: {e}")
+            return 0
+        if stale:
+            logger.info(f"Checkpointer evicted {len(stale)} idle threads.")
+        return len(stale)
+
+    def _count_write(self) -> None:
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % EVICTION_CHECK_INTERVAL == 0
+        if due:
+            self.evict()
+
+    # --- BaseCheckpointSaver API ---
+    def _build_tuple(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        row: Tuple[Any, ...],
+        metadata: Optional[CheckpointMetadata] = None,
+    ) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, checkpoint_type, checkpoint_data, metadata_type, metadata_data = row
+        checkpoint: Checkpoint = self.serde.loads_typed((checkpoint_type, bytes(checkpoint_data)))
+        if metadata is None:
+            metadata = self.serde.loads_typed((metadata_type, bytes(metadata_data)))
+
+        value_rows: List[Tuple[str, str, bytes]] = []
+        for channel, version in checkpoint["channel_versions"].items():
+            stored = conn.execute(
+                "SELECT value_type, value FROM channel_values "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if stored is not None and stored[0] != EMPTY_TYPE:
+                value_rows.append((channel, stored[0], stored[1]))
+        values = self._decode_rows(conn, [(value_type, data) for _, value_type, data in value_rows])
+
+        write_rows = sorted(
+            conn.execute(
+                "SELECT task_id, idx, channel, value_type, value, task_path FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            ).fetchall(),
+            key=lambda w: writes_sort_key(w[5], w[0], w[1]),
+        )
+        write_values = self._decode_rows(conn, [(w[3], w[4]) for w in write_rows])
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": {channel: value for (channel, _, _), value in zip(value_rows, values)}},
+            metadata=metadata,
+            pending_writes=[(w[0], w[2], value) for w, value in zip(write_rows, write_values)],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Returns the checkpoint named by `config`, or the thread's latest one if no `checkpoint_id` is given."""
+        thread_id: str = config["configurable"]["thread_id"]
+        checkpoint_ns: str = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, checkpoint_type, checkpoint, metadata_type, metadata"
+        conn = self._connect()
+        if checkpoint_id := get_checkpoint_id(config):
+            row = conn.execute(
+                f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            ).fetchone()
+        else:
+            row = conn.execute(
+                f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                "ORDER BY checkpoint_id DESC LIMIT 1",
+                (thread_id, checkpoint_ns),
+            ).fetchone()
+        if row is None:
+            return None
+        self._touch(conn, thread_id)
+        return self._build_tuple(conn, thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """Yields matching checkpoints, newest first within each thread."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if config is not None:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_checkpoint_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, checkpoint_type, checkpoint, "
+            f"metadata_type, metadata FROM checkpoints {where} ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC",
+            params,
+        ).fetchall()
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and limit <= 0:
+                break
+            metadata = self.serde.loads_typed((row[4], bytes(row[5])))
+            if filter and not all(value == metadata.get(key) for key, value in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield self._build_tuple(conn, thread_id, checkpoint_ns, tuple(row), metadata)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Stores a checkpoint and the channel values that changed with it."""
+        thread_id: str = config["configurable"]["thread_id"]
+        checkpoint_ns: str = config["configurable"].get("checkpoint_ns", "")
+        stored = checkpoint.copy()
+        values: Dict[str, Any] = stored.pop("channel_values")  # type: ignore[misc]
+        with self._transaction() as conn:
+            for channel, version in new_versions.items():
+                if channel in values:
+                    value_type, data = self._encode(conn, thread_id, values[channel])
+                else:
+                    value_type, data = EMPTY_TYPE, b""
+                conn.execute(
+                    "INSERT OR REPLACE INTO channel_values "
+                    "(thread_id, checkpoint_ns, channel, version, value_type, value) VALUES (?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, channel, str(version), value_type, data),
+                )
+            checkpoint_type, checkpoint_data = self.serde.dumps_typed(stored)
+            metadata_type, metadata_data = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                "checkpoint_type, checkpoint, metadata_type, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+                    checkpoint_type, checkpoint_data, metadata_type, metadata_data,
+                ),
+            )
+            self._touch(conn, thread_id, force=True)
+        self._count_write()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Stores intermediate writes for a checkpoint; regular writes already stored for a task are kept."""
+        thread_id: str = config["configurable"]["thread_id"]
+        checkpoint_ns: str = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id: str = config["configurable"]["checkpoint_id"]
+        with self._transaction() as conn:
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                value_type, data = self._encode(conn, thread_id, value)
+                conn.execute(
+                    f"INSERT OR {'IGNORE' if write_idx >= 0 else 'REPLACE'} INTO writes "
+                    "(thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, value_type, value, task_path) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint_id, task_id, write_idx, channel, value_type, data, task_path),
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Deletes every checkpoint and write of a thread, and blobs no other thread references."""
+        with self._transaction() as conn:
+            self._delete_threads(conn, [thread_id])
+
+    def get_next_version(self, current: Optional[str], channel: Any = None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # --- Async API (SQLite work runs in the default executor) ---
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # --- Metrics ---
+    def info(self) -> Dict[str, Any]:
+        conn = self._connect()
+        blob_count, blob_bytes, stored_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+        ).fetchone()
+        with self._hot_lock:
+            hot = {"entries": len(self._hot), "bytes": self._hot_bytes, "hits": self.hot_hits, "misses": self.hot_misses}
+        return {
+            "backend": "sqlite",
+            "db_path": self.db_path,
+            "threads": conn.execute("SELECT COUNT(*) FROM threads").fetchone()[0],
+            "checkpoints": conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0],
+            "blobs": blob_count,
+            "blob_bytes": blob_bytes,
+            "blob_stored_bytes": stored_bytes,
+            "hot_tier": hot,
+        }
+
+
+def create_checkpointer() -> BaseCheckpointSaver:
+    """Opens the configured durable checkpointer, falling back to `InMemorySaver` if disabled or unavailable."""
+    if settings.AGENT_CHECKPOINT_PERSISTENT_ENABLED:
+        try:
+            saver = SqliteCheckpointSaver(get_cache_file_path(settings.AGENT_CHECKPOINT_DB_FILE))
+            logger.info(f"Agent checkpoints persisted at {saver.db_path}")
+            return saver
+        except Exception as e:
+            logger.error(f"Failed to open agent checkpoint store, keeping threads in memory: {e}", exc_info=True)
+    return InMemorySaver()
@@ -0,0 +1,420 @@
+"""
+Process-isolated execution of the data science tools.
+
+`python_code_execution` and the other data science tools run LLM-written pandas
+code. In the API process that code holds the GIL through heavy computations,
+swaps the process-wide `sys.stdout` and shares the interpreter with every
+request. `CodeSandbox` runs those tools in a few pre-warmed worker processes
+instead (pandas, numpy and matplotlib are imported when a worker starts):
+
+- Each conversation (thread_id) is pinned to one worker, which keeps that
+  conversation's session variables. Conversations on different workers run in
+  parallel.
+- Each call has a CPU-time limit (RLIMIT_CPU; the code is aborted with an error)
+  and a wall-time limit (the worker is killed and restarted, and the sessions it
+  held are lost). Each worker has an address-space limit (RLIMIT_AS), so a
+  runaway allocation fails with MemoryError instead of growing the API process.
+- Condensed tool results referenced by handle (res_...) are written once as
+  Arrow IPC files on tmpfs and memory-mapped by the worker, which keeps them for
+  later calls.
+
+The workers isolate resources, not privileges: code runs as the API's user with
+the same filesystem and network access, exactly as it did in process.
+
+Workers run `python -m langgraph_agent.code_sandbox --worker <in fd> <out fd>`
+and exchange pickled messages with the API process over a pair of pipes; their
+stdout/stderr are the API's, so prints and logs land in the server log.
+"""
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import signal
+import logging
+import tempfile
+import threading
+import subprocess
+from collections import OrderedDict
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from config import settings
+from langgraph_agent.services.tool_output_service import HANDLE_PREFIX, get_tool_result_store
+from utils import deadline
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TABLE_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()  # tmpfs: shipped tables stay in memory
+HANDLE_PATTERN = re.compile(rf"\b{HANDLE_PREFIX}[0-9a-f]{{10}}\b")
+STARTUP_TIMEOUT_SECONDS = 60.0
+WORKER_ENV = {
+    "CODE_SANDBOX_ENABLED": "false",  # Inside a worker the tools run directly
+    "MPLBACKEND": "Agg",
+    # One BLAS thread per worker: CPU limits apply per call and workers don't oversubscribe the cores
+    "OMP_NUM_THREADS": "1",
+    "OPENBLAS_NUM_THREADS": "1",
+    "MKL_NUM_THREADS": "1",
+    "MALLOC_ARENA_MAX": "2",  # Keeps virtual size (what RLIMIT_AS counts) close to actual use
+}
+
+
+class SandboxError(RuntimeError):
+    """A worker could not be started."""
+
+
+# --- Table Handoff ---
+def write_table_file(df: pd.DataFrame) -> str:
+    """Writes a table as an Arrow IPC file in TABLE_DIR (pickle if Arrow cannot type a column); returns its path."""
+    fd, path = tempfile.mkstemp(prefix="sandbox_", suffix=".arrow", dir=TABLE_DIR)
+    os.close(fd)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return path
+    except (pa.ArrowException, TypeError, ValueError):
+        os.remove(path)
+        path = path[: -len(".arrow")] + ".pkl"
+        df.to_pickle(path)
+        return path
+
+
+def read_table_file(path: str) -> pd.DataFrame:
+    """Reads a table written by `write_table_file`; Arrow files are memory-mapped, not copied."""
+    if path.endswith(".pkl"):
+        return pd.read_pickle(path)
+    return pa.ipc.open_file(pa.memory_map(path)).read_all().to_pandas(split_blocks=True)
+
+
+# --- API Side ---
+class _Worker:
+    """API-side handle of one worker process."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.lock = threading.Lock()  # One call at a time per worker
+        self.process: Optional[subprocess.Popen] = None
+        self.pid: Optional[int] = None
+        self.ready = False
+        self.tables: set = set()  # Handles already shipped to this worker
+        self.calls = 0
+        self.restarts = 0
+        self._send: Optional[Connection] = None
+        self._recv: Optional[Connection] = None
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def spawn(self) -> None:
+        """Starts the process; its imports run in the background until `ensure_ready`."""
+        if self.process is not None:
+            self.restarts += 1
+            self.stop()
+        to_worker_read, to_worker_write = os.pipe()
+        from_worker_read, from_worker_write = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "langgraph_agent.code_sandbox", "--worker",
+                 str(to_worker_read), str(from_worker_write)],
+                cwd=BACKEND_DIR, env={**os.environ, **WORKER_ENV}, stdin=subprocess.DEVNULL,
+                pass_fds=(to_worker_read, from_worker_write),
+            )
+        finally:
+            os.close(to_worker_read)  # The worker's ends
+            os.close(from_worker_write)
+        self._send = Connection(to_worker_write, readable=False)
+        self._recv = Connection(from_worker_read, writable=False)
+
+    def stop(self) -> None:
+        if self.alive():
+            self.process.kill()
+            self.process.wait()
+        for conn in (self._send, self._recv):
+            if conn is not None:
+                conn.close()
+        self._send = self._recv = None
+        self.pid = None
+        self.ready = False
+        self.tables = set()
+
+    def _receive(self, timeout: float) -> Dict[str, Any]:
+        if not self._recv.poll(max(timeout, 0.0)):
+            raise TimeoutError
+        return self._recv.recv()  # EOFError if the worker died
+
+    def ensure_ready(self) -> None:
+        if not self.alive():
+            self.spawn()
+        if self.ready:
+            return
+        try:
+            message = self._receive(STARTUP_TIMEOUT_SECONDS)
+        except (TimeoutError, EOFError, OSError) as e:
+            self.stop()
+            raise SandboxError(f"code sandbox worker {self.index} failed to start ({type(e).__name__})") from e
+        self.pid, self.ready = message.get("pid"), True
+
+    def request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        self._send.send(message)
+        return self._receive(timeout)
+
+
+class CodeSandbox:
+    """
+    Runs data science tool functions in pre-warmed worker processes, one session per conversation.
+
+    Args:
+        workers (Optional[int]): Worker processes; defaults to settings.CODE_SANDBOX_WORKERS.
+        timeout_seconds (Optional[float]): Wall time per call; defaults to settings.CODE_SANDBOX_TIMEOUT_SECONDS.
+            A shorter deadline of the calling tool (utils/deadline.py) takes precedence.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout_seconds: Optional[float] = None):
+        self.timeout_seconds = timeout_seconds or settings.CODE_SANDBOX_TIMEOUT_SECONDS
+        self._workers = [_Worker(i) for i in range(max(1, workers or settings.CODE_SANDBOX_WORKERS))]
+        self._assignments: "OrderedDict[str, int]" = OrderedDict()  # session -> worker index, LRU order
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "errors": 0, "timeouts": 0, "crashes": 0, "tables_shipped": 0, "table_bytes": 0}
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def start(self) -> None:
+        """Spawns every worker that is not running, without waiting for their imports."""
+        for worker in self._workers:
+            with worker.lock:
+                if not worker.alive():
+                    worker.spawn()
+
+    def shutdown(self) -> None:
+        for worker in self._workers:
+            worker.stop()
+
+    def _worker_for(self, session_id: str) -> _Worker:
+        """The session's worker; new sessions go to the worker with the fewest sessions, preferring idle ones."""
+        with self._lock:
+            index = self._assignments.get(session_id)
+            if index is None:
+                load = [0] * len(self._workers)
+                for assigned in self._assignments.values():
+                    load[assigned] += 1
+                index = min(range(len(self._workers)), key=lambda i: (load[i], self._workers[i].lock.locked()))
+            self._assignments[session_id] = index
+            self._assignments.move_to_end(session_id)
+            while len(self._assignments) > settings.CODE_SANDBOX_MAX_SESSIONS * len(self._workers):
+                self._assignments.popitem(last=False)
+            return self._workers[index]
+
+    def _export_tables(self, worker: _Worker, handles: List[str], files: List[str]) -> Dict[str, str]:
+        """Writes the stored tables behind `handles` for the worker; unknown handles are left for it to report."""
+        store = get_tool_result_store()
+        tables = {}
+        for handle in handles:
+            df = store.get(handle)
+            if df is None:
+                continue
+            path = write_table_file(df)
+            files.append(path)
+            tables[handle] = path
+            worker.tables.add(handle)
+            self._count("tables_shipped")
+            self._count("table_bytes", os.path.getsize(path))
+        return tables
+
+    def call(self, session_id: str, function_name: str, kwargs: Dict[str, Any]) -> str:
+        """Runs `function_name(**kwargs)` from data_science_tools in the session's worker and returns its output."""
+        seconds = self.timeout_seconds
+        left = deadline.remaining()
+        if left is not None:
+            seconds = min(seconds, max(left, 0.0))
+        expires = time.monotonic() + seconds
+        worker = self._worker_for(session_id)
+        handles = sorted(set(HANDLE_PATTERN.findall(json.dumps(kwargs, default=str))))
+        self._count("calls")
+        if not worker.lock.acquire(timeout=seconds):
+            self._count("timeouts")
+            return f"Error: the Python session stayed busy for {seconds:.0f}s; try again shortly."
+        files: List[str] = []
+        try:
+            worker.ensure_ready()
+            message = {
+                "session": session_id, "function": function_name, "kwargs": kwargs, "handles": handles,
+                "tables": self._export_tables(worker, [h for h in handles if h not in worker.tables], files),
+                "final": False,
+            }
+            reply = worker.request(message, expires - time.monotonic())
+            if reply["status"] == "need_tables":  # The worker evicted tables it was sent earlier
+                message.update(tables=self._export_tables(worker, reply["handles"], files), final=True)
+                reply = worker.request(message, expires - time.monotonic())
+            worker.calls += 1
+            if reply["status"] == "error":
+                self._count("errors")
+                return f"Error running {function_name} in the code sandbox: {reply['error']}"
+            return reply["output"]
+        except SandboxError as e:
+            self._count("crashes")
+            return f"Error: {e}"
+        except TimeoutError:
+            self._count("timeouts")
+            logger.warning(f"Code sandbox worker {worker.index} killed: {function_name} exceeded {seconds:.0f}s")
+            worker.spawn()  # Replacement warms up in the background
+            return (
+                f"Error: {function_name} did not finish within {seconds:.0f}s and was stopped. The Python session "
+                "for this conversation was reset; recreate the variables it needs and use less data or simpler code."
+            )
+        except (EOFError, OSError) as e:
+            self._count("crashes")
+            logger.warning(f"Code sandbox worker {worker.index} exited during {function_name}: {e!r}")
+            worker.spawn()
+            return (
+                f"Error: the Python worker exited while running {function_name} (most likely out of memory). "
+                "The Python session for this conversation was reset."
+            )
+        finally:
+            worker.lock.release()
+            for path in files:
+                try:
+                    os.remove(path)  # A worker keeps its memory map of the data after the file is unlinked
+                except OSError:
+                    pass
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            sessions = [0] * len(self._workers)
+            for index in self._assignments.values():
+                sessions[index] += 1
+        workers = [
+            {"pid": w.pid, "alive": w.alive(), "ready": w.ready, "busy": w.lock.locked(), "sessions": sessions[w.index],
+             "calls": w.calls, "restarts": w.restarts, "tables": len(w.tables)}
+            for w in self._workers
+        ]
+        return {"enabled": True, **stats, "workers": workers}
+
+
+_sandbox: Optional[CodeSandbox] = None
+_sandbox_lock = threading.Lock()
+
+
+def get_code_sandbox() -> Optional[CodeSandbox]:
+    """The process-wide sandbox, or None when disabled or unsupported (the resource limits need POSIX)."""
+    global _sandbox
+    if not settings.CODE_SANDBOX_ENABLED or os.name != "posix":
+        return None
+    if _sandbox is None:
+        with _sandbox_lock:
+            if _sandbox is None:
+                _sandbox = CodeSandbox()
+                atexit.register(_sandbox.shutdown)
+    return _sandbox
+
+
+def code_sandbox_info() -> Dict[str, Any]:
+    """Worker and call counters for the health endpoint."""
+    return _sandbox.info() if _sandbox is not None else {"enabled": get_code_sandbox() is not None, "started": False}
+
+
+def shutdown_code_sandbox() -> None:
+    if _sandbox is not None:
+        _sandbox.shutdown()
+
+
+# --- Worker Side ---
+class CpuLimitExceeded(Exception):
+    """Raised inside sandboxed code when its call's CPU-time limit is reached."""
+
+
+def _on_cpu_limit(signum: int, frame: Any) -> None:
+    raise CpuLimitExceeded(f"CPU time limit of {settings.CODE_SANDBOX_CPU_SECONDS}s per call exceeded")
+
+
+def _set_cpu_limit(seconds: Optional[int]) -> None:
+    """Allows `seconds` more CPU time from now (SIGXCPU past it); None lifts the limit."""
+    import resource
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if seconds is None:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    limit = int(usage.ru_utime + usage.ru_stime) + seconds
+    resource.setrlimit(resource.RLIMIT_CPU, (limit if hard == resource.RLIM_INFINITY else min(limit, hard), hard))
+
+
+def _set_memory_limit(megabytes: int) -> None:
+    import resource
+    if megabytes <= 0:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = megabytes * 2**20
+    resource.setrlimit(resource.RLIMIT_AS, (limit if hard == resource.RLIM_INFINITY else min(limit, hard), hard))
+
+
+def _touch_session(tools: Any, last_used: "OrderedDict[str, float]", session_id: str) -> None:
+    """Marks the session used and drops sessions past the idle TTL or the per-worker cap."""
+    now = time.monotonic()
+    last_used[session_id] = now
+    last_used.move_to_end(session_id)
+    while last_used and (
+        len(last_used) > settings.CODE_SANDBOX_MAX_SESSIONS
+        or now - next(iter(last_used.values())) > settings.CODE_SANDBOX_SESSION_TTL_SECONDS
+    ):
+        stale, _ = last_used.popitem(last=False)
+        tools.drop_session(stale)
+
+
+def _handle_call(message: Dict[str, Any], tools: Any, store: Any, last_used: "OrderedDict[str, float]") -> Dict[str, Any]:
+    import matplotlib.pyplot as plt
+    try:
+        for handle, path in message["tables"].items():
+            store.remember(handle, read_table_file(path))
+        missing = [handle for handle in message["handles"] if store.get(handle) is None]
+        if missing and not message["final"]:
+            return {"status": "need_tables", "handles": missing}
+        function = tools.SESSION_FUNCTIONS.get(message["function"])
+        if function is None:
+            return {"status": "error", "error": f"unknown function '{message['function']}'"}
+        _touch_session(tools, last_used, message["session"])
+        _set_cpu_limit(settings.CODE_SANDBOX_CPU_SECONDS)
+        try:
+            with tools.session_scope(message["session"]):
+                output = function(**message["kwargs"])
+        finally:
+            _set_cpu_limit(None)
+            plt.close("all")
+        return {"status": "ok", "output": output}
+    except Exception as e:  # CpuLimitExceeded/MemoryError outside the tool's own error handling
+        return {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+
+def _worker_main(in_fd: int, out_fd: int) -> None:
+    recv = Connection(in_fd, writable=False)
+    send = Connection(out_fd, readable=False)
+
+    # Pre-warm: pandas, numpy, matplotlib and seaborn come in with the toolkit
+    from langgraph_agent.toolkits import data_science_tools as tools
+    store = get_tool_result_store()
+    _set_memory_limit(settings.CODE_SANDBOX_MEMORY_MB)
+    signal.signal(signal.SIGXCPU, _on_cpu_limit)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C on the API server: the API process shuts workers down
+    last_used: "OrderedDict[str, float]" = OrderedDict()
+
+    send.send({"status": "ready", "pid": os.getpid()})
+    while True:
+        try:
+            message = recv.recv()
+        except (EOFError, OSError):
+            return  # The API process exited or stopped this worker
+        send.send(_handle_call(message, tools, store, last_used))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--worker":
+        _worker_main(int(sys.argv[2]), int(sys.argv[3]))
@@ -1,11 +1,15 @@
 # This file will define the main Langgraph StateGraph for the NBA agent. 
 
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode, tools_condition # Import ToolNode and tools_condition
+from langgraph.prebuilt import tools_condition
 from langgraph_agent.state import AgentState
 # Import node functions from the renamed node_functions module
 from langgraph_agent.node_functions import entry_node, llm_service, prompt_service
-from langgraph_agent.tool_manager import all_tools # Import the list of actual tools
+from langgraph_agent.tool_manager import all_tools, tool_categories # Import the list of actual tools
+from langgraph_agent.tool_router import ToolRouter
+from langgraph_agent.tool_executor import ToolExecutor
+from langgraph_agent.services.tool_output_service import ToolOutputCondenser
+from langgraph_agent.services.context_service import ContextWindowManager
 from langgraph.pregel import RetryPolicy
 
 # Import memory manager for checkpointer
@@ -19,13 +23,21 @@ from langgraph_agent.agents.presentation_agent import PresentationAgent
 # Define the graph
 workflow = StateGraph(AgentState)
 
-# Initialize the ToolNode with our tools
-actual_tool_node = ToolNode(all_tools)
+# Tool calls of one LLM turn run concurrently with per-call deadlines; large table results are condensed
+# (full data kept server-side under a handle) before they re-enter the LLM context, and each result is
+# streamed as a custom event as soon as it completes
+actual_tool_node = ToolExecutor(all_tools, message_processor=ToolOutputCondenser().condense_message).node()
+
+# Tool router: each agent hop binds only the tools relevant to the turn's query
+tool_router = ToolRouter(llm_provider=llm_service, tool_categories=tool_categories)
+
+# Context window manager: each hop's prompt is fitted into a token budget (old turns summarized)
+context_manager = ContextWindowManager()
 
 # Initialize specialized agent instances
-data_retrieval_agent = DataRetrievalAgent(llm_provider=llm_service.bind_tools(all_tools))
-analytics_agent = AnalyticsAgent(llm_provider=llm_service.bind_tools(all_tools))
-presentation_agent = PresentationAgent(llm_provider=llm_service.bind_tools(all_tools))
+data_retrieval_agent = DataRetrievalAgent(llm_provider=llm_service, tool_router=tool_router, context_manager=context_manager)
+analytics_agent = AnalyticsAgent(llm_provider=llm_service, tool_router=tool_router, context_manager=context_manager)
+presentation_agent = PresentationAgent(llm_provider=llm_service, tool_router=tool_router, context_manager=context_manager)
 
 # Add nodes for each agent and the tool executor
 workflow.add_node("entry_node", entry_node, retry=RetryPolicy())
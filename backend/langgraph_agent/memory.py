@@ -5,9 +5,13 @@ Follows Single Responsibility Principle (SRP) and clean code practices.
 
 from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
-from langgraph.checkpoint.memory import InMemorySaver
+from datetime import datetime, timezone
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from config import settings
+from langgraph_agent.checkpointer import create_checkpointer
 import uuid
 import logging
 
@@ -44,18 +48,20 @@ class ConversationMemoryManager(MemoryInterface):
     Responsibilities:
     - Generate and manage thread IDs
     - Create proper configurations for LangGraph
-    - Handle conversation context
+    - Handle conversation context (the most recently used AGENT_ACTIVE_THREADS_MAX threads)
     """
     
-    def __init__(self, checkpointer: Optional[InMemorySaver] = None):
+    def __init__(self, checkpointer: Optional[BaseCheckpointSaver] = None, max_active_threads: Optional[int] = None):
         """
         Initialize the memory manager.
         
         Args:
-            checkpointer: LangGraph checkpointer for state persistence
+            checkpointer: LangGraph checkpointer for state persistence (defaults to the durable SQLite saver)
+            max_active_threads: Thread contexts kept before the least recently used are dropped
         """
-        self.checkpointer = checkpointer or InMemorySaver()
-        self._active_threads: Dict[str, ConversationContext] = {}
+        self.checkpointer = checkpointer or create_checkpointer()
+        self.max_active_threads = max_active_threads or settings.AGENT_ACTIVE_THREADS_MAX
+        self._active_threads: "OrderedDict[str, ConversationContext]" = OrderedDict()
         logger.info("ConversationMemoryManager initialized")
     
     def generate_thread_id(self) -> str:
@@ -87,14 +93,18 @@ class ConversationMemoryManager(MemoryInterface):
         # Track the thread context
         context = ConversationContext(
             thread_id=thread_id,
-            user_id=user_id
+            user_id=user_id,
+            created_at=datetime.now(timezone.utc).isoformat()
         )
         self._active_threads[thread_id] = context
+        self._active_threads.move_to_end(thread_id)
+        while len(self._active_threads) > self.max_active_threads:
+            self._active_threads.popitem(last=False)
         
         logger.debug(f"Created thread config for thread_id: {thread_id}, user_id: {user_id}")
         return config
     
-    def get_checkpointer(self) -> InMemorySaver:
+    def get_checkpointer(self) -> BaseCheckpointSaver:
         """Get the checkpointer instance."""
         return self.checkpointer
     
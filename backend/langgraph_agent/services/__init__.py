@@ -7,6 +7,9 @@ from .stream_service import StreamWriterService, EventStreamProcessor
 from .prompt_service import SystemPromptService, PromptServiceFactory
 from .message_service import MessageProcessor, MessageProcessorFactory
 from .error_service import ErrorHandler, ErrorHandlerFactory
+from .tool_output_service import ToolOutputCondenser, load_tool_result
+from .context_service import ContextWindowManager
+from .answer_cache_service import SemanticAnswerCache
 
 __all__ = [
     'GeminiLLMService',
@@ -19,4 +22,8 @@ __all__ = [
     'MessageProcessorFactory',
     'ErrorHandler',
     'ErrorHandlerFactory',
+    'ToolOutputCondenser',
+    'load_tool_result',
+    'ContextWindowManager',
+    'SemanticAnswerCache',
 ]
\ No newline at end of file
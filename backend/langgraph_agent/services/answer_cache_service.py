@@ -0,0 +1,369 @@
+"""
+Semantic answer cache service.
+Following Single Responsibility Principle (SRP).
+
+Many users ask the agent the same questions ("who leads the league in assists",
+"LeBron's career stats"), and each one costs several LLM hops and NBA API
+calls. `SemanticAnswerCache` sits in front of `EventStreamProcessor`: a new
+conversation's question is normalized and embedded locally, and if a stored
+answer's question is similar enough (and names the same players, teams,
+seasons and stat categories) its recorded SSE event sequence is replayed.
+
+Entries expire by the freshness policy of the tools the original run called
+(utils/cache_policy.py): answers built on live data are never stored,
+current-season answers expire with current-season data and answers about
+completed seasons persist. Entries live in a SQLite file shared by workers.
+"""
+
+import re
+import json
+import math
+import time
+import zlib
+import hashlib
+import logging
+import sqlite3
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import settings
+from utils.cache_policy import (
+    GAME_DATE_PARAM_NAMES, GAME_ID_PARAM_NAMES, PLAYER_PARAM_NAMES, SEASON_PARAM_NAMES,
+    DataClass, classify_request, ttl_for,
+)
+from utils.name_search import normalize_name
+from utils.path_utils import get_cache_file_path
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+EMBEDDING_DIMENSIONS = 512
+CHAR_NGRAM_SIZE = 3
+FEATURE_WEIGHTS = {"word": 1.0, "bigram": 0.7, "char": 0.3}
+EVICT_EVERY_N_STORES = 50
+
+# Filler words that never change what is being asked.
+STOPWORDS = frozenset("""
+    a an the of in on at for to by with from and or is are was were be been being am do does did
+    i me my we us our you your please can could would will should tell show give get find let
+    what whats which who whos how much many about there this that these those it its any some
+    nba basketball currently just really like know want see
+""".split())
+
+# Interchangeable spellings, folded before embedding and matching.
+SYNONYMS = {
+    "leads": "lead", "leading": "lead", "leader": "lead", "leaders": "lead", "led": "lead",
+    "top": "lead", "best": "lead", "most": "lead", "highest": "lead",
+    "stats": "stat", "statistics": "stat", "statistic": "stat", "numbers": "stat", "statline": "stat",
+    "pts": "point", "points": "point", "ppg": "point",
+    "ast": "assist", "assists": "assist", "apg": "assist",
+    "reb": "rebound", "rebounds": "rebound", "boards": "rebound", "rpg": "rebound",
+    "stl": "steal", "steals": "steal", "blk": "block", "blocks": "block",
+    "tov": "turnover", "turnovers": "turnover",
+    "threes": "three", "3pt": "three", "3pm": "three", "3s": "three",
+    "avg": "average", "averages": "average", "averaged": "average", "averaging": "average",
+    "versus": "vs", "against": "vs", "compared": "compare", "comparison": "compare",
+    "games": "game", "seasons": "season", "players": "player", "teams": "team",
+    "standings": "standing", "ranking": "rank", "rankings": "rank", "ranked": "rank",
+}
+
+# Words whose wording may differ between paraphrases; every other content word (names, stat
+# categories, seasons, scopes like "career"/"game"/"all time", numbers) must match exactly.
+SOFT_TERMS = frozenset("""
+    lead stat league player team list table summary overview info information details
+    compare vs overall
+""".split())
+
+# Questions about what is happening now are never answered from the cache.
+VOLATILE_TERMS = frozenset("live today tonight now currently latest score scores injury injuries news rumor rumors trade trades".split())
+
+# Tool-name fragments whose results are volatile regardless of their arguments.
+TOOL_CLASS_OVERRIDES: Tuple[Tuple[str, DataClass], ...] = (
+    ("live", DataClass.LIVE),
+    ("odds", DataClass.INTRADAY),
+    ("exa_", DataClass.INTRADAY),  # Web/news search
+)
+
+# Tool arguments that pin a call's data to a season, game, date or player. The LLM leaves out
+# arguments whose tool default applies; without any of these, that default is the current season.
+PINNING_PARAM_NAMES = SEASON_PARAM_NAMES + GAME_ID_PARAM_NAMES + GAME_DATE_PARAM_NAMES + PLAYER_PARAM_NAMES
+
+_SEASON_RE = re.compile(r"\b(\d{4})\s*[-/]\s*(?:\d{4}|\d{2})\b")  # "2012-13", "2012-2013", "2012/13"
+_POSSESSIVE_RE = re.compile(r"['’]s\b")
+
+
+def normalize_query(text: str) -> List[str]:
+    """Folded, canonical content words of a question, in order ("2012-13" and "2012-2013" become "s2012")."""
+    text = _POSSESSIVE_RE.sub("", _SEASON_RE.sub(lambda m: f" s{m.group(1)} ", str(text)))
+    folded = normalize_name(text)
+    tokens = (SYNONYMS.get(token, token) for token in folded.split())
+    return [token for token in tokens if token not in STOPWORDS]
+
+
+def query_signature(tokens: Sequence[str]) -> str:
+    """The hard terms of a question: two questions may share an answer only if these are equal."""
+    return " ".join(sorted({token for token in tokens if token not in SOFT_TERMS}))
+
+
+def _feature_index(feature: str) -> Tuple[int, float]:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest()
+    value = int.from_bytes(digest, "little")
+    return value % EMBEDDING_DIMENSIONS, (1.0 if value & 0x80000000 else -1.0)
+
+
+def embed_query(tokens: Sequence[str]) -> array:
+    """
+    L2-normalized hashed bag of words, word bigrams and character trigrams.
+
+    Runs locally with no model download; character trigrams make it tolerant to typos and
+    inflections, bigrams to word order. Hashing is stable across processes (blake2b, not hash()).
+    """
+    vector = array("f", bytes(4 * EMBEDDING_DIMENSIONS))
+    features: List[Tuple[str, float]] = [(f"w:{token}", FEATURE_WEIGHTS["word"]) for token in tokens]
+    features += [(f"b:{a} {b}", FEATURE_WEIGHTS["bigram"]) for a, b in zip(tokens, tokens[1:])]
+    for token in tokens:
+        padded = f" {token} "
+        features += [
+            (f"c:{padded[i:i + CHAR_NGRAM_SIZE]}", FEATURE_WEIGHTS["char"])
+            for i in range(len(padded) - CHAR_NGRAM_SIZE + 1)
+        ]
+    for feature, weight in features:
+        index, sign = _feature_index(feature)
+        vector[index] += sign * weight
+    norm = math.sqrt(sum(value * value for value in vector))
+    if norm:
+        for i in range(EMBEDDING_DIMENSIONS):
+            vector[i] /= norm
+    return vector
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two L2-normalized vectors."""
+    return sum(x * y for x, y in zip(a, b))
+
+
+def _with_default_season(args: Dict[str, Any]) -> Dict[str, Any]:
+    """A tool call's arguments with `season` set to the current season if nothing else pins its data."""
+    scopes = [args] + [value for value in args.values() if isinstance(value, dict)]
+    if any(scope.get(name) not in (None, "", 0) for scope in scopes for name in PINNING_PARAM_NAMES):
+        return args
+    return {**args, "season": settings.CURRENT_NBA_SEASON}
+
+
+def answer_data_class(tokens: Sequence[str], tool_calls: Iterable[Dict[str, Any]]) -> DataClass:
+    """
+    Freshness class of an answer: the most volatile class among the tool calls that produced it.
+
+    Tool calls are classified by the same rules as the cached NBA API requests behind them
+    (season, game ID, dates, retired players). Calls that name no season, game, date or player
+    use the tools' current-season default; answers without tool calls count as current.
+    """
+    if VOLATILE_TERMS.intersection(tokens):
+        return DataClass.LIVE
+    volatility = list(DataClass)  # Most volatile first
+    classes = [DataClass.CURRENT]
+    for call in tool_calls:
+        name = str(call.get("name") or "")
+        args = call.get("args") if isinstance(call.get("args"), dict) else {}
+        override = next((cls for fragment, cls in TOOL_CLASS_OVERRIDES if fragment in name), None)
+        classes.append(override or classify_request(name, _with_default_season(args)))
+    if len(classes) > 1:
+        classes.pop(0)
+    return min(classes, key=volatility.index)
+
+
+class SemanticAnswerCache:
+    """
+    Stores the SSE event sequences of answered questions and finds them again for similar questions.
+
+    Lookups scan only entries whose hard terms (names, seasons, stat categories, numbers) equal the
+    question's, so the embedding similarity decides between paraphrases, never between subjects.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        similarity_threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        min_ttl_seconds: Optional[int] = None,
+    ):
+        self.db_path = db_path
+        self.similarity_threshold = (
+            similarity_threshold if similarity_threshold is not None else settings.ANSWER_CACHE_SIMILARITY_THRESHOLD
+        )
+        self.max_entries = max_entries if max_entries is not None else settings.ANSWER_CACHE_MAX_ENTRIES
+        self.min_ttl_seconds = min_ttl_seconds if min_ttl_seconds is not None else settings.ANSWER_CACHE_MIN_TTL_SECONDS
+        self._local = threading.local()
+        self._stores = 0
+        self._stats_lock = threading.Lock()
+        self._stats = {"lookups": 0, "hits": 0, "stores": 0, "skipped": 0}
+        self._init_schema()
+
+    # --- Connection & Schema ---
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        self._connect().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS answers (
+                query_key TEXT PRIMARY KEY,
+                signature TEXT NOT NULL,
+                normalized TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                payload BLOB NOT NULL,
+                data_class TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_hit REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_answers_signature ON answers(signature);
+            CREATE INDEX IF NOT EXISTS idx_answers_expires ON answers(expires_at);
+            """
+        )
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    # --- Lookup & Store ---
+    def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached answer for a question, or None.
+
+        Returns:
+            Optional[Dict[str, Any]]: {"events": [...], "thread_id": str, "final_answer": str|None,
+            "similarity": float, "data_class": str}.
+        """
+        self._count("lookups")
+        tokens = normalize_query(query)
+        if not tokens or VOLATILE_TERMS.intersection(tokens):
+            return None
+        normalized = " ".join(tokens)
+        now = time.time()
+        rows = self._connect().execute(
+            "SELECT query_key, normalized, embedding, payload, data_class FROM answers "
+            "WHERE signature = ? AND expires_at > ?",
+            (query_signature(tokens), now),
+        ).fetchall()
+        if not rows:
+            return None
+        embedding = embed_query(tokens)
+        best, best_similarity = None, -1.0
+        for row in rows:
+            if row[1] == normalized:
+                best, best_similarity = row, 1.0
+                break
+            stored = array("f")
+            stored.frombytes(row[2])
+            similarity = cosine_similarity(embedding, stored)
+            if similarity > best_similarity:
+                best, best_similarity = row, similarity
+        if best is None or best_similarity < self.similarity_threshold:
+            return None
+        self._connect().execute("UPDATE answers SET last_hit = ? WHERE query_key = ?", (now, best[0]))
+        self._count("hits")
+        entry = json.loads(zlib.decompress(best[3]))
+        entry.update({"similarity": round(best_similarity, 4), "data_class": best[4]})
+        logger.info(f"Answer cache hit ({best_similarity:.3f}, {best[4]}) for '{query[:60]}' ~ '{best[1][:60]}'")
+        return entry
+
+    def store(
+        self,
+        query: str,
+        events: List[str],
+        thread_id: str,
+        tool_calls: Iterable[Dict[str, Any]] = (),
+        final_answer: Optional[str] = None,
+    ) -> bool:
+        """
+        Stores a completed run's SSE events; returns False if its data is too volatile to reuse or any
+        of its tool calls failed (marked `"status": "error"`), so a transient failure is not replayed.
+        """
+        tokens = normalize_query(query)
+        tool_calls = list(tool_calls)
+        data_class = answer_data_class(tokens, tool_calls)
+        ttl = ttl_for(data_class)
+        failed = any(call.get("status") == "error" for call in tool_calls)
+        if not tokens or not events or failed or ttl < self.min_ttl_seconds:
+            self._count("skipped")
+            return False
+        normalized = " ".join(tokens)
+        payload = zlib.compress(json.dumps(
+            {"events": events, "thread_id": thread_id, "final_answer": final_answer}
+        ).encode("utf-8"))
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO answers "
+            "(query_key, signature, normalized, embedding, payload, data_class, created_at, expires_at, last_hit) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                hashlib.sha256(normalized.encode("utf-8")).hexdigest(), query_signature(tokens), normalized,
+                embed_query(tokens).tobytes(), payload, data_class.value, now, now + ttl, now,
+            ),
+        )
+        self._count("stores")
+        with self._stats_lock:
+            self._stores += 1
+            evict_now = self._stores % EVICT_EVERY_N_STORES == 0
+        if evict_now:
+            self.evict()
+        return True
+
+    def evict(self) -> int:
+        """Deletes expired entries and the least recently hit entries beyond `max_entries`."""
+        conn = self._connect()
+        removed = conn.execute("DELETE FROM answers WHERE expires_at <= ?", (time.time(),)).rowcount
+        removed += conn.execute(
+            "DELETE FROM answers WHERE query_key IN ("
+            "SELECT query_key FROM answers ORDER BY last_hit DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        return removed
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM answers")
+
+    def info(self) -> Dict[str, Any]:
+        rows = self._connect().execute(
+            "SELECT data_class, COUNT(*) FROM answers WHERE expires_at > ? GROUP BY data_class", (time.time(),)
+        ).fetchall()
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 4) if stats["lookups"] else 0.0
+        return {"enabled": True, "entries": dict(rows), **stats}
+
+
+_answer_cache: Optional[SemanticAnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """Returns the process-wide answer cache, opening it on first use. None if disabled or unavailable."""
+    global _answer_cache
+    if not settings.ANSWER_CACHE_ENABLED:
+        return None
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                try:
+                    _answer_cache = SemanticAnswerCache(get_cache_file_path(settings.ANSWER_CACHE_DB_FILE))
+                    logger.info(f"Answer cache opened at {_answer_cache.db_path}")
+                except Exception as e:
+                    logger.error(f"Failed to open answer cache: {e}", exc_info=True)
+                    return None
+    return _answer_cache
+
+
+def answer_cache_info() -> Dict[str, Any]:
+    """Entry counts per freshness class and lookup/hit/store counters."""
+    cache = get_answer_cache()
+    return cache.info() if cache is not None else {"enabled": False}
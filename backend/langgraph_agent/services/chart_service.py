@@ -0,0 +1,409 @@
+"""
+Chart rendering service.
+Following Single Responsibility Principle (SRP).
+
+`create_data_visualization` used to draw through pyplot's global state and
+write every PNG to a fresh temp file. `ChartService` instead:
+
+- keys each chart by a fingerprint of the data it plots plus its spec, so a
+  repeated chart (same table, same columns, same type) is served from the
+  content-addressed artifact store under backend/cache/visualizations without
+  rendering;
+- renders misses on a small background thread pool with matplotlib's
+  object-oriented Figure API (one Figure per render, no pyplot), coalescing
+  identical concurrent requests;
+- can emit a Vega-Lite JSON spec instead of an image, for the frontend to draw;
+- evicts the least recently used artifacts once the store exceeds its byte budget.
+
+Artifacts are served by routes/charts.py; figures left open by agent-written
+matplotlib code are stored the same way (`store_figure`).
+"""
+
+import io
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from config import settings
+from utils.path_utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+RENDERER_VERSION = 1  # Bump when drawing code changes, so cached artifacts are not reused
+CHART_TYPES = ("line", "bar", "scatter", "histogram", "box", "heatmap", "pie")
+OUTPUT_FORMATS = {"png": ".png", "svg": ".svg", "vega": ".vl.json"}  # Output format -> artifact extension
+MEDIA_TYPES = {".png": "image/png", ".svg": "image/svg+xml", ".vl.json": "application/json"}
+KEY_LENGTH = 24
+FIGURE_SIZE = (10, 6)
+VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+
+
+class ChartSpecError(ValueError):
+    """The chart spec does not fit the data (missing columns, unsupported type)."""
+
+
+def chart_spec(
+    chart_type: str,
+    x_column: Optional[str] = None,
+    y_column: Optional[str] = None,
+    title: Optional[str] = None,
+    output_format: str = "png",
+) -> Dict[str, Any]:
+    """Normalized chart spec; raises ChartSpecError for unsupported types and formats."""
+    chart_type = (chart_type or "").strip().lower()
+    output_format = (output_format or "png").strip().lower()
+    if chart_type not in CHART_TYPES:
+        raise ChartSpecError(f"Unsupported chart type '{chart_type}'")
+    if output_format not in OUTPUT_FORMATS:
+        raise ChartSpecError(f"Unsupported output format '{output_format}' (use one of {', '.join(OUTPUT_FORMATS)})")
+    if chart_type == "scatter" and not (x_column and y_column):
+        raise ChartSpecError("Scatter plot requires x_column and y_column")
+    if chart_type == "pie" and not y_column:
+        raise ChartSpecError("Pie chart requires y_column")
+    return {
+        "chart_type": chart_type,
+        "x": x_column or None,
+        "y": y_column or None,
+        "title": title or f"{chart_type.title()} Chart",
+        "format": output_format,
+    }
+
+
+def plotted_frame(df: pd.DataFrame, spec: Dict[str, Any]) -> pd.DataFrame:
+    """The columns of `df` the chart draws; charts are keyed and rendered from this frame only."""
+    chart_type, x, y = spec["chart_type"], spec["x"], spec["y"]
+    missing = [c for c in (x, y) if c and c not in df.columns]
+    if missing:
+        raise ChartSpecError(f"Column(s) not found: {', '.join(missing)}. Available: {', '.join(map(str, df.columns))}")
+    if chart_type in ("line", "bar", "scatter") and x and y:
+        return df[[x, y]] if x != y else df[[x]]
+    if chart_type in ("histogram", "box", "pie") and y:
+        return df[[y]]
+    numeric = df.select_dtypes(include=[np.number])
+    if numeric.empty:
+        raise ChartSpecError(f"No numeric columns to plot; pass x_column/y_column (available: {', '.join(map(str, df.columns))})")
+    return numeric
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a table: column names, dtypes, index and values."""
+    digest = hashlib.sha256()
+    digest.update("\x1f".join(f"{c}:{t}" for c, t in df.dtypes.astype(str).items()).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def chart_key(df: pd.DataFrame, spec: Dict[str, Any]) -> str:
+    """Content address of a chart: fingerprint of its plotted frame plus the spec and renderer settings."""
+    payload = {
+        "v": RENDERER_VERSION,
+        "data": data_fingerprint(df),
+        "spec": spec,
+        "dpi": settings.CHART_DPI if spec["format"] == "png" else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:KEY_LENGTH]
+
+
+# --- Drawing ---
+def draw_chart(df: pd.DataFrame, spec: Dict[str, Any]) -> Any:
+    """Draws a plotted frame on a new Figure (object-oriented API, safe to call from any thread)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg  # Imported on first render, not at API startup
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=FIGURE_SIZE)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    chart_type, x, y = spec["chart_type"], spec["x"], spec["y"]
+    numeric = df.select_dtypes(include=[np.number])
+
+    if chart_type == "line":
+        if x and y:
+            ax.plot(df[x], df[y])
+        else:
+            for column in numeric.columns:
+                ax.plot(numeric.index, numeric[column], label=str(column))
+            ax.legend()
+    elif chart_type == "bar":
+        if x and y:
+            ax.bar(df[x].astype(str), df[y])
+            ax.tick_params(axis="x", labelrotation=45)
+        else:
+            df.plot(kind="bar", ax=ax)
+    elif chart_type == "scatter":
+        ax.scatter(df[x], df[y])
+    elif chart_type == "histogram":
+        if y:
+            ax.hist(df[y].dropna(), bins=30)
+            ax.set_ylabel("Frequency")
+        else:
+            for column in numeric.columns:
+                ax.hist(numeric[column].dropna(), bins=30, alpha=0.5, label=str(column))
+            ax.legend()
+    elif chart_type == "box":
+        if y:
+            ax.boxplot(df[y].dropna())
+        else:
+            ax.boxplot([numeric[c].dropna() for c in numeric.columns], labels=[str(c) for c in numeric.columns])
+    elif chart_type == "heatmap":
+        import seaborn as sns
+        sns.heatmap(numeric.corr(), annot=True, cmap="coolwarm", ax=ax)
+    elif chart_type == "pie":
+        counts = df[y].value_counts()
+        ax.pie(counts.values, labels=[str(v) for v in counts.index], autopct="%1.1f%%")
+
+    if x and y and chart_type in ("line", "bar", "scatter"):
+        ax.set_xlabel(x)
+    if y and chart_type in ("line", "bar", "scatter", "box"):
+        ax.set_ylabel(y)
+    elif y and chart_type == "histogram":
+        ax.set_xlabel(y)
+    ax.set_title(spec["title"])
+    return fig
+
+
+def figure_bytes(fig: Any, output_format: str = "png") -> bytes:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=output_format, dpi=settings.CHART_DPI, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def vega_lite_spec(df: pd.DataFrame, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Vega-Lite spec for a plotted frame, with its rows inlined (capped at settings.CHART_SPEC_MAX_ROWS)."""
+    data = df.head(settings.CHART_SPEC_MAX_ROWS)
+    chart_type, x, y = spec["chart_type"], spec["x"], spec["y"]
+
+    def field(name: str, series: pd.Series) -> Dict[str, Any]:
+        kind = "quantitative" if pd.api.types.is_numeric_dtype(series) else (
+            "temporal" if pd.api.types.is_datetime64_any_dtype(series) else "nominal")
+        return {"field": str(name), "type": kind}
+
+    transform: List[Dict[str, Any]] = []
+    if chart_type == "heatmap":
+        corr = data.corr().stack().reset_index()
+        corr.columns = ["row", "column", "correlation"]
+        data = corr
+        mark = "rect"
+        encoding = {"x": {"field": "column", "type": "nominal"}, "y": {"field": "row", "type": "nominal"},
+                    "color": {"field": "correlation", "type": "quantitative", "scale": {"scheme": "redblue", "domain": [-1, 1]}}}
+    elif chart_type == "pie":
+        mark = "arc"
+        encoding = {"theta": {"aggregate": "count", "type": "quantitative"}, "color": field(y, data[y])}
+    elif chart_type == "histogram":
+        column = y or str(data.columns[0])
+        mark = "bar"
+        encoding = {"x": {"field": column, "bin": {"maxbins": 30}, "type": "quantitative"},
+                    "y": {"aggregate": "count", "type": "quantitative"}}
+    elif chart_type == "box":
+        if y:
+            mark, encoding = "boxplot", {"y": field(y, data[y])}
+        else:
+            transform = [{"fold": [str(c) for c in data.columns], "as": ["column", "value"]}]
+            mark, encoding = "boxplot", {"x": {"field": "column", "type": "nominal"}, "y": {"field": "value", "type": "quantitative"}}
+    elif x and y:
+        mark = {"line": "line", "bar": "bar", "scatter": "point"}[chart_type]
+        encoding = {"x": field(x, data[x]), "y": field(y, data[y])}
+    else:  # line/bar of every column against the row position
+        data = data.reset_index(drop=True).rename_axis("row").reset_index()
+        columns = [str(c) for c in data.columns if c != "row"]
+        transform = [{"fold": columns, "as": ["column", "value"]}]
+        mark = "line" if chart_type == "line" else "bar"
+        encoding = {"x": {"field": "row", "type": "ordinal"}, "y": {"field": "value", "type": "quantitative"},
+                    "color": {"field": "column", "type": "nominal"}}
+
+    records = json.loads(data.to_json(orient="records", date_format="iso"))
+    result = {"$schema": VEGA_LITE_SCHEMA, "title": spec["title"], "data": {"values": records}, "mark": mark, "encoding": encoding}
+    if transform:
+        result["transform"] = transform
+    return result
+
+
+# --- Artifact Store ---
+class ChartArtifactStore:
+    """
+    Content-addressed chart files in one directory, evicted least-recently-used by total size.
+
+    Several processes (API workers, code sandbox workers) may share the directory: writes are
+    atomic renames, and eviction rescans the directory rather than trusting this process's tally.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = directory or get_cache_dir(settings.CHART_CACHE_DIR)
+        self.max_bytes = max_bytes or settings.CHART_CACHE_MAX_BYTES
+        self._lock = threading.Lock()
+        self._bytes = sum(size for _, size, _ in self._scan())
+        self.evicted = 0
+
+    def path(self, key: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{key}{extension}")
+
+    def get(self, key: str, extension: str) -> Optional[str]:
+        """Path of a stored artifact (its recency is refreshed), or None."""
+        path = self.path(key, extension)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key: str, extension: str, data: bytes) -> str:
+        path = self.path(key, extension)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self._lock:
+            self._bytes += len(data)
+            if self._bytes > self.max_bytes:
+                self._evict()
+        return path
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        """Removes the least recently used files until the store is within 90% of its budget."""
+        entries = sorted(self._scan(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.evicted += 1
+            except OSError:
+                pass
+        self._bytes = total
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"bytes": self._bytes, "max_bytes": self.max_bytes, "evicted": self.evicted}
+
+
+# --- Service ---
+class ChartService:
+    """
+    Renders charts into the artifact store, reusing any chart already rendered for the same data and spec.
+
+    Args:
+        store (Optional[ChartArtifactStore]): Artifact store; defaults to backend/cache/<settings.CHART_CACHE_DIR>.
+        workers (Optional[int]): Render threads; defaults to settings.CHART_RENDER_WORKERS.
+    """
+
+    def __init__(self, store: Optional[ChartArtifactStore] = None, workers: Optional[int] = None):
+        self.store = store or ChartArtifactStore()
+        self._pool = ThreadPoolExecutor(max_workers=workers or settings.CHART_RENDER_WORKERS, thread_name_prefix="chart-render")
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "renders": 0, "coalesced": 0, "errors": 0, "figures_stored": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    @staticmethod
+    def url(path: str) -> str:
+        return f"{settings.CHART_URL_PREFIX}/{os.path.basename(path)}"
+
+    def _artifact(self, key: str, path: str, spec: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+        return {"key": key, "format": spec["format"], "path": path, "url": self.url(path), "cached": cached}
+
+    def _render(self, key: str, df: pd.DataFrame, spec: Dict[str, Any]) -> str:
+        extension = OUTPUT_FORMATS[spec["format"]]
+        if spec["format"] == "vega":
+            data = json.dumps(vega_lite_spec(df, spec), separators=(",", ":"), default=str).encode("utf-8")
+        else:
+            data = figure_bytes(draw_chart(df, spec), spec["format"])
+        return self.store.put(key, extension, data)
+
+    def submit(self, df: pd.DataFrame, spec: Dict[str, Any]) -> Tuple[str, "Future[str]", bool]:
+        """Starts (or joins) the render of a chart; returns its key, a future for its path, and whether it was cached."""
+        data = plotted_frame(df, spec)
+        key = chart_key(data, spec)
+        path = self.store.get(key, OUTPUT_FORMATS[spec["format"]])
+        if path is not None:
+            self._count("hits")
+            future: Future = Future()
+            future.set_result(path)
+            return key, future, True
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                return key, future, False
+            future = self._pool.submit(self._render, key, data.copy(), spec)
+            self._inflight[key] = future
+            self._stats["renders"] += 1
+        future.add_done_callback(lambda _: self._forget(key))
+        return key, future, False
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def render(self, df: pd.DataFrame, spec: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Renders (or reuses) a chart of `df` and waits for it.
+
+        Returns:
+            Dict[str, Any]: key, format, path, url and whether the artifact came from the cache.
+                Raises ChartSpecError if the spec does not fit the data.
+        """
+        key, future, cached = self.submit(df, spec)
+        try:
+            path = future.result(timeout=timeout or settings.CHART_RENDER_TIMEOUT_SECONDS)
+        except Exception:
+            self._count("errors")
+            raise
+        return self._artifact(key, path, spec, cached)
+
+    def store_figure(self, fig: Any, output_format: str = "png") -> Dict[str, Any]:
+        """Stores an already drawn figure (e.g. one left open by agent code), addressed by its rendered bytes."""
+        data = figure_bytes(fig, output_format)
+        key = hashlib.sha256(data).hexdigest()[:KEY_LENGTH]
+        extension = OUTPUT_FORMATS[output_format]
+        path = self.store.get(key, extension) or self.store.put(key, extension, data)
+        self._count("figures_stored")
+        return {"key": key, "format": output_format, "path": path, "url": self.url(path), "cached": False}
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._inflight)
+        return {**stats, "store": self.store.info()}
+
+
+_chart_service: Optional[ChartService] = None
+_chart_service_lock = threading.Lock()
+
+
+def get_chart_service() -> ChartService:
+    """Returns the process-wide chart service."""
+    global _chart_service
+    if _chart_service is None:
+        with _chart_service_lock:
+            if _chart_service is None:
+                _chart_service = ChartService()
+    return _chart_service
+
+
+def chart_service_info() -> Dict[str, Any]:
+    """Cache hits, renders and artifact store usage of this process's chart service."""
+    return _chart_service.info() if _chart_service is not None else {"started": False}
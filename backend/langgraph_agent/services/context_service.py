@@ -0,0 +1,325 @@
+"""
+Context window service implementation.
+Following Single Responsibility Principle (SRP).
+
+`AgentState.messages` accumulates every turn of a thread, and each agent hop
+used to send all of it to the LLM. `ContextWindowManager.fit` builds the
+prompt for one hop within a token budget, leaving the stored history intact:
+
+1. Leading system messages and the current turn (the last human message and
+   everything after it) are always kept.
+2. Earlier turns are kept newest first while they fit, with their tool
+   results clipped (stale tool output is the bulk of old turns).
+3. Turns that don't fit are replaced by one summary message: a short recap
+   of each evicted turn plus pinned facts (player/team IDs and names, seasons,
+   game IDs) gathered from tool calls and results. Summaries are cached per
+   evicted prefix, so later hops and turns of the thread reuse them.
+4. If the current turn alone is over budget, its older tool results are clipped.
+
+Token counts are estimates (characters / CHARS_PER_TOKEN); when the LLM
+response reports real usage, that is recorded alongside.
+"""
+
+import re
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4        # Role/formatting tokens per message
+SUMMARY_QUESTION_CHARS = 200       # Per evicted turn: the user's question...
+SUMMARY_ANSWER_CHARS = 400         # ...and the start of the final answer
+MAX_PINNED_FACTS = 40
+PINNED_KEYS = (
+    "player_id", "player_name", "team_id", "team_name", "team_identifier", "team_abbreviation",
+    "season", "season_type", "game_id",
+)
+_PINNED_VALUE_RE = re.compile(
+    r'"(' + "|".join(PINNED_KEYS) + r')"\s*:\s*("(?:[^"\\]|\\.){1,80}"|-?\d{1,12})',
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(message: BaseMessage) -> int:
+    """Rough token count of a message: content, tool call arguments and a fixed overhead."""
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content, default=str)
+    chars = len(content)
+    for tool_call in getattr(message, "tool_calls", None) or ():
+        chars += len(tool_call.get("name") or "") + len(json.dumps(tool_call.get("args") or {}, default=str))
+    return chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit].rstrip() + "…"
+
+
+def _clip_tool_message(message: ToolMessage, max_tokens: int) -> ToolMessage:
+    """Returns a copy of a tool result cut to about `max_tokens`; the tool call pairing is preserved."""
+    content = _text(message)
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(content) <= limit:
+        return message
+    clipped = f"{content[:limit]}\n[... {len(content) - limit} more characters of earlier tool output omitted]"
+    return message.model_copy(update={"content": clipped})
+
+
+def extract_pinned_facts(messages: Sequence[BaseMessage]) -> Dict[str, List[str]]:
+    """Collects identifiers worth keeping after their turns are evicted: tool call arguments and result fields."""
+    facts: "OrderedDict[str, OrderedDict[str, None]]" = OrderedDict()
+    count = 0
+
+    def add(key: str, value: Any) -> None:
+        nonlocal count
+        text = str(value).strip()
+        if not text or count >= MAX_PINNED_FACTS:
+            return
+        values = facts.setdefault(key.lower(), OrderedDict())
+        if text not in values:
+            values[text] = None
+            count += 1
+
+    for message in messages:
+        if isinstance(message, AIMessage):
+            for tool_call in message.tool_calls or ():
+                for key, value in (tool_call.get("args") or {}).items():
+                    if key.lower() in PINNED_KEYS and isinstance(value, (str, int)) and value not in ("", 0):
+                        add(key, value)
+        elif isinstance(message, ToolMessage):
+            for key, raw in _PINNED_VALUE_RE.findall(_text(message)[:20000]):  # Identifiers lead tool results
+                try:
+                    value = json.loads(raw)
+                except ValueError:
+                    continue
+                if value not in ("", 0, None):
+                    add(key, value)
+    return {key: list(values) for key, values in facts.items()}
+
+
+def _split_turns(history: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+    """Groups messages into turns, each starting at a human message."""
+    turns: List[List[BaseMessage]] = []
+    for message in history:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def _turn_recap(turn: Sequence[BaseMessage]) -> str:
+    question = next((_text(m) for m in turn if isinstance(m, HumanMessage)), "")
+    answers = [m for m in turn if isinstance(m, AIMessage) and _text(m).strip()]
+    tools = sorted({m.name for m in turn if isinstance(m, ToolMessage) and m.name})
+    line = f"- User asked: {_shorten(question, SUMMARY_QUESTION_CHARS)}"
+    if tools:
+        line += f" | Tools used: {', '.join(tools)}"
+    if answers:
+        line += f" | Answer: {_shorten(_text(answers[-1]), SUMMARY_ANSWER_CHARS)}"
+    return line
+
+
+def _prefix_key(thread_id: str, evicted: Sequence[BaseMessage]) -> str:
+    """Identifies an evicted prefix: stable message IDs where present, content otherwise."""
+    digest = hashlib.sha1(thread_id.encode("utf-8"))
+    for message in evicted:
+        digest.update((message.id or _text(message)[:200]).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ContextWindowManager:
+    """
+    Fits each agent hop's prompt into a token budget by clipping stale tool results and
+    summarizing old turns, without touching the thread's stored history.
+
+    Args:
+        max_tokens (Optional[int]): Prompt budget per hop.
+        summarizer (Optional[Callable]): Turns evicted messages into summary text; defaults to an
+            extractive recap (no LLM call).
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        summarizer: Optional[Callable[[Sequence[BaseMessage]], str]] = None,
+    ):
+        self.max_tokens = max_tokens or settings.AGENT_CONTEXT_MAX_TOKENS
+        self.summarizer = summarizer
+        self._summaries: "OrderedDict[str, SystemMessage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fit(self, state: Dict[str, Any], messages: List[BaseMessage], agent_name: str = "") -> List[BaseMessage]:
+        """Returns the messages to send for this hop, within the token budget."""
+        tokens_before = sum(map(estimate_tokens, messages))
+        if not settings.AGENT_CONTEXT_MANAGEMENT_ENABLED or tokens_before <= self.max_tokens:
+            _record(agent_name, tokens_before, tokens_before, 0, False)
+            return messages
+
+        leading = 0
+        while leading < len(messages) and isinstance(messages[leading], SystemMessage):
+            leading += 1
+        system, history = list(messages[:leading]), list(messages[leading:])
+        last_human = max((i for i, m in enumerate(history) if isinstance(m, HumanMessage)), default=0)
+        earlier, current = history[:last_human], history[last_human:]
+
+        budget = self.max_tokens - sum(map(estimate_tokens, system)) - settings.AGENT_CONTEXT_SUMMARY_MAX_TOKENS
+        current = self._fit_current_turn(current, budget)
+        budget -= sum(map(estimate_tokens, current))
+
+        kept: List[BaseMessage] = []
+        turns = _split_turns(earlier)
+        evicted_turns = len(turns)
+        for turn in reversed(turns):
+            clipped = [
+                _clip_tool_message(m, settings.AGENT_CONTEXT_STALE_TOOL_RESULT_TOKENS) if isinstance(m, ToolMessage) else m
+                for m in turn
+            ]
+            cost = sum(map(estimate_tokens, clipped))
+            if cost > budget:
+                break
+            kept = clipped + kept
+            budget -= cost
+            evicted_turns -= 1
+
+        evicted = [m for turn in turns[:evicted_turns] for m in turn]
+        summary, cached = (self._summary_for(state, evicted) if evicted else (None, False))
+        fitted = system + ([summary] if summary is not None else []) + kept + current
+        tokens_after = sum(map(estimate_tokens, fitted))
+        _record(agent_name, tokens_before, tokens_after, len(evicted), cached)
+        logger.info(
+            f"Context window for {agent_name or 'agent'}: ~{tokens_before} -> ~{tokens_after} tokens "
+            f"({evicted_turns} earlier turns summarized, {len(kept)} earlier messages kept)"
+        )
+        return fitted
+
+    def _fit_current_turn(self, current: List[BaseMessage], budget: int) -> List[BaseMessage]:
+        """Clips the current turn's tool results, oldest first, until it fits."""
+        total = sum(map(estimate_tokens, current))
+        if total <= budget:
+            return current
+        fitted = list(current)
+        for position in [i for i, m in enumerate(fitted) if isinstance(m, ToolMessage)]:
+            before = estimate_tokens(fitted[position])
+            fitted[position] = _clip_tool_message(fitted[position], settings.AGENT_CONTEXT_STALE_TOOL_RESULT_TOKENS)
+            total -= before - estimate_tokens(fitted[position])
+            if total <= budget:
+                break
+        return fitted
+
+    def _summary_for(self, state: Dict[str, Any], evicted: List[BaseMessage]) -> Tuple[SystemMessage, bool]:
+        key = _prefix_key(str(state.get("thread_id") or ""), evicted)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is not None:
+                self._summaries.move_to_end(key)
+                return summary, True
+        summary = SystemMessage(content=self._render_summary(evicted))
+        with self._lock:
+            self._summaries[key] = summary
+            while len(self._summaries) > settings.AGENT_CONTEXT_SUMMARY_CACHE_SIZE:
+                self._summaries.popitem(last=False)
+        return summary, False
+
+    def _render_summary(self, evicted: List[BaseMessage]) -> str:
+        budget_chars = settings.AGENT_CONTEXT_SUMMARY_MAX_TOKENS * CHARS_PER_TOKEN
+        facts = extract_pinned_facts(evicted)
+        fact_lines = [f"- {key}: {', '.join(values)}" for key, values in facts.items()]
+        if self.summarizer is not None:
+            try:
+                recap = [_shorten(self.summarizer(evicted), budget_chars)]
+            except Exception as e:
+                logger.warning(f"Conversation summarizer failed, using extractive recap: {e}")
+                recap = [_turn_recap(turn) for turn in _split_turns(evicted)]
+        else:
+            recap = [_turn_recap(turn) for turn in _split_turns(evicted)]
+
+        header = "Summary of earlier conversation turns (older messages omitted to save context):"
+        used = len(header) + sum(len(line) + 1 for line in fact_lines)
+        lines: List[str] = []
+        for line in reversed(recap):  # Newest turns are most relevant; drop the oldest first
+            if used + len(line) + 1 > budget_chars:
+                lines.insert(0, f"- ({len(recap) - len(lines)} older turns omitted)")
+                break
+            lines.insert(0, line)
+            used += len(line) + 1
+        parts = [header, *lines]
+        if fact_lines:
+            parts += ["Pinned facts from those turns (resolved identifiers; reuse instead of searching again):", *fact_lines]
+        return "\n".join(parts)
+
+
+# --- Metrics ---
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def _record(agent_name: str, tokens_before: int, tokens_after: int, evicted_messages: int, summary_cached: bool) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(agent_name or "unknown", {
+            "hops": 0, "prompt_tokens": 0, "prompt_tokens_before": 0, "max_prompt_tokens": 0,
+            "trimmed_hops": 0, "evicted_messages": 0, "summary_cache_hits": 0,
+            "reported_input_tokens": 0, "reported_hops": 0,
+        })
+        stats["hops"] += 1
+        stats["prompt_tokens"] += tokens_after
+        stats["prompt_tokens_before"] += tokens_before
+        stats["max_prompt_tokens"] = max(stats["max_prompt_tokens"], tokens_after)
+        stats["trimmed_hops"] += int(tokens_after < tokens_before)
+        stats["evicted_messages"] += evicted_messages
+        stats["summary_cache_hits"] += int(summary_cached)
+
+
+def record_llm_usage(agent_name: str, llm_response: Any) -> None:
+    """Records the input tokens the LLM reported for a hop, when its response carries usage metadata."""
+    usage = getattr(llm_response, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens") if isinstance(usage, dict) else None
+    if not input_tokens:
+        return
+    with _stats_lock:
+        stats = _stats.get(agent_name or "unknown")
+        if stats is not None:
+            stats["reported_input_tokens"] += input_tokens
+            stats["reported_hops"] += 1
+
+
+def context_window_info() -> Dict[str, Any]:
+    """Per-agent prompt size metrics: average estimated prompt tokens per hop before/after fitting, evictions."""
+    with _stats_lock:
+        agents = {}
+        for agent, stats in _stats.items():
+            hops = stats["hops"] or 1
+            agents[agent] = {
+                "hops": int(stats["hops"]),
+                "avg_prompt_tokens": round(stats["prompt_tokens"] / hops, 1),
+                "avg_prompt_tokens_untrimmed": round(stats["prompt_tokens_before"] / hops, 1),
+                "max_prompt_tokens": int(stats["max_prompt_tokens"]),
+                "trimmed_hops": int(stats["trimmed_hops"]),
+                "evicted_messages": int(stats["evicted_messages"]),
+                "summary_cache_hits": int(stats["summary_cache_hits"]),
+                "avg_reported_input_tokens": (
+                    round(stats["reported_input_tokens"] / stats["reported_hops"], 1) if stats["reported_hops"] else None
+                ),
+            }
+    return {
+        "enabled": settings.AGENT_CONTEXT_MANAGEMENT_ENABLED,
+        "max_tokens_per_hop": settings.AGENT_CONTEXT_MAX_TOKENS,
+        "agents": agents,
+    }
@@ -3,11 +3,21 @@ Stream service implementation.
 Following Single Responsibility Principle (SRP).
 """
 
+import re
 import json
+import time
+import zlib
+import asyncio
 import logging
-from typing import Dict, Any, Optional, AsyncGenerator
+import threading
+from typing import Dict, Any, List, Optional, AsyncGenerator, AsyncIterator
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+from config import settings
 from langgraph_agent.interfaces import IStreamWriter, IEventStreamProcessor
 from langgraph_agent.state import AgentState
+from langgraph_agent.services.answer_cache_service import SemanticAnswerCache
+from langgraph_agent.services.tool_output_service import HANDLE_PREFIX
+from utils.cache import is_error_response
 
 # Import get_stream_writer with fallback
 try:
@@ -16,8 +26,24 @@ except ImportError:
     def get_stream_writer():
         return lambda data: None
 
+# Brotli is optional; without it, streams are gzip-compressed (or sent as is)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 logger = logging.getLogger(__name__)
 
+PROTOCOLS = ("v1", "v2")  # v1: full message contents; v2: token deltas and truncated tool results
+_HANDLE_RE = re.compile(rf"\b{HANDLE_PREFIX}[0-9a-f]{{10}}\b")
+
+
+def _is_failed_tool_result(message: ToolMessage) -> bool:
+    """True for a tool result that reports an error, by its status or an error payload."""
+    if getattr(message, "status", None) == "error":
+        return True
+    return isinstance(message.content, str) and is_error_response(message.content)
+
 
 class StreamWriterService(IStreamWriter):
     """Service for writing stream data."""
@@ -34,18 +60,34 @@ class StreamWriterService(IStreamWriter):
 class EventStreamProcessor(IEventStreamProcessor):
     """Service for processing event streams from LangGraph."""
     
-    def __init__(self, langgraph_app, memory_manager):
+    def __init__(self, langgraph_app, memory_manager, answer_cache: Optional[SemanticAnswerCache] = None):
         """Initialize the event stream processor."""
         self.langgraph_app = langgraph_app
         self.memory_manager = memory_manager
+        self.answer_cache = answer_cache
         
     async def process_events(
         self, 
         input_query: str, 
         thread_id: Optional[str] = None, 
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        protocol: str = "v1",
     ) -> AsyncGenerator[str, None]:
-        """Process events and yield SSE formatted strings."""
+        """
+        Process events and yield SSE formatted strings.
+
+        With protocol "v2", LLM text is streamed as `token` events while it is generated, and
+        `message` events carry only what the tokens did not (see `_compact_message`).
+        """
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"Unknown stream protocol '{protocol}'; expected one of {PROTOCOLS}")
+        deltas = _MessageDeltas() if protocol == "v2" else None
+        _record_stream(protocol)
+        # Only first turns are answered from/stored in the cache: follow-ups depend on the thread's history
+        answer_cache = self.answer_cache if not thread_id else None
+        recorded: List[str] = []
+        tool_calls: List[Dict[str, Any]] = []
+        final_answer: Optional[str] = None
         try:
             # Generate thread_id if not provided (new conversation)
             if not thread_id:
@@ -53,21 +95,44 @@ class EventStreamProcessor(IEventStreamProcessor):
             
             # Create configuration for this conversation thread
             config = self.memory_manager.create_thread_config(thread_id, user_id)
+
+            if answer_cache is not None:
+                cached = await asyncio.to_thread(answer_cache.lookup, input_query)
+                if cached is not None:
+                    async for event in self._replay_cached_answer(cached, input_query, thread_id, config):
+                        yield event
+                    return
             
             # Prepare inputs - only need the new query, memory handles the rest
-            inputs = {"input_query": input_query}
+            inputs = {"input_query": input_query, "thread_id": thread_id}
 
             # Use streaming modes that work reliably
+            stream_modes = ["updates", "custom"]
+            if deltas is not None and settings.SSE_TOKEN_STREAMING_ENABLED:
+                stream_modes.append("messages")
             async for stream_mode, event_chunk in self.langgraph_app.astream(
                 inputs,
                 config=config,
-                stream_mode=["updates", "custom"]
+                stream_mode=stream_modes
             ):
-                if stream_mode == "updates":
-                    async for event in self._process_updates(event_chunk, thread_id):
+                if stream_mode == "messages":
+                    event = self._process_token(*event_chunk, deltas)
+                    if event is not None:
+                        yield event
+                elif stream_mode == "updates":
+                    final_answer = self._collect_answer_facts(event_chunk, tool_calls) or final_answer
+                    # The cache replays to either protocol, so it always records full (v1) events
+                    if deltas is None or answer_cache is not None:
+                        events = [event async for event in self._process_updates(event_chunk, thread_id)]
+                        recorded.extend(events)
+                    if deltas is not None:
+                        events = [event async for event in self._process_updates(event_chunk, thread_id, deltas)]
+                    for event in events:
                         yield event
                 elif stream_mode == "custom":
-                    yield self._format_sse_event("custom_data", event_chunk)
+                    event = self._format_sse_event("custom_data", event_chunk)
+                    recorded.append(event)
+                    yield event
                     
         except Exception as e:
             logger.error(f"Error in event stream processor: {e}", exc_info=True)
@@ -78,11 +143,85 @@ class EventStreamProcessor(IEventStreamProcessor):
         
         # Send final graph_end event for successful completion
         logger.info("Agent event stream processing finished successfully.")
-        yield self._format_sse_event("graph_end", {})
+        graph_end = self._format_sse_event("graph_end", {})
+        yield graph_end
+        if answer_cache is not None:
+            try:
+                await asyncio.to_thread(
+                    answer_cache.store, input_query, recorded + [graph_end], thread_id, tool_calls, final_answer
+                )
+            except Exception as e:
+                logger.warning(f"Failed to store answer in the answer cache: {e}", exc_info=True)
         logger.info("Agent event stream generator fully terminated.")
+
+    async def _replay_cached_answer(
+        self, cached: Dict[str, Any], input_query: str, thread_id: str, config: Dict[str, Any]
+    ) -> AsyncGenerator[str, None]:
+        """Replays a cached run's events under the new thread, seeded so follow-up questions have context."""
+        final_answer = cached.get("final_answer")
+        if final_answer and hasattr(self.langgraph_app, "aupdate_state"):
+            try:
+                await self.langgraph_app.aupdate_state(
+                    config,
+                    {
+                        "input_query": input_query,
+                        "thread_id": thread_id,
+                        "messages": [HumanMessage(content=input_query), AIMessage(content=final_answer)],
+                        "final_answer": final_answer,
+                        "should_call_tool": False,
+                    },
+                    as_node="presentation_agent",
+                )
+            except Exception as e:
+                logger.warning(f"Failed to seed thread {thread_id} with a cached answer: {e}", exc_info=True)
+        original_thread_id = cached.get("thread_id")
+        for event in cached["events"]:
+            if original_thread_id and event.startswith("event: node_update"):
+                event = event.replace(json.dumps(original_thread_id), json.dumps(thread_id))
+            yield event
+
+    def _collect_answer_facts(self, event_chunk: Dict[str, Any], tool_calls: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Records a node update's tool calls (for the answer's freshness) and whether their results
+        failed, and returns its answer text, if any.
+        """
+        node_output = list(event_chunk.values())[0] if event_chunk else None
+        if not isinstance(node_output, dict) or not node_output.get("messages"):
+            return None
+        for message in node_output["messages"]:
+            if getattr(message, "type", None) == "tool" and _is_failed_tool_result(message):
+                call = next((c for c in tool_calls if c.get("id") == message.tool_call_id), None)
+                if call is None:
+                    call = {"name": message.name, "args": {}, "id": message.tool_call_id}
+                    tool_calls.append(call)
+                call["status"] = "error"
+        last_msg_obj = node_output["messages"][-1]
+        if getattr(last_msg_obj, "type", None) != "ai":
+            return None
+        if getattr(last_msg_obj, "tool_calls", None):
+            tool_calls.extend(
+                {"name": tc.get("name"), "args": tc.get("args"), "id": tc.get("id")} for tc in last_msg_obj.tool_calls
+            )
+            return None
+        return last_msg_obj.content if isinstance(last_msg_obj.content, str) and last_msg_obj.content else None
     
-    async def _process_updates(self, event_chunk: Dict[str, Any], thread_id: str) -> AsyncGenerator[str, None]:
-        """Process update events."""
+    def _process_token(self, chunk, metadata: Dict[str, Any], deltas: "_MessageDeltas") -> Optional[str]:
+        """Formats a chunk of an agent's LLM output as a `token` event (v2), remembering the text sent."""
+        node_name = metadata.get("langgraph_node")
+        if not isinstance(chunk, AIMessageChunk) or node_name not in settings.SSE_TOKEN_NODES:
+            return None
+        text = chunk.content if isinstance(chunk.content, str) else "".join(
+            part.get("text", "") for part in chunk.content if isinstance(part, dict)
+        )
+        if not text:
+            return None
+        deltas.add(chunk.id, node_name, text)
+        return self._format_sse_event("token", {"id": chunk.id, "node": node_name, "delta": text})
+
+    async def _process_updates(
+        self, event_chunk: Dict[str, Any], thread_id: str, deltas: Optional["_MessageDeltas"] = None
+    ) -> AsyncGenerator[str, None]:
+        """Process update events (compacted for the v2 protocol when `deltas` is given)."""
         node_name, node_output_state_dict = list(event_chunk.items())[0]
 
         # 1. Node Update Event (include thread_id for first event)
@@ -97,6 +236,8 @@ class EventStreamProcessor(IEventStreamProcessor):
         if messages:
             last_msg_obj = messages[-1]
             msg_data_payload = self._process_message(last_msg_obj)
+            if deltas is not None:
+                msg_data_payload = self._compact_message(msg_data_payload, last_msg_obj, node_name, deltas)
             yield self._format_sse_event("message", msg_data_payload)
 
         # 3. Process streaming_output from state (for intermediate thoughts/logs)
@@ -142,7 +283,212 @@ class EventStreamProcessor(IEventStreamProcessor):
                 msg_data_payload["tool_call_id"] = message_obj.tool_call_id
         
         return msg_data_payload
+
+    def _compact_message(
+        self, payload: Dict[str, Any], message_obj, node_name: str, deltas: "_MessageDeltas"
+    ) -> Dict[str, Any]:
+        """
+        Drops what a v2 client already has or does not need from a message payload: AI text that
+        was streamed as tokens becomes {"id", "streamed": true, "delta": <unstreamed tail>}, and
+        tool results are cut to a preview with their length and any stored-table handles.
+        """
+        content = payload.get("content")
+        if not isinstance(content, str):
+            return payload
+        if payload["type"] in ("ai", "tool_call"):
+            message_id, streamed = deltas.pop(getattr(message_obj, "id", None), node_name)
+            if streamed and content.startswith(streamed):
+                payload.pop("content")
+                payload.update(id=message_id, streamed=True)
+                if len(content) > len(streamed):
+                    payload["delta"] = content[len(streamed):]
+        elif payload["type"] == "tool_result" and len(content) > settings.SSE_TOOL_RESULT_PREVIEW_CHARS:
+            payload.update(
+                content=content[:settings.SSE_TOOL_RESULT_PREVIEW_CHARS],
+                truncated=True,
+                content_length=len(content),
+            )
+            handles = list(dict.fromkeys(_HANDLE_RE.findall(content)))
+            if handles:
+                payload["handles"] = handles
+        return payload
     
     def _format_sse_event(self, event_type: str, data: Dict[str, Any]) -> str:
         """Format data as SSE event."""
-        return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
\ No newline at end of file
+        return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+class _MessageDeltas:
+    """The AI text a v2 stream has already sent as tokens, by message id (and by node, as a fallback)."""
+
+    def __init__(self):
+        self._text: Dict[str, List[str]] = {}
+        self._last_by_node: Dict[str, str] = {}
+
+    def add(self, message_id: Optional[str], node_name: str, text: str) -> None:
+        message_id = message_id or f"{node_name}:stream"
+        self._text.setdefault(message_id, []).append(text)
+        self._last_by_node[node_name] = message_id
+
+    def pop(self, message_id: Optional[str], node_name: str):
+        """Returns (message id, text streamed for it) for a completed message, forgetting it."""
+        if message_id not in self._text:
+            message_id = self._last_by_node.get(node_name)
+        if message_id is None or message_id not in self._text:
+            return None, ""
+        if self._last_by_node.get(node_name) == message_id:
+            del self._last_by_node[node_name]
+        return message_id, "".join(self._text.pop(message_id))
+
+
+_END = object()
+
+
+async def coalesce_events(
+    events: AsyncIterator[str], window_seconds: Optional[float] = None, max_bytes: Optional[int] = None
+) -> AsyncGenerator[str, None]:
+    """
+    Joins events that arrive within `window_seconds` of the first one in a batch into a single
+    chunk (one write and, when compressed, one flush), flushing early at `max_bytes`. The source
+    is consumed by a background task, so a slow event never delays a batch past its window;
+    closing or cancelling this generator cancels that task and closes the source.
+    """
+    window_seconds = settings.SSE_FLUSH_WINDOW_MS / 1000 if window_seconds is None else window_seconds
+    max_bytes = max_bytes or settings.SSE_FLUSH_MAX_BYTES
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        try:
+            async for event in events:
+                queue.put_nowait(event)
+        finally:
+            queue.put_nowait(_END)
+
+    producer = asyncio.ensure_future(pump())
+    getter: Optional[asyncio.Future] = None
+    try:
+        finished = False
+        while not finished:
+            item = await (getter if getter is not None else queue.get())
+            getter = None
+            if item is _END:
+                break
+            batch, size = [item], len(item)
+            deadline = time.monotonic() + window_seconds
+            while size < max_bytes:
+                if queue.empty():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    getter = getter or asyncio.ensure_future(queue.get())
+                    await asyncio.wait({getter}, timeout=remaining)
+                    if not getter.done():
+                        break  # Left pending: it holds the first event of the next batch
+                    item, getter = getter.result(), None
+                else:
+                    item = queue.get_nowait()
+                if item is _END:
+                    finished = True
+                    break
+                batch.append(item)
+                size += len(item)
+            _record_batch(len(batch))
+            yield "".join(batch)
+        await producer  # Re-raises an error from the source
+    finally:
+        for task in (getter, producer):
+            if task is not None and not task.done():
+                task.cancel()
+        await asyncio.gather(*(t for t in (getter, producer) if t is not None), return_exceptions=True)
+        await events.aclose()
+
+
+class SSEEncoder:
+    """
+    Per-connection compression of an SSE stream. Each chunk is compressed with a sync flush, so
+    the client can decode every event as soon as it arrives, while the compressor's window spans
+    the whole connection (repeated keys and field names cost a few bytes after the first event).
+    """
+
+    def __init__(self, encoding: Optional[str] = None):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=settings.SSE_BROTLI_QUALITY)
+        elif encoding == "gzip":
+            self._compressor = zlib.compressobj(settings.SSE_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        else:
+            self._compressor = None
+
+    @staticmethod
+    def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+        """Picks the first of SSE_COMPRESSION_ENCODINGS the client accepts (q > 0), or None."""
+        accepted: Dict[str, float] = {}
+        for part in (accept_encoding or "").split(","):
+            name, _, params = part.strip().partition(";")
+            quality = 1.0
+            match = re.search(r"q=([0-9.]+)", params)
+            if match:
+                try:
+                    quality = float(match.group(1))
+                except ValueError:
+                    quality = 0.0
+            if name:
+                accepted[name.strip().lower()] = quality
+        for encoding in settings.SSE_COMPRESSION_ENCODINGS:
+            if encoding == "br" and brotli is None:
+                continue
+            if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                return encoding
+        return None
+
+    def encode(self, chunk: str) -> bytes:
+        data = chunk.encode("utf-8")
+        if self._compressor is None:
+            out = data
+        elif self.encoding == "br":
+            out = self._compressor.process(data) + self._compressor.flush()
+        else:
+            out = self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        _record_bytes(len(data), len(out))
+        return out
+
+    def close(self) -> bytes:
+        """The compressed stream's trailer (empty when uncompressed)."""
+        if self._compressor is None:
+            return b""
+        out = self._compressor.finish() if self.encoding == "br" else self._compressor.flush()
+        _record_bytes(0, len(out))
+        return out
+
+
+_stats_lock = threading.Lock()
+_stats = {"streams": {p: 0 for p in PROTOCOLS}, "events": 0, "batches": 0, "bytes": 0, "bytes_sent": 0}
+
+
+def _record_stream(protocol: str) -> None:
+    with _stats_lock:
+        _stats["streams"][protocol] += 1
+
+
+def _record_batch(events: int) -> None:
+    with _stats_lock:
+        _stats["events"] += events
+        _stats["batches"] += 1
+
+
+def _record_bytes(raw: int, sent: int) -> None:
+    with _stats_lock:
+        _stats["bytes"] += raw
+        _stats["bytes_sent"] += sent
+
+
+def sse_stream_info() -> Dict[str, Any]:
+    """Streams per protocol, events per written batch, and bytes before/after compression."""
+    with _stats_lock:
+        stats = {**_stats, "streams": dict(_stats["streams"])}
+    return {
+        **stats,
+        "events_per_batch": round(stats["events"] / stats["batches"], 2) if stats["batches"] else 0.0,
+        "compression_ratio": round(stats["bytes"] / stats["bytes_sent"], 2) if stats["bytes_sent"] else 0.0,
+        "brotli_available": brotli is not None,
+    }
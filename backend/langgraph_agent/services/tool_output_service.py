@@ -0,0 +1,254 @@
+"""
+Tool output condensation service.
+Following Single Responsibility Principle (SRP).
+
+League-wide tools return every row of `_process_dataframe` output as JSON, and
+that ToolMessage is re-sent to the LLM on every later hop and turn of the
+thread. `ToolOutputCondenser.condense_message` runs as the tool executor's
+message processor (langgraph_agent/tool_executor.py): each large table in a
+tool result is stored server-side under a handle (loadable as a DataFrame by
+the Python REPL tools), and the LLM sees its schema, row count, first rows and
+summary statistics instead.
+"""
+
+import json
+import math
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from langchain_core.messages import ToolMessage
+
+from config import settings
+from utils.cache import MemoryTier, get_persistent_store
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+HANDLE_PREFIX = "res_"
+HANDLE_ENDPOINT = "tool_result_handle"  # PersistentStore endpoint for stored tables
+ID_COLUMN_SUFFIXES = ("_ID", "ID")      # Identifier columns get no summary statistics
+TABLE_ROW_KEYS = ("rowSet", "data", "rows")  # {"headers": [...], <key>: [[...], ...]} tables
+STAT_DECIMALS = 3
+DESCRIBE_FIELDS = {"mean": "mean", "min": "min", "50%": "median", "max": "max"}  # describe() row -> summary key
+
+
+class ToolResultStore:
+    """
+    Stores full tool-result tables under short, content-addressed handles.
+
+    Tables live in a byte-bounded in-memory tier and in the shared persistent response
+    store (when enabled), so a handle created on one worker resolves on any other.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, memory_max_bytes: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or settings.TOOL_RESULT_HANDLE_TTL_SECONDS
+        self._memory = MemoryTier(maxsize=0, max_bytes=memory_max_bytes or settings.TOOL_RESULT_MEMORY_MAX_BYTES)
+
+    @staticmethod
+    def make_handle(df: pd.DataFrame) -> str:
+        """Deterministic handle for a table: identical results share one handle."""
+        digest = hashlib.sha256()
+        digest.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df.astype(str), index=False).values.tobytes())
+        return f"{HANDLE_PREFIX}{digest.hexdigest()[:10]}"
+
+    def put(self, df: pd.DataFrame) -> str:
+        handle = self.make_handle(df)
+        self._memory.set(handle, df, self.ttl_seconds)
+        store = get_persistent_store()
+        if store is not None:
+            store.set(f"{HANDLE_ENDPOINT}:{handle}", HANDLE_ENDPOINT, df, self.ttl_seconds)
+        return handle
+
+    def remember(self, handle: str, df: pd.DataFrame) -> None:
+        """Caches a table received from another process under its existing handle (memory tier only)."""
+        self._memory.set(handle, df, self.ttl_seconds)
+
+    def get(self, handle: str) -> Optional[pd.DataFrame]:
+        """Returns the table stored under `handle`, or None if unknown or expired."""
+        df = self._memory.get(handle)
+        if isinstance(df, pd.DataFrame):
+            return df
+        store = get_persistent_store()
+        if store is None:
+            return None
+        df = store.get(f"{HANDLE_ENDPOINT}:{handle}")
+        if not isinstance(df, pd.DataFrame):
+            return None
+        self._memory.set(handle, df, self.ttl_seconds)
+        return df
+
+    def info(self) -> Dict[str, int]:
+        return self._memory.info()
+
+
+_result_store: Optional[ToolResultStore] = None
+_result_store_lock = threading.Lock()
+
+
+def get_tool_result_store() -> ToolResultStore:
+    """Returns the process-wide tool result store."""
+    global _result_store
+    if _result_store is None:
+        with _result_store_lock:
+            if _result_store is None:
+                _result_store = ToolResultStore()
+    return _result_store
+
+
+def load_tool_result(handle: str) -> pd.DataFrame:
+    """Loads the full table behind a condensed tool result's handle (e.g. 'res_3f9a1c2b7d')."""
+    df = get_tool_result_store().get(str(handle).strip())
+    if df is None:
+        raise KeyError(f"Tool result '{handle}' not found or expired; call the data tool again.")
+    return df.copy()
+
+
+def _as_table(value: Any) -> Optional[pd.DataFrame]:
+    """Returns a DataFrame if `value` is a list of row dicts or a headers/rows table, else None."""
+    if isinstance(value, list) and value and all(isinstance(row, dict) for row in value):
+        return pd.DataFrame.from_records(value)
+    if isinstance(value, dict) and isinstance(value.get("headers"), list):
+        for key in TABLE_ROW_KEYS:
+            rows = value.get(key)
+            if isinstance(rows, list) and rows and all(isinstance(row, list) for row in rows):
+                headers = value["headers"]
+                if all(len(row) == len(headers) for row in rows):
+                    return pd.DataFrame(rows, columns=[str(h) for h in headers])
+    return None
+
+
+def _json_scalar(value: Any) -> Any:
+    if hasattr(value, "item"):  # numpy scalar
+        value = value.item()
+    if isinstance(value, float):
+        return None if math.isnan(value) else round(value, STAT_DECIMALS)
+    return value
+
+
+def summarize_table(df: pd.DataFrame, handle: str, preview_rows: int, max_stat_columns: int) -> Dict[str, Any]:
+    """Schema, row count, leading rows and per-column statistics for one stored table."""
+    columns = {str(column): str(dtype) for column, dtype in df.dtypes.items()}
+    stats: Dict[str, Dict[str, Any]] = {}
+    numeric = [
+        column for column in df.select_dtypes(include="number").columns
+        if not str(column).upper().endswith(ID_COLUMN_SUFFIXES)
+    ][:max_stat_columns]
+    if numeric:
+        described = df[numeric].describe().T
+        for column, row in described.iterrows():
+            stats[str(column)] = {
+                name: _json_scalar(row[key]) for key, name in DESCRIBE_FIELDS.items() if key in row
+            }
+    for column in df.select_dtypes(exclude="number").columns[:max_stat_columns]:
+        try:
+            stats[str(column)] = {"unique": int(df[column].nunique(dropna=True))}
+        except TypeError:  # Unhashable cells (nested lists/dicts)
+            continue
+    preview = [
+        {str(key): _json_scalar(value) for key, value in row.items()}
+        for row in df.head(preview_rows).to_dict(orient="records")
+    ]
+    return {
+        "condensed": True,
+        "handle": handle,
+        "row_count": len(df),
+        "columns": columns,
+        "first_rows": preview,
+        "column_stats": stats,
+        "note": (
+            f"Showing {len(preview)} of {len(df)} rows. The full table is stored server-side: "
+            f"in python_code_execution use `df = load_result('{handle}')` (or the variable `{handle}`)."
+        ),
+    }
+
+
+class ToolOutputCondenser:
+    """Replaces large tables inside JSON tool results with stored handles and summaries."""
+
+    def __init__(self, store: Optional[ToolResultStore] = None):
+        self._store = store
+
+    @property
+    def store(self) -> ToolResultStore:
+        return self._store or get_tool_result_store()
+
+    def condense_content(self, content: str) -> Tuple[str, List[str]]:
+        """Returns (content for the LLM, handles created). Content is unchanged if nothing qualifies."""
+        if not settings.TOOL_OUTPUT_CONDENSE_ENABLED or len(content) < settings.TOOL_OUTPUT_CONDENSE_MIN_CHARS:
+            return content, []
+        try:
+            payload = json.loads(content)
+        except (TypeError, ValueError):
+            return content, []
+        handles: List[str] = []
+        condensed = self._condense_value(payload, handles)
+        if not handles:
+            return content, []
+        text = json.dumps(condensed, separators=(",", ":"), default=str)
+        return (text, handles) if len(text) < len(content) else (content, [])
+
+    def _condense_value(self, value: Any, handles: List[str]) -> Any:
+        table = _as_table(value)
+        if table is not None and len(table) > settings.TOOL_OUTPUT_CONDENSE_MIN_ROWS:
+            handle = self.store.put(table)
+            handles.append(handle)
+            return summarize_table(
+                table, handle, settings.TOOL_OUTPUT_PREVIEW_ROWS, settings.TOOL_OUTPUT_MAX_STAT_COLUMNS
+            )
+        if isinstance(value, dict):
+            return {key: self._condense_value(item, handles) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._condense_value(item, handles) for item in value]
+        return value
+
+    def condense_message(self, message: Any) -> Any:
+        """Returns a condensed copy of a ToolMessage; anything else is returned as is."""
+        if not isinstance(message, ToolMessage) or not isinstance(message.content, str):
+            return message
+        try:
+            content, handles = self.condense_content(message.content)
+        except Exception as e:
+            logger.warning(f"Tool output condensation failed for '{message.name}': {e}", exc_info=True)
+            return message
+        _record(message.name, len(message.content), len(content))
+        if not handles:
+            return message
+        logger.info(
+            f"Condensed '{message.name}' output from {len(message.content)} to {len(content)} chars "
+            f"(handles: {', '.join(handles)})"
+        )
+        return message.model_copy(update={"content": content})
+
+
+# --- Metrics ---
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _record(tool_name: Optional[str], original_chars: int, sent_chars: int) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(tool_name or "unknown", {"calls": 0, "condensed": 0, "chars_in": 0, "chars_out": 0})
+        stats["calls"] += 1
+        stats["condensed"] += int(sent_chars < original_chars)
+        stats["chars_in"] += original_chars
+        stats["chars_out"] += sent_chars
+
+
+def tool_output_info() -> Dict[str, Any]:
+    """Per-tool condensation metrics: calls, condensed calls, characters returned vs sent to the LLM."""
+    with _stats_lock:
+        tools = {name: dict(stats) for name, stats in _stats.items()}
+    chars_in = sum(stats["chars_in"] for stats in tools.values())
+    chars_out = sum(stats["chars_out"] for stats in tools.values())
+    return {
+        "enabled": settings.TOOL_OUTPUT_CONDENSE_ENABLED,
+        "chars_in": chars_in,
+        "chars_out": chars_out,
+        "reduction": round(1 - chars_out / chars_in, 4) if chars_in else 0.0,
+        "tools": tools,
+        "store": get_tool_result_store().info(),
+    }
@@ -0,0 +1,274 @@
+"""
+Parallel tool execution node for the LangGraph agents.
+
+When the LLM emits several tool calls in one turn (two players' career stats
+plus a boxscore), `ToolExecutor` runs them concurrently:
+
+- Tools with an async runner (the NBA API tools, see api_tools/async_http.py)
+  are awaited; the rest run on a bounded, shared thread pool instead of the
+  event loop's default executor.
+- Each call has a deadline (a default plus per-tool overrides from settings).
+  A call that misses it is cancelled and answered with an error ToolMessage;
+  synchronous nba_api requests beneath it see the same deadline through
+  utils/deadline.py, so they stop retrying and waiting on sockets.
+- If the run is cancelled (the SSE client disconnected), every pending call is
+  cancelled with it.
+- Each result is post-processed (condensed, see services/tool_output_service.py)
+  and streamed as a custom event as soon as it completes, before the whole
+  batch is returned to the agents in tool-call order.
+"""
+import time
+import asyncio
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.tools import BaseTool, StructuredTool, Tool
+
+from config import settings
+from langgraph_agent.services.stream_service import StreamWriterService
+from langgraph_agent.tool_registry import LazyTool
+from utils import deadline
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+TOOL_CALL_ERROR_TEMPLATE = "Error: {error}\n Please fix your mistakes."  # Same wording as LangGraph's ToolNode
+STREAM_EVENT_TYPE = "tool_result"
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """Shared worker pool for synchronous tools."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.TOOL_EXECUTION_MAX_WORKERS, thread_name_prefix="agent-tool"
+                )
+    return _pool
+
+
+def parse_tool_timeouts(spec: str) -> Dict[str, float]:
+    """Parses "tool_name:seconds,..." into a dict; malformed entries are skipped with a warning."""
+    timeouts: Dict[str, float] = {}
+    for entry in (spec or "").split(","):
+        if not entry.strip():
+            continue
+        name, _, seconds = entry.strip().rpartition(":")
+        try:
+            timeouts[name.strip()] = float(seconds)
+        except ValueError:
+            logger.warning(f"Ignoring malformed tool timeout entry '{entry}'")
+    return timeouts
+
+
+def _is_sync_only(tool: BaseTool) -> bool:
+    """True if `tool.ainvoke` would just run the sync body in an executor thread."""
+    return isinstance(tool, (StructuredTool, Tool)) and getattr(tool, "coroutine", None) is None
+
+
+class ToolExecutor:
+    """
+    Runs the tool calls of the latest AIMessage concurrently, with per-call deadlines.
+
+    Args:
+        tools (Sequence[BaseTool]): Tools callable by name.
+        message_processor (Optional[Callable[[ToolMessage], ToolMessage]]): Applied to each result
+            before it is streamed and returned (e.g. `ToolOutputCondenser.condense_message`).
+        timeouts (Optional[Dict[str, float]]): Per-tool deadlines; defaults to settings.TOOL_EXECUTION_TIMEOUTS_STR.
+        default_timeout (Optional[float]): Deadline for other tools; defaults to settings.TOOL_EXECUTION_TIMEOUT_SECONDS.
+        max_concurrency (Optional[int]): Calls of one batch running at once; defaults to settings.TOOL_EXECUTION_MAX_CONCURRENCY.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool],
+        message_processor: Optional[Callable[[ToolMessage], ToolMessage]] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.tools_by_name: Dict[str, BaseTool] = {tool.name: tool for tool in tools}
+        self.message_processor = message_processor
+        self.timeouts = timeouts if timeouts is not None else parse_tool_timeouts(settings.TOOL_EXECUTION_TIMEOUTS_STR)
+        self.default_timeout = default_timeout or settings.TOOL_EXECUTION_TIMEOUT_SECONDS
+        self.max_concurrency = max_concurrency or settings.TOOL_EXECUTION_MAX_CONCURRENCY
+        self._stream_writer = StreamWriterService()
+
+    def timeout_for(self, tool_name: str) -> float:
+        return self.timeouts.get(tool_name, self.default_timeout)
+
+    # --- Helpers ---
+    @staticmethod
+    def _tool_calls(state: Any) -> List[Dict[str, Any]]:
+        messages = state.get("messages", []) if isinstance(state, dict) else state
+        for message in reversed(messages or []):
+            if isinstance(message, AIMessage):
+                return list(message.tool_calls or [])
+        return []
+
+    def _error_message(self, call: Dict[str, Any], error: str) -> ToolMessage:
+        return ToolMessage(
+            content=TOOL_CALL_ERROR_TEMPLATE.format(error=error),
+            name=call.get("name"), tool_call_id=call.get("id") or "", status="error",
+        )
+
+    def _unknown_tool(self, call: Dict[str, Any]) -> ToolMessage:
+        return self._error_message(
+            call, f"{call.get('name')} is not a valid tool, try one of [{', '.join(self.tools_by_name)}]."
+        )
+
+    def _finish(self, call: Dict[str, Any], output: Any) -> ToolMessage:
+        """Normalizes a tool's output to a ToolMessage and applies the message processor."""
+        if not isinstance(output, ToolMessage):
+            output = ToolMessage(content=str(output), name=call.get("name"), tool_call_id=call.get("id") or "")
+        if self.message_processor is not None:
+            output = self.message_processor(output)
+        return output
+
+    def _stream_result(self, message: ToolMessage, status: str, elapsed: float, completed: int, total: int) -> None:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        limit = settings.TOOL_EXECUTION_STREAM_PREVIEW_CHARS
+        self._stream_writer.write({
+            "type": STREAM_EVENT_TYPE,
+            "tool_call_id": message.tool_call_id,
+            "name": message.name,
+            "status": status,
+            "elapsed_ms": int(elapsed * 1000),
+            "content": content[:limit],
+            "truncated": len(content) > limit,
+            "completed": completed,
+            "total": total,
+        })
+
+    def _invoke_sync(self, tool: BaseTool, call: Dict[str, Any], config: Optional[RunnableConfig], seconds: float) -> ToolMessage:
+        with deadline.deadline_scope(seconds):
+            return self._finish(call, tool.invoke({**call, "type": "tool_call"}, config))
+
+    # --- Async Execution ---
+    async def _arun_call(
+        self, call: Dict[str, Any], config: Optional[RunnableConfig], semaphore: asyncio.Semaphore
+    ) -> Tuple[ToolMessage, str, float]:
+        tool = self.tools_by_name.get(call.get("name"))
+        if tool is None:
+            return self._unknown_tool(call), "error", 0.0
+        seconds = self.timeout_for(tool.name)
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                if isinstance(tool, LazyTool):
+                    real = await loop.run_in_executor(_get_pool(), tool.resolve)  # First use imports the toolkit
+                else:
+                    real = tool
+                if _is_sync_only(real):
+                    context = contextvars.copy_context()
+                    work = loop.run_in_executor(_get_pool(), context.run, self._invoke_sync, tool, call, config, seconds)
+                    message = await asyncio.wait_for(work, seconds)
+                else:
+                    with deadline.deadline_scope(seconds):
+                        output = await asyncio.wait_for(tool.ainvoke({**call, "type": "tool_call"}, config), seconds)
+                    message = await loop.run_in_executor(_get_pool(), self._finish, call, output)
+                status = "error" if message.status == "error" else "success"
+            except asyncio.TimeoutError:
+                message, status = self._error_message(
+                    call, f"Tool '{tool.name}' did not finish within {seconds:g}s. Try a narrower request or retry later."
+                ), "timeout"
+            except Exception as e:
+                logger.warning(f"Tool '{tool.name}' failed: {e}", exc_info=True)
+                message, status = self._error_message(call, repr(e)), "error"
+        elapsed = time.perf_counter() - started
+        _record(tool.name, status, elapsed)
+        return message, status, elapsed
+
+    async def arun(self, state: Any, config: Optional[RunnableConfig] = None) -> Dict[str, List[ToolMessage]]:
+        calls = self._tool_calls(state)
+        if not calls:
+            return {"messages": []}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [asyncio.ensure_future(self._arun_call(call, config, semaphore)) for call in calls]
+        index_of = {task: i for i, task in enumerate(tasks)}
+        results: List[Optional[ToolMessage]] = [None] * len(calls)
+        started = time.perf_counter()
+        pending = set(tasks)
+        completed = 0
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    message, status, elapsed = task.result()
+                    results[index_of[task]] = message
+                    completed += 1
+                    self._stream_result(message, status, elapsed, completed, len(calls))
+        except asyncio.CancelledError:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)  # Let each call unwind before re-raising
+            _record_cancelled(len(pending))
+            logger.info(f"Tool batch cancelled with {len(pending)} of {len(calls)} calls pending")
+            raise
+        _record_batch(len(calls), time.perf_counter() - started)
+        return {"messages": results}
+
+    # --- Sync Execution ---
+    def run(self, state: Any, config: Optional[RunnableConfig] = None) -> Dict[str, List[ToolMessage]]:
+        """Sync entry point (graph.invoke): runs the async executor on a private event loop."""
+        return asyncio.run(self.arun(state, config))
+
+    def node(self, name: str = "tools") -> RunnableLambda:
+        """The executor as a graph node."""
+        return RunnableLambda(self.run, afunc=self.arun, name=name)
+
+
+# --- Metrics ---
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+_batches = {"batches": 0, "calls": 0, "max_batch": 0, "wall_seconds": 0.0, "cancelled_calls": 0}
+
+
+def _record(tool_name: str, status: str, seconds: float) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(tool_name, {"calls": 0, "errors": 0, "timeouts": 0, "seconds": 0.0})
+        stats["calls"] += 1
+        stats["errors"] += int(status == "error")
+        stats["timeouts"] += int(status == "timeout")
+        stats["seconds"] += seconds
+
+
+def _record_batch(calls: int, seconds: float) -> None:
+    with _stats_lock:
+        _batches["batches"] += 1
+        _batches["calls"] += calls
+        _batches["max_batch"] = max(_batches["max_batch"], calls)
+        _batches["wall_seconds"] += seconds
+
+
+def _record_cancelled(calls: int) -> None:
+    with _stats_lock:
+        _batches["cancelled_calls"] += calls
+
+
+def tool_execution_info() -> Dict[str, Any]:
+    """Batch counts, summed call time vs batch wall time, and per-tool calls/errors/timeouts/average seconds."""
+    with _stats_lock:
+        tools = {
+            name: {**{k: int(v) for k, v in stats.items() if k != "seconds"},
+                   "avg_seconds": round(stats["seconds"] / stats["calls"], 3) if stats["calls"] else 0.0}
+            for name, stats in _stats.items()
+        }
+        call_seconds = sum(stats["seconds"] for stats in _stats.values())
+        batches = dict(_batches)
+    return {
+        **batches,
+        "wall_seconds": round(batches["wall_seconds"], 3),
+        "call_seconds": round(call_seconds, 3),
+        "tools": tools,
+    }
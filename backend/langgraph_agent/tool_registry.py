@@ -0,0 +1,263 @@
+"""
+Lazy tool registry for the LangGraph agents.
+
+Importing the toolkits loads every api_tools module, every nba_api endpoint
+class, pandas, matplotlib/seaborn and langchain_experimental, which dominates
+backend startup. The agents only need each tool's name, description and JSON
+schema to bind it to the LLM, so the registry serves those from a manifest
+(generated from the real tools and stored in backend/cache) and imports the
+implementing toolkit module the first time one of its tools is invoked.
+
+The manifest is keyed by each toolkit module's source hash plus the settings
+and library versions that shape tool schemas (current season defaults, nba_api,
+langchain-core). A module whose entry is missing or stale is imported eagerly
+and its entry rewritten, so the first start after a change is simply an eager
+start. Build it ahead of time (e.g. in a container image) with:
+
+    python -m langgraph_agent.tool_registry
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import importlib
+import importlib.util
+import threading
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
+from langchain_core.tools import BaseTool, Tool
+from pydantic import BaseModel, PrivateAttr
+
+from config import settings
+from utils.path_utils import get_cache_file_path
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+MANIFEST_VERSION = 1
+SCHEMA_LIBRARIES = ("nba_api", "langchain-core")  # Their versions change generated schemas/defaults
+
+# Category -> (toolkit module, tool attributes in registry order)
+ToolkitSpec = Tuple[str, Sequence[str]]
+
+
+class LazyTool(BaseTool):
+    """
+    Structured tool whose schema comes from the manifest and whose implementation is imported on first use.
+
+    `args_schema` is the real tool's JSON schema, so LLM bindings are identical; calls are forwarded to the
+    real tool, which validates arguments and applies defaults as before.
+    """
+
+    module_name: str
+    attribute: str
+    _loader: Callable[[str, str], BaseTool] = PrivateAttr()
+
+    def __init__(self, loader: Callable[[str, str], BaseTool], **data: Any):
+        super().__init__(**data)
+        self._loader = loader
+
+    def resolve(self) -> BaseTool:
+        return self._loader(self.module_name, self.attribute)
+
+    def _run(self, run_manager: Optional[CallbackManagerForToolRun] = None, **kwargs: Any) -> Any:
+        callbacks = run_manager.get_child() if run_manager else None
+        return self.resolve().invoke(kwargs, {"callbacks": callbacks})
+
+    async def _arun(self, run_manager: Optional[AsyncCallbackManagerForToolRun] = None, **kwargs: Any) -> Any:
+        callbacks = run_manager.get_child() if run_manager else None
+        return await self.resolve().ainvoke(kwargs, {"callbacks": callbacks})
+
+
+def _lazy_func(loader: Callable[[str, str], BaseTool], module_name: str, attribute: str) -> Callable[..., Any]:
+    """`func` of a lazy single-input `Tool`: resolves the real tool and calls its function."""
+    def run(*args: Any, **kwargs: Any) -> Any:
+        return loader(module_name, attribute).func(*args, **kwargs)
+    run.lazy_target = (module_name, attribute)
+    return run
+
+
+def _module_source_hash(module_name: str) -> Optional[str]:
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return None
+    with open(spec.origin, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _environment() -> Dict[str, str]:
+    """Settings and library versions baked into generated schemas (e.g. season defaults)."""
+    env = {"manifest_version": str(MANIFEST_VERSION), "current_season": settings.CURRENT_NBA_SEASON}
+    for library in SCHEMA_LIBRARIES:
+        try:
+            env[library] = metadata.version(library)
+        except metadata.PackageNotFoundError:
+            env[library] = ""
+    return env
+
+
+def describe_tool(tool: BaseTool) -> Dict[str, Any]:
+    """Manifest entry for a real tool: everything needed to bind it without importing it."""
+    entry: Dict[str, Any] = {"name": tool.name, "description": tool.description}
+    schema = tool.args_schema
+    if isinstance(tool, Tool) and schema is None:
+        entry["kind"] = "single_input"
+    else:
+        entry["kind"] = "structured"
+        entry["args_schema"] = schema.model_json_schema() if isinstance(schema, type) and issubclass(schema, BaseModel) else schema
+    return entry
+
+
+class ToolRegistry:
+    """
+    Builds the tool lists of each category, lazily where the manifest allows.
+
+    Args:
+        toolkits (Dict[str, ToolkitSpec]): Category -> (module, tool attributes), in registry order.
+        async_categories (Sequence[str]): Categories whose tools get an `async_variant` coroutine when loaded.
+        manifest_path (Optional[str]): Manifest file; defaults to settings.AGENT_TOOL_MANIFEST_FILE in backend/cache.
+        lazy (Optional[bool]): Defaults to settings.AGENT_LAZY_TOOLS_ENABLED.
+    """
+
+    def __init__(
+        self,
+        toolkits: Dict[str, ToolkitSpec],
+        async_categories: Sequence[str] = (),
+        manifest_path: Optional[str] = None,
+        lazy: Optional[bool] = None,
+    ):
+        self.toolkits = toolkits
+        self.async_modules = {toolkits[category][0] for category in async_categories if category in toolkits}
+        self.manifest_path = manifest_path or get_cache_file_path(settings.AGENT_TOOL_MANIFEST_FILE)
+        self.lazy = settings.AGENT_LAZY_TOOLS_ENABLED if lazy is None else lazy
+        self._lock = threading.RLock()
+        self._resolved: Dict[Tuple[str, str], BaseTool] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._categories: Dict[str, List[BaseTool]] = {}
+        self._build()
+
+    # --- Loading ---
+    def _import(self, module_name: str) -> Any:
+        with self._lock:
+            first = module_name not in self._load_seconds
+            started = time.perf_counter()
+            module = importlib.import_module(module_name)
+            if first:
+                self._load_seconds[module_name] = round(time.perf_counter() - started, 4)
+                logger.info(f"Loaded toolkit {module_name} in {self._load_seconds[module_name]:.3f}s")
+            return module
+
+    def load(self, module_name: str, attribute: str) -> BaseTool:
+        """Returns the real tool, importing its toolkit module on first use."""
+        key = (module_name, attribute)
+        tool = self._resolved.get(key)
+        if tool is not None:
+            return tool
+        with self._lock:
+            tool = self._resolved.get(key)
+            if tool is None:
+                tool = getattr(self._import(module_name), attribute)
+                if module_name in self.async_modules:
+                    self._attach_async_runner(tool)
+                self._resolved[key] = tool
+        return tool
+
+    @staticmethod
+    def _attach_async_runner(tool: BaseTool) -> None:
+        # ToolNode awaits `tool.ainvoke`, which otherwise runs the sync body in a thread-pool worker that
+        # stays blocked for the whole stats.nba.com round trip. NBA API tools await their upstream requests instead.
+        from api_tools.async_http import async_variant
+        if getattr(tool, "coroutine", None) is None and getattr(tool, "func", None) is not None:
+            tool.coroutine = async_variant(tool.func)
+
+    # --- Manifest ---
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable tool manifest {self.manifest_path}: {e}")
+            return {}
+        return manifest if manifest.get("environment") == _environment() else {}
+
+    def _write_manifest(self, modules: Dict[str, Any]) -> None:
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"environment": _environment(), "modules": modules}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.manifest_path)  # Atomic: concurrent workers never read a partial file
+        except OSError as e:
+            logger.warning(f"Could not write tool manifest {self.manifest_path}: {e}")
+
+    def _lazy_tool(self, module_name: str, attribute: str, entry: Dict[str, Any]) -> BaseTool:
+        if entry["kind"] == "single_input":
+            return Tool(
+                name=entry["name"], description=entry["description"],
+                func=_lazy_func(self.load, module_name, attribute),
+            )
+        return LazyTool(
+            self.load, name=entry["name"], description=entry["description"], args_schema=entry["args_schema"],
+            module_name=module_name, attribute=attribute,
+        )
+
+    def _build(self) -> None:
+        manifest = self._read_manifest() if self.lazy else {}
+        modules: Dict[str, Any] = dict(manifest.get("modules", {}))
+        stale: List[str] = []
+        for category, (module_name, attributes) in self.toolkits.items():
+            source_hash = _module_source_hash(module_name)
+            entries = modules.get(module_name, {})
+            if (
+                self.lazy and source_hash is not None and entries.get("source_sha256") == source_hash
+                and all(attribute in entries.get("tools", {}) for attribute in attributes)
+            ):
+                self._categories[category] = [
+                    self._lazy_tool(module_name, attribute, entries["tools"][attribute]) for attribute in attributes
+                ]
+                continue
+            tools = [self.load(module_name, attribute) for attribute in attributes]
+            self._categories[category] = tools
+            if source_hash is not None:
+                stale.append(module_name)
+                module_tools = dict(entries.get("tools", {})) if entries.get("source_sha256") == source_hash else {}
+                module_tools.update({attribute: describe_tool(tool) for attribute, tool in zip(attributes, tools)})
+                modules[module_name] = {"source_sha256": source_hash, "tools": module_tools}
+        if stale and self.lazy:
+            logger.info(f"Tool manifest refreshed for {', '.join(stale)}; later starts load these lazily")
+            self._write_manifest(modules)
+
+    # --- Access ---
+    def category(self, name: str) -> List[BaseTool]:
+        return self._categories[name]
+
+    def info(self) -> Dict[str, Any]:
+        """Tools registered and loaded, and import seconds per loaded toolkit module."""
+        tools = [tool for tools in self._categories.values() for tool in tools]
+        with self._lock:
+            load_seconds = dict(self._load_seconds)
+        return {
+            "lazy": self.lazy,
+            "tools": len(tools),
+            "lazy_tools": sum(isinstance(tool, LazyTool) or hasattr(getattr(tool, "func", None), "lazy_target") for tool in tools),
+            "tools_loaded": len(self._resolved),
+            "modules_loaded": load_seconds,
+        }
+
+
+if __name__ == "__main__":
+    # Writes a complete manifest by importing every toolkit once.
+    from langgraph_agent.tool_manager import TOOLKITS
+    registry = ToolRegistry(TOOLKITS, lazy=False)
+    modules = {}
+    for module_name, attributes in TOOLKITS.values():
+        modules[module_name] = {
+            "source_sha256": _module_source_hash(module_name),
+            "tools": {attribute: describe_tool(registry.load(module_name, attribute)) for attribute in attributes},
+        }
+    registry._write_manifest(modules)
+    print(f"Wrote {sum(len(m['tools']) for m in modules.values())} tools to {registry.manifest_path}")
@@ -0,0 +1,276 @@
+"""
+Query-aware tool routing for the LangGraph agents.
+
+Binding every tool sends the JSON schema of ~120 tools with each Gemini request.
+The router picks a small, relevant subset per turn instead:
+
+1. A keyword classifier maps the query to tool categories (contracts, game,
+   league, ...); team nicknames/cities and full player names from the identity
+   index mark team and player questions.
+2. A TF-IDF index over tool names and descriptions, built once at startup,
+   ranks the tools of those categories and adds the best matches from any
+   category in case the classifier missed.
+3. Each agent adds the tools it always needs (name search for data retrieval,
+   data science tools for analytics/presentation).
+
+Bound LLMs are cached per tool subset, so schemas are converted once per subset.
+Per-agent metrics (tools and schema bytes bound, bytes saved, LLM latency per
+hop) are reported by `tool_routing_info()`.
+"""
+import re
+import json
+import math
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from config import settings
+from langgraph_agent.interfaces import ILLMProvider
+from utils.identity_index import get_identity_index
+from utils.name_search import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+# Category -> query patterns that indicate it. Player and team mentions are also detected from the identity index.
+CATEGORY_KEYWORDS: Dict[str, str] = {
+    "contracts": r"contract|salar|payroll|paid|cap space|luxury tax|earn",
+    "free_agents": r"free agen",
+    "draft_combine": r"combine|wingspan|standing reach|vertical|anthropometr|draft",
+    "fantasy": r"fantasy|fanduel|draftkings|\bdfs\b",
+    "synergy": r"synergy|play ?types?|pick[- ]and[- ]roll|isolation|post[- ]?ups?|spot[- ]?ups?|handoff|cuts?\b",
+    "franchise": r"franchise|all[- ]time .*(team|franchise)|team history|founded",
+    "game": r"\bgames?\b|box ?score|play[- ]by[- ]play|tonight|last night|yesterday|scoreboard|\bscores?\b|win probability|rotation|quarter",
+    "league": r"league|standings|leaders?\b|\brank|playoff|schedule|\bseed|conference|odds|in[- ]season|\bist\b|lineups?",
+    "team": r"\bteams?\b|roster|lineups?|on[- ]off|\bvs\.? |against",
+    "player": r"players?\b|career|season|shoot|shot|clutch|averag|points|rebound|assist|per game|compare|stats|efficien|\bper\b|defen",
+    "exa_search": r"news|latest|injur|rumou?r|trade|article|report|web|internet|who won|mvp",
+    "data_science": r"chart|plot|graph|visuali|calculat|compute|regression|correlat|trend|csv|dataframe|table",
+}
+DEFAULT_CATEGORIES = ("player", "team", "league", "game")  # Searched when the classifier finds nothing
+
+# Agent -> (categories always bound, whether routed tools are added, max routed tools)
+AGENT_PROFILES: Dict[str, Tuple[Tuple[str, ...], bool, Optional[int]]] = {
+    "data_retrieval_agent": (("search",), True, None),  # None: settings.TOOL_ROUTING_MAX_TOOLS
+    "analytics_agent": (("data_science",), True, 4),    # A few fetch tools for data the retrieval step missed
+    "presentation_agent": (("data_science",), False, 0),
+}
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from get how i in is it me of on or show than that the their this to vs was "
+    "were what when which who with his her he she they do does did can could would should about tell give".split()
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_POSSESSIVE_RE = re.compile(r"['’]s\b")  # "Curry's" -> "Curry", so names still match
+
+
+def _tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower().replace("_", " ")):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]  # Light stemming: "rebounds" -> "rebound"
+        tokens.append(token)
+    return tokens
+
+
+def _schema_bytes(tool: Any) -> int:
+    """Size of the JSON schema a tool adds to each request it is bound to."""
+    try:
+        from langchain_core.utils.function_calling import convert_to_openai_tool
+        return len(json.dumps(convert_to_openai_tool(tool)))
+    except Exception:
+        return len(getattr(tool, "description", "") or "") + len(getattr(tool, "name", ""))
+
+
+class RouteSelection(NamedTuple):
+    """Tools chosen for one agent hop."""
+    agent: str
+    tool_names: Tuple[str, ...]
+    categories: Tuple[str, ...]
+    schema_bytes: int
+    full_schema_bytes: int
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def tool_routing_info() -> Dict[str, Any]:
+    """Per-agent routing metrics: hops, average tools/schema bytes bound, bytes saved and LLM latency per hop."""
+    with _stats_lock:
+        agents = {}
+        for agent, stats in _stats.items():
+            hops = stats["hops"] or 1
+            agents[agent] = {
+                "hops": int(stats["hops"]),
+                "avg_tools_bound": round(stats["tools_bound"] / hops, 1),
+                "avg_schema_bytes": int(stats["schema_bytes"] / hops),
+                "schema_bytes_saved": int(stats["schema_bytes_saved"]),
+                "avg_llm_latency_ms": round(stats["llm_seconds"] * 1000 / hops, 1),
+            }
+    return {"enabled": settings.TOOL_ROUTING_ENABLED, "agents": agents}
+
+
+class ToolRouter:
+    """
+    Selects and binds a relevant tool subset per agent hop.
+
+    Args:
+        llm_provider (ILLMProvider): Unbound LLM service; subsets are bound through its `bind_tools`.
+        tool_categories (Dict[str, List[Any]]): Tools by category, in registry order.
+    """
+
+    def __init__(self, llm_provider: ILLMProvider, tool_categories: Dict[str, List[Any]]):
+        self._llm_provider = llm_provider
+        self._tools: Dict[str, Any] = {}
+        self._tool_category: Dict[str, str] = {}
+        self._category_tools: Dict[str, List[str]] = {}
+        for category, tools in tool_categories.items():
+            names = self._category_tools.setdefault(category, [])
+            for tool in tools:
+                if tool.name in self._tools:
+                    continue  # Same tool registered under two categories: keep the first
+                self._tools[tool.name] = tool
+                self._tool_category[tool.name] = category
+                names.append(tool.name)
+        self._registry_order = {name: position for position, name in enumerate(self._tools)}
+        self._schema_bytes = {name: _schema_bytes(tool) for name, tool in self._tools.items()}
+        self._full_schema_bytes = sum(self._schema_bytes.values())
+        self._category_patterns = {category: re.compile(pattern) for category, pattern in CATEGORY_KEYWORDS.items()}
+        self._build_retrieval_index()
+        self._build_entity_vocabulary()
+        self._bound: "OrderedDict[Tuple[str, ...], ILLMProvider]" = OrderedDict()
+        self._bound_lock = threading.Lock()
+        logger.info(
+            f"ToolRouter ready: {len(self._tools)} tools in {len(self._category_tools)} categories, "
+            f"{self._full_schema_bytes} schema bytes when all are bound"
+        )
+
+    # --- Startup indexes ---
+    def _build_retrieval_index(self) -> None:
+        documents = {
+            name: _tokenize(f"{name} {self._tool_category[name]} {getattr(tool, 'description', '') or ''}")
+            for name, tool in self._tools.items()
+        }
+        document_frequency: Counter = Counter()
+        for tokens in documents.values():
+            document_frequency.update(set(tokens))
+        total = len(documents) or 1
+        self._idf = {token: math.log(1 + total / count) for token, count in document_frequency.items()}
+        self._postings: Dict[str, List[Tuple[str, float]]] = {}
+        for name, tokens in documents.items():
+            counts = Counter(tokens)
+            weights = {token: (1 + math.log(count)) * self._idf[token] for token, count in counts.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for token, weight in weights.items():
+                self._postings.setdefault(token, []).append((name, weight / norm))
+
+    def _build_entity_vocabulary(self) -> None:
+        try:
+            index = get_identity_index()
+            self._team_terms = {
+                normalize_name(team.get(field, ""))
+                for team in index.teams
+                for field in ("nickname", "city", "full_name")
+            } - {""}
+            self._player_names = {normalize_name(player.get("full_name", "")) for player in index.players} - {""}
+        except Exception as e:
+            logger.warning(f"ToolRouter could not load player/team names; entity detection disabled: {e}")
+            self._team_terms, self._player_names = set(), set()
+
+    # --- Selection ---
+    def classify(self, query: str) -> Tuple[str, ...]:
+        """Returns the tool categories the query refers to, in registry order."""
+        text = query.lower()
+        matched = {category for category, pattern in self._category_patterns.items() if pattern.search(text)}
+        words = normalize_name(_POSSESSIVE_RE.sub("", query)).split()
+        phrases = {" ".join(words[i:i + n]) for n in (1, 2, 3) for i in range(len(words) - n + 1)}
+        if phrases & self._team_terms:
+            matched.add("team")
+        if phrases & self._player_names:
+            matched.add("player")
+        return tuple(category for category in self._category_tools if category in matched)
+
+    def retrieve(self, query: str) -> Dict[str, float]:
+        """TF-IDF cosine scores of tools against the query (tools without a shared term are omitted)."""
+        query_weights = {token: self._idf[token] for token in set(_tokenize(query)) if token in self._idf}
+        scores: Dict[str, float] = {}
+        for token, query_weight in query_weights.items():
+            for name, weight in self._postings[token]:
+                scores[name] = scores.get(name, 0.0) + query_weight * weight
+        return scores
+
+    def _ranked(self, names: Iterable[str], scores: Dict[str, float]) -> List[str]:
+        return sorted(names, key=lambda name: (-scores.get(name, 0.0), self._registry_order[name]))
+
+    def select(self, query: str, agent: str) -> RouteSelection:
+        """Chooses the tools to bind for one hop of `agent` answering `query`."""
+        if not settings.TOOL_ROUTING_ENABLED or agent not in AGENT_PROFILES:
+            return self._selection(agent, list(self._tools), tuple(self._category_tools))
+
+        always, routed, max_routed = AGENT_PROFILES[agent]
+        chosen: Dict[str, None] = {}
+        for category in always:
+            chosen.update(dict.fromkeys(self._category_tools.get(category, ())))
+
+        categories = self.classify(query) if routed else ()
+        if routed:
+            max_routed = settings.TOOL_ROUTING_MAX_TOOLS if max_routed is None else max_routed
+            scores = self.retrieve(query)
+            pool_categories = tuple(c for c in categories if c not in always) or DEFAULT_CATEGORIES
+            pool = [name for category in pool_categories for name in self._category_tools.get(category, ())]
+            routed_names = [name for name in self._ranked(pool, scores) if name not in chosen][:max_routed]
+            best_anywhere = [name for name in self._ranked(scores, scores) if name not in chosen and name not in routed_names]
+            routed_names += best_anywhere[:settings.TOOL_ROUTING_RETRIEVAL_TOP_K]
+            chosen.update(dict.fromkeys(routed_names))
+        return self._selection(agent, list(chosen), tuple(categories) + always)
+
+    def _selection(self, agent: str, names: List[str], categories: Tuple[str, ...]) -> RouteSelection:
+        names = sorted(names, key=self._registry_order.__getitem__)  # Stable order, so equal subsets share a bound LLM
+        return RouteSelection(
+            agent=agent,
+            tool_names=tuple(names),
+            categories=categories,
+            schema_bytes=sum(self._schema_bytes[name] for name in names),
+            full_schema_bytes=self._full_schema_bytes,
+        )
+
+    # --- Binding and metrics ---
+    def bind(self, selection: RouteSelection) -> ILLMProvider:
+        """Returns the LLM bound to the selected tools, reusing a cached binding for the same subset."""
+        key = selection.tool_names
+        with self._bound_lock:
+            bound = self._bound.get(key)
+            if bound is not None:
+                self._bound.move_to_end(key)
+                return bound
+        bound = self._llm_provider.bind_tools([self._tools[name] for name in key])
+        with self._bound_lock:
+            self._bound[key] = bound
+            while len(self._bound) > settings.TOOL_ROUTING_BOUND_CACHE_SIZE:
+                self._bound.popitem(last=False)
+        return bound
+
+    def route(self, query: str, agent: str) -> Tuple[ILLMProvider, RouteSelection]:
+        """Selects and binds tools for one hop."""
+        selection = self.select(query, agent)
+        logger.info(
+            f"Tool routing for {agent}: {len(selection.tool_names)}/{len(self._tools)} tools "
+            f"({selection.schema_bytes}/{selection.full_schema_bytes} schema bytes), categories={list(selection.categories)}"
+        )
+        return self.bind(selection), selection
+
+    @staticmethod
+    def record_hop(selection: RouteSelection, llm_seconds: float) -> None:
+        """Adds one LLM hop to the agent's routing metrics."""
+        with _stats_lock:
+            stats = _stats.setdefault(selection.agent, {
+                "hops": 0, "tools_bound": 0, "schema_bytes": 0, "schema_bytes_saved": 0, "llm_seconds": 0.0,
+            })
+            stats["hops"] += 1
+            stats["tools_bound"] += len(selection.tool_names)
+            stats["schema_bytes"] += selection.schema_bytes
+            stats["schema_bytes_saved"] += selection.full_schema_bytes - selection.schema_bytes
+            stats["llm_seconds"] += llm_seconds
@@ -3,13 +3,7 @@ Toolkits package for LangGraph Agent.
 Contains specialized tool collections for different domains.
 """
 
-from .data_science_tools import (
-    pandas_dataframe_tool,
-    csv_operations_tool,
-    python_repl_tool,
-    data_visualization_tool,
-    session_variables_tool
-)
+import importlib
 
 __all__ = [
     'pandas_dataframe_tool',
@@ -17,4 +11,12 @@ __all__ = [
     'python_repl_tool',
     'data_visualization_tool',
     'session_variables_tool'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # Data science tools pull in pandas, matplotlib, seaborn and langchain_experimental; import them
+    # only when used so that loading any one toolkit (or the lazy tool registry) stays cheap.
+    if name in __all__:
+        return getattr(importlib.import_module(".data_science_tools", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,15 +1,23 @@
 """
 Data Science Tools for LangGraph Agent.
 Provides pandas, CSV, data manipulation, and Python REPL capabilities.
+
+Each conversation (LangGraph thread) has its own Python session. The tools run
+in the code sandbox's worker processes when it is enabled (see
+langgraph_agent/code_sandbox.py) and in the API process otherwise.
 """
 
 import os
 import io
+import re
 import sys
 import json
-import tempfile
+import shutil
 import traceback
-from typing import Any, Dict, List, Optional, Union
+import threading
+import contextlib
+import contextvars
+from typing import Any, Dict, Iterator, List, Optional, Union
 from pathlib import Path
 
 import pandas as pd
@@ -18,10 +26,15 @@ import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import seaborn as sns
+from langchain_core.runnables import ensure_config
 from langchain_core.tools import Tool
 from langchain_experimental.utilities import PythonREPL
 from pydantic import BaseModel, Field
 
+from langgraph_agent.code_sandbox import get_code_sandbox
+from langgraph_agent.services.chart_service import ChartSpecError, chart_spec, get_chart_service
+from langgraph_agent.services.tool_output_service import HANDLE_PREFIX, load_tool_result
+
 
 class PandasDataFrameInput(BaseModel):
     """Input for pandas DataFrame operations."""
@@ -52,10 +65,65 @@ class DataVisualizationInput(BaseModel):
     y_column: Optional[str] = Field(None, description="Y-axis column")
     title: Optional[str] = Field(None, description="Chart title")
     save_path: Optional[str] = Field(None, description="Path to save chart")
+    output_format: str = Field("png", description="Output: 'png', 'svg', or 'vega' (Vega-Lite JSON spec)")
+
+
+# Python session state per conversation (thread_id -> variables)
+DEFAULT_SESSION_ID = "default"
+_sessions: Dict[str, Dict[str, Any]] = {}
+_session_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("python_session_id", default=None)
+_stdout_lock = threading.Lock()  # In-process execution swaps sys.stdout, so only one call may capture at a time
+
+# Handles of condensed tool results (full tables stored server-side), e.g. "res_3f9a1c2b7d"
+_RESULT_HANDLE_PATTERN = re.compile(rf"\b{HANDLE_PREFIX}[0-9a-f]{{10}}\b")
+
+
+def current_session_id() -> str:
+    """The session of the current call: an explicit `session_scope`, else the LangGraph thread being run."""
+    session_id = _session_id.get()
+    if session_id is None:
+        session_id = ensure_config().get("configurable", {}).get("thread_id")
+    return str(session_id) if session_id else DEFAULT_SESSION_ID
+
+
+@contextlib.contextmanager
+def session_scope(session_id: str) -> Iterator[None]:
+    """Runs the block against the given session (used by the code sandbox workers)."""
+    token = _session_id.set(session_id)
+    try:
+        yield
+    finally:
+        _session_id.reset(token)
+
+
+def _session() -> Dict[str, Any]:
+    return _sessions.setdefault(current_session_id(), {})
 
 
-# Global Python session state for persistence
-_python_session = {}
+def drop_session(session_id: str) -> None:
+    """Forgets a session's variables."""
+    _sessions.pop(session_id, None)
+
+
+def _load_result_handle(name: str) -> Optional[pd.DataFrame]:
+    """Returns the stored table for a condensed tool result handle, or None."""
+    if not _RESULT_HANDLE_PATTERN.fullmatch(name or ""):
+        return None
+    try:
+        return load_tool_result(name)
+    except KeyError:
+        return None
+
+
+def _referenced_result_handles(code: str) -> Dict[str, pd.DataFrame]:
+    """Loads every condensed tool result handle mentioned in `code`, so handles work as variable names."""
+    tables = {}
+    for handle in set(_RESULT_HANDLE_PATTERN.findall(code or "")):
+        if handle not in _session():
+            df = _load_result_handle(handle)
+            if df is not None:
+                tables[handle] = df
+    return tables
 
 
 def create_dataframe_from_data(data: Union[str, Dict, List], df_name: str = "df") -> str:
@@ -77,7 +145,7 @@ def create_dataframe_from_data(data: Union[str, Dict, List], df_name: str = "df"
             return f"Error: Unsupported data type {type(data)}"
         
         # Store in global session
-        _python_session[df_name] = df
+        _session()[df_name] = df
         
         # Return DataFrame info
         buffer = io.StringIO()
@@ -99,12 +167,13 @@ def perform_pandas_operation(operation: str, data: Optional[Union[str, Dict, Lis
             if "Error" in result:
                 return result
         
-        # Check if DataFrame exists in session
-        if df_name not in _python_session:
+        # Check if DataFrame exists in session (or is a condensed tool result handle)
+        df = _session().get(df_name)
+        if df is None:
+            df = _load_result_handle(df_name)
+        if df is None:
             return f"Error: DataFrame '{df_name}' not found. Create it first with data."
         
-        df = _python_session[df_name]
-        
         # Create safe execution environment
         safe_globals = {
             'pd': pd,
@@ -114,15 +183,16 @@ def perform_pandas_operation(operation: str, data: Optional[Union[str, Dict, Lis
             '__builtins__': {}
         }
         
-        # Add all DataFrames from session
-        safe_globals.update(_python_session)
+        # Add all DataFrames from session, and any tool result handles the operation mentions
+        safe_globals.update(_session())
+        safe_globals.update(_referenced_result_handles(operation))
         
         # Execute the operation
         result = eval(operation, safe_globals)
         
         # If result is a DataFrame, store it
         if isinstance(result, pd.DataFrame):
-            _python_session[f"{df_name}_result"] = result
+            _session()[f"{df_name}_result"] = result
             return f"Operation executed successfully!\n\nResult (stored as '{df_name}_result'):\n{result}"
         else:
             return f"Operation executed successfully!\n\nResult:\n{result}"
@@ -137,12 +207,15 @@ def read_csv_file(file_path: str, options: Dict[str, Any] = None) -> str:
         if options is None:
             options = {}
             
-        # Read the CSV file
-        df = pd.read_csv(file_path, **options)
+        # Read the file (api_tools caches DataFrames as Parquet)
+        if file_path.endswith('.parquet'):
+            df = pd.read_parquet(file_path, **options)
+        else:
+            df = pd.read_csv(file_path, **options)
         
         # Store in session with filename as variable name
         var_name = Path(file_path).stem.replace('-', '_').replace(' ', '_')
-        _python_session[var_name] = df
+        _session()[var_name] = df
         
         # Get DataFrame info
         buffer = io.StringIO()
@@ -162,10 +235,10 @@ def write_csv_file(file_path: str, data_source: str, options: Dict[str, Any] = N
             options = {}
             
         # Get DataFrame from session
-        if data_source not in _python_session:
+        if data_source not in _session():
             return f"Error: DataFrame '{data_source}' not found in session."
         
-        df = _python_session[data_source]
+        df = _session()[data_source]
         
         # Write to CSV
         df.to_csv(file_path, **options)
@@ -205,6 +278,19 @@ Sample Data (first 5 rows):
         return f"Error getting CSV info: {str(e)}\nTraceback: {traceback.format_exc()}"
 
 
+def _store_open_figures() -> List[str]:
+    """Stores the figures open in pyplot as chart artifacts and closes them; returns their URLs."""
+    urls = []
+    for number in plt.get_fignums():
+        fig = plt.figure(number)
+        try:
+            if fig.axes:
+                urls.append(get_chart_service().store_figure(fig)["url"])
+        finally:
+            plt.close(fig)
+    return urls
+
+
 def execute_python_code(code: str, save_variables: bool = True) -> str:
     """Execute Python code with access to pandas, numpy, and session variables."""
     try:
@@ -217,31 +303,38 @@ def execute_python_code(code: str, save_variables: bool = True) -> str:
             'os': os,
             'json': json,
             'io': io,
+            'load_result': load_tool_result,
             '__builtins__': __builtins__
         }
         
-        # Add session variables
-        exec_globals.update(_python_session)
-        
-        # Capture output
-        old_stdout = sys.stdout
-        sys.stdout = captured_output = io.StringIO()
+        # Add session variables, and any condensed tool results the code refers to by handle
+        session = _session()
+        exec_globals.update(session)
+        result_tables = _referenced_result_handles(code)
+        exec_globals.update(result_tables)
         
-        try:
-            # Execute the code
-            exec(code, exec_globals)
-            
-            # Save variables back to session if requested
-            if save_variables:
-                for key, value in exec_globals.items():
-                    # Avoid saving built-in modules or internal variables
-                    if not key.startswith('__') and key not in ['pd', 'np', 'plt', 'sns', 'os', 'json', 'io', 'sys', 'tempfile', 'traceback', 'Path']:
-                        # Only save types that are generally useful and serializable/manageable
-                        if isinstance(value, (pd.DataFrame, pd.Series, dict, list, int, float, str, bool, type(None), np.ndarray)):
-                            _python_session[key] = value
+        # Capture output (sys.stdout is process-wide, so concurrent in-process calls take turns)
+        with _stdout_lock:
+            old_stdout = sys.stdout
+            sys.stdout = captured_output = io.StringIO()
             
-        finally:
-            sys.stdout = old_stdout
+            try:
+                # Execute the code
+                exec(code, exec_globals)
+                
+                # Save variables back to session if requested
+                if save_variables:
+                    for key, value in exec_globals.items():
+                        # Avoid saving built-in modules or internal variables
+                        if not key.startswith('__') and key not in result_tables and key not in ['pd', 'np', 'plt', 'sns', 'os', 'json', 'io', 'sys', 'tempfile', 'traceback', 'Path', 'load_result']:
+                            # Only save types that are generally useful and serializable/manageable
+                            if isinstance(value, (pd.DataFrame, pd.Series, dict, list, int, float, str, bool, type(None), np.ndarray)):
+                                session[key] = value
+                
+                # Figures the code left open in pyplot become chart artifacts
+                chart_urls = _store_open_figures()
+            finally:
+                sys.stdout = old_stdout
         
         output = captured_output.getvalue()
         
@@ -257,6 +350,8 @@ def execute_python_code(code: str, save_variables: bool = True) -> str:
             except Exception:
                 output = "Code executed successfully (no explicit output or last expression result)"
         
+        if chart_urls:
+            output += "\n\nCharts:\n" + "\n".join(chart_urls)
         return f"Python code executed successfully!\n\nOutput:\n{output}"
         
     except Exception as e:
@@ -265,89 +360,35 @@ def execute_python_code(code: str, save_variables: bool = True) -> str:
 
 def create_data_visualization(data_source: str, chart_type: str, x_column: Optional[str] = None, 
                             y_column: Optional[str] = None, title: Optional[str] = None, 
-                            save_path: Optional[str] = None) -> str:
-    """Create data visualizations using matplotlib and seaborn."""
+                            save_path: Optional[str] = None, output_format: str = "png") -> str:
+    """Create data visualizations through the chart service (cached by data and chart spec)."""
     try:
         # Get data source
         if data_source.endswith('.csv'):
             df = pd.read_csv(data_source)
-        elif data_source in _python_session:
-            df = _python_session[data_source]
+        elif data_source.endswith('.parquet'):
+            df = pd.read_parquet(data_source)
+        elif data_source in _session():
+            df = _session()[data_source]
         else:
-            return f"Error: Data source '{data_source}' not found."
+            df = _load_result_handle(data_source)
+            if df is None:
+                return f"Error: Data source '{data_source}' not found."
+        if isinstance(df, pd.Series):
+            df = df.to_frame()
         
-        # Create figure
-        plt.figure(figsize=(10, 6))
-        
-        # Create chart based on type
-        if chart_type == 'line':
-            if x_column and y_column:
-                plt.plot(df[x_column], df[y_column])
-                plt.xlabel(x_column)
-                plt.ylabel(y_column)
-            else:
-                df.plot(kind='line')
-                
-        elif chart_type == 'bar':
-            if x_column and y_column:
-                plt.bar(df[x_column], df[y_column])
-                plt.xlabel(x_column)
-                plt.ylabel(y_column)
-            else:
-                df.plot(kind='bar')
-                
-        elif chart_type == 'scatter':
-            if x_column and y_column:
-                plt.scatter(df[x_column], df[y_column])
-                plt.xlabel(x_column)
-                plt.ylabel(y_column)
-            else:
-                return "Error: Scatter plot requires x_column and y_column"
-                
-        elif chart_type == 'histogram':
-            if y_column:
-                plt.hist(df[y_column], bins=30)
-                plt.xlabel(y_column)
-                plt.ylabel('Frequency')
-            else:
-                df.hist(figsize=(12, 8))
-                
-        elif chart_type == 'box':
-            if y_column:
-                plt.boxplot(df[y_column])
-                plt.ylabel(y_column)
-            else:
-                df.boxplot(figsize=(12, 8))
-                
-        elif chart_type == 'heatmap':
-            numeric_df = df.select_dtypes(include=[np.number])
-            sns.heatmap(numeric_df.corr(), annot=True, cmap='coolwarm')
-            
-        elif chart_type == 'pie':
-            if y_column:
-                df[y_column].value_counts().plot(kind='pie')
-            else:
-                return "Error: Pie chart requires y_column"
-        else:
-            return f"Error: Unsupported chart type '{chart_type}'"
-        
-        # Set title
-        if title:
-            plt.title(title)
-        else:
-            plt.title(f"{chart_type.title()} Chart")
+        try:
+            spec = chart_spec(chart_type, x_column, y_column, title, output_format)
+            artifact = get_chart_service().render(df, spec)
+        except ChartSpecError as e:
+            return f"Error: {e}"
         
-        # Save or show
+        # Copy to the requested path, or point at the stored artifact
         if save_path:
-            plt.savefig(save_path, dpi=150, bbox_inches='tight')
-            plt.close()
-            return f"Chart saved to '{save_path}' successfully!"
-        else:
-            # Save to temporary file and return path
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                plt.savefig(tmp.name, dpi=150, bbox_inches='tight')
-                plt.close()
-                return f"Chart created successfully! Saved to: {tmp.name}"
+            shutil.copyfile(artifact["path"], save_path)
+            return f"Chart saved to '{save_path}' successfully! (URL: {artifact['url']})"
+        source = "reused from cache" if artifact["cached"] else "rendered"
+        return f"Chart created successfully ({artifact['format']}, {source})! Saved to: {artifact['path']}\nURL: {artifact['url']}"
                 
     except Exception as e:
         return f"Error creating visualization: {str(e)}\nTraceback: {traceback.format_exc()}"
@@ -355,11 +396,12 @@ def create_data_visualization(data_source: str, chart_type: str, x_column: Optio
 
 def list_session_variables() -> str:
     """List all variables in the current Python session."""
-    if not _python_session:
+    session = _session()
+    if not session:
         return "No variables in session."
     
     result = "Session Variables:\n"
-    for name, value in _python_session.items():
+    for name, value in session.items():
         if isinstance(value, pd.DataFrame):
             result += f"  {name}: DataFrame ({value.shape[0]} rows, {value.shape[1]} columns)\n"
         elif isinstance(value, pd.Series):
@@ -372,6 +414,23 @@ def list_session_variables() -> str:
     return result
 
 
+# Functions that read or write the conversation's session; the code sandbox workers run only these
+SESSION_FUNCTIONS = {
+    fn.__name__: fn for fn in (
+        create_dataframe_from_data, perform_pandas_operation, read_csv_file, write_csv_file, get_csv_info,
+        execute_python_code, create_data_visualization, list_session_variables,
+    )
+}
+
+
+def _run_in_session(function_name: str, **kwargs: Any) -> str:
+    """Runs a session function in this conversation's sandbox worker, or in process when the sandbox is off."""
+    sandbox = get_code_sandbox()
+    if sandbox is None:
+        return SESSION_FUNCTIONS[function_name](**kwargs)
+    return sandbox.call(current_session_id(), function_name, kwargs)
+
+
 # Create LangChain tools
 pandas_dataframe_tool = Tool(
     name="pandas_dataframe_operations",
@@ -386,7 +445,7 @@ pandas_dataframe_tool = Tool(
     - {"operation": "df.head(10)", "df_name": "my_data"}
     - {"operation": "df.groupby('category').sum()", "data": {"category": ["A", "B", "A"], "value": [1, 2, 3]}}
     - {"operation": "df.describe()"}""",
-    func=lambda x: perform_pandas_operation(**json.loads(x) if isinstance(x, str) else x)
+    func=lambda x: _run_in_session("perform_pandas_operation", **json.loads(x) if isinstance(x, str) else x)
 )
 
 csv_operations_tool = Tool(
@@ -404,9 +463,9 @@ csv_operations_tool = Tool(
     - {"file_path": "output.csv", "operation": "write", "data": "my_dataframe"}
     - {"file_path": "large_file.csv", "operation": "info"}""",
     func=lambda x: {
-        'read': lambda p: read_csv_file(p.get('file_path'), p.get('options', {})),
-        'write': lambda p: write_csv_file(p.get('file_path'), p.get('data'), p.get('options', {})),
-        'info': lambda p: get_csv_info(p.get('file_path'))
+        'read': lambda p: _run_in_session("read_csv_file", file_path=p.get('file_path'), options=p.get('options', {})),
+        'write': lambda p: _run_in_session("write_csv_file", file_path=p.get('file_path'), data_source=p.get('data'), options=p.get('options', {})),
+        'info': lambda p: _run_in_session("get_csv_info", file_path=p.get('file_path'))
     }[json.loads(x)['operation'] if isinstance(x, str) else x['operation']](json.loads(x) if isinstance(x, str) else x)
 )
 
@@ -438,11 +497,15 @@ python_repl_tool = Tool(
     - code: Python code to execute
     - save_variables: Whether to save variables in session (default: true)
     
+    Large data tool results are condensed: their full table is available by the result's handle,
+    e.g. `df = load_result('res_3f9a1c2b7d')` (or use the handle directly as a variable name).
+    
     Examples:
     - {"code": "import pandas as pd; df = pd.DataFrame({'A': [1,2,3], 'B': [4,5,6]}); print(df)"}
+    - {"code": "df = load_result('res_3f9a1c2b7d'); print(df.nlargest(10, 'PTS')[['PLAYER_NAME', 'PTS']])"}
     - {"code": "result = df.groupby('category').mean(); print(result)"}
     - {"code": "df.plot(); plt.savefig('chart.png')"}""",
-    func=lambda x: execute_python_code(**_parse_python_code_tool_input(x))
+    func=lambda x: _run_in_session("execute_python_code", **_parse_python_code_tool_input(x))
 )
 
 data_visualization_tool = Tool(
@@ -450,24 +513,25 @@ data_visualization_tool = Tool(
     description="""Create charts and visualizations from DataFrames or CSV files.
     
     Input should be a JSON object with:
-    - data_source: DataFrame variable name or CSV file path
+    - data_source: DataFrame variable name, condensed tool result handle (res_...) or CSV file path
     - chart_type: 'line', 'bar', 'scatter', 'histogram', 'box', 'heatmap', 'pie'
     - x_column: X-axis column name (optional)
     - y_column: Y-axis column name (optional)
     - title: Chart title (optional)
-    - save_path: Path to save chart (optional, creates temp file if not provided)
+    - save_path: Path to save chart (optional; charts are always stored and served at the returned URL)
+    - output_format: 'png' (default), 'svg', or 'vega' (a Vega-Lite JSON spec the frontend can render)
     
     Examples:
     - {"data_source": "df", "chart_type": "histogram", "y_column": "sales"}
     - {"data_source": "data.csv", "chart_type": "scatter", "x_column": "x", "y_column": "y", "title": "X vs Y"}
     - {"data_source": "df", "chart_type": "heatmap"}""",
-    func=lambda x: create_data_visualization(**json.loads(x) if isinstance(x, str) else x)
+    func=lambda x: _run_in_session("create_data_visualization", **json.loads(x) if isinstance(x, str) else x)
 )
 
 session_variables_tool = Tool(
     name="list_session_variables",
     description="List all variables (DataFrames, arrays, etc.) currently available in the Python session.",
-    func=lambda x: list_session_variables()
+    func=lambda x: _run_in_session("list_session_variables")
 )
 
 # Export all tools
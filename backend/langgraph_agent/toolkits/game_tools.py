@@ -35,9 +35,30 @@ from api_tools.game_boxscores import (
     fetch_boxscore_misc_logic as fetch_boxscore_misc_data,
     fetch_boxscore_playertrack_logic as fetch_boxscore_playertrack_data,
     fetch_boxscore_scoring_logic as fetch_boxscore_scoring_data,
-    fetch_boxscore_hustle_logic as fetch_boxscore_hustle_data
+    fetch_boxscore_hustle_logic as fetch_boxscore_hustle_data,
+    fetch_game_boxscore_bundle_logic as fetch_game_boxscore_bundle_data
 )
 
+class GameBoxscoreBundleInput(BaseModel):
+    """Input schema for the NBA Game Boxscore Bundle tool."""
+    game_id: str = Field(description="The ID of the game to fetch data for (e.g., '0022300001').")
+    families: Optional[List[str]] = Field(
+        default=None,
+        description="Box score families to include: traditional, advanced, four_factors, usage, defensive, misc, "
+                    "playertrack, scoring, hustle, summary, or ['all']. Defaults to traditional, advanced, "
+                    "four_factors, misc and summary."
+    )
+
+@tool("get_nba_game_boxscore_bundle", args_schema=GameBoxscoreBundleInput)
+def get_nba_game_boxscore_bundle(game_id: str, families: Optional[List[str]] = None) -> str:
+    """Fetches several box score families for one NBA game in a single call and merges them into one player table and one team table (plus the game summary: line score, officials, inactive players). Prefer this over calling the individual box score tools one by one when breaking down a full game."""
+    json_response = fetch_game_boxscore_bundle_data(
+        game_id=game_id,
+        families=families,
+        return_dataframe=False
+    )
+    return json_response
+
 class BoxscoreTraditionalInput(BaseModel):
     """Input schema for the NBA Traditional Box Score tool."""
     game_id: str = Field(description="The ID of the game to fetch data for (e.g., '0022300001').")
@@ -200,6 +221,10 @@ class PlayByPlayInput(BaseModel):
     person_id: Optional[int] = Field(default=None, description="Player ID to filter plays by.")
     team_id: Optional[int] = Field(default=None, description="Team ID to filter plays by.")
     team_tricode: Optional[str] = Field(default=None, description="Team tricode to filter plays by (e.g., 'LAL', 'BOS').")
+    since_action_number: Optional[int] = Field(
+        default=0,
+        description="Only return plays after this action number. For a live game, pass 'cursor.next' from the previous call to get just the new plays."
+    )
 
 @tool("get_nba_play_by_play", args_schema=PlayByPlayInput)
 def get_nba_play_by_play(
@@ -210,9 +235,10 @@ def get_nba_play_by_play(
     player_name: Optional[str] = None,
     person_id: Optional[int] = None,
     team_id: Optional[int] = None,
-    team_tricode: Optional[str] = None
+    team_tricode: Optional[str] = None,
+    since_action_number: int = 0
 ) -> str:
-    """Fetches play-by-play data for an NBA game. Attempts live data first if no period filters are applied, otherwise uses historical data. Provides granular filtering by period, event type, player, and team."""
+    """Fetches play-by-play data for an NBA game. Attempts live data first if no period filters are applied, otherwise uses historical data. Provides granular filtering by period, event type, player, and team. Live results include the score, clock and players on court, and a cursor for fetching only newer plays."""
     json_response = fetch_playbyplay_data(
         game_id=game_id,
         start_period=start_period,
@@ -222,7 +248,8 @@ def get_nba_play_by_play(
         person_id=person_id,
         team_id=team_id,
         team_tricode=team_tricode,
-        return_dataframe=False
+        return_dataframe=False,
+        since_action_number=since_action_number or 0
     )
     return json_response
 
@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
 
+from config import settings
+
 from api_tools.team_dash_lineups import (
     fetch_team_lineups_logic,
     VALID_MEASURE_TYPES,
@@ -90,6 +92,7 @@ from api_tools.team_player_on_off_details import (
     _VALID_VS_CONFERENCES,
     _VALID_VS_DIVISIONS
 )
+from api_tools.lineup_stints import fetch_lineup_stints_logic
 from api_tools.teamplayeronoffsummary import (
     fetch_teamplayeronoffsummary_logic,
     _VALID_SEASON_TYPES as ONOFF_SUMMARY_SEASON_TYPES,
@@ -1076,6 +1079,86 @@ def get_team_player_on_off_details(
     )
     return json_response
 
+class TeamLineupStintsInput(BaseModel):
+    """Input schema for the Team Lineup Stints tool."""
+    team_identifier: str = Field(
+        ...,
+        description="Name, abbreviation, or ID of the team (e.g., 'Lakers', 'LAL', '1610612747')."
+    )
+    season: Optional[str] = Field(
+        None,
+        description="The NBA season in YYYY-YY format (e.g., '2023-24'). If None, uses the current season."
+    )
+    season_type: str = Field(
+        "Regular Season",
+        description="Type of season ('Regular Season' or 'Playoffs')."
+    )
+    game_ids: Optional[List[str]] = Field(
+        None,
+        description="Specific game IDs to use instead of all of the season's games (e.g., ['0022300001'])."
+    )
+    last_n_games: int = Field(
+        0,
+        description="Only the team's last N games of the season (0 for all)."
+    )
+    periods: Optional[List[int]] = Field(
+        None,
+        description="Periods to include (1-4, 5+ for overtime), e.g. [4] for fourth quarters. None for all."
+    )
+    clutch: bool = Field(
+        False,
+        description="Only clutch time: last five minutes of the fourth quarter or overtime with the margin within five points."
+    )
+    opponent: Optional[str] = Field(
+        None,
+        description="Only games against this team (name, abbreviation, or ID)."
+    )
+    location: Optional[str] = Field(
+        None,
+        description="Filter by game location ('Home' or 'Road')."
+    )
+    min_minutes: float = Field(
+        0,
+        description="Minimum minutes for a lineup to be listed."
+    )
+
+@tool("get_team_lineup_stints", args_schema=TeamLineupStintsInput)
+def get_team_lineup_stints(
+    team_identifier: str,
+    season: Optional[str] = None,
+    season_type: str = "Regular Season",
+    game_ids: Optional[List[str]] = None,
+    last_n_games: int = 0,
+    periods: Optional[List[int]] = None,
+    clutch: bool = False,
+    opponent: Optional[str] = None,
+    location: Optional[str] = None,
+    min_minutes: float = 0
+) -> str:
+    """
+    Computes five-man lineup ratings and player on/off splits for a team from play-by-play and rotation data.
+    Returns each lineup's minutes, points for/against, possessions and offensive/defensive/net rating per 100
+    possessions, and each player's net rating on and off the court.
+
+    Filters combine freely, including combinations the NBA lineup and on/off endpoints do not offer
+    (e.g. clutch time against one opponent, fourth quarters of road games, a specific set of games).
+    Games already processed are reused, so follow-up questions with different filters are fast.
+    """
+    json_response = fetch_lineup_stints_logic(
+        team_identifier=team_identifier,
+        season=season or settings.CURRENT_NBA_SEASON,
+        season_type=season_type,
+        game_ids=game_ids,
+        last_n_games=last_n_games,
+        periods=periods,
+        clutch=clutch,
+        opponent_team_identifier=opponent,
+        location=location,
+        min_minutes=min_minutes,
+        return_dataframe=False
+    )
+    return json_response
+
 class TeamReboundingStatsInput(BaseModel):
     """Input schema for the Team Rebounding Stats tool."""
     team_identifier: str = Field(
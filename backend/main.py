@@ -34,6 +34,8 @@ except ImportError as e:
 try:
     from core.errors import Errors
     from routes.sse import router as sse_router
+    from routes.charts import router as charts_router
+    from routes.live import router as live_router
 
 except ImportError as e:
     logger.critical(f"Failed to import application modules (config/routers). This is a fatal error. Error: {e}", exc_info=True)
@@ -80,6 +82,12 @@ if 'sse_router' in locals() and sse_router:
 else:
     logger.warning("sse_router was not imported or is None. SSE endpoint will not be available.")
 
+app.include_router(charts_router, prefix=API_V1_PREFIX)
+logger.info(f"Charts router included at {API_V1_PREFIX}/charts.")
+
+app.include_router(live_router, prefix=API_V1_PREFIX)
+logger.info(f"Live games router included at {API_V1_PREFIX}/live/stream.")
+
 
 logger.info("API routers included under /api/v1 prefix. Some routers are temporarily disabled.")
 
@@ -93,6 +101,50 @@ async def health_check() -> dict: # Added return type hint
     logger.info("Health check endpoint called successfully.")
     return {"status": "healthy", "message": "NBA Analytics API is up and running!"}
 
+@app.get("/health/upstream", tags=["Health Check"], summary="NBA API Upstream Traffic Metrics")
+async def upstream_metrics() -> dict:
+    """Reports per-host rate-limiter queue waits, request-coalescing, async-fetch, live-ingestion and season warehouse counters."""
+    from utils.rate_limiter import get_rate_limiter
+    from api_tools.http_client import upstream_flight
+    from api_tools.async_http import async_fetch_info
+    from api_tools.live_ingestion import live_ingestion_info
+    from utils.season_warehouse import season_warehouse_info
+    return {
+        "rate_limiter": get_rate_limiter().metrics(),
+        "coalescing": upstream_flight.info(),
+        "async_fetch": async_fetch_info(),
+        "live_ingestion": live_ingestion_info(),
+        "season_warehouse": season_warehouse_info(),
+    }
+
+@app.get("/health/agent", tags=["Health Check"], summary="Agent Tool Routing Metrics")
+async def agent_metrics() -> dict:
+    """Reports lazy tool loading, tool routing, parallel tool execution, tool output condensation, code sandbox workers, chart rendering, SSE stream batching/compression, prompt tokens per hop, checkpoint store and answer cache usage."""
+    from langgraph_agent.tool_router import tool_routing_info
+    from langgraph_agent.tool_executor import tool_execution_info
+    from langgraph_agent.memory import get_memory_manager
+    from langgraph_agent.services.tool_output_service import tool_output_info
+    from langgraph_agent.services.context_service import context_window_info
+    from langgraph_agent.services.answer_cache_service import answer_cache_info
+    from langgraph_agent.tool_manager import tool_registry
+    from langgraph_agent.code_sandbox import code_sandbox_info
+    from langgraph_agent.services.chart_service import chart_service_info
+    from langgraph_agent.services.stream_service import sse_stream_info
+    checkpointer = get_memory_manager().checkpointer
+    checkpoints = checkpointer.info() if hasattr(checkpointer, "info") else {"backend": type(checkpointer).__name__}
+    return {
+        "tool_registry": tool_registry.info(),
+        "tool_routing": tool_routing_info(),
+        "tool_execution": tool_execution_info(),
+        "tool_output": tool_output_info(),
+        "code_sandbox": code_sandbox_info(),
+        "charts": chart_service_info(),
+        "sse_stream": sse_stream_info(),
+        "context_window": context_window_info(),
+        "checkpoints": checkpoints,
+        "answer_cache": answer_cache_info(),
+    }
+
 # --- Global Exception Handler ---
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse: # Added return type hint
@@ -119,14 +171,26 @@ async def generic_unhandled_exception_handler(request: Request, exc: Exception)
 @app.on_event("startup")
 async def startup_event() -> None: # Added return type hint
     logger.info("NBA Analytics API starting up...")
-    # Potential future startup tasks: Initialize DB connections, load ML models, etc.
-    pass
+    from utils.identity_index import get_identity_index
+    get_identity_index()  # Build player/team lookup tables before the first tool call needs them
+    if settings.CODE_SANDBOX_PREWARM:
+        from langgraph_agent.code_sandbox import get_code_sandbox
+        sandbox = get_code_sandbox()
+        if sandbox is not None:
+            sandbox.start()  # Workers import pandas/matplotlib in the background
+    if settings.LIVE_INGESTION_ENABLED:
+        from api_tools.live_ingestion import get_live_ingestion
+        get_live_ingestion().start()
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None: # Added return type hint
     logger.info("NBA Analytics API shutting down...")
-    # Potential future shutdown tasks: Close DB connections, save state, etc.
-    pass
+    from api_tools.live_ingestion import get_live_ingestion
+    await get_live_ingestion().stop()
+    from api_tools.async_http import aclose_async_client
+    await aclose_async_client()
+    from langgraph_agent.code_sandbox import shutdown_code_sandbox
+    shutdown_code_sandbox()
 
 # --- Uvicorn Runner ---
 if __name__ == "__main__":
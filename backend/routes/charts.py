@@ -0,0 +1,35 @@
+import re
+import logging
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from langgraph_agent.services.chart_service import KEY_LENGTH, MEDIA_TYPES, get_chart_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+_ARTIFACT_NAME_RE = re.compile(rf"^([0-9a-f]{{{KEY_LENGTH}}})({'|'.join(re.escape(ext) for ext in MEDIA_TYPES)})$")
+
+
+@router.get("/charts/{artifact}", tags=["Charts"])
+async def get_chart(artifact: str) -> FileResponse:
+    """
+    Serves a chart artifact (PNG, SVG or Vega-Lite JSON) created by the agent's visualization tools.
+
+    Artifacts are content-addressed, so a URL always refers to the same bytes and can be cached
+    indefinitely; a 404 means the artifact was evicted and the chart must be requested again.
+    """
+    match = _ARTIFACT_NAME_RE.match(artifact)
+    if not match:
+        raise HTTPException(status_code=404, detail="Chart not found")
+    key, extension = match.groups()
+    path = get_chart_service().store.get(key, extension)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Chart not found or expired")
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[extension],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
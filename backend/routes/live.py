@@ -0,0 +1,76 @@
+import logging
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from config import settings
+from api_tools.live_ingestion import get_live_ingestion
+from api_tools.live_playbyplay_store import get_live_pbp_store
+from langgraph_agent.services.stream_service import SSEEncoder
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/live/stream", tags=["Live Games"])
+async def stream_live_games(
+    request: Request,
+    games: str = Query(None, description="Comma-separated game IDs to follow, or 'all' for every game in progress. The scoreboard is always included."),
+):
+    """
+    Pushes live game updates to every connected client using Server-Sent Events (SSE).
+
+    Updates come from one background poller per API process, so the upstream cost
+    of a game does not depend on how many clients follow it. A new connection first
+    receives the latest state, then only changes.
+
+    Events:
+    - `scoreboard`: {"date": str, "games": [...]} - Every game of the day (same format as the live scoreboard tool).
+    - `boxscore`: {"game_id": str, "state": str, "game": {...}} - A followed game's live boxscore.
+    - `playbyplay`: {"game_id": str, "periods": [...], "cursor": {"since": int, "next": int}, "state": {...},
+      "corrections": [...], "removed": [int]} - New plays of a followed game (see `/live/games/{game_id}/playbyplay`);
+      the first event per game has "snapshot": true and every play so far.
+    """
+    service = get_live_ingestion()
+    if not service.running:
+        raise HTTPException(status_code=503, detail="Live game ingestion is not running")
+    game_ids = [game_id.strip() for game_id in (games or "").split(",") if game_id.strip()]
+    all_games = game_ids == ["all"]
+    subscriber = service.subscribe(None if all_games else game_ids, all_games=all_games)
+    if subscriber is None:
+        raise HTTPException(status_code=503, detail="Too many live stream connections")
+
+    encoder = SSEEncoder(SSEEncoder.negotiate(request.headers.get("accept-encoding")))
+
+    async def event_stream():
+        try:
+            while True:
+                chunk = await subscriber.next(settings.LIVE_STREAM_KEEPALIVE_SECONDS)
+                if await request.is_disconnected():
+                    return
+                yield encoder.encode(chunk or ": keepalive\n\n")
+        finally:
+            service.unsubscribe(subscriber)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Vary": "Accept-Encoding"}
+    if encoder.encoding:
+        headers["Content-Encoding"] = encoder.encoding
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=headers)
+
+
+@router.get("/live/games/{game_id}/playbyplay", tags=["Live Games"])
+async def get_live_playbyplay(
+    game_id: str,
+    since: int = Query(0, ge=0, description="Return only plays after this action number (the previous response's cursor.next)."),
+) -> dict:
+    """
+    Returns a live game's plays after an action-number cursor, grouped by period, with the running
+    score, clock and players on court. `corrections` holds earlier plays edited since the cursor was
+    issued and `removed` the action numbers dropped by the feed. Served from memory; a 404 means the
+    game is not being followed by live ingestion.
+    """
+    changes = get_live_pbp_store().changes(game_id, since)
+    if changes is None:
+        raise HTTPException(status_code=404, detail="Game is not being tracked live")
+    return {"game_id": game_id, **changes}
@@ -7,8 +7,11 @@ from fastapi import APIRouter, Query, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from starlette.types import Send
 
+from config import settings
 from langgraph_agent.graph import app as langgraph_app
 from langgraph_agent.services import EventStreamProcessor
+from langgraph_agent.services.stream_service import PROTOCOLS, SSEEncoder, coalesce_events
+from langgraph_agent.services.answer_cache_service import get_answer_cache
 from langgraph_agent.memory import get_memory_manager
 
 logger = logging.getLogger(__name__)
@@ -16,13 +19,13 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Create service instance
-event_processor = EventStreamProcessor(langgraph_app, get_memory_manager())
+event_processor = EventStreamProcessor(langgraph_app, get_memory_manager(), get_answer_cache())
 
-async def agent_event_generator(input_query: str, thread_id: str = None, user_id: str = None):
+async def agent_event_generator(input_query: str, thread_id: str = None, user_id: str = None, protocol: str = "v1"):
     """
     Runs the LangGraph agent and yields formatted SSE events with memory support.
     """
-    async for event in event_processor.process_events(input_query, thread_id, user_id):
+    async for event in event_processor.process_events(input_query, thread_id, user_id, protocol):
         yield event
 
 def format_sse_event(event_type: str, data: Dict[str, Any]) -> str:
@@ -35,6 +38,7 @@ async def stream_agent_response(
     query: str = Query(..., description="The user's query for the AI agent."),
     thread_id: str = Query(None, description="Thread ID for multi-turn conversation. If not provided, a new conversation starts."),
     user_id: str = Query(None, description="User ID for cross-thread persistence and user-specific memory."),
+    protocol: str = Query(None, description="Stream protocol: 'v1' (full message contents) or 'v2' (token deltas, truncated tool results)."),
 ):
     """
     Streams the AI agent's processing steps and final response using Server-Sent Events (SSE).
@@ -58,24 +62,66 @@ async def stream_agent_response(
     - `final_answer`: {"answer": str} - The final textual answer from the agent.
     - `graph_end`: {} - Signals the end of the graph execution.
     - `error`: {"message": str, "type": str} - If an error occurs.
+
+    Protocol v2 (`protocol=v2`) cuts bytes on the wire and time to the first visible text:
+    - `token`: {"id": str, "node": str, "delta": str} - LLM text as it is generated; append by `id`.
+    - AI messages whose text was streamed carry {"id": str, "streamed": true, "delta": str (unstreamed tail, if any)}
+      instead of `content`.
+    - Tool results longer than SSE_TOOL_RESULT_PREVIEW_CHARS are cut to a preview, with "truncated": true,
+      "content_length": int and "handles": [str] (stored tables, loadable by the agent's tools).
+
+    With either protocol, events arriving within SSE_FLUSH_WINDOW_MS are written together, and the
+    stream is gzip/brotli compressed when the client's Accept-Encoding allows it.
     """
-    logger.info(f"SSE connection established for query: '{query[:50]}...'")
+    protocol = protocol or settings.SSE_DEFAULT_PROTOCOL
+    if protocol not in PROTOCOLS:
+        raise HTTPException(status_code=400, detail=f"Unknown protocol '{protocol}'; expected one of {list(PROTOCOLS)}")
+    logger.info(f"SSE connection established for query: '{query[:50]}...' (protocol {protocol})")
 
-    generator = agent_event_generator(query, thread_id, user_id)
+    encoder = SSEEncoder(SSEEncoder.negotiate(request.headers.get("accept-encoding")))
+    generator = coalesce_events(agent_event_generator(query, thread_id, user_id, protocol))
     
     async def safe_generator_wrapper():
+        # The next event can be a long way off (a batch of slow tool calls), so the disconnect check
+        # does not wait for it: a disconnect cancels the pending step, which cancels the running tools.
+        next_chunk = None
         try:
-            async for data_chunk in generator:
+            while True:
+                next_chunk = asyncio.ensure_future(generator.__anext__())
+                while not next_chunk.done():
+                    await asyncio.wait({next_chunk}, timeout=settings.SSE_DISCONNECT_POLL_SECONDS)
+                    if not next_chunk.done() and await request.is_disconnected():
+                        logger.warning(f"Client disconnected for query: '{query[:50]}...'. Cancelling agent run.")
+                        next_chunk.cancel()
+                        return
+                try:
+                    data_chunk = next_chunk.result()
+                except StopAsyncIteration:
+                    trailer = encoder.close()
+                    if trailer:
+                        yield trailer
+                    return
                 if await request.is_disconnected():
                     logger.warning(f"Client disconnected for query: '{query[:50]}...'. Stopping stream.")
-                    break
-                yield data_chunk
+                    return
+                yield encoder.encode(data_chunk)
         except asyncio.CancelledError:
             logger.info(f"Stream cancelled for query: '{query[:50]}...'")
+            if next_chunk is not None:
+                next_chunk.cancel()
         finally:
             logger.info(f"Generator cleanup for query: '{query[:50]}...'")
+            if next_chunk is not None and not next_chunk.done():
+                try:
+                    await next_chunk
+                except (asyncio.CancelledError, StopAsyncIteration, Exception):
+                    pass
+            await generator.aclose()
 
-    return StreamingResponse(safe_generator_wrapper(), media_type="text/event-stream")
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Vary": "Accept-Encoding"}
+    if encoder.encoding:
+        headers["Content-Encoding"] = encoder.encoding
+    return StreamingResponse(safe_generator_wrapper(), media_type="text/event-stream", headers=headers)
 
 # For backwards compatibility
 agent_sse_router = router
\ No newline at end of file
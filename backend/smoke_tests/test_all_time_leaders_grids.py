@@ -40,7 +40,7 @@ class TestAllTimeLeadersGridsReal(unittest.TestCase):
         """Test that the CSV path is generated correctly."""
         # Test with default parameters
         path = _get_csv_path_for_all_time_leaders()
-        self.assertIn("all_time_leaders_league00_modeTotals_seasonRegular_Season_top10.csv", path)
+        self.assertIn("all_time_leaders_league00_modeTotals_seasonRegular_Season_top10.parquet", path)
 
         # Test with custom parameters
         path = _get_csv_path_for_all_time_leaders(
@@ -48,7 +48,7 @@ class TestAllTimeLeadersGridsReal(unittest.TestCase):
             per_mode="PerGame",
             topx=20
         )
-        self.assertIn("all_time_leaders_league10_modePerGame_seasonRegular_Season_top20.csv", path)
+        self.assertIn("all_time_leaders_league10_modePerGame_seasonRegular_Season_top20.parquet", path)
 
     def test_fetch_all_time_leaders_logic_json(self):
         """Test fetching all-time leaders in JSON format."""
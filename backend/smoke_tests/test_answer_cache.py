@@ -0,0 +1,121 @@
+"""
+Smoke tests for the semantic answer cache (langgraph_agent/services/answer_cache_service.py).
+Runs offline with a scripted stand-in graph and a temporary SQLite file.
+"""
+import asyncio
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from langgraph_agent.services.answer_cache_service import (
+    SemanticAnswerCache, answer_data_class, normalize_query, query_signature,
+)
+from langgraph_agent.services.stream_service import EventStreamProcessor
+from utils.cache_policy import DataClass
+
+
+class ScriptedGraph:
+    """Streams a fixed tool call + answer and records how often it ran and which threads were seeded."""
+
+    def __init__(self, tool_args, tool_result=None):
+        self.tool_args = tool_args
+        self.tool_result = tool_result if tool_result is not None else ToolMessage(content="{}", tool_call_id="c1")
+        self.runs = 0
+        self.seeded = []
+
+    async def astream(self, inputs, config, stream_mode):
+        self.runs += 1
+        yield "updates", {"entry_node": {"messages": []}}
+        yield "updates", {"data_retrieval_agent": {"messages": [AIMessage(
+            content="", tool_calls=[{"name": "get_player_career_stats", "args": self.tool_args, "id": "c1"}]
+        )]}}
+        yield "updates", {"actual_tool_node": {"messages": [self.tool_result]}}
+        yield "updates", {"presentation_agent": {"messages": [AIMessage(content="He averaged 27.1 points.")]}}
+
+    async def aupdate_state(self, config, values, as_node=None):
+        self.seeded.append((config["configurable"]["thread_id"], values["messages"][-1].content, as_node))
+
+
+class Threads:
+    def __init__(self):
+        self.count = 0
+
+    def generate_thread_id(self):
+        self.count += 1
+        return f"thread-{self.count}"
+
+    def create_thread_config(self, thread_id, user_id=None):
+        return {"configurable": {"thread_id": thread_id}}
+
+
+def _run(processor, query, thread_id=None):
+    async def collect():
+        return [event async for event in processor.process_events(query, thread_id)]
+    return asyncio.run(collect())
+
+
+def test_similar_first_turn_questions_replay_the_stored_answer(tmp_path):
+    graph = ScriptedGraph({"player_name": "Michael Jordan"})
+    cache = SemanticAnswerCache(str(tmp_path / "answers.sqlite3"))
+    processor = EventStreamProcessor(graph, Threads(), cache)
+
+    first = _run(processor, "What were Michael Jordan's career stats?")
+    replayed = _run(processor, "michael jordan career statistics")
+    assert graph.runs == 1
+    assert len(replayed) == len(first) and replayed[-1] == first[-1]
+    assert '"thread_id": "thread-2"' in replayed[0] and "thread-1" not in "".join(replayed)
+    assert graph.seeded == [("thread-2", "He averaged 27.1 points.", "presentation_agent")]
+    assert cache.info()["entries"] == {DataClass.HISTORICAL.value: 1}
+
+    _run(processor, "What were Kobe Bryant's career stats?")  # Different player
+    _run(processor, "michael jordan career statistics", thread_id="thread-1")  # Follow-up turn
+    assert graph.runs == 3
+
+
+def test_answers_built_on_failed_tool_calls_are_not_stored(tmp_path):
+    cache = SemanticAnswerCache(str(tmp_path / "answers.sqlite3"))
+    failures = [
+        ToolMessage(content='{"error": "upstream timed out"}', tool_call_id="c1"),
+        ToolMessage(content="Error: tool timed out", tool_call_id="c1", status="error"),
+    ]
+    for failure in failures:
+        graph = ScriptedGraph({"player_name": "Michael Jordan"}, failure)
+        processor = EventStreamProcessor(graph, Threads(), cache)
+        _run(processor, "What were Michael Jordan's career stats?")
+        _run(processor, "What were Michael Jordan's career stats?")
+        assert graph.runs == 2
+    assert cache.info()["entries"] == {} and cache.info()["skipped"] == 4
+
+
+def test_answers_expire_with_their_most_volatile_tool_call(tmp_path):
+    cache = SemanticAnswerCache(str(tmp_path / "answers.sqlite3"))
+    events = ["event: graph_end\ndata: {}\n\n"]
+    assert not cache.store("Lakers score tonight", events, "t1")
+    assert not cache.store("Warriors game", events, "t1", [{"name": "get_nba_live_scoreboard", "args": {}}])
+    assert cache.store("Celtics odds", events, "t1", [
+        {"name": "get_player_career_stats", "args": {"player_name": "Larry Bird"}},
+        {"name": "get_nba_odds_data", "args": {}},
+    ])
+    assert cache.info()["entries"] == {DataClass.INTRADAY.value: 1}
+
+
+def test_season_less_tool_calls_expire_with_current_season_data(tmp_path):
+    """Tools default to the current season, so calls that leave it out are not stored as reference data."""
+    cache = SemanticAnswerCache(str(tmp_path / "answers.sqlite3"))
+    events = ["event: graph_end\ndata: {}\n\n"]
+    for query, call in [
+        ("Who leads the league in assists?", {"name": "get_nba_assist_leaders", "args": {}}),
+        ("What are the league standings?", {"name": "get_nba_league_standings", "args": {}}),
+        ("League player stats per game", {"name": "get_nba_league_player_stats", "args": {"per_mode": "PerGame"}}),
+    ]:
+        assert answer_data_class(normalize_query(query), [call]) is DataClass.CURRENT
+        assert cache.store(query, events, "t1", [call])
+    assert cache.info()["entries"] == {DataClass.CURRENT.value: 3}
+    # Explicit seasons and players still decide the class
+    assert answer_data_class([], [{"name": "get_nba_assist_leaders", "args": {"season": "1995-96"}}]) is DataClass.HISTORICAL
+    assert answer_data_class([], [{"name": "get_player_career_stats", "args": {"player_name": "Larry Bird"}}]) is DataClass.HISTORICAL
+
+
+def test_seasons_and_stat_categories_must_match():
+    assert normalize_query("Curry stats 2015-2016") == normalize_query("curry statistics in 2015-16")
+    assert query_signature(normalize_query("Who leads the league in assists?")) == "assist"
+    assert query_signature(normalize_query("Who leads the league in rebounds?")) == "rebound"
@@ -0,0 +1,135 @@
+"""
+Smoke tests for the async fetch layer (api_tools/async_http.py), the async
+single-flight and the async rate-limiter slot. Runs offline: upstream fetches are replaced with canned responses.
+"""
+import json
+import asyncio
+import threading
+
+import pytest
+import requests
+
+pytest.importorskip("httpx")
+
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from api_tools import async_http
+from utils.rate_limiter import HostBudget, RateLimiter
+from utils.single_flight import AsyncSingleFlight
+
+
+def _install_fake_fetch(monkeypatch, responses):
+    """Serves upstream requests by endpoint name and records which endpoints were fetched."""
+    fetched = []
+
+    async def fake_fetch(request):
+        endpoint = request.url.rsplit("/", 1)[-1]
+        fetched.append(endpoint)
+        outcome = responses[endpoint]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return async_http.FetchedResponse(json.dumps(outcome), 200, request.url)
+
+    monkeypatch.setattr(async_http, "fetch", fake_fetch)
+    return fetched
+
+
+def _two_request_logic(season: str = "2015-16"):
+    """Stands in for a logic function that makes two sequential nba_api requests."""
+    try:
+        first = NBAStatsHTTP().send_api_request("firstendpoint", {"Season": season}).get_dict()
+        second = NBAStatsHTTP().send_api_request("secondendpoint", {"Season": season}).get_dict()
+    except Exception as e:
+        return json.dumps({"error": str(e)})
+    return json.dumps({"first": first["value"], "second": second["value"]})
+
+
+def test_logic_function_completes_after_deferred_fetches(monkeypatch):
+    """Each upstream request is fetched once and the final pass returns the sync result."""
+    fetched = _install_fake_fetch(monkeypatch, {"firstendpoint": {"value": 1}, "secondendpoint": {"value": 2}})
+    result = asyncio.run(async_http.call_logic_async(_two_request_logic, "2015-16"))
+    assert json.loads(result) == {"first": 1, "second": 2}
+    assert fetched == ["firstendpoint", "secondendpoint"]
+
+
+def test_logic_passes_run_off_the_event_loop(monkeypatch):
+    """Every pass of the sync logic runs in a worker thread; only the fetches are awaited on the loop."""
+    _install_fake_fetch(monkeypatch, {"firstendpoint": {"value": 1}, "secondendpoint": {"value": 2}})
+    pass_threads = []
+
+    def logic():
+        pass_threads.append(threading.get_ident())
+        return _two_request_logic()
+
+    async def run():
+        return threading.get_ident(), await async_http.call_logic_async(logic)
+
+    loop_thread, result = asyncio.run(run())
+    assert json.loads(result) == {"first": 1, "second": 2}
+    assert len(pass_threads) == 3 and loop_thread not in pass_threads
+
+
+def test_fetch_failure_is_handled_by_logic_function(monkeypatch):
+    """A failed fetch is raised inside the logic function, which formats its own error response."""
+    _install_fake_fetch(monkeypatch, {"firstendpoint": requests.exceptions.RetryError("upstream down")})
+    result = asyncio.run(async_http.call_logic_async(_two_request_logic))
+    assert json.loads(result) == {"error": "upstream down"}
+
+
+def _one_request_logic():
+    return NBAStatsHTTP().send_api_request("firstendpoint", {}).get_dict()["value"]
+
+
+def test_fetch_pass_limit_falls_back_to_thread(monkeypatch):
+    """Calls exhausting the pass budget finish in a worker thread that reuses what was already fetched."""
+    fetched = _install_fake_fetch(monkeypatch, {"firstendpoint": {"value": 1}})
+    monkeypatch.setattr(async_http.settings, "NBA_API_ASYNC_MAX_FETCH_PASSES", 1)
+    fallbacks = async_http.async_fetch_info()["thread_fallbacks"]
+    assert asyncio.run(async_http.call_logic_async(_one_request_logic)) == 1
+    assert fetched == ["firstendpoint"]
+    assert async_http.async_fetch_info()["thread_fallbacks"] == fallbacks + 1
+
+
+def test_async_variant_keeps_signature():
+    """Async variants expose the wrapped function's name and parameters for tool binding."""
+    variant = async_http.async_variant(_two_request_logic)
+    assert asyncio.iscoroutinefunction(variant)
+    assert variant.__name__ == "_two_request_logic"
+
+
+def test_async_single_flight_shares_one_execution():
+    """Concurrent coroutines with the same key await a single execution."""
+    flight = AsyncSingleFlight("test")
+    calls = {"count": 0}
+
+    async def slow_fetch():
+        calls["count"] += 1
+        await asyncio.sleep(0.05)
+        return {"rows": [1, 2, 3]}
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", slow_fetch) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert calls["count"] == 1
+    assert all(result is results[0] for result in results)
+    assert flight.info() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_async_rate_limiter_slot_bounds_in_flight():
+    """Async slots respect the per-host in-flight limit without blocking the loop."""
+    limiter = RateLimiter({"stats.nba.com": HostBudget(rate=0, burst=1, max_in_flight=2)}, HostBudget(0, 1, 0), max_wait=5)
+    state = {"current": 0, "peak": 0}
+
+    async def request():
+        async with limiter.async_slot("stats.nba.com"):
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+            await asyncio.sleep(0.05)
+            state["current"] -= 1
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(main())
+    assert state["peak"] == 2
@@ -0,0 +1,120 @@
+"""
+Smoke tests for the tiered response cache in utils/cache.py.
+Runs entirely offline: decorated functions are local stand-ins for api_tools logic functions.
+"""
+import os
+import json
+import time
+import tempfile
+
+import pandas as pd
+
+from utils import cache
+from utils.cache import (
+    MemoryTier,
+    PersistentStore,
+    cached_logic,
+    make_cache_key,
+    is_error_response,
+    set_persistent_store,
+    get_persistent_store,
+)
+
+
+def _use_temp_store() -> PersistentStore:
+    """Points the shared persistent tier at a throwaway SQLite file."""
+    db_path = os.path.join(tempfile.mkdtemp(prefix="dime_cache_"), "responses.sqlite3")
+    store = PersistentStore(db_path)
+    set_persistent_store(store)
+    return store
+
+
+def test_make_cache_key_normalizes_params():
+    """Keys ignore parameter order, surrounding whitespace and bypass_cache."""
+    key_a = make_cache_key("endpoint", {"season": "2023-24", "team_id": 1610612747})
+    key_b = make_cache_key("endpoint", {"team_id": 1610612747, "season": " 2023-24 ", "bypass_cache": True})
+    key_c = make_cache_key("endpoint", {"season": "2022-23", "team_id": 1610612747})
+    assert key_a == key_b
+    assert key_a != key_c
+    assert key_a.startswith("endpoint:")
+
+
+def test_is_error_response():
+    """Error JSON (plain or inside a DataFrame tuple) is recognized."""
+    assert is_error_response(json.dumps({"error": "boom"}))
+    assert is_error_response((json.dumps({"error": "boom"}), {}))
+    assert not is_error_response(json.dumps({"data": [1, 2, 3]}))
+    assert not is_error_response((json.dumps({"data": []}), {"df": pd.DataFrame()}))
+
+
+def test_memory_tier_ttl_and_eviction():
+    """Entries expire after their TTL and the oldest entries are evicted past maxsize/max_bytes."""
+    tier = MemoryTier(maxsize=2, max_bytes=1000)
+    tier.set("a", "x" * 10, ttl=60)
+    tier.set("b", "y" * 10, ttl=60)
+    tier.get("a")  # Touch 'a' so 'b' becomes least recently used
+    tier.set("c", "z" * 10, ttl=60)
+    assert tier.get("b") is cache._MISSING
+    assert tier.get("a") == "x" * 10
+
+    tier.set("short", "v", ttl=0.01)
+    time.sleep(0.02)
+    assert tier.get("short") is cache._MISSING
+
+    tier.set("big", "w" * 900, ttl=60)
+    tier.set("bigger", "q" * 900, ttl=60)
+    assert tier.get("big") is cache._MISSING
+    assert tier.info()["bytes"] <= 1000
+
+
+def test_cached_logic_skips_errors_and_persists():
+    """Successful responses are served from cache and survive a memory-tier reset; errors are never cached."""
+    _use_temp_store()
+    calls = {"count": 0}
+
+    @cached_logic(maxsize=8, endpoint="test.fake_logic")
+    def fake_logic(season: str = "2023-24", fail: bool = False, return_dataframe: bool = False):
+        calls["count"] += 1
+        if fail:
+            return json.dumps({"error": "upstream failed"})
+        payload = json.dumps({"season": season, "call": calls["count"]})
+        if return_dataframe:
+            return payload, {"rows": pd.DataFrame({"A": [1, 2]})}
+        return payload
+
+    first = fake_logic("2015-16")
+    assert fake_logic(season="2015-16") == first
+    assert calls["count"] == 1
+
+    # Simulate a restarted worker: memory tier is empty, persistent tier still has the entry
+    fake_logic.cache_clear()
+    assert fake_logic("2015-16") == first
+    assert calls["count"] == 1
+
+    fake_logic("2015-16", fail=True)
+    fake_logic("2015-16", fail=True)
+    assert calls["count"] == 3
+
+    json_response, dataframes = fake_logic("2015-16", return_dataframe=True)
+    fake_logic.cache_clear()
+    cached_json, cached_frames = fake_logic("2015-16", return_dataframe=True)
+    assert cached_json == json_response
+    assert cached_frames["rows"].equals(dataframes["rows"])
+    assert calls["count"] == 4
+
+    fake_logic.cache_clear(persistent=True)
+    fake_logic("2015-16")
+    assert calls["count"] == 5
+
+
+def test_persistent_store_expiry():
+    """Expired rows are not returned and are purged by evict()."""
+    store = _use_temp_store()
+    store.set("k1", "endpoint", "value", ttl=0.01)
+    store.set("k2", "endpoint", "value", ttl=60)
+    time.sleep(0.02)
+    assert store.get("k1") is cache._MISSING
+    assert store.get("k2") == "value"
+    store.evict()
+    assert get_persistent_store() is store
+    set_persistent_store(None)
@@ -0,0 +1,67 @@
+"""
+Smoke tests for the freshness policy in utils/cache_policy.py.
+Runs offline: classification only inspects call parameters and the configured current season.
+"""
+from datetime import date, timedelta
+
+from config import settings
+from utils.cache_policy import (
+    DataClass,
+    GAME_STATUS_FINAL,
+    GAME_STATUS_IN_PROGRESS,
+    classify_request,
+    record_game_status,
+    resolve_ttl,
+    season_start_year,
+    ttl_for,
+)
+
+CURRENT_START = season_start_year(settings.CURRENT_NBA_SEASON)
+CURRENT_SEASON = settings.CURRENT_NBA_SEASON
+PAST_SEASON = f"{CURRENT_START - 3}-{str(CURRENT_START - 2)[-2:]}"
+
+
+def test_season_parsing():
+    """Season strings, bare years and season IDs all resolve to a start year."""
+    assert season_start_year("2023-24") == 2023
+    assert season_start_year("2023") == 2023
+    assert season_start_year("22023") == 2023
+    assert season_start_year("not-a-season") is None
+
+
+def test_classify_by_family_and_season():
+    """Fixed families win; otherwise past seasons are historical and the current season is current."""
+    assert classify_request("live_game_tools.get_cached_scoreboard_data", {}) is DataClass.LIVE
+    assert classify_request("odds_tools.get_cached_odds_data", {}) is DataClass.INTRADAY
+    assert classify_request("player_gamelogs.fetch_player_gamelogs_logic", {"season": PAST_SEASON}) is DataClass.HISTORICAL
+    assert classify_request("player_gamelogs.fetch_player_gamelogs_logic", {"season": CURRENT_SEASON}) is DataClass.CURRENT
+    assert classify_request("synergy_tools.get_cached_synergy_data", {"api_kwargs": {"season": PAST_SEASON}}) is DataClass.HISTORICAL
+    assert classify_request("franchise_history.fetch_franchise_history_logic", {"league_id": "00"}) is DataClass.REFERENCE
+
+
+def test_classify_by_dates():
+    """A current-season window that closed in the past is historical; today's games are intraday."""
+    long_ago = (date.today() - timedelta(days=30)).isoformat()
+    today = date.today().isoformat()
+    params = {"season": CURRENT_SEASON, "date_to_nullable": long_ago}
+    assert classify_request("player_dashboard.fetch_logic", params) is DataClass.HISTORICAL
+    assert classify_request("scoreboard_tools.get_cached_static_scoreboard_data", {"game_date": today}) is DataClass.INTRADAY
+    assert classify_request("scoreboard_tools.get_cached_static_scoreboard_data", {"game_date": long_ago}) is DataClass.HISTORICAL
+
+
+def test_classify_by_game_status():
+    """Observed final games are immutable, in-progress games are live, unseen games follow their season."""
+    game_id = f"002{str(CURRENT_START)[-2:]}99901"
+    assert classify_request("boxscore.fetch_logic", {"game_id": game_id}) is DataClass.CURRENT
+    record_game_status(game_id, GAME_STATUS_IN_PROGRESS)
+    assert classify_request("boxscore.fetch_logic", {"game_id": game_id}) is DataClass.LIVE
+    record_game_status(game_id, GAME_STATUS_FINAL)
+    assert classify_request("boxscore.fetch_logic", {"game_id": game_id}) is DataClass.HISTORICAL
+    assert classify_request("boxscore.fetch_logic", {"game_id": "0021500001"}) is DataClass.HISTORICAL
+
+
+def test_resolve_ttl_uses_settings():
+    """TTLs come from settings, and a pinned data class skips classification."""
+    assert resolve_ttl("any.endpoint", {"season": PAST_SEASON}) == settings.CACHE_TTL_HISTORICAL_SECONDS
+    assert resolve_ttl("any.endpoint", {"season": PAST_SEASON}, DataClass.LIVE) == settings.CACHE_TTL_LIVE_SECONDS
+    assert ttl_for(DataClass.LIVE) < ttl_for(DataClass.INTRADAY) < ttl_for(DataClass.CURRENT) < ttl_for(DataClass.HISTORICAL)
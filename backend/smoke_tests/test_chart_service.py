@@ -0,0 +1,86 @@
+"""
+Smoke tests for the chart rendering service (langgraph_agent/services/chart_service.py).
+Renders into a temporary artifact store; no network access.
+"""
+import json
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from config import settings
+from langgraph_agent.services.chart_service import (
+    ChartArtifactStore, ChartService, ChartSpecError, chart_spec,
+)
+
+STATS = pd.DataFrame({
+    "PLAYER_NAME": ["A", "B", "C", "D"],
+    "PTS": [30.1, 25.5, 19.0, 12.2],
+    "AST": [5.0, 9.1, 3.3, 7.4],
+    "TEAM": ["LAL", "BOS", "LAL", "MIA"],
+})
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = ChartService(ChartArtifactStore(str(tmp_path), max_bytes=10 * 2**20), workers=2)
+    yield service
+    service._pool.shutdown(wait=True)
+
+
+def test_repeated_charts_are_served_from_the_store(service):
+    spec = chart_spec("bar", "PLAYER_NAME", "PTS", "Scoring")
+    first = service.render(STATS, spec)
+    assert not first["cached"] and first["path"].endswith(".png") and os.path.getsize(first["path"]) > 1000
+    assert first["url"] == f"{settings.CHART_URL_PREFIX}/{first['key']}.png"
+
+    # Unplotted columns don't change the key; plotted values do
+    again = service.render(STATS.assign(AST=0), spec)
+    assert again["cached"] and again["key"] == first["key"]
+    changed = service.render(STATS.assign(PTS=STATS["PTS"] + 1), spec)
+    assert not changed["cached"] and changed["key"] != first["key"]
+    assert service.info()["renders"] == 2 and service.info()["hits"] == 1
+
+
+def test_concurrent_identical_renders_are_coalesced(service):
+    spec = chart_spec("heatmap", title="Correlation")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.render(STATS, spec))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({r["key"] for r in results}) == 1
+    info = service.info()
+    assert info["renders"] == 1 and info["renders"] + info["coalesced"] + info["hits"] == 4
+
+
+def test_svg_and_vega_outputs(service):
+    svg = service.render(STATS, chart_spec("scatter", "PTS", "AST", output_format="svg"))
+    with open(svg["path"], encoding="utf-8") as f:
+        assert "<svg" in f.read(500)
+
+    vega = service.render(STATS, chart_spec("pie", y_column="TEAM", output_format="vega"))
+    with open(vega["path"], encoding="utf-8") as f:
+        spec = json.load(f)
+    assert vega["path"].endswith(".vl.json") and spec["mark"] == "arc"
+    assert spec["data"]["values"] == [{"TEAM": t} for t in STATS["TEAM"]]
+
+    with pytest.raises(ChartSpecError):
+        service.render(STATS, chart_spec("line", "PLAYER_NAME", "REB"))
+    with pytest.raises(ChartSpecError):
+        chart_spec("scatter", "PTS")
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = ChartArtifactStore(str(tmp_path), max_bytes=3000)
+    store.put("a" * 24, ".png", b"x" * 1000)
+    os.utime(store.path("a" * 24, ".png"), (1, 1))
+    store.put("b" * 24, ".png", b"x" * 1000)
+    os.utime(store.path("b" * 24, ".png"), (2, 2))
+    assert store.get("a" * 24, ".png")  # Refreshes "a", so "b" is now the oldest
+    store.put("c" * 24, ".png", b"x" * 1500)
+    assert store.get("b" * 24, ".png") is None
+    assert store.get("a" * 24, ".png") and store.get("c" * 24, ".png")
+    assert store.info()["evicted"] == 1
@@ -0,0 +1,92 @@
+"""
+Smoke tests for the durable agent checkpointer (langgraph_agent/checkpointer.py).
+Runs a small LangGraph graph offline against a temporary SQLite file.
+"""
+import sqlite3
+from typing import Annotated, List, TypedDict
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from langgraph_agent.checkpointer import SqliteCheckpointSaver
+
+TOOL_PAYLOAD = '{"rows": [' + ",".join(f'{{"game": {i}, "pts": {i % 40}}}' for i in range(5000)) + "]}"
+
+
+class State(TypedDict):
+    messages: Annotated[List[BaseMessage], add_messages]
+
+
+def _respond(state: State) -> dict:
+    turn = sum(isinstance(m, HumanMessage) for m in state["messages"])
+    return {"messages": [
+        ToolMessage(content=TOOL_PAYLOAD, tool_call_id=f"call-{turn}"),
+        AIMessage(content=f"answer {turn}"),
+    ]}
+
+
+def _graph(saver):
+    builder = StateGraph(State)
+    builder.add_node("respond", _respond)
+    builder.add_edge(START, "respond")
+    builder.add_edge("respond", END)
+    return builder.compile(checkpointer=saver)
+
+
+def _config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_threads_resume_from_a_new_saver(tmp_path):
+    db_path = str(tmp_path / "checkpoints.sqlite3")
+    _graph(SqliteCheckpointSaver(db_path)).invoke({"messages": [HumanMessage(content="first")]}, _config("t1"))
+
+    graph = _graph(SqliteCheckpointSaver(db_path))  # e.g. another worker, or after a restart
+    result = graph.invoke({"messages": [HumanMessage(content="second")]}, _config("t1"))
+    assert [m.content for m in result["messages"] if isinstance(m, AIMessage)] == ["answer 1", "answer 2"]
+    assert graph.get_state(_config("t1")).values["messages"][1].content == TOOL_PAYLOAD
+    assert len(list(graph.get_state_history(_config("t1")))) >= 4
+
+
+def test_large_tool_payloads_are_stored_once(tmp_path):
+    db_path = str(tmp_path / "checkpoints.sqlite3")
+    saver = SqliteCheckpointSaver(db_path)
+    graph = _graph(saver)
+    for turn in range(5):
+        graph.invoke({"messages": [HumanMessage(content=f"question {turn}")]}, _config("t1"))
+
+    # Every turn adds a distinct ToolMessage (different tool_call_id), each stored once,
+    # even though each checkpoint's message list contains all earlier ones.
+    info = saver.info()
+    assert info["blob_bytes"] < 5 * 2 * len(TOOL_PAYLOAD)
+    assert info["blob_stored_bytes"] < info["blob_bytes"] / 5  # zlib-compressed
+    conn = sqlite3.connect(db_path)
+    largest_value = conn.execute("SELECT MAX(LENGTH(value)) FROM channel_values").fetchone()[0]
+    assert largest_value < 2000  # Channel values hold digests, not payloads
+
+
+def test_idle_and_excess_threads_are_evicted(tmp_path):
+    saver = SqliteCheckpointSaver(str(tmp_path / "checkpoints.sqlite3"), max_threads=2)
+    graph = _graph(saver)
+    for thread_id in ("a", "b", "c"):
+        graph.invoke({"messages": [HumanMessage(content="hi")]}, _config(thread_id))
+    assert saver.evict() == 1
+    assert saver.get_tuple(_config("a")) is None
+    assert saver.get_tuple(_config("c")) is not None
+
+    saver.thread_ttl_seconds = 1e-9
+    saver.evict()
+    info = saver.info()
+    assert info["threads"] == 0 and info["checkpoints"] == 0 and info["blobs"] == 0
+
+
+def test_hot_tier_stays_within_its_budget(tmp_path):
+    saver = SqliteCheckpointSaver(str(tmp_path / "checkpoints.sqlite3"), hot_cache_bytes=len(TOOL_PAYLOAD) * 2)
+    graph = _graph(saver)
+    for thread_id in ("a", "b", "c"):
+        graph.invoke({"messages": [HumanMessage(content=thread_id)]}, _config(thread_id))
+        graph.get_state(_config(thread_id))
+    hot = saver.info()["hot_tier"]
+    assert 0 < hot["bytes"] <= saver.hot_cache_bytes
+    assert hot["hits"] > 0
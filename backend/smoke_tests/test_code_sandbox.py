@@ -0,0 +1,88 @@
+"""
+Smoke tests for the data science code sandbox (langgraph_agent/code_sandbox.py).
+Starts real worker processes (a few seconds each to import pandas/matplotlib); no network access.
+"""
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from config import settings
+from langgraph_agent.code_sandbox import CodeSandbox, read_table_file, write_table_file
+from langgraph_agent.services.tool_output_service import get_tool_result_store
+from langgraph_agent.toolkits import data_science_tools
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="The code sandbox needs POSIX resource limits")
+
+
+@pytest.fixture(scope="module")
+def sandbox():
+    os.environ["CODE_SANDBOX_CPU_SECONDS"] = "2"  # Read by the workers at startup
+    sandbox = CodeSandbox(workers=2, timeout_seconds=20)
+    sandbox.start()
+    yield sandbox
+    sandbox.shutdown()
+    os.environ.pop("CODE_SANDBOX_CPU_SECONDS", None)
+
+
+def _run(sandbox, session, code):
+    return sandbox.call(session, "execute_python_code", {"code": code})
+
+
+def test_sessions_are_per_conversation_and_run_in_parallel(sandbox):
+    assert "42" in _run(sandbox, "thread-a", "x = 41\nprint(x + 1)")
+    assert "41" in _run(sandbox, "thread-a", "print(x)")
+    assert "name 'x' is not defined" in _run(sandbox, "thread-b", "print(x)")
+    assert "x: int" in sandbox.call("thread-a", "list_session_variables", {})
+
+    # Two conversations sit on different workers, so their slow calls overlap
+    from concurrent.futures import ThreadPoolExecutor
+    started = time.perf_counter()
+    with ThreadPoolExecutor(2) as pool:
+        outputs = list(pool.map(lambda s: _run(sandbox, s, "import time; time.sleep(1); print('done')"), ["thread-a", "thread-b"]))
+    assert all("done" in output for output in outputs)
+    assert time.perf_counter() - started < 1.9
+    assert data_science_tools._sessions == {}  # Nothing ran in the API process
+
+
+def test_result_handles_are_shipped_once(sandbox):
+    df = pd.DataFrame({"PLAYER_NAME": ["A", "B", "C"], "PTS": [30.1, 25.5, 19.0]})
+    handle = get_tool_result_store().put(df)
+    shipped = sandbox.info()["tables_shipped"]
+    assert "74.6" in _run(sandbox, "thread-a", f"print(round({handle}['PTS'].sum(), 1))")
+    assert "30.1" in _run(sandbox, "thread-a", f"print(load_result('{handle}')['PTS'].max())")
+    assert sandbox.info()["tables_shipped"] == shipped + 1
+
+    path = write_table_file(df)
+    try:
+        assert path.endswith(".arrow")
+        pd.testing.assert_frame_equal(read_table_file(path), df)
+    finally:
+        os.remove(path)
+
+
+def test_limits_abort_code_without_hurting_other_sessions(sandbox):
+    _run(sandbox, "thread-c", "kept = 'still here'")
+    output = _run(sandbox, "thread-c", "while True: pass")
+    assert "CPU time limit" in output
+    assert "still here" in _run(sandbox, "thread-c", "print(kept)")  # Same worker, session intact
+
+    quick = CodeSandbox(workers=1, timeout_seconds=1)
+    try:
+        assert "did not finish within 1s" in quick.call("t", "execute_python_code", {"code": "import time; time.sleep(5)"})
+        assert quick.info()["workers"][0]["restarts"] == 1
+    finally:
+        quick.shutdown()
+
+
+def test_in_process_sessions_follow_the_thread_id(monkeypatch):
+    monkeypatch.setattr(settings, "CODE_SANDBOX_ENABLED", False)
+    tool = data_science_tools.python_repl_tool
+    try:
+        tool.invoke('{"code": "y = 1"}', {"configurable": {"thread_id": "t1"}})
+        assert "1" in tool.invoke('{"code": "print(y)"}', {"configurable": {"thread_id": "t1"}})
+        assert "not defined" in tool.invoke('{"code": "print(y)"}', {"configurable": {"thread_id": "t2"}})
+        assert set(data_science_tools._sessions) == {"t1", "t2"}
+    finally:
+        data_science_tools._sessions.clear()
@@ -0,0 +1,91 @@
+"""
+Smoke tests for composite sub-fetches (api_tools/composite.py) and the native
+payload carried by format_response. Runs offline.
+"""
+import json
+import time
+import pickle
+import asyncio
+
+from api_tools.composite import SubFetch, fetch_concurrently
+from api_tools.utils import format_response, parse_response
+from utils.cache import cached_logic, is_partial_response
+
+
+def _slow(value, delay: float = 0.3):
+    time.sleep(delay)
+    return value
+
+
+def test_sub_fetches_run_concurrently():
+    """Three 0.3s sub-fetches finish in roughly the time of one."""
+    started = time.monotonic()
+    results = fetch_concurrently({name: SubFetch(_slow, (name,)) for name in ("info", "career", "awards")})
+    assert time.monotonic() - started < 0.8
+    assert {name: result.value for name, result in results.items()} == {"info": "info", "career": "career", "awards": "awards"}
+    assert all(result.error is None for result in results.values())
+
+
+def test_failures_and_deadline_are_reported_per_sub_fetch():
+    """A raising sub-fetch and one past the deadline report errors without affecting the others."""
+    def boom():
+        raise ConnectionError("upstream down")
+
+    results = fetch_concurrently({
+        "ok": SubFetch(_slow, ("ok", 0.01)),
+        "failed": SubFetch(boom),
+        "late": SubFetch(_slow, ("late", 1.0)),
+    }, deadline=0.3)
+    assert results["ok"].value == "ok"
+    assert "upstream down" in results["failed"].error
+    assert "timed out" in results["late"].error and results["late"].value is None
+
+
+def test_format_response_carries_native_payload():
+    """Composite callers read the encoded object directly; pickled copies are plain JSON strings."""
+    payload = {"player_info": {"PERSON_ID": 2544}}
+    response = format_response(payload)
+    assert json.loads(response) == payload
+    assert parse_response(response) is payload
+    restored = pickle.loads(pickle.dumps(response))
+    assert type(restored) is str and parse_response(restored) == payload
+
+
+def test_partial_responses_are_not_cached():
+    """Responses reporting failed parts are returned but recomputed on the next call."""
+    calls = {"count": 0}
+
+    @cached_logic(maxsize=4, endpoint="test.partial_logic", persist=False)
+    def partial_logic(season: str = "2015-16"):
+        calls["count"] += 1
+        return format_response({"season": season, "partial_errors": ["awards_history: timed out"]})
+
+    assert is_partial_response(partial_logic())
+    partial_logic()
+    assert calls["count"] == 2
+
+
+def test_deferred_mode_gathers_requests_from_every_branch(monkeypatch):
+    """Under call_logic_async, the first request of each branch is fetched in the same pass."""
+    from api_tools import async_http
+    from nba_api.stats.library.http import NBAStatsHTTP
+
+    passes = []
+
+    async def fake_fetch_into(plan, deferred):
+        passes.append(sorted(request.url.rsplit("/", 1)[-1] for request in deferred.requests))
+        for request in deferred.requests:
+            plan.outcomes[request.key] = async_http.FetchedResponse(json.dumps({"ok": True}), 200, request.url)
+
+    def branch(endpoint):
+        return NBAStatsHTTP().send_api_request(endpoint, {}).get_dict()
+
+    def composite():
+        results = fetch_concurrently({name: SubFetch(branch, (name,)) for name in ("teaminfocommon", "commonteamroster")})
+        return {name: result.value for name, result in results.items()}
+
+    monkeypatch.setattr(async_http, "httpx", object())
+    monkeypatch.setattr(async_http, "_fetch_into", fake_fetch_into)
+    result = asyncio.run(async_http.call_logic_async(composite))
+    assert result == {"teaminfocommon": {"ok": True}, "commonteamroster": {"ok": True}}
+    assert passes == [["commonteamroster", "teaminfocommon"]]
@@ -0,0 +1,70 @@
+"""
+Smoke tests for the per-hop context window manager (langgraph_agent/services/context_service.py).
+Runs offline on synthetic multi-turn histories.
+"""
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from langgraph_agent.services.context_service import (
+    ContextWindowManager, context_window_info, estimate_tokens, extract_pinned_facts,
+)
+
+BIG_RESULT = json.dumps({"parameters": {"player_name": "LeBron James", "player_id": 2544, "season": "2012-13"},
+                         "data": [{"GAME": i, "PTS": 25 + i % 10} for i in range(800)]})
+
+
+def _turn(n: int):
+    call_id = f"call-{n}"
+    return [
+        HumanMessage(content=f"Question {n} about LeBron James", id=f"h{n}"),
+        AIMessage(content="", id=f"a{n}", tool_calls=[
+            {"name": "get_player_game_logs", "args": {"player_name": "LeBron James", "season": "2012-13"}, "id": call_id},
+        ]),
+        ToolMessage(content=BIG_RESULT, tool_call_id=call_id, name="get_player_game_logs", id=f"t{n}"),
+        AIMessage(content=f"Answer {n}: LeBron averaged 26.8 points.", id=f"f{n}"),
+    ]
+
+
+def _history(turns: int):
+    messages = [SystemMessage(content="You are the analytics agent.")]
+    for n in range(turns):
+        messages += _turn(n)
+    return messages[:-1]  # The current turn is still in progress
+
+
+def test_short_histories_are_untouched():
+    manager = ContextWindowManager(max_tokens=100000)
+    messages = _history(2)
+    assert manager.fit({}, messages, "analytics_agent") is messages
+
+
+def test_long_histories_fit_the_budget_and_keep_the_current_turn():
+    manager = ContextWindowManager(max_tokens=8000)
+    messages = _history(30)
+    fitted = manager.fit({"thread_id": "t"}, messages, "analytics_agent")
+    assert sum(map(estimate_tokens, fitted)) <= 8000 < sum(map(estimate_tokens, messages))
+    assert fitted[0].content == "You are the analytics agent."
+    assert "Summary of earlier conversation turns" in fitted[1].content
+    assert "2544" in fitted[1].content and "2012-13" in fitted[1].content  # Pinned facts
+    assert fitted[-3].content == "Question 29 about LeBron James"
+    # Tool calls and their results stay paired
+    call_ids = {c["id"] for m in fitted if isinstance(m, AIMessage) for c in m.tool_calls}
+    assert call_ids == {m.tool_call_id for m in fitted if isinstance(m, ToolMessage)}
+    assert len(messages) == 30 * 4  # Stored history is not modified
+
+
+def test_summaries_are_reused_across_hops():
+    manager = ContextWindowManager(max_tokens=8000)
+    messages = _history(30)
+    first = manager.fit({"thread_id": "t"}, messages, "presentation_agent")
+    second = manager.fit({"thread_id": "t"}, messages + [AIMessage(content="Done.")], "presentation_agent")
+    assert first[1] is second[1]
+    assert context_window_info()["agents"]["presentation_agent"]["summary_cache_hits"] >= 1
+
+
+def test_pinned_facts_come_from_tool_calls_and_results():
+    facts = extract_pinned_facts(_turn(0))
+    assert facts["player_name"] == ["LeBron James"]
+    assert facts["player_id"] == ["2544"]
+    assert facts["season"] == ["2012-13"]
@@ -209,6 +209,16 @@ def test_search_contracts():
         print(f"✗ Error: {e}")
         return False
 
+def test_multi_row_results_are_lists():
+    """Every contracts data set is a list of records, not just the first row."""
+    fetch_contracts_data_logic.cache_clear(persistent=True)
+    contracts = json.loads(fetch_contracts_data_logic())["data_sets"]["contracts"]
+    highest_paid = json.loads(get_highest_paid_players(limit=10))["data_sets"]["highest_paid_players"]
+    search = json.loads(search_player_contracts("James"))["data_sets"]["player_contracts"]
+    for records in (contracts, highest_paid, search):
+        assert isinstance(records, list) and len(records) > 1
+    assert len(highest_paid) == 10
+
 if __name__ == "__main__":
     print("=" * 60)
     print("CONTRACTS DATA SMOKE TESTS")
@@ -0,0 +1,86 @@
+"""
+Smoke tests for utils/dataset_store.py (Parquet datasets with metadata sidecars).
+Runs offline against a temporary directory.
+"""
+import os
+
+import pandas as pd
+
+from utils.dataset_store import (
+    dataset_path,
+    load_dataset,
+    metadata_path,
+    read_dataset_metadata,
+    save_dataset,
+    schema_hash,
+)
+
+
+def _game_log_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "GAME_ID": ["0022300001", "0022300002", "0022300003"],
+        "PLAYER_ID": [2544, 2544, 2544],
+        "PTS": [25, 31, 18],
+        "FG_PCT": [0.5, 0.61, None],
+        "WL": ["W", "L", None],
+    })
+
+
+def test_round_trip_preserves_dtypes(tmp_path):
+    """IDs stay zero-padded strings and integer columns stay integers after a reload."""
+    df = _game_log_frame()
+    written = save_dataset(df, str(tmp_path / "game_log.csv"))
+    assert written == str(tmp_path / "game_log.parquet")
+
+    loaded = load_dataset(str(tmp_path / "game_log.csv"))
+    assert loaded is not None
+    assert loaded["GAME_ID"].tolist() == df["GAME_ID"].tolist()
+    assert loaded["PLAYER_ID"].dtype == df["PLAYER_ID"].dtype
+    assert loaded["PTS"].tolist() == [25, 31, 18]
+    assert pd.isna(loaded["FG_PCT"].iloc[2])
+    print("round trip ok:", dict(loaded.dtypes.astype(str)))
+
+
+def test_metadata_sidecar(tmp_path):
+    df = _game_log_frame()
+    path = str(tmp_path / "game_log.parquet")
+    save_dataset(df, path, endpoint="playergamelog", params={"season": "2023-24"})
+
+    assert os.path.exists(metadata_path(path))
+    meta = read_dataset_metadata(path)
+    assert meta["endpoint"] == "playergamelog"
+    assert meta["params"] == {"season": "2023-24"}
+    assert meta["row_count"] == 3
+    assert meta["columns"] == list(df.columns)
+    assert meta["schema_hash"] == schema_hash(df)
+    assert meta["fetched_at"] > 0
+
+
+def test_column_projection(tmp_path):
+    path = str(tmp_path / "game_log.parquet")
+    save_dataset(_game_log_frame(), path)
+
+    loaded = load_dataset(path, columns=["GAME_ID", "PTS"])
+    assert list(loaded.columns) == ["GAME_ID", "PTS"]
+    assert len(loaded) == 3
+
+
+def test_missing_and_corrupt_datasets(tmp_path):
+    path = str(tmp_path / "broken.parquet")
+    assert load_dataset(path) is None
+
+    with open(dataset_path(path), "wb") as f:
+        f.write(b"not a parquet file")
+    assert load_dataset(path) is None
+    assert not os.path.exists(dataset_path(path))
+
+
+def test_mixed_object_columns_are_stored(tmp_path):
+    """Columns mixing strings and numbers (common in nba_api result sets) are coerced rather than rejected."""
+    df = pd.DataFrame({"VALUE": ["1", 2, None], (1, "x"): [1, 2, 3]})
+    path = str(tmp_path / "mixed.parquet")
+    assert save_dataset(df, path) is not None
+
+    loaded = load_dataset(path)
+    assert loaded["VALUE"].tolist()[:2] == ["1", "2"]
+    assert "1_x" in loaded.columns
@@ -41,11 +41,11 @@ class TestDraftCombineNonShootingReal(unittest.TestCase):
         """Test that the CSV path is generated correctly."""
         # Test with default league_id
         path = _get_csv_path_for_draft_combine_nonshooting("2022")
-        self.assertIn("draft_combine_nonshooting_2022_00.csv", path)
+        self.assertIn("draft_combine_nonshooting_2022_00.parquet", path)
 
         # Test with custom league_id
         path = _get_csv_path_for_draft_combine_nonshooting("2022", "01")
-        self.assertIn("draft_combine_nonshooting_2022_01.csv", path)
+        self.assertIn("draft_combine_nonshooting_2022_01.parquet", path)
 
     def test_fetch_draft_combine_nonshooting_logic_json(self):
         """Test fetching draft combine non-stationary shooting in JSON format."""
@@ -41,11 +41,11 @@ class TestDraftCombineSpotShootingReal(unittest.TestCase):
         """Test that the CSV path is generated correctly."""
         # Test with default league_id
         path = _get_csv_path_for_draft_combine_spot_shooting("2022")
-        self.assertIn("draft_combine_spot_shooting_2022_00.csv", path)
+        self.assertIn("draft_combine_spot_shooting_2022_00.parquet", path)
         
         # Test with custom league_id
         path = _get_csv_path_for_draft_combine_spot_shooting("2022", "01")
-        self.assertIn("draft_combine_spot_shooting_2022_01.csv", path)
+        self.assertIn("draft_combine_spot_shooting_2022_01.parquet", path)
 
     def test_fetch_draft_combine_spot_shooting_logic_json(self):
         """Test fetching draft combine spot shooting in JSON format."""
@@ -41,15 +41,15 @@ class TestDraftCombineStatsReal(unittest.TestCase):
         """Test that the CSV path is generated correctly."""
         # Test with default league_id
         path = _get_csv_path_for_draft_combine_stats("2022-23")
-        self.assertIn("draft_combine_stats_2022_23_00.csv", path)
+        self.assertIn("draft_combine_stats_2022_23_00.parquet", path)
 
         # Test with custom league_id
         path = _get_csv_path_for_draft_combine_stats("2022-23", "01")
-        self.assertIn("draft_combine_stats_2022_23_01.csv", path)
+        self.assertIn("draft_combine_stats_2022_23_01.parquet", path)
 
         # Test with "All Time"
         path = _get_csv_path_for_draft_combine_stats("All Time")
-        self.assertIn("draft_combine_stats_All_Time_00.csv", path)
+        self.assertIn("draft_combine_stats_All_Time_00.parquet", path)
 
     def test_fetch_draft_combine_stats_logic_json(self):
         """Test fetching draft combine stats in JSON format."""
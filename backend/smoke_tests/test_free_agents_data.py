@@ -250,6 +250,16 @@ def test_filtered_free_agents():
         print(f"✗ Error: {e}")
         return False
 
+def test_multi_row_results_are_lists():
+    """Every free agent data set is a list of records, not just the first row."""
+    fetch_free_agents_data_logic.cache_clear(persistent=True)
+    free_agents = json.loads(fetch_free_agents_data_logic())["data_sets"]["free_agents"]
+    top = json.loads(get_top_free_agents(limit=10))["data_sets"]["top_free_agents"]
+    search = json.loads(search_free_agents("Jo"))["data_sets"]["free_agent_search"]
+    for records in (free_agents, top, search):
+        assert isinstance(records, list) and len(records) > 1
+    assert len(top) == 10
+
 if __name__ == "__main__":
     print("=" * 60)
     print("FREE AGENTS DATA SMOKE TESTS")
@@ -0,0 +1,91 @@
+"""
+Smoke tests for the multi-family game boxscore bundle (api_tools/game_boxscores.py).
+Uses stand-in endpoint classes; no network access.
+"""
+import json
+import time
+
+import pandas as pd
+import pytest
+
+from config import settings
+from api_tools import game_boxscores
+from api_tools.game_boxscores import _fetch_boxscore_bundle, fetch_game_boxscore_bundle_logic
+from utils.cache_policy import DataClass, classify_request, season_start_year
+
+# A current-season game, so only its final status makes the bundle historical
+GAME_ID = f"002{season_start_year(settings.CURRENT_NBA_SEASON) % 100:02d}00999"
+UPSTREAM_DELAY = 0.3
+
+
+class _Dataset:
+    def __init__(self, df):
+        self._df = df
+
+    def get_data_frame(self):
+        return self._df
+
+
+def _endpoint(stat_column, calls, fail=False, **extra_datasets):
+    class FakeBoxScore:
+        def __init__(self, game_id, timeout=None):
+            calls.append(stat_column)
+            time.sleep(UPSTREAM_DELAY)
+            if fail:
+                raise ConnectionError("upstream down")
+            players = pd.DataFrame({"gameId": game_id, "personId": [1, 2, 3], "teamId": [10, 10, 20],
+                                    "nameI": ["A. One", "B. Two", "C. Three"], "minutes": ["30:00", "20:00", "25:00"],
+                                    stat_column: [5, 6, 7]})
+            teams = pd.DataFrame({"gameId": game_id, "teamId": [10, 20], "teamTricode": ["LAL", "BOS"], stat_column: [50, 60]})
+            self.player_stats, self.team_stats = _Dataset(players), _Dataset(teams)
+            for name, df in extra_datasets.items():
+                setattr(self, name, _Dataset(df))
+    return FakeBoxScore
+
+
+@pytest.fixture
+def fake_families(monkeypatch):
+    calls = []
+    summary = pd.DataFrame({"GAME_ID": [GAME_ID], "GAME_STATUS_ID": [3], "GAME_STATUS_TEXT": ["Final"]})
+    families = {
+        "traditional": (_endpoint("points", calls), {"players": "player_stats", "teams": "team_stats"}),
+        "advanced": (_endpoint("offensiveRating", calls), {"players": "player_stats", "teams": "team_stats"}),
+        "hustle": (_endpoint("deflections", calls, fail=True), {"players": "player_stats", "teams": "team_stats"}),
+        "summary": (_endpoint("unused", calls, game_summary=summary), {"game_summary": "game_summary"}),
+    }
+    monkeypatch.setattr(game_boxscores, "BOXSCORE_FAMILIES", families)
+    _fetch_boxscore_bundle.cache_clear(persistent=True)
+    yield calls
+    _fetch_boxscore_bundle.cache_clear(persistent=True)
+
+
+def test_families_are_fetched_concurrently_and_merged(fake_families):
+    started = time.monotonic()
+    result = json.loads(fetch_game_boxscore_bundle_logic(GAME_ID, ["advanced", "traditional", "summary"]))
+    assert time.monotonic() - started < 3 * UPSTREAM_DELAY
+    assert sorted(fake_families) == ["offensiveRating", "points", "unused"]
+
+    assert result["families"] == ["traditional", "advanced", "summary"]
+    assert [(p["personId"], p["points"], p["offensiveRating"]) for p in result["players"]] == [(1, 5, 5), (2, 6, 6), (3, 7, 7)]
+    assert "gameId" not in result["players"][0]
+    assert [(t["teamTricode"], t["points"], t["offensiveRating"]) for t in result["teams"]] == [("LAL", 50, 50), ("BOS", 60, 60)]
+    assert result["columns_by_family"]["advanced"] == {"players": ["offensiveRating"], "teams": ["offensiveRating"]}
+    assert result["game"]["game_summary"][0]["GAME_STATUS_TEXT"] == "Final"
+
+
+def test_bundle_is_cached_as_a_unit_once_final(fake_families):
+    first = fetch_game_boxscore_bundle_logic(GAME_ID, "summary,traditional")
+    second = fetch_game_boxscore_bundle_logic(GAME_ID, ["traditional", "summary"])
+    assert json.loads(first) == json.loads(second)
+    assert len(fake_families) == 2  # The reordered request was served from the cached bundle
+    assert classify_request(_fetch_boxscore_bundle.cache_endpoint, {"game_id": GAME_ID}) is DataClass.HISTORICAL
+
+
+def test_failed_families_are_partial_errors_and_not_cached(fake_families):
+    result = json.loads(fetch_game_boxscore_bundle_logic(GAME_ID, ["traditional", "hustle"]))
+    assert result["families"] == ["traditional"] and "upstream down" in result["partial_errors"][0]
+    fetch_game_boxscore_bundle_logic(GAME_ID, ["traditional", "hustle"])
+    assert len(fake_families) == 4
+
+    assert "error" in json.loads(fetch_game_boxscore_bundle_logic(GAME_ID, ["hustle"]))
+    assert "Invalid boxscore family" in json.loads(fetch_game_boxscore_bundle_logic(GAME_ID, ["shooting"]))["error"]
@@ -0,0 +1,82 @@
+"""
+Smoke tests for the player/team identity index (utils/identity_index.py). Runs offline on a small fixture list.
+"""
+from utils.identity_index import IdentityIndex, normalize_name
+
+PLAYERS = [
+    {"id": 1629029, "full_name": "Luka Dončić", "is_active": True},
+    {"id": 406, "full_name": "Shaquille O'Neal", "is_active": False},
+    {"id": 203076, "full_name": "Anthony Davis", "is_active": True},
+    {"id": 1626157, "full_name": "Karl-Anthony Towns", "is_active": True},
+]
+TEAMS = [
+    {"id": 1610612747, "full_name": "Los Angeles Lakers", "abbreviation": "LAL", "nickname": "Lakers", "city": "Los Angeles"},
+    {"id": 1610612746, "full_name": "LA Clippers", "abbreviation": "LAC", "nickname": "Clippers", "city": "Los Angeles"},
+    {"id": 1610612743, "full_name": "Denver Nuggets", "abbreviation": "DEN", "nickname": "Nuggets", "city": "Denver"},
+    {"id": 1610612755, "full_name": "Philadelphia 76ers", "abbreviation": "PHI", "nickname": "76ers", "city": "Philadelphia"},
+    {"id": 1610612739, "full_name": "Cleveland Cavaliers", "abbreviation": "CLE", "nickname": "Cavaliers", "city": "Cleveland"},
+    {"id": 1610612742, "full_name": "Dallas Mavericks", "abbreviation": "DAL", "nickname": "Mavericks", "city": "Dallas"},
+    {"id": 1610612744, "full_name": "Golden State Warriors", "abbreviation": "GSW", "nickname": "Warriors", "city": "Golden State"},
+]
+
+
+def test_normalize_name_folds_accents_and_punctuation():
+    assert normalize_name("Luka Dončić") == "luka doncic"
+    assert normalize_name("Shaquille O'Neal") == "shaquille oneal"
+    assert normalize_name(" Karl-Anthony  Towns ") == "karl anthony towns"
+
+
+def test_player_resolution_by_id_name_and_fragment():
+    index = IdentityIndex(PLAYERS, TEAMS)
+    assert index.resolve_player("406")["full_name"] == "Shaquille O'Neal"
+    assert index.resolve_player("luka doncic")["id"] == 1629029
+    assert index.resolve_player("O'NEAL")["id"] == 406
+    assert index.resolve_player("nobody at all") is None
+
+
+def test_fragment_search_keeps_list_order_and_limit():
+    index = IdentityIndex(PLAYERS, TEAMS)
+    assert [p["id"] for p in index.find_players("anthony")] == [203076, 1626157]
+    assert [p["id"] for p in index.find_players("anthony", limit=1)] == [203076]
+    assert [p["id"] for p in index.find_players("ka")] == [1629029, 1626157]  # Short fragments skip the trigram index
+
+
+def test_team_resolution():
+    index = IdentityIndex(PLAYERS, TEAMS)
+    assert index.resolve_team("1610612743")["abbreviation"] == "DEN"
+    assert index.resolve_team("lac")["nickname"] == "Clippers"
+    assert index.resolve_team("nuggets")["id"] == 1610612743
+    assert index.resolve_team("Denver")["id"] == 1610612743
+    assert [t["abbreviation"] for t in index.find_teams("los angeles")] == ["LAL", "LAC"]
+
+
+def test_player_aliases_resolve_before_fuzzy_matching():
+    players = PLAYERS + [
+        {"id": 201142, "full_name": "Kevin Durant", "is_active": True},
+        {"id": 1628983, "full_name": "Shai Gilgeous-Alexander", "is_active": True},
+        {"id": 1631204, "full_name": "Shaq Buchanan", "is_active": True},  # Fuzzy-closer to "Shaq" than O'Neal
+    ]
+    index = IdentityIndex(players, TEAMS)
+    assert index.resolve_player("KD")["id"] == 201142
+    assert index.resolve_player("sga")["id"] == 1628983
+    assert index.resolve_player("Shaq")["id"] == 406
+    assert index.resolve_player("AD")["id"] == 203076
+    assert index.resolve_player("Shaq Buchanan")["id"] == 1631204  # Real names still win over aliases
+
+
+def test_ambiguous_team_identifiers_do_not_resolve():
+    index = IdentityIndex(PLAYERS, TEAMS)
+    for identifier in ("Los Angeles", "los angeles", "LA"):
+        assert index.resolve_team(identifier) is None
+        assert {t["abbreviation"] for t in index.ambiguous_teams(identifier)} == {"LAL", "LAC"}
+    assert index.ambiguous_teams("Denver") == [] and index.ambiguous_teams("Lakers") == []
+
+
+def test_team_aliases_resolve_before_fuzzy_matching():
+    index = IdentityIndex(PLAYERS, TEAMS)
+    assert index.resolve_team("Sixers")["abbreviation"] == "PHI"
+    assert index.resolve_team("cavs")["abbreviation"] == "CLE"
+    assert index.resolve_team("Mavs")["abbreviation"] == "DAL"
+    assert index.resolve_team("Dubs")["abbreviation"] == "GSW"
+    assert index.resolve_team("Clips")["abbreviation"] == "LAC"
+    assert index.resolve_team("76ers")["abbreviation"] == "PHI"  # Official nicknames are unaffected
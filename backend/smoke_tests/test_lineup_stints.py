@@ -0,0 +1,133 @@
+"""
+Smoke tests for the possession and stint engine (api_tools/lineup_stints.py).
+Uses a scripted play-by-play and rotation; no network access.
+"""
+import json
+
+import pandas as pd
+import pytest
+
+from api_tools import lineup_stints
+from api_tools.lineup_stints import _compute_lineup_stints, build_action_table, fetch_lineup_stints_logic
+from api_tools.utils import format_response
+
+GAME_ID = "0022200999"
+HOME, AWAY = 1610612747, 1610612738  # Lakers, Celtics
+HOME_STARTERS = [11, 12, 13, 14, 15]
+FIRST_UNIT = " - ".join(f"Home {n}" for n in HOME_STARTERS)
+SECOND_UNIT = " - ".join(f"Home {n}" for n in (11, 12, 13, 14, 16))
+
+# (period, clock, team, person, actionType, subType, scoreHome, scoreAway)
+PLAYS = [
+    (1, "12:00", 0, 0, "period", "start", None, None),
+    (1, "11:30", HOME, 11, "Made Shot", "Jump Shot", 2, 0),
+    (1, "11:10", AWAY, 21, "Missed Shot", "Jump Shot", None, None),
+    (1, "11:08", HOME, 12, "Rebound", "Unknown", None, None),            # Ends the away possession
+    (1, "10:50", HOME, 13, "Turnover", "Bad Pass", None, None),
+    (1, "10:30", AWAY, 21, "Made Shot", "Jump Shot", 2, 3),
+    (1, "06:00", AWAY, 22, "Foul", "Shooting", None, None),
+    (1, "06:00", HOME, 14, "Free Throw", "Free Throw 1 of 2", 3, 3),  # Before the substitution: first unit
+    (1, "06:00", HOME, 15, "Substitution", "", None, None),
+    (1, "06:00", HOME, 14, "Free Throw", "Free Throw 2 of 2", 4, 3),  # After it: second unit
+    (1, "05:40", AWAY, 22, "Made Shot", "Layup", 4, 5),
+    (1, "00:00", 0, 0, "period", "end", None, None),
+    (4, "12:00", 0, 0, "period", "start", None, None),
+    (4, "08:00", AWAY, 21, "Made Shot", "3PT Jump Shot", 4, 8),
+    (4, "04:00", HOME, 16, "Made Shot", "Layup", 6, 8),                # Clutch: last five minutes, down four
+    (4, "00:00", 0, 0, "period", "end", None, None),
+]
+
+
+def _pbp():
+    rows = [{"actionNumber": n, "period": p, "clock": c, "teamId": t, "personId": pid, "actionType": a, "subType": s,
+             "scoreHome": "" if h is None else str(h), "scoreAway": "" if v is None else str(v),
+             "location": "h" if t == HOME else "v" if t == AWAY else ""}
+            for n, (p, c, t, pid, a, s, h, v) in enumerate(PLAYS, start=1)]
+    return pd.DataFrame(rows)
+
+
+def _rotation(team_id, spans, prefix):
+    return pd.DataFrame([{"TEAM_ID": team_id, "PERSON_ID": pid, "PLAYER_FIRST": prefix, "PLAYER_LAST": str(pid),
+                          "IN_TIME_REAL": start, "OUT_TIME_REAL": end} for pid, (start, end) in spans.items()])
+
+
+HOME_ROTATION = _rotation(HOME, {11: (0, 28800), 12: (0, 28800), 13: (0, 28800), 14: (0, 28800),
+                                 15: (0, 3600), 16: (3600, 28800)}, "Home")
+AWAY_ROTATION = _rotation(AWAY, {pid: (0, 28800) for pid in (21, 22, 23, 24, 25)}, "Away")
+
+
+@pytest.fixture
+def scripted_game(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_pbp(game_id, return_dataframe=False):
+        calls.append(("pbp", game_id))
+        return {"game_id": game_id}, {"play_by_play": _pbp()}
+
+    def fake_rotation(game_id, return_dataframe=False):
+        calls.append(("rotation", game_id))
+        return format_response({"game_id": game_id}), {"GameRotation": AWAY_ROTATION, "AvailableRotation": HOME_ROTATION}
+
+    monkeypatch.setattr(lineup_stints, "_fetch_historical_playbyplay_logic", fake_pbp)
+    monkeypatch.setattr(lineup_stints, "fetch_game_rotation_logic", fake_rotation)
+    monkeypatch.setattr(lineup_stints, "_table_paths",
+                        lambda game_id: (str(tmp_path / f"{game_id}_actions.parquet"), str(tmp_path / f"{game_id}_players.parquet")))
+    lineup_stints._game_tables.clear()
+    _compute_lineup_stints.cache_clear(persistent=True)
+    yield calls
+    lineup_stints._game_tables.clear()
+    _compute_lineup_stints.cache_clear(persistent=True)
+
+
+def _query(**filters):
+    return json.loads(fetch_lineup_stints_logic("Los Angeles Lakers", season="2022-23", game_ids=[GAME_ID], **filters))
+
+
+def test_action_table_possessions_and_stints():
+    table = build_action_table(_pbp(), pd.concat([AWAY_ROTATION, HOME_ROTATION]), GAME_ID)
+    assert (table["home_team_id"].iloc[0], table["away_team_id"].iloc[0]) == (HOME, AWAY)
+    assert list(table["possession_end_team"][table["possession_end_team"] > 0]) == [HOME, AWAY, HOME, AWAY, HOME, AWAY, AWAY, HOME]
+    home_fifth = table["home_5"].tolist()
+    assert home_fifth[:8] == [15] * 8 and home_fifth[8:] == [16] * 8  # The substitution splits the free throws
+    assert table.loc[table["period"] == 1, "seconds"].sum() == 720
+    assert (table[[f"away_{slot}" for slot in range(1, 6)]].to_numpy() == [21, 22, 23, 24, 25]).all()
+
+
+def test_lineup_and_on_off_ratings(scripted_game):
+    data = _query()
+    lineups = {row["lineup"]: row for row in data["lineups"]}
+    first, second = lineups[FIRST_UNIT], lineups[SECOND_UNIT]
+    assert (first["minutes"], first["points_for"], first["points_against"]) == (6.0, 3, 3)
+    assert (first["off_possessions"], first["def_possessions"], first["net_rating"]) == (2, 2, 0.0)
+    assert (second["minutes"], second["off_rating"], second["def_rating"], second["net_rating"]) == (18.0, 150.0, 250.0, -100.0)
+    assert data["team_totals"]["plus_minus"] == -2
+
+    on_off = {row["person_id"]: row for row in data["on_off"]}
+    assert on_off[15]["player_name"] == "Home 15"
+    assert (on_off[15]["on_net_rating"], on_off[15]["off_net_rating"], on_off[15]["on_off_net_rating"]) == (0.0, -100.0, 100.0)
+    assert on_off[11]["off_minutes"] == 0 and on_off[11]["off_net_rating"] is None
+
+    # The other team's view of the same game
+    away = json.loads(fetch_lineup_stints_logic("Boston Celtics", season="2022-23", game_ids=[GAME_ID]))
+    assert away["lineups"][0]["plus_minus"] == 2 and away["lineups"][0]["minutes"] == 24.0
+
+
+def test_filters_reuse_the_game_tables(scripted_game):
+    _query()
+    clutch = _query(clutch=True)
+    assert [(row["lineup"], row["minutes"], row["points_for"], row["off_rating"]) for row in clutch["lineups"]] == [
+        (SECOND_UNIT, 4.0, 2, 200.0)
+    ]
+    first_quarter = _query(periods=[1])
+    assert {row["lineup"]: row["points_against"] for row in first_quarter["lineups"]} == {FIRST_UNIT: 3, SECOND_UNIT: 2}
+    assert _query(opponent_team_identifier="Miami Heat")["lineups"] == []
+    assert _query(location="Road")["lineups"] == []
+    assert scripted_game == [("pbp", GAME_ID), ("rotation", GAME_ID)]  # Built once, filtered locally afterwards
+
+    # A final game's tables outlive the process memory
+    lineup_stints._game_tables.clear()
+    assert _query(periods=[4], location="Home")["lineups"][0]["points_for"] == 2
+    assert len(scripted_game) == 2
+
+    assert "error" in _query(periods="overtime")
+    assert "error" in _query(location="Away")
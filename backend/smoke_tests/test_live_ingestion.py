@@ -0,0 +1,116 @@
+"""
+Smoke tests for background live-game ingestion and fan-out (api_tools/live_ingestion.py, utils/live_snapshots.py).
+Uses scripted scoreboard/boxscore/play-by-play payloads; no network access.
+"""
+import asyncio
+import json
+
+import pytest
+
+from config import settings
+from api_tools.live_ingestion import LiveIngestionService, game_state
+from api_tools.live_playbyplay_store import get_live_pbp_store
+from utils.live_snapshots import PLAYBYPLAY, SCOREBOARD, drop_live_snapshots, get_live_snapshot
+
+GAME_ID = "0022400999"
+
+
+def _game(status, text="Q2 5:00"):
+    return {"gameId": GAME_ID, "gameStatus": status, "gameStatusText": text, "period": 2,
+            "gameTimeUTC": "2030-01-01T00:00:00Z",
+            "homeTeam": {"teamId": 1, "teamTricode": "LAL", "score": 50},
+            "awayTeam": {"teamId": 2, "teamTricode": "BOS", "score": 48}}
+
+
+class ScriptedFeed:
+    """Serves the game as live until `final` is set, with one more play-by-play action per poll."""
+
+    def __init__(self):
+        self.calls = {"scoreboard": 0, "boxscore": 0, "playbyplay": 0}
+        self.final = False
+
+    async def __call__(self, kind, game_id=None):
+        self.calls[kind] += 1
+        status = 3 if self.final else 2
+        if kind == "scoreboard":
+            return {"scoreboard": {"gameDate": "2030-01-01", "games": [_game(status, "Final" if self.final else "Q2 5:00")]}}
+        if kind == "boxscore":
+            return {"game": {"gameId": game_id, "gameStatus": status}}
+        actions = [{"actionNumber": n, "description": f"play {n}"} for n in range(1, self.calls["playbyplay"] + 1)]
+        return {"game": {"gameId": game_id, "actions": actions}}
+
+
+def _events(chunk):
+    return [(block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+            for block in chunk.strip().split("\n\n") if block]
+
+
+@pytest.fixture
+def fast_polls(monkeypatch):
+    monkeypatch.setattr(settings, "LIVE_POLL_LIVE_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "LIVE_POLL_SCOREBOARD_LIVE_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "LIVE_POLL_SCOREBOARD_IDLE_SECONDS", 60)
+    yield
+    drop_live_snapshots(GAME_ID)
+    get_live_pbp_store().drop(GAME_ID)
+
+
+def test_game_states():
+    assert game_state(_game(1, "7:30 pm ET")) == "scheduled"
+    assert game_state(_game(2)) == "live"
+    assert game_state(_game(2, "Halftime")) == "halftime"
+    assert game_state(_game(3, "Final")) == "final"
+
+
+def test_upstream_polls_do_not_grow_with_subscribers(fast_polls):
+    async def run(viewers):
+        get_live_pbp_store().drop(GAME_ID)
+        feed = ScriptedFeed()
+        service = LiveIngestionService(fetch=feed)
+        subscribers = [service.subscribe([GAME_ID]) for _ in range(viewers)]
+        service.start()
+        await asyncio.sleep(0.3)
+        chunks = [await s.next(0.1) for s in subscribers]
+        await service.stop()
+        return feed.calls, chunks, service.info()
+
+    few_calls, _, _ = asyncio.run(run(1))
+    many_calls, chunks, info = asyncio.run(run(50))
+    assert many_calls["playbyplay"] <= few_calls["playbyplay"] + 2
+    assert info["deliveries"] >= 50 * info["published"] - 50  # Each update rendered once, delivered to all
+
+    # Every viewer sees the scoreboard, the boxscore and each play exactly once, in order
+    for chunk in chunks:
+        events = _events(chunk)
+        assert {"scoreboard", "boxscore", "playbyplay"} <= {kind for kind, _ in events}
+        numbers = [play["event_num"] for kind, data in events if kind == "playbyplay"
+                   for period in data["periods"] for play in period["plays"]]
+        assert numbers == list(range(1, len(numbers) + 1))
+
+    # The tools read the poller's payloads instead of going upstream
+    assert get_live_snapshot(SCOREBOARD)["scoreboard"]["games"][0]["gameId"] == GAME_ID
+    assert get_live_snapshot(PLAYBYPLAY, GAME_ID)["game"]["actions"]
+
+
+def test_final_games_stop_polling_and_late_subscribers_get_a_snapshot(fast_polls):
+    async def run():
+        feed = ScriptedFeed()
+        service = LiveIngestionService(fetch=feed)
+        service.start()
+        await asyncio.sleep(0.2)
+        feed.final = True
+        await asyncio.sleep(0.3)
+        polls_at_final = feed.calls["playbyplay"]
+        await asyncio.sleep(0.3)
+        late = service.subscribe([GAME_ID])
+        chunk = await late.next(0.1)
+        await service.stop()
+        return feed.calls["playbyplay"], polls_at_final, _events(chunk), service.info()
+
+    polls, polls_at_final, events, info = asyncio.run(run())
+    assert polls == polls_at_final  # No polling once the final payloads were fetched
+    snapshot = [data for kind, data in events if kind == "playbyplay"][0]
+    assert snapshot["snapshot"] and snapshot["cursor"]["next"] == polls
+    assert [data for kind, data in events if kind == "scoreboard"][0]["games"][0]["status"]["state_text"] == "Final"
+    assert info["tracked_games"] == {"final": 1}
+    assert get_live_snapshot(PLAYBYPLAY, GAME_ID, max_age=0) is not None  # Final payloads never go stale
@@ -0,0 +1,99 @@
+"""
+Smoke tests for the incremental live play-by-play store (api_tools/live_playbyplay_store.py)
+and the play-by-play tool's cursors. Uses scripted live payloads; no network access.
+"""
+import json
+
+import pytest
+
+from api_tools.game_playbyplay import fetch_playbyplay_logic
+from api_tools.live_playbyplay_store import LivePlayByPlayStore, get_live_pbp_store
+from utils.live_snapshots import PLAYBYPLAY, drop_live_snapshots, put_live_snapshot
+
+GAME_ID = "0022400998"
+LAL = ["LeBron", "Davis", "Reaves", "Russell", "Hachimura"]
+BOS = ["Tatum", "Brown", "Holiday", "White", "Porzingis"]
+
+
+def _action(number, action_type="2pt", sub_type="jumpshot", team="LAL", player=None, period=1, score=(0, 0), **extra):
+    roster = LAL if team == "LAL" else BOS
+    player = player or roster[number % 5]
+    return {"actionNumber": number, "period": period, "clock": f"PT{11 - number % 11:02d}M{number % 60:02d}.00S",
+            "actionType": action_type, "subType": sub_type, "teamTricode": team,
+            "teamId": 1 if team == "LAL" else 2, "personId": player, "playerNameI": player,
+            "description": f"{player} {action_type}", "scoreHome": str(score[0]), "scoreAway": str(score[1]),
+            "edited": "2030-01-01T00:00:00Z", **extra}
+
+
+def _game(actions):
+    return {"game": {"gameId": GAME_ID, "actions": actions}}
+
+
+def _starters():
+    actions = [{"actionNumber": 1, "period": 1, "clock": "PT12M00.00S", "actionType": "period", "subType": "start",
+                "edited": "2030-01-01T00:00:00Z"}]
+    for i, (lal, bos) in enumerate(zip(LAL, BOS)):
+        actions.append(_action(2 + 2 * i, team="LAL", player=lal, score=(2 * (i + 1), 2 * i)))
+        actions.append(_action(3 + 2 * i, team="BOS", player=bos, score=(2 * (i + 1), 2 * (i + 1))))
+    return actions
+
+
+@pytest.fixture
+def live_game():
+    yield
+    get_live_pbp_store().drop(GAME_ID)
+    drop_live_snapshots(GAME_ID)
+
+
+def test_only_new_actions_are_formatted():
+    store = LivePlayByPlayStore()
+    actions = _starters()
+    assert store.update(GAME_ID, _game(actions)) == {"new": 11, "edited": 0, "removed": 0}
+
+    actions += [_action(12, "substitution", "out", player="Russell", score=(10, 10)),
+                _action(13, "substitution", "in", player="Vincent", score=(10, 10))]
+    assert store.update(GAME_ID, _game(actions)) == {"new": 2, "edited": 0, "removed": 0}
+    assert store.info()["actions_skipped"] == 11
+
+    changes = store.changes(GAME_ID, since=11)
+    assert [p["event_num"] for p in changes["periods"][0]["plays"]] == [12, 13]
+    assert changes["cursor"] == {"since": 11, "next": 13}
+    state = changes["state"]
+    assert state["score"] == {"home": "10", "away": "10"} and state["period"] == 1
+    assert sorted(p["person_id"] for p in state["on_court"]["LAL"]) == sorted(["LeBron", "Davis", "Reaves", "Vincent", "Hachimura"])
+    assert len(state["on_court"]["BOS"]) == 5
+    assert store.changes(GAME_ID, since=13)["periods"] == []
+
+
+def test_edits_and_removals_are_reported_after_the_cursor():
+    store = LivePlayByPlayStore()
+    actions = _starters()
+    store.update(GAME_ID, _game(actions))
+
+    actions[4] = {**actions[4], "description": "Davis 3pt (corrected)", "edited": "2030-01-01T00:05:00Z"}
+    del actions[6]  # Action 7 is withdrawn
+    actions.append(_action(12, score=(12, 10)))
+    assert store.update(GAME_ID, _game(actions)) == {"new": 1, "edited": 1, "removed": 1}
+
+    changes = store.changes(GAME_ID, since=11)
+    assert [p["event_num"] for p in changes["periods"][0]["plays"]] == [12]
+    assert changes["corrections"][0]["event_num"] == 5
+    assert changes["corrections"][0]["description"] == "Davis 3pt (corrected)"
+    assert changes["removed"] == [7]
+    assert "corrections" not in store.changes(GAME_ID, since=12 + 1)
+
+
+def test_tool_returns_plays_after_the_cursor(live_game):
+    actions = _starters()
+    put_live_snapshot(PLAYBYPLAY, _game(actions), GAME_ID)
+    full = json.loads(fetch_playbyplay_logic(GAME_ID))
+    assert full["source"] == "live" and full["cursor"]["next"] == 11
+    assert sum(len(p["plays"]) for p in full["periods"]) == 11
+
+    put_live_snapshot(PLAYBYPLAY, _game(actions + [_action(12, score=(12, 10)), _action(13, team="BOS", score=(12, 13))]), GAME_ID)
+    delta = json.loads(fetch_playbyplay_logic(GAME_ID, since_action_number=full["cursor"]["next"]))
+    assert [p["event_num"] for p in delta["periods"][0]["plays"]] == [12, 13]
+    assert delta["state"]["score"] == {"home": "12", "away": "13"}
+
+    filtered = json.loads(fetch_playbyplay_logic(GAME_ID, team_tricode="BOS", since_action_number=11))
+    assert [p["event_num"] for p in filtered["periods"][0]["plays"]] == [13]
@@ -0,0 +1,61 @@
+"""
+Smoke tests and a latency benchmark for the fuzzy name search (utils/name_search.py)
+over nba_api's full static player and team lists. Runs offline.
+"""
+import time
+
+from nba_api.stats.static import players, teams
+
+from utils.identity_index import IdentityIndex
+from utils.name_search import FuzzyNameIndex, similarity
+
+BENCHMARK_QUERIES = [
+    "Luka Doncic", "Nikola Jokic", "lebron jmaes", "steph curry", "jokic", "giannis antetokoumpo",
+    "shaq oneal", "james", "an", "kareem abdul jabar", "dame lillard", "jason tatum", "wemby",
+]
+BENCHMARK_REPEATS = 20
+MAX_MEAN_QUERY_MS = 5.0  # Typically well under 1ms; generous to keep slow CI machines green
+
+
+def _full_index() -> IdentityIndex:
+    return IdentityIndex(players.get_players(), teams.get_teams())
+
+
+def test_similarity_matches_edit_distance():
+    assert similarity("jokic", "jokic") == 1.0
+    assert similarity("jmaes", "james") == 0.6
+    assert similarity("kitten", "sitting") == 1 - 3 / 7
+
+
+def test_typos_and_diacritics_resolve():
+    index = _full_index()
+    assert index.resolve_player("Luka Doncic")["full_name"] == "Luka Dončić"
+    assert index.resolve_player("lebron jmaes")["full_name"] == "LeBron James"
+    assert index.resolve_player("giannis antetokoumpo")["full_name"] == "Giannis Antetokounmpo"
+    assert index.resolve_player("jason tatum")["full_name"] == "Jayson Tatum"
+    assert index.resolve_team("celtcs")["abbreviation"] == "BOS"
+    assert index.resolve_player("zzqx qqzv") is None
+
+
+def test_ranking_prefers_better_and_active_matches():
+    records = [
+        {"id": 1, "full_name": "Tim Duncan", "is_active": False},
+        {"id": 2, "full_name": "Tim Hardaway Jr.", "is_active": True},
+        {"id": 3, "full_name": "Tim Hardaway", "is_active": False},
+    ]
+    index = FuzzyNameIndex(records, aliases=lambda r: [r["full_name"]], boost=lambda r: 0.03 if r["is_active"] else 0.0)
+    assert [hit.record["id"] for hit in index.search("tim hardaway")] == [3, 2]  # Exact name beats the boost
+    assert [hit.record["id"] for hit in index.search("hardaway")] == [2, 3]     # Near-tie: active first
+    assert index.search("tim dunkan")[0].record["id"] == 1
+
+
+def test_search_latency_over_full_player_list():
+    """Benchmark: mean ranked top-5 latency over the full historical player list."""
+    index = _full_index()
+    started = time.perf_counter()
+    for _ in range(BENCHMARK_REPEATS):
+        for query in BENCHMARK_QUERIES:
+            index.search_players(query, limit=5)
+    mean_ms = (time.perf_counter() - started) * 1000 / (BENCHMARK_REPEATS * len(BENCHMARK_QUERIES))
+    print(f"\nFuzzy player search over {len(index.players)} players: {mean_ms:.3f} ms/query")
+    assert mean_ms < MAX_MEAN_QUERY_MS
@@ -179,7 +179,7 @@ def test_fetch_player_clutch_stats_dataframe():
                     pass # Row count can differ due to _process_dataframe, so skipping strict check here
 
                 # Check if the CSV files were created (only for non-empty DFs)
-                csv_file_name_part = f"{SAMPLE_PLAYER_NAME.lower().replace(' ', '_')}_{SAMPLE_SEASON}_{SAMPLE_SEASON_TYPE.lower().replace(' ', '_')}_{key.lower()}.csv"
+                csv_file_name_part = f"{SAMPLE_PLAYER_NAME.lower().replace(' ', '_')}_{SAMPLE_SEASON}_{SAMPLE_SEASON_TYPE.lower().replace(' ', '_')}_{key.lower()}.parquet"
                 expected_csv_path = os.path.join(PLAYER_CLUTCH_CSV_DIR, csv_file_name_part)
                 assert os.path.exists(expected_csv_path), f"Expected CSV file {expected_csv_path} was not created for DataFrame '{key}'"
                 print(f"CSV file found: {expected_csv_path}")
@@ -92,7 +92,7 @@ def test_fetch_player_profile():
                      csv_path = _get_csv_path_for_player_profile(player_id_for_csv, DEFAULT_PER_MODE_PROFILE)
                      _verify_csv_exists(csv_path)
                 elif key == "season_totals_regular_season":
-                    csv_path = os.path.join(PLAYER_PROFILE_CSV_DIR, f"player_{player_id_for_csv}_season_totals_rs_{DEFAULT_PER_MODE_PROFILE.replace(' ', '_').lower()}.csv")
+                    csv_path = os.path.join(PLAYER_PROFILE_CSV_DIR, f"player_{player_id_for_csv}_season_totals_rs_{DEFAULT_PER_MODE_PROFILE.replace(' ', '_').lower()}.parquet")
                     _verify_csv_exists(csv_path)
                 # Add checks for other specific CSVs if their naming pattern is distinct in main logic
             else:
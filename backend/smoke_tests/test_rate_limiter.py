@@ -0,0 +1,125 @@
+"""
+Smoke tests for the NBA API rate limiter / concurrency governor in utils/rate_limiter.py.
+Runs offline against local budgets; no upstream requests are made.
+"""
+import os
+import time
+import tempfile
+import threading
+
+import pytest
+
+from utils.rate_limiter import (
+    HostBudget,
+    Priority,
+    RateLimiter,
+    RateLimitTimeout,
+    SharedTokenBucket,
+    current_priority,
+    parse_host_budgets,
+    request_priority,
+)
+
+
+def test_parse_host_budgets():
+    """Budgets parse from settings-style strings; malformed entries are skipped."""
+    budgets = parse_host_budgets("stats.nba.com:4:8:4, cdn.nba.com:10:20:8,broken:1")
+    assert budgets["stats.nba.com"] == HostBudget(4.0, 8, 4)
+    assert budgets["cdn.nba.com"].max_in_flight == 8
+    assert "broken" not in budgets
+
+
+def test_token_bucket_enforces_rate():
+    """After the burst is spent, admissions are spaced by the sustained rate."""
+    limiter = RateLimiter({"stats.nba.com": HostBudget(rate=20, burst=2, max_in_flight=0)}, HostBudget(0, 1, 0))
+    started = time.monotonic()
+    for _ in range(6):
+        with limiter.slot("stats.nba.com"):
+            pass
+    elapsed = time.monotonic() - started
+    assert elapsed >= 0.15  # 4 requests beyond the burst at 20/s
+    metrics = limiter.metrics()["stats.nba.com"]
+    assert metrics["priorities"]["interactive"]["admitted"] == 6
+    assert metrics["in_flight"] == 0 and metrics["queued"] == 0
+
+
+def test_max_in_flight_and_timeout():
+    """Concurrency is capped per host, and waiting past the deadline raises RateLimitTimeout."""
+    limiter = RateLimiter({}, HostBudget(rate=0, burst=1, max_in_flight=1), max_wait=0.1)
+    limiter.acquire("stats.nba.com")
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire("stats.nba.com")
+    limiter.release("stats.nba.com")
+    assert limiter.acquire("stats.nba.com") >= 0
+    limiter.release("stats.nba.com")
+    assert limiter.metrics()["stats.nba.com"]["priorities"]["interactive"]["timeouts"] == 1
+
+
+def test_priority_admission_order():
+    """When a slot frees up, queued LIVE requests are admitted before BACKGROUND ones."""
+    limiter = RateLimiter({}, HostBudget(rate=0, burst=1, max_in_flight=1), max_wait=5)
+    limiter.acquire("stats.nba.com")
+    order = []
+
+    def worker(priority: Priority):
+        with limiter.slot("stats.nba.com", priority):
+            order.append(priority)
+
+    background = threading.Thread(target=worker, args=(Priority.BACKGROUND,))
+    background.start()
+    time.sleep(0.05)
+    live = threading.Thread(target=worker, args=(Priority.LIVE,))
+    live.start()
+    time.sleep(0.05)
+    limiter.release("stats.nba.com")
+    background.join(timeout=5)
+    live.join(timeout=5)
+    assert order == [Priority.LIVE, Priority.BACKGROUND]
+
+
+def test_higher_priority_arrival_during_token_wait():
+    """A request that got its slot removes its own ticket, not a higher-priority one queued while it waited for a token."""
+    limiter = RateLimiter({}, HostBudget(rate=5, burst=1, max_in_flight=1), max_wait=2)
+    limiter.acquire("stats.nba.com")  # Spend the only token
+    limiter.release("stats.nba.com")
+    results = {}
+
+    def worker(priority: Priority, delay: float):
+        time.sleep(delay)
+        try:
+            with limiter.slot("stats.nba.com", priority):
+                time.sleep(0.05)
+            results[priority] = "ok"
+        except Exception as e:
+            results[priority] = type(e).__name__
+
+    interactive = threading.Thread(target=worker, args=(Priority.INTERACTIVE, 0))
+    live = threading.Thread(target=worker, args=(Priority.LIVE, 0.05))  # Queues while INTERACTIVE waits for the token
+    interactive.start()
+    live.start()
+    interactive.join(timeout=5)
+    live.join(timeout=5)
+    assert results == {Priority.INTERACTIVE: "ok", Priority.LIVE: "ok"}
+    metrics = limiter.metrics()["stats.nba.com"]
+    assert metrics["queued"] == 0 and metrics["in_flight"] == 0
+    assert limiter.acquire("stats.nba.com", timeout=1) >= 0  # The gate is not left blocked
+    limiter.release("stats.nba.com")
+
+
+def test_request_priority_context_and_host_defaults():
+    """Live CDN traffic defaults to LIVE; an explicit context overrides the default."""
+    assert current_priority("cdn.nba.com") is Priority.LIVE
+    assert current_priority("stats.nba.com") is Priority.INTERACTIVE
+    with request_priority(Priority.BACKGROUND):
+        assert current_priority("cdn.nba.com") is Priority.BACKGROUND
+
+
+def test_shared_bucket_is_shared_between_instances():
+    """Two limiters pointing at the same SQLite file (e.g., two workers) draw from one budget."""
+    db_path = os.path.join(tempfile.mkdtemp(prefix="dime_rl_"), "rate_limit.sqlite3")
+    first = SharedTokenBucket(db_path, "stats.nba.com", rate=0.001, burst=2)
+    second = SharedTokenBucket(db_path, "stats.nba.com", rate=0.001, burst=2)
+    assert first.try_acquire() == 0
+    assert second.try_acquire() == 0
+    assert first.try_acquire() > 0
+    assert second.try_acquire() > 0
@@ -0,0 +1,88 @@
+"""
+Smoke tests for the season warehouse (utils/season_warehouse.py) and its resumable ingestion
+(api_tools/warehouse_ingestion.py). Uses a temporary warehouse and stand-in endpoints; no network access.
+"""
+import json
+
+import pytest
+from nba_api.stats.endpoints._base import Endpoint
+
+from api_tools import game_boxscores, warehouse_ingestion
+from api_tools.game_boxscores import fetch_boxscore_traditional_logic
+from api_tools.warehouse_ingestion import ingest_season
+from utils.season_warehouse import SeasonWarehouse, get_season_warehouse, set_season_warehouse
+
+SEASON = "2015-16"
+GAMES = [{"game_id": f"00215000{n:02d}", "game_date": f"2015-10-{n + 10:02d}", "matchup": "GSW vs. CLE"} for n in range(1, 4)]
+
+
+def _endpoint(name, calls, fail_for=()):
+    """An nba_api-style endpoint class with player and team datasets."""
+    def __init__(self, game_id, timeout=None):
+        calls.append(game_id)
+        if game_id in fail_for:
+            raise ConnectionError("upstream down")
+        players = {"headers": ["personId", "teamId", "points"], "data": [[1, 10, 30], [2, 20, None if game_id.endswith("1") else 12]]}
+        teams = {"headers": ["teamId", "points"], "data": [[10, 110], [20, 100]]}
+        self.data_sets = [Endpoint.DataSet(data=players), Endpoint.DataSet(data=teams)]
+        self.player_stats, self.team_stats = Endpoint.DataSet(data=players), Endpoint.DataSet(data=teams)
+        self.player_stats.data, self.team_stats.data = self.data_sets[0].data, self.data_sets[1].data
+    return type(name, (), {"__init__": __init__})
+
+
+@pytest.fixture
+def warehouse(tmp_path, monkeypatch):
+    previous = get_season_warehouse()
+    store = SeasonWarehouse(str(tmp_path))
+    set_season_warehouse(store)
+    monkeypatch.setattr(warehouse_ingestion, "enumerate_season_games", lambda season, season_type: GAMES if season_type == "Regular Season" else [])
+    yield store
+    set_season_warehouse(previous)
+
+
+def test_ingestion_checkpoints_and_resumes(warehouse, monkeypatch):
+    box_calls, pbp_calls = [], []
+    monkeypatch.setattr(warehouse_ingestion, "WAREHOUSE_SOURCES", {
+        "FakeBoxScore": _endpoint("FakeBoxScore", box_calls),
+        "FakePlayByPlay": _endpoint("FakePlayByPlay", pbp_calls, fail_for={GAMES[1]["game_id"]}),
+    })
+
+    first = ingest_season(SEASON, max_games=2, workers=2)
+    assert (first["games"], first["stored"], first["failed"]) == (3, 3, 1)
+    assert sorted(box_calls) == [GAMES[0]["game_id"], GAMES[1]["game_id"]]  # Oldest games first
+
+    second = ingest_season(SEASON, workers=2)
+    assert (second["stored"], second["failed"], second["already_done"]) == (2, 1, 3)
+    assert sorted(box_calls) == sorted(g["game_id"] for g in GAMES)  # Stored fetches are not repeated
+    assert pbp_calls.count(GAMES[1]["game_id"]) == 2  # Failures are retried by later runs
+
+    ingest_season(SEASON, workers=2)
+    assert pbp_calls.count(GAMES[1]["game_id"]) == 3
+    assert ingest_season(SEASON, workers=2)["already_done"] == 6  # Given up after WAREHOUSE_MAX_ATTEMPTS
+
+    assert warehouse.info()["seasons"][SEASON] == {"games": 3, "games_stored": 3}
+    players = warehouse.season_table("FakeBoxScore", "player_stats")
+    assert len(players) == 6 and set(players["game_id"]) == {g["game_id"] for g in GAMES}
+    assert players["points"].isna().sum() == 1 and set(players["season"]) == {SEASON}
+
+
+def test_logic_functions_answer_from_the_warehouse(warehouse, monkeypatch):
+    game_id = GAMES[0]["game_id"]
+    calls = []
+    monkeypatch.setattr(warehouse_ingestion, "WAREHOUSE_SOURCES", {"BoxScoreTraditionalV3": _endpoint("BoxScoreTraditionalV3", calls)})
+    ingest_season(SEASON, max_games=1)
+
+    def offline(*args, **kwargs):
+        raise AssertionError("stats.nba.com must not be called for an ingested game")
+    monkeypatch.setattr(game_boxscores, "BoxScoreTraditionalV3", type("BoxScoreTraditionalV3", (), {"__init__": offline}))
+    fetch_boxscore_traditional_logic.cache_clear(persistent=True)
+    try:
+        result = json.loads(fetch_boxscore_traditional_logic(game_id))
+        assert [p["points"] for p in result["players"]] == [30, None]
+        assert [t["points"] for t in result["teams"]] == [110, 100]
+
+        # Period-filtered requests are not what the warehouse holds, so they still go upstream
+        assert "error" in json.loads(fetch_boxscore_traditional_logic(game_id, start_period=1, end_period=1))
+    finally:
+        fetch_boxscore_traditional_logic.cache_clear(persistent=True)
+    assert warehouse.info()["hits"] == 1
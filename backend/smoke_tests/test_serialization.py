@@ -0,0 +1,134 @@
+"""
+Smoke tests and a throughput benchmark for the DataFrame-to-JSON path in api_tools/utils.py
+(_process_dataframe, dumps_json, format_response). Runs offline on synthetic frames shaped
+like LeagueDashPlayerStats (~500 x 65) and ShotChartLeagueWide (tens of thousands of rows).
+"""
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from api_tools.utils import (
+    _convert_value_for_json,
+    _process_dataframe,
+    dumps_json,
+    format_response,
+)
+
+
+def _legacy_process_dataframe(df, single_row=True):
+    """The previous per-cell implementation, kept here as the benchmark baseline."""
+    if df is None or df.empty:
+        return {} if single_row else []
+    if single_row:
+        return {col: _convert_value_for_json(value, col, "single_row") for col, value in df.iloc[0].items()}
+    records = []
+    for _, row_series in df.iterrows():
+        records.append({col: _convert_value_for_json(value, col, "multi_row") for col, value in row_series.items()})
+    return records
+
+
+def _league_dash_like_frame(rows: int = 500, numeric_columns: int = 60) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    data = {
+        "PLAYER_ID": np.arange(rows, dtype=np.int64) + 200000,
+        "PLAYER_NAME": [f"Player {i}" for i in range(rows)],
+        "TEAM_ABBREVIATION": rng.choice(["LAL", "BOS", "GSW", "DEN"], rows),
+        "AGE": rng.integers(19, 40, rows).astype(float),
+        "NICKNAME": [None if i % 7 == 0 else f"P{i}" for i in range(rows)],
+    }
+    for index in range(numeric_columns):
+        column = rng.random(rows) * 40
+        column[rng.random(rows) < 0.05] = np.nan
+        data[f"STAT_{index}"] = column
+    return pd.DataFrame(data)
+
+
+def _shot_chart_like_frame(rows: int = 20000) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    return pd.DataFrame({
+        "GRID_TYPE": "Shot Chart Detail",
+        "SHOT_ZONE_BASIC": rng.choice(["Restricted Area", "Mid-Range", "Above the Break 3"], rows),
+        "SHOT_ZONE_AREA": rng.choice(["Center(C)", "Left Side(L)", "Right Side(R)"], rows),
+        "SHOT_ZONE_RANGE": rng.choice(["Less Than 8 ft.", "16-24 ft.", "24+ ft."], rows),
+        "FGA": rng.integers(0, 500, rows),
+        "FGM": rng.integers(0, 250, rows),
+        "FG_PCT": rng.random(rows),
+        "GAME_DATE": pd.date_range("2023-10-24", periods=rows, freq="min"),
+    })
+
+
+def _rows_per_second(func, df: pd.DataFrame, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(df, single_row=False)
+        best = min(best, time.perf_counter() - started)
+    return len(df) / best
+
+
+def test_process_dataframe_types():
+    """NaN/NaT/pd.NA become None, numpy scalars become Python numbers, timestamps become ISO strings."""
+    df = pd.DataFrame({
+        "INT": np.array([1, 2], dtype=np.int64),
+        "FLOAT": [1.5, np.nan],
+        "INF": [np.inf, 2.0],
+        "TEXT": ["a", None],
+        "WHEN": pd.to_datetime(["2024-01-02", None]),
+        "NULLABLE": pd.array([3, None], dtype="Int64"),
+        "FLAG": [True, False],
+        "MIXED": [np.int64(5), pd.Timestamp("2024-03-01")],
+    })
+    records = _process_dataframe(df, single_row=False)
+    assert records[0] == {
+        "INT": 1, "FLOAT": 1.5, "INF": None, "TEXT": "a", "WHEN": "2024-01-02T00:00:00",
+        "NULLABLE": 3, "FLAG": True, "MIXED": 5,
+    }
+    assert records[1]["FLOAT"] is None and records[1]["WHEN"] is None and records[1]["NULLABLE"] is None
+    assert records[1]["MIXED"] == "2024-03-01T00:00:00"
+    assert all(type(value) in (int, float, str, bool, type(None)) for record in records for value in record.values())
+    assert _process_dataframe(df, single_row=True) == records[0]
+    assert _process_dataframe(pd.DataFrame(), single_row=True) == {}
+    assert _process_dataframe(None, single_row=False) == []
+
+
+def test_process_dataframe_matches_legacy_output():
+    """The vectorized path produces the same records as the per-cell implementation on finite data."""
+    df = _league_dash_like_frame(rows=50, numeric_columns=5)
+    assert _process_dataframe(df, single_row=False) == _legacy_process_dataframe(df, single_row=False)
+
+
+def test_multiindex_columns_are_flattened():
+    """MultiIndex headers (e.g., shot-location endpoints) are joined with underscores."""
+    df = pd.DataFrame([[1, 2]], columns=pd.MultiIndex.from_tuples([("Restricted Area", "FGM"), ("Restricted Area", "FGA")]))
+    assert _process_dataframe(df, single_row=False) == [{"Restricted Area_FGM": 1, "Restricted Area_FGA": 2}]
+
+
+def test_format_response_encoding():
+    """format_response emits valid JSON for numpy, timestamps and NaN, and keeps the error shape."""
+    payload = json.loads(format_response({"n": np.int64(3), "f": np.float32(0.5), "t": pd.Timestamp("2024-01-01"), "nan": float("nan")}))
+    assert payload == {"n": 3, "f": 0.5, "t": "2024-01-01T00:00:00", "nan": None}
+    assert json.loads(format_response(error="boom")) == {"error": "boom"}
+    assert format_response() == "{}"
+    assert isinstance(dumps_json({"a": [1, 2]}), bytes)
+
+
+def test_serialization_benchmark():
+    """Prints rows/sec for the legacy and vectorized serializers; the vectorized path must be faster."""
+    for label, df in (("LeagueDashPlayerStats-like", _league_dash_like_frame()), ("ShotChartLeagueWide-like", _shot_chart_like_frame())):
+        legacy = _rows_per_second(_legacy_process_dataframe, df, repeat=1)
+        vectorized = _rows_per_second(_process_dataframe, df)
+        print(f"\n{label} ({len(df)} rows x {len(df.columns)} cols): legacy {legacy:,.0f} rows/s, "
+              f"vectorized {vectorized:,.0f} rows/s ({vectorized / legacy:.1f}x)")
+        assert vectorized > legacy
+
+    records = _process_dataframe(_shot_chart_like_frame(), single_row=False)
+    started = time.perf_counter()
+    stdlib_bytes = json.dumps({"data": records}, default=str).encode("utf-8")
+    stdlib_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    fast_bytes = dumps_json({"data": records})
+    fast_seconds = time.perf_counter() - started
+    print(f"Encoding {len(records)} records: json.dumps {stdlib_seconds * 1000:.1f} ms, dumps_json {fast_seconds * 1000:.1f} ms")
+    assert json.loads(fast_bytes) == json.loads(stdlib_bytes)
@@ -0,0 +1,100 @@
+"""
+Smoke tests for request coalescing (utils/single_flight.py) and its use in the
+nba_api client wrapper and the cached_logic decorator. Runs offline.
+"""
+import json
+import time
+import threading
+
+from utils.single_flight import SingleFlight
+from utils.cache import cached_logic
+
+
+def _run_concurrently(target, count: int = 8):
+    """Starts `count` threads on `target` at the same moment and collects their results."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index: int):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results
+
+
+def test_concurrent_calls_share_one_execution():
+    """Identical concurrent calls run the upstream function once and share its result."""
+    flight = SingleFlight("test")
+    calls = {"count": 0}
+
+    def slow_fetch():
+        calls["count"] += 1
+        time.sleep(0.2)
+        return {"rows": [1, 2, 3]}
+
+    results = _run_concurrently(lambda: flight.do("leaguedashplayerstats:{}", slow_fetch))
+    assert calls["count"] == 1
+    assert all(result is results[0] for result in results)
+    info = flight.info()
+    assert info["executed"] == 1 and info["coalesced"] == 7 and info["in_flight"] == 0
+
+
+def test_leader_exception_is_shared_and_not_retained():
+    """Waiters see the leader's exception; the next call after completion runs again."""
+    flight = SingleFlight("test")
+
+    def failing_fetch():
+        time.sleep(0.1)
+        raise ConnectionError("upstream down")
+
+    def call():
+        try:
+            flight.do("key", failing_fetch)
+        except ConnectionError as e:
+            return str(e)
+        return None
+
+    assert _run_concurrently(call, count=4) == ["upstream down"] * 4
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+def test_reentrant_call_does_not_deadlock():
+    """A leader calling back into the same key runs the inner call directly."""
+    flight = SingleFlight("test")
+    assert flight.do("key", lambda: flight.do("key", lambda: "inner")) == "inner"
+
+
+def test_cached_logic_coalesces_misses():
+    """Concurrent cache misses for the same logic call execute the function once."""
+    calls = {"count": 0}
+
+    @cached_logic(maxsize=4, endpoint="test.coalesced_logic", persist=False)
+    def coalesced_logic(season: str = "2015-16"):
+        calls["count"] += 1
+        time.sleep(0.2)
+        return json.dumps({"season": season})
+
+    results = _run_concurrently(lambda: coalesced_logic("2015-16"), count=6)
+    assert calls["count"] == 1
+    assert len(set(results)) == 1
+    assert coalesced_logic.flight_info()["coalesced"] == 5
+
+
+def test_nba_api_request_coalescing_installed():
+    """The shared nba_api HTTP layer is wrapped exactly once and keys ignore parameter order."""
+    from nba_api.library.http import NBAHTTP
+    from nba_api.stats.library.http import NBAStatsHTTP
+    from api_tools import http_client
+
+    http_client.install_request_coalescing()
+    assert getattr(NBAHTTP.send_api_request, "_coalesced", False)
+
+    client = NBAStatsHTTP()
+    key_a = http_client._request_key(client, "LeagueDashPlayerStats", {"Season": "2023-24", "PerMode": "PerGame"})
+    key_b = http_client._request_key(client, "leaguedashplayerstats", {"PerMode": "PerGame", "Season": "2023-24"})
+    assert key_a == key_b
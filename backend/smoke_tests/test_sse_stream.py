@@ -0,0 +1,142 @@
+"""
+Smoke tests for SSE stream protocols, event batching and compression (langgraph_agent/services/stream_service.py).
+Runs a small local LangGraph graph with a fake chat model; no network access.
+"""
+import asyncio
+import json
+import zlib
+from typing import Annotated, List, TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from langgraph_agent.services.stream_service import EventStreamProcessor, SSEEncoder, coalesce_events
+
+ANSWER = "LeBron James averaged 25.7 points per game in 2023-24."
+TOOL_OUTPUT = "res_0123456789 condensed table\n" + "PLAYER,PTS\n" * 500
+
+
+class State(TypedDict, total=False):
+    input_query: str
+    thread_id: str
+    messages: Annotated[List[BaseMessage], add_messages]
+
+
+def build_app():
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=ANSWER)]))
+
+    def entry_node(state):
+        return {"messages": [ToolMessage(content=TOOL_OUTPUT, tool_call_id="call-1", name="league_leaders")]}
+
+    def presentation_agent(state):
+        return {"messages": [llm.invoke(state["messages"])]}
+
+    graph = StateGraph(State)
+    graph.add_node("entry_node", entry_node)
+    graph.add_node("presentation_agent", presentation_agent)
+    graph.add_edge(START, "entry_node")
+    graph.add_edge("entry_node", "presentation_agent")
+    graph.add_edge("presentation_agent", END)
+    return graph.compile()
+
+
+class FakeMemoryManager:
+    def generate_thread_id(self):
+        return "thread-1"
+
+    def create_thread_config(self, thread_id, user_id=None):
+        return {"configurable": {"thread_id": thread_id}}
+
+
+def _parse(stream: str):
+    events = []
+    for block in stream.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+async def _collect(protocol):
+    processor = EventStreamProcessor(build_app(), FakeMemoryManager())
+    return "".join([event async for event in processor.process_events("LeBron scoring?", protocol=protocol)])
+
+
+def test_v2_streams_tokens_and_compacts_messages():
+    v1 = asyncio.run(_collect("v1"))
+    v2 = asyncio.run(_collect("v2"))
+    v1_events, v2_events = _parse(v1), _parse(v2)
+
+    tokens = [data for event, data in v2_events if event == "token"]
+    assert len(tokens) > 1 and "".join(t["delta"] for t in tokens) == ANSWER
+    assert {t["node"] for t in tokens} == {"presentation_agent"}
+
+    answer = [data for event, data in v2_events if event == "message" and data["type"] == "ai"][0]
+    assert answer["streamed"] and "content" not in answer and answer["id"] == tokens[0]["id"]
+
+    tool_result = [data for event, data in v2_events if event == "message" and data["type"] == "tool_result"][0]
+    assert tool_result["truncated"] and tool_result["content_length"] == len(TOOL_OUTPUT)
+    assert tool_result["handles"] == ["res_0123456789"]
+
+    # v1 is unchanged: full contents, no tokens
+    assert "token" not in {event for event, _ in v1_events}
+    assert any(data.get("content") == TOOL_OUTPUT for event, data in v1_events if event == "message")
+    assert len(v2) < len(v1) - len(TOOL_OUTPUT) // 2
+
+
+async def _slow_source(delays):
+    for i, delay in enumerate(delays):
+        await asyncio.sleep(delay)
+        yield f"event: token\ndata: {i}\n\n"
+
+
+def test_events_within_the_flush_window_are_batched():
+    async def run():
+        return [chunk async for chunk in coalesce_events(_slow_source([0, 0, 0, 0.15, 0]), window_seconds=0.05)]
+
+    chunks = asyncio.run(run())
+    assert [chunk.count("event: token") for chunk in chunks] == [3, 2]
+
+    async def run_small():
+        return [chunk async for chunk in coalesce_events(_slow_source([0] * 4), window_seconds=0.05, max_bytes=40)]
+
+    assert len(asyncio.run(run_small())) == 2  # Each event is 22 bytes, so batches of two flush early
+
+
+def test_closing_the_batched_stream_closes_the_source():
+    closed = []
+
+    async def source():
+        try:
+            yield "event: a\ndata: {}\n\n"
+            await asyncio.sleep(10)
+            yield "event: b\ndata: {}\n\n"
+        finally:
+            closed.append(True)
+
+    async def run():
+        stream = coalesce_events(source(), window_seconds=0.01)
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first
+
+    assert asyncio.run(asyncio.wait_for(run(), 2)).startswith("event: a")
+    assert closed == [True]
+
+
+def test_gzip_stream_is_decodable_after_every_chunk():
+    assert SSEEncoder.negotiate("gzip, deflate") == "gzip"
+    assert SSEEncoder.negotiate("gzip;q=0, identity") is None
+    assert SSEEncoder.negotiate(None) is None
+
+    encoder = SSEEncoder("gzip")
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    chunks = [f'event: message\ndata: {{"type": "tool_result", "content": "row {i}"}}\n\n' for i in range(20)]
+    sizes = []
+    for chunk in chunks:
+        encoded = encoder.encode(chunk)
+        sizes.append(len(encoded))
+        assert decoder.decompress(encoded).decode() == chunk  # Nothing is held back in the compressor
+    decoder.decompress(encoder.close())
+    assert decoder.eof and sizes[-1] < len(chunks[-1]) / 2
@@ -40,7 +40,7 @@ class TestTeamDetailsReal(unittest.TestCase):
         # Test with team ID
         path = _get_csv_path_for_team_details("1610612739")
         self.assertIn("team_details_1610612739", path)
-        self.assertTrue(path.endswith(".csv"))
+        self.assertTrue(path.endswith(".parquet"))
 
     def test_fetch_team_details_logic_json(self):
         """Test fetching team details in JSON format."""
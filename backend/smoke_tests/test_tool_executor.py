@@ -0,0 +1,134 @@
+"""
+Smoke tests for parallel tool execution (langgraph_agent/tool_executor.py) and call deadlines (utils/deadline.py).
+Uses local sleeping tools; no network access.
+"""
+import asyncio
+import json
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+
+from langgraph_agent.tool_executor import ToolExecutor, parse_tool_timeouts
+from utils import deadline
+
+
+@tool
+def slow_stats(player_name: str, delay: float = 0.3) -> str:
+    """Returns a player's stats after a blocking delay."""
+    time.sleep(delay)
+    return json.dumps({"player": player_name, "ppg": 25.0, "deadline_left": deadline.remaining()})
+
+
+@tool
+async def async_stats(player_name: str, delay: float = 0.3) -> str:
+    """Returns a player's stats after a non-blocking delay."""
+    await asyncio.sleep(delay)
+    return json.dumps({"player": player_name, "ppg": 30.0})
+
+
+@tool
+def broken_tool(query: str) -> str:
+    """Always fails."""
+    raise ValueError(f"bad query {query}")
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.events = []
+
+    def write(self, data):
+        self.events.append(data)
+
+
+def _state(*calls):
+    tool_calls = [{"name": name, "args": args, "id": f"call_{i}", "type": "tool_call"} for i, (name, args) in enumerate(calls)]
+    return {"messages": [HumanMessage(content="compare"), AIMessage(content="", tool_calls=tool_calls)]}
+
+
+def _executor(**kwargs):
+    executor = ToolExecutor([slow_stats, async_stats, broken_tool], **kwargs)
+    executor._stream_writer = RecordingWriter()
+    return executor
+
+
+def test_calls_run_concurrently_and_keep_order():
+    executor = _executor(timeouts={})
+    state = _state(
+        ("slow_stats", {"player_name": "A", "delay": 0.4}),
+        ("async_stats", {"player_name": "B", "delay": 0.1}),
+        ("slow_stats", {"player_name": "C", "delay": 0.4}),
+        ("async_stats", {"player_name": "D", "delay": 0.4}),
+    )
+    started = time.perf_counter()
+    messages = asyncio.run(executor.arun(state))["messages"]
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0, f"calls ran sequentially ({elapsed:.2f}s)"
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2", "call_3"]
+    assert [json.loads(m.content)["player"] for m in messages] == ["A", "B", "C", "D"]
+    # Sync tools see their call's deadline in the worker thread
+    assert 0 < json.loads(messages[0].content)["deadline_left"] <= executor.default_timeout
+
+    events = executor._stream_writer.events
+    assert [e["completed"] for e in events] == [1, 2, 3, 4]
+    assert events[0]["tool_call_id"] == "call_1"  # Fastest call is streamed first
+    assert all(e["type"] == "tool_result" and e["status"] == "success" and e["total"] == 4 for e in events)
+
+
+def test_timeouts_errors_and_unknown_tools_become_error_messages():
+    executor = _executor(timeouts={"async_stats": 0.2, "slow_stats": 0.2})
+    state = _state(
+        ("async_stats", {"player_name": "A", "delay": 5}),
+        ("slow_stats", {"player_name": "B", "delay": 1}),
+        ("broken_tool", {"query": "x"}),
+        ("no_such_tool", {}),
+        ("async_stats", {"player_name": "C", "delay": 0.01}),
+    )
+    started = time.perf_counter()
+    messages = executor.run(state)["messages"]
+    assert time.perf_counter() - started < 1.5
+
+    assert [m.status for m in messages] == ["error", "error", "error", "error", "success"]
+    assert "did not finish within 0.2s" in messages[0].content
+    assert "did not finish within 0.2s" in messages[1].content
+    assert "bad query x" in messages[2].content
+    assert "no_such_tool is not a valid tool" in messages[3].content
+    statuses = {e["tool_call_id"]: e["status"] for e in executor._stream_writer.events}
+    assert statuses["call_0"] == "timeout" and statuses["call_4"] == "success"
+
+
+def test_cancellation_cancels_pending_calls():
+    executor = _executor(timeouts={})
+    finished = []
+
+    async def main():
+        state = _state(("async_stats", {"player_name": "A", "delay": 5}), ("async_stats", {"player_name": "B", "delay": 0.01}))
+        task = asyncio.ensure_future(executor.arun(state))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        finished.append(len([t for t in asyncio.all_tasks() if t is not asyncio.current_task()]))
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - started < 1.0
+    assert finished == [0]
+    assert [e["tool_call_id"] for e in executor._stream_writer.events] == ["call_1"]
+
+
+def test_deadline_caps_timeouts():
+    assert deadline.cap_timeout(30) == 30
+    with deadline.deadline_scope(2):
+        assert deadline.cap_timeout(30) <= 2
+        assert deadline.cap_timeout((5, 30))[1] <= 2
+        with deadline.deadline_scope(60):  # Nested scopes keep the earlier deadline
+            assert deadline.remaining() <= 2
+    with deadline.deadline_scope(0):
+        with pytest.raises(deadline.DeadlineExceeded):
+            deadline.check()
+    assert parse_tool_timeouts("python_code_execution:120, exa_web_search:20,bad") == {
+        "python_code_execution": 120.0, "exa_web_search": 20.0,
+    }
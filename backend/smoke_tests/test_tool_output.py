@@ -0,0 +1,87 @@
+"""
+Smoke tests for tool output condensation (langgraph_agent/services/tool_output_service.py).
+Runs offline: a stand-in league-wide tool inside a small LangGraph graph, executed by the ToolExecutor.
+"""
+import json
+from typing import Annotated, List, TypedDict
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+import pytest
+
+from langgraph_agent.services.tool_output_service import (
+    ToolOutputCondenser, ToolResultStore, load_tool_result, tool_output_info,
+)
+from langgraph_agent.tool_executor import ToolExecutor
+from utils.cache import PersistentStore, set_persistent_store
+from langgraph_agent.toolkits.data_science_tools import execute_python_code
+
+ROWS = [
+    {"PLAYER_ID": 1000 + i, "PLAYER_NAME": f"Player {i}", "TEAM_ABBREVIATION": "BOS" if i % 2 else "LAL",
+     "GP": 60 + i % 20, "PTS": round(30 - i * 0.05, 1), "REB": 5.5, "AST": round(i % 11 * 0.7, 1)}
+    for i in range(500)
+]
+LEAGUE_PAYLOAD = json.dumps({"parameters": {"season": "2024-25"}, "data_sets": {"LeagueDashPlayerStats": ROWS}})
+
+
+@tool
+def get_nba_league_player_stats(season: str) -> str:
+    """Fetches league-wide player statistics."""
+    return LEAGUE_PAYLOAD
+
+
+@tool
+def get_player_info(player_name: str) -> str:
+    """Fetches one player's info."""
+    return json.dumps({"player": {"name": player_name, "team": "BOS"}})
+
+
+@pytest.fixture(autouse=True)
+def temp_persistent_store(tmp_path):
+    """Stored tables go to a throwaway SQLite file instead of the shared response cache."""
+    set_persistent_store(PersistentStore(str(tmp_path / "response_cache.sqlite3")))
+    yield
+    set_persistent_store(None)
+
+
+class State(TypedDict):
+    messages: Annotated[List[BaseMessage], add_messages]
+
+
+def _run_tools(*calls) -> List[ToolMessage]:
+    builder = StateGraph(State)
+    executor = ToolExecutor([get_nba_league_player_stats, get_player_info], message_processor=ToolOutputCondenser().condense_message)
+    builder.add_node("tools", executor.node())
+    builder.add_edge(START, "tools")
+    builder.add_edge("tools", END)
+    tool_calls = [{"name": name, "args": args, "id": f"call-{i}"} for i, (name, args) in enumerate(calls)]
+    result = builder.compile().invoke({"messages": [AIMessage(content="", tool_calls=tool_calls)]})
+    return [m for m in result["messages"] if isinstance(m, ToolMessage)]
+
+
+def test_large_tables_are_condensed_behind_a_handle():
+    league, player = _run_tools(
+        ("get_nba_league_player_stats", {"season": "2024-25"}), ("get_player_info", {"player_name": "Jayson Tatum"})
+    )
+    assert json.loads(player.content)["player"]["name"] == "Jayson Tatum"  # Small results pass through
+    assert len(league.content) * 10 < len(LEAGUE_PAYLOAD)
+
+    summary = json.loads(league.content)["data_sets"]["LeagueDashPlayerStats"]
+    assert summary["row_count"] == 500 and len(summary["first_rows"]) == 10
+    assert summary["column_stats"]["PTS"]["max"] == 30.0
+    assert "PLAYER_ID" not in summary["column_stats"]
+    assert summary["column_stats"]["TEAM_ABBREVIATION"] == {"unique": 2}
+
+    df = load_tool_result(summary["handle"])
+    assert len(df) == 500 and list(df.columns) == list(ROWS[0])
+    assert len(ToolResultStore().get(summary["handle"])) == 500  # e.g. another worker: empty memory tier
+    assert tool_output_info()["tools"]["get_nba_league_player_stats"]["condensed"] >= 1
+
+
+def test_python_repl_reads_condensed_results_by_handle():
+    league, = _run_tools(("get_nba_league_player_stats", {"season": "2024-25"}))
+    handle = json.loads(league.content)["data_sets"]["LeagueDashPlayerStats"]["handle"]
+    output = execute_python_code(f"print(len(load_result('{handle}')), {handle}['GP'].max())")
+    assert "500 79" in output
@@ -0,0 +1,82 @@
+"""
+Smoke tests for lazy tool loading (langgraph_agent/tool_registry.py).
+Uses a throwaway toolkit module and a temporary manifest; no network access.
+"""
+import asyncio
+import sys
+import textwrap
+
+import pytest
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from langgraph_agent.tool_registry import LazyTool, ToolRegistry
+
+TOOLKIT_SOURCE = textwrap.dedent('''
+    import json
+    from pydantic import BaseModel, Field
+    from langchain_core.tools import Tool, tool
+
+    class ScoreInput(BaseModel):
+        """Input schema for the score tool."""
+        player_name: str = Field(..., description="Player's full name.")
+        season: str = Field("2024-25", description="Season in YYYY-YY format.")
+
+    @tool("get_score", args_schema=ScoreInput)
+    def get_score(player_name: str, season: str = "2024-25") -> str:
+        """Returns a player's scoring average."""
+        return json.dumps({"player": player_name, "season": season, "ppg": 27.1})
+
+    echo_tool = Tool(name="echo", description="Echoes its input.", func=lambda x: f"echo:{x}")
+''')
+
+
+@pytest.fixture
+def toolkit(tmp_path, monkeypatch):
+    module_name = f"lazy_toolkit_{tmp_path.name.replace('-', '_')}"
+    (tmp_path / f"{module_name}.py").write_text(TOOLKIT_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield {"stats": (module_name, ["get_score", "echo_tool"])}, str(tmp_path / "manifest.json")
+    sys.modules.pop(module_name, None)
+
+
+def test_first_start_is_eager_and_later_starts_are_lazy(toolkit):
+    toolkits, manifest = toolkit
+    eager = ToolRegistry(toolkits, manifest_path=manifest, lazy=True)
+    assert eager.info()["lazy_tools"] == 0
+    sys.modules.pop(toolkits["stats"][0])
+
+    lazy = ToolRegistry(toolkits, manifest_path=manifest, lazy=True)
+    assert lazy.info()["lazy_tools"] == 2 and toolkits["stats"][0] not in sys.modules
+    for real, proxy in zip(eager.category("stats"), lazy.category("stats")):
+        assert convert_to_openai_tool(proxy) == convert_to_openai_tool(real)
+    assert isinstance(lazy.category("stats")[0], LazyTool)
+
+
+def test_lazy_tools_import_their_module_on_first_call(toolkit):
+    toolkits, manifest = toolkit
+    ToolRegistry(toolkits, manifest_path=manifest, lazy=True)
+    sys.modules.pop(toolkits["stats"][0])
+    registry = ToolRegistry(toolkits, manifest_path=manifest, lazy=True)
+    score, echo = registry.category("stats")
+
+    # ToolNode passes each tool call as below and gets a ToolMessage back
+    scored = asyncio.run(score.ainvoke(
+        {"type": "tool_call", "name": "get_score", "args": {"player_name": "Stephen Curry"}, "id": "c1"}
+    ))
+    assert scored.tool_call_id == "c1" and '"season": "2024-25"' in scored.content  # Real tool applied its default
+    assert echo.invoke({"type": "tool_call", "name": "echo", "args": {"__arg1": "hi"}, "id": "c2"}).content == "echo:hi"
+    info = registry.info()
+    assert info["tools_loaded"] == 2 and toolkits["stats"][0] in info["modules_loaded"]
+
+
+def test_changed_toolkit_source_invalidates_its_manifest_entry(toolkit, tmp_path):
+    toolkits, manifest = toolkit
+    ToolRegistry(toolkits, manifest_path=manifest, lazy=True)
+    module_file = tmp_path / f"{toolkits['stats'][0]}.py"
+    module_file.write_text(TOOLKIT_SOURCE.replace("Returns a player's scoring average.", "Points per game."))
+    sys.modules.pop(toolkits["stats"][0])
+
+    refreshed = ToolRegistry(toolkits, manifest_path=manifest, lazy=True)
+    assert refreshed.info()["lazy_tools"] == 0
+    assert refreshed.category("stats")[0].description == "Points per game."
+    assert ToolRegistry(toolkits, manifest_path=manifest, lazy=True).info()["lazy_tools"] == 2
@@ -0,0 +1,103 @@
+"""
+Smoke tests for query-aware tool routing (langgraph_agent/tool_router.py).
+Runs offline with small stand-in tools and a recording LLM provider.
+"""
+from langchain_core.tools import tool
+
+from langgraph_agent import tool_router as tool_router_module
+from langgraph_agent.tool_router import ToolRouter, tool_routing_info
+
+
+@tool
+def get_player_career_stats(player_name: str) -> str:
+    """Fetches a player's career statistics: points, rebounds and assists per season."""
+    return "{}"
+
+
+@tool
+def get_player_game_logs(player_name: str, season: str) -> str:
+    """Fetches a player's game-by-game logs for a season."""
+    return "{}"
+
+
+@tool
+def get_team_info_and_roster(team_identifier: str) -> str:
+    """Fetches a team's info and current roster."""
+    return "{}"
+
+
+@tool
+def get_nba_player_contract(player_name: str) -> str:
+    """Fetches a player's contract and salary details."""
+    return "{}"
+
+
+@tool
+def search_nba_players(query: str) -> str:
+    """Searches players by name."""
+    return "{}"
+
+
+@tool
+def python_code_execution(code: str) -> str:
+    """Executes Python code for calculations and charts."""
+    return "{}"
+
+
+CATEGORIES = {
+    "player": [get_player_career_stats, get_player_game_logs],
+    "team": [get_team_info_and_roster],
+    "search": [search_nba_players],
+    "contracts": [get_nba_player_contract],
+    "data_science": [python_code_execution],
+}
+
+
+class RecordingProvider:
+    def __init__(self):
+        self.bound = []
+
+    def bind_tools(self, tools):
+        self.bound.append([t.name for t in tools])
+        return ("bound", tuple(t.name for t in tools))
+
+
+def test_routes_by_category_and_keeps_always_bound_tools(monkeypatch):
+    monkeypatch.setattr(tool_router_module.settings, "TOOL_ROUTING_RETRIEVAL_TOP_K", 0)
+    router = ToolRouter(RecordingProvider(), CATEGORIES)
+    selection = router.select("What is Stephen Curry's contract worth?", "data_retrieval_agent")
+    assert selection.categories[:2] == ("player", "contracts")
+    assert "get_nba_player_contract" in selection.tool_names
+    assert "search_nba_players" in selection.tool_names
+    assert "get_team_info_and_roster" not in selection.tool_names
+    assert selection.schema_bytes < selection.full_schema_bytes
+
+
+def test_team_names_and_player_names_are_detected():
+    router = ToolRouter(RecordingProvider(), CATEGORIES)
+    assert "team" in router.classify("Celtics depth chart")
+    assert "player" in router.classify("How good was Michael Jordan?")
+
+
+def test_presentation_agent_binds_only_its_tools():
+    router = ToolRouter(RecordingProvider(), CATEGORIES)
+    assert router.select("Compare their career stats", "presentation_agent").tool_names == ("python_code_execution",)
+
+
+def test_disabled_routing_binds_everything(monkeypatch):
+    monkeypatch.setattr(tool_router_module.settings, "TOOL_ROUTING_ENABLED", False)
+    router = ToolRouter(RecordingProvider(), CATEGORIES)
+    assert len(router.select("anything", "data_retrieval_agent").tool_names) == 6
+
+
+def test_bindings_are_cached_and_hops_recorded():
+    provider = RecordingProvider()
+    router = ToolRouter(provider, CATEGORIES)
+    first, selection = router.route("LeBron James game logs", "analytics_agent")
+    second, _ = router.route("LeBron James game logs", "analytics_agent")
+    assert first == second and len(provider.bound) == 1
+    hops_before = tool_routing_info()["agents"].get("analytics_agent", {}).get("hops", 0)
+    router.record_hop(selection, 0.25)
+    metrics = tool_routing_info()["agents"]["analytics_agent"]
+    assert metrics["hops"] == hops_before + 1
+    assert metrics["schema_bytes_saved"] > 0
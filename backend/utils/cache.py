@@ -1,21 +1,466 @@
 """
-Provides a simple in-memory caching utility with Time-To-Live (TTL) support.
-This can be used to temporarily store results of expensive operations.
+Provides the response caching subsystem used by the api_tools logic functions.
+
+Two tiers are layered behind a single decorator, `cached_logic`:
+- A bounded in-memory tier per decorated function (LRU with TTL, evicted by
+  entry count and approximate byte size).
+- A persistent SQLite tier under `backend/cache/` shared by every function and
+  process, keyed by endpoint + normalized call parameters, so a restarted
+  worker can serve previously fetched responses without re-hitting stats.nba.com.
+
+Entry TTLs come from the freshness policy in utils/cache_policy.py unless a
+function pins an explicit `ttl` or `data_class`.
+
+Concurrent misses for the same key are coalesced so only one caller computes
+the response. Error responses (JSON strings with a top-level "error" key) and
+composite responses with "partial_errors" are never cached.
+The simple `cache_data` / `get_cached_data` helpers remain available for ad-hoc use.
 """
 import time
+import json
+import zlib
+import pickle
+import sqlite3
+import hashlib
+import inspect
 import logging
-from typing import Optional, Any, Dict
+import threading
+import functools
+from collections import OrderedDict
+from typing import Optional, Any, Dict, Callable, Tuple
+
+import pandas as pd
+
+from config import settings
+from utils.path_utils import get_cache_file_path
+from utils.cache_policy import DataClass, resolve_ttl
+from utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 # --- Module-Level Constants and Variables ---
-DEFAULT_CACHE_TTL_SECONDS: int = 3600  # Default TTL: 1 hour
-
-# Simple in-memory cache storage
-_cache: Dict[str, Dict[str, Any]] = {} # Structure: {key: {"data": ..., "expires_at": ...}}
+DEFAULT_CACHE_TTL_SECONDS: int = 3600  # Default TTL for ad-hoc cache_data calls: 1 hour
+DEFAULT_MEMORY_TIER_SIZE: int = settings.DEFAULT_LRU_CACHE_SIZE
+DISK_EVICTION_CHECK_INTERVAL: int = 50  # Check the on-disk size budget every N writes
+NON_KEY_PARAMETERS = frozenset({"bypass_cache"})  # Parameters that never affect the response
+ERROR_RESPONSE_PREFIX = '{"error"'
 
 # --- Cache Control ---
-CACHE_ENABLED: bool = True # Global flag to enable/disable caching behavior
+CACHE_ENABLED: bool = settings.RESPONSE_CACHE_ENABLED  # Global flag to enable/disable caching behavior
+
+_MISSING = object()
+
+
+# --- Key Normalization & Response Inspection ---
+def _normalize_param_value(value: Any) -> Any:
+    """Converts a call parameter into a stable, JSON-friendly representation for cache keys."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalize_param_value(v) for v in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, dict):
+        return {str(k): _normalize_param_value(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def make_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    Builds a deterministic cache key from an endpoint name and its call parameters.
+
+    Args:
+        endpoint (str): Logical endpoint name (e.g., "league_dash_player_stats.fetch_league_player_stats_logic").
+        params (Dict[str, Any]): Call parameters, including defaults.
+
+    Returns:
+        str: A key of the form "<endpoint>:<sha256 of normalized params>".
+    """
+    normalized = {k: _normalize_param_value(v) for k, v in params.items() if k not in NON_KEY_PARAMETERS}
+    payload = json.dumps(normalized, sort_keys=True, default=str, separators=(",", ":"))
+    return f"{endpoint}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def is_error_response(value: Any) -> bool:
+    """
+    Returns True if a logic-function result represents an error and must not be cached.
+    Handles both plain JSON strings and the `(json_str, dataframes)` tuples returned
+    when `return_dataframe=True`.
+    """
+    if value is None:
+        return True
+    if isinstance(value, tuple) and value:
+        return is_error_response(value[0])
+    if isinstance(value, (bytes, bytearray)):
+        value = bytes(value[:len(ERROR_RESPONSE_PREFIX) + 8]).decode("utf-8", errors="ignore")
+    if isinstance(value, str):
+        return value.lstrip().startswith(ERROR_RESPONSE_PREFIX)
+    if isinstance(value, dict):
+        return "error" in value
+    return False
+
+
+def is_partial_response(value: Any) -> bool:
+    """
+    Returns True if a composite logic result reports failed parts ("partial_errors"); such results
+    are returned but not cached, so a sub-fetch that timed out is retried on the next call.
+    """
+    if isinstance(value, tuple) and value:
+        return is_partial_response(value[0])
+    data = getattr(value, "data", None)  # api_tools.utils.ResponseJSON
+    return isinstance(data, dict) and bool(data.get("partial_errors"))
+
+
+def estimate_size(value: Any) -> int:
+    """Approximates the in-memory footprint of a cached value in bytes."""
+    if isinstance(value, (str, bytes, bytearray)):
+        native = getattr(value, "data", None)  # api_tools.utils.ResponseJSON keeps its source object
+        return len(value) + (estimate_size(native) if native is not None else 0)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values()) + 64 * len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value) + 8 * len(value)
+    return 64
+
+
+# --- In-Memory Tier ---
+class MemoryTier:
+    """Thread-safe LRU cache with per-entry expiry, bounded by entry count and total bytes."""
+
+    def __init__(self, maxsize: int = DEFAULT_MEMORY_TIER_SIZE, max_bytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes if max_bytes is not None else settings.RESPONSE_CACHE_MEMORY_MAX_BYTES
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()  # key -> (value, expires_at, size)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any:
+        """Returns the cached value, or the `_MISSING` sentinel on a miss or expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            value, expires_at, size = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                self._total_bytes -= size
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Stores a value, evicting least-recently-used entries to stay within bounds."""
+        size = estimate_size(value)
+        if self.max_bytes and size > self.max_bytes:
+            logger.debug(f"Skipping memory cache for key '{key}': {size} bytes exceeds tier budget.")
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[2]
+            self._entries[key] = (value, time.time() + ttl, size)
+            self._total_bytes += size
+            while self._entries and (
+                (self.maxsize and len(self._entries) > self.maxsize)
+                or (self.max_bytes and self._total_bytes > self.max_bytes)
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def delete(self, key: str) -> None:
+        """Removes a single key if present."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry[2]
+
+    def clear(self) -> None:
+        """Removes every entry from this tier."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def info(self) -> Dict[str, int]:
+        """Returns hit/miss counters and current occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "bytes": self._total_bytes,
+            }
+
+
+# --- Persistent Tier ---
+class PersistentStore:
+    """
+    SQLite-backed response store shared across threads and worker processes.
+    Values are pickled and zlib-compressed; the file runs in WAL mode so readers
+    in other uvicorn workers are not blocked by writers.
+    """
+
+    def __init__(self, db_path: str, max_bytes: Optional[int] = None):
+        self.db_path = db_path
+        self.max_bytes = max_bytes if max_bytes is not None else settings.RESPONSE_CACHE_DISK_MAX_BYTES
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        self._connect().execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._connect().execute("CREATE INDEX IF NOT EXISTS idx_responses_created ON responses(created_at)")
+
+    def get(self, key: str) -> Any:
+        """Returns the stored value, or the `_MISSING` sentinel if absent, expired or unreadable."""
+        return self.get_with_expiry(key)[0]
+
+    def get_with_expiry(self, key: str) -> Tuple[Any, float]:
+        """Like `get`, but also returns the entry's absolute expiry timestamp."""
+        try:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache read failed for key '{key}': {e}")
+            return _MISSING, 0.0
+        if row is None:
+            return _MISSING, 0.0
+        blob, expires_at = row
+        if time.time() >= expires_at:
+            self.delete(key)
+            return _MISSING, 0.0
+        try:
+            return pickle.loads(zlib.decompress(blob)), expires_at
+        except Exception as e:
+            logger.warning(f"Discarding unreadable persistent cache entry '{key}': {e}")
+            self.delete(key)
+            return _MISSING, 0.0
+
+    def set(self, key: str, endpoint: str, value: Any, ttl: float) -> None:
+        """Stores a value; failures are logged and otherwise ignored."""
+        try:
+            blob = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 1)
+            now = time.time()
+            self._connect().execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, value, size, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, blob, len(blob), now, now + ttl),
+            )
+        except Exception as e:
+            logger.warning(f"Persistent cache write failed for key '{key}': {e}")
+            return
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % DISK_EVICTION_CHECK_INTERVAL == 0
+        if due:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        try:
+            self._connect().execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache delete failed for key '{key}': {e}")
+
+    def evict(self) -> None:
+        """Purges expired rows, then the oldest rows until the store fits its byte budget."""
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if not self.max_bytes or total <= self.max_bytes:
+                return
+            excess = total - self.max_bytes
+            freed = 0
+            stale_keys = []
+            for key, size in conn.execute("SELECT key, size FROM responses ORDER BY created_at ASC"):
+                stale_keys.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+            logger.info(f"Persistent cache evicted {len(stale_keys)} entries ({freed} bytes).")
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache eviction failed: {e}")
+
+    def clear(self, endpoint: Optional[str] = None) -> None:
+        """Deletes every row, or only the rows belonging to one endpoint."""
+        try:
+            if endpoint:
+                self._connect().execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+            else:
+                self._connect().execute("DELETE FROM responses")
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache clear failed: {e}")
+
+
+_persistent_store: Optional[PersistentStore] = None
+_persistent_store_lock = threading.Lock()
+
+
+def get_persistent_store() -> Optional[PersistentStore]:
+    """Returns the shared persistent store, opening it on first use. None if disabled or unavailable."""
+    global _persistent_store
+    if not settings.RESPONSE_CACHE_PERSISTENT_ENABLED:
+        return None
+    if _persistent_store is None:
+        with _persistent_store_lock:
+            if _persistent_store is None:
+                try:
+                    _persistent_store = PersistentStore(get_cache_file_path(settings.RESPONSE_CACHE_DB_FILE))
+                    logger.info(f"Persistent response cache opened at {_persistent_store.db_path}")
+                except Exception as e:
+                    logger.error(f"Failed to open persistent response cache: {e}", exc_info=True)
+                    return None
+    return _persistent_store
+
+
+def set_persistent_store(store: Optional[PersistentStore]) -> None:
+    """Replaces the shared persistent store (e.g., to point at a temporary file in tests)."""
+    global _persistent_store
+    with _persistent_store_lock:
+        _persistent_store = store
+
+
+# --- Decorator ---
+_registered_tiers: Dict[str, MemoryTier] = {}
+
+
+def cached_logic(
+    maxsize: int = DEFAULT_MEMORY_TIER_SIZE,
+    ttl: Optional[int] = None,
+    endpoint: Optional[str] = None,
+    persist: bool = True,
+    data_class: Optional[DataClass] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Caches an api_tools logic function in the memory tier and the persistent tier.
+
+    Drop-in replacement for `functools.lru_cache` on `fetch_*_logic` functions:
+    keys are built from the bound call arguments (defaults included), error
+    responses are never stored, and a `bypass_cache=True` argument skips lookups.
+
+    Args:
+        maxsize (int): Maximum number of entries kept in this function's memory tier.
+        ttl (Optional[int]): Fixed time-to-live in seconds. Defaults to the freshness policy.
+        endpoint (Optional[str]): Cache namespace. Defaults to "<module>.<function>".
+        persist (bool): Whether results are also written to the persistent tier. Entries
+            shorter-lived than settings.RESPONSE_CACHE_MIN_PERSIST_TTL_SECONDS stay in memory.
+        data_class (Optional[DataClass]): Pins the freshness class instead of classifying each call.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        name = endpoint or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+        signature = inspect.signature(func)
+        memory = MemoryTier(maxsize=maxsize)
+        flight = SingleFlight(name)
+        _registered_tiers[name] = memory
+
+        def _resolve_ttl(params: Dict[str, Any]) -> int:
+            if ttl is not None:
+                return ttl
+            return resolve_ttl(name, params, data_class)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not CACHE_ENABLED:
+                return func(*args, **kwargs)
+
+            try:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                params = dict(bound.arguments)
+            except TypeError:
+                return func(*args, **kwargs)  # Let the function raise its own signature error
+
+            key = make_cache_key(name, params)
+            bypass = bool(params.get("bypass_cache"))
+
+            if not bypass:
+                value = memory.get(key)
+                if value is not _MISSING:
+                    logger.debug(f"Memory cache hit for {name}")
+                    return value
+                store = get_persistent_store() if persist else None
+                if store is not None:
+                    value, expires_at = store.get_with_expiry(key)
+                    if value is not _MISSING:
+                        logger.debug(f"Persistent cache hit for {name}")
+                        memory.set(key, value, max(expires_at - time.time(), 1))
+                        return value
+
+            def compute() -> Any:
+                value = func(*args, **kwargs)
+                if is_error_response(value):
+                    logger.debug(f"Not caching error response from {name}")
+                    return value
+                if is_partial_response(value):
+                    logger.debug(f"Not caching partial response from {name}")
+                    return value
+                entry_ttl = _resolve_ttl(params)
+                if entry_ttl <= 0:
+                    return value
+                memory.set(key, value, entry_ttl)
+                if not persist or entry_ttl < settings.RESPONSE_CACHE_MIN_PERSIST_TTL_SECONDS:
+                    return value
+                store = get_persistent_store()
+                if store is not None:
+                    store.set(key, name, value, entry_ttl)
+                return value
+
+            if bypass:
+                return compute()
+            return flight.do(key, compute)
+
+        def cache_clear(persistent: bool = False) -> None:
+            """Clears this function's memory tier and, optionally, its persistent rows."""
+            memory.clear()
+            if persistent:
+                store = get_persistent_store()
+                if store is not None:
+                    store.clear(name)
+
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        wrapper.cache_info = memory.info  # type: ignore[attr-defined]
+        wrapper.flight_info = flight.info  # type: ignore[attr-defined]
+        wrapper.cache_endpoint = name  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+# --- Ad-hoc Cache Helpers ---
+_adhoc_tier = MemoryTier(maxsize=0)  # Unbounded by count; still bounded by bytes
+
 
 def cache_data(key: str, data: Any, ttl: int = DEFAULT_CACHE_TTL_SECONDS) -> None:
     """
@@ -31,29 +476,33 @@ def cache_data(key: str, data: Any, ttl: int = DEFAULT_CACHE_TTL_SECONDS) -> Non
         logger.debug(f"Caching is disabled. Skipping cache_data for key '{key}'.")
         return
 
-    expires_at = time.time() + ttl
-    _cache[key] = {"data": data, "expires_at": expires_at}
-    logger.debug(f"Cached data for key '{key}' with TTL {ttl}s. Expires at: {time.ctime(expires_at)}.")
+    _adhoc_tier.set(key, data, ttl)
+    logger.debug(f"Cached data for key '{key}' with TTL {ttl}s. Expires at: {time.ctime(time.time() + ttl)}.")
 
 def get_cached_data(key: str) -> Optional[Any]:
     """Retrieves data from the in-memory cache if it exists and hasn't expired."""
     if not CACHE_ENABLED:
         logger.debug(f"Caching disabled. Skipping get_cached_data for key '{key}'")
         return None
-        
-    cached_item = _cache.get(key)
-    if cached_item:
-        if time.time() < cached_item["expires_at"]:
-            logger.debug(f"Cache hit for key '{key}'")
-            return cached_item["data"]
-        else:
-            logger.debug(f"Cache expired for key '{key}'")
-            del _cache[key] # Remove expired item
-    logger.debug(f"Cache miss for key '{key}'")
-    return None
-
-def clear_cache():
-    """Clears the entire in-memory cache."""
-    global _cache
-    _cache = {}
-    logger.info("In-memory cache cleared.")
\ No newline at end of file
+
+    value = _adhoc_tier.get(key)
+    if value is _MISSING:
+        logger.debug(f"Cache miss for key '{key}'")
+        return None
+    logger.debug(f"Cache hit for key '{key}'")
+    return value
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Returns memory-tier statistics for every decorated logic function."""
+    return {name: tier.info() for name, tier in _registered_tiers.items()}
+
+def clear_cache(persistent: bool = False) -> None:
+    """Clears every in-memory tier and, optionally, the persistent store."""
+    _adhoc_tier.clear()
+    for tier in _registered_tiers.values():
+        tier.clear()
+    if persistent:
+        store = get_persistent_store()
+        if store is not None:
+            store.clear()
+    logger.info("Response caches cleared%s.", " (including persistent store)" if persistent else "")
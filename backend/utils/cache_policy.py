@@ -0,0 +1,214 @@
+"""
+Central freshness policy for cached NBA data.
+
+Each cached request is classified into a `DataClass` from its endpoint family,
+the game(s) it refers to (final vs live), any explicit dates, the season it
+targets (past vs `settings.CURRENT_NBA_SEASON`) and, for career-style queries,
+whether the player is retired. Each class maps to a TTL from settings, so
+completed seasons/games are effectively immutable while live data stays fresh.
+"""
+import re
+import logging
+import threading
+from enum import Enum
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from config import settings
+from utils.identity_index import get_identity_index
+
+logger = logging.getLogger(__name__)
+
+
+class DataClass(str, Enum):
+    """Freshness classes, ordered from most to least volatile."""
+    LIVE = "live"              # In-progress games, live scoreboards/play-by-play
+    INTRADAY = "intraday"      # Odds, today's/upcoming schedules
+    CURRENT = "current"        # Current-season dashboards and logs
+    REFERENCE = "reference"    # Season-independent lookups (franchise history, indexes)
+    HISTORICAL = "historical"  # Completed seasons and final games
+
+
+# --- Module-Level Constants ---
+# Endpoint families (module name prefix of the cache endpoint) with a fixed class.
+LIVE_FAMILIES = frozenset({"live_game_tools"})
+INTRADAY_FAMILIES = frozenset({"odds_tools"})
+
+SEASON_PARAM_NAMES = (
+    "season", "season_nullable", "season_year", "season_year_nullable",
+    "season_id", "season_id_nullable",
+)
+GAME_ID_PARAM_NAMES = ("game_id", "game_id_nullable")
+DATE_TO_PARAM_NAMES = ("date_to", "date_to_nullable", "date_to_str")
+GAME_DATE_PARAM_NAMES = ("game_date",)
+PLAYER_PARAM_NAMES = ("player_name", "player_identifier", "player_id", "player_id_nullable")
+
+FINAL_GAME_GRACE_DAYS = 1  # Late West-coast games can finish after midnight ET
+GAME_STATUS_SCHEDULED = 1
+GAME_STATUS_IN_PROGRESS = 2
+GAME_STATUS_FINAL = 3
+
+_SEASON_RE = re.compile(r"^(\d{4})(?:-(\d{2}))?$")
+_SEASON_ID_RE = re.compile(r"^[1-6](\d{4})$")  # e.g. "22023" (season type digit + start year)
+_GAME_ID_RE = re.compile(r"^\d{3}(\d{2})\d{5}$")  # e.g. "0022300001" -> "23"
+
+# Game statuses observed on scoreboards, so current-season final games can be treated as immutable.
+_game_statuses: Dict[str, int] = {}
+_game_statuses_lock = threading.Lock()
+
+
+# --- TTL Lookup ---
+def ttl_for(data_class: DataClass) -> int:
+    """Returns the configured TTL in seconds for a data class."""
+    return {
+        DataClass.LIVE: settings.CACHE_TTL_LIVE_SECONDS,
+        DataClass.INTRADAY: settings.CACHE_TTL_INTRADAY_SECONDS,
+        DataClass.CURRENT: settings.CACHE_TTL_CURRENT_SEASON_SECONDS,
+        DataClass.REFERENCE: settings.CACHE_TTL_REFERENCE_SECONDS,
+        DataClass.HISTORICAL: settings.CACHE_TTL_HISTORICAL_SECONDS,
+    }[data_class]
+
+
+# --- Game Status Registry ---
+def record_game_status(game_id: Optional[str], status_code: Optional[int]) -> None:
+    """Records a game's status (1 scheduled, 2 in progress, 3 final) as observed on a scoreboard."""
+    if not game_id or status_code is None:
+        return
+    with _game_statuses_lock:
+        _game_statuses[str(game_id)] = int(status_code)
+
+def get_game_status(game_id: str) -> Optional[int]:
+    """Returns the last observed status code for a game, if any."""
+    with _game_statuses_lock:
+        return _game_statuses.get(str(game_id))
+
+
+# --- Parsing Helpers ---
+def season_start_year(season: Any) -> Optional[int]:
+    """Extracts the starting year from "YYYY-YY", "YYYY" or season IDs like "22023"."""
+    if season is None:
+        return None
+    text = str(season).strip()
+    match = _SEASON_RE.match(text)
+    if match:
+        return int(match.group(1))
+    match = _SEASON_ID_RE.match(text)
+    if match:
+        return int(match.group(1))
+    return None
+
+def game_season_start_year(game_id: Any) -> Optional[int]:
+    """Derives the season start year encoded in a 10-digit NBA game ID."""
+    match = _GAME_ID_RE.match(str(game_id or "").strip())
+    if not match:
+        return None
+    yy = int(match.group(1))
+    return 1900 + yy if yy >= 46 else 2000 + yy
+
+def _parse_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+def _flatten_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Lifts keys from nested dict arguments (e.g. `api_kwargs`) one level; top-level keys win."""
+    flat: Dict[str, Any] = {}
+    for value in params.values():
+        if isinstance(value, dict):
+            flat.update({str(k).lower(): v for k, v in value.items()})
+    flat.update(params)
+    return flat
+
+def _first_param(params: Dict[str, Any], names: Iterable[str]) -> Any:
+    for name in names:
+        value = params.get(name)
+        if value not in (None, "", 0):
+            return value
+    return None
+
+def _is_retired_player(identifier: Any) -> bool:
+    """True if the identifier (ID or full name) matches a player flagged inactive in nba_api's static list."""
+    index = get_identity_index()
+    text = str(identifier).strip()
+    matches = [index.player_by_id(text)] if text.isdigit() else index.players_by_name(text)
+    return bool(matches) and all(player is not None and not player.get("is_active") for player in matches)
+
+
+# --- Classification ---
+def _classify_season(start_year: int) -> DataClass:
+    current_start = season_start_year(settings.CURRENT_NBA_SEASON)
+    if current_start is not None and start_year < current_start:
+        return DataClass.HISTORICAL
+    return DataClass.CURRENT
+
+def _classify_date(value: date, today: date) -> DataClass:
+    if value < today - timedelta(days=FINAL_GAME_GRACE_DAYS):
+        return DataClass.HISTORICAL
+    return DataClass.INTRADAY
+
+def classify_request(endpoint: str, params: Dict[str, Any]) -> DataClass:
+    """
+    Classifies a cached request into a freshness class.
+
+    Args:
+        endpoint (str): Cache endpoint name ("<module>.<function>").
+        params (Dict[str, Any]): Bound call parameters, defaults included.
+
+    Returns:
+        DataClass: The data class driving the entry's TTL.
+    """
+    family = endpoint.split(".", 1)[0]
+    if family in LIVE_FAMILIES:
+        return DataClass.LIVE
+    if family in INTRADAY_FAMILIES:
+        return DataClass.INTRADAY
+
+    params = _flatten_params(params)
+    today = date.today()
+
+    game_id = _first_param(params, GAME_ID_PARAM_NAMES)
+    if game_id:
+        status = get_game_status(game_id)
+        if status == GAME_STATUS_FINAL:
+            return DataClass.HISTORICAL
+        if status == GAME_STATUS_IN_PROGRESS:
+            return DataClass.LIVE
+        game_start_year = game_season_start_year(game_id)
+        if game_start_year is not None:
+            return _classify_season(game_start_year)
+
+    game_date = _parse_date(_first_param(params, GAME_DATE_PARAM_NAMES))
+    if game_date:
+        return _classify_date(game_date, today)
+
+    season_value = _first_param(params, SEASON_PARAM_NAMES)
+    start_year = season_start_year(season_value)
+    if start_year is not None:
+        season_class = _classify_season(start_year)
+        if season_class is DataClass.CURRENT:
+            date_to = _parse_date(_first_param(params, DATE_TO_PARAM_NAMES))
+            if date_to and _classify_date(date_to, today) is DataClass.HISTORICAL:
+                return DataClass.HISTORICAL
+        return season_class
+
+    player = _first_param(params, PLAYER_PARAM_NAMES)
+    if player:
+        return DataClass.HISTORICAL if _is_retired_player(player) else DataClass.CURRENT
+
+    return DataClass.REFERENCE
+
+def resolve_ttl(endpoint: str, params: Dict[str, Any], data_class: Optional[DataClass] = None) -> int:
+    """Returns the TTL in seconds for a request, classifying it unless `data_class` is given."""
+    resolved = data_class or classify_request(endpoint, params)
+    ttl = ttl_for(resolved)
+    logger.debug(f"Freshness policy: {endpoint} -> {resolved.value} ({ttl}s)")
+    return ttl
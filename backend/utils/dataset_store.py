@@ -0,0 +1,171 @@
+"""
+Columnar dataset store for DataFrames fetched by the api_tools modules.
+
+Datasets are written as compressed, typed Parquet files under `backend/cache/`
+with a JSON metadata sidecar (`<file>.meta.json`) recording the endpoint, call
+parameters, fetch time, row count and a schema hash. Reads are memory-mapped and
+can be limited to a subset of columns, so reloading a cached dashboard keeps its
+dtypes (IDs stay strings, ints stay ints) and skips CSV re-parsing entirely.
+
+Callers may pass legacy ".csv" paths; they are mapped to the ".parquet" file
+next to them.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.path_utils import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+DATASET_EXTENSION = ".parquet"
+METADATA_SUFFIX = ".meta.json"
+LEGACY_EXTENSIONS = (".csv", ".parquet")
+PARQUET_COMPRESSION = "zstd"
+
+
+# --- Paths ---
+def dataset_path(path: str) -> str:
+    """Maps a cache file path (legacy ".csv" or otherwise) to the path the store actually uses."""
+    root, ext = os.path.splitext(path)
+    if ext.lower() in LEGACY_EXTENSIONS:
+        return root + DATASET_EXTENSION
+    return path + DATASET_EXTENSION
+
+def metadata_path(path: str) -> str:
+    """Returns the sidecar metadata path for a dataset."""
+    return dataset_path(path) + METADATA_SUFFIX
+
+def dataset_exists(path: str) -> bool:
+    """True if a dataset has been stored for this path."""
+    return os.path.exists(dataset_path(path))
+
+def _endpoint_from_path(path: str) -> str:
+    """Derives a default endpoint label from the cache subdirectory (e.g. "player_dashboard/profile")."""
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        relative = os.path.relpath(directory, CACHE_DIR)
+    except ValueError:
+        return os.path.basename(directory)
+    return os.path.basename(directory) if relative.startswith("..") else relative.replace(os.sep, "/")
+
+
+# --- Schema ---
+def schema_hash(df: pd.DataFrame) -> str:
+    """Hashes column names and dtypes so schema drift between fetches can be detected."""
+    signature = json.dumps([[str(col), str(dtype)] for col, dtype in df.dtypes.items()])
+    return hashlib.sha256(signature.encode("utf-8")).hexdigest()[:16]
+
+def _prepare_for_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    """Makes column labels strings and coerces mixed-type object columns so Arrow can type them."""
+    prepared = df
+    if not all(isinstance(col, str) for col in df.columns):
+        prepared = df.copy()
+        prepared.columns = [
+            "_".join(str(level) for level in col if str(level)) if isinstance(col, tuple) else str(col)
+            for col in prepared.columns
+        ]
+    for col in prepared.columns[prepared.dtypes.values == object]:
+        kinds = {type(v) for v in prepared[col].dropna()}
+        if len(kinds) > 1 or (kinds and not kinds <= {str, int, float, bool}):
+            if prepared is df:
+                prepared = df.copy()
+            prepared[col] = prepared[col].map(lambda v: v if v is None or (isinstance(v, float) and pd.isna(v)) else str(v))
+    return prepared
+
+
+# --- Read / Write ---
+def save_dataset(
+    df: pd.DataFrame,
+    path: str,
+    endpoint: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> Optional[str]:
+    """
+    Writes a DataFrame and its metadata sidecar atomically.
+
+    Args:
+        df (pd.DataFrame): Data to store.
+        path (str): Target cache path; a legacy ".csv" path is mapped to the store's format.
+        endpoint (Optional[str]): Endpoint label for the sidecar. Defaults to the cache subdirectory.
+        params (Optional[Dict[str, Any]]): Parameters the data was fetched with.
+
+    Returns:
+        Optional[str]: The written dataset path, or None if the write failed (logged, never raised).
+    """
+    target = dataset_path(path)
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+        os.close(fd)
+        try:
+            table = pa.Table.from_pandas(_prepare_for_parquet(df), preserve_index=False)
+            pq.write_table(table, tmp_path, compression=PARQUET_COMPRESSION)
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        metadata = {
+            "endpoint": endpoint or _endpoint_from_path(target),
+            "params": params or {},
+            "fetched_at": time.time(),
+            "row_count": int(len(df)),
+            "columns": [str(col) for col in df.columns],
+            "schema_hash": schema_hash(df),
+        }
+        with open(metadata_path(path), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, default=str)
+        logger.info(f"Saved dataset: {target} ({len(df)} rows, {os.path.getsize(target)} bytes)")
+        return target
+    except Exception as e:
+        logger.error(f"Error saving dataset to {target}: {e}", exc_info=True)
+        return None
+
+def load_dataset(path: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    Reads a stored dataset, memory-mapped and optionally projected to `columns`.
+
+    Args:
+        path (str): Cache path used when saving (legacy ".csv" paths are accepted).
+        columns (Optional[List[str]]): Columns to read; None reads all of them.
+
+    Returns:
+        Optional[pd.DataFrame]: The data with its original dtypes, or None if missing or unreadable.
+            Unreadable files are removed so the caller refetches.
+    """
+    source = dataset_path(path)
+    if not os.path.exists(source):
+        return None
+    try:
+        return pq.read_table(source, columns=columns, memory_map=True).to_pandas()
+    except Exception as e:
+        logger.warning(f"Discarding unreadable dataset {source}: {e}")
+        delete_dataset(path)
+        return None
+
+def read_dataset_metadata(path: str) -> Optional[Dict[str, Any]]:
+    """Returns the metadata sidecar for a dataset, or None if it is missing or unreadable."""
+    try:
+        with open(metadata_path(path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def delete_dataset(path: str) -> None:
+    """Removes a dataset and its sidecar if present."""
+    for file_path in (dataset_path(path), metadata_path(path)):
+        try:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        except OSError as e:
+            logger.warning(f"Could not remove {file_path}: {e}")
@@ -0,0 +1,62 @@
+"""
+Per-call deadlines carried in a context variable.
+
+The agent's tool executor gives each tool call a deadline; synchronous code
+beneath it (nba_api requests through api_tools/http_client.py) reads the
+remaining time to cap socket timeouts and to give up before starting a request
+that could not finish in time. Context variables follow the call into worker
+threads started with `contextvars.copy_context().run`, and into tasks.
+"""
+import time
+import contextlib
+import contextvars
+from typing import Iterator, Optional
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("call_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work is about to start after its call's deadline has passed."""
+
+
+@contextlib.contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Runs the block with a deadline `seconds` from now (None: no deadline). Nested scopes keep the earlier deadline."""
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline (may be negative), or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check(what: str = "request") -> None:
+    """Raises DeadlineExceeded if the current deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {what} ({-left:.1f}s over)")
+
+
+def cap_timeout(timeout: Optional[object]) -> Optional[object]:
+    """
+    Caps a `requests`-style timeout (seconds, (connect, read) tuple or None) at the time left before the deadline.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(left, 0.001)
+    if timeout is None:
+        return left
+    if isinstance(timeout, tuple):
+        return tuple(left if part is None else min(part, left) for part in timeout)
+    return min(float(timeout), left)
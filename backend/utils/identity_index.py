@@ -0,0 +1,262 @@
+"""
+In-memory identity index over nba_api's static player and team lists.
+
+Name and ID resolution runs on nearly every tool call. Instead of scanning the
+~5,000 player dicts (or regex-matching every name) per lookup, the index is
+built once, from `players.get_players()` / `teams.get_teams()`, into:
+
+- ID -> record hash maps for players and teams
+- normalized-name maps (case, accents and punctuation folded, so
+  "Luka Doncic", "luka dončić" and "Shaquille ONeal" resolve like the canonical names)
+- team abbreviation, nickname and city maps
+- player and team alias maps for common nicknames ("KD", "SGA", "Shaq"; "Sixers",
+  "Cavs", "Dubs"), checked before fuzzy matching so a nickname never resolves to a
+  similarly spelled name
+- ranked, typo-tolerant search indexes (utils/name_search.py) for player names
+  and team names/cities/nicknames/abbreviations, with active players boosted
+
+Records are the original nba_api dicts, and unranked lists keep nba_api's order.
+"""
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from utils.name_search import FuzzyNameIndex, SearchHit, normalize_name
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+ACTIVE_PLAYER_BOOST = 0.03    # Ranks active players above retired ones with a similar name match
+RESOLVE_MIN_SCORE = 0.7       # Minimum ranked-search score for a name to resolve to an ID
+AMBIGUOUS_SCORE_MARGIN = 0.005  # Top team matches this close are ambiguous ("LA" matches the Lakers and Clippers equally)
+
+# Common player nicknames and initials -> canonical full names (resolved like any other name).
+PLAYER_ALIASES = {
+    "kd": "Kevin Durant", "durantula": "Kevin Durant", "easy money sniper": "Kevin Durant",
+    "sga": "Shai Gilgeous-Alexander",
+    "shaq": "Shaquille O'Neal",
+    "lbj": "LeBron James", "bron": "LeBron James", "king james": "LeBron James",
+    "steph": "Stephen Curry", "chef curry": "Stephen Curry",
+    "greek freak": "Giannis Antetokounmpo",
+    "joker": "Nikola Jokic", "the joker": "Nikola Jokic",
+    "ad": "Anthony Davis", "the brow": "Anthony Davis",
+    "kat": "Karl-Anthony Towns",
+    "cp3": "Chris Paul",
+    "mj": "Michael Jordan", "air jordan": "Michael Jordan",
+    "dame": "Damian Lillard", "dame time": "Damian Lillard",
+    "pg13": "Paul George",
+    "the beard": "James Harden",
+    "mamba": "Kobe Bryant", "black mamba": "Kobe Bryant",
+    "the answer": "Allen Iverson",
+    "wemby": "Victor Wembanyama",
+    "ant man": "Anthony Edwards",
+    "jimmy buckets": "Jimmy Butler",
+    "spida": "Donovan Mitchell",
+    "the big fundamental": "Tim Duncan",
+    "dr j": "Julius Erving",
+    "the mailman": "Karl Malone",
+    "the klaw": "Kawhi Leonard",
+    "kaj": "Kareem Abdul-Jabbar",
+    "the big dipper": "Wilt Chamberlain", "wilt the stilt": "Wilt Chamberlain",
+    "d wade": "Dwyane Wade",
+    "the process": "Joel Embiid",
+    "kg": "Kevin Garnett", "the big ticket": "Kevin Garnett",
+    "the dream": "Hakeem Olajuwon",
+    "sir charles": "Charles Barkley",
+    "larry legend": "Larry Bird",
+    "russ": "Russell Westbrook",
+    "uncle drew": "Kyrie Irving",
+    "t mac": "Tracy McGrady", "tmac": "Tracy McGrady",
+    "vinsanity": "Vince Carter", "air canada": "Vince Carter",
+    "pistol pete": "Pete Maravich",
+    "the glide": "Clyde Drexler",
+    "jjj": "Jaren Jackson Jr.",
+}
+
+# Informal team names -> official team nicknames (the `nickname` field of nba_api's team list).
+TEAM_ALIASES = {
+    "sixers": "76ers", "philly": "76ers",
+    "cavs": "Cavaliers",
+    "mavs": "Mavericks",
+    "dubs": "Warriors",
+    "celts": "Celtics", "cs": "Celtics",
+    "clips": "Clippers", "lob city": "Clippers",
+    "lakeshow": "Lakers",
+    "blazers": "Trail Blazers", "rip city": "Trail Blazers",
+    "wolves": "Timberwolves", "t wolves": "Timberwolves", "twolves": "Timberwolves",
+    "nugs": "Nuggets",
+    "grizz": "Grizzlies",
+    "pels": "Pelicans",
+    "wiz": "Wizards",
+    "raps": "Raptors", "the north": "Raptors",
+    "knickerbockers": "Knicks",
+}
+
+
+class IdentityIndex:
+    """Lookup tables for players and teams. Build once with `get_identity_index()`; read-only afterwards."""
+
+    def __init__(self, player_records: List[Dict[str, Any]], team_records: List[Dict[str, Any]]):
+        self.players: List[Dict[str, Any]] = list(player_records)
+        self.teams: List[Dict[str, Any]] = list(team_records)
+
+        self._player_by_id: Dict[int, Dict[str, Any]] = {}
+        self._players_by_name: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for player in self.players:
+            self._player_by_id.setdefault(int(player["id"]), player)
+            self._players_by_name[normalize_name(player.get("full_name", ""))].append(player)
+        self._player_search = FuzzyNameIndex(
+            self.players,
+            aliases=lambda player: [player.get("full_name", "")],
+            boost=lambda player: ACTIVE_PLAYER_BOOST if player.get("is_active") else 0.0,
+        )
+
+        self._team_by_id: Dict[int, Dict[str, Any]] = {}
+        self._team_by_abbreviation: Dict[str, Dict[str, Any]] = {}
+        self._team_by_name: Dict[str, Dict[str, Any]] = {}
+        self._team_by_nickname: Dict[str, Dict[str, Any]] = {}
+        self._teams_by_city: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for team in self.teams:
+            self._team_by_id.setdefault(int(team["id"]), team)
+            self._team_by_abbreviation.setdefault(str(team.get("abbreviation", "")).upper(), team)
+            self._team_by_name.setdefault(normalize_name(team.get("full_name", "")), team)
+            self._team_by_nickname.setdefault(normalize_name(team.get("nickname", "")), team)
+            self._teams_by_city[normalize_name(team.get("city", ""))].append(team)
+        self._team_search = FuzzyNameIndex(
+            self.teams,
+            aliases=lambda team: [team.get(field, "") for field in ("full_name", "city", "nickname", "abbreviation")],
+        )
+
+    # --- Players ---
+    def player_by_id(self, player_id: Any) -> Optional[Dict[str, Any]]:
+        """Returns the player record for a numeric ID (int or digit string), or None."""
+        try:
+            return self._player_by_id.get(int(player_id))
+        except (TypeError, ValueError):
+            return None
+
+    def players_by_name(self, name: str) -> List[Dict[str, Any]]:
+        """Returns players whose normalized full name equals the normalized `name`, in nba_api order."""
+        return list(self._players_by_name.get(normalize_name(name), ()))
+
+    def find_players(self, fragment: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Returns players whose normalized full name contains the normalized `fragment`, in nba_api order."""
+        return self._player_search.contains(fragment, limit=limit)
+
+    def search_players(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """Returns up to `limit` players best matching `query` (typos tolerated), best first."""
+        return self._player_search.search(query, limit=limit)
+
+    def resolve_player(self, identifier: Any) -> Optional[Dict[str, Any]]:
+        """
+        Resolves a player ID or name to one record: numeric ID, then exact normalized name, then
+        a nickname from PLAYER_ALIASES (resolved as its full name), then the best ranked match
+        scoring at least RESOLVE_MIN_SCORE. Returns None if nothing matches.
+        """
+        text = str(identifier).strip()
+        if text.isdigit():
+            record = self.player_by_id(text)
+            if record is not None:
+                return record
+        exact = self._players_by_name.get(normalize_name(text))
+        if exact:
+            return exact[0]
+        alias = PLAYER_ALIASES.get(normalize_name(text))
+        if alias is not None:
+            text = alias
+            exact = self._players_by_name.get(normalize_name(text))
+            if exact:
+                return exact[0]
+        hits = self._player_search.search(text, limit=1, min_score=RESOLVE_MIN_SCORE)
+        return hits[0].record if hits else None
+
+    # --- Teams ---
+    def team_by_id(self, team_id: Any) -> Optional[Dict[str, Any]]:
+        """Returns the team record for a numeric ID (int or digit string), or None."""
+        try:
+            return self._team_by_id.get(int(team_id))
+        except (TypeError, ValueError):
+            return None
+
+    def team_by_abbreviation(self, abbreviation: str) -> Optional[Dict[str, Any]]:
+        return self._team_by_abbreviation.get(str(abbreviation).strip().upper())
+
+    def find_teams(self, fragment: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Returns teams whose full name, city, nickname or abbreviation contains `fragment`, in nba_api order."""
+        return self._team_search.contains(fragment, limit=limit)
+
+    def search_teams(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """Returns up to `limit` teams whose full name, city, nickname or abbreviation best match `query`."""
+        return self._team_search.search(query, limit=limit)
+
+    def resolve_team(self, identifier: Any) -> Optional[Dict[str, Any]]:
+        """
+        Resolves a team ID, abbreviation, full name, nickname, informal name from TEAM_ALIASES or
+        unambiguous city to one record, falling back to the best ranked match scoring at least
+        RESOLVE_MIN_SCORE. Returns None if nothing matches or the identifier is ambiguous (see `ambiguous_teams`).
+        """
+        matches = self._match_teams(identifier)
+        return matches[0] if len(matches) == 1 else None
+
+    def ambiguous_teams(self, identifier: Any) -> List[Dict[str, Any]]:
+        """Returns the teams an identifier matches equally well ("Los Angeles": Lakers and Clippers), or [] if it is not ambiguous."""
+        matches = self._match_teams(identifier)
+        return matches if len(matches) > 1 else []
+
+    def _match_teams(self, identifier: Any) -> List[Dict[str, Any]]:
+        """The one team an identifier names, the equally good candidates if it is ambiguous, or []."""
+        text = str(identifier).strip()
+        if text.isdigit():
+            record = self.team_by_id(text)
+            if record is not None:
+                return [record]
+        record = self.team_by_abbreviation(text)
+        if record is not None:
+            return [record]
+        name = normalize_name(text)
+        if not name:
+            return []
+        record = self._team_by_name.get(name) or self._team_by_nickname.get(name)
+        if record is None and name in TEAM_ALIASES:
+            record = self._team_by_nickname.get(normalize_name(TEAM_ALIASES[name]))
+        if record is not None:
+            return [record]
+        city_teams = self._teams_by_city.get(name, [])
+        if city_teams:  # "Los Angeles" is ambiguous; "Denver" is not
+            return list(city_teams)
+        hits = self._team_search.search(name, limit=len(self.teams), min_score=RESOLVE_MIN_SCORE)
+        return [hit.record for hit in hits if hits[0].score - hit.score <= AMBIGUOUS_SCORE_MARGIN]
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "players": len(self.players),
+            "teams": len(self.teams),
+            "player_names": len(self._players_by_name),
+        }
+
+
+_index: Optional[IdentityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_identity_index() -> IdentityIndex:
+    """Returns the process-wide identity index, building it from nba_api's static lists on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from nba_api.stats.static import players, teams
+                try:
+                    player_records = players.get_players()
+                except Exception as e:
+                    logger.error(f"Failed to load static player list for identity index: {e}", exc_info=True)
+                    player_records = []
+                try:
+                    team_records = teams.get_teams()
+                except Exception as e:
+                    logger.error(f"Failed to load static team list for identity index: {e}", exc_info=True)
+                    team_records = []
+                _index = IdentityIndex(player_records or [], team_records or [])
+                logger.info(f"Built identity index: {_index.info()}")
+    return _index
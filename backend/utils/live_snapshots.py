@@ -0,0 +1,60 @@
+"""
+Latest live-game payloads shared across the process.
+
+The live ingestion poller (api_tools/live_ingestion.py) writes the raw scoreboard,
+boxscore and play-by-play dicts it fetches; the live api_tools logic functions
+read them before going upstream, so any number of tool calls and stream viewers
+of a game cost one upstream poll per interval.
+"""
+import time
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from config import settings
+
+SCOREBOARD = "scoreboard"
+BOXSCORE = "boxscore"
+PLAYBYPLAY = "playbyplay"
+
+
+class LiveSnapshot(NamedTuple):
+    data: Dict[str, Any]
+    fetched_at: float  # time.time()
+    final: bool        # Fetched after the game ended; never goes stale
+
+
+_snapshots: Dict[Tuple[str, Optional[str]], LiveSnapshot] = {}
+_snapshots_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def put_live_snapshot(kind: str, data: Dict[str, Any], game_id: Optional[str] = None, final: bool = False) -> None:
+    """Stores the latest payload of `kind` (SCOREBOARD, or BOXSCORE/PLAYBYPLAY for `game_id`)."""
+    with _snapshots_lock:
+        _snapshots[(kind, game_id)] = LiveSnapshot(data, time.time(), final)
+
+
+def get_live_snapshot(kind: str, game_id: Optional[str] = None, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Returns the latest payload of `kind` if it was fetched within `max_age` seconds
+    (default settings.LIVE_SNAPSHOT_MAX_AGE_SECONDS) or after the game ended, else None.
+    """
+    max_age = settings.LIVE_SNAPSHOT_MAX_AGE_SECONDS if max_age is None else max_age
+    with _snapshots_lock:
+        snapshot = _snapshots.get((kind, game_id))
+        fresh = snapshot is not None and (snapshot.final or time.time() - snapshot.fetched_at <= max_age)
+        _stats["hits" if fresh else "misses"] += 1
+    return snapshot.data if fresh else None
+
+
+def drop_live_snapshots(game_id: str) -> None:
+    """Forgets a game's boxscore and play-by-play (the scoreboard no longer lists it)."""
+    with _snapshots_lock:
+        for key in [key for key in _snapshots if key[1] == game_id]:
+            del _snapshots[key]
+
+
+def live_snapshot_info() -> Dict[str, Any]:
+    """Stored snapshot count and how often readers found a fresh one."""
+    with _snapshots_lock:
+        return {"snapshots": len(_snapshots), **_stats}
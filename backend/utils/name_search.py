@@ -0,0 +1,260 @@
+"""
+Typo-tolerant, ranked name search.
+
+`FuzzyNameIndex` answers "which records does this (possibly misspelled) name
+refer to?" in two stages:
+
+1. Candidates: names containing the normalized query are found through an
+   exact trigram index; if those don't fill the requested top-k, names sharing
+   the most padded trigrams with the query are added (an n-gram inverted index,
+   so a typo only costs the few trigrams it touches).
+2. Rerank: substring matches are scored by where and how much of the name they
+   cover; the other candidates by edit-distance similarity, over the whole name
+   and token by token ("jokic" vs "nikola jokic"). A per-record boost (e.g.
+   active players) breaks near-ties.
+
+Queries and names are compared after `normalize_name`, so accents,
+punctuation and case never count as typos.
+"""
+import re
+import heapq
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from rapidfuzz.distance import Levenshtein as _rapidfuzz_levenshtein
+except ImportError:  # Optional: C implementation of the edit distance when installed
+    _rapidfuzz_levenshtein = None
+
+# --- Module-Level Constants ---
+TRIGRAM_SIZE = 3
+MIN_SEARCH_SCORE = 0.6          # Hits scoring below this are dropped
+FUZZY_CANDIDATES = 16           # Names (by shared trigrams) reranked by edit distance
+MIN_SHARED_TRIGRAM_RATIO = 0.5  # ...if they share at least this fraction of the best candidate's trigrams
+FUZZY_WEIGHT = 0.85             # Caps edit-distance matches below exact/prefix matches
+TOKEN_PREFIX_SIMILARITY = 0.95  # "steph" vs "stephen"
+MIN_TOKEN_PREFIX_LENGTH = 3
+_DROPPED_PUNCTUATION = re.compile(r"[.'’`]")  # Removed outright: "C.J." -> "cj", "O'Neal" -> "oneal"
+_SEPARATORS = re.compile(r"[^a-z0-9]+")            # Anything else splits words: "Karl-Anthony" -> "karl anthony"
+
+
+def normalize_name(text: Any) -> str:
+    """Folds case, accents and punctuation so equivalent spellings of a name compare equal."""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    ascii_text = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+    return _SEPARATORS.sub(" ", _DROPPED_PUNCTUATION.sub("", ascii_text)).strip()
+
+
+def trigrams(text: str) -> Iterable[str]:
+    """Distinct character trigrams of `text`."""
+    return {text[i:i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
+
+
+def _levenshtein(a: str, b: str) -> int:
+    """Edit distance via the bit-parallel algorithm (Myers/Hyyrö): one pass of integer ops per character."""
+    if _rapidfuzz_levenshtein is not None:
+        return _rapidfuzz_levenshtein.distance(a, b)
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(b):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << len(b)) - 1
+    last = 1 << (len(b) - 1)
+    pv, mv, distance = mask, 0, len(b)
+    for ch in a:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            distance += 1
+        elif mh & last:
+            distance -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv & mask
+    return distance
+
+
+def similarity(a: str, b: str) -> float:
+    """Edit-distance similarity in [0, 1]: 1 - distance / longer length."""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    if abs(len(a) - len(b)) > longest * (1 - MIN_SEARCH_SCORE):
+        return 0.0  # Can't reach the minimum score; skip the distance computation
+    return 1.0 - _levenshtein(a, b) / longest
+
+
+def _token_similarity(query_tokens: Sequence[str], name_tokens: Sequence[str]) -> float:
+    """Length-weighted best match of each query token against the name's tokens."""
+    total = weight = 0.0
+    for query_token in query_tokens:
+        best = 0.0
+        for name_token in name_tokens:
+            if query_token == name_token:
+                best = 1.0
+                break
+            if len(query_token) >= MIN_TOKEN_PREFIX_LENGTH and name_token.startswith(query_token):
+                best = max(best, TOKEN_PREFIX_SIMILARITY)
+            else:
+                best = max(best, similarity(query_token, name_token))
+        total += best * len(query_token)
+        weight += len(query_token)
+    coverage = min(1.0, len(query_tokens) / len(name_tokens)) if name_tokens else 0.0
+    return (total / weight) * (0.9 + 0.1 * coverage) if weight else 0.0
+
+
+def _substring_score(query: str, name: str) -> float:
+    """Scores a name containing the query: exact > prefix > word start > inside a word."""
+    if query == name:
+        return 1.0
+    coverage = 0.05 * len(query) / len(name)
+    if name.startswith(query):
+        return 0.9 + coverage
+    if (" " + name).find(" " + query) >= 0:
+        return 0.85 + coverage
+    return 0.75 + coverage
+
+
+class SearchHit(NamedTuple):
+    """A ranked search result."""
+    record: Dict[str, Any]
+    score: float
+
+
+class FuzzyNameIndex:
+    """
+    Ranked, typo-tolerant search over records that each have one or more names (aliases).
+
+    Args:
+        records (List[Dict[str, Any]]): Records to search, in their canonical order (used for tie-breaks).
+        aliases (Callable): Returns the names a record can be found by.
+        boost (Optional[Callable]): Returns a small score bonus for a record (e.g. active players).
+    """
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        aliases: Callable[[Dict[str, Any]], Iterable[str]],
+        boost: Optional[Callable[[Dict[str, Any]], float]] = None,
+    ):
+        self.records = records
+        self._boosts: List[float] = [boost(record) if boost else 0.0 for record in records]
+        self._alias_record: List[int] = []                 # Alias position -> record position
+        self._alias_names: List[str] = []                  # Normalized alias text
+        self._alias_tokens: List[Tuple[str, ...]] = []
+        exact_postings: Dict[str, List[int]] = defaultdict(list)   # Trigrams of the name itself (substring search)
+        padded_postings: Dict[str, List[int]] = defaultdict(list)  # Trigrams of " name " (fuzzy candidates)
+        prefix_postings: Dict[str, List[int]] = defaultdict(list)  # Word prefixes shorter than a trigram
+        for record_position, record in enumerate(records):
+            seen = set()
+            for alias in aliases(record):
+                name = normalize_name(alias)
+                if not name or name in seen:
+                    continue
+                seen.add(name)
+                alias_position = len(self._alias_names)
+                self._alias_record.append(record_position)
+                self._alias_names.append(name)
+                self._alias_tokens.append(tuple(name.split()))
+                for gram in trigrams(name):
+                    exact_postings[gram].append(alias_position)
+                for gram in trigrams(f" {name} "):
+                    padded_postings[gram].append(alias_position)
+                for prefix in {token[:length] for token in name.split() for length in range(1, TRIGRAM_SIZE)}:
+                    prefix_postings[prefix].append(alias_position)
+        self._exact_postings = dict(exact_postings)
+        self._padded_postings = dict(padded_postings)
+        self._prefix_postings = dict(prefix_postings)
+
+    def _substring_candidates(self, query: str) -> Iterable[int]:
+        grams = sorted(trigrams(query), key=lambda gram: len(self._exact_postings.get(gram, ())))
+        if not grams:
+            return range(len(self._alias_names))  # Short queries: a plain scan of ~5k short strings
+        if grams[0] not in self._exact_postings:
+            return ()
+        candidates: Iterable[int] = self._exact_postings[grams[0]]
+        for gram in grams[1:3]:  # The substring check is exact; a couple of intersections narrow enough
+            allowed = set(self._exact_postings.get(gram, ()))
+            candidates = [position for position in candidates if position in allowed]
+        return candidates
+
+    def _fuzzy_candidates(self, query: str, exclude: Dict[int, float]) -> List[int]:
+        shared: Counter = Counter()
+        for gram in trigrams(f" {query} "):
+            postings = self._padded_postings.get(gram)
+            if postings:
+                shared.update(postings)
+        ranked = shared.most_common(FUZZY_CANDIDATES + len(exclude))
+        if not ranked:
+            return []
+        min_shared = ranked[0][1] * MIN_SHARED_TRIGRAM_RATIO  # Names sharing far fewer trigrams than the best can't rank
+        return [
+            position for position, count in ranked
+            if count >= min_shared and self._alias_record[position] not in exclude
+        ][:FUZZY_CANDIDATES]
+
+    def contains(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Returns records with a name containing the normalized `query`, in record order (no ranking)."""
+        needle = normalize_name(query)
+        if not needle:
+            return []
+        positions = sorted({
+            self._alias_record[alias_position]
+            for alias_position in self._substring_candidates(needle)
+            if needle in self._alias_names[alias_position]
+        })
+        return [self.records[position] for position in positions[:limit]]
+
+    def search(self, query: str, limit: int = 10, min_score: float = MIN_SEARCH_SCORE) -> List[SearchHit]:
+        """
+        Returns up to `limit` records matching `query`, best first.
+
+        Ties are broken by record order. Scores are in [0, 1] plus the record's boost.
+        """
+        needle = normalize_name(query)
+        if not needle or limit <= 0:
+            return []
+
+        scores: Dict[int, float] = {}  # Record position -> best alias score
+        if len(needle) < TRIGRAM_SIZE:
+            # Very short queries match inside thousands of names; rank only names with a word starting with them
+            candidates: Iterable[int] = self._prefix_postings.get(needle, ())
+        else:
+            candidates = self._substring_candidates(needle)
+        for alias_position in candidates:
+            name = self._alias_names[alias_position]
+            if needle in name:
+                record_position = self._alias_record[alias_position]
+                score = _substring_score(needle, name)
+                if score > scores.get(record_position, 0.0):
+                    scores[record_position] = score
+
+        if len(scores) < limit and 1.0 not in scores.values():  # No fuzzy padding once a name matched exactly
+            query_tokens = tuple(needle.split())
+            for alias_position in self._fuzzy_candidates(needle, scores):
+                name_tokens = self._alias_tokens[alias_position]
+                score = similarity(needle, self._alias_names[alias_position])
+                if len(query_tokens) > 1 or len(name_tokens) > 1:
+                    score = max(score, _token_similarity(query_tokens, name_tokens))
+                score *= FUZZY_WEIGHT
+                record_position = self._alias_record[alias_position]
+                if score > scores.get(record_position, 0.0):
+                    scores[record_position] = score
+
+        ranked = heapq.nsmallest(
+            limit,
+            (
+                (-(score + self._boosts[position]), position)
+                for position, score in scores.items()
+                if score >= min_score
+            ),
+        )
+        return [SearchHit(self.records[position], round(-negative_score, 4)) for negative_score, position in ranked]
@@ -0,0 +1,432 @@
+"""
+Global rate limiter and concurrency governor for outbound NBA API traffic.
+
+Each upstream host (stats.nba.com, cdn.nba.com, ...) gets its own budget:
+- a token bucket bounding requests per second (with a burst allowance), and
+- a max-in-flight limit bounding concurrent requests.
+
+Waiting requests are admitted strictly by priority (live scoreboard polling
+ahead of interactive agent queries ahead of background backfill), then FIFO.
+Queue-wait times are recorded per host and priority.
+
+In shared mode the token buckets live in a small SQLite file under
+`backend/cache/`, updated inside `BEGIN IMMEDIATE` transactions, so every
+uvicorn worker on the machine draws from the same per-host budget.
+In-flight limits are always enforced per process.
+"""
+import time
+import asyncio
+import sqlite3
+import logging
+import threading
+import contextlib
+import contextvars
+import heapq
+import itertools
+from enum import IntEnum
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from config import settings
+from utils.path_utils import get_cache_file_path
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Admission priority; lower values are admitted first."""
+    LIVE = 0         # Live scoreboards / play-by-play polling
+    INTERACTIVE = 1  # Agent tool calls answering a user
+    BACKGROUND = 2   # Warehouse ingestion and other backfill
+
+
+class HostBudget(NamedTuple):
+    """Request budget for a single upstream host."""
+    rate: float        # Sustained requests per second
+    burst: int         # Bucket capacity
+    max_in_flight: int # Concurrent requests allowed per process
+
+
+class RateLimitTimeout(requests.exceptions.Timeout):
+    """Raised when a request waits longer than its admission deadline."""
+
+
+# --- Module-Level Constants ---
+DEFAULT_HOST_PRIORITIES: Dict[str, Priority] = {"cdn.nba.com": Priority.LIVE}
+WAIT_SAMPLE_SIZE = 512  # Recent wait samples kept per host/priority for percentiles
+SHARED_BUCKET_POLL_SECONDS = 0.05
+ASYNC_ADMISSION_POLL_SECONDS = 0.02  # Async waiters poll; threads are woken by the condition
+
+_current_priority: contextvars.ContextVar[Optional[Priority]] = contextvars.ContextVar("nba_api_priority", default=None)
+
+
+@contextlib.contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Runs the enclosed NBA API calls at the given priority (e.g., `with request_priority(Priority.BACKGROUND):`)."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def current_priority(host: str) -> Priority:
+    """Returns the priority set by `request_priority`, else the host default, else INTERACTIVE."""
+    explicit = _current_priority.get()
+    if explicit is not None:
+        return explicit
+    return DEFAULT_HOST_PRIORITIES.get(host, Priority.INTERACTIVE)
+
+def parse_host_budgets(spec: str) -> Dict[str, HostBudget]:
+    """Parses "host:rate:burst:max_in_flight,..." into per-host budgets, skipping malformed entries."""
+    budgets: Dict[str, HostBudget] = {}
+    for item in (spec or "").split(","):
+        parts = [p.strip() for p in item.split(":")]
+        if len(parts) != 4 or not parts[0]:
+            if item.strip():
+                logger.warning(f"Ignoring malformed host budget '{item}'")
+            continue
+        try:
+            budgets[parts[0].lower()] = HostBudget(float(parts[1]), int(parts[2]), int(parts[3]))
+        except ValueError:
+            logger.warning(f"Ignoring malformed host budget '{item}'")
+    return budgets
+
+
+# --- Token Buckets ---
+class TokenBucket:
+    """In-process token bucket."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Takes a token if available. Returns 0 on success, else the seconds until one is available."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class SharedTokenBucket:
+    """Token bucket persisted in SQLite so that several processes share one budget."""
+
+    def __init__(self, db_path: str, host: str, rate: float, burst: int):
+        self.db_path = db_path
+        self.host = host
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS buckets (host TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def try_acquire(self) -> float:
+        """Takes a token from the shared bucket. Returns 0 on success, else the seconds until one is available."""
+        if self.rate <= 0:
+            return 0.0
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()  # Wall clock: shared across processes
+                row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE host = ?", (self.host,)).fetchone()
+                tokens = float(self.burst) if row is None else min(self.burst, row[0] + max(now - row[1], 0) * self.rate)
+                wait = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / self.rate
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (host, tokens, updated_at) VALUES (?, ?, ?)",
+                    (self.host, tokens, now),
+                )
+                conn.execute("COMMIT")
+                return wait
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"Shared rate-limit bucket unavailable for {self.host}, retrying shortly: {e}")
+            return SHARED_BUCKET_POLL_SECONDS
+
+
+# --- Governor ---
+class _HostGate:
+    """Priority-ordered admission queue, in-flight counter, token bucket and wait metrics for one host."""
+
+    def __init__(self, host: str, budget: HostBudget, bucket):
+        self.host = host
+        self.budget = budget
+        self.bucket = bucket
+        self.in_flight = 0
+        self.queue: List[Tuple[int, int]] = []  # Heap of (priority, ticket)
+        self.condition = threading.Condition()
+        self.waits: Dict[Priority, Deque[float]] = {p: deque(maxlen=WAIT_SAMPLE_SIZE) for p in Priority}
+        self.admitted: Dict[Priority, int] = {p: 0 for p in Priority}
+        self.timeouts: Dict[Priority, int] = {p: 0 for p in Priority}
+
+
+class RateLimiter:
+    """Per-host token-bucket rate limiting plus priority-aware concurrency limits."""
+
+    def __init__(
+        self,
+        budgets: Dict[str, HostBudget],
+        default_budget: HostBudget,
+        shared_db_path: Optional[str] = None,
+        max_wait: float = 30.0,
+    ):
+        self.budgets = {host.lower(): budget for host, budget in budgets.items()}
+        self.default_budget = default_budget
+        self.shared_db_path = shared_db_path
+        self.max_wait = max_wait
+        self._gates: Dict[str, _HostGate] = {}
+        self._gates_lock = threading.Lock()
+        self._tickets = itertools.count()
+
+    def _gate(self, host: str) -> _HostGate:
+        host = host.lower()
+        with self._gates_lock:
+            gate = self._gates.get(host)
+            if gate is None:
+                budget = self.budgets.get(host, self.default_budget)
+                if self.shared_db_path:
+                    bucket = SharedTokenBucket(self.shared_db_path, host, budget.rate, budget.burst)
+                else:
+                    bucket = TokenBucket(budget.rate, budget.burst)
+                gate = _HostGate(host, budget, bucket)
+                self._gates[host] = gate
+            return gate
+
+    @staticmethod
+    def _drop_ticket(gate: _HostGate, ticket: Tuple[int, int]) -> None:
+        """Removes a request's own ticket, wherever it sits in the queue, and wakes the waiters (gate condition held)."""
+        try:
+            gate.queue.remove(ticket)
+        except ValueError:
+            pass  # Already removed
+        else:
+            heapq.heapify(gate.queue)
+        gate.condition.notify_all()
+
+    def acquire(self, host: str, priority: Optional[Priority] = None, timeout: Optional[float] = None) -> float:
+        """
+        Blocks until a request to `host` may be sent, then reserves an in-flight slot.
+
+        Args:
+            host (str): Upstream host name.
+            priority (Optional[Priority]): Admission priority. Defaults to `current_priority(host)`.
+            timeout (Optional[float]): Maximum seconds to wait. Defaults to the limiter's `max_wait`.
+
+        Returns:
+            float: Seconds spent waiting for admission.
+
+        Raises:
+            RateLimitTimeout: If admission takes longer than `timeout`.
+        """
+        gate = self._gate(host)
+        priority = priority if priority is not None else current_priority(gate.host)
+        deadline_in = self.max_wait if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + deadline_in
+        ticket = (int(priority), next(self._tickets))
+
+        with gate.condition:
+            heapq.heappush(gate.queue, ticket)
+            try:
+                # 1. Wait until this request is first in line and a concurrency slot is free.
+                while gate.queue[0] != ticket or (gate.budget.max_in_flight and gate.in_flight >= gate.budget.max_in_flight):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._timeout(gate, priority, deadline_in)
+                    gate.condition.wait(remaining)
+                gate.in_flight += 1
+            except BaseException:
+                self._drop_ticket(gate, ticket)
+                raise
+
+        # 2. Still at the head of the queue, wait for a token so lower priorities cannot overtake.
+        try:
+            while True:
+                wait = gate.bucket.try_acquire()
+                if wait <= 0:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise self._timeout(gate, priority, deadline_in)
+                time.sleep(min(wait, remaining, 1.0))
+        except BaseException:
+            self.release(host)
+            with gate.condition:
+                self._drop_ticket(gate, ticket)
+            raise
+
+        waited = time.monotonic() - started
+        with gate.condition:
+            self._drop_ticket(gate, ticket)
+            gate.admitted[priority] += 1
+            gate.waits[priority].append(waited)
+        if waited > 1.0:
+            logger.info(f"NBA API request to {gate.host} ({priority.name}) queued for {waited:.2f}s")
+        return waited
+
+    async def acquire_async(self, host: str, priority: Optional[Priority] = None, timeout: Optional[float] = None) -> float:
+        """
+        Async counterpart of `acquire` that waits on the event loop instead of blocking a thread.
+
+        Async and threaded callers share the same admission queue, in-flight counts and buckets.
+
+        Raises:
+            RateLimitTimeout: If admission takes longer than `timeout`.
+        """
+        gate = self._gate(host)
+        priority = priority if priority is not None else current_priority(gate.host)
+        deadline_in = self.max_wait if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + deadline_in
+        ticket = (int(priority), next(self._tickets))
+
+        with gate.condition:
+            heapq.heappush(gate.queue, ticket)
+        admitted = False
+        try:
+            # 1. Wait until first in line with a free concurrency slot.
+            while not admitted:
+                with gate.condition:
+                    if gate.queue[0] == ticket and not (gate.budget.max_in_flight and gate.in_flight >= gate.budget.max_in_flight):
+                        gate.in_flight += 1
+                        admitted = True
+                        break
+                if time.monotonic() >= deadline:
+                    raise self._timeout(gate, priority, deadline_in)
+                await asyncio.sleep(ASYNC_ADMISSION_POLL_SECONDS)
+
+            # 2. Wait for a token while still at the head of the queue.
+            while True:
+                wait = gate.bucket.try_acquire()
+                if wait <= 0:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise self._timeout(gate, priority, deadline_in)
+                await asyncio.sleep(min(wait, remaining, 1.0))
+        except BaseException:
+            if admitted:
+                self.release(host)
+            with gate.condition:
+                self._drop_ticket(gate, ticket)
+            raise
+
+        waited = time.monotonic() - started
+        with gate.condition:
+            self._drop_ticket(gate, ticket)
+            gate.admitted[priority] += 1
+            gate.waits[priority].append(waited)
+        if waited > 1.0:
+            logger.info(f"NBA API request to {gate.host} ({priority.name}) queued for {waited:.2f}s")
+        return waited
+
+    def release(self, host: str) -> None:
+        """Frees the in-flight slot reserved by `acquire`."""
+        gate = self._gate(host)
+        with gate.condition:
+            gate.in_flight = max(gate.in_flight - 1, 0)
+            gate.condition.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, host: str, priority: Optional[Priority] = None) -> Iterator[float]:
+        """Context manager pairing `acquire` and `release`; yields the queue wait in seconds."""
+        waited = self.acquire(host, priority)
+        try:
+            yield waited
+        finally:
+            self.release(host)
+
+    @contextlib.asynccontextmanager
+    async def async_slot(self, host: str, priority: Optional[Priority] = None) -> AsyncIterator[float]:
+        """Async context manager pairing `acquire_async` and `release`; yields the queue wait in seconds."""
+        waited = await self.acquire_async(host, priority)
+        try:
+            yield waited
+        finally:
+            self.release(host)
+
+    def _timeout(self, gate: _HostGate, priority: Priority, waited_for: float) -> RateLimitTimeout:
+        gate.timeouts[priority] += 1
+        logger.warning(f"NBA API request to {gate.host} ({priority.name}) not admitted within {waited_for:.1f}s")
+        return RateLimitTimeout(f"Rate limiter did not admit request to {gate.host} within {waited_for:.1f}s")
+
+    def metrics(self) -> Dict[str, Dict[str, object]]:
+        """Returns per-host budgets, in-flight/queued counts and queue-wait statistics by priority."""
+        with self._gates_lock:
+            gates = list(self._gates.values())
+        report: Dict[str, Dict[str, object]] = {}
+        for gate in gates:
+            with gate.condition:
+                by_priority = {}
+                for priority in Priority:
+                    samples = sorted(gate.waits[priority])
+                    by_priority[priority.name.lower()] = {
+                        "admitted": gate.admitted[priority],
+                        "timeouts": gate.timeouts[priority],
+                        "avg_wait_seconds": round(sum(samples) / len(samples), 4) if samples else 0.0,
+                        "p95_wait_seconds": round(samples[int(0.95 * (len(samples) - 1))], 4) if samples else 0.0,
+                        "max_wait_seconds": round(samples[-1], 4) if samples else 0.0,
+                    }
+                report[gate.host] = {
+                    "budget": gate.budget._asdict(),
+                    "shared": isinstance(gate.bucket, SharedTokenBucket),
+                    "in_flight": gate.in_flight,
+                    "queued": len(gate.queue),
+                    "priorities": by_priority,
+                }
+        return report
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the process-wide limiter, building it from settings on first use."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(
+                    budgets=parse_host_budgets(settings.NBA_API_HOST_BUDGETS_STR),
+                    default_budget=HostBudget(
+                        settings.NBA_API_RATE_LIMIT_DEFAULT_RPS,
+                        settings.NBA_API_RATE_LIMIT_DEFAULT_BURST,
+                        settings.NBA_API_MAX_IN_FLIGHT,
+                    ),
+                    shared_db_path=get_cache_file_path(settings.NBA_API_RATE_LIMIT_DB_FILE) if settings.NBA_API_RATE_LIMIT_SHARED else None,
+                    max_wait=settings.NBA_API_RATE_LIMIT_MAX_WAIT_SECONDS,
+                )
+    return _rate_limiter
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Replaces the process-wide limiter (e.g., after changing settings, or in tests)."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = limiter
@@ -0,0 +1,370 @@
+"""
+Local season warehouse of per-game NBA data.
+
+Past games never change, so api_tools/warehouse_ingestion.py bulk-loads every
+game of a season (boxscores, play-by-play, win probability, rotations, hustle)
+into this store. The logic functions then read full-game requests from it
+before going to stats.nba.com.
+
+Layout under `backend/cache/<settings.WAREHOUSE_DIR>/`:
+- `season=<YYYY-YY>/<source>/<table>/<game_id>.parquet`: one typed Parquet file
+  per game and dataset, written through utils/dataset_store.py. `source` is the
+  nba_api endpoint class name (e.g. "BoxScoreTraditionalV3"), `table` its
+  dataset attribute (e.g. "player_stats"). The directories are Hive-style
+  partitions, so DuckDB (optional) can query whole seasons with SQL.
+- `catalog.sqlite3`: the season's games and, per game and source, the tables
+  stored or the last ingestion error. Ingestion checkpoints through it, so an
+  interrupted run resumes where it stopped.
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import settings
+from utils.path_utils import get_cache_dir
+from utils.cache_policy import GAME_STATUS_FINAL, record_game_status
+from utils.dataset_store import load_dataset, save_dataset
+
+try:
+    import duckdb
+except ImportError:  # Optional: enables SQL over whole seasons
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+# --- Module-Level Constants ---
+CATALOG_FILE = "catalog.sqlite3"
+SEASON_PARTITION_PREFIX = "season="
+
+
+class _StoredDataSet:
+    """Stands in for nba_api's `Endpoint.DataSet`."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+
+    def get_data_frame(self) -> pd.DataFrame:
+        return self._df
+
+
+class StoredEndpoint:
+    """
+    Stands in for an nba_api endpoint instance built from warehouse tables: each table is a dataset
+    attribute (e.g. `.player_stats.get_data_frame()`) and `get_data_frames()` keeps the endpoint's order.
+    """
+
+    def __init__(self, source: str, tables: Dict[str, pd.DataFrame]):
+        self.source = source
+        self.data_sets = [_StoredDataSet(df) for df in tables.values()]
+        for name, data_set in zip(tables, self.data_sets):
+            setattr(self, name, data_set)
+
+    def get_data_frames(self) -> List[pd.DataFrame]:
+        return [data_set.get_data_frame() for data_set in self.data_sets]
+
+
+def endpoint_tables(endpoint: Any) -> Dict[str, pd.DataFrame]:
+    """Returns an nba_api endpoint instance's datasets by attribute name, in `data_sets` order."""
+    names = {
+        id(value.data): name for name, value in vars(endpoint).items()
+        if name != "data_sets" and hasattr(value, "get_data_frame") and hasattr(value, "data")
+    }
+    return {
+        names.get(id(data_set.data), f"data_set_{position}"): data_set.get_data_frame()
+        for position, data_set in enumerate(endpoint.data_sets)
+    }
+
+
+class SeasonWarehouse:
+    """Parquet partitions plus a SQLite catalog; safe to share across threads and worker processes."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or get_cache_dir(settings.WAREHOUSE_DIR)
+        os.makedirs(self.root, exist_ok=True)
+        self.catalog_path = os.path.join(self.root, CATALOG_FILE)
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.catalog_path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS games (
+                game_id TEXT PRIMARY KEY,
+                season TEXT NOT NULL,
+                season_type TEXT NOT NULL,
+                game_date TEXT,
+                matchup TEXT
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingested (
+                game_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                season TEXT NOT NULL,
+                tables TEXT,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                fetched_at REAL NOT NULL,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                PRIMARY KEY (game_id, source)
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_games_season ON games(season, season_type)")
+
+    # --- Paths ---
+    def table_dir(self, season: str, source: str, table: str) -> str:
+        return os.path.join(self.root, f"{SEASON_PARTITION_PREFIX}{season}", source, table)
+
+    def table_path(self, season: str, source: str, table: str, game_id: str) -> str:
+        return os.path.join(self.table_dir(season, source, table), f"{game_id}.parquet")
+
+    # --- Catalog ---
+    def record_games(self, season: str, season_type: str, games: Iterable[Dict[str, Any]]) -> int:
+        """Adds a season's games ({"game_id", "game_date", "matchup"}) to the catalog; returns how many were given."""
+        rows = [(g["game_id"], season, season_type, g.get("game_date"), g.get("matchup")) for g in games]
+        self._connect().executemany(
+            "INSERT OR REPLACE INTO games (game_id, season, season_type, game_date, matchup) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def pending(
+        self,
+        season: str,
+        sources: Iterable[str],
+        season_type: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        (game_id, source) pairs of the season's catalogued games not stored yet, oldest games first.
+        Pairs that already failed `max_attempts` times (settings.WAREHOUSE_MAX_ATTEMPTS) are skipped.
+        """
+        max_attempts = max_attempts or settings.WAREHOUSE_MAX_ATTEMPTS
+        query = "SELECT game_id FROM games WHERE season = ?"
+        params: List[Any] = [season]
+        if season_type:
+            query += " AND season_type = ?"
+            params.append(season_type)
+        conn = self._connect()
+        game_ids = [row[0] for row in conn.execute(query + " ORDER BY game_date, game_id", params)]
+        done = {
+            (game_id, source) for game_id, source, error, attempts in conn.execute(
+                "SELECT game_id, source, error, attempts FROM ingested WHERE season = ?", (season,)
+            ) if error is None or attempts >= max_attempts
+        }
+        return [(game_id, source) for game_id in game_ids for source in sources if (game_id, source) not in done]
+
+    def season_of(self, game_id: str) -> Optional[str]:
+        row = self._connect().execute("SELECT season FROM games WHERE game_id = ?", (game_id,)).fetchone()
+        return row[0] if row else None
+
+    # --- Write ---
+    def write(self, game_id: str, source: str, tables: Dict[str, pd.DataFrame], season: Optional[str] = None) -> bool:
+        """Stores one game's datasets from a source and checkpoints them in the catalog. Returns False on failure."""
+        season = season or self.season_of(game_id)
+        if season is None:
+            logger.warning(f"Warehouse write skipped: game {game_id} is not in the catalog")
+            return False
+        for table, df in tables.items():
+            if save_dataset(df, self.table_path(season, source, table, game_id), endpoint=source,
+                            params={"game_id": game_id, "season": season}) is None:
+                self.record_failure(game_id, source, f"could not write table {table}", season)
+                return False
+        self._connect().execute(
+            "INSERT OR REPLACE INTO ingested (game_id, source, season, tables, row_count, fetched_at, error, attempts) "
+            "VALUES (?, ?, ?, ?, ?, ?, NULL, 1)",
+            (game_id, source, season, json.dumps(list(tables)), sum(len(df) for df in tables.values()), time.time()),
+        )
+        return True
+
+    def record_failure(self, game_id: str, source: str, error: str, season: Optional[str] = None) -> None:
+        season = season or self.season_of(game_id) or ""
+        self._connect().execute(
+            """
+            INSERT INTO ingested (game_id, source, season, fetched_at, error, attempts) VALUES (?, ?, ?, ?, ?, 1)
+            ON CONFLICT (game_id, source) DO UPDATE SET
+                error = excluded.error, fetched_at = excluded.fetched_at, attempts = ingested.attempts + 1
+            """,
+            (game_id, source, season, time.time(), error[:500]),
+        )
+
+    # --- Read ---
+    def read(self, game_id: str, source: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """A stored game's datasets from a source in endpoint order, or None if not ingested (or unreadable)."""
+        try:
+            row = self._connect().execute(
+                "SELECT season, tables FROM ingested WHERE game_id = ? AND source = ? AND error IS NULL",
+                (game_id, source),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Warehouse catalog read failed for {source} {game_id}: {e}")
+            row = None
+        tables: Optional[Dict[str, pd.DataFrame]] = None
+        if row is not None:
+            season, names = row
+            tables = {}
+            for name in json.loads(names):
+                df = load_dataset(self.table_path(season, source, name, game_id))
+                if df is None:
+                    self._connect().execute("DELETE FROM ingested WHERE game_id = ? AND source = ?", (game_id, source))
+                    tables = None
+                    break
+                tables[name] = df
+        with self._stats_lock:
+            self._stats["hits" if tables is not None else "misses"] += 1
+        return tables
+
+    def season_table(
+        self,
+        source: str,
+        table: str,
+        seasons: Optional[Iterable[str]] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        One dataset across every stored game of the given seasons (all seasons by default), with
+        `season` and `game_id` columns. Schemas are unified across games, e.g. a column that is all
+        null in one game keeps the type it has in the others.
+        """
+        seasons = list(seasons) if seasons is not None else self.seasons()
+        parts: List[pa.Table] = []
+        for season in seasons:
+            directory = self.table_dir(season, source, table)
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                if not filename.endswith(".parquet"):
+                    continue
+                part = pq.read_table(os.path.join(directory, filename), columns=columns, memory_map=True)
+                game_id = filename[:-len(".parquet")]
+                part = part.append_column("season", pa.array([season] * part.num_rows, pa.string()))
+                parts.append(part.append_column("game_id", pa.array([game_id] * part.num_rows, pa.string())))
+        if not parts:
+            return pd.DataFrame()
+        return pa.concat_tables(parts, promote_options="permissive").to_pandas()
+
+    def seasons(self) -> List[str]:
+        return [row[0] for row in self._connect().execute("SELECT DISTINCT season FROM games ORDER BY season")]
+
+    def sql(self, query: str) -> pd.DataFrame:
+        """
+        Runs a DuckDB query over the warehouse. Every `<source>/<table>` is a view named
+        `<source>__<table>` (e.g. `BoxScoreTraditionalV3__player_stats`) with a `season` column.
+        Requires the optional `duckdb` package.
+        """
+        if duckdb is None:
+            raise RuntimeError("SQL queries over the season warehouse require the 'duckdb' package")
+        conn = duckdb.connect()
+        try:
+            views = set()
+            for season_dir in os.listdir(self.root):
+                if not season_dir.startswith(SEASON_PARTITION_PREFIX):
+                    continue
+                for source in os.listdir(os.path.join(self.root, season_dir)):
+                    for table in os.listdir(os.path.join(self.root, season_dir, source)):
+                        views.add((source, table))
+            for source, table in sorted(views):
+                pattern = os.path.join(self.root, f"{SEASON_PARTITION_PREFIX}*", source, table, "*.parquet")
+                conn.execute(
+                    f'CREATE VIEW "{source}__{table}" AS SELECT * FROM '
+                    f"read_parquet('{pattern}', hive_partitioning = true, union_by_name = true, filename = true)"
+                )
+            return conn.execute(query).fetchdf()
+        finally:
+            conn.close()
+
+    def info(self) -> Dict[str, Any]:
+        conn = self._connect()
+        games = dict(conn.execute("SELECT season, COUNT(*) FROM games GROUP BY season").fetchall())
+        stored = dict(conn.execute(
+            "SELECT season, COUNT(DISTINCT game_id) FROM ingested WHERE error IS NULL GROUP BY season"
+        ).fetchall())
+        failed = conn.execute("SELECT COUNT(*) FROM ingested WHERE error IS NOT NULL").fetchone()[0]
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {
+            "seasons": {season: {"games": count, "games_stored": stored.get(season, 0)} for season, count in games.items()},
+            "failed_fetches": failed,
+            "sql_available": duckdb is not None,
+            **stats,
+        }
+
+
+_warehouse: Optional[SeasonWarehouse] = None
+_warehouse_lock = threading.Lock()
+
+
+def get_season_warehouse() -> SeasonWarehouse:
+    """Returns the process-wide season warehouse, opening it on first use."""
+    global _warehouse
+    with _warehouse_lock:
+        if _warehouse is None:
+            _warehouse = SeasonWarehouse()
+        return _warehouse
+
+
+def set_season_warehouse(warehouse: Optional[SeasonWarehouse]) -> None:
+    """Replaces the shared warehouse (e.g., to point at a temporary directory in tests)."""
+    global _warehouse
+    with _warehouse_lock:
+        _warehouse = warehouse
+
+
+def is_full_game_request(*values: Any) -> bool:
+    """True if period/range parameters are all unset; nba_api's defaults are the string "0"."""
+    return all(value in (None, "", 0, "0") for value in values)
+
+
+def stored_endpoint(endpoint_class: Any, game_id: str) -> Optional[StoredEndpoint]:
+    """
+    The warehouse copy of a full-game endpoint response, or None when the warehouse is disabled or
+    the game has not been ingested for that endpoint. Callers use it only for requests the ingestion
+    made, i.e. with the endpoint's default (full-game) parameters:
+
+        endpoint = stored_endpoint(BoxScoreTraditionalV3, game_id) or BoxScoreTraditionalV3(game_id=game_id, ...)
+    """
+    if not settings.WAREHOUSE_ENABLED or not game_id:
+        return None
+    try:
+        tables = get_season_warehouse().read(str(game_id), endpoint_class.__name__)
+    except Exception as e:
+        logger.warning(f"Season warehouse unavailable for {endpoint_class.__name__} {game_id}: {e}")
+        return None
+    if tables is None:
+        return None
+    logger.debug(f"Serving {endpoint_class.__name__} for game {game_id} from the season warehouse")
+    record_game_status(str(game_id), GAME_STATUS_FINAL)  # Only completed games are ingested
+    return StoredEndpoint(endpoint_class.__name__, tables)
+
+
+def season_warehouse_info() -> Dict[str, Any]:
+    """Catalog counts and read hit/miss counters for the health endpoint."""
+    if not settings.WAREHOUSE_ENABLED:
+        return {"enabled": False}
+    try:
+        return {"enabled": True, **get_season_warehouse().info()}
+    except Exception as e:
+        return {"enabled": True, "error": str(e)}
@@ -0,0 +1,167 @@
+"""
+Request coalescing ("single-flight") for concurrent identical upstream calls.
+
+When several threads ask for the same key at the same time, only the first
+(the leader) runs the underlying call; the others wait for it to finish and
+receive the same result, or the same exception. Nothing is retained once the
+call completes; caching finished results is left to utils/cache.py.
+
+`AsyncSingleFlight` does the same for coroutines running on one event loop.
+Synchronous code running on an event loop should call `SingleFlight.do` inside
+`no_blocking_waits()`, so it never parks the loop on another thread's call.
+"""
+import asyncio
+import logging
+import threading
+import contextlib
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_waits_allowed: contextvars.ContextVar[bool] = contextvars.ContextVar("single_flight_waits_allowed", default=True)
+
+
+@contextlib.contextmanager
+def no_blocking_waits() -> Iterator[None]:
+    """Within this block, a call that finds an identical one in flight runs itself instead of waiting."""
+    token = _waits_allowed.set(False)
+    try:
+        yield
+    finally:
+        _waits_allowed.reset(token)
+
+
+class _Call:
+    """A single in-flight call and the outcome shared with its waiters."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.leader_thread = threading.get_ident()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self, name: str, wait_timeout: Optional[float] = None):
+        self.name = name
+        self.wait_timeout = wait_timeout if wait_timeout is not None else settings.SINGLE_FLIGHT_WAIT_TIMEOUT_SECONDS
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Runs `fn` unless an identical call is already in flight, in which case its result is shared.
+
+        Args:
+            key (str): Normalized identity of the call (e.g., endpoint + sorted parameters).
+            fn (Callable[[], Any]): Zero-argument callable performing the upstream work.
+
+        Returns:
+            Any: The leader's return value. Exceptions raised by the leader are re-raised in every waiter.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                is_leader = True
+            elif call.leader_thread == threading.get_ident() or not _waits_allowed.get():
+                is_leader = None  # Re-entrant call from the leader, or a caller that must not block
+            else:
+                is_leader = False
+
+        if is_leader is None:
+            return fn()
+
+        if not is_leader:
+            if not call.done.wait(self.wait_timeout):
+                logger.warning(f"{self.name}: timed out after {self.wait_timeout}s waiting on in-flight call; fetching independently.")
+                return fn()
+            with self._lock:
+                self.coalesced += 1
+            logger.debug(f"{self.name}: shared in-flight result for {key}")
+            if call.error is not None:
+                if not isinstance(call.error, Exception):
+                    # Control-flow exceptions (interrupts, deferred async fetches) belong to the leader only
+                    return fn()
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self.executed += 1
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def info(self) -> Dict[str, int]:
+        """Returns counters for executed vs coalesced calls and the number currently in flight."""
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+class AsyncSingleFlight:
+    """Deduplicates concurrent coroutine calls that share a key. Bound to the event loop it is first used on."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Awaits `fn()` unless an identical call is already in flight, in which case its outcome is shared.
+
+        Cancelling a waiter does not cancel the shared call.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            logger.debug(f"{self.name}: shared in-flight result for {key}")
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(fn())
+        self._calls[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self.executed += 1
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+            else:
+                # The leader was cancelled; waiters still await the shared call, so clean up when it finishes
+                future.add_done_callback(lambda f: self._finish(key, f))
+
+    def _finish(self, key: str, future: asyncio.Future) -> None:
+        self.executed += 1
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            future.exception()  # Mark retrieved so an unawaited failure is not logged as never retrieved
+
+    def info(self) -> Dict[str, int]:
+        """Returns counters for executed vs coalesced calls and the number currently in flight."""
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }